@@ -0,0 +1,69 @@
+"""
+ChartSense Bot Process
+Runs the trading bot in its own process and serves the API workers over local IPC.
+
+Usage:
+    BOT_IPC_AUTHKEY=... python bot_process.py [--autostart]
+
+Run the API alongside it with BOT_PROCESS_MODE=external and the same
+BOT_IPC_AUTHKEY / BOT_IPC_ADDRESS; the API can then use several uvicorn
+workers without starting duplicate bots:
+
+    BOT_PROCESS_MODE=external uvicorn main:app --workers 4
+"""
+import argparse
+import asyncio
+import os
+import signal
+from dotenv import load_dotenv
+
+# Load environment variables BEFORE other imports
+load_dotenv()
+
+# This process owns the real bot - never proxy to ourselves
+os.environ["BOT_PROCESS_MODE"] = "embedded"
+
+from database.connection import init_db
+from services.bot_ipc import BotIPCServer
+from services.logging_config import setup_logging, get_logger
+from services.trading_bot import BotState, get_trading_bot
+
+use_json_logging = os.getenv("LOG_FORMAT", "console").lower() == "json"
+setup_logging(use_json=use_json_logging)
+logger = get_logger(__name__)
+
+
+async def run(autostart: bool):
+    """Serve the bot over IPC until SIGINT/SIGTERM"""
+    init_db()
+    bot = get_trading_bot()
+
+    server = BotIPCServer(bot, loop=asyncio.get_running_loop())
+    server.start()
+
+    if autostart:
+        await bot.start()
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    logger.info("Bot process ready")
+    await stop_event.wait()
+
+    logger.info("Bot process shutting down")
+    server.close()
+    if bot.state != BotState.STOPPED:
+        await bot.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the ChartSense trading bot as its own process")
+    parser.add_argument("--autostart", action="store_true", help="Start trading immediately")
+    args = parser.parse_args()
+    asyncio.run(run(args.autostart))
+
+
+if __name__ == "__main__":
+    main()
@@ -53,6 +53,16 @@ def _get_env_bool(key: str, default: bool) -> bool:
     return default
 
 
+def _get_env_str(key: str, default: str) -> str:
+    """Get string from environment variable with fallback to default."""
+    env_key = f"TRADING_{key.upper()}"
+    value = os.getenv(env_key)
+    if value:
+        logger.info(f"Config override: {key} = {value} (from {env_key})")
+        return value
+    return default
+
+
 @dataclass
 class TradingConfig:
     """
@@ -125,6 +135,39 @@ class TradingConfig:
     # Default stop loss percentage if not specified
     default_stop_loss_pct: float = field(default_factory=lambda: _get_env_float('default_stop_loss_pct', 0.05))
 
+    # ===== Warm Restart Snapshot =====
+    # Periodically snapshot analytic state (analysis results, priority tiers, caches)
+    state_snapshot_enabled: bool = field(default_factory=lambda: _get_env_bool('state_snapshot_enabled', True))
+
+    # Local file the snapshot is written to (gzip-compressed JSON)
+    state_snapshot_path: str = field(default_factory=lambda: _get_env_str('state_snapshot_path', './bot_state_snapshot.json.gz'))
+
+    # Seconds between snapshots while the bot is running
+    state_snapshot_interval_seconds: int = field(default_factory=lambda: _get_env_int('state_snapshot_interval_seconds', 120))
+
+    # Snapshots older than this are ignored on startup
+    state_snapshot_max_age_seconds: int = field(default_factory=lambda: _get_env_int('state_snapshot_max_age_seconds', 3600))
+
+    # ===== Partitioned Bot Workers =====
+    # Worker processes for symbol analysis (0 = analyze in the bot process)
+    bot_worker_processes: int = field(default_factory=lambda: _get_env_int('bot_worker_processes', 0))
+
+    # Seconds the bot waits for all workers to finish one horizon scan
+    bot_worker_timeout_seconds: int = field(default_factory=lambda: _get_env_int('bot_worker_timeout_seconds', 120))
+
+    # ===== Broker Backend =====
+    # Paper trading backend: 'alpaca' (Alpaca's paper API) or 'simulated' (in-memory fills)
+    broker_backend: str = field(default_factory=lambda: _get_env_str('broker_backend', 'alpaca'))
+
+    # Starting cash of the simulated paper account
+    sim_starting_cash: float = field(default_factory=lambda: _get_env_float('sim_starting_cash', 100000.0))
+
+    # Milliseconds from submission until a simulated order reaches the book
+    sim_latency_ms: float = field(default_factory=lambda: _get_env_float('sim_latency_ms', 0.0))
+
+    # Share of a bar's volume simulated fills may take (0 = no limit, no partial fills)
+    sim_max_volume_fraction: float = field(default_factory=lambda: _get_env_float('sim_max_volume_fraction', 0.0))
+
     def __post_init__(self):
         """Validate configuration values."""
         self._validate()
@@ -148,6 +191,24 @@ class TradingConfig:
         if not 0 < self.limit_order_offset_pct < 0.1:
             errors.append(f"limit_order_offset_pct should be between 0 and 0.1, got {self.limit_order_offset_pct}")
 
+        if self.state_snapshot_interval_seconds < 10:
+            errors.append(f"state_snapshot_interval_seconds must be at least 10, got {self.state_snapshot_interval_seconds}")
+
+        if self.bot_worker_processes < 0:
+            errors.append(f"bot_worker_processes cannot be negative, got {self.bot_worker_processes}")
+
+        if self.broker_backend not in ('alpaca', 'simulated'):
+            errors.append(f"broker_backend must be 'alpaca' or 'simulated', got {self.broker_backend!r}")
+
+        if self.sim_starting_cash <= 0:
+            errors.append(f"sim_starting_cash must be positive, got {self.sim_starting_cash}")
+
+        if self.sim_latency_ms < 0:
+            errors.append(f"sim_latency_ms cannot be negative, got {self.sim_latency_ms}")
+
+        if not 0 <= self.sim_max_volume_fraction <= 1:
+            errors.append(f"sim_max_volume_fraction must be between 0 and 1, got {self.sim_max_volume_fraction}")
+
         if errors:
             for error in errors:
                 logger.error(f"Config validation error: {error}")
@@ -174,6 +235,16 @@ class TradingConfig:
             'http_timeout_seconds': self.http_timeout_seconds,
             'order_fill_timeout_seconds': self.order_fill_timeout_seconds,
             'default_stop_loss_pct': self.default_stop_loss_pct,
+            'state_snapshot_enabled': self.state_snapshot_enabled,
+            'state_snapshot_path': self.state_snapshot_path,
+            'state_snapshot_interval_seconds': self.state_snapshot_interval_seconds,
+            'state_snapshot_max_age_seconds': self.state_snapshot_max_age_seconds,
+            'bot_worker_processes': self.bot_worker_processes,
+            'bot_worker_timeout_seconds': self.bot_worker_timeout_seconds,
+            'broker_backend': self.broker_backend,
+            'sim_starting_cash': self.sim_starting_cash,
+            'sim_latency_ms': self.sim_latency_ms,
+            'sim_max_volume_fraction': self.sim_max_volume_fraction,
         }
 
 
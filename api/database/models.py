@@ -412,3 +412,38 @@ class UserWatchlist(Base):
 
     def __repr__(self):
         return f"<UserWatchlist {self.symbol}: auto_trade={self.auto_trade}>"
+
+
+class BacktestJobRecord(Base):
+    """
+    Backtest job submitted through the job API.
+    Keeps the request, progress and final result so clients can fetch
+    results after the run (or after an API restart).
+    """
+    __tablename__ = "backtest_jobs"
+
+    id = Column(String(32), primary_key=True)
+    kind = Column(String(20), nullable=False)  # backtest, symbol_backtest
+    client_id = Column(String(100), index=True)
+
+    # QUEUED, RUNNING, COMPLETED, FAILED, CANCELLED
+    status = Column(String(20), nullable=False, index=True)
+    progress = Column(Float, default=0.0)  # 0-100
+
+    request = Column(JSON)
+    result = Column(JSON)
+    error = Column(String(500))
+
+    # API worker running the job; it refreshes the heartbeat while the job
+    # is active and polls cancel_requested (set by whichever worker got the DELETE)
+    owner_id = Column(String(64), index=True)
+    heartbeat_at = Column(DateTime)
+    cancel_requested = Column(Boolean, default=False)
+
+    # Timestamps
+    created_at = Column(DateTime, server_default=func.now(), index=True)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+    def __repr__(self):
+        return f"<BacktestJobRecord {self.id}: {self.kind} {self.status}>"
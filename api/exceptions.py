@@ -19,11 +19,18 @@ Exception Hierarchy:
     |   |-- AlpacaPositionError
     |   +-- AlpacaConnectionError
     |
-    +-- CryptoServiceError
-        |-- CryptoRateLimitError
-        |-- CryptoOrderError
-        |-- CryptoInsufficientDataError
-        +-- CryptoSymbolError
+    |-- CryptoServiceError
+    |   |-- CryptoRateLimitError
+    |   |-- CryptoOrderError
+    |   |-- CryptoInsufficientDataError
+    |   +-- CryptoSymbolError
+    |
+    |-- BotProcessError
+    |   +-- BotProcessUnavailableError
+    |
+    +-- BacktestError
+        |-- BacktestCancelledError
+        +-- BacktestJobLimitError
 
 Usage:
     from exceptions import AlpacaOrderError, AlpacaInsufficientFundsError
@@ -681,6 +688,107 @@ class CryptoAPIError(CryptoServiceError):
         )
 
 
+# =============================================================================
+# Bot Process Exceptions
+# =============================================================================
+
+class BotProcessError(ChartSenseError):
+    """
+    Raised when a request to the out-of-process trading bot fails.
+
+    Attributes:
+        remote_type: Exception type raised inside the bot process (if any)
+    """
+
+    def __init__(
+        self,
+        message: str,
+        error_code: Optional[str] = None,
+        remote_type: Optional[str] = None
+    ):
+        self.remote_type = remote_type
+        super().__init__(
+            message=message,
+            error_code=error_code or "BOT_PROCESS_ERROR",
+            details={"remote_type": remote_type}
+        )
+
+
+class BotProcessUnavailableError(BotProcessError):
+    """
+    Raised when the bot process cannot be reached over IPC.
+
+    Attributes:
+        address: IPC address that was tried
+    """
+
+    def __init__(
+        self,
+        message: str = "Trading bot process is not reachable",
+        address: Optional[str] = None
+    ):
+        self.address = address
+        super().__init__(
+            message=message,
+            error_code="BOT_PROCESS_UNAVAILABLE",
+        )
+        self.details["address"] = address
+
+
+# =============================================================================
+# Backtest Exceptions
+# =============================================================================
+
+class BacktestError(ChartSenseError):
+    """
+    Base exception for backtest job errors.
+
+    Attributes:
+        job_id: Backtest job involved (if any)
+    """
+
+    def __init__(
+        self,
+        message: str,
+        error_code: Optional[str] = None,
+        job_id: Optional[str] = None
+    ):
+        self.job_id = job_id
+        super().__init__(
+            message=message,
+            error_code=error_code or "BACKTEST_ERROR",
+            details={"job_id": job_id}
+        )
+
+
+class BacktestCancelledError(BacktestError):
+    """Raised inside a running backtest when its job has been cancelled."""
+
+    def __init__(self, message: str = "Backtest cancelled", job_id: Optional[str] = None):
+        super().__init__(
+            message=message,
+            error_code="BACKTEST_CANCELLED",
+            job_id=job_id
+        )
+
+
+class BacktestJobLimitError(BacktestError):
+    """
+    Raised when a backtest job is rejected by a concurrency cap.
+
+    Attributes:
+        limit: The cap that was hit
+    """
+
+    def __init__(self, message: str, limit: Optional[int] = None):
+        self.limit = limit
+        super().__init__(
+            message=message,
+            error_code="BACKTEST_JOB_LIMIT",
+        )
+        self.details["limit"] = limit
+
+
 # =============================================================================
 # Utility Functions
 # =============================================================================
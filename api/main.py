@@ -3,6 +3,7 @@ ChartSense API - FastAPI Backend
 Technical analysis stock trading app with automated trading bot
 Updated: 2026-01-28 - Fixed backtesting indicator bounds issue
 """
+import asyncio
 import os
 from contextlib import asynccontextmanager
 from dotenv import load_dotenv
@@ -18,6 +19,9 @@ from routes import bot, positions, performance, settings
 from routes import ai, watchlist_bot
 from routes import crypto, advanced, notifications, backtest
 from database.connection import init_db
+from services.backtest_jobs import get_backtest_job_manager, peek_backtest_job_manager
+from services.bot_ipc import is_external_bot_mode
+from services.trading_bot import get_trading_bot
 
 # Configure structured logging with correlation IDs
 from services.logging_config import (
@@ -38,9 +42,15 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Initializing database...")
     init_db()
+    interrupted = get_backtest_job_manager().recover_interrupted_jobs()
+    if interrupted:
+        logger.warning(f"Marked {interrupted} interrupted backtest job(s) as failed")
     logger.info("ChartSense API starting up")
     yield
     # Shutdown
+    job_manager = peek_backtest_job_manager()
+    if job_manager:
+        await job_manager.shutdown()
     logger.info("ChartSense API shutting down")
 
 
@@ -119,7 +129,12 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    health = {"status": "healthy"}
+    if is_external_bot_mode():
+        # Bot runs in its own process (bot_process.py) - report whether it's reachable
+        bot_proxy = get_trading_bot()
+        health["bot_process"] = "reachable" if await asyncio.to_thread(bot_proxy.ping) else "unreachable"
+    return health
 
 
 if __name__ == "__main__":
@@ -16,6 +16,27 @@ class BacktestRequest(BaseModel):
     strategy: str = Field(default="simple_rsi", description="Strategy to use")
     strategy_params: Dict[str, Any] = Field(default_factory=dict, description="Strategy parameters")
     position_size_pct: float = Field(default=10.0, description="Position size as % of portfolio")
+    vectorized: bool = Field(default=False, description="Use the vectorized simulator when the strategy supports it")
+    use_cache: bool = Field(default=True, description="Serve/extend identical earlier runs from the result cache")
+    timeframe: str = Field(default="1Day", description="Bar timeframe: '1Day' or '1Min' (intraday, streamed)")
+    trading_mode: str = Field(default="intraday", description="Session rules for 1Min runs: scalp, intraday or swing")
+    allow_extended_hours: bool = Field(default=False, description="1Min runs also trade pre-market and after-hours")
+
+
+class WalkForwardRequest(BaseModel):
+    """Request body for a walk-forward optimization job."""
+    symbol: str = Field(..., description="Symbol to optimize on (daily bars)")
+    start_date: date = Field(..., description="First bar date")
+    end_date: date = Field(..., description="Last bar date")
+    strategy: str = Field(default="rsi", pattern="^(rsi|macd)$", description="Signal function: rsi or macd")
+    param_ranges: Optional[Dict[str, List[Any]]] = Field(default=None, description="Parameter values to search (default: the backtester's ranges)")
+    num_windows: int = Field(default=5, ge=1, le=50, description="Rolling train/test windows")
+    train_pct: float = Field(default=0.7, gt=0, lt=1, description="Share of each window used for training")
+    initial_capital: float = Field(default=10000, gt=0, description="Starting capital per backtest")
+    search: Optional[str] = Field(default=None, description="Search per window: grid, random, successive_halving or tpe (default: grid)")
+    max_evaluations: Optional[float] = Field(default=None, gt=0, description="Evaluation budget for the whole run")
+    workers: int = Field(default=1, ge=1, le=32, description="Processes to run windows on")
+    seed: Optional[int] = Field(default=None, description="Slippage noise seed (reproduces the run)")
 
 
 class Signal(BaseModel):
@@ -92,10 +113,83 @@ class BacktestResult(BaseModel):
     metrics: PerformanceMetricsResult
     equity_curve: List[EquityPoint]
     trades: List[SimulatedTrade]
+    equity_points_total: Optional[int] = Field(default=None, description="Full equity curve length when equity_curve is downsampled")
+    trades_total: Optional[int] = Field(default=None, description="Total trades when trades is one page")
 
     # Timing
     run_time_seconds: float
     bars_processed: int
+    cache_status: Optional[str] = Field(default=None, description="'hit' or 'extended' when served from the result cache")
+
+
+class StrategyVariant(BaseModel):
+    """One strategy configuration in a multi-strategy backtest."""
+    name: Optional[str] = Field(default=None, description="Label in the comparison (default: strategy name, numbered if repeated)")
+    strategy: str = Field(..., description="Strategy to use")
+    strategy_params: Dict[str, Any] = Field(default_factory=dict, description="Strategy parameters")
+
+
+class MultiBacktestRequest(BaseModel):
+    """Request body for running several strategy variants over the same data in one pass."""
+    symbols: List[str] = Field(..., description="List of symbols to backtest")
+    start_date: date = Field(..., description="Backtest start date")
+    end_date: date = Field(..., description="Backtest end date")
+    initial_capital: float = Field(default=100000, description="Starting capital for each variant")
+    position_size_pct: float = Field(default=10.0, description="Position size as % of portfolio")
+    variants: List[StrategyVariant] = Field(..., min_length=1, description="Strategy variants to compare")
+
+
+class VariantComparison(BaseModel):
+    """One row of a multi-strategy comparison table."""
+    name: str
+    strategy: str
+    strategy_params: Dict[str, Any]
+    final_equity: float
+    total_return_pct: float
+    annualized_return_pct: float
+    sharpe_ratio: float
+    sortino_ratio: float
+    max_drawdown_pct: float
+    win_rate: float
+    profit_factor: float
+    total_trades: int
+
+    @classmethod
+    def from_result(cls, name: str, result: "BacktestResult") -> "VariantComparison":
+        metrics = result.metrics
+        return cls(
+            name=name,
+            strategy=result.strategy,
+            strategy_params=result.strategy_params,
+            final_equity=result.final_equity,
+            total_return_pct=metrics.total_return_pct,
+            annualized_return_pct=metrics.annualized_return_pct,
+            sharpe_ratio=metrics.sharpe_ratio,
+            sortino_ratio=metrics.sortino_ratio,
+            max_drawdown_pct=metrics.max_drawdown_pct,
+            win_rate=metrics.win_rate,
+            profit_factor=metrics.profit_factor,
+            total_trades=metrics.total_trades,
+        )
+
+
+class MultiBacktestResult(BaseModel):
+    """Results of a multi-strategy backtest."""
+    symbols: List[str]
+    start_date: date
+    end_date: date
+    initial_capital: float
+
+    # Results
+    comparison: List[VariantComparison]
+    best_variant: Optional[str] = Field(default=None, description="Variant with the highest Sharpe ratio")
+    results: Dict[str, BacktestResult]
+
+    # Timing
+    run_time_seconds: float
+    bars_processed: int
+    indicators_computed: int = 0
+    indicators_reused: int = Field(default=0, description="Indicator values shared between variants instead of recomputed")
 
 
 class StrategyInfo(BaseModel):
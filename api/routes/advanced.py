@@ -2,7 +2,7 @@
 Advanced Analysis API Routes
 Multi-timeframe, patterns, sentiment, calendar, backtesting
 """
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 from typing import Optional, List
 from pydantic import BaseModel
 
@@ -10,7 +10,9 @@ from services.multi_timeframe import get_multi_timeframe_service
 from services.pattern_recognition import get_pattern_service
 from services.sentiment_analysis import get_sentiment_service
 from services.calendar_service import get_calendar_service
-from services.backtester import get_backtest_engine, StrategyType
+from services.backtester import run_symbol_backtest, backtest_summary
+from services.backtest_jobs import client_id_for, get_backtest_job_manager
+from exceptions import BacktestJobLimitError
 from services.alpha_vantage import AlphaVantageService
 from services.alpaca_service import get_alpaca_service
 import logging
@@ -439,93 +441,59 @@ async def run_backtest(request: BacktestRequest):
     - Profit factor
     - Max drawdown
     - Sharpe ratio
+
+    For long runs use POST /backtest/jobs, which returns a job id instead
+    of holding the request open.
     """
     import logging
     logger = logging.getLogger(__name__)
 
     logger.info(f"[BACKTEST] Starting backtest for {request.symbol} with strategy {request.strategy}")
 
-    alpaca_service = get_alpaca_service()
-    backtest_engine = get_backtest_engine()
-
-    # Map strategy string to enum
-    strategy_map = {
-        "rsi_oversold": StrategyType.RSI_OVERSOLD,
-        "macd_crossover": StrategyType.MACD_CROSSOVER,
-        "golden_cross": StrategyType.GOLDEN_CROSS,
-        "bollinger_bounce": StrategyType.BOLLINGER_BOUNCE,
-        "momentum": StrategyType.MOMENTUM,
-        "mean_reversion": StrategyType.MEAN_REVERSION,
-    }
-
-    strategy = strategy_map.get(request.strategy.lower())
-    if not strategy:
-        raise HTTPException(status_code=400, detail=f"Unknown strategy: {request.strategy}")
-
-    # Get historical data from Alpaca (more reliable, unlimited requests)
     try:
-        logger.info(f"[BACKTEST] Fetching bars for {request.symbol}")
-        bars = await alpaca_service.get_bars(request.symbol.upper(), "1Day", 500)
-        logger.info(f"[BACKTEST] Got {len(bars) if bars else 0} bars")
+        result = await run_symbol_backtest(
+            get_alpaca_service(),
+            symbol=request.symbol,
+            strategy_name=request.strategy,
+            initial_capital=request.initial_capital,
+            position_size_pct=request.position_size_pct,
+            stop_loss_pct=request.stop_loss_pct,
+            take_profit_pct=request.take_profit_pct,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        logger.error(f"[BACKTEST] Error fetching bars: {type(e).__name__}: {e}")
+        logger.error(f"[BACKTEST] Error fetching data: {type(e).__name__}: {e}")
         raise HTTPException(status_code=500, detail=f"Error fetching data: {str(e)}")
 
-    if not bars:
-        raise HTTPException(status_code=404, detail=f"No data found for {request.symbol}")
-
-    # Need at least 200 bars for proper backtesting
-    if len(bars) < 200:
-        raise HTTPException(status_code=400, detail=f"Insufficient historical data (got {len(bars)}, need 200+ bars)")
-
-    # Extract OHLCV data (bars are sorted oldest to newest)
-    opens = [bar["open"] for bar in bars]
-    highs = [bar["high"] for bar in bars]
-    lows = [bar["low"] for bar in bars]
-    closes = [bar["close"] for bar in bars]
-    volumes = [bar["volume"] for bar in bars]
-    dates = [bar["timestamp"].split("T")[0] if isinstance(bar["timestamp"], str) else bar["timestamp"].strftime("%Y-%m-%d") for bar in bars]
-
-    # Run backtest
-    result = backtest_engine.run_backtest(
-        symbol=request.symbol.upper(),
-        strategy=strategy,
-        opens=opens,
-        highs=highs,
-        lows=lows,
-        closes=closes,
-        volumes=volumes,
-        dates=dates,
-        initial_capital=request.initial_capital,
-        position_size_pct=request.position_size_pct,
-        stop_loss_pct=request.stop_loss_pct,
-        take_profit_pct=request.take_profit_pct,
-    )
-
-    # Convert to dict (excluding trades list for brevity)
-    return {
-        "strategy": result.strategy,
-        "symbol": result.symbol,
-        "start_date": result.start_date,
-        "end_date": result.end_date,
-        "initial_capital": result.initial_capital,
-        "final_capital": result.final_capital,
-        "total_return": result.total_return,
-        "total_return_pct": result.total_return_pct,
-        "total_trades": result.total_trades,
-        "winning_trades": result.winning_trades,
-        "losing_trades": result.losing_trades,
-        "win_rate": result.win_rate,
-        "profit_factor": result.profit_factor,
-        "max_drawdown": result.max_drawdown,
-        "max_drawdown_pct": result.max_drawdown_pct,
-        "sharpe_ratio": result.sharpe_ratio,
-        "avg_trade_pnl": result.avg_trade_pnl,
-        "avg_win": result.avg_win,
-        "avg_loss": result.avg_loss,
-        "largest_win": result.largest_win,
-        "largest_loss": result.largest_loss,
+    # Trades list excluded for brevity
+    return backtest_summary(result)
+
+
+@router.post("/backtest/jobs", status_code=202)
+async def submit_backtest_job(request: BacktestRequest, http_request: Request):
+    """
+    Queue a backtest as a background job and return its job id.
+
+    Track it with the /api/backtest/jobs/{job_id} endpoints.
+    """
+    payload = {
+        "symbol": request.symbol,
+        "strategy_name": request.strategy,
+        "initial_capital": request.initial_capital,
+        "position_size_pct": request.position_size_pct,
+        "stop_loss_pct": request.stop_loss_pct,
+        "take_profit_pct": request.take_profit_pct,
     }
+    try:
+        job = await get_backtest_job_manager().submit(
+            "symbol_backtest", payload, client_id=client_id_for(http_request)
+        )
+    except BacktestJobLimitError as e:
+        raise HTTPException(status_code=429, detail=e.message)
+    return {"job_id": job.job_id, "status": job.status.value}
 
 
 # ==================== Risk Analysis ====================
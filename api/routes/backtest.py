@@ -4,16 +4,27 @@ API routes for backtesting.
 Provides endpoints to run backtests and view results.
 """
 
+import asyncio
+import json
 import logging
-from typing import List
-from fastapi import APIRouter, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
+
+from exceptions import BacktestJobLimitError
 
 from models.backtest import (
     BacktestRequest,
     BacktestResult,
+    MultiBacktestRequest,
+    MultiBacktestResult,
     StrategyInfo,
+    WalkForwardRequest,
 )
-from services.backtesting.engine import run_backtest
+from services.backtesting.engine import run_backtest, run_multi_backtest
+from services.backtesting.result_cache import get_backtest_result_cache
+from services.backtest_jobs import client_id_for, get_backtest_job_manager
+from services.chart_data import MIN_POINTS, DownsampleMethod, paginate, shape_backtest_result, to_csv, to_npy
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +32,13 @@ router = APIRouter(prefix="/api/backtest", tags=["backtest"])
 
 
 @router.post("/run", response_model=BacktestResult)
-async def run_backtest_endpoint(request: BacktestRequest):
+async def run_backtest_endpoint(
+    request: BacktestRequest,
+    max_points: Optional[int] = Query(None, ge=MIN_POINTS, description="Downsample the equity curve to at most this many points"),
+    method: DownsampleMethod = Query(DownsampleMethod.LTTB, description="Downsampling method: lttb or minmax"),
+    trades_page: Optional[int] = Query(None, ge=1, description="Return one page of trades instead of all"),
+    trades_page_size: int = Query(50, ge=1, le=1000),
+):
     """
     Run a backtest with the specified configuration.
 
@@ -41,12 +58,20 @@ async def run_backtest_endpoint(request: BacktestRequest):
         "position_size_pct": 10.0
     }
     ```
+
+    Pass max_points and/or trades_page to get a chart-sized equity curve
+    and one page of trades; for the full-resolution data submit a job and
+    use GET /jobs/{job_id}/export.
     """
     try:
         logger.info(f"Starting backtest: {request.strategy} on {len(request.symbols)} symbols")
         result = await run_backtest(request)
         logger.info(f"Backtest complete: {result.metrics.total_return_pct:.1f}% return")
-        return result
+        if max_points is None and trades_page is None:
+            return result
+        return shape_backtest_result(
+            result.model_dump(mode="json"), max_points, method, trades_page, trades_page_size
+        )
 
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -55,6 +80,206 @@ async def run_backtest_endpoint(request: BacktestRequest):
         raise HTTPException(status_code=500, detail=f"Backtest failed: {str(e)}")
 
 
+@router.post("/compare", response_model=MultiBacktestResult)
+async def compare_strategies_endpoint(request: MultiBacktestRequest):
+    """
+    Run several strategy/parameter variants side by side over the same data.
+
+    Bars are loaded once and simulated in one pass; each variant trades its
+    own portfolio. Returns a comparison table and each variant's full result.
+
+    Example request:
+    ```json
+    {
+        "symbols": ["AAPL", "MSFT"],
+        "start_date": "2023-01-01",
+        "end_date": "2024-01-01",
+        "variants": [
+            {"strategy": "simple_rsi", "strategy_params": {"oversold": 25, "overbought": 75}},
+            {"strategy": "simple_rsi", "strategy_params": {"oversold": 30, "overbought": 70}},
+            {"strategy": "macd_crossover"},
+            {"name": "bot_default", "strategy": "weighted_score"}
+        ]
+    }
+    ```
+    """
+    try:
+        logger.info(f"Starting strategy comparison: {len(request.variants)} variants on {len(request.symbols)} symbols")
+        result = await run_multi_backtest(request)
+        logger.info(f"Strategy comparison complete: best variant {result.best_variant}")
+        return result
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Strategy comparison failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Strategy comparison failed: {str(e)}")
+
+
+# ==================== Background Jobs ====================
+
+@router.post("/jobs", status_code=202)
+async def submit_backtest_job(request: BacktestRequest, http_request: Request):
+    """
+    Queue a backtest and return its job id immediately.
+
+    Poll GET /jobs/{job_id} (or stream GET /jobs/{job_id}/events) for
+    progress, then fetch GET /jobs/{job_id}/result.
+    """
+    try:
+        job = await get_backtest_job_manager().submit(
+            "backtest", request.model_dump(mode="json"), client_id=client_id_for(http_request)
+        )
+    except BacktestJobLimitError as e:
+        raise HTTPException(status_code=429, detail=e.message)
+    return {"job_id": job.job_id, "status": job.status.value}
+
+
+@router.post("/walk-forward/jobs", status_code=202)
+async def submit_walk_forward_job(request: WalkForwardRequest, http_request: Request):
+    """
+    Queue a walk-forward optimization and return its job id immediately.
+
+    With workers > 1 the windows run in parallel. GET /jobs/{job_id} (or
+    the /events stream) reports progress_detail with each finished window's
+    in- and out-of-sample Sharpe; GET /jobs/{job_id}/result returns the
+    WalkForwardResult.
+    """
+    try:
+        job = await get_backtest_job_manager().submit(
+            "walk_forward", request.model_dump(mode="json"), client_id=client_id_for(http_request)
+        )
+    except BacktestJobLimitError as e:
+        raise HTTPException(status_code=429, detail=e.message)
+    return {"job_id": job.job_id, "status": job.status.value}
+
+
+@router.get("/jobs")
+async def list_backtest_jobs(http_request: Request):
+    """List this client's backtest jobs, newest first."""
+    return {"jobs": get_backtest_job_manager().list_jobs(client_id=client_id_for(http_request))}
+
+
+@router.get("/jobs/{job_id}")
+async def get_backtest_job(job_id: str):
+    """Get a job's status, progress percentage and ETA."""
+    job = await get_backtest_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Backtest job {job_id} not found")
+    return job
+
+
+@router.get("/jobs/{job_id}/result")
+async def get_backtest_job_result(
+    job_id: str,
+    max_points: Optional[int] = Query(None, ge=MIN_POINTS, description="Downsample the equity curve to at most this many points"),
+    method: DownsampleMethod = Query(DownsampleMethod.LTTB, description="Downsampling method: lttb or minmax"),
+    trades_page: Optional[int] = Query(None, ge=1, description="Return one page of trades instead of all"),
+    trades_page_size: int = Query(50, ge=1, le=1000),
+):
+    """Get the result of a completed job (optionally downsampled / one trades page)."""
+    result = await _completed_job_result(job_id)
+    return shape_backtest_result(result, max_points, method, trades_page, trades_page_size)
+
+
+@router.get("/jobs/{job_id}/trades")
+async def get_backtest_job_trades(
+    job_id: str,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=1000),
+):
+    """Page through a completed job's trades."""
+    result = await _completed_job_result(job_id)
+    if "trades" not in result:
+        raise HTTPException(status_code=404, detail="This job's result has no trade list")
+    return paginate(result["trades"], page, page_size)
+
+
+@router.get("/jobs/{job_id}/export")
+async def export_backtest_job(
+    job_id: str,
+    data: str = Query("equity", pattern="^(equity|trades)$", description="equity or trades"),
+    file_format: str = Query("csv", alias="format", pattern="^(csv|npy)$", description="csv, or npy (equity only)"),
+):
+    """
+    Download a completed job's full-resolution equity curve or trades.
+
+    npy is a NumPy structured array (timestamp as datetime64[ms] UTC, then
+    equity, cash, positions_value) - load with np.load, no pickle needed.
+    """
+    result = await _completed_job_result(job_id)
+    rows = result.get("equity_curve" if data == "equity" else "trades")
+    if rows is None:
+        raise HTTPException(status_code=404, detail=f"This job's result has no {data} data")
+
+    filename = f"backtest_{job_id}_{data}.{file_format}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    if file_format == "csv":
+        return Response(content=to_csv(rows), media_type="text/csv", headers=headers)
+    if data != "equity":
+        raise HTTPException(status_code=400, detail="npy export is only available for the equity curve")
+    content = to_npy(rows, ["equity", "cash", "positions_value"])
+    return Response(content=content, media_type="application/octet-stream", headers=headers)
+
+
+async def _completed_job_result(job_id: str):
+    manager = get_backtest_job_manager()
+    job = await manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Backtest job {job_id} not found")
+    if job["status"] != "COMPLETED":
+        raise HTTPException(status_code=409, detail=f"Backtest job is {job['status']}")
+    return await manager.get_result(job_id)
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_backtest_job(job_id: str):
+    """Stream job status updates as server-sent events until the job finishes."""
+    manager = get_backtest_job_manager()
+    if await manager.get(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Backtest job {job_id} not found")
+
+    async def events():
+        last = None
+        while True:
+            job = await manager.get(job_id)
+            if job is None:
+                return
+            if job != last:
+                yield f"data: {json.dumps(job)}\n\n"
+                last = job
+            if job["status"] in ("COMPLETED", "FAILED", "CANCELLED"):
+                return
+            await asyncio.sleep(1.0)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@router.delete("/jobs/{job_id}")
+async def cancel_backtest_job(job_id: str):
+    """Cancel a queued or running job (on this or another API worker)."""
+    job = await get_backtest_job_manager().cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Backtest job {job_id} not found")
+    return job
+
+
+# ==================== Result Cache ====================
+
+@router.get("/cache")
+async def backtest_cache_status():
+    """Result cache size, hit/miss counts and code version."""
+    return get_backtest_result_cache().get_status()
+
+
+@router.delete("/cache")
+async def clear_backtest_cache():
+    """Delete every cached backtest result."""
+    cache = get_backtest_result_cache()
+    cache.clear()
+    return cache.get_status()
+
+
 @router.get("/strategies", response_model=List[StrategyInfo])
 async def list_strategies():
     """
@@ -83,6 +308,17 @@ async def list_strategies():
                 "signal_period": 9,
             }
         ),
+        StrategyInfo(
+            id="weighted_score",
+            name="Weighted Score (StrategyEngine)",
+            description="The trading bot's weighted indicator scoring. Buy when the score reaches the entry threshold, "
+                        "exit on stop-loss, profit target, reversal or time stop.",
+            default_params={
+                "entry_threshold": 70.0,
+                "weights": None,
+                "lookback": 200,
+            }
+        ),
     ]
 
 
@@ -23,14 +23,17 @@ from models.bot import (
     AIDecisionResult,
 )
 from services.trading_bot import get_trading_bot
+from services.bot_ipc import offload_bot_io, run_bot_io
 from services.performance_tracker import PerformanceTracker
+from services.chart_data import MIN_POINTS, DownsampleMethod, downsample
 from services.alpaca_service import get_alpaca_service
 
 router = APIRouter()
 
 
 @router.get("/status", response_model=BotStatusResponse)
-async def get_bot_status():
+@offload_bot_io
+def get_bot_status():
     """
     Get current trading bot status.
 
@@ -171,7 +174,8 @@ async def get_bot_status():
 
 
 @router.post("/start", response_model=BotActionResponse)
-async def start_bot(
+@offload_bot_io
+def start_bot(
     background_tasks: BackgroundTasks,
     request: Optional[BotStartRequest] = None
 ):
@@ -209,7 +213,8 @@ async def start_bot(
 
 
 @router.post("/stop", response_model=BotActionResponse)
-async def stop_bot(background_tasks: BackgroundTasks):
+@offload_bot_io
+def stop_bot(background_tasks: BackgroundTasks):
     """
     Stop the trading bot.
 
@@ -235,7 +240,8 @@ async def stop_bot(background_tasks: BackgroundTasks):
 
 
 @router.post("/pause", response_model=BotActionResponse)
-async def pause_bot(background_tasks: BackgroundTasks):
+@offload_bot_io
+def pause_bot(background_tasks: BackgroundTasks):
     """
     Pause the trading bot.
 
@@ -260,7 +266,8 @@ async def pause_bot(background_tasks: BackgroundTasks):
 
 
 @router.post("/resume", response_model=BotActionResponse)
-async def resume_bot(background_tasks: BackgroundTasks):
+@offload_bot_io
+def resume_bot(background_tasks: BackgroundTasks):
     """
     Resume the trading bot from paused state.
     """
@@ -288,15 +295,16 @@ async def bot_health():
     Check bot health and connectivity.
     """
     bot = get_trading_bot()
+    bot_state = await run_bot_io(lambda: bot.state.value)
 
     try:
         # Try to get account info
-        account = await bot.alpaca.get_account()
-        market_open = await bot.alpaca.is_market_open()
+        account = await run_bot_io(lambda: bot.alpaca.get_account())
+        market_open = await run_bot_io(lambda: bot.alpaca.is_market_open())
 
         return {
             "status": "healthy",
-            "bot_state": bot.state.value,
+            "bot_state": bot_state,
             "alpaca_connected": True,
             "market_open": market_open,
             "account_equity": account["equity"],
@@ -305,14 +313,15 @@ async def bot_health():
     except Exception as e:
         return {
             "status": "unhealthy",
-            "bot_state": bot.state.value,
+            "bot_state": bot_state,
             "alpaca_connected": False,
             "error": str(e),
         }
 
 
 @router.get("/execution-log")
-async def get_execution_log(symbol: str = None, limit: int = 20):
+@offload_bot_io
+def get_execution_log(symbol: str = None, limit: int = 20):
     """
     Get execution log for debugging paper trade failures.
 
@@ -326,7 +335,8 @@ async def get_execution_log(symbol: str = None, limit: int = 20):
 
 
 @router.get("/strong-buy-trace")
-async def get_strong_buy_trace(limit: int = 5):
+@offload_bot_io
+def get_strong_buy_trace(limit: int = 5):
     """
     Get trace of last N 'Strong Buy' signals to diagnose execution failures.
 
@@ -351,7 +361,8 @@ async def get_strong_buy_trace(limit: int = 5):
 
 
 @router.post("/pause-entries")
-async def toggle_pause_entries():
+@offload_bot_io
+def toggle_pause_entries():
     """
     Toggle pause on new position entries.
 
@@ -368,7 +379,8 @@ async def toggle_pause_entries():
 
 
 @router.post("/strategy-override")
-async def set_strategy_override(strategy: str = None):
+@offload_bot_io
+def set_strategy_override(strategy: str = None):
     """
     Override the trading strategy.
 
@@ -398,7 +410,8 @@ async def set_strategy_override(strategy: str = None):
 
 
 @router.post("/auto-trade")
-async def toggle_auto_trade(enabled: bool = None):
+@offload_bot_io
+def toggle_auto_trade(enabled: bool = None):
     """
     Enable or disable automatic trade execution.
 
@@ -444,7 +457,8 @@ async def toggle_auto_trade(enabled: bool = None):
 
 
 @router.get("/auto-trade")
-async def get_auto_trade_status():
+@offload_bot_io
+def get_auto_trade_status():
     """
     Get current auto-trade mode status.
     """
@@ -467,23 +481,26 @@ async def emergency_close_all():
     bot = get_trading_bot()
 
     try:
-        positions = await bot.alpaca.get_positions()
+        positions = await run_bot_io(lambda: bot.alpaca.get_positions())
         closed_count = 0
 
         for pos in positions:
             symbol = pos.get("symbol")
+            details = {"quantity": pos.get("qty"), "price": pos.get("current_price")}
             try:
-                await bot.alpaca.close_position(symbol)
+                await run_bot_io(lambda position: bot.alpaca.close_position(position), symbol)
                 closed_count += 1
-                bot._log_execution_event(
+                await run_bot_io(
+                    lambda **event: bot._log_execution_event(**event),
                     symbol=symbol,
                     event_type="EMERGENCY_CLOSE",
                     executed=True,
                     reason="Emergency close all triggered by user",
-                    details={"quantity": pos.get("qty"), "price": pos.get("current_price")}
+                    details=details,
                 )
             except Exception as e:
-                bot._log_execution_event(
+                await run_bot_io(
+                    lambda **event: bot._log_execution_event(**event),
                     symbol=symbol,
                     event_type="EMERGENCY_CLOSE_FAILED",
                     executed=False,
@@ -500,7 +517,8 @@ async def emergency_close_all():
 
 
 @router.get("/priority-tiers")
-async def get_priority_tiers():
+@offload_bot_io
+def get_priority_tiers():
     """
     Get current priority tier distribution for symbols.
 
@@ -514,7 +532,8 @@ async def get_priority_tiers():
 
 
 @router.post("/asset-class-mode")
-async def set_asset_class_mode(mode: str):
+@offload_bot_io
+def set_asset_class_mode(mode: str):
     """
     Set the asset class mode for hybrid scanning.
 
@@ -553,7 +572,8 @@ async def set_asset_class_mode(mode: str):
 
 
 @router.get("/scan-progress")
-async def get_scan_progress():
+@offload_bot_io
+def get_scan_progress():
     """
     Get current scan progress for both stocks and crypto.
 
@@ -573,7 +593,8 @@ async def get_scan_progress():
 
 
 @router.get("/activity")
-async def get_bot_activity():
+@offload_bot_io
+def get_bot_activity():
     """
     Get recent bot activity log.
 
@@ -818,7 +839,8 @@ async def run_diagnostic():
 
 
 @router.get("/execution-errors")
-async def get_execution_errors():
+@offload_bot_io
+def get_execution_errors():
     """
     Get detailed execution error summary from the ExecutionLogger.
 
@@ -966,7 +988,11 @@ async def get_performance_metrics(period: str = Query("1M")):
 
 
 @router.get("/performance/equity-curve")
-async def get_equity_curve(period: str = Query("1M")):
+async def get_equity_curve(
+    period: str = Query("1M"),
+    max_points: Optional[int] = Query(None, ge=MIN_POINTS),
+    method: DownsampleMethod = Query(DownsampleMethod.LTTB),
+):
     """
     Get equity curve data for charting.
 
@@ -974,6 +1000,7 @@ async def get_equity_curve(period: str = Query("1M")):
 
     Args:
         period: Time period - '1D', '1W', '1M', '3M', 'ALL'
+        max_points: Downsample to at most this many points (lttb or minmax)
 
     Returns list of equity points for drawing the portfolio equity curve.
     """
@@ -1004,7 +1031,7 @@ async def get_equity_curve(period: str = Query("1M")):
 
     # Format data for frontend
     data = []
-    for point in curve_data:
+    for point in downsample(curve_data, lambda p: p["cumulative_pnl"], max_points, method):
         equity_value = starting_equity + point["cumulative_pnl"]
         data.append({
             "date": point["date"],
@@ -1042,7 +1069,8 @@ async def get_performance_summary():
 # ===== HIERARCHICAL TRADING STRATEGY ENDPOINTS =====
 
 @router.get("/hierarchical/status")
-async def get_hierarchical_status():
+@offload_bot_io
+def get_hierarchical_status():
     """
     Get the current status of the hierarchical trading strategy.
 
@@ -1066,7 +1094,8 @@ async def get_hierarchical_status():
 
 
 @router.post("/hierarchical/toggle")
-async def toggle_hierarchical_mode(enabled: bool = Query(..., description="Enable or disable hierarchical mode")):
+@offload_bot_io
+def toggle_hierarchical_mode(enabled: bool = Query(..., description="Enable or disable hierarchical mode")):
     """
     Enable or disable the hierarchical trading mode.
 
@@ -1091,7 +1120,8 @@ async def toggle_hierarchical_mode(enabled: bool = Query(..., description="Enabl
 
 
 @router.post("/hierarchical/set-daily-target")
-async def set_daily_target(target_pct: float = Query(..., ge=0.1, le=5.0, description="Daily profit target percentage")):
+@offload_bot_io
+def set_daily_target(target_pct: float = Query(..., ge=0.1, le=5.0, description="Daily profit target percentage")):
     """
     Set the daily profit target for the hierarchical strategy.
 
@@ -1118,7 +1148,8 @@ async def set_daily_target(target_pct: float = Query(..., ge=0.1, le=5.0, descri
 
 
 @router.get("/hierarchical/opportunities")
-async def get_hierarchical_opportunities():
+@offload_bot_io
+def get_hierarchical_opportunities():
     """
     Get all current trading opportunities from the hierarchical scanner.
 
@@ -1182,7 +1213,8 @@ async def get_hierarchical_opportunities():
 
 
 @router.post("/hierarchical/force-horizon")
-async def force_trading_horizon(
+@offload_bot_io
+def force_trading_horizon(
     horizon: str = Query(..., description="Force a specific horizon: SWING, INTRADAY, or SCALP")
 ):
     """
@@ -1213,12 +1245,8 @@ async def force_trading_horizon(
         "SCALP": TradingHorizon.SCALP,
     }
 
-    bot.current_trading_horizon = horizon_map[horizon_upper]
-
-    # Reset exhausted flags except for the forced horizon
-    if bot.smart_scanner:
-        for h in TradingHorizon:
-            bot.smart_scanner.strategy.horizon_exhausted[h] = h != horizon_map[horizon_upper]
+    # Through a bot method, so it also reaches a bot running in its own process
+    bot.force_trading_horizon(horizon_map[horizon_upper])
 
     return {
         "success": True,
@@ -1228,7 +1256,8 @@ async def force_trading_horizon(
 
 
 @router.get("/hierarchical/daily-goal")
-async def get_daily_goal_progress():
+@offload_bot_io
+def get_daily_goal_progress():
     """
     Get detailed progress toward the daily profit goal.
 
@@ -1293,17 +1322,18 @@ async def execute_opportunity(
     Endpoint: POST /api/bot/execute-opportunity?symbol=AMD&signal=BUY&confidence=85
     """
     bot = get_trading_bot()
+    bot_state, entries_paused = await run_bot_io(lambda: (bot.state.value, bot.new_entries_paused))
 
     # Check if bot is running
-    if bot.state.value != "RUNNING":
+    if bot_state != "RUNNING":
         return {
             "success": False,
             "error": "Bot must be running to execute trades. Start the bot first.",
-            "bot_state": bot.state.value,
+            "bot_state": bot_state,
         }
 
     # Check if entries are paused
-    if bot.new_entries_paused:
+    if entries_paused:
         return {
             "success": False,
             "error": "New entries are paused. Resume entries first.",
@@ -1314,7 +1344,7 @@ async def execute_opportunity(
 
     try:
         # Get account info
-        account = await bot.alpaca.get_account()
+        account = await run_bot_io(lambda: bot.alpaca.get_account())
         buying_power = float(account.get("buying_power", 0))
 
         if buying_power < 100:
@@ -1337,7 +1367,7 @@ async def execute_opportunity(
                 current_price = 0
         else:
             # Use alpaca for stocks
-            quote = await bot.alpaca.get_quote(symbol)
+            quote = await run_bot_io(lambda: bot.alpaca.get_quote(symbol))
             current_price = quote.get("price", 0)
 
         if current_price <= 0:
@@ -1377,15 +1407,15 @@ async def execute_opportunity(
                     order_type="market",
                 )
             else:
-                result = await bot.alpaca.submit_market_order(
+                result = await run_bot_io(lambda: bot.alpaca.submit_market_order(
                     symbol=symbol,
                     quantity=quantity,
                     side="buy",
                     time_in_force="day",
-                )
+                ))
 
             # Log the execution
-            bot._log_execution_event(
+            await run_bot_io(lambda: bot._log_execution_event(
                 symbol=symbol,
                 event_type="OPPORTUNITY_EXECUTED",
                 executed=True,
@@ -1397,7 +1427,7 @@ async def execute_opportunity(
                     "signal": signal,
                     "order_id": result.get("id"),
                 }
-            )
+            ))
 
             return {
                 "success": True,
@@ -1419,17 +1449,18 @@ async def execute_opportunity(
 
     except Exception as e:
         # Log the failure
-        bot._log_execution_event(
+        error = str(e)
+        await run_bot_io(lambda: bot._log_execution_event(
             symbol=symbol,
             event_type="OPPORTUNITY_FAILED",
             executed=False,
-            reason=str(e),
+            reason=error,
             details={"signal": signal, "confidence": confidence}
-        )
+        ))
 
         return {
             "success": False,
-            "error": str(e),
+            "error": error,
         }
 
 
@@ -1458,59 +1489,65 @@ async def auto_trade_opportunities(
     Endpoint: POST /api/bot/auto-trade-opportunities?max_trades=3&min_confidence=80
     """
     bot = get_trading_bot()
+    bot_state, auto_trade_mode = await run_bot_io(lambda: (bot.state.value, bot.auto_trade_mode))
 
     # Check if bot is running
-    if bot.state.value != "RUNNING":
+    if bot_state != "RUNNING":
         return {
             "success": False,
             "error": "Bot must be running to execute trades. Start the bot first.",
-            "bot_state": bot.state.value,
+            "bot_state": bot_state,
         }
 
     # Check if auto-trade is enabled
-    if not bot.auto_trade_mode:
+    if not auto_trade_mode:
         return {
             "success": False,
             "error": "Auto-trade mode is disabled. Enable it first or use execute-opportunity for manual trades.",
         }
 
     # Collect all opportunities from various sources
-    opportunities = []
+    def collect_opportunities():
+        opportunities = []
 
-    # 1. From stock analysis results
-    for symbol, result in bot._stock_analysis_results.items():
-        if result.get("signal") == "BUY" and result.get("confidence", 0) >= min_confidence:
-            opportunities.append({
-                "symbol": symbol,
-                "confidence": result.get("confidence", 0),
-                "signal": "BUY",
-                "source": "stock_scanner",
-                "reason": result.get("reason", "Technical analysis"),
-            })
-
-    # 2. From crypto analysis results
-    for symbol, result in bot._crypto_analysis_results.items():
-        if result.get("signal") == "BUY" and result.get("confidence", 0) >= min_confidence:
-            opportunities.append({
-                "symbol": symbol,
-                "confidence": result.get("confidence", 0),
-                "signal": "BUY",
-                "source": "crypto_scanner",
-                "reason": result.get("reason", "Technical analysis"),
-            })
+        # 1. From stock analysis results
+        for symbol, result in bot._stock_analysis_results.items():
+            if result.get("signal") == "BUY" and result.get("confidence", 0) >= min_confidence:
+                opportunities.append({
+                    "symbol": symbol,
+                    "confidence": result.get("confidence", 0),
+                    "signal": "BUY",
+                    "source": "stock_scanner",
+                    "reason": result.get("reason", "Technical analysis"),
+                })
 
-    # 3. From hierarchical opportunities
-    if bot.smart_scanner:
-        for opp in bot.smart_scanner.all_opportunities:
-            if opp.overall_score >= min_confidence and opp.direction == "LONG":
+        # 2. From crypto analysis results
+        for symbol, result in bot._crypto_analysis_results.items():
+            if result.get("signal") == "BUY" and result.get("confidence", 0) >= min_confidence:
                 opportunities.append({
-                    "symbol": opp.symbol,
-                    "confidence": opp.overall_score,
+                    "symbol": symbol,
+                    "confidence": result.get("confidence", 0),
                     "signal": "BUY",
-                    "source": f"hierarchical_{opp.horizon.value}",
-                    "reason": f"{opp.quality.value} opportunity - {', '.join(opp.patterns_detected[:2])}",
+                    "source": "crypto_scanner",
+                    "reason": result.get("reason", "Technical analysis"),
                 })
 
+        # 3. From hierarchical opportunities
+        if bot.smart_scanner:
+            for opp in bot.smart_scanner.all_opportunities:
+                if opp.overall_score >= min_confidence and opp.direction == "LONG":
+                    opportunities.append({
+                        "symbol": opp.symbol,
+                        "confidence": opp.overall_score,
+                        "signal": "BUY",
+                        "source": f"hierarchical_{opp.horizon.value}",
+                        "reason": f"{opp.quality.value} opportunity - {', '.join(opp.patterns_detected[:2])}",
+                    })
+
+        return opportunities
+
+    opportunities = await run_bot_io(collect_opportunities)
+
     # Sort by confidence (highest first)
     opportunities.sort(key=lambda x: x["confidence"], reverse=True)
 
@@ -1538,13 +1575,13 @@ async def auto_trade_opportunities(
     failed = []
 
     for opp in to_execute:
+        symbol = opp["symbol"]
         try:
             # Determine if crypto
-            symbol = opp["symbol"]
             is_crypto = symbol.upper().endswith(('USD', 'USDT', 'USDC')) or '/' in symbol
 
             # Get account info
-            account = await bot.alpaca.get_account()
+            account = await run_bot_io(lambda: bot.alpaca.get_account())
             buying_power = float(account.get("buying_power", 0))
             position_value = buying_power * (position_size_pct / 100)
 
@@ -1557,7 +1594,7 @@ async def auto_trade_opportunities(
                 if current_price is None:
                     current_price = 0
             else:
-                quote = await bot.alpaca.get_quote(symbol)
+                quote = await run_bot_io(lambda quote_symbol: bot.alpaca.get_quote(quote_symbol), symbol)
                 current_price = quote.get("price", 0)
 
             if current_price <= 0:
@@ -1585,7 +1622,8 @@ async def auto_trade_opportunities(
                     order_type="market",
                 )
             else:
-                result = await bot.alpaca.submit_market_order(
+                result = await run_bot_io(
+                    lambda **order: bot.alpaca.submit_market_order(**order),
                     symbol=symbol,
                     quantity=quantity,
                     side="buy",
@@ -1602,7 +1640,8 @@ async def auto_trade_opportunities(
             })
 
             # Log success
-            bot._log_execution_event(
+            await run_bot_io(
+                lambda **event: bot._log_execution_event(**event),
                 symbol=symbol,
                 event_type="AUTO_TRADE_EXECUTED",
                 executed=True,
@@ -1611,9 +1650,10 @@ async def auto_trade_opportunities(
             )
 
         except Exception as e:
-            failed.append({"symbol": opp["symbol"], "error": str(e)})
-            bot._log_execution_event(
-                symbol=opp["symbol"],
+            failed.append({"symbol": symbol, "error": str(e)})
+            await run_bot_io(
+                lambda **event: bot._log_execution_event(**event),
+                symbol=symbol,
                 event_type="AUTO_TRADE_FAILED",
                 executed=False,
                 reason=str(e),
@@ -1641,17 +1681,18 @@ async def get_queued_trades():
     Endpoint: GET /api/bot/queued-trades
     """
     bot = get_trading_bot()
-    queued = getattr(bot, '_queued_trades', [])
+    queued = await run_bot_io(getattr, bot, '_queued_trades', [])
 
     return {
         "queued_trades": queued,
         "count": len(queued),
-        "market_open": await bot.alpaca.is_market_open(),
+        "market_open": await run_bot_io(lambda: bot.alpaca.is_market_open()),
     }
 
 
 @router.post("/queue-trade")
-async def queue_trade_for_open(
+@offload_bot_io
+def queue_trade_for_open(
     symbol: str = Query(..., description="Symbol to queue"),
     signal: str = Query(default="BUY", description="Trade signal"),
     confidence: float = Query(default=70.0, description="Signal confidence"),
@@ -1689,7 +1730,8 @@ async def queue_trade_for_open(
         "queued_at": datetime.now().isoformat(),
         "status": "PENDING",
     }
-    bot._queued_trades.append(trade)
+    # Reassign rather than append so the change also reaches an out-of-process bot
+    bot._queued_trades = bot._queued_trades + [trade]
 
     return {
         "success": True,
@@ -1700,7 +1742,8 @@ async def queue_trade_for_open(
 
 
 @router.delete("/queue-trade/{symbol}")
-async def remove_queued_trade(symbol: str):
+@offload_bot_io
+def remove_queued_trade(symbol: str):
     """
     Remove a trade from the queue.
 
@@ -1798,9 +1841,10 @@ async def rescan_position(symbol: str):
             # Get analysis via the hierarchical strategy
             analysis = {"signal": "NEUTRAL", "confidence": 50, "indicators": {}}
 
-            if bot.smart_scanner:
+            smart_scanner = await run_bot_io(lambda: bot.smart_scanner)
+            if smart_scanner:
                 try:
-                    opp = await bot.smart_scanner.evaluate_symbol(symbol_upper, is_crypto=False)
+                    opp = await run_bot_io(lambda: smart_scanner.evaluate_symbol(symbol_upper, is_crypto=False))
                     if opp:
                         analysis = {
                             "signal": opp.direction,
@@ -1966,7 +2010,8 @@ async def rescan_all_positions():
 # ==================== AUTO-OPTIMIZER ENDPOINTS ====================
 
 @router.get("/optimizer/status")
-async def get_optimizer_status():
+@offload_bot_io
+def get_optimizer_status():
     """
     Get auto-optimizer status.
 
@@ -2004,10 +2049,10 @@ async def run_optimizer_now():
     """
     bot = get_trading_bot()
 
-    if not bot.auto_optimize_enabled:
+    if not await run_bot_io(lambda: bot.auto_optimize_enabled):
         raise HTTPException(status_code=400, detail="Auto-optimizer is disabled")
 
-    result = await bot.auto_optimizer.run_optimization(force=True)
+    result = await run_bot_io(lambda: bot.auto_optimizer.run_optimization(force=True))
 
     if result is None:
         raise HTTPException(status_code=500, detail="Optimization failed")
@@ -2034,21 +2079,27 @@ async def toggle_optimizer(enabled: bool = Query(..., description="Enable or dis
     When enabled, weights will automatically adapt to market conditions.
     """
     bot = get_trading_bot()
-    bot.auto_optimize_enabled = enabled
-    bot.auto_optimizer.enabled = enabled
+
+    def apply():
+        bot.auto_optimize_enabled = enabled
+        bot.auto_optimizer.enabled = enabled
+        return bot.state.value
+
+    bot_state = await run_bot_io(apply)
 
     if enabled:
         # Start background optimization if bot is running
-        if bot.state.value == "RUNNING":
-            await bot.auto_optimizer.start_background_optimization()
+        if bot_state == "RUNNING":
+            await run_bot_io(lambda: bot.auto_optimizer.start_background_optimization())
         return {"enabled": True, "message": "Auto-optimizer enabled - strategy will adapt automatically"}
     else:
-        await bot.auto_optimizer.stop_background_optimization()
+        await run_bot_io(lambda: bot.auto_optimizer.stop_background_optimization())
         return {"enabled": False, "message": "Auto-optimizer disabled - using static weights"}
 
 
 @router.get("/optimizer/weights")
-async def get_current_weights():
+@offload_bot_io
+def get_current_weights():
     """
     Get current strategy weights being used for trading.
 
@@ -3,6 +3,7 @@ Performance API Routes
 Endpoints for viewing trading performance and history
 """
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import Response
 from typing import Optional, List
 from datetime import datetime
 
@@ -20,6 +21,7 @@ from models.bot import (
     OptimizationHistoryResponse,
 )
 from services.performance_tracker import PerformanceTracker, SelfOptimizer
+from services.chart_data import MIN_POINTS, DownsampleMethod, downsample, to_csv, to_npy
 from services.alpaca_service import get_alpaca_service
 from services.post_mortem import PostMortemService
 from database.connection import SessionLocal
@@ -96,7 +98,10 @@ async def get_detailed_metrics(period_days: int = Query(30, ge=1, le=365)):
 
 
 @router.get("/dashboard")
-async def get_performance_dashboard():
+async def get_performance_dashboard(
+    max_points: Optional[int] = Query(None, ge=MIN_POINTS, description="Downsample the equity curve"),
+    method: DownsampleMethod = Query(DownsampleMethod.LTTB),
+):
     """
     Get complete performance dashboard data.
 
@@ -108,11 +113,18 @@ async def get_performance_dashboard():
     - Performance by trade type
     """
     tracker = PerformanceTracker()
-    return tracker.get_dashboard_data()
+    data = tracker.get_dashboard_data()
+    if data.get("equity_curve"):
+        data["equity_curve"] = downsample(data["equity_curve"], lambda p: p["cumulative_pnl"], max_points, method)
+    return data
 
 
 @router.get("/equity-curve", response_model=EquityCurveResponse)
-async def get_equity_curve(period_days: int = Query(30, ge=1, le=365)):
+async def get_equity_curve(
+    period_days: int = Query(30, ge=1, le=365),
+    max_points: Optional[int] = Query(None, ge=MIN_POINTS, description="Downsample to at most this many points"),
+    method: DownsampleMethod = Query(DownsampleMethod.LTTB, description="Downsampling method: lttb or minmax"),
+):
     """
     Get equity curve data for charting.
 
@@ -120,6 +132,8 @@ async def get_equity_curve(period_days: int = Query(30, ge=1, le=365)):
 
     Args:
         period_days: Number of days to include (default 30)
+        max_points: Shape-preserving downsampling (pnl stays the kept
+            point's own trade P&L; totals use every trade)
     """
     tracker = PerformanceTracker()
     curve_data = tracker.get_equity_curve(period_days)
@@ -144,7 +158,7 @@ async def get_equity_curve(period_days: int = Query(30, ge=1, le=365)):
             pnl=p["pnl"],
             cumulative_pnl=p["cumulative_pnl"],
         )
-        for p in curve_data
+        for p in downsample(curve_data, lambda p: p["cumulative_pnl"], max_points, method)
     ]
 
     return EquityCurveResponse(
@@ -155,6 +169,26 @@ async def get_equity_curve(period_days: int = Query(30, ge=1, le=365)):
     )
 
 
+@router.get("/equity-curve/export")
+async def export_equity_curve(
+    period_days: int = Query(30, ge=1, le=365),
+    file_format: str = Query("csv", alias="format", pattern="^(csv|npy)$", description="csv or npy"),
+):
+    """
+    Download the full-resolution equity curve (date, pnl, cumulative_pnl).
+
+    npy is a NumPy structured array with date as datetime64[ms] - load with
+    np.load, no pickle needed.
+    """
+    curve_data = [p for p in PerformanceTracker().get_equity_curve(period_days) if p["date"]]
+
+    headers = {"Content-Disposition": f'attachment; filename="equity_curve_{period_days}d.{file_format}"'}
+    if file_format == "csv":
+        return Response(content=to_csv(curve_data), media_type="text/csv", headers=headers)
+    content = to_npy(curve_data, ["pnl", "cumulative_pnl"], time_field="date")
+    return Response(content=content, media_type="application/octet-stream", headers=headers)
+
+
 @router.get("/trades", response_model=TradeHistoryResponse)
 async def get_trade_history(
     page: int = Query(1, ge=1),
@@ -14,6 +14,7 @@ from models.bot import (
 from database.connection import SessionLocal
 from database.models import BotConfiguration
 from services.trading_bot import get_trading_bot
+from services.bot_ipc import run_bot_io
 from services.alpaca_service import set_trading_mode, get_trading_mode
 
 router = APIRouter()
@@ -241,7 +242,7 @@ async def update_settings(request: UpdateSettingsRequest):
 
         # Apply to running bot
         bot = get_trading_bot()
-        bot._apply_config({
+        await run_bot_io(lambda: bot._apply_config({
             "enabled_symbols": settings.enabled_symbols,
             "paper_trading": settings.paper_trading,
             "trading_hours_only": settings.trading_hours_only,
@@ -274,7 +275,7 @@ async def update_settings(request: UpdateSettingsRequest):
             "crypto_trading_enabled": settings.crypto_trading_enabled,
             "crypto_symbols": settings.crypto_symbols,
             "crypto_max_positions": settings.crypto_max_positions,
-        })
+        }))
 
         return BotSettingsResponse(
             settings=settings,
@@ -0,0 +1,121 @@
+"""
+Backtest Engine Scaling Benchmark
+=================================
+Measures how BacktestEngine.run scales with bars x symbols.
+
+Usage:
+    python -m scripts.benchmark_backtest_engine
+    python -m scripts.benchmark_backtest_engine --bars 1000 4000 --symbols 5 20
+    python -m scripts.benchmark_backtest_engine --strategy macd_crossover
+
+Feeds the engine synthetic daily bars (random walk, business days only)
+through a stand-in data service, then runs a strategy in both the
+event-driven and the vectorized mode. With the indexed BacktestData the
+time per bar x symbol should stay flat as either dimension grows (linear
+total runtime); the vectorized column shows the speedup for parameter
+research.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.backtesting.data_loader import DataLoader
+from services.backtesting.engine import BacktestEngine
+from services.backtesting.strategies import SimpleRSIStrategy, MACDCrossoverStrategy
+from tests.mocks.synthetic_bars import SyntheticBarService
+
+START_DATE = date(2000, 1, 3)
+
+STRATEGIES = {
+    "simple_rsi": SimpleRSIStrategy,
+    "macd_crossover": MACDCrossoverStrategy,
+}
+
+
+def end_date_for(num_bars: int) -> date:
+    """End date that gives num_bars business days from START_DATE"""
+    day, count = START_DATE, 0
+    while True:
+        if day.weekday() < 5:
+            count += 1
+            if count == num_bars:
+                return day
+        day += timedelta(days=1)
+
+
+async def run_backtest(num_bars: int, symbols: list, strategy_name: str, vectorized: bool):
+    """Run one backtest and return (result, seconds)"""
+    engine = BacktestEngine(
+        strategy=STRATEGIES[strategy_name](),
+        start_date=START_DATE,
+        end_date=end_date_for(num_bars),
+        vectorized=vectorized,
+    )
+    engine.data_loader = DataLoader(SyntheticBarService())
+
+    # Load once up front so only the simulation is timed
+    data = await engine.data_loader.load(symbols, engine.start_date, engine.end_date)
+    benchmark = await engine.data_loader.load_benchmark(engine.start_date, engine.end_date)
+
+    class PreloadedLoader:
+        async def load(self, *args, **kwargs):
+            return data
+
+        async def load_benchmark(self, *args, **kwargs):
+            return benchmark
+
+    engine.data_loader = PreloadedLoader()
+    start = time.perf_counter()
+    result = await engine.run(symbols)
+    return result, time.perf_counter() - start
+
+
+async def run_benchmark(num_bars: int, num_symbols: int, strategy_name: str = "simple_rsi") -> dict:
+    """Run the same backtest in both modes and return timing results"""
+    symbols = [f"SYM{i:03d}" for i in range(num_symbols)]
+    event, event_s = await run_backtest(num_bars, symbols, strategy_name, vectorized=False)
+    vector, vector_s = await run_backtest(num_bars, symbols, strategy_name, vectorized=True)
+
+    return {
+        "bars": num_bars,
+        "symbols": num_symbols,
+        "seconds": event_s,
+        "us_per_bar_symbol": event_s / (event.bars_processed * num_symbols) * 1e6,
+        "vectorized_seconds": vector_s,
+        "speedup": event_s / vector_s if vector_s else float("inf"),
+        "trades": event.metrics.total_trades,
+        "trades_match": vector.trades == event.trades,
+    }
+
+
+async def main_async(args):
+    print(f"{'bars':>6} {'symbols':>8} {'event s':>9} {'us/bar*sym':>11} {'vector s':>9} {'speedup':>8} {'trades':>7} {'match':>6}")
+    for num_symbols in args.symbols:
+        for num_bars in args.bars:
+            r = await run_benchmark(num_bars, num_symbols, args.strategy)
+            print(
+                f"{r['bars']:>6} {r['symbols']:>8} {r['seconds']:>9.3f} {r['us_per_bar_symbol']:>11.2f} "
+                f"{r['vectorized_seconds']:>9.4f} {r['speedup']:>7.0f}x {r['trades']:>7} {str(r['trades_match']):>6}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark backtest engine scaling")
+    parser.add_argument("--bars", type=int, nargs="+", default=[500, 1000, 2000, 4000])
+    parser.add_argument("--symbols", type=int, nargs="+", default=[5, 20])
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="simple_rsi")
+    args = parser.parse_args()
+    # Per-trade INFO logs would dominate the timings of both modes
+    logging.disable(logging.INFO)
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Simulated Broker Load Benchmark
+===============================
+Concurrent clients submit a mix of market, limit, bracket and exit orders
+(plus cancels and status checks) to a feed-mode SimulatedBroker while a
+price feed pushes random-walk bars, and reports orders and fills per
+second with per-call latency percentiles for each client count.
+
+Usage:
+    python -m scripts.benchmark_broker_load
+    python -m scripts.benchmark_broker_load --clients 1 50 --orders 2000 --latency-ms 5 --volume-fraction 0.1
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from exceptions import AlpacaError
+from services.simulated_broker import SimulatedBroker
+
+
+class Load:
+    """Counters shared by the clients of one run"""
+
+    def __init__(self):
+        self.orders = 0
+        self.rejected = 0
+        self.latencies = []
+        self.done = False
+
+
+async def client(broker: SimulatedBroker, load: Load, symbols, orders: int, seed: int) -> None:
+    rng = random.Random(seed)
+    open_ids = []
+    for _ in range(orders):
+        symbol = rng.choice(symbols)
+        price = broker._price(symbol)
+        kind = rng.random()
+        start = time.perf_counter()
+        try:
+            if kind < 0.35:
+                order = await broker.submit_market_order(symbol, rng.randint(1, 10), "buy")
+            elif kind < 0.60:
+                order = await broker.submit_limit_order(symbol, rng.randint(1, 10), "buy",
+                                                        round(price * (1 - rng.uniform(0, 0.01)), 2))
+            elif kind < 0.75:
+                order = await broker.submit_bracket_order(
+                    symbol, rng.randint(1, 10), "buy",
+                    stop_loss_price=round(price * 0.98, 2), take_profit_price=round(price * 1.02, 2),
+                )
+            elif kind < 0.85:
+                order = await broker.submit_limit_order(symbol, 1, "sell", round(price * (1 + rng.uniform(0, 0.01)), 2))
+            elif kind < 0.95 and open_ids:
+                await broker.cancel_order(open_ids.pop(rng.randrange(len(open_ids))))
+                order = None
+            else:
+                order = await broker.get_order(open_ids[-1]) if open_ids else None
+            if order is not None and order["status"] not in ("filled", "canceled"):
+                open_ids.append(order["id"])
+        except AlpacaError:
+            load.rejected += 1
+        load.latencies.append(time.perf_counter() - start)
+        load.orders += 1
+        await asyncio.sleep(0)
+
+
+async def feed(broker: SimulatedBroker, load: Load, symbols, interval: float, seed: int) -> int:
+    """Push a random-walk bar per symbol every interval; returns the bars pushed"""
+    rng = random.Random(seed)
+    prices = {symbol: broker._price(symbol) for symbol in symbols}
+    bars = 0
+    while not load.done:
+        for symbol in symbols:
+            open_ = prices[symbol]
+            close = open_ * (1 + rng.gauss(0, 0.002))
+            high = max(open_, close) * (1 + abs(rng.gauss(0, 0.001)))
+            low = min(open_, close) * (1 - abs(rng.gauss(0, 0.001)))
+            broker.push_bar(symbol, open_, high, low, close, volume=rng.randint(500, 5000))
+            prices[symbol] = close
+            bars += 1
+        await asyncio.sleep(interval)
+    return bars
+
+
+async def run(clients: int, orders: int, symbol_count: int, latency_ms: float,
+              volume_fraction, interval: float, seed: int = 0):
+    symbols = [f"SYM{i:03d}" for i in range(symbol_count)]
+    broker = SimulatedBroker(
+        starting_cash=1e12, latency_seconds=latency_ms / 1000, max_volume_fraction=volume_fraction,
+        enforce_sessions=False, seed=seed,
+    )
+    for i, symbol in enumerate(symbols):
+        broker.push_price(symbol, 50.0 + i)
+
+    load = Load()
+    start = time.perf_counter()
+    feed_task = asyncio.create_task(feed(broker, load, symbols, interval, seed))
+    await asyncio.gather(*(client(broker, load, symbols, orders, seed + 1 + i) for i in range(clients)))
+    seconds = time.perf_counter() - start
+    load.done = True
+    bars = await feed_task
+    return seconds, load, len(broker.fills), bars
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the simulated broker")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--orders", type=int, default=1000, help="Requests per client")
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Order latency to the book")
+    parser.add_argument("--volume-fraction", type=float, help="Share of bar volume fills may take")
+    parser.add_argument("--bar-interval-ms", type=float, default=1.0, help="Time between feed bars")
+    args = parser.parse_args()
+
+    print(f"{'clients':>8} {'requests':>9} {'rejected':>9} {'fills':>8} {'bars':>7} {'seconds':>8} "
+          f"{'req/s':>8} {'fills/s':>8} {'p50 us':>7} {'p99 us':>7}")
+    for clients in args.clients:
+        seconds, load, fills, bars = asyncio.run(run(
+            clients, args.orders, args.symbols, args.latency_ms, args.volume_fraction,
+            args.bar_interval_ms / 1000,
+        ))
+        p50, p99 = np.percentile(load.latencies, [50, 99]) * 1e6
+        print(f"{clients:>8} {load.orders:>9} {load.rejected:>9} {fills:>8} {bars:>7} {seconds:>8.2f} "
+              f"{load.orders / seconds:>8.0f} {fills / seconds:>8.0f} {p50:>7.0f} {p99:>7.0f}")
+
+
+if __name__ == "__main__":
+    main()
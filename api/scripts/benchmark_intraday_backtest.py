@@ -0,0 +1,108 @@
+"""
+Intraday Backtest Memory Benchmark
+==================================
+Runs minute-bar backtests of increasing length on synthetic bars and
+reports run time and peak traced memory. With streaming, peak memory
+should stay flat as the number of months grows.
+
+Usage:
+    python -m scripts.benchmark_intraday_backtest
+    python -m scripts.benchmark_intraday_backtest --months 1 3 12 --symbols 5
+
+The synthetic bars are written to a temporary MinuteBarStore first, so
+the fill is not part of the measurement.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import zlib
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.backtesting.intraday import IntradayBacktestEngine, IntradaySessionRules
+from services.backtesting.minute_store import EASTERN, MinuteBarStore
+from services.backtesting.strategies import SimpleRSIStrategy
+from services.indicators import TradingMode
+
+START_DATE = date(2023, 1, 2)
+
+
+class SyntheticMinuteService:
+    """Random-walk minute bars for the regular session of every weekday (daily bars for 1Day)"""
+
+    async def get_bars(self, symbol, timeframe="1Min", limit=100, start=None, end=None):
+        if timeframe == "1Day":
+            days = [start.date() + timedelta(days=i) for i in range((end.date() - start.date()).days + 1)]
+            return [{"timestamp": d.isoformat(), "open": 100, "high": 100, "low": 100, "close": 100, "volume": 1}
+                    for d in days if d.weekday() < 5]
+        bars = []
+        day = start.astimezone(EASTERN).date()
+        while day <= end.astimezone(EASTERN).date():
+            if day.weekday() < 5:
+                rng = np.random.default_rng([zlib.crc32(symbol.encode()), day.toordinal()])
+                open_ts = EASTERN.localize(datetime.combine(day, datetime.min.time()) + timedelta(hours=9, minutes=30))
+                closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, 390)))
+                for minute, close in enumerate(closes.tolist()):
+                    bars.append({
+                        "timestamp": (open_ts + timedelta(minutes=minute)).astimezone(timezone.utc).isoformat(),
+                        "open": close, "high": close, "low": close, "close": close, "volume": 1000,
+                    })
+            day += timedelta(days=1)
+        return bars[-limit:]
+
+
+def end_date_for(months: int) -> date:
+    year, month = divmod(START_DATE.month - 1 + months, 12)
+    return date(START_DATE.year + year, month + 1, 1) - timedelta(days=1)
+
+
+async def run(store: MinuteBarStore, service, symbols, months: int):
+    engine = IntradayBacktestEngine(
+        strategy=SimpleRSIStrategy(),
+        start_date=START_DATE,
+        end_date=end_date_for(months),
+        rules=IntradaySessionRules.for_mode(TradingMode.INTRADAY),
+        store=store,
+        data_service=service,
+    )
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = await engine.run(symbols)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark intraday backtest memory")
+    parser.add_argument("--months", type=int, nargs="+", default=[1, 3, 6])
+    parser.add_argument("--symbols", type=int, default=3)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    symbols = [f"SYM{i:02d}" for i in range(args.symbols)]
+    service = SyntheticMinuteService()
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = MinuteBarStore(directory)
+        await store.ensure(symbols, START_DATE, end_date_for(max(args.months)), service)
+
+        print(f"{'months':>6} {'minutes':>9} {'trades':>7} {'seconds':>8} {'peak MB':>8}")
+        for months in args.months:
+            result, seconds, peak = await run(store, service, symbols, months)
+            print(f"{months:>6} {result.bars_processed:>9} {len(result.trades):>7} "
+                  f"{seconds:>8.2f} {peak / 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
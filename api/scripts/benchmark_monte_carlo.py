@@ -0,0 +1,68 @@
+"""
+Monte Carlo Benchmark
+=====================
+Compares the vectorized Monte Carlo simulation against the previous
+shuffle-and-loop implementation.
+
+Usage:
+    python -m scripts.benchmark_monte_carlo
+    python -m scripts.benchmark_monte_carlo --trades 200 --simulations 1000 100000 --workers 4
+
+The loop baseline is only timed up to 10k simulations (it scales linearly).
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.monte_carlo import MonteCarloMethod
+from services.walk_forward_backtester import WalkForwardBacktester
+
+LOOP_LIMIT = 10_000
+
+
+def loop_monte_carlo(backtester, trades, initial_capital, num_simulations):
+    """The pre-vectorization implementation: shuffle and recompute per simulation"""
+    for _ in range(num_simulations):
+        shuffled = trades.copy()
+        random.shuffle(shuffled)
+        backtester._calculate_sharpe_from_trades(shuffled, initial_capital)
+        backtester._calculate_max_drawdown(shuffled, initial_capital)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Monte Carlo simulation")
+    parser.add_argument("--trades", type=int, default=200)
+    parser.add_argument("--simulations", type=int, nargs="+", default=[1000, 10_000, 100_000])
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    trades = [{"pnl": rng.gauss(20, 300)} for _ in range(args.trades)]
+    backtester = WalkForwardBacktester()
+
+    print(f"{'sims':>8} {'method':>17} {'loop s':>8} {'numpy s':>8} {'speedup':>8}")
+    for num_simulations in args.simulations:
+        loop_s = None
+        if num_simulations <= LOOP_LIMIT:
+            start = time.perf_counter()
+            loop_monte_carlo(backtester, trades, 10000, num_simulations)
+            loop_s = time.perf_counter() - start
+
+        for method in MonteCarloMethod:
+            start = time.perf_counter()
+            backtester.run_monte_carlo(
+                trades, num_simulations=num_simulations, method=method, seed=1, workers=args.workers
+            )
+            numpy_s = time.perf_counter() - start
+            loop_col = f"{loop_s:>8.3f}" if loop_s is not None else f"{'-':>8}"
+            speedup = f"{loop_s / numpy_s:>7.0f}x" if loop_s is not None else f"{'-':>8}"
+            print(f"{num_simulations:>8} {method.value:>17} {loop_col} {numpy_s:>8.3f} {speedup}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Order Simulator Throughput Benchmark
+====================================
+Keeps a book of resting stop, limit and trailing-stop orders topped up
+while random-walk bars are processed, and reports bars and fills per
+second for each book size.
+
+Usage:
+    python -m scripts.benchmark_order_simulator
+    python -m scripts.benchmark_order_simulator --orders 1000 10000 --bars 2000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.backtesting.order_simulator import IntrabarPath, OrderSimulator, OrderType
+from services.backtesting.slippage import SlippageConfig
+
+
+def submit_random(simulator: OrderSimulator, rng: random.Random, price: float) -> None:
+    kind = rng.random()
+    side = rng.choice(("buy", "sell"))
+    if kind < 0.4:
+        offset = rng.uniform(0.002, 0.05) * price
+        level = price - offset if side == "buy" else price + offset
+        simulator.submit_order("SYM", 1, side, OrderType.LIMIT, limit_price=level)
+    elif kind < 0.8:
+        offset = rng.uniform(0.002, 0.05) * price
+        level = price + offset if side == "buy" else price - offset
+        simulator.submit_order("SYM", 1, side, OrderType.STOP, stop_price=level)
+    else:
+        simulator.submit_trailing_stop_order("SYM", 1, trail_percent=rng.uniform(0.01, 0.05), side=side)
+
+
+def run(resting: int, bars: int, seed: int = 0):
+    rng = random.Random(seed)
+    simulator = OrderSimulator(SlippageConfig(), IntrabarPath.BAR_DIRECTION, rng=rng)
+    price = 100.0
+    simulator.process_bar("SYM", price, price, price, price)
+    for _ in range(resting):
+        submit_random(simulator, rng, price)
+
+    fills = 0
+    start = time.perf_counter()
+    for _ in range(bars):
+        open_ = price
+        price *= 1 + rng.gauss(0, 0.01)
+        high = max(open_, price) * (1 + abs(rng.gauss(0, 0.005)))
+        low = min(open_, price) * (1 - abs(rng.gauss(0, 0.005)))
+        filled = simulator.process_bar("SYM", open_, high, low, price, volume=1_000_000)
+        fills += len(filled)
+        for _ in filled:  # Keep the book at its size
+            submit_random(simulator, rng, price)
+    seconds = time.perf_counter() - start
+    return seconds, fills
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the order fill simulator")
+    parser.add_argument("--orders", type=int, nargs="+", default=[100, 1000, 5000, 20000])
+    parser.add_argument("--bars", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{'resting':>8} {'bars':>6} {'fills':>8} {'seconds':>8} {'bars/s':>9} {'fills/s':>9}")
+    for resting in args.orders:
+        seconds, fills = run(resting, args.bars)
+        print(f"{resting:>8} {args.bars:>6} {fills:>8} {seconds:>8.2f} "
+              f"{args.bars / seconds:>9.0f} {fills / seconds:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Simulation Core Benchmark
+=========================
+Times the shared single-position simulation core against a bar-by-bar
+position loop (the model both single-symbol backtesters used before) on
+random-walk closes, at sparse and dense entry signals.
+
+Usage:
+    python -m scripts.benchmark_sim_core
+    python -m scripts.benchmark_sim_core --bars 20000 --runs 20 --density 0.005 0.3 --stop-loss 0.1
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.backtesting import sim_core
+
+
+def random_walk(num_bars: int, seed: int):
+    rng = random.Random(seed)
+    price, closes = 100.0, []
+    for i in range(num_bars):
+        price *= 1 + 0.01 * math.sin(i / 15) + rng.gauss(0.0003, 0.015)
+        closes.append(price)
+    return closes
+
+
+def per_bar_loop(closes, sides, start, capital, stop_loss_pct, take_profit_pct):
+    """The previous model: a position dict checked on every bar"""
+    position, equity_curve, trades = None, [capital], []
+    for i in range(start, len(closes)):
+        price = closes[i]
+        if position:
+            unrealized = (price - position["entry_price"]) * position["quantity"]
+            if position["side"] == "short":
+                unrealized = -unrealized
+            equity_curve.append(capital + unrealized)
+        else:
+            equity_curve.append(capital)
+
+        if position:
+            exit_reason = ""
+            if position["side"] == "long":
+                if price <= position["stop_price"]:
+                    exit_reason = "stop_loss"
+                elif price >= position["target_price"]:
+                    exit_reason = "take_profit"
+            else:
+                if price >= position["stop_price"]:
+                    exit_reason = "stop_loss"
+                elif price <= position["target_price"]:
+                    exit_reason = "take_profit"
+            if exit_reason:
+                if position["side"] == "long":
+                    pnl = (price - position["entry_price"]) * position["quantity"]
+                else:
+                    pnl = (position["entry_price"] - price) * position["quantity"]
+                trades.append({
+                    "entry_price": position["entry_price"], "exit_price": price, "side": position["side"],
+                    "quantity": position["quantity"], "pnl": pnl, "exit_reason": exit_reason,
+                    "slippage_pct": 0.0, "slippage_cost": 0.0,
+                })
+                capital += pnl
+                position = None
+
+        if not position and sides[i]:
+            quantity = int(capital * 0.1 / price)
+            if quantity > 0:
+                sign = 1 if sides[i] == "long" else -1
+                position = {
+                    "entry_price": price, "side": sides[i], "quantity": quantity,
+                    "stop_price": price * (1 - sign * stop_loss_pct),
+                    "target_price": price * (1 + sign * take_profit_pct),
+                }
+    return trades, np.asarray(equity_curve)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the simulation core")
+    parser.add_argument("--bars", type=int, default=2000)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--density", type=float, nargs="+", default=[0.02, 0.1, 0.5],
+                        help="Fraction of bars with an entry signal")
+    parser.add_argument("--stop-loss", type=float, default=0.05)
+    parser.add_argument("--take-profit", type=float, default=0.10)
+    args = parser.parse_args()
+
+    closes = random_walk(args.bars, 1)
+    print(f"{args.bars} bars x {args.runs} runs\n")
+    print(f"{'signal density':<15} {'trades':>7} {'per-bar ms':>11} {'core ms':>8} {'speedup':>8}")
+    for density in args.density:
+        rng = random.Random(2)
+        sides = [rng.choice(["long", "short"]) if rng.random() < density else "" for _ in closes]
+
+        start = time.perf_counter()
+        for _ in range(args.runs):
+            per_bar_loop(closes, sides, 50, 10000, args.stop_loss, args.take_profit)
+        loop_ms = (time.perf_counter() - start) / args.runs * 1000
+
+        start = time.perf_counter()
+        for _ in range(args.runs):
+            result = sim_core.simulate(closes, 50, 10000, args.stop_loss, args.take_profit, sides=sides)
+            result.trades.to_dicts()
+        core_ms = (time.perf_counter() - start) / args.runs * 1000
+
+        print(f"{density:<15} {len(result.trades):>7} {loop_ms:>11.2f} {core_ms:>8.2f} {loop_ms / core_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,498 @@
+"""
+Backtest Throughput Benchmark
+=============================
+Measures bars/second, peak memory and allocation churn of every backtest
+path on deterministic synthetic data, and checks them against the
+baselines in scripts/benchmark_baselines.json.
+
+Usage:
+    python -m scripts.benchmark_throughput
+    python -m scripts.benchmark_throughput --check
+    python -m scripts.benchmark_throughput --update-baseline
+    python -m scripts.benchmark_throughput --symbols 10 --bars 5000 --cases walk_forward monte_carlo
+
+Synthetic OHLCV is a random walk that switches between bull, bear,
+sideways and volatile regimes (Markov chain), seeded per symbol. Bars are
+served through the MockAlpacaService test client, so each path loads data
+the way it does against Alpaca.
+
+Cases:
+- engine_event / engine_vectorized: backtesting.engine.BacktestEngine
+  (SimpleRSIStrategy) over all symbols
+- single_symbol: services.backtester.BacktestEngine, every strategy type
+  per symbol
+- walk_forward: WalkForwardBacktester.run_walk_forward (RSI) per symbol
+- monte_carlo: WalkForwardBacktester.run_monte_carlo on the walk-forward
+  trades (throughput in trade-steps/s: simulations x trades)
+- bot_replay: the live TradingBot replayed through the opening half hour
+  of a session of synthetic minute bars (services.replay.BotReplay), with
+  the daily bars as history (throughput in replayed minute bars/s)
+
+Each case runs in a fresh process so its peak RSS is its own. A timed
+repeat runs the case back to back for at least half a second; the best
+of --repeats is kept, per run. A further tracemalloc run (not timed)
+gives the peak traced allocation size. gc_gen0 is the number of
+generation-0 collections per run - a count of container allocations in
+units of the gen-0 threshold.
+
+--check compares against the baseline taken with the same configuration.
+Throughput is scaled by a calibration loop timed on both machines, so a
+baseline from a faster or slower machine still compares; memory and
+gc_gen0 are compared as-is. Exits 1 on any regression past the
+tolerances.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import math
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baselines.json")
+START_DATE = date(2010, 1, 4)
+
+CASES = ["engine_event", "engine_vectorized", "single_symbol", "walk_forward", "monte_carlo", "bot_replay"]
+
+# Allowed change before --check reports a regression
+THROUGHPUT_TOLERANCE = 0.35   # Calibrated throughput may drop 35% (shared CI machines are noisy)
+MEMORY_TOLERANCE = 0.25       # Peak RSS / traced memory may grow 25% ...
+MEMORY_SLACK_MB = 16          # ... plus this much (interpreter and allocator noise)
+GC_TOLERANCE = 0.25
+
+# Each timed repeat runs its case back to back for at least this long
+MIN_TIMED_SECONDS = 0.5
+
+# (drift, volatility) per bar, and the chance of leaving a regime on any bar
+REGIMES = {
+    "bull": (0.0008, 0.010),
+    "bear": (-0.0009, 0.018),
+    "sideways": (0.0, 0.008),
+    "volatile": (0.0, 0.030),
+}
+REGIME_SWITCH_PROBABILITY = 0.01
+
+# bot_replay: minute-bar days after the daily history (the last one is replayed)
+REPLAY_DAYS = 5
+MINUTES_PER_DAY = 16 * 60  # 4:00 AM - 8:00 PM ET
+REPLAY_WINDOW = ((9, 25), (10, 0))  # ET; a full session takes tens of seconds
+
+
+# ==================== SYNTHETIC DATA ====================
+
+def business_days(start: date, count: int) -> List[date]:
+    days, day = [], start
+    while len(days) < count:
+        if day.weekday() < 5:
+            days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def synthetic_bars(symbol: str, num_bars: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Deterministic daily OHLCV for a symbol: a random walk switching regimes.
+
+    The same (symbol, num_bars, seed) always gives the same bars.
+    """
+    rng = random.Random(f"{seed}:{symbol}")
+    price = rng.uniform(20, 400)
+    regime = rng.choice(list(REGIMES))
+    bars = []
+    for day in business_days(START_DATE, num_bars):
+        if rng.random() < REGIME_SWITCH_PROBABILITY:
+            regime = rng.choice([name for name in REGIMES if name != regime])
+        drift, volatility = REGIMES[regime]
+        open_price = price * (1 + rng.gauss(0, volatility / 4))
+        price = max(1.0, open_price * (1 + rng.gauss(drift, volatility)))
+        wick = abs(rng.gauss(0, volatility / 2))
+        bars.append({
+            "timestamp": datetime(day.year, day.month, day.day, tzinfo=timezone.utc).isoformat(),
+            "open": open_price,
+            "high": max(open_price, price) * (1 + wick),
+            "low": min(open_price, price) * (1 - wick),
+            "close": price,
+            "volume": int(rng.lognormvariate(13.8, 0.5)),
+        })
+    return bars
+
+
+def synthetic_minutes(
+    symbol: str, days: List[date], start_price: float, seed: int = 0
+) -> Tuple[List[int], Dict[str, List[float]]]:
+    """
+    Deterministic extended-hours minute bars for a symbol, one regime per day.
+
+    Returns:
+        (bar start timestamps in epoch seconds, OHLCV columns)
+    """
+    from services.backtesting.minute_store import eastern_offset_seconds
+
+    rng = random.Random(f"{seed}:{symbol}:minutes")
+    price = start_price
+    timestamps, columns = [], {"open": [], "high": [], "low": [], "close": [], "volume": []}
+    for day in days:
+        drift, volatility = REGIMES[rng.choice(list(REGIMES))]
+        # Spread the daily move over the day's minutes
+        drift, volatility = drift / MINUTES_PER_DAY, volatility / math.sqrt(MINUTES_PER_DAY)
+        session_start = int(datetime(day.year, day.month, day.day, 4, tzinfo=timezone.utc).timestamp())
+        session_start -= eastern_offset_seconds(day)
+        for minute in range(MINUTES_PER_DAY):
+            open_price = price
+            price = max(1.0, price * (1 + rng.gauss(drift, volatility)))
+            wick = abs(rng.gauss(0, volatility / 2))
+            timestamps.append(session_start + minute * 60)
+            columns["open"].append(open_price)
+            columns["high"].append(max(open_price, price) * (1 + wick))
+            columns["low"].append(min(open_price, price) * (1 - wick))
+            columns["close"].append(price)
+            columns["volume"].append(float(int(rng.lognormvariate(8.5, 0.7))))
+    return timestamps, columns
+
+
+def mock_alpaca(symbols: List[str], num_bars: int, seed: int):
+    """MockAlpacaService serving the synthetic bars (plus SPY for the engine's benchmark)"""
+    from tests.mocks.alpaca_mock import MockAlpacaService
+
+    service = MockAlpacaService()
+    for symbol in symbols + ["SPY"]:
+        service.set_bars(symbol, synthetic_bars(symbol, num_bars, seed))
+    return service
+
+
+async def fetch_columns(alpaca, symbol: str, num_bars: int) -> Dict[str, list]:
+    """OHLCV columns for one symbol from the (mock) Alpaca client"""
+    bars = await alpaca.get_bars(symbol, "1Day", num_bars)
+    return {
+        "opens": [bar["open"] for bar in bars],
+        "highs": [bar["high"] for bar in bars],
+        "lows": [bar["low"] for bar in bars],
+        "closes": [bar["close"] for bar in bars],
+        "volumes": [bar["volume"] for bar in bars],
+        "dates": [bar["timestamp"][:10] for bar in bars],
+    }
+
+
+# ==================== CASES ====================
+# Each case: prepare(config, alpaca) loads its data (untimed) and returns run() -> units of work
+
+async def _prepare_engine(config, alpaca, vectorized: bool):
+    from services.backtesting.data_loader import DataLoader
+    from services.backtesting.engine import BacktestEngine
+    from services.backtesting.strategies import SimpleRSIStrategy
+
+    days = business_days(START_DATE, config["bars"])
+    loader = DataLoader(alpaca)
+    data = await loader.load(config["symbol_names"], days[0], days[-1])
+    benchmark = await loader.load_benchmark(days[0], days[-1])
+
+    class PreloadedLoader:
+        async def load(self, *args, **kwargs):
+            return data
+
+        async def load_benchmark(self, *args, **kwargs):
+            return benchmark
+
+    def run():
+        engine = BacktestEngine(
+            strategy=SimpleRSIStrategy(), start_date=days[0], end_date=days[-1], vectorized=vectorized,
+        )
+        engine.data_loader = PreloadedLoader()
+        result = asyncio.run(engine.run(config["symbol_names"]))
+        return result.bars_processed * len(config["symbol_names"])
+
+    return run
+
+
+async def _prepare_single_symbol(config, alpaca):
+    from services.backtester import BacktestEngine, StrategyType
+
+    columns = {symbol: await fetch_columns(alpaca, symbol, config["bars"]) for symbol in config["symbol_names"]}
+    strategies = [strategy for strategy in StrategyType if strategy != StrategyType.CUSTOM]
+
+    def run():
+        engine = BacktestEngine()
+        for data in columns.values():
+            for strategy in strategies:
+                engine.run_backtest(
+                    "SYM", strategy, data["opens"], data["highs"], data["lows"], data["closes"],
+                    data["volumes"], data["dates"],
+                )
+        return config["bars"] * len(columns) * len(strategies)
+
+    return run
+
+
+def _walk_forward_backtester():
+    from services.walk_forward_backtester import WalkForwardBacktester
+
+    backtester = WalkForwardBacktester()
+    backtester.param_ranges = {
+        "rsi_period": [7, 14, 21],
+        "rsi_oversold": [25, 30, 35],
+        "stop_loss_pct": [0.02, 0.04],
+        "take_profit_pct": [0.04, 0.08],
+    }
+    return backtester
+
+
+def _walk_forward(backtester, data):
+    return backtester.run_walk_forward(
+        data["opens"], data["highs"], data["lows"], data["closes"], data["volumes"], data["dates"],
+        backtester.rsi_strategy, num_windows=5, workers=1, seed=1,
+    )
+
+
+async def _prepare_walk_forward(config, alpaca):
+    columns = {symbol: await fetch_columns(alpaca, symbol, config["bars"]) for symbol in config["symbol_names"]}
+    backtester = _walk_forward_backtester()
+    combinations = math.prod(len(values) for values in backtester.param_ranges.values())
+
+    def run():
+        for data in columns.values():
+            _walk_forward(backtester, data)
+        # Every training bar is simulated once per combination, every test bar once
+        return int(config["bars"] * len(columns) * (0.7 * combinations + 0.3))
+
+    return run
+
+
+async def _prepare_monte_carlo(config, alpaca):
+    backtester = _walk_forward_backtester()
+    trades = []
+    for symbol in config["symbol_names"]:
+        result = _walk_forward(backtester, await fetch_columns(alpaca, symbol, config["bars"]))
+        trades.extend(trade for window in result.windows for trade in window.trades)
+
+    def run():
+        result = backtester.run_monte_carlo(trades, num_simulations=config["simulations"], seed=1)
+        return result.num_simulations * len(trades)
+
+    return run
+
+
+async def _prepare_bot_replay(config, alpaca):
+    from services.backtesting.minute_store import EASTERN
+    from services.backtesting.replay_data import ReplayMarketData
+    from services.replay import BotReplay
+
+    # The bot logs every scan and order; keep it out of the timings
+    logging.disable(logging.CRITICAL)
+
+    days = business_days(START_DATE, config["bars"] + REPLAY_DAYS)
+    minute_days, replay_day = days[config["bars"]:], days[-1]
+    data = ReplayMarketData()
+    for symbol in config["symbol_names"]:
+        daily = await alpaca.get_bars(symbol, "1Day", config["bars"])
+        data.add_history(symbol, "1day", [int(datetime.fromisoformat(bar["timestamp"]).timestamp()) for bar in daily],
+                         {name: [bar[name] for bar in daily] for name in ("open", "high", "low", "close", "volume")})
+        data.add_minutes(symbol, *synthetic_minutes(symbol, minute_days, daily[-1]["close"], config["seed"]))
+
+    start, end = (
+        EASTERN.localize(datetime(replay_day.year, replay_day.month, replay_day.day, hour, minute))
+        for hour, minute in REPLAY_WINDOW
+    )
+
+    def run():
+        result = asyncio.run(BotReplay(data, start=start, end=end, seed=config["seed"]).run())
+        return result.backtest.bars_processed
+
+    return run
+
+
+PREPARE = {
+    "engine_event": lambda config, alpaca: _prepare_engine(config, alpaca, vectorized=False),
+    "engine_vectorized": lambda config, alpaca: _prepare_engine(config, alpaca, vectorized=True),
+    "single_symbol": _prepare_single_symbol,
+    "walk_forward": _prepare_walk_forward,
+    "monte_carlo": _prepare_monte_carlo,
+    "bot_replay": _prepare_bot_replay,
+}
+
+
+# ==================== MEASUREMENT ====================
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def measure_case(case: str, config: Dict[str, Any]) -> Dict[str, Any]:
+    """Prepare, time (best of config["repeats"], per run) and trace one case (run in its own process)"""
+    logging.disable(logging.INFO)  # Per-trade INFO logs would dominate the timings
+    alpaca = mock_alpaca(config["symbol_names"], config["bars"], config["seed"])
+    run = asyncio.run(PREPARE[case](config, alpaca))
+
+    best = None
+    for _ in range(config.get("repeats", 1)):
+        gc.collect()
+        gen0_before = gc.get_stats()[0]["collections"]
+        runs, start = 0, time.perf_counter()
+        while True:
+            units = run()
+            runs += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= MIN_TIMED_SECONDS:
+                break
+        seconds = elapsed / runs
+        if best is None or seconds < best[0]:
+            best = (seconds, (gc.get_stats()[0]["collections"] - gen0_before) / runs)
+    seconds, gen0 = best
+    rss = peak_rss_mb()
+
+    tracemalloc.start()
+    run()
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "units": units,
+        "seconds": round(seconds, 5),
+        "throughput": round(units / seconds, 1) if seconds > 0 else 0.0,
+        "peak_rss_mb": round(rss, 1),
+        "traced_peak_mb": round(traced_peak / (1024 * 1024), 2),
+        "gc_gen0": round(gen0, 1),
+    }
+
+
+def run_isolated(case: str, config: Dict[str, Any]) -> Dict[str, Any]:
+    """measure_case in a fresh spawned process"""
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(measure_case, (case, config))
+
+
+def calibration_seconds(repeats: int = 5) -> float:
+    """Best time of a fixed pure-Python workload (machine speed reference)"""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        rng = random.Random(0)
+        values = [rng.random() for _ in range(200_000)]
+        total = 0.0
+        for value in sorted(values):
+            total += math.sqrt(value) * 1.0001
+        best = min(best, time.perf_counter() - start)
+    return round(best, 5)
+
+
+# ==================== BASELINES ====================
+
+def config_key(config: Dict[str, Any]) -> str:
+    return f"{config['symbols']}x{config['bars']}_sims{config['simulations']}_seed{config['seed']}"
+
+
+def load_baselines() -> Dict[str, Any]:
+    if not os.path.exists(BASELINE_FILE):
+        return {}
+    with open(BASELINE_FILE) as f:
+        return json.load(f)
+
+
+def save_baseline(config, calibration, results) -> None:
+    baselines = load_baselines()
+    baselines[config_key(config)] = {
+        "recorded": date.today().isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "calibration_seconds": calibration,
+        "cases": results,
+    }
+    with open(BASELINE_FILE, "w") as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def compare(
+    baseline: Dict[str, Any],
+    calibration: float,
+    results: Dict[str, Dict],
+    throughput_tolerance: float = THROUGHPUT_TOLERANCE,
+) -> List[Tuple[str, str]]:
+    """Regressions as (case, description)"""
+    # A slower machine (longer calibration) is expected to have proportionally lower throughput
+    speed = baseline["calibration_seconds"] / calibration
+    regressions = []
+    for case, current in results.items():
+        expected = baseline["cases"].get(case)
+        if expected is None:
+            continue
+        floor = expected["throughput"] * speed * (1 - throughput_tolerance)
+        if current["throughput"] < floor:
+            regressions.append((case, f"throughput {current['throughput']:.0f}/s < {floor:.0f}/s"))
+        for metric in ("peak_rss_mb", "traced_peak_mb"):
+            ceiling = expected[metric] * (1 + MEMORY_TOLERANCE) + MEMORY_SLACK_MB
+            if current[metric] > ceiling:
+                regressions.append((case, f"{metric} {current[metric]:.1f} > {ceiling:.1f}"))
+        gc_ceiling = expected["gc_gen0"] * (1 + GC_TOLERANCE) + 5
+        if current["gc_gen0"] > gc_ceiling:
+            regressions.append((case, f"gc_gen0 {current['gc_gen0']:.1f} > {gc_ceiling:.1f}"))
+    return regressions
+
+
+# ==================== MAIN ====================
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark backtest throughput and memory")
+    parser.add_argument("--symbols", type=int, default=3)
+    parser.add_argument("--bars", type=int, default=2000)
+    parser.add_argument("--simulations", type=int, default=100_000, help="Monte Carlo simulations")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic data seed")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per case (best is kept)")
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=CASES)
+    parser.add_argument("--check", action="store_true", help="Exit 1 on a regression against the baseline")
+    parser.add_argument("--throughput-tolerance", type=float, default=THROUGHPUT_TOLERANCE,
+                        help="Allowed fractional throughput drop for --check")
+    parser.add_argument("--update-baseline", action="store_true", help="Record these results as the baseline")
+    args = parser.parse_args()
+
+    config = {
+        "symbols": args.symbols,
+        "bars": args.bars,
+        "simulations": args.simulations,
+        "seed": args.seed,
+        "repeats": args.repeats,
+        "symbol_names": [f"SYN{i:03d}" for i in range(args.symbols)],
+    }
+    calibration = calibration_seconds()
+    print(f"{args.symbols} symbols x {args.bars} bars, calibration {calibration * 1000:.1f} ms\n")
+    print(f"{'case':<18} {'units':>11} {'seconds':>8} {'units/s':>11} {'peak RSS MB':>12} {'traced MB':>10} {'gc gen0':>8}")
+
+    results = {}
+    for case in args.cases:
+        r = run_isolated(case, config)
+        results[case] = r
+        print(f"{case:<18} {r['units']:>11} {r['seconds']:>8.3f} {r['throughput']:>11.0f} "
+              f"{r['peak_rss_mb']:>12.1f} {r['traced_peak_mb']:>10.2f} {r['gc_gen0']:>8.1f}")
+
+    if args.update_baseline:
+        save_baseline(config, calibration, results)
+        print(f"\nBaseline {config_key(config)} written to {BASELINE_FILE}")
+
+    if args.check:
+        baseline = load_baselines().get(config_key(config))
+        if baseline is None:
+            print(f"\nNo baseline for {config_key(config)}; run with --update-baseline first")
+            sys.exit(1)
+        regressions = compare(baseline, calibration, results, args.throughput_tolerance)
+        for case, description in regressions:
+            print(f"REGRESSION {case}: {description}")
+        if regressions:
+            sys.exit(1)
+        print(f"\nNo regressions against the {baseline['recorded']} baseline")
+
+
+if __name__ == "__main__":
+    main()
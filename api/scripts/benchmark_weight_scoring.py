@@ -0,0 +1,90 @@
+"""
+Auto-Optimizer Weight Scoring Benchmark
+=======================================
+Times walk-forward scoring of one weight vector across a universe of
+random-walk symbols: per-bar indicator votes (the previous strategy
+function) against precomputed vote arrays, serially and on a process pool.
+
+Usage:
+    python -m scripts.benchmark_weight_scoring
+    python -m scripts.benchmark_weight_scoring --symbols 10 --bars 750 --workers 1 4
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.strategy_engine import DEFAULT_WEIGHTS
+from services.walk_forward_backtester import MAX_PARAM_COMBINATIONS, WalkForwardBacktester
+from services.weight_scoring import SymbolComponents, WeightScorer, WeightedSignals
+
+
+def random_walk(num_bars: int, seed: int):
+    rng = random.Random(seed)
+    price, data = 100.0, {"opens": [], "highs": [], "lows": [], "closes": [], "volumes": [], "dates": []}
+    for i in range(num_bars):
+        open_ = price
+        price *= 1 + rng.gauss(0.0003, 0.015)
+        data["opens"].append(open_)
+        data["highs"].append(max(open_, price) * (1 + abs(rng.gauss(0, 0.004))))
+        data["lows"].append(min(open_, price) * (1 - abs(rng.gauss(0, 0.004))))
+        data["closes"].append(price)
+        data["volumes"].append(rng.randint(500_000, 2_000_000))
+        data["dates"].append(str(i))
+    return data
+
+
+def per_bar_seconds(history, backtester) -> float:
+    """The previous path: strategy function called on every bar"""
+    start = time.perf_counter()
+    for symbol, data in history.items():
+        signals = WeightedSignals(SymbolComponents(symbol, data), DEFAULT_WEIGHTS)
+        backtester.run_walk_forward(
+            data["opens"], data["highs"], data["lows"], data["closes"], data["volumes"], data["dates"],
+            lambda *args: signals(*args), num_windows=4, initial_capital=100000, workers=1, seed=1,
+        )
+    return time.perf_counter() - start
+
+
+def scorer_seconds(history, backtester, workers: int, vectors: int):
+    """Scorer startup, then the mean time per weight vector"""
+    start = time.perf_counter()
+    with WeightScorer(history, backtester, workers=workers, seed=1) as scorer:
+        scorer.score(DEFAULT_WEIGHTS)  # Workers up and votes built
+        startup = time.perf_counter() - start
+        rng = random.Random(0)
+        start = time.perf_counter()
+        for _ in range(vectors):
+            scorer.score({name: rng.random() for name in DEFAULT_WEIGHTS})
+        return startup, (time.perf_counter() - start) / vectors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark auto-optimizer weight scoring")
+    parser.add_argument("--symbols", type=int, default=5)
+    parser.add_argument("--bars", type=int, default=1000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--vectors", type=int, default=10, help="Weight vectors timed per configuration")
+    parser.add_argument("--skip-per-bar", action="store_true", help="Skip the slow per-bar baseline")
+    args = parser.parse_args()
+
+    history = {f"SYM{i}": random_walk(args.bars, i) for i in range(args.symbols)}
+    backtester = WalkForwardBacktester()
+    print(f"{args.symbols} symbols x {args.bars} bars, "
+          f"{MAX_PARAM_COMBINATIONS} param combinations x 4 windows per symbol\n")
+
+    print(f"{'mode':<22} {'startup s':>10} {'s/vector':>9} {'vectors/hour':>13}")
+    if not args.skip_per_bar:
+        seconds = per_bar_seconds(history, backtester)
+        print(f"{'per-bar strategy':<22} {'':>10} {seconds:>9.2f} {3600 / seconds:>13.0f}")
+    for workers in args.workers:
+        startup, seconds = scorer_seconds(history, backtester, workers, args.vectors)
+        print(f"{f'kernel, {workers} worker(s)':<22} {startup:>10.2f} {seconds:>9.2f} {3600 / seconds:>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Trading Bot Replay
+==================
+Replays the live trading bot over stored historical minute bars on a
+virtual clock (services/replay.py) and prints what it did: orders, round
+trips, the session-close equity curve and how much faster than real time
+the replay ran.
+
+Usage:
+    python -m scripts.replay_bot --symbols AAPL MSFT --start 2024-03-04
+    python -m scripts.replay_bot --symbols AAPL --start 2024-03-04 --end 2024-03-08 --exit-manager --circuit-breaker
+
+Minute bars come from the MinuteBarStore (BACKTEST_MINUTE_STORE_DIR),
+which is filled from Alpaca for any month not yet stored; daily bars for
+indicator lookback are fetched from Alpaca (requires Alpaca API keys).
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+from datetime import date, datetime, timedelta
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.alpaca_service import get_alpaca_service
+from services.backtesting.minute_store import EASTERN, get_minute_bar_store
+from services.backtesting.replay_data import ReplayMarketData
+from services.replay import BotReplay
+
+# Days of minute bars loaded before the replay, so intraday indicators have lookback
+WARMUP_DAYS = 7
+DAILY_HISTORY_BARS = 300
+
+
+def parse_date(value: str) -> date:
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+async def load_market_data(symbols, start: date, end: date, daily: bool) -> ReplayMarketData:
+    store = get_minute_bar_store()
+    alpaca = get_alpaca_service()
+    first = start - timedelta(days=WARMUP_DAYS)
+    await store.ensure(symbols, first, end, alpaca)
+
+    data = ReplayMarketData.from_minute_store(store, symbols, first, end)
+    if daily:
+        for symbol in data.symbols:
+            bars = await alpaca.get_bars(
+                symbol, "1Day", DAILY_HISTORY_BARS,
+                start=datetime.combine(first - timedelta(days=DAILY_HISTORY_BARS * 3 // 2), datetime.min.time()),
+                end=datetime.combine(first, datetime.min.time()),
+            )
+            data.add_history(
+                symbol, "1day",
+                [int(datetime.fromisoformat(bar["timestamp"]).timestamp()) for bar in bars],
+                {name: [bar[name] for bar in bars] for name in ("open", "high", "low", "close", "volume")},
+            )
+    return data
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Replay the trading bot over historical minute bars")
+    parser.add_argument("--symbols", nargs="+", required=True)
+    parser.add_argument("--start", type=parse_date, required=True, help="First replayed day (YYYY-MM-DD)")
+    parser.add_argument("--end", type=parse_date, help="Last replayed day (default: --start)")
+    parser.add_argument("--cash", type=float, default=100000.0, help="Starting cash")
+    parser.add_argument("--exit-manager", action="store_true", help="Run the exit manager on the bot's positions")
+    parser.add_argument("--circuit-breaker", action="store_true", help="Run the circuit breaker")
+    parser.add_argument("--no-daily", action="store_true", help="Don't fetch daily bars for lookback")
+    parser.add_argument("--seed", type=int, default=0, help="Slippage noise seed")
+    parser.add_argument("--verbose", action="store_true", help="Show the bot's logs")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    symbols = [symbol.upper() for symbol in args.symbols]
+    end_day = args.end or args.start
+
+    data = await load_market_data(symbols, args.start, end_day, daily=not args.no_daily)
+    if not data.symbols:
+        print("No minute bars for any symbol")
+        sys.exit(1)
+
+    # Pre-market open of the first day to the after-hours close of the last
+    replay = BotReplay(
+        data,
+        start=EASTERN.localize(datetime(args.start.year, args.start.month, args.start.day, 4)),
+        end=EASTERN.localize(datetime(end_day.year, end_day.month, end_day.day, 20)),
+        symbols=data.symbols,
+        starting_cash=args.cash,
+        use_exit_manager=args.exit_manager,
+        use_circuit_breaker=args.circuit_breaker,
+        seed=args.seed,
+    )
+    result = await replay.run()
+    backtest = result.backtest
+    metrics = backtest.metrics
+
+    print(f"\nReplayed {', '.join(backtest.symbols)} {args.start} - {end_day}")
+    print(f"  {backtest.bars_processed} minute bars in {result.wall_seconds:.1f}s ({result.speedup:,.0f}x real time)")
+    print(f"  Orders: {result.orders_submitted} submitted, {result.orders_rejected} rejected, {result.fills} fills")
+    print(f"  Round trips: {len(backtest.trades)} (win rate {metrics.win_rate:.1f}%)")
+    if args.exit_manager:
+        print(f"  Exit manager exits: {result.exits_managed}")
+    if args.circuit_breaker:
+        print(f"  Circuit breaker triggers: {len(result.breaker_triggers)}")
+    print(f"  Final equity: ${backtest.final_equity:,.2f} ({metrics.total_return_pct:+.2f}%)")
+
+    print("\nSession closes:")
+    for point in backtest.equity_curve:
+        print(f"  {point.timestamp.astimezone(EASTERN):%Y-%m-%d %H:%M} ET  ${point.equity:,.2f}")
+
+    if backtest.trades:
+        print("\nTrades:")
+        for trade in backtest.trades:
+            print(f"  {trade.symbol:<6} {trade.quantity:>8g} @ {trade.entry_price:>9.2f} -> {trade.exit_price:>9.2f}"
+                  f"  {trade.pnl:>+10.2f}  {trade.reason}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
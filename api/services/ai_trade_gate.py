@@ -94,6 +94,7 @@ class AITradeGate:
 
         # Recent decisions cache
         self._decision_cache: Dict[str, TradeGateResult] = {}
+        self._decision_cache_times: Dict[str, datetime] = {}
         self._cache_ttl_seconds = 300  # 5 minutes
 
         # Statistics
@@ -546,6 +547,7 @@ Also provide:
     def _cache_decision(self, cache_key: str, result: TradeGateResult):
         """Cache a decision"""
         self._decision_cache[cache_key] = result
+        self._decision_cache_times[cache_key] = datetime.now()
 
         # Limit cache size
         if len(self._decision_cache) > 100:
@@ -553,6 +555,68 @@ Also provide:
             keys = list(self._decision_cache.keys())
             for key in keys[:50]:
                 del self._decision_cache[key]
+                self._decision_cache_times.pop(key, None)
+
+    # ==================== SNAPSHOT ====================
+
+    def export_state(self) -> Dict[str, Any]:
+        """Export unexpired cached decisions, history and stats for a warm-restart snapshot"""
+        now = datetime.now()
+        cache = {}
+        for key, result in self._decision_cache.items():
+            cached_at = self._decision_cache_times.get(key)
+            if not cached_at or (now - cached_at).total_seconds() > self._cache_ttl_seconds:
+                continue
+            cache[key] = {
+                "decision": result.decision.value,
+                "confidence": result.confidence,
+                "reasons": result.reasons,
+                "concerns": result.concerns,
+                "suggested_stop_loss": result.suggested_stop_loss,
+                "suggested_take_profit": result.suggested_take_profit,
+                "suggested_size_multiplier": result.suggested_size_multiplier,
+                "cached_at": cached_at.isoformat(),
+            }
+
+        return {
+            "decision_cache": cache,
+            "decision_history": self._decision_history[-self._max_history:],
+            "stats": dict(self._stats),
+        }
+
+    def restore_state(self, state: Dict[str, Any]) -> int:
+        """
+        Restore cached decisions from a snapshot, dropping any past their TTL.
+
+        Returns the number of cached decisions restored.
+        """
+        now = datetime.now()
+        restored = 0
+        for key, data in state.get("decision_cache", {}).items():
+            try:
+                cached_at = datetime.fromisoformat(data["cached_at"])
+                if (now - cached_at).total_seconds() > self._cache_ttl_seconds:
+                    continue
+                self._decision_cache[key] = TradeGateResult(
+                    decision=TradeDecision(data["decision"]),
+                    confidence=data["confidence"],
+                    reasons=data.get("reasons", []),
+                    concerns=data.get("concerns", []),
+                    suggested_stop_loss=data.get("suggested_stop_loss"),
+                    suggested_take_profit=data.get("suggested_take_profit"),
+                    suggested_size_multiplier=data.get("suggested_size_multiplier", 1.0),
+                )
+                self._decision_cache_times[key] = cached_at
+                restored += 1
+            except (KeyError, ValueError) as e:
+                logger.warning(f"Skipping invalid AI gate snapshot entry {key}: {e}")
+
+        if not self._decision_history:
+            self._decision_history = list(state.get("decision_history", []))[-self._max_history:]
+        if self._stats["total_evaluations"] == 0 and state.get("stats"):
+            self._stats.update(state["stats"])
+
+        return restored
 
     # ==================== STATISTICS ====================
 
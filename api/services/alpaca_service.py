@@ -26,6 +26,35 @@ load_dotenv()
 
 logger = get_logger(__name__)
 
+# Market sessions in minutes from midnight, Eastern Time
+PRE_MARKET_START = 4 * 60      # 4:00 AM
+REGULAR_START = 9 * 60 + 30    # 9:30 AM
+REGULAR_END = 16 * 60          # 4:00 PM
+AFTER_HOURS_END = 20 * 60      # 8:00 PM
+
+
+def market_session(now_eastern: datetime) -> tuple[str, bool]:
+    """
+    Trading session at a time in US/Eastern.
+
+    Returns:
+        (session, can_trade): session is "pre_market", "regular",
+        "after_hours", "overnight" or "weekend"; can_trade is True for the
+        first three (extended hours need limit orders)
+    """
+    if now_eastern.weekday() >= 5:
+        return "weekend", False
+    minutes = now_eastern.hour * 60 + now_eastern.minute
+    if minutes < PRE_MARKET_START:
+        return "overnight", False
+    if minutes < REGULAR_START:
+        return "pre_market", True
+    if minutes < REGULAR_END:
+        return "regular", True
+    if minutes < AFTER_HOURS_END:
+        return "after_hours", True
+    return "overnight", False
+
 
 class AlpacaService:
     """
@@ -1291,37 +1320,7 @@ class AlpacaService:
             # Get current time in Eastern
             eastern = pytz.timezone('US/Eastern')
             now_eastern = datetime.now(eastern)
-            current_hour = now_eastern.hour
-            current_minute = now_eastern.minute
-            current_time_minutes = current_hour * 60 + current_minute
-
-            # Define market sessions in minutes from midnight
-            PRE_MARKET_START = 4 * 60      # 4:00 AM
-            REGULAR_START = 9 * 60 + 30    # 9:30 AM
-            REGULAR_END = 16 * 60          # 4:00 PM
-            AFTER_HOURS_END = 20 * 60      # 8:00 PM
-
-            # Determine current session
-            is_weekday = now_eastern.weekday() < 5
-
-            if not is_weekday:
-                session = "weekend"
-                can_trade = False
-            elif current_time_minutes < PRE_MARKET_START:
-                session = "overnight"
-                can_trade = False
-            elif current_time_minutes < REGULAR_START:
-                session = "pre_market"
-                can_trade = True  # Can trade with extended hours orders
-            elif current_time_minutes < REGULAR_END:
-                session = "regular"
-                can_trade = True
-            elif current_time_minutes < AFTER_HOURS_END:
-                session = "after_hours"
-                can_trade = True  # Can trade with extended hours orders
-            else:
-                session = "overnight"
-                can_trade = False
+            session, can_trade = market_session(now_eastern)
 
             return {
                 "is_open": clock.is_open,
@@ -1489,6 +1488,8 @@ def get_alpaca_service(paper_trading: bool = None) -> AlpacaService:
 
     If paper_trading is None, uses the current global trading mode.
     Paper and live services are maintained separately as singletons.
+    With TRADING_BROKER_BACKEND=simulated, paper trading goes to the
+    in-memory SimulatedBroker instead of Alpaca's paper API.
     """
     global _alpaca_paper_service, _alpaca_live_service, _current_trading_mode
 
@@ -1497,6 +1498,10 @@ def get_alpaca_service(paper_trading: bool = None) -> AlpacaService:
         paper_trading = _current_trading_mode
 
     if paper_trading:
+        from config.trading_config import get_trading_config
+        if get_trading_config().broker_backend == "simulated":
+            from services.simulated_broker import get_simulated_broker
+            return get_simulated_broker()
         if _alpaca_paper_service is None:
             _alpaca_paper_service = AlpacaService(paper_trading=True)
             logger.info("Created Alpaca PAPER trading service")
@@ -11,12 +11,18 @@ This ensures the bot adapts to changing market conditions without manual interve
 """
 import logging
 import asyncio
+import math
+import os
+import random
+import statistics
 from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass, field
 from enum import Enum
 
 from .walk_forward_backtester import get_walk_forward_backtester, WalkForwardResult
+from .param_search import ParamSearch, SearchBudget, SearchSpace, TPESearch
+from .weight_scoring import WeightScorer
 from .strategy_engine import StrategyEngine, DEFAULT_WEIGHTS
 from .alpaca_service import get_alpaca_service
 
@@ -100,16 +106,24 @@ class AutoOptimizer:
     3. Recent performance metrics
     """
 
-    def __init__(self):
+    def __init__(self, alpaca_service=None):
         self.backtester = get_walk_forward_backtester()
-        self.alpaca = get_alpaca_service()
+        self.alpaca = alpaca_service or get_alpaca_service()
 
         # Optimization settings
         self.optimization_interval_hours = 168  # Weekly by default (7 * 24)
-        self.min_interval_hours = 24  # Don't optimize more than once per day
+        self.min_interval_hours = 1  # Don't optimize more than once per hour
         self.lookback_days = 180  # 6 months of data for backtesting
         self.min_robustness_score = 50  # Don't update if robustness too low
 
+        # Weight search: the current, regime preset and default weights are
+        # scored first, then the search explores within the budget
+        self.weight_search: ParamSearch = TPESearch(n_trials=40, n_startup=8)
+        self.search_budget = SearchBudget(max_evaluations=40, max_seconds=30 * 60)
+
+        # Processes scoring the optimization symbols in parallel
+        self.optimizer_workers = min(5, os.cpu_count() or 1)
+
         # State tracking
         self.last_optimization: Optional[datetime] = None
         self.optimization_history: List[OptimizationResult] = []
@@ -281,12 +295,11 @@ class AutoOptimizer:
             return None
 
     async def _fetch_historical_data(self) -> Dict[str, Dict[str, List]]:
-        """Fetch historical data for optimization symbols"""
-        data = {}
+        """Fetch historical data for optimization symbols (concurrently)"""
         end_date = datetime.now(timezone.utc)
         start_date = end_date - timedelta(days=self.lookback_days)
 
-        for symbol in self.optimization_symbols:
+        async def fetch(symbol: str) -> Optional[Dict[str, List]]:
             try:
                 bars = await asyncio.to_thread(
                     self.alpaca.get_stock_bars,
@@ -298,7 +311,8 @@ class AutoOptimizer:
                 )
 
                 if bars and len(bars) >= 50:
-                    data[symbol] = {
+                    logger.debug(f"Fetched {len(bars)} bars for {symbol}")
+                    return {
                         "opens": [b["open"] for b in bars],
                         "highs": [b["high"] for b in bars],
                         "lows": [b["low"] for b in bars],
@@ -306,14 +320,14 @@ class AutoOptimizer:
                         "volumes": [b["volume"] for b in bars],
                         "dates": [b.get("timestamp", b.get("t", "")) for b in bars],
                     }
-                    logger.debug(f"Fetched {len(bars)} bars for {symbol}")
-                else:
-                    logger.warning(f"Insufficient data for {symbol}: {len(bars) if bars else 0} bars")
+                logger.warning(f"Insufficient data for {symbol}: {len(bars) if bars else 0} bars")
 
             except Exception as e:
                 logger.warning(f"Failed to fetch data for {symbol}: {e}")
+            return None
 
-        return data
+        fetched = await asyncio.gather(*(fetch(symbol) for symbol in self.optimization_symbols))
+        return {symbol: data for symbol, data in zip(self.optimization_symbols, fetched) if data}
 
     async def _detect_market_regime(self, historical_data: Dict) -> MarketRegime:
         """
@@ -386,7 +400,8 @@ class AutoOptimizer:
         Tests:
         1. Current weights
         2. Regime-specific preset weights
-        3. Variations of both
+        3. Default weights
+        4. Weight vectors proposed by weight_search, until search_budget runs out
         """
         # Get weight configurations to test
         weight_configs = [
@@ -394,165 +409,68 @@ class AutoOptimizer:
             ("regime_preset", REGIME_WEIGHT_ADJUSTMENTS.get(regime, DEFAULT_WEIGHTS)),
             ("default", DEFAULT_WEIGHTS),
         ]
+        names = {_weights_key(weights): name for name, weights in reversed(weight_configs)}
+        results: Dict[tuple, WalkForwardResult] = {}
 
-        best_result = None
-        best_weights = self._get_current_weights()
-        best_score = -float('inf')
-
-        # Test each weight configuration
-        for config_name, weights in weight_configs:
+        def objective(scorer: WeightScorer, weights: Dict[str, float], fidelity: float) -> float:
+            config_name = names.get(_weights_key(weights), f"search #{len(results) + 1}")
             try:
-                result = await self._run_backtest_with_weights(historical_data, weights)
-                if result is None:
-                    continue
-
-                # Score based on out-of-sample Sharpe and robustness
-                score = (result.out_of_sample_sharpe * 0.6) + (result.robustness_score / 100 * 0.4)
-
-                logger.info(
-                    f"Config '{config_name}': Sharpe={result.out_of_sample_sharpe:.2f}, "
-                    f"WinRate={result.win_rate:.1f}%, Robustness={result.robustness_score:.0f}%, "
-                    f"Score={score:.3f}"
+                result = self._run_backtest_with_weights(scorer, weights, fidelity)
+            except Exception as e:
+                logger.warning(f"Backtest failed for {config_name}: {e}")
+                return -math.inf
+            if result is None:
+                return -math.inf
+
+            # Score based on out-of-sample Sharpe and robustness
+            score = (result.out_of_sample_sharpe * 0.6) + (result.robustness_score / 100 * 0.4)
+            if fidelity == 1.0:
+                results[_weights_key(weights)] = result
+
+            logger.info(
+                f"Config '{config_name}': Sharpe={result.out_of_sample_sharpe:.2f}, "
+                f"WinRate={result.win_rate:.1f}%, Robustness={result.robustness_score:.0f}%, "
+                f"Score={score:.3f}"
+            )
+            return score
+
+        # Same slippage noise for every candidate, so scores differ only through the weights
+        seed = random.getrandbits(32)
+
+        def run_search():
+            with WeightScorer(
+                historical_data, self.backtester, workers=self.optimizer_workers, seed=seed,
+            ) as scorer:
+                return self.weight_search.search(
+                    SearchSpace.weights(DEFAULT_WEIGHTS),
+                    lambda weights, fidelity: objective(scorer, weights, fidelity),
+                    self.search_budget,
+                    initial=[weights for _, weights in weight_configs],
                 )
 
-                if score > best_score:
-                    best_score = score
-                    best_result = result
-                    best_weights = weights
+        # Off the event loop - a full search runs for up to search_budget.max_seconds
+        search = await asyncio.to_thread(run_search)
 
-            except Exception as e:
-                logger.warning(f"Backtest failed for {config_name}: {e}")
+        best_result = results.get(_weights_key(search.best_params))
+        if best_result is None:
+            return self._get_current_weights(), None
 
-        return best_weights, best_result
+        logger.info(
+            f"Weight search ({search.method}): {len(search.evaluations)} backtests in "
+            f"{search.elapsed_seconds:.0f}s, best score {search.best_score:.3f}"
+        )
+        return search.best_params, best_result
 
-    async def _run_backtest_with_weights(
+    def _run_backtest_with_weights(
         self,
-        historical_data: Dict,
-        weights: Dict[str, float]
+        scorer: WeightScorer,
+        weights: Dict[str, float],
+        fidelity: float = 1.0,
     ) -> Optional[WalkForwardResult]:
-        """Run a walk-forward backtest with specific weights"""
-        # Use SPY as the primary test symbol
-        if "SPY" not in historical_data:
+        """Walk-forward backtest of specific weights across the optimization symbols"""
+        if not scorer.symbols:
             return None
-
-        data = historical_data["SPY"]
-
-        # Create a simple strategy function based on weights
-        def weighted_strategy(i, opens, highs, lows, closes, volumes, params):
-            """Strategy using weighted indicator scoring"""
-            if i < 50:
-                return False, ""
-
-            # Calculate individual indicator signals
-            signals = {}
-
-            # RSI
-            rsi = self._calculate_rsi(closes, i, params.get("rsi_period", 14))
-            if rsi < params.get("rsi_oversold", 30):
-                signals["rsi"] = 1  # Bullish
-            elif rsi > params.get("rsi_overbought", 70):
-                signals["rsi"] = -1  # Bearish
-            else:
-                signals["rsi"] = 0
-
-            # SMA Crossover
-            sma_short = sum(closes[i-20:i]) / 20
-            sma_long = sum(closes[i-50:i]) / 50
-            signals["sma_crossover"] = 1 if sma_short > sma_long else -1
-
-            # Momentum (20-day return)
-            momentum = (closes[i] - closes[i-20]) / closes[i-20]
-            signals["momentum"] = 1 if momentum > 0.02 else (-1 if momentum < -0.02 else 0)
-
-            # Bollinger Bands
-            bb_period = params.get("bb_period", 20)
-            bb_std = params.get("bb_std", 2.0)
-            sma = sum(closes[i-bb_period:i]) / bb_period
-            std = (sum((c - sma)**2 for c in closes[i-bb_period:i]) / bb_period) ** 0.5
-            upper = sma + bb_std * std
-            lower = sma - bb_std * std
-            if closes[i] < lower:
-                signals["bollinger"] = 1
-                signals["mean_reversion"] = 1
-            elif closes[i] > upper:
-                signals["bollinger"] = -1
-                signals["mean_reversion"] = -1
-            else:
-                signals["bollinger"] = 0
-                signals["mean_reversion"] = 0
-
-            # MACD
-            fast_ema = self._calculate_ema(closes, i, params.get("macd_fast", 12))
-            slow_ema = self._calculate_ema(closes, i, params.get("macd_slow", 26))
-            macd = fast_ema - slow_ema
-            signals["macd"] = 1 if macd > 0 else -1
-
-            # Volume (above average = confirmation)
-            avg_vol = sum(volumes[i-20:i]) / 20
-            signals["volume"] = 1 if volumes[i] > avg_vol * 1.2 else 0
-
-            # Calculate weighted score
-            score = 0
-            for indicator, signal in signals.items():
-                weight = weights.get(indicator, 0)
-                score += signal * weight
-
-            # Generate signal based on score
-            if score > 0.3:
-                return True, "long"
-            elif score < -0.3:
-                return True, "short"
-            return False, ""
-
-        # Run walk-forward backtest
-        result = self.backtester.run_walk_forward(
-            opens=data["opens"],
-            highs=data["highs"],
-            lows=data["lows"],
-            closes=data["closes"],
-            volumes=data["volumes"],
-            dates=data["dates"],
-            strategy_func=weighted_strategy,
-            num_windows=4,
-            initial_capital=100000,
-        )
-
-        result.symbol = "SPY"
-        return result
-
-    def _calculate_rsi(self, closes: List[float], i: int, period: int) -> float:
-        """Calculate RSI at index i"""
-        if i < period:
-            return 50
-
-        gains = []
-        losses = []
-        for j in range(i - period, i):
-            change = closes[j + 1] - closes[j]
-            if change > 0:
-                gains.append(change)
-                losses.append(0)
-            else:
-                gains.append(0)
-                losses.append(abs(change))
-
-        avg_gain = sum(gains) / period if gains else 0
-        avg_loss = sum(losses) / period if losses else 0
-
-        if avg_loss == 0:
-            return 100
-        rs = avg_gain / avg_loss
-        return 100 - (100 / (1 + rs))
-
-    def _calculate_ema(self, closes: List[float], i: int, period: int) -> float:
-        """Calculate EMA at index i"""
-        if i < period:
-            return closes[i]
-        mult = 2 / (period + 1)
-        value = sum(closes[i-period:i-period+period]) / period
-        for j in range(i - period + 1, i + 1):
-            value = (closes[j] - value) * mult + value
-        return value
+        return _combine_results(scorer.score(weights, fidelity))
 
     def _should_update_weights(
         self,
@@ -602,6 +520,12 @@ class AutoOptimizer:
             "next_optimization_in_hours": self._hours_until_next_optimization(),
             "optimization_symbols": self.optimization_symbols,
             "lookback_days": self.lookback_days,
+            "weight_search": self.weight_search.name,
+            "optimizer_workers": self.optimizer_workers,
+            "search_budget": {
+                "max_evaluations": self.search_budget.max_evaluations,
+                "max_seconds": self.search_budget.max_seconds,
+            },
             "current_weights": self._get_current_weights(),
             "recent_optimizations": [
                 {
@@ -625,6 +549,44 @@ class AutoOptimizer:
         return max(0, remaining)
 
 
+def _combine_results(results: Dict[str, WalkForwardResult]) -> WalkForwardResult:
+    """
+    One result for a weight vector across symbols: Sharpe, efficiency,
+    return and robustness averaged per symbol; trade statistics pooled.
+    """
+    symbol_results = list(results.values())
+    trades = [trade for result in symbol_results for window in result.windows for trade in window.trades]
+    wins = sum(t.get("pnl", 0) for t in trades if t.get("pnl", 0) > 0)
+    losses = abs(sum(t.get("pnl", 0) for t in trades if t.get("pnl", 0) <= 0))
+    total_trades = sum(result.total_trades for result in symbol_results)
+
+    return WalkForwardResult(
+        symbol=",".join(results),
+        strategy="walk_forward",
+        total_windows=sum(result.total_windows for result in symbol_results),
+        in_sample_sharpe=round(statistics.mean(r.in_sample_sharpe for r in symbol_results), 3),
+        out_of_sample_sharpe=round(statistics.mean(r.out_of_sample_sharpe for r in symbol_results), 3),
+        efficiency_ratio=round(statistics.mean(r.efficiency_ratio for r in symbol_results), 3),
+        total_return_pct=round(statistics.mean(r.total_return_pct for r in symbol_results), 2),
+        total_trades=total_trades,
+        win_rate=round(sum(r.win_rate * r.total_trades for r in symbol_results) / total_trades, 2)
+        if total_trades else 0,
+        profit_factor=round(wins / losses, 3) if losses > 0 else float('inf'),
+        max_drawdown_pct=max(r.max_drawdown_pct for r in symbol_results),
+        avg_slippage_pct=round(statistics.mean(r.avg_slippage_pct for r in symbol_results), 4),
+        total_slippage_cost=round(sum(r.total_slippage_cost for r in symbol_results), 2),
+        windows=[window for result in symbol_results for window in result.windows],
+        optimal_params_summary={symbol: r.optimal_params_summary for symbol, r in results.items()},
+        robustness_score=round(statistics.mean(r.robustness_score for r in symbol_results), 1),
+        seed=symbol_results[0].seed,
+    )
+
+
+def _weights_key(weights: Dict[str, float]) -> tuple:
+    """Hashable form of a weight vector (rounded like SearchSpace.weights points)"""
+    return tuple(sorted((name, round(value, 3)) for name, value in weights.items()))
+
+
 # Singleton instance
 _auto_optimizer: Optional[AutoOptimizer] = None
 
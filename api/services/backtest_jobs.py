@@ -0,0 +1,734 @@
+"""
+Backtest Job Queue
+==================
+
+Runs backtests as background jobs instead of inside the HTTP request, so
+long walk-forward or multi-symbol runs don't hit client timeouts or tie up
+the API server.
+
+Flow:
+- submit() records the job (QUEUED) and returns its id immediately.
+- At most `max_concurrent_jobs` jobs run at a time, each in its own
+  spawned process. CPU-heavy simulation never shares the API's (or an
+  embedded trading bot's) GIL, and a cancelled or stuck run can be
+  terminated without taking anything else down.
+- The job process reports progress over a queue; the manager keeps the
+  job's percentage and ETA current, and persists status, progress and the
+  final result in the backtest_jobs table. Jobs can also report a progress
+  detail (walk-forward: the windows finished so far), kept in memory only.
+- Walk-forward jobs run their windows on a process pool of their own, so
+  their processes are started non-daemonic (daemons can't have children);
+  shutdown() still terminates them.
+- Cancellation is cooperative (the engine polls a flag between bars) with
+  a hard terminate after a grace period.
+- Several API workers can share the table. Each row records the worker
+  that owns it, and the owner refreshes a heartbeat while the job is
+  active. A cancel request that reaches another worker sets the row's
+  cancel_requested flag, which the owner polls. At startup a worker fails
+  only the active rows whose heartbeat has gone stale.
+
+Caps keep backtests from starving the live bot: a per-instance
+concurrency limit, a per-instance queue limit, and a per-client limit on
+active (queued + running) jobs. Rejected submissions raise
+BacktestJobLimitError.
+"""
+
+import asyncio
+import logging
+import multiprocessing as mp
+import os
+import queue
+import socket
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from enum import Enum
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
+
+from exceptions import BacktestCancelledError, BacktestJobLimitError
+
+logger = logging.getLogger(__name__)
+
+
+class BacktestJobStatus(str, Enum):
+    """Lifecycle of a backtest job"""
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+    CANCELLED = "CANCELLED"
+
+
+FINISHED_STATUSES = {BacktestJobStatus.COMPLETED, BacktestJobStatus.FAILED, BacktestJobStatus.CANCELLED}
+
+
+# ==================== JOB PROCESS ====================
+
+async def _run_backtest_job(payload: Dict[str, Any], data_service, progress, should_cancel) -> Dict[str, Any]:
+    """Engine backtest from a models.backtest.BacktestRequest payload"""
+    from models.backtest import BacktestRequest
+    from services.backtesting.engine import run_backtest
+
+    result = await run_backtest(
+        BacktestRequest(**payload),
+        data_service=data_service,
+        progress_callback=progress,
+        should_cancel=should_cancel,
+    )
+    return result.model_dump(mode="json")
+
+
+async def _run_symbol_backtest_job(payload: Dict[str, Any], data_service, progress, should_cancel) -> Dict[str, Any]:
+    """Single-symbol strategy backtest (the /api/advanced backtester)"""
+    from services.backtester import run_symbol_backtest, backtest_summary
+
+    result = await run_symbol_backtest(data_service, **payload)
+    if should_cancel():
+        raise BacktestCancelledError()
+    progress(1.0)
+    return backtest_summary(result)
+
+
+async def _run_walk_forward_job(payload: Dict[str, Any], data_service, progress, should_cancel) -> Dict[str, Any]:
+    """Walk-forward optimization from a models.backtest.WalkForwardRequest payload"""
+    from models.backtest import WalkForwardRequest
+    from services.backtesting.data_loader import DataLoader
+    from services.param_search import SearchBudget, create_search
+    from services.walk_forward_backtester import WalkForwardBacktester
+
+    request = WalkForwardRequest(**payload)
+    # Column arrays - views of the shared price matrix when one is configured
+    data = await DataLoader(data_service).load([request.symbol], request.start_date, request.end_date)
+    symbol_data = data.symbol_data.get(request.symbol)
+    if symbol_data is None or not symbol_data.bars:
+        raise ValueError(f"No bars for {request.symbol} between {request.start_date} and {request.end_date}")
+
+    reported_windows = [0]
+
+    def on_progress(state) -> None:
+        if should_cancel():
+            raise BacktestCancelledError()
+        # The finished windows whenever another one completes
+        detail = None
+        if state.completed_windows != reported_windows[0]:
+            reported_windows[0] = state.completed_windows
+            detail = state.to_dict()
+        progress(state.percent / 100, detail)
+
+    strategies = {"rsi": WalkForwardBacktester.rsi_strategy, "macd": WalkForwardBacktester.macd_strategy}
+    result = WalkForwardBacktester().run_walk_forward(
+        opens=symbol_data.array("open"),
+        highs=symbol_data.array("high"),
+        lows=symbol_data.array("low"),
+        closes=symbol_data.array("close"),
+        volumes=symbol_data.array("volume"),
+        dates=[str(timestamp) for timestamp in data.timestamps],
+        strategy_func=strategies[request.strategy],
+        param_ranges=request.param_ranges,
+        train_pct=request.train_pct,
+        num_windows=request.num_windows,
+        initial_capital=request.initial_capital,
+        workers=request.workers,
+        seed=request.seed,
+        progress_callback=on_progress,
+        search=create_search(request.search) if request.search else None,
+        search_budget=SearchBudget(max_evaluations=request.max_evaluations) if request.max_evaluations else None,
+    )
+    result.symbol = request.symbol
+    return asdict(result)
+
+
+JOB_RUNNERS: Dict[str, Callable] = {
+    "backtest": _run_backtest_job,
+    "symbol_backtest": _run_symbol_backtest_job,
+    "walk_forward": _run_walk_forward_job,
+}
+
+# Job kinds that start a process pool of their own
+POOL_JOB_KINDS = {"walk_forward"}
+
+
+def _default_data_service():
+    from .alpaca_service import get_alpaca_service
+    return get_alpaca_service()
+
+
+def _job_process_main(
+    kind: str,
+    payload: Dict[str, Any],
+    messages: "mp.Queue",
+    cancel_event: Any,
+    data_service_factory: Optional[Callable[[], Any]],
+) -> None:
+    """Job process entry point: run one backtest and report back over `messages`"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [backtest-job] %(name)s %(levelname)s: %(message)s",
+    )
+    last_reported = [-1.0]
+
+    def progress(fraction: float, detail: Optional[Dict[str, Any]] = None) -> None:
+        # At most one message per percent; details always go through
+        if detail is not None:
+            messages.put(("detail", detail))
+        if fraction - last_reported[0] >= 0.01 or fraction >= 1.0:
+            last_reported[0] = fraction
+            messages.put(("progress", fraction))
+
+    try:
+        data_service = (data_service_factory or _default_data_service)()
+        result = asyncio.run(JOB_RUNNERS[kind](payload, data_service, progress, cancel_event.is_set))
+        messages.put(("result", result))
+    except BacktestCancelledError:
+        messages.put(("cancelled", None))
+    except Exception as e:
+        messages.put(("error", f"{type(e).__name__}: {e}"))
+
+
+# ==================== MANAGER ====================
+
+@dataclass
+class BacktestJob:
+    """One submitted backtest"""
+    job_id: str
+    kind: str
+    payload: Dict[str, Any]
+    client_id: str
+    status: BacktestJobStatus = BacktestJobStatus.QUEUED
+    progress: float = 0.0  # 0-100
+    progress_detail: Optional[Dict[str, Any]] = None  # Kind-specific, e.g. finished walk-forward windows
+    created_at: datetime = field(default_factory=datetime.now)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    cancel_requested: bool = False
+
+    # Runtime handles (not persisted)
+    _task: Any = None
+    _process: Any = None
+    _cancel_event: Any = None
+    _started_monotonic: Optional[float] = None
+    _last_persisted: float = 0.0
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        if self.status != BacktestJobStatus.RUNNING or not self._started_monotonic or self.progress <= 0:
+            return None
+        elapsed = time.monotonic() - self._started_monotonic
+        return round(elapsed * (100 - self.progress) / self.progress, 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "client_id": self.client_id,
+            "status": self.status.value,
+            "progress": round(self.progress, 1),
+            "eta_seconds": self.eta_seconds,
+            "progress_detail": self.progress_detail,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "error": self.error,
+            "cancel_requested": self.cancel_requested,
+            "request": self.payload,
+        }
+
+
+class BacktestJobManager:
+    """
+    Bounded pool of backtest job processes.
+
+    Usage:
+        manager = get_backtest_job_manager()
+        job = await manager.submit("backtest", request.model_dump(mode="json"), client_id="10.0.0.5")
+        await manager.get(job.job_id)          # status, progress, ETA
+        await manager.get_result(job.job_id)   # result once COMPLETED
+        await manager.cancel(job.job_id)
+    """
+
+    def __init__(
+        self,
+        max_concurrent_jobs: int = 2,
+        max_jobs_per_client: int = 2,
+        max_queued_jobs: int = 20,
+        data_service_factory: Optional[Callable[[], Any]] = None,
+        persist: bool = True,
+        cancel_grace_seconds: float = 5.0,
+        max_finished_jobs: int = 100,
+        instance_id: Optional[str] = None,
+        heartbeat_seconds: float = 2.0,
+        stale_after_seconds: float = 30.0,
+    ):
+        """
+        Args:
+            max_concurrent_jobs: Job processes running at once on this instance
+            max_jobs_per_client: Active (queued + running) jobs per client
+            max_queued_jobs: Jobs waiting for a slot on this instance
+            data_service_factory: Picklable zero-arg callable creating the job
+                processes' bar source (default: Alpaca)
+            persist: Store jobs in the backtest_jobs table
+            cancel_grace_seconds: Time a cancelled job gets to stop before it's terminated
+            max_finished_jobs: Finished jobs kept in memory (older ones are served from the DB)
+            instance_id: Owner id stored on this instance's rows (default: host, pid and a random suffix)
+            heartbeat_seconds: How often active rows are refreshed and checked for cancel requests
+            stale_after_seconds: Heartbeat age after which an active row counts as abandoned
+        """
+        if max_concurrent_jobs < 1:
+            raise ValueError(f"max_concurrent_jobs must be at least 1, got {max_concurrent_jobs}")
+
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.max_jobs_per_client = max_jobs_per_client
+        self.max_queued_jobs = max_queued_jobs
+        self.data_service_factory = data_service_factory
+        self.persist = persist
+        self.cancel_grace_seconds = cancel_grace_seconds
+        self.max_finished_jobs = max_finished_jobs
+        self.instance_id = instance_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.heartbeat_seconds = heartbeat_seconds
+        self.stale_after_seconds = stale_after_seconds
+
+        self._mp = mp.get_context("spawn")
+        self._jobs: Dict[str, BacktestJob] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+
+        # Statistics
+        self._submitted = 0
+        self._rejected = 0
+
+    # ===== SUBMISSION =====
+
+    async def submit(self, kind: str, payload: Dict[str, Any], client_id: str = "anonymous") -> BacktestJob:
+        """
+        Queue a backtest job.
+
+        Raises:
+            ValueError: Unknown job kind
+            BacktestJobLimitError: A concurrency cap was hit
+        """
+        if kind not in JOB_RUNNERS:
+            raise ValueError(f"Unknown backtest job kind: {kind}")
+
+        active = [job for job in self._jobs.values() if not job.is_finished]
+        client_active = sum(1 for job in active if job.client_id == client_id)
+        if client_active >= self.max_jobs_per_client:
+            self._rejected += 1
+            raise BacktestJobLimitError(
+                f"Client already has {client_active} active backtest job(s)", limit=self.max_jobs_per_client
+            )
+        queued = sum(1 for job in active if job.status == BacktestJobStatus.QUEUED)
+        if queued >= self.max_queued_jobs:
+            self._rejected += 1
+            raise BacktestJobLimitError("Backtest queue is full", limit=self.max_queued_jobs)
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent_jobs)
+        if self.persist and (self._heartbeat_task is None or self._heartbeat_task.done()):
+            self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+
+        job = BacktestJob(job_id=uuid.uuid4().hex, kind=kind, payload=payload, client_id=client_id)
+        self._jobs[job.job_id] = job
+        self._submitted += 1
+        await self._persist(job, force=True)
+        job._task = asyncio.create_task(self._run_job(job))
+        logger.info(f"[BacktestJobs] Queued {kind} job {job.job_id} for {client_id}")
+        return job
+
+    # ===== EXECUTION =====
+
+    async def _run_job(self, job: BacktestJob) -> None:
+        try:
+            async with self._semaphore:
+                if job.cancel_requested:
+                    await self._finish(job, BacktestJobStatus.CANCELLED)
+                    return
+                await self._execute(job)
+        except asyncio.CancelledError:
+            self._terminate(job)
+            if not job.is_finished:
+                if job.cancel_requested:
+                    await self._finish(job, BacktestJobStatus.CANCELLED)
+                else:
+                    await self._finish(job, BacktestJobStatus.FAILED, error="Interrupted by shutdown")
+            raise
+        except Exception as e:
+            logger.error(f"[BacktestJobs] Job {job.job_id} crashed: {e}")
+            self._terminate(job)
+            await self._finish(job, BacktestJobStatus.FAILED, error=f"{type(e).__name__}: {e}")
+        finally:
+            self._prune_finished()
+
+    async def _execute(self, job: BacktestJob) -> None:
+        messages = self._mp.Queue()
+        job._cancel_event = self._mp.Event()
+        job._process = self._mp.Process(
+            target=_job_process_main,
+            args=(job.kind, job.payload, messages, job._cancel_event, self.data_service_factory),
+            name=f"chartsense-backtest-{job.job_id[:8]}",
+            daemon=job.kind not in POOL_JOB_KINDS,
+        )
+        job._process.start()
+        job.status = BacktestJobStatus.RUNNING
+        job.started_at = datetime.now()
+        job._started_monotonic = time.monotonic()
+        await self._persist(job, force=True)
+
+        loop = asyncio.get_running_loop()
+        cancel_deadline = None
+
+        while not job.is_finished:
+            try:
+                kind, value = await loop.run_in_executor(None, partial(messages.get, True, 0.5))
+            except queue.Empty:
+                if job.cancel_requested:
+                    cancel_deadline = cancel_deadline or time.monotonic() + self.cancel_grace_seconds
+                    if time.monotonic() >= cancel_deadline:
+                        self._terminate(job)
+                        await self._finish(job, BacktestJobStatus.CANCELLED)
+                    continue
+                if job._process.is_alive():
+                    continue
+                try:
+                    # The process may have reported and exited since the get timed out
+                    kind, value = messages.get_nowait()
+                except queue.Empty:
+                    await self._finish(
+                        job, BacktestJobStatus.FAILED,
+                        error=f"Backtest process exited unexpectedly (code {job._process.exitcode})",
+                    )
+                    continue
+
+            if kind == "progress":
+                job.progress = min(100.0, value * 100)
+                await self._persist(job)
+            elif kind == "detail":
+                job.progress_detail = value
+            elif kind == "result":
+                job.progress = 100.0
+                await self._finish(job, BacktestJobStatus.COMPLETED, result=value)
+            elif kind == "cancelled":
+                await self._finish(job, BacktestJobStatus.CANCELLED)
+            else:
+                await self._finish(job, BacktestJobStatus.FAILED, error=value)
+
+        await loop.run_in_executor(None, job._process.join, 5)
+        self._terminate(job)
+
+    def _terminate(self, job: BacktestJob) -> None:
+        if job._process is not None and job._process.is_alive():
+            job._process.terminate()
+            job._process.join(timeout=5)
+
+    async def _finish(
+        self,
+        job: BacktestJob,
+        status: BacktestJobStatus,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        job.status = status
+        job.result = result
+        job.error = error
+        job.finished_at = datetime.now()
+        await self._persist(job, force=True)
+        logger.info(f"[BacktestJobs] Job {job.job_id} {status.value}" + (f": {error}" if error else ""))
+
+    def _prune_finished(self) -> None:
+        finished = [job for job in self._jobs.values() if job.is_finished]
+        for job in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self._jobs[job.job_id]
+
+    # ===== QUERIES =====
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job status, progress and ETA (from memory, else from the DB)"""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job.to_dict()
+        record = await asyncio.to_thread(self._load_record, job_id)
+        return _record_to_dict(record) if record else None
+
+    async def get_result(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Result of a completed job (None if unknown or not completed)"""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job.result
+        record = await asyncio.to_thread(self._load_record, job_id)
+        return record.result if record and record.status == BacktestJobStatus.COMPLETED.value else None
+
+    def list_jobs(self, client_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Jobs known to this instance, newest first"""
+        jobs = [job for job in self._jobs.values() if client_id is None or job.client_id == client_id]
+        return [job.to_dict() for job in sorted(jobs, key=lambda j: j.created_at, reverse=True)]
+
+    async def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Wait until a job on this instance finishes and return its status"""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return await self.get(job_id)
+        if job._task is not None and not job.is_finished:
+            await asyncio.wait_for(asyncio.shield(job._task), timeout)
+        return job.to_dict()
+
+    # ===== CANCELLATION / SHUTDOWN =====
+
+    async def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Cancel a job.
+
+        Queued jobs on this instance are cancelled immediately; running jobs
+        are asked to stop and terminated if they don't within the grace
+        period. Jobs owned by another worker get their cancel_requested flag
+        set, and that worker stops them on its next heartbeat.
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            return await asyncio.to_thread(self._request_cancel, job_id)
+        if job.is_finished:
+            return job.to_dict()
+
+        job.cancel_requested = True
+        if job.status == BacktestJobStatus.QUEUED:
+            job._task.cancel()
+            try:
+                await job._task
+            except asyncio.CancelledError:
+                pass
+            if not job.is_finished:  # Cancelled before the task ever ran
+                await self._finish(job, BacktestJobStatus.CANCELLED)
+        elif job._cancel_event is not None:
+            job._cancel_event.set()
+        return job.to_dict()
+
+    async def shutdown(self) -> None:
+        """Stop all queued and running jobs"""
+        tasks = [job._task for job in self._jobs.values() if job._task is not None and not job._task.done()]
+        if self._heartbeat_task is not None:
+            tasks.append(self._heartbeat_task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for job in self._jobs.values():
+            if not job.is_finished:
+                await self._finish(job, BacktestJobStatus.FAILED, error="Interrupted by shutdown")
+
+    def recover_interrupted_jobs(self) -> int:
+        """
+        Mark jobs left QUEUED/RUNNING by an API process that has gone away as
+        failed. Jobs of other live workers keep a fresh heartbeat and are left alone.
+        """
+        if not self.persist:
+            return 0
+        try:
+            from sqlalchemy import or_
+
+            from database.connection import SessionLocal
+            from database.models import BacktestJobRecord
+
+            stale_before = datetime.now() - timedelta(seconds=self.stale_after_seconds)
+            db = SessionLocal()
+            try:
+                count = (
+                    db.query(BacktestJobRecord)
+                    .filter(
+                        BacktestJobRecord.status.in_([BacktestJobStatus.QUEUED.value, BacktestJobStatus.RUNNING.value]),
+                        or_(BacktestJobRecord.heartbeat_at.is_(None), BacktestJobRecord.heartbeat_at < stale_before),
+                    )
+                    .update(
+                        {"status": BacktestJobStatus.FAILED.value, "error": "Interrupted by API restart",
+                         "finished_at": datetime.now()},
+                        synchronize_session=False,
+                    )
+                )
+                db.commit()
+                return count
+            finally:
+                db.close()
+        except Exception as e:
+            logger.warning(f"[BacktestJobs] Could not recover interrupted jobs: {e}")
+            return 0
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get job manager status"""
+        jobs = list(self._jobs.values())
+        return {
+            "max_concurrent_jobs": self.max_concurrent_jobs,
+            "max_jobs_per_client": self.max_jobs_per_client,
+            "max_queued_jobs": self.max_queued_jobs,
+            "running": sum(1 for j in jobs if j.status == BacktestJobStatus.RUNNING),
+            "queued": sum(1 for j in jobs if j.status == BacktestJobStatus.QUEUED),
+            "submitted": self._submitted,
+            "rejected": self._rejected,
+        }
+
+    # ===== PERSISTENCE =====
+
+    async def _persist(self, job: BacktestJob, force: bool = False) -> None:
+        """Write the job to the DB (progress-only updates at most every 2s)"""
+        if not self.persist:
+            return
+        now = time.monotonic()
+        if not force and now - job._last_persisted < 2.0:
+            return
+        job._last_persisted = now
+        fields = dict(
+            id=job.job_id,
+            kind=job.kind,
+            client_id=job.client_id,
+            status=job.status.value,
+            progress=job.progress,
+            request=job.payload,
+            result=job.result,
+            error=job.error[:500] if job.error else None,
+            owner_id=self.instance_id,
+            heartbeat_at=datetime.now(),
+            created_at=job.created_at,
+            started_at=job.started_at,
+            finished_at=job.finished_at,
+        )
+        # Only ever set here: a False would clear another worker's request
+        if job.cancel_requested:
+            fields["cancel_requested"] = True
+        await asyncio.to_thread(self._write_record, fields)
+
+    def _write_record(self, fields: Dict[str, Any]) -> None:
+        try:
+            from database.connection import SessionLocal
+            from database.models import BacktestJobRecord
+
+            db = SessionLocal()
+            try:
+                db.merge(BacktestJobRecord(**fields))
+                db.commit()
+            finally:
+                db.close()
+        except Exception as e:
+            logger.warning(f"[BacktestJobs] Could not persist job {fields['id']}: {e}")
+
+    async def _heartbeat_loop(self) -> None:
+        """Keep this instance's active rows fresh and pick up cancel requests from other workers"""
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            active = [job.job_id for job in self._jobs.values() if not job.is_finished]
+            if not active:
+                continue
+            for job_id in await asyncio.to_thread(self._heartbeat, active):
+                job = self._jobs.get(job_id)
+                if job is not None and not job.cancel_requested:
+                    logger.info(f"[BacktestJobs] Job {job_id} cancelled from another worker")
+                    await self.cancel(job_id)
+
+    def _heartbeat(self, job_ids: List[str]) -> List[str]:
+        """Refresh the jobs' heartbeat; returns the ids with a cancel request"""
+        try:
+            from database.connection import SessionLocal
+            from database.models import BacktestJobRecord
+
+            db = SessionLocal()
+            try:
+                rows = db.query(BacktestJobRecord).filter(BacktestJobRecord.id.in_(job_ids))
+                rows.update({"heartbeat_at": datetime.now()}, synchronize_session=False)
+                db.commit()
+                return [record.id for record in rows.filter(BacktestJobRecord.cancel_requested.is_(True))]
+            finally:
+                db.close()
+        except Exception as e:
+            logger.warning(f"[BacktestJobs] Could not refresh job heartbeats: {e}")
+            return []
+
+    def _request_cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Flag a job owned by another worker for cancellation"""
+        record = self._load_record(job_id)
+        if record is None:
+            return None
+        status = _record_to_dict(record)
+        if BacktestJobStatus(record.status) in FINISHED_STATUSES:
+            return status
+        try:
+            from database.connection import SessionLocal
+            from database.models import BacktestJobRecord
+
+            db = SessionLocal()
+            try:
+                db.query(BacktestJobRecord).filter(BacktestJobRecord.id == job_id).update(
+                    {"cancel_requested": True}, synchronize_session=False
+                )
+                db.commit()
+            finally:
+                db.close()
+        except Exception as e:
+            logger.warning(f"[BacktestJobs] Could not request cancel of job {job_id}: {e}")
+            return None
+        status["cancel_requested"] = True
+        return status
+
+    def _load_record(self, job_id: str):
+        if not self.persist:
+            return None
+        try:
+            from database.connection import SessionLocal
+            from database.models import BacktestJobRecord
+
+            db = SessionLocal()
+            try:
+                return db.query(BacktestJobRecord).filter(BacktestJobRecord.id == job_id).first()
+            finally:
+                db.close()
+        except Exception as e:
+            logger.warning(f"[BacktestJobs] Could not load job {job_id}: {e}")
+            return None
+
+
+def _record_to_dict(record) -> Dict[str, Any]:
+    return {
+        "job_id": record.id,
+        "kind": record.kind,
+        "client_id": record.client_id,
+        "status": record.status,
+        "progress": round(record.progress or 0.0, 1),
+        "eta_seconds": None,
+        "progress_detail": None,
+        "created_at": record.created_at.isoformat() if record.created_at else None,
+        "started_at": record.started_at.isoformat() if record.started_at else None,
+        "finished_at": record.finished_at.isoformat() if record.finished_at else None,
+        "error": record.error,
+        "cancel_requested": bool(record.cancel_requested),
+        "request": record.request,
+    }
+
+
+def client_id_for(request) -> str:
+    """Client key for per-client caps: X-Client-Id header, else the client address"""
+    header = request.headers.get("X-Client-Id")
+    if header:
+        return header[:100]
+    return request.client.host if request.client else "anonymous"
+
+
+# Singleton instance
+_backtest_job_manager: Optional[BacktestJobManager] = None
+
+
+def get_backtest_job_manager() -> BacktestJobManager:
+    """Get the global backtest job manager (caps from BACKTEST_* env vars)"""
+    global _backtest_job_manager
+    if _backtest_job_manager is None:
+        _backtest_job_manager = BacktestJobManager(
+            max_concurrent_jobs=int(os.getenv("BACKTEST_MAX_CONCURRENT_JOBS", "2")),
+            max_jobs_per_client=int(os.getenv("BACKTEST_MAX_JOBS_PER_CLIENT", "2")),
+            max_queued_jobs=int(os.getenv("BACKTEST_MAX_QUEUED_JOBS", "20")),
+        )
+    return _backtest_job_manager
+
+
+def peek_backtest_job_manager() -> Optional[BacktestJobManager]:
+    """The manager if it has been created (for shutdown)"""
+    return _backtest_job_manager
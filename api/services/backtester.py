@@ -3,12 +3,15 @@ Backtesting Engine
 Test trading strategies on historical data
 """
 import logging
-from typing import Dict, Any, Optional, List, Callable
+from typing import Dict, Any, Optional, List, Callable, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 import statistics
 
+import numpy as np
+
+from services.backtesting import sim_core
 from services.indicators import IndicatorService
 
 logger = logging.getLogger(__name__)
@@ -112,131 +115,131 @@ class BacktestEngine:
         sma_50 = self.indicator_service.calculate_sma(closes, 50)
         sma_200 = self.indicator_service.calculate_sma(closes, 200)
         upper_bb, middle_bb, lower_bb = self.indicator_service.calculate_bollinger_bands(closes)
-        atr = self.indicator_service.calculate_atr(highs, lows, closes, 14)
-
-        # Initialize tracking
-        capital = initial_capital
-        position = None  # Current position
-        trades = []
-        equity_curve = [initial_capital]
-        peak_equity = initial_capital
-        max_drawdown = 0
 
         # Minimum bars needed for indicators
         min_bars = 200 if sma_200 else 50
 
-        # Run through each bar
-        for i in range(min_bars, len(closes)):
-            current_price = closes[i]
-            current_date = dates[i]
-
-            # Update equity curve
-            if position:
-                unrealized_pnl = (current_price - position.entry_price) * position.quantity
-                if position.side == "short":
-                    unrealized_pnl = -unrealized_pnl
-                current_equity = capital + unrealized_pnl
-            else:
-                current_equity = capital
-
-            equity_curve.append(current_equity)
-
-            # Track max drawdown
-            if current_equity > peak_equity:
-                peak_equity = current_equity
-            drawdown = (peak_equity - current_equity) / peak_equity
-            if drawdown > max_drawdown:
-                max_drawdown = drawdown
-
-            # Check exit conditions if in position
-            if position:
-                exit_signal = False
-                exit_reason = ""
-
-                # Stop loss
-                if position.side == "long":
-                    if current_price <= position.entry_price * (1 - stop_loss_pct):
-                        exit_signal = True
-                        exit_reason = "stop_loss"
-                    elif current_price >= position.entry_price * (1 + take_profit_pct):
-                        exit_signal = True
-                        exit_reason = "take_profit"
-                else:  # Short
-                    if current_price >= position.entry_price * (1 + stop_loss_pct):
-                        exit_signal = True
-                        exit_reason = "stop_loss"
-                    elif current_price <= position.entry_price * (1 - take_profit_pct):
-                        exit_signal = True
-                        exit_reason = "take_profit"
-
-                # Strategy-specific exit
-                if not exit_signal:
-                    exit_signal, exit_reason = self._check_exit_signal(
-                        strategy, i, position.side,
-                        rsi, macd_line, signal_line, sma_20, sma_50, upper_bb, lower_bb,
-                        closes, strategy_params
-                    )
-
-                if exit_signal:
-                    # Close position
-                    if position.side == "long":
-                        pnl = (current_price - position.entry_price) * position.quantity
-                    else:
-                        pnl = (position.entry_price - current_price) * position.quantity
-
-                    pnl_pct = pnl / (position.entry_price * position.quantity) * 100
-
-                    position.exit_date = current_date
-                    position.exit_price = current_price
-                    position.pnl = pnl
-                    position.pnl_pct = pnl_pct
-                    position.exit_reason = exit_reason
-
-                    trades.append(position)
-                    capital += pnl
-                    position = None
-
-            # Check entry conditions if not in position
-            if not position:
-                entry_signal, side = self._check_entry_signal(
-                    strategy, i,
-                    rsi, macd_line, signal_line, sma_20, sma_50, sma_200,
-                    upper_bb, lower_bb, closes, strategy_params
-                )
-
-                if entry_signal:
-                    # Calculate position size
-                    position_value = capital * position_size_pct
-                    quantity = int(position_value / current_price)
-
-                    if quantity > 0:
-                        position = Trade(
-                            entry_date=current_date,
-                            entry_price=current_price,
-                            side=side,
-                            quantity=quantity
-                        )
-
-        # Close any remaining position at end
-        if position:
-            current_price = closes[-1]
-            if position.side == "long":
-                pnl = (current_price - position.entry_price) * position.quantity
-            else:
-                pnl = (position.entry_price - current_price) * position.quantity
-
-            position.exit_date = dates[-1]
-            position.exit_price = current_price
-            position.pnl = pnl
-            position.pnl_pct = pnl / (position.entry_price * position.quantity) * 100
-            position.exit_reason = "end_of_data"
-            trades.append(position)
-            capital += pnl
+        sides, long_exits, short_exits = self._signal_arrays(
+            strategy, rsi, macd_line, signal_line, sma_20, sma_50, sma_200,
+            upper_bb, lower_bb, closes, strategy_params
+        )
+        result = sim_core.simulate(
+            closes, min_bars, initial_capital, stop_loss_pct, take_profit_pct,
+            position_fraction=position_size_pct,
+            sides=sides,
+            long_exits=long_exits,
+            short_exits=short_exits,
+            close_at_end=True,
+        )
+
+        records = result.trades
+        trades = [
+            Trade(
+                entry_date=dates[entry_bar],
+                entry_price=entry_price,
+                exit_date=dates[exit_bar],
+                exit_price=exit_price,
+                side=side,
+                quantity=quantity,
+                pnl=pnl,
+                pnl_pct=pnl / (entry_price * quantity) * 100,
+                exit_reason=exit_reason,
+            )
+            for entry_bar, exit_bar, side, quantity, entry_price, exit_price, pnl, exit_reason in zip(
+                records.entry_bar.tolist(), records.exit_bar.tolist(), records.side, records.quantity.tolist(),
+                records.entry_price.tolist(), records.exit_price.tolist(), records.pnl.tolist(), records.exit_reason,
+            )
+        ]
 
         # Calculate metrics
         return self._calculate_metrics(
             strategy.value, symbol, dates[min_bars], dates[-1],
-            initial_capital, capital, trades, max_drawdown, equity_curve
+            initial_capital, result.final_capital, trades, result.max_drawdown, result.sharpe
+        )
+
+    def _signal_arrays(
+        self,
+        strategy: StrategyType,
+        rsi, macd_line, signal_line, sma_20, sma_50, sma_200,
+        upper_bb, lower_bb, closes, params
+    ) -> Tuple[List[str], Optional[List[str]], Optional[List[str]]]:
+        """
+        Entry side and exit reasons for every bar at once.
+
+        Array form of _check_entry_signal and _check_exit_signal: missing
+        indicator values are NaN, so every comparison on them is False.
+
+        Returns:
+            (entry side per bar, long exit reason per bar, short exit reason per bar);
+            exits are None for strategies without a strategy-specific exit
+        """
+        def array(values) -> np.ndarray:
+            return np.array(values if values is not None else [None] * len(closes), dtype=np.float64)
+
+        def previous(values: np.ndarray) -> np.ndarray:
+            shifted = np.full_like(values, np.nan)
+            shifted[1:] = values[:-1]
+            return shifted
+
+        price = np.asarray(closes, dtype=np.float64)
+        no_signal = np.zeros(len(price), dtype=bool)
+        long_entry = short_entry = no_signal
+        long_exit = short_exit = None
+        long_reason = short_reason = ""
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if strategy == StrategyType.RSI_OVERSOLD:
+                threshold = params.get("rsi_threshold", 30)
+                rsi_val = array(rsi)
+                long_entry = rsi_val < threshold
+                short_entry = rsi_val > (100 - threshold)
+                long_exit, long_reason = rsi_val > 70, "rsi_overbought"
+                short_exit, short_reason = rsi_val < 30, "rsi_oversold"
+
+            elif strategy == StrategyType.MACD_CROSSOVER:
+                macd_val, sig_val = array(macd_line), array(signal_line)
+                macd_prev, sig_prev = previous(macd_val), previous(sig_val)
+                long_entry = (macd_val > sig_val) & (macd_prev <= sig_prev)
+                short_entry = (macd_val < sig_val) & (macd_prev >= sig_prev)
+                long_exit, long_reason = macd_val < sig_val, "macd_bearish"
+                short_exit, short_reason = macd_val > sig_val, "macd_bullish"
+
+            elif strategy == StrategyType.GOLDEN_CROSS:
+                sma50_val, sma200_val = array(sma_50), array(sma_200)
+                sma50_prev, sma200_prev = previous(sma50_val), previous(sma200_val)
+                long_entry = (sma50_val > sma200_val) & (sma50_prev <= sma200_prev)
+                short_entry = (sma50_val < sma200_val) & (sma50_prev >= sma200_prev)
+
+            elif strategy == StrategyType.BOLLINGER_BOUNCE:
+                upper, lower = array(upper_bb), array(lower_bb)
+                long_entry = price <= lower
+                short_entry = price >= upper
+                long_exit, long_reason = price >= upper, "upper_band"
+                short_exit, short_reason = price <= lower, "lower_band"
+
+            elif strategy == StrategyType.MOMENTUM:
+                lookback = params.get("lookback", 20)
+                if lookback > 0:
+                    momentum = np.full_like(price, np.nan)
+                    momentum[lookback:] = (price[lookback:] - price[:-lookback]) / price[:-lookback]
+                    long_entry = momentum > 0.05  # 5% momentum
+                    short_entry = momentum < -0.05
+
+            elif strategy == StrategyType.MEAN_REVERSION:
+                sma20_val = array(sma_20)
+                deviation = (price - sma20_val) / sma20_val
+                long_entry = deviation < -0.03  # 3% below MA
+                short_entry = deviation > 0.03  # 3% above MA
+                long_exit, long_reason = price >= sma20_val, "mean_reached"
+                short_exit, short_reason = price <= sma20_val, "mean_reached"
+
+        sides = np.where(long_entry, "long", np.where(short_entry, "short", "")).tolist()
+        if long_exit is None:
+            return sides, None, None
+        return (
+            sides,
+            np.where(long_exit, long_reason, "").tolist(),
+            np.where(short_exit, short_reason, "").tolist(),
         )
 
     def _check_entry_signal(
@@ -246,7 +249,7 @@ class BacktestEngine:
         rsi, macd_line, signal_line, sma_20, sma_50, sma_200,
         upper_bb, lower_bb, closes, params
     ) -> tuple[bool, str]:
-        """Check for entry signals based on strategy"""
+        """Check for entry signals based on strategy (per-bar form of _signal_arrays)"""
         current_price = closes[i]
 
         # Helper to safely get indicator value (handles None and index bounds)
@@ -326,7 +329,7 @@ class BacktestEngine:
         rsi, macd_line, signal_line, sma_20, sma_50, upper_bb, lower_bb,
         closes, params
     ) -> tuple[bool, str]:
-        """Check for exit signals based on strategy"""
+        """Check for exit signals based on strategy (per-bar form of _signal_arrays)"""
         # Helper to safely get indicator value (handles None and index bounds)
         def safe_get(arr, idx):
             if arr is None or idx >= len(arr):
@@ -379,7 +382,7 @@ class BacktestEngine:
         final_capital: float,
         trades: List[Trade],
         max_drawdown: float,
-        equity_curve: List[float]
+        sharpe_ratio: float
     ) -> BacktestResult:
         """Calculate backtest performance metrics"""
         total_return = final_capital - initial_capital
@@ -424,19 +427,6 @@ class BacktestEngine:
         avg_win = statistics.mean([t.pnl for t in wins]) if wins else 0
         avg_loss = statistics.mean([t.pnl for t in losses]) if losses else 0
 
-        # Calculate Sharpe ratio (simplified)
-        returns = []
-        for i in range(1, len(equity_curve)):
-            ret = (equity_curve[i] - equity_curve[i-1]) / equity_curve[i-1]
-            returns.append(ret)
-
-        if returns and len(returns) > 1:
-            avg_return = statistics.mean(returns)
-            std_return = statistics.stdev(returns)
-            sharpe_ratio = (avg_return * 252) / (std_return * (252 ** 0.5)) if std_return > 0 else 0
-        else:
-            sharpe_ratio = 0
-
         return BacktestResult(
             strategy=strategy,
             symbol=symbol,
@@ -464,6 +454,91 @@ class BacktestEngine:
         )
 
 
+# Need at least this many daily bars for proper backtesting
+MIN_BACKTEST_BARS = 200
+
+
+async def run_symbol_backtest(
+    alpaca_service,
+    symbol: str,
+    strategy_name: str,
+    initial_capital: float = 10000,
+    position_size_pct: float = 0.1,
+    stop_loss_pct: float = 0.05,
+    take_profit_pct: float = 0.10,
+) -> BacktestResult:
+    """
+    Fetch the last 500 daily bars for a symbol and backtest a strategy on them.
+
+    Raises:
+        ValueError: Unknown strategy or insufficient history
+        LookupError: No data for the symbol
+    """
+    try:
+        strategy = StrategyType(strategy_name.lower())
+    except ValueError:
+        raise ValueError(f"Unknown strategy: {strategy_name}")
+    if strategy == StrategyType.CUSTOM:
+        raise ValueError(f"Unknown strategy: {strategy_name}")
+
+    symbol = symbol.upper()
+    logger.info(f"[BACKTEST] Fetching bars for {symbol}")
+    bars = await alpaca_service.get_bars(symbol, "1Day", 500)
+    logger.info(f"[BACKTEST] Got {len(bars) if bars else 0} bars")
+
+    if not bars:
+        raise LookupError(f"No data found for {symbol}")
+    if len(bars) < MIN_BACKTEST_BARS:
+        raise ValueError(f"Insufficient historical data (got {len(bars)}, need {MIN_BACKTEST_BARS}+ bars)")
+
+    # Bars are sorted oldest to newest
+    dates = [
+        bar["timestamp"].split("T")[0] if isinstance(bar["timestamp"], str) else bar["timestamp"].strftime("%Y-%m-%d")
+        for bar in bars
+    ]
+    return get_backtest_engine().run_backtest(
+        symbol=symbol,
+        strategy=strategy,
+        opens=[bar["open"] for bar in bars],
+        highs=[bar["high"] for bar in bars],
+        lows=[bar["low"] for bar in bars],
+        closes=[bar["close"] for bar in bars],
+        volumes=[bar["volume"] for bar in bars],
+        dates=dates,
+        initial_capital=initial_capital,
+        position_size_pct=position_size_pct,
+        stop_loss_pct=stop_loss_pct,
+        take_profit_pct=take_profit_pct,
+    )
+
+
+def backtest_summary(result: BacktestResult) -> Dict[str, Any]:
+    """API view of a result (without the trades list)"""
+    return {
+        "strategy": result.strategy,
+        "symbol": result.symbol,
+        "start_date": result.start_date,
+        "end_date": result.end_date,
+        "initial_capital": result.initial_capital,
+        "final_capital": result.final_capital,
+        "total_return": result.total_return,
+        "total_return_pct": result.total_return_pct,
+        "total_trades": result.total_trades,
+        "winning_trades": result.winning_trades,
+        "losing_trades": result.losing_trades,
+        "win_rate": result.win_rate,
+        "profit_factor": result.profit_factor,
+        "max_drawdown": result.max_drawdown,
+        "max_drawdown_pct": result.max_drawdown_pct,
+        "sharpe_ratio": result.sharpe_ratio,
+        "avg_trade_pnl": result.avg_trade_pnl,
+        "avg_win": result.avg_win,
+        "avg_loss": result.avg_loss,
+        "largest_win": result.largest_win,
+        "largest_loss": result.largest_loss,
+    }
+
+
 # Singleton instance
 _backtest_engine = None
 
@@ -9,16 +9,19 @@ Components:
 - DataLoader: Historical data fetching from Alpaca
 - SimulatedPortfolio: Track positions, cash, equity
 - PerformanceMetrics: Calculate win rate, Sharpe, drawdown, etc.
+- OnlineMetrics: Running metrics updated per equity point / trade
 """
 
 from .engine import BacktestEngine
 from .data_loader import DataLoader
 from .portfolio import SimulatedPortfolio
 from .metrics import PerformanceMetrics
+from .online_metrics import OnlineMetrics
 
 __all__ = [
     "BacktestEngine",
     "DataLoader",
     "SimulatedPortfolio",
     "PerformanceMetrics",
+    "OnlineMetrics",
 ]
@@ -2,13 +2,22 @@
 Historical data loader for backtesting.
 
 Fetches OHLCV data from Alpaca API and organizes it for backtesting.
+With a shared price matrix configured (PRICE_MATRIX_DIR), bars are read
+from it as zero-copy views and only fetched when it doesn't cover the
+requested range yet, so concurrent processes share one copy.
 """
 
+import bisect
 import logging
-from datetime import datetime, date, timedelta
+from collections.abc import Sequence as SequenceABC
+from datetime import datetime, date, timedelta, timezone
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass, field
 
+import numpy as np
+
+from services.price_matrix import COLUMNS, PriceSeries, get_price_matrix, to_epoch_us
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,12 +32,55 @@ class Bar:
     volume: float
 
 
+class SharedBars(SequenceABC):
+    """
+    Bars of a shared price matrix series.
+
+    Bar objects are built on access, so a process holds views into the
+    matrix rather than a Bar per bar. Concatenates and pickles as a list.
+    """
+
+    def __init__(self, series: PriceSeries):
+        self.series = series
+        self._timestamps = series.datetimes
+
+    def __len__(self) -> int:
+        return len(self.series)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        s = self.series
+        return Bar(
+            timestamp=self._timestamps[index],
+            open=float(s.opens[index]),
+            high=float(s.highs[index]),
+            low=float(s.lows[index]),
+            close=float(s.closes[index]),
+            volume=float(s.volumes[index]),
+        )
+
+    def __add__(self, other) -> List[Bar]:
+        return list(self) + list(other)
+
+    def __radd__(self, other) -> List[Bar]:
+        return list(other) + list(self)
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+
 @dataclass
 class SymbolData:
     """Historical data for a single symbol."""
     symbol: str
     bars: List[Bar] = field(default_factory=list)
 
+    # Column arrays built on first use (see _ensure_index)
+    _indexed_len: int = field(default=-1, repr=False)
+    _timestamps: List[datetime] = field(default_factory=list, repr=False)
+    _arrays: Dict[str, np.ndarray] = field(default_factory=dict, repr=False)
+
     @property
     def closes(self) -> List[float]:
         return [b.close for b in self.bars]
@@ -45,13 +97,47 @@ class SymbolData:
     def volumes(self) -> List[float]:
         return [b.volume for b in self.bars]
 
+    @classmethod
+    def from_series(cls, symbol: str, series: PriceSeries) -> "SymbolData":
+        """SymbolData whose bars, timestamps and columns are views of a shared series."""
+        sd = cls(symbol=symbol, bars=SharedBars(series))
+        sd._timestamps = series.datetimes
+        sd._arrays = dict(zip(COLUMNS, series.columns))
+        sd._indexed_len = len(series)
+        return sd
+
+    def _ensure_index(self):
+        """Build sorted timestamp list and OHLCV column arrays (rebuilt if bars were added)."""
+        if self._indexed_len == len(self.bars):
+            return
+        if any(self.bars[i].timestamp > self.bars[i + 1].timestamp for i in range(len(self.bars) - 1)):
+            self.bars.sort(key=lambda b: b.timestamp)
+        self._timestamps = [b.timestamp for b in self.bars]
+        self._arrays = {
+            name: np.fromiter((getattr(b, name) for b in self.bars), dtype=np.float64, count=len(self.bars))
+            for name in ("open", "high", "low", "close", "volume")
+        }
+        self._indexed_len = len(self.bars)
+
+    def array(self, name: str) -> np.ndarray:
+        """Get a column ("open", "high", "low", "close", "volume") as a float64 array."""
+        self._ensure_index()
+        return self._arrays[name]
+
+    def row_at(self, timestamp: datetime) -> int:
+        """Index of the last bar at or before timestamp, or -1 if there is none."""
+        self._ensure_index()
+        return bisect.bisect_right(self._timestamps, timestamp) - 1
+
 
 @dataclass
 class BacktestData:
     """
     Container for all historical data needed for a backtest.
 
-    Organizes data by timestamp for easy iteration.
+    Organizes data by timestamp for easy iteration. A timeline index maps
+    every timestamp to the row of each symbol's bar at or before it, so
+    bar lookups are O(1) and lookbacks are array views rather than scans.
     """
     symbols: List[str]
     start_date: date
@@ -59,40 +145,83 @@ class BacktestData:
     symbol_data: Dict[str, SymbolData] = field(default_factory=dict)
     _timestamps: List[datetime] = field(default_factory=list)
 
+    # Timeline index: timestamp -> position, and per-symbol position -> bar row (-1 = no bar yet)
+    _timeline_pos: Dict[datetime, int] = field(default_factory=dict, repr=False)
+    _rows: Dict[str, np.ndarray] = field(default_factory=dict, repr=False)
+    _indexed_bars: int = field(default=-1, repr=False)
+
     @property
     def timestamps(self) -> List[datetime]:
         """Get all unique timestamps in chronological order."""
-        if not self._timestamps and self.symbol_data:
-            # Collect all timestamps from all symbols
-            all_timestamps = set()
-            for sd in self.symbol_data.values():
-                for bar in sd.bars:
-                    all_timestamps.add(bar.timestamp)
-            self._timestamps = sorted(all_timestamps)
+        self._ensure_index()
         return self._timestamps
 
+    def _ensure_index(self):
+        """Build the timeline index (rebuilt if symbols or bars were added)."""
+        total_bars = sum(len(sd.bars) for sd in self.symbol_data.values())
+        if total_bars == self._indexed_bars and len(self._rows) == len(self.symbol_data):
+            return
+
+        all_timestamps = set()
+        for sd in self.symbol_data.values():
+            sd._ensure_index()
+            all_timestamps.update(sd._timestamps)
+        self._timestamps = sorted(all_timestamps)
+        self._timeline_pos = {ts: pos for pos, ts in enumerate(self._timestamps)}
+
+        self._rows = {}
+        for symbol, sd in self.symbol_data.items():
+            rows = np.full(len(self._timestamps), -1, dtype=np.int32)
+            if sd.bars:
+                positions = np.fromiter((self._timeline_pos[ts] for ts in sd._timestamps), dtype=np.int64)
+                rows[positions] = np.arange(len(sd.bars), dtype=np.int32)
+                # Forward-fill: timeline positions between bars point at the previous bar
+                rows = np.maximum.accumulate(rows)
+            self._rows[symbol] = rows
+
+        self._indexed_bars = total_bars
+
+    def timeline_rows(self, symbol: str) -> np.ndarray:
+        """Per-timestamp row of the symbol's bar at or before it (-1 = no bar yet)."""
+        self._ensure_index()
+        return self._rows[symbol]
+
+    def _row(self, symbol: str, timestamp: datetime) -> int:
+        """Row of symbol's bar at or before timestamp (-1 if none)."""
+        pos = self._timeline_pos.get(timestamp)
+        if pos is not None:
+            return int(self._rows[symbol][pos])
+        # Off-timeline timestamp: binary search the symbol's own bars
+        return self.symbol_data[symbol].row_at(timestamp)
+
     def get_bars_at(self, timestamp: datetime) -> Dict[str, Bar]:
-        """Get the bar for each symbol at a specific timestamp."""
+        """Get the bar for each symbol at (or most recently before) a specific timestamp."""
+        self._ensure_index()
         result = {}
         for symbol, sd in self.symbol_data.items():
-            # Find bar at or before this timestamp
-            for bar in reversed(sd.bars):
-                if bar.timestamp <= timestamp:
-                    result[symbol] = bar
-                    break
+            row = self._row(symbol, timestamp)
+            if row >= 0:
+                result[symbol] = sd.bars[row]
         return result
 
-    def get_lookback(self, symbol: str, timestamp: datetime, periods: int) -> List[float]:
-        """Get the last N closing prices for a symbol up to timestamp."""
-        if symbol not in self.symbol_data:
-            return []
+    def get_lookback(self, symbol: str, timestamp: datetime, periods: int) -> np.ndarray:
+        """
+        Get the last N closing prices for a symbol up to timestamp.
 
-        closes = []
-        for bar in self.symbol_data[symbol].bars:
-            if bar.timestamp <= timestamp:
-                closes.append(bar.close)
+        Returns a read-only view into the symbol's close array (no copy).
+        """
+        return self.get_lookback_array(symbol, timestamp, periods, "close")
 
-        return closes[-periods:] if len(closes) >= periods else closes
+    def get_lookback_array(self, symbol: str, timestamp: datetime, periods: int, column: str = "close") -> np.ndarray:
+        """Get the last N values of an OHLCV column up to timestamp as a read-only view."""
+        if symbol not in self.symbol_data:
+            return np.empty(0, dtype=np.float64)
+
+        self._ensure_index()
+        row = self._row(symbol, timestamp)
+        view = self.symbol_data[symbol].array(column)[max(0, row + 1 - periods):row + 1]
+        view.flags.writeable = False
+        return view
 
 
 class DataLoader:
@@ -100,14 +229,17 @@ class DataLoader:
     Loads historical data from Alpaca for backtesting.
     """
 
-    def __init__(self, alpaca_service=None):
+    def __init__(self, alpaca_service=None, price_matrix=None):
         """
         Initialize the data loader.
 
         Args:
             alpaca_service: Optional AlpacaService instance. If None, creates one.
+            price_matrix: Optional PriceMatrixService. If None, uses the
+                configured one (if any).
         """
         self.alpaca = alpaca_service
+        self.price_matrix = price_matrix if price_matrix is not None else get_price_matrix()
 
     async def _get_alpaca(self):
         """Lazy load alpaca service."""
@@ -144,31 +276,26 @@ class DataLoader:
             end_date=end_date
         )
 
+        start = datetime.combine(start_date, datetime.min.time())
+        end = datetime.combine(end_date, datetime.max.time())
+
         for symbol in symbols:
             try:
-                # Fetch bars from Alpaca
-                bars = await alpaca.get_bars(
-                    symbol=symbol,
-                    timeframe=timeframe,
-                    start=datetime.combine(start_date, datetime.min.time()),
-                    end=datetime.combine(end_date, datetime.max.time()),
-                    limit=10000  # Get as much data as possible
-                )
-
-                # Convert to Bar objects
-                symbol_bars = []
-                for bar in bars:
-                    symbol_bars.append(Bar(
-                        timestamp=bar.get("timestamp") or bar.get("t"),
-                        open=float(bar.get("open") or bar.get("o", 0)),
-                        high=float(bar.get("high") or bar.get("h", 0)),
-                        low=float(bar.get("low") or bar.get("l", 0)),
-                        close=float(bar.get("close") or bar.get("c", 0)),
-                        volume=float(bar.get("volume") or bar.get("v", 0))
-                    ))
-
-                data.symbol_data[symbol] = SymbolData(symbol=symbol, bars=symbol_bars)
-                logger.info(f"Loaded {len(symbol_bars)} bars for {symbol}")
+                if self.price_matrix is not None:
+                    symbol_data = await self._load_shared(alpaca, symbol, timeframe, start, end)
+                else:
+                    # Fetch bars from Alpaca
+                    bars = await alpaca.get_bars(
+                        symbol=symbol,
+                        timeframe=timeframe,
+                        start=start,
+                        end=end,
+                        limit=10000  # Get as much data as possible
+                    )
+                    symbol_data = SymbolData(symbol=symbol, bars=_to_bars(bars))
+
+                data.symbol_data[symbol] = symbol_data
+                logger.info(f"Loaded {len(symbol_data.bars)} bars for {symbol}")
 
             except Exception as e:
                 logger.error(f"Failed to load data for {symbol}: {e}")
@@ -177,6 +304,36 @@ class DataLoader:
         logger.info(f"Loaded data for {len(data.symbol_data)} symbols, {len(data.timestamps)} timestamps")
         return data
 
+    async def _load_shared(self, alpaca, symbol: str, timeframe: str,
+                           start: datetime, end: datetime) -> SymbolData:
+        """
+        The symbol's bars in [start, end] as views of the shared price
+        matrix, fetching and publishing them first if it doesn't cover the
+        range yet (plain Bars if publishing fails).
+        """
+        start_us, end_us = to_epoch_us(start), to_epoch_us(end)
+        series = self.price_matrix.read(symbol, timeframe)
+        if series is None or not series.covers(start_us, end_us):
+            bars = await alpaca.get_bars(
+                symbol=symbol,
+                timeframe=timeframe,
+                start=start,
+                end=end,
+                limit=10000
+            )
+            try:
+                # Covered only up to now: later bars of the range are still to come
+                series = self.price_matrix.publish_bars(
+                    symbol, timeframe, bars,
+                    covered_from=start_us, covered_to=min(end_us, to_epoch_us(datetime.now(timezone.utc))),
+                )
+            except (OSError, ValueError) as e:
+                logger.warning(f"Price matrix unavailable for {symbol}: {e}")
+                series = None
+            if series is None:
+                return SymbolData(symbol=symbol, bars=_to_bars(bars))
+        return SymbolData.from_series(symbol, series.between(start_us, end_us))
+
     async def load_benchmark(self, start_date: date, end_date: date) -> SymbolData:
         """
         Load S&P 500 (SPY) data for benchmark comparison.
@@ -190,3 +347,18 @@ class DataLoader:
         """
         data = await self.load(["SPY"], start_date, end_date)
         return data.symbol_data.get("SPY", SymbolData(symbol="SPY"))
+
+
+def _to_bars(bars: List[Dict[str, Any]]) -> List[Bar]:
+    """Convert bar dicts from the data API to Bar objects."""
+    return [
+        Bar(
+            timestamp=bar.get("timestamp") or bar.get("t"),
+            open=float(bar.get("open") or bar.get("o", 0)),
+            high=float(bar.get("high") or bar.get("h", 0)),
+            low=float(bar.get("low") or bar.get("l", 0)),
+            close=float(bar.get("close") or bar.get("c", 0)),
+            volume=float(bar.get("volume") or bar.get("v", 0))
+        )
+        for bar in bars
+    ]
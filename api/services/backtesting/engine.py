@@ -4,15 +4,28 @@ Core backtesting engine.
 Simulates time progression through historical data and executes strategy signals.
 """
 
+import bisect
+import copy
 import logging
 import time
-from datetime import datetime, date
-from typing import List, Dict, Any, Optional, Protocol
-
-from models.backtest import BacktestRequest, BacktestResult, Signal
-from .data_loader import DataLoader, BacktestData, Bar
+from dataclasses import dataclass
+from datetime import datetime, date, timedelta
+from typing import Callable, List, Dict, Any, Optional, Protocol, Tuple
+
+from exceptions import BacktestCancelledError
+from models.backtest import (
+    BacktestRequest,
+    BacktestResult,
+    MultiBacktestRequest,
+    MultiBacktestResult,
+    Signal,
+    VariantComparison,
+)
+from .data_loader import DataLoader, BacktestData, Bar, SymbolData
 from .portfolio import SimulatedPortfolio
 from .metrics import PerformanceMetrics
+from .shared_indicators import SharedIndicators
+from .vectorized import simulate_signals, supports_vectorized
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +44,20 @@ class Strategy(Protocol):
         ...
 
 
+@dataclass
+class EngineCheckpoint:
+    """
+    Event-loop state just before the end-of-backtest close-out.
+
+    Restoring it and stepping the timestamps after last_timestamp gives the
+    same result as re-running the whole (longer) range.
+    """
+    portfolio: SimulatedPortfolio
+    strategy: Any
+    last_timestamp: datetime
+    bars_processed: int
+
+
 class BacktestEngine:
     """
     Core backtesting engine that simulates time progression.
@@ -47,27 +74,45 @@ class BacktestEngine:
 
     def __init__(
         self,
-        strategy: Strategy,
+        strategy: Optional[Strategy],
         start_date: date,
         end_date: date,
         initial_capital: float = 100000,
         position_size_pct: float = 10.0,
+        vectorized: bool = False,
+        progress_callback: Optional[Callable[[float], None]] = None,
+        should_cancel: Optional[Callable[[], bool]] = None,
+        capture_checkpoint: bool = False,
     ):
         """
         Initialize the backtest engine.
 
         Args:
-            strategy: The strategy to backtest
+            strategy: The strategy to backtest (None when only running variants)
             start_date: Start date for backtest
             end_date: End date for backtest
             initial_capital: Starting capital
             position_size_pct: Position size as % of portfolio
+            vectorized: Simulate from precomputed signal arrays if the strategy
+                supports it (same results, much faster for parameter research)
+            progress_callback: Called with the simulated fraction (0-1) as the run advances
+            should_cancel: Polled during the run; returning True raises BacktestCancelledError
+            capture_checkpoint: Keep an EngineCheckpoint of event-driven runs (for resuming)
         """
         self.strategy = strategy
         self.start_date = start_date
         self.end_date = end_date
         self.initial_capital = initial_capital
         self.position_size_pct = position_size_pct
+        self.vectorized = vectorized
+        self.progress_callback = progress_callback
+        self.should_cancel = should_cancel
+        self.capture_checkpoint = capture_checkpoint
+
+        # Set by run(): the data simulated and the checkpoint (if captured)
+        self.data: Optional[BacktestData] = None
+        self.benchmark_data: Optional[SymbolData] = None
+        self.checkpoint: Optional[EngineCheckpoint] = None
 
         self.data_loader = DataLoader()
         self.portfolio = SimulatedPortfolio(
@@ -75,12 +120,22 @@ class BacktestEngine:
             position_size_pct=position_size_pct
         )
 
-    async def run(self, symbols: List[str]) -> BacktestResult:
+    async def run(
+        self,
+        symbols: List[str],
+        data: Optional[BacktestData] = None,
+        benchmark_data: Optional[SymbolData] = None,
+        resume_from: Optional[EngineCheckpoint] = None,
+    ) -> BacktestResult:
         """
         Run the backtest.
 
         Args:
             symbols: List of symbols to trade
+            data: Preloaded bars for the full range (skips the DataLoader)
+            benchmark_data: Preloaded benchmark bars (used with data)
+            resume_from: Checkpoint of an earlier run over a prefix of this
+                range; only the timestamps after it are simulated
 
         Returns:
             BacktestResult with performance metrics and trade history
@@ -88,121 +143,361 @@ class BacktestEngine:
         start_time = time.time()
         logger.info(f"Starting backtest: {len(symbols)} symbols, {self.start_date} to {self.end_date}")
 
-        # Load all historical data upfront
-        data = await self.data_loader.load(
+        data, benchmark_data = await self._load(symbols, data, benchmark_data)
+
+        if resume_from is not None:
+            # The checkpoint is deep-copied so it can be resumed again
+            self.portfolio = copy.deepcopy(resume_from.portfolio)
+            self.strategy = copy.deepcopy(resume_from.strategy)
+            bars_processed = await self._run_event_loop(
+                data, start_after=resume_from.last_timestamp, bars_processed=resume_from.bars_processed
+            )
+        elif self.vectorized and supports_vectorized(self.strategy):
+            bars_processed = simulate_signals(data, self.strategy, self.portfolio)
+        else:
+            if self.vectorized:
+                logger.info(f"{self.strategy.__class__.__name__} has no vectorized mode, running event-driven")
+            bars_processed = await self._run_event_loop(data)
+        self._report_progress(1.0)
+
+        benchmark_return = self._benchmark_return(benchmark_data)
+        result = self._build_result(
+            symbols, self.strategy, self.portfolio, bars_processed, time.time() - start_time, benchmark_return
+        )
+
+        logger.info(f"Backtest complete: {bars_processed} bars, {result.metrics.total_trades} trades, "
+                   f"{result.metrics.total_return_pct:.1f}% return, {result.run_time_seconds:.2f}s")
+
+        return result
+
+    async def run_variants(
+        self,
+        variants: Dict[str, Strategy],
+        symbols: List[str],
+        data: Optional[BacktestData] = None,
+        benchmark_data: Optional[SymbolData] = None,
+    ) -> MultiBacktestResult:
+        """
+        Run several strategy/parameter variants side by side in one pass.
+
+        Bars are loaded once and every timestamp is visited once; each
+        variant trades its own SimulatedPortfolio. Indicators that several
+        variants need on the same bar are computed once (SharedIndicators).
+        The engine's own strategy is not used.
+
+        Args:
+            variants: Variant name -> strategy instance
+            symbols: List of symbols to trade
+            data: Preloaded bars for the full range (skips the DataLoader)
+            benchmark_data: Preloaded benchmark bars (used with data)
+
+        Returns:
+            MultiBacktestResult with a comparison table and each variant's result
+        """
+        start_time = time.time()
+        logger.info(f"Starting multi-strategy backtest: {len(variants)} variants, {len(symbols)} symbols, "
+                    f"{self.start_date} to {self.end_date}")
+
+        if len({id(strategy) for strategy in variants.values()}) < len(variants):
+            raise ValueError("Each variant needs its own strategy instance")
+        data, benchmark_data = await self._load(symbols, data, benchmark_data)
+
+        portfolios = {
+            name: SimulatedPortfolio(initial_capital=self.initial_capital, position_size_pct=self.position_size_pct)
+            for name in variants
+        }
+        shared = SharedIndicators()
+        for strategy in variants.values():
+            strategy.shared_indicators = shared
+        try:
+            bars_processed = await self._run_variants_loop(data, variants, portfolios, shared)
+        finally:
+            for strategy in variants.values():
+                strategy.shared_indicators = None
+        self._report_progress(1.0)
+
+        benchmark_return = self._benchmark_return(benchmark_data)
+        run_time = time.time() - start_time
+        results = {
+            name: self._build_result(symbols, strategy, portfolios[name], bars_processed, run_time, benchmark_return)
+            for name, strategy in variants.items()
+        }
+        comparison = [VariantComparison.from_result(name, result) for name, result in results.items()]
+        best = max(comparison, key=lambda row: row.sharpe_ratio).name if comparison else None
+
+        logger.info(f"Multi-strategy backtest complete: {bars_processed} bars, {len(variants)} variants, "
+                    f"{shared.computed} indicator values computed, {shared.reused} reused, {run_time:.2f}s")
+
+        return MultiBacktestResult(
             symbols=symbols,
             start_date=self.start_date,
             end_date=self.end_date,
-            timeframe="1Day"
+            initial_capital=self.initial_capital,
+            comparison=comparison,
+            best_variant=best,
+            results=results,
+            run_time_seconds=run_time,
+            bars_processed=bars_processed,
+            indicators_computed=shared.computed,
+            indicators_reused=shared.reused,
         )
 
+    async def _load(
+        self,
+        symbols: List[str],
+        data: Optional[BacktestData],
+        benchmark_data: Optional[SymbolData],
+    ) -> Tuple[BacktestData, SymbolData]:
+        """Load the bars and benchmark bars not passed in"""
+        # Load all historical data upfront
+        if data is None:
+            data = await self.data_loader.load(
+                symbols=symbols,
+                start_date=self.start_date,
+                end_date=self.end_date,
+                timeframe="1Day"
+            )
+
         # Load benchmark data for comparison
-        benchmark_data = await self.data_loader.load_benchmark(self.start_date, self.end_date)
+        if benchmark_data is None:
+            benchmark_data = await self.data_loader.load_benchmark(self.start_date, self.end_date)
+        self.data = data
+        self.benchmark_data = benchmark_data
+        self._check_cancelled()
+        return data, benchmark_data
+
+    def _benchmark_return(self, benchmark_data: SymbolData) -> Optional[float]:
+        if not benchmark_data.bars:
+            return None
+        return PerformanceMetrics.calculate_benchmark_return(
+            benchmark_data.bars,
+            datetime.combine(self.start_date, datetime.min.time()),
+            datetime.combine(self.end_date, datetime.max.time())
+        )
 
-        bars_processed = 0
+    def _build_result(
+        self,
+        symbols: List[str],
+        strategy: Strategy,
+        portfolio: SimulatedPortfolio,
+        bars_processed: int,
+        run_time: float,
+        benchmark_return: Optional[float],
+    ) -> BacktestResult:
+        metrics = PerformanceMetrics.calculate(
+            trades=portfolio.trades,
+            equity_curve=portfolio.equity_curve,
+            initial_capital=self.initial_capital,
+            benchmark_return_pct=benchmark_return,
+            online=portfolio.metrics,
+        )
+        return BacktestResult(
+            symbols=symbols,
+            start_date=self.start_date,
+            end_date=self.end_date,
+            initial_capital=self.initial_capital,
+            strategy=strategy.__class__.__name__,
+            strategy_params=getattr(strategy, 'params', {}),
+            final_equity=portfolio.equity,
+            metrics=metrics,
+            equity_curve=portfolio.equity_curve,
+            trades=portfolio.get_completed_trades(),
+            run_time_seconds=run_time,
+            bars_processed=bars_processed
+        )
+
+    async def _run_event_loop(
+        self,
+        data: BacktestData,
+        start_after: Optional[datetime] = None,
+        bars_processed: int = 0,
+    ) -> int:
+        """
+        Step through every timestamp, asking the strategy for signals.
+
+        Args:
+            data: Bars to simulate
+            start_after: Skip timestamps up to and including this one (resuming)
+            bars_processed: Bars already processed before start_after
+
+        Returns:
+            Number of bars processed
+        """
+        timestamps = data.timestamps
+        first = bisect.bisect_right(timestamps, start_after) if start_after is not None else 0
+        num_steps = len(timestamps) - first
+        report_every = max(1, num_steps // 100)
 
         # Iterate through time
-        for timestamp in data.timestamps:
+        for step, timestamp in enumerate(timestamps[first:]):
+            if step % report_every == 0:
+                self._check_cancelled()
+                self._report_progress(step / num_steps)
+
             current_bars = data.get_bars_at(timestamp)
 
             if not current_bars:
                 continue
 
-            # Update portfolio with current prices
-            self.portfolio.update_prices(current_bars)
-
-            # Generate signals from strategy
-            try:
-                signals = await self.strategy.generate_signals(
-                    bars=current_bars,
-                    portfolio=self.portfolio,
-                    lookback_data=data,
-                    current_timestamp=timestamp
-                )
-            except Exception as e:
-                logger.error(f"Strategy error at {timestamp}: {e}")
-                signals = []
-
-            # Execute simulated trades
-            for signal in signals:
-                if signal.symbol in current_bars:
-                    price = current_bars[signal.symbol].close
-                    self.portfolio.execute(signal, price)
-
-            # Record equity
-            self.portfolio.record_equity(timestamp)
+            await self._step(self.strategy, self.portfolio, current_bars, data, timestamp)
             bars_processed += 1
 
         # Close any remaining positions at end of backtest
         if data.timestamps:
             final_timestamp = data.timestamps[-1]
+            if self.capture_checkpoint:
+                self.checkpoint = EngineCheckpoint(
+                    portfolio=copy.deepcopy(self.portfolio),
+                    strategy=copy.deepcopy(self.strategy),
+                    last_timestamp=final_timestamp,
+                    bars_processed=bars_processed,
+                )
             self.portfolio.close_all_positions(final_timestamp)
             self.portfolio.record_equity(final_timestamp)
 
-        # Calculate benchmark return
-        benchmark_return = None
-        if benchmark_data.bars:
-            benchmark_return = PerformanceMetrics.calculate_benchmark_return(
-                benchmark_data.bars,
-                datetime.combine(self.start_date, datetime.min.time()),
-                datetime.combine(self.end_date, datetime.max.time())
-            )
+        return bars_processed
 
-        # Calculate performance metrics
-        metrics = PerformanceMetrics.calculate(
-            trades=self.portfolio.trades,
-            equity_curve=self.portfolio.equity_curve,
-            initial_capital=self.initial_capital,
-            benchmark_return_pct=benchmark_return
-        )
+    async def _run_variants_loop(
+        self,
+        data: BacktestData,
+        variants: Dict[str, Strategy],
+        portfolios: Dict[str, SimulatedPortfolio],
+        shared: SharedIndicators,
+    ) -> int:
+        """Step every variant through each timestamp; returns bars processed"""
+        timestamps = data.timestamps
+        num_steps = len(timestamps)
+        report_every = max(1, num_steps // 100)
+        bars_processed = 0
 
-        run_time = time.time() - start_time
+        for step, timestamp in enumerate(timestamps):
+            if step % report_every == 0:
+                self._check_cancelled()
+                self._report_progress(step / num_steps)
+
+            current_bars = data.get_bars_at(timestamp)
+            if not current_bars:
+                continue
 
-        logger.info(f"Backtest complete: {bars_processed} bars, {metrics.total_trades} trades, "
-                   f"{metrics.total_return_pct:.1f}% return, {run_time:.2f}s")
+            shared.advance(timestamp)
+            for name, strategy in variants.items():
+                await self._step(strategy, portfolios[name], current_bars, data, timestamp)
+            bars_processed += 1
 
-        return BacktestResult(
-            symbols=symbols,
-            start_date=self.start_date,
-            end_date=self.end_date,
-            initial_capital=self.initial_capital,
-            strategy=self.strategy.__class__.__name__,
-            strategy_params=getattr(self.strategy, 'params', {}),
-            final_equity=self.portfolio.equity,
-            metrics=metrics,
-            equity_curve=self.portfolio.equity_curve,
-            trades=self.portfolio.get_completed_trades(),
-            run_time_seconds=run_time,
-            bars_processed=bars_processed
-        )
+        if timestamps:
+            for portfolio in portfolios.values():
+                portfolio.close_all_positions(timestamps[-1])
+                portfolio.record_equity(timestamps[-1])
 
+        return bars_processed
 
-async def run_backtest(request: BacktestRequest) -> BacktestResult:
-    """
-    Convenience function to run a backtest from a request.
+    async def _step(
+        self,
+        strategy: Strategy,
+        portfolio: SimulatedPortfolio,
+        current_bars: Dict[str, Bar],
+        data: BacktestData,
+        timestamp: datetime,
+    ) -> None:
+        """Process one timestamp for one strategy and its portfolio"""
+        # Update portfolio with current prices
+        portfolio.update_prices(current_bars)
+
+        # Generate signals from strategy
+        try:
+            signals = await strategy.generate_signals(
+                bars=current_bars,
+                portfolio=portfolio,
+                lookback_data=data,
+                current_timestamp=timestamp
+            )
+        except Exception as e:
+            logger.error(f"Strategy error at {timestamp}: {e}")
+            signals = []
 
-    Args:
-        request: BacktestRequest with configuration
+        # Execute simulated trades
+        for signal in signals:
+            if signal.symbol in current_bars:
+                price = current_bars[signal.symbol].close
+                portfolio.execute(signal, price)
 
-    Returns:
-        BacktestResult with performance data
-    """
+        # Record equity
+        portfolio.record_equity(timestamp)
+
+    def _check_cancelled(self) -> None:
+        if self.should_cancel and self.should_cancel():
+            raise BacktestCancelledError()
+
+    def _report_progress(self, fraction: float) -> None:
+        if self.progress_callback:
+            self.progress_callback(fraction)
+
+
+def create_strategy(name: str, params: Dict[str, Any]) -> Strategy:
+    """Instantiate a backtest strategy by name (ValueError if unknown)"""
     # Import strategies
-    from .strategies import SimpleRSIStrategy, MACDCrossoverStrategy
+    from .strategies import SimpleRSIStrategy, MACDCrossoverStrategy, WeightedScoreStrategy
 
     # Map strategy names to classes
     strategy_map = {
         "simple_rsi": SimpleRSIStrategy,
         "macd_crossover": MACDCrossoverStrategy,
+        "weighted_score": WeightedScoreStrategy,
     }
 
     # Get strategy class
-    strategy_class = strategy_map.get(request.strategy)
+    strategy_class = strategy_map.get(name)
     if not strategy_class:
-        raise ValueError(f"Unknown strategy: {request.strategy}")
+        raise ValueError(f"Unknown strategy: {name}")
 
     # Instantiate strategy with params
-    strategy = strategy_class(**request.strategy_params)
+    return strategy_class(**params)
+
+
+async def run_backtest(
+    request: BacktestRequest,
+    data_service=None,
+    progress_callback: Optional[Callable[[float], None]] = None,
+    should_cancel: Optional[Callable[[], bool]] = None,
+    use_cache: bool = True,
+) -> BacktestResult:
+    """
+    Convenience function to run a backtest from a request.
+
+    Identical requests are served from the result cache, and requests that
+    only extend a cached run's end date resume from it (see result_cache).
+
+    Args:
+        request: BacktestRequest with configuration
+        data_service: Bar source for the DataLoader (default: Alpaca)
+        progress_callback: See BacktestEngine
+        should_cancel: See BacktestEngine
+        use_cache: Read and write the backtest result cache
+
+    Returns:
+        BacktestResult with performance data
+    """
+    from .result_cache import CacheEntry, data_source_name, get_backtest_result_cache
+
+    strategy = create_strategy(request.strategy, request.strategy_params)
+
+    if request.timeframe not in ("1Day", "1Min"):
+        raise ValueError(f"Unsupported timeframe: {request.timeframe} (use 1Day or 1Min)")
+
+    cache = get_backtest_result_cache() if use_cache and request.use_cache else None
+    key = None
+    if cache is not None and cache.enabled:
+        key = cache.key_for(request, getattr(strategy, "params", None), data_source_name(data_service))
+        cached = cache.get(key)
+        if cached is not None:
+            logger.info(f"Backtest served from cache ({key.base[:8]}, {key.end_date})")
+            return cached.result.model_copy(update={"cache_status": "hit"})
+
+    if request.timeframe == "1Min":
+        result = await _run_intraday(request, strategy, data_service, progress_callback, should_cancel)
+        if key is not None:
+            cache.put(key, CacheEntry(result=result))
+        return result
 
     # Create and run engine
     engine = BacktestEngine(
@@ -210,7 +505,121 @@ async def run_backtest(request: BacktestRequest) -> BacktestResult:
         start_date=request.start_date,
         end_date=request.end_date,
         initial_capital=request.initial_capital,
-        position_size_pct=request.position_size_pct
+        position_size_pct=request.position_size_pct,
+        vectorized=request.vectorized,
+        progress_callback=progress_callback,
+        should_cancel=should_cancel,
+        capture_checkpoint=key is not None,
+    )
+    if data_service is not None:
+        engine.data_loader = DataLoader(data_service)
+
+    result = None
+    base = cache.find_extendable(key) if key is not None else None
+    if base is not None:
+        result = await _extend_cached_run(engine, request, base)
+    if result is None:
+        result = await engine.run(request.symbols)
+
+    if key is not None:
+        cache.put(key, CacheEntry.from_engine(result, engine))
+    return result
+
+
+async def run_multi_backtest(
+    request: MultiBacktestRequest,
+    data_service=None,
+    progress_callback: Optional[Callable[[float], None]] = None,
+    should_cancel: Optional[Callable[[], bool]] = None,
+) -> MultiBacktestResult:
+    """
+    Run several strategy variants over the same data in one pass.
+
+    Args:
+        request: MultiBacktestRequest with the shared configuration and variants
+        data_service: Bar source for the DataLoader (default: Alpaca)
+        progress_callback: See BacktestEngine
+        should_cancel: See BacktestEngine
+
+    Returns:
+        MultiBacktestResult with a comparison table and per-variant results
+    """
+    variants: Dict[str, Strategy] = {}
+    counts: Dict[str, int] = {}
+    for variant in request.variants:
+        counts[variant.strategy] = counts.get(variant.strategy, 0) + 1
+    seen: Dict[str, int] = {}
+    for variant in request.variants:
+        name = variant.name
+        if name is None:
+            seen[variant.strategy] = seen.get(variant.strategy, 0) + 1
+            name = variant.strategy if counts[variant.strategy] == 1 else f"{variant.strategy}#{seen[variant.strategy]}"
+        if name in variants:
+            raise ValueError(f"Duplicate variant name: {name}")
+        variants[name] = create_strategy(variant.strategy, variant.strategy_params)
+
+    engine = BacktestEngine(
+        strategy=None,
+        start_date=request.start_date,
+        end_date=request.end_date,
+        initial_capital=request.initial_capital,
+        position_size_pct=request.position_size_pct,
+        progress_callback=progress_callback,
+        should_cancel=should_cancel,
     )
+    if data_service is not None:
+        engine.data_loader = DataLoader(data_service)
+
+    return await engine.run_variants(variants, request.symbols)
+
+
+async def _run_intraday(request, strategy, data_service, progress_callback, should_cancel) -> BacktestResult:
+    """Minute-bar backtest streamed from the local minute store"""
+    from services.indicators import TradingMode
+    from .intraday import IntradayBacktestEngine, IntradaySessionRules
+    from .minute_store import get_minute_bar_store
 
+    try:
+        mode = TradingMode(request.trading_mode)
+    except ValueError:
+        raise ValueError(f"Unknown trading mode: {request.trading_mode}")
+
+    engine = IntradayBacktestEngine(
+        strategy=strategy,
+        start_date=request.start_date,
+        end_date=request.end_date,
+        initial_capital=request.initial_capital,
+        position_size_pct=request.position_size_pct,
+        rules=IntradaySessionRules.for_mode(mode, request.allow_extended_hours),
+        store=get_minute_bar_store(),
+        data_service=data_service,
+        progress_callback=progress_callback,
+        should_cancel=should_cancel,
+    )
     return await engine.run(request.symbols)
+
+
+async def _extend_cached_run(engine: BacktestEngine, request: BacktestRequest, base) -> Optional[BacktestResult]:
+    """
+    Run a request whose range extends a cached run's end date.
+
+    Only bars after the cached end date are loaded. Event-driven entries
+    also resume from their checkpoint; otherwise the full range is
+    simulated on the combined bars.
+
+    Returns:
+        The result, or None if the cached entry can't be extended
+    """
+    delta_start = base.result.end_date + timedelta(days=1)
+    delta = await engine.data_loader.load(request.symbols, delta_start, request.end_date)
+    delta_benchmark = await engine.data_loader.load_benchmark(delta_start, request.end_date)
+
+    extended = base.extend(request, delta, delta_benchmark)
+    if extended is None:
+        return None
+    data, benchmark_data = extended
+
+    logger.info(f"Extending cached backtest from {base.result.end_date} to {request.end_date}"
+                f"{' (resuming checkpoint)' if base.checkpoint else ''}")
+    result = await engine.run(request.symbols, data, benchmark_data, resume_from=base.checkpoint)
+    return result.model_copy(update={"cache_status": "extended"})
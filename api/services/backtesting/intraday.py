@@ -0,0 +1,401 @@
+"""
+Intraday (minute-bar) backtesting.
+
+Streams minute bars from the MinuteBarStore through a generator pipeline
+instead of materializing the whole range:
+
+    MinuteBarStore.iter_days (per symbol, one month on disk at a time)
+      -> iter_trading_days (align symbols day by day, apply session hours)
+        -> iter_minutes (merge symbols into one minute timeline)
+
+Strategies see a RollingLookback holding only the last N bars per symbol
+(N = the strategy's lookback_periods), so memory is bounded by one trading
+day of bars plus the lookback windows, however long the backtest.
+
+Session rules follow the bot's trading modes (AdaptiveIndicatorConfig):
+- Regular hours only unless extended hours are allowed
+- No new entries in the last minutes before the session closes
+- Positions held longer than the mode's hold_time_max_minutes are exited
+- Scalp and intraday positions are flattened at the session close
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from exceptions import BacktestCancelledError
+from models.backtest import BacktestResult, Signal
+from services.indicators import AdaptiveIndicatorConfig, TradingMode
+from .data_loader import Bar, DataLoader
+from .metrics import PerformanceMetrics
+from .minute_store import COLUMNS, MinuteBarStore, MinuteChunk, eastern_offset_seconds
+from .portfolio import SimulatedPortfolio
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOOKBACK_PERIODS = 200
+
+# Session boundaries in minutes since midnight ET
+PRE_MARKET_OPEN = 4 * 60
+REGULAR_OPEN = 9 * 60 + 30
+REGULAR_CLOSE = 16 * 60
+AFTER_HOURS_CLOSE = 20 * 60
+
+
+# ==================== SESSION RULES ====================
+
+@dataclass
+class IntradaySessionRules:
+    """
+    When the simulated bot may trade and how long it may hold.
+
+    Attributes:
+        mode: Trading mode whose hold limit applies
+        allow_extended_hours: Trade pre-market and after-hours bars too
+        no_entry_minutes_before_close: Block new entries this close to the session end
+        max_hold_minutes: Exit positions held longer than this (None = no limit)
+        flatten_at_close: Close every position on the session's last bar
+    """
+    mode: TradingMode = TradingMode.INTRADAY
+    allow_extended_hours: bool = False
+    no_entry_minutes_before_close: int = 15
+    max_hold_minutes: Optional[int] = None
+    flatten_at_close: bool = True
+
+    @classmethod
+    def for_mode(cls, mode: TradingMode, allow_extended_hours: bool = False) -> "IntradaySessionRules":
+        """Rules for a trading mode (swing positions are held overnight)"""
+        config = AdaptiveIndicatorConfig.get_config(mode)
+        return cls(
+            mode=mode,
+            allow_extended_hours=allow_extended_hours,
+            max_hold_minutes=config["hold_time_max_minutes"],
+            flatten_at_close=mode != TradingMode.SWING,
+        )
+
+    @property
+    def open_minute(self) -> int:
+        return PRE_MARKET_OPEN if self.allow_extended_hours else REGULAR_OPEN
+
+    @property
+    def close_minute(self) -> int:
+        return AFTER_HOURS_CLOSE if self.allow_extended_hours else REGULAR_CLOSE
+
+    def in_session(self, minute_of_day: np.ndarray) -> np.ndarray:
+        """Mask of bars inside the tradable session"""
+        return (minute_of_day >= self.open_minute) & (minute_of_day < self.close_minute)
+
+    def can_enter(self, minute_of_day: int) -> bool:
+        return minute_of_day < self.close_minute - self.no_entry_minutes_before_close
+
+    def hold_expired(self, entry_time: datetime, now: datetime) -> bool:
+        if self.max_hold_minutes is None:
+            return False
+        return now - entry_time >= timedelta(minutes=self.max_hold_minutes)
+
+
+# ==================== ROLLING LOOKBACK ====================
+
+class RollingWindow:
+    """
+    Last `capacity` bars of one symbol as OHLCV column arrays.
+
+    Appends into a buffer twice the capacity and slides the tail back to
+    the front when it fills, so appends are amortized O(1) and the window
+    is always one contiguous view.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self._buffer = np.empty((len(COLUMNS), 2 * self.capacity), dtype=np.float64)
+        self._start = 0
+        self._end = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def append(self, values: Tuple[float, ...]) -> None:
+        if self._end == self._buffer.shape[1]:
+            keep = self.capacity - 1
+            self._buffer[:, :keep] = self._buffer[:, self._end - keep:self._end]
+            self._start, self._end = 0, keep
+        self._buffer[:, self._end] = values
+        self._end += 1
+        if self._end - self._start > self.capacity:
+            self._start += 1
+
+    def tail(self, column: int, periods: int) -> np.ndarray:
+        view = self._buffer[column, max(self._start, self._end - periods):self._end]
+        view.flags.writeable = False
+        return view
+
+
+class RollingLookback:
+    """
+    Stand-in for BacktestData.get_lookback in streaming backtests.
+
+    Only the current minute can be looked back from (bars arrive in time
+    order), so the timestamp argument is accepted for interface
+    compatibility and not used.
+    """
+
+    def __init__(self, symbols: List[str], periods: int):
+        self.periods = periods
+        self.windows: Dict[str, RollingWindow] = {symbol: RollingWindow(periods) for symbol in symbols}
+
+    def append(self, symbol: str, bar: Bar) -> None:
+        self.windows[symbol].append((bar.open, bar.high, bar.low, bar.close, bar.volume))
+
+    def get_lookback(self, symbol: str, timestamp: datetime, periods: int) -> np.ndarray:
+        """Last N closes for a symbol as a read-only view"""
+        return self.get_lookback_array(symbol, timestamp, periods, "close")
+
+    def get_lookback_array(self, symbol: str, timestamp: datetime, periods: int, column: str = "close") -> np.ndarray:
+        window = self.windows.get(symbol)
+        if window is None:
+            return np.empty(0, dtype=np.float64)
+        return window.tail(COLUMNS.index(column), periods)
+
+
+# ==================== STREAMING PIPELINE ====================
+
+@dataclass
+class TradingDay:
+    """All symbols' in-session minute bars for one day"""
+    day: date
+    chunks: Dict[str, MinuteChunk] = field(default_factory=dict)
+
+
+def iter_trading_days(
+    store: MinuteBarStore,
+    symbols: List[str],
+    start_date: date,
+    end_date: date,
+    rules: IntradaySessionRules,
+) -> Iterator[TradingDay]:
+    """Advance every symbol's day stream in lockstep, keeping in-session bars"""
+    streams = {symbol: store.iter_days(symbol, start_date, end_date) for symbol in symbols}
+    pending: Dict[str, MinuteChunk] = {}
+    for symbol, stream in streams.items():
+        chunk = next(stream, None)
+        if chunk is not None:
+            pending[symbol] = chunk
+
+    while pending:
+        day = min(chunk.day for chunk in pending.values())
+        trading_day = TradingDay(day=day)
+        for symbol in [s for s, chunk in pending.items() if chunk.day == day]:
+            chunk = pending.pop(symbol)
+            session = chunk.select(rules.in_session(chunk.minute_of_day))
+            if len(session):
+                trading_day.chunks[symbol] = session
+            following = next(streams[symbol], None)
+            if following is not None:
+                pending[symbol] = following
+        if trading_day.chunks:
+            yield trading_day
+
+
+def iter_minutes(trading_day: TradingDay) -> Iterator[Tuple[int, Dict[str, Bar]]]:
+    """Yield (epoch seconds, {symbol: Bar}) for each minute of the day that has bars"""
+    timeline = np.unique(np.concatenate([chunk.timestamps for chunk in trading_day.chunks.values()]))
+    rows = {symbol: np.searchsorted(chunk.timestamps, timeline) for symbol, chunk in trading_day.chunks.items()}
+
+    for position, ts in enumerate(timeline.tolist()):
+        timestamp = datetime.fromtimestamp(ts, tz=timezone.utc)
+        bars = {}
+        for symbol, chunk in trading_day.chunks.items():
+            row = rows[symbol][position]
+            if row < len(chunk) and chunk.timestamps[row] == ts:
+                bars[symbol] = Bar(
+                    timestamp=timestamp,
+                    open=float(chunk.open[row]),
+                    high=float(chunk.high[row]),
+                    low=float(chunk.low[row]),
+                    close=float(chunk.close[row]),
+                    volume=float(chunk.volume[row]),
+                )
+        yield ts, bars
+
+
+# ==================== ENGINE ====================
+
+class IntradayBacktestEngine:
+    """
+    Minute-bar backtest engine with bounded memory.
+
+    Same flow as BacktestEngine (update prices, ask the strategy, execute,
+    record), driven by the streaming pipeline above and the session rules.
+    Equity is recorded at each session close, so the equity curve and the
+    daily-return metrics have one point per trading day.
+    """
+
+    def __init__(
+        self,
+        strategy,
+        start_date: date,
+        end_date: date,
+        initial_capital: float = 100000,
+        position_size_pct: float = 10.0,
+        rules: Optional[IntradaySessionRules] = None,
+        store: Optional[MinuteBarStore] = None,
+        data_service=None,
+        progress_callback: Optional[Callable[[float], None]] = None,
+        should_cancel: Optional[Callable[[], bool]] = None,
+    ):
+        """
+        Initialize the intraday engine.
+
+        Args:
+            strategy: The strategy to backtest (BacktestEngine Strategy protocol)
+            start_date: Start date for backtest
+            end_date: End date for backtest
+            initial_capital: Starting capital
+            position_size_pct: Position size as % of portfolio
+            rules: Session rules (default: intraday mode, regular hours)
+            store: Minute bar store (default: ./minute_bars)
+            data_service: Bar source used to fill the store (default: Alpaca)
+            progress_callback: Called with the simulated fraction (0-1)
+            should_cancel: Polled each day; returning True raises BacktestCancelledError
+        """
+        self.strategy = strategy
+        self.start_date = start_date
+        self.end_date = end_date
+        self.initial_capital = initial_capital
+        self.rules = rules or IntradaySessionRules.for_mode(TradingMode.INTRADAY)
+        self.store = store or MinuteBarStore()
+        self.data_loader = DataLoader(data_service)
+        self.progress_callback = progress_callback
+        self.should_cancel = should_cancel
+
+        self.portfolio = SimulatedPortfolio(
+            initial_capital=initial_capital,
+            position_size_pct=position_size_pct
+        )
+
+    async def run(self, symbols: List[str]) -> BacktestResult:
+        """
+        Run the backtest.
+
+        Args:
+            symbols: List of symbols to trade
+
+        Returns:
+            BacktestResult with performance metrics and trade history
+        """
+        start_time = time.time()
+        logger.info(f"Starting intraday backtest: {len(symbols)} symbols, {self.start_date} to {self.end_date}, "
+                    f"{self.rules.mode.value} mode")
+
+        await self.store.ensure(symbols, self.start_date, self.end_date, await self.data_loader._get_alpaca())
+        benchmark_data = await self.data_loader.load_benchmark(self.start_date, self.end_date)
+
+        lookback = RollingLookback(
+            symbols, getattr(self.strategy, "lookback_periods", DEFAULT_LOOKBACK_PERIODS)
+        )
+        total_days = max(1, (self.end_date - self.start_date).days + 1)
+        bars_processed = 0
+        last_timestamp = None
+
+        for trading_day in iter_trading_days(self.store, symbols, self.start_date, self.end_date, self.rules):
+            self._check_cancelled()
+            if self.progress_callback:
+                self.progress_callback((trading_day.day - self.start_date).days / total_days)
+
+            offset = eastern_offset_seconds(trading_day.day)
+            for ts, bars in iter_minutes(trading_day):
+                last_timestamp = next(iter(bars.values())).timestamp
+                await self._step(bars, lookback, last_timestamp, (ts + offset) % 86400 // 60)
+                bars_processed += 1
+
+            if self.rules.flatten_at_close:
+                self._close_positions(self.portfolio.positions.keys(), last_timestamp, "Session close")
+            self.portfolio.record_equity(last_timestamp)
+
+        if last_timestamp is not None:
+            self.portfolio.close_all_positions(last_timestamp)
+            self.portfolio.record_equity(last_timestamp)
+        if self.progress_callback:
+            self.progress_callback(1.0)
+
+        benchmark_return = None
+        if benchmark_data.bars:
+            benchmark_return = PerformanceMetrics.calculate_benchmark_return(
+                benchmark_data.bars,
+                datetime.combine(self.start_date, datetime.min.time()),
+                datetime.combine(self.end_date, datetime.max.time())
+            )
+
+        metrics = PerformanceMetrics.calculate(
+            trades=self.portfolio.trades,
+            equity_curve=self.portfolio.equity_curve,
+            initial_capital=self.initial_capital,
+            benchmark_return_pct=benchmark_return,
+            online=self.portfolio.metrics,
+        )
+
+        run_time = time.time() - start_time
+        logger.info(f"Intraday backtest complete: {bars_processed} minutes, {metrics.total_trades} trades, "
+                    f"{metrics.total_return_pct:.1f}% return, {run_time:.2f}s")
+
+        return BacktestResult(
+            symbols=symbols,
+            start_date=self.start_date,
+            end_date=self.end_date,
+            initial_capital=self.initial_capital,
+            strategy=self.strategy.__class__.__name__,
+            strategy_params=getattr(self.strategy, 'params', {}),
+            final_equity=self.portfolio.equity,
+            metrics=metrics,
+            equity_curve=self.portfolio.equity_curve,
+            trades=self.portfolio.get_completed_trades(),
+            run_time_seconds=run_time,
+            bars_processed=bars_processed
+        )
+
+    async def _step(self, bars: Dict[str, Bar], lookback: RollingLookback, timestamp: datetime, minute_of_day: int):
+        """Process one minute: lookback, prices, hold limits, strategy signals"""
+        for symbol, bar in bars.items():
+            lookback.append(symbol, bar)
+        self.portfolio.update_prices(bars)
+
+        expired = [
+            symbol for symbol, position in self.portfolio.positions.items()
+            if symbol in bars and self.rules.hold_expired(position.entry_time, timestamp)
+        ]
+        self._close_positions(expired, timestamp, f"Max hold time ({self.rules.max_hold_minutes}m)")
+
+        try:
+            signals = await self.strategy.generate_signals(
+                bars=bars,
+                portfolio=self.portfolio,
+                lookback_data=lookback,
+                current_timestamp=timestamp
+            )
+        except Exception as e:
+            logger.error(f"Strategy error at {timestamp}: {e}")
+            signals = []
+
+        can_enter = self.rules.can_enter(minute_of_day)
+        for signal in signals:
+            if signal.symbol not in bars:
+                continue
+            if signal.action == "BUY" and not can_enter:
+                continue
+            self.portfolio.execute(signal, bars[signal.symbol].close)
+
+    def _close_positions(self, symbols, timestamp: datetime, reason: str):
+        """Sell positions at their latest price"""
+        for symbol in list(symbols):
+            price = self.portfolio._current_prices.get(symbol, self.portfolio.positions[symbol].entry_price)
+            self.portfolio.execute(
+                Signal(symbol=symbol, action="SELL", timestamp=timestamp, reason=reason), price
+            )
+
+    def _check_cancelled(self) -> None:
+        if self.should_cancel and self.should_cancel():
+            raise BacktestCancelledError()
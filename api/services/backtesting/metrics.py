@@ -4,12 +4,12 @@ Performance metrics calculation for backtesting.
 Calculates key metrics like win rate, Sharpe ratio, max drawdown, etc.
 """
 
-import math
 import logging
 from typing import List, Optional
 from datetime import datetime
 
 from models.backtest import SimulatedTrade, EquityPoint, PerformanceMetricsResult
+from .online_metrics import OnlineMetrics
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +31,8 @@ class PerformanceMetrics:
         trades: List[SimulatedTrade],
         equity_curve: List[EquityPoint],
         initial_capital: float,
-        benchmark_return_pct: Optional[float] = None
+        benchmark_return_pct: Optional[float] = None,
+        online: Optional[OnlineMetrics] = None,
     ) -> PerformanceMetricsResult:
         """
         Calculate all performance metrics.
@@ -41,44 +42,37 @@ class PerformanceMetrics:
             equity_curve: Equity values over time
             initial_capital: Starting capital
             benchmark_return_pct: Optional benchmark return for alpha calculation
+            online: Accumulator already fed with this equity curve and these
+                trades (e.g. SimulatedPortfolio.metrics); built here if omitted
 
         Returns:
             PerformanceMetricsResult with all metrics
         """
-        # Filter to completed trades only
-        completed = [t for t in trades if t.exit_price is not None]
+        if online is None:
+            online = cls.accumulate(trades, equity_curve)
+        snapshot = online.snapshot()
 
         # Basic stats
-        total_trades = len(completed)
-        winning_trades = sum(1 for t in completed if t.pnl and t.pnl > 0)
-        losing_trades = sum(1 for t in completed if t.pnl and t.pnl <= 0)
-        win_rate = winning_trades / total_trades if total_trades > 0 else 0
-
-        # Extract equity values
-        equities = [e.equity for e in equity_curve] if equity_curve else [initial_capital]
-        final_equity = equities[-1] if equities else initial_capital
+        total_trades = snapshot.total_trades
+        winning_trades = snapshot.winning_trades
+        losing_trades = snapshot.losing_trades
+        win_rate = snapshot.win_rate
 
         # Returns
+        final_equity = snapshot.equity if snapshot.equity is not None else initial_capital
         total_return_pct = (final_equity - initial_capital) / initial_capital * 100
         annualized_return = cls._calculate_annualized_return(equity_curve, initial_capital)
 
-        # Risk metrics
-        max_drawdown = cls._calculate_max_drawdown(equities)
-        sharpe = cls._calculate_sharpe_ratio(equity_curve)
-        sortino = cls._calculate_sortino_ratio(equity_curve)
+        # Risk metrics (population deviation of per-point returns)
+        max_drawdown = snapshot.max_drawdown_pct
+        sharpe = snapshot.sharpe_ratio(cls.RISK_FREE_RATE, ddof=0) or 0
+        sortino = snapshot.sortino_ratio(cls.RISK_FREE_RATE) or 0
 
         # Trade metrics
-        wins = [t.pnl for t in completed if t.pnl and t.pnl > 0]
-        losses = [t.pnl for t in completed if t.pnl and t.pnl <= 0]
-
-        average_win = sum(wins) / len(wins) if wins else 0
-        average_loss = sum(losses) / len(losses) if losses else 0
-
-        total_wins = sum(wins)
-        total_losses = abs(sum(losses)) if losses else 0
-        profit_factor = total_wins / total_losses if total_losses > 0 else float('inf')
-
-        expectancy = (win_rate * average_win) - ((1 - win_rate) * abs(average_loss))
+        average_win = snapshot.avg_win
+        average_loss = snapshot.avg_loss
+        profit_factor = snapshot.profit_factor
+        expectancy = snapshot.expectancy
 
         # Alpha (outperformance vs benchmark)
         alpha = None
@@ -104,25 +98,19 @@ class PerformanceMetrics:
         )
 
     @classmethod
-    def _calculate_max_drawdown(cls, equities: List[float]) -> float:
-        """
-        Calculate maximum drawdown percentage.
-
-        Max drawdown is the largest peak-to-trough decline.
-        """
-        if not equities:
-            return 0
-
-        peak = equities[0]
-        max_dd = 0
-
-        for equity in equities:
-            if equity > peak:
-                peak = equity
-            dd = (peak - equity) / peak * 100
-            max_dd = max(max_dd, dd)
-
-        return max_dd
+    def accumulate(
+        cls,
+        trades: List[SimulatedTrade],
+        equity_curve: List[EquityPoint],
+    ) -> OnlineMetrics:
+        """Feed a finished equity curve and its completed trades to an accumulator"""
+        online = OnlineMetrics()
+        for point in equity_curve:
+            online.add_equity(point.equity)
+        for trade in trades:
+            if trade.exit_price is not None:
+                online.add_trade(trade.pnl or 0)
+        return online
 
     @classmethod
     def _calculate_annualized_return(
@@ -152,84 +140,6 @@ class PerformanceMetrics:
             return annualized * 100
         return 0
 
-    @classmethod
-    def _calculate_sharpe_ratio(cls, equity_curve: List[EquityPoint]) -> float:
-        """
-        Calculate Sharpe ratio.
-
-        Sharpe = (Return - RiskFreeRate) / StdDev(Returns)
-        """
-        if not equity_curve or len(equity_curve) < 2:
-            return 0
-
-        # Calculate daily returns
-        daily_returns = cls._calculate_daily_returns(equity_curve)
-        if not daily_returns:
-            return 0
-
-        # Mean and std of daily returns
-        mean_return = sum(daily_returns) / len(daily_returns)
-        variance = sum((r - mean_return) ** 2 for r in daily_returns) / len(daily_returns)
-        std_return = math.sqrt(variance) if variance > 0 else 0
-
-        if std_return == 0:
-            return 0
-
-        # Annualize
-        daily_rf = cls.RISK_FREE_RATE / cls.TRADING_DAYS_PER_YEAR
-        excess_return = mean_return - daily_rf
-        sharpe = (excess_return / std_return) * math.sqrt(cls.TRADING_DAYS_PER_YEAR)
-
-        return sharpe
-
-    @classmethod
-    def _calculate_sortino_ratio(cls, equity_curve: List[EquityPoint]) -> float:
-        """
-        Calculate Sortino ratio.
-
-        Like Sharpe but only penalizes downside volatility.
-        """
-        if not equity_curve or len(equity_curve) < 2:
-            return 0
-
-        daily_returns = cls._calculate_daily_returns(equity_curve)
-        if not daily_returns:
-            return 0
-
-        mean_return = sum(daily_returns) / len(daily_returns)
-
-        # Downside deviation (std of negative returns only)
-        negative_returns = [r for r in daily_returns if r < 0]
-        if not negative_returns:
-            return float('inf')  # No downside = infinite Sortino
-
-        variance = sum(r ** 2 for r in negative_returns) / len(negative_returns)
-        downside_std = math.sqrt(variance) if variance > 0 else 0
-
-        if downside_std == 0:
-            return 0
-
-        daily_rf = cls.RISK_FREE_RATE / cls.TRADING_DAYS_PER_YEAR
-        excess_return = mean_return - daily_rf
-        sortino = (excess_return / downside_std) * math.sqrt(cls.TRADING_DAYS_PER_YEAR)
-
-        return sortino
-
-    @classmethod
-    def _calculate_daily_returns(cls, equity_curve: List[EquityPoint]) -> List[float]:
-        """Calculate daily return percentages."""
-        if len(equity_curve) < 2:
-            return []
-
-        returns = []
-        for i in range(1, len(equity_curve)):
-            prev = equity_curve[i - 1].equity
-            curr = equity_curve[i].equity
-            if prev > 0:
-                returns.append((curr - prev) / prev)
-
-        return returns
-
     @classmethod
     def calculate_benchmark_return(
         cls,
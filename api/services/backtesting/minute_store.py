@@ -0,0 +1,255 @@
+"""
+Local minute-bar store for intraday backtests.
+
+Minute bars are stored on disk as one NumPy archive per symbol per month
+(<directory>/<SYMBOL>/<YYYY-MM>.npz: epoch seconds plus OHLCV columns).
+Missing months are fetched from the bar source (Alpaca by default) a week
+at a time, which keeps every request under the API's bar limit.
+
+Months that end before today are stored as complete and never refetched.
+The current month is stored as a partial file and refreshed on every run.
+
+Backtests read the store one month per symbol at a time and hand out one
+trading day at a time (see iter_days), so memory stays bounded regardless
+of the backtest length.
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import pytz
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ("open", "high", "low", "close", "volume")
+
+# Alpaca returns at most this many bars per request; a week of minute bars
+# including extended hours is ~4,800
+FETCH_WINDOW_DAYS = 7
+FETCH_LIMIT = 10000
+
+EASTERN = pytz.timezone("US/Eastern")
+# Every trading minute (4:00 AM - 8:00 PM ET) is on the same calendar day
+# in ET and in UTC-5, so shifting by 5 hours finds the ET session date
+_SESSION_DAY_SHIFT = 5 * 3600
+
+
+@lru_cache(maxsize=4096)
+def eastern_offset_seconds(day: date) -> int:
+    """UTC offset of US/Eastern during the session on `day` (DST-aware)"""
+    return int(EASTERN.localize(datetime.combine(day, time(12))).utcoffset().total_seconds())
+
+
+@dataclass
+class MinuteChunk:
+    """Minute bars of one symbol for one trading day (ET), as column arrays"""
+    symbol: str
+    day: date
+    timestamps: np.ndarray  # int64 epoch seconds (UTC)
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def minute_of_day(self) -> np.ndarray:
+        """Minutes since midnight ET for each bar"""
+        local = self.timestamps + eastern_offset_seconds(self.day)
+        return (local % 86400) // 60
+
+    def select(self, mask: np.ndarray) -> "MinuteChunk":
+        return MinuteChunk(
+            symbol=self.symbol,
+            day=self.day,
+            timestamps=self.timestamps[mask],
+            **{name: getattr(self, name)[mask] for name in COLUMNS},
+        )
+
+
+def session_days(timestamps: np.ndarray) -> np.ndarray:
+    """ET trading date of each timestamp, as days since the epoch"""
+    return (timestamps - _SESSION_DAY_SHIFT) // 86400
+
+
+def _epoch_seconds(value: Any) -> int:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+def _month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def _next_month(month: date) -> date:
+    return (month + timedelta(days=32)).replace(day=1)
+
+
+class MinuteBarStore:
+    """
+    On-disk minute bars, filled from a bar source on demand.
+    """
+
+    def __init__(self, directory: str = "./minute_bars"):
+        self.directory = Path(directory)
+
+    # ===== PATHS =====
+
+    def _path(self, symbol: str, month: date, partial: bool = False) -> Path:
+        suffix = ".partial.npz" if partial else ".npz"
+        return self.directory / symbol.upper() / f"{month:%Y-%m}{suffix}"
+
+    def has_month(self, symbol: str, month: date) -> bool:
+        """Whether a complete month is stored"""
+        return self._path(symbol, _month_start(month)).exists()
+
+    # ===== FILL =====
+
+    async def ensure(
+        self,
+        symbols: List[str],
+        start_date: date,
+        end_date: date,
+        data_service,
+        today: Optional[date] = None,
+    ) -> int:
+        """
+        Fetch and store every month of [start_date, end_date] not yet stored.
+
+        Args:
+            symbols: Symbols to fill
+            start_date: First day needed
+            end_date: Last day needed
+            data_service: Object with async get_bars(symbol, timeframe, limit, start, end)
+            today: Override the current date (tests)
+
+        Returns:
+            Number of months fetched
+        """
+        today = today or date.today()
+        fetched = 0
+        for symbol in symbols:
+            month = _month_start(start_date)
+            while month <= end_date:
+                month_end = _next_month(month) - timedelta(days=1)
+                complete = month_end < today
+                if not (complete and self.has_month(symbol, month)):
+                    last_day = month_end if complete else min(month_end, today)
+                    await self._fetch_month(symbol, month, last_day, data_service, partial=not complete)
+                    fetched += 1
+                month = _next_month(month)
+        return fetched
+
+    async def _fetch_month(self, symbol: str, month: date, last_day: date, data_service, partial: bool) -> None:
+        rows = []
+        day = month
+        while day <= last_day:
+            window_end = min(day + timedelta(days=FETCH_WINDOW_DAYS - 1), last_day)
+            bars = await data_service.get_bars(
+                symbol=symbol,
+                timeframe="1Min",
+                # ET day boundaries, so each month file holds exactly its sessions
+                start=EASTERN.localize(datetime.combine(day, time.min)),
+                end=EASTERN.localize(datetime.combine(window_end, time.max)),
+                limit=FETCH_LIMIT,
+            )
+            for bar in bars:
+                rows.append((
+                    _epoch_seconds(bar.get("timestamp") or bar.get("t")),
+                    float(bar.get("open") or bar.get("o", 0)),
+                    float(bar.get("high") or bar.get("h", 0)),
+                    float(bar.get("low") or bar.get("l", 0)),
+                    float(bar.get("close") or bar.get("c", 0)),
+                    float(bar.get("volume") or bar.get("v", 0)),
+                ))
+            day = window_end + timedelta(days=1)
+
+        table = np.array(rows, dtype=np.float64).reshape(-1, 6)
+        timestamps = table[:, 0].astype(np.int64)
+        order = np.argsort(timestamps, kind="stable")
+        timestamps, unique = np.unique(timestamps[order], return_index=True)
+        columns = {name: table[order, i + 1][unique] for i, name in enumerate(COLUMNS)}
+        self.write_month(symbol, month, timestamps, columns, partial=partial)
+        logger.info(f"[MinuteStore] Stored {len(timestamps)} bars for {symbol} {month:%Y-%m}"
+                    f"{' (partial)' if partial else ''}")
+
+    def write_month(
+        self,
+        symbol: str,
+        month: date,
+        timestamps: np.ndarray,
+        columns: Dict[str, np.ndarray],
+        partial: bool = False,
+    ) -> None:
+        """Store a month of bars (atomic: temp file + rename)"""
+        month = _month_start(month)
+        path = self._path(symbol, month, partial)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.stem}.tmp.npz")
+        np.savez(tmp_path, timestamps=np.asarray(timestamps, dtype=np.int64),
+                 **{name: np.asarray(columns[name], dtype=np.float64) for name in COLUMNS})
+        tmp_path.replace(path)
+        if not partial:
+            self._path(symbol, month, partial=True).unlink(missing_ok=True)
+
+    # ===== READ =====
+
+    def read_month(self, symbol: str, month: date) -> Optional[Dict[str, np.ndarray]]:
+        """Column arrays of a stored month (complete, else partial), or None"""
+        month = _month_start(month)
+        for path in (self._path(symbol, month), self._path(symbol, month, partial=True)):
+            if path.exists():
+                with np.load(path) as archive:
+                    return {name: archive[name] for name in ("timestamps",) + COLUMNS}
+        return None
+
+    def iter_days(self, symbol: str, start_date: date, end_date: date) -> Iterator[MinuteChunk]:
+        """
+        Yield one MinuteChunk per trading day in [start_date, end_date].
+
+        Only one month of the symbol is in memory at a time.
+        """
+        epoch = date(1970, 1, 1)
+        first, last = (start_date - epoch).days, (end_date - epoch).days
+        month = _month_start(start_date)
+        while month <= end_date:
+            arrays = self.read_month(symbol, month)
+            month = _next_month(month)
+            if arrays is None or not len(arrays["timestamps"]):
+                continue
+
+            days = session_days(arrays["timestamps"])
+            boundaries = np.flatnonzero(np.diff(days)) + 1
+            for lo, hi in zip(np.r_[0, boundaries], np.r_[boundaries, len(days)]):
+                day_number = int(days[lo])
+                if day_number < first or day_number > last:
+                    continue
+                yield MinuteChunk(
+                    symbol=symbol,
+                    day=epoch + timedelta(days=day_number),
+                    timestamps=arrays["timestamps"][lo:hi],
+                    **{name: arrays[name][lo:hi] for name in COLUMNS},
+                )
+
+
+_minute_bar_store: Optional[MinuteBarStore] = None
+
+
+def get_minute_bar_store() -> MinuteBarStore:
+    """Get the global minute bar store (directory from BACKTEST_MINUTE_STORE_DIR)"""
+    global _minute_bar_store
+    if _minute_bar_store is None:
+        _minute_bar_store = MinuteBarStore(os.getenv("BACKTEST_MINUTE_STORE_DIR", "./minute_bars"))
+    return _minute_bar_store
@@ -0,0 +1,296 @@
+"""
+Online performance metrics.
+
+Keeps running statistics of an equity curve and a trade stream so that
+Sharpe, Sortino, drawdown, streaks and profit factor are available at any
+point without re-walking the full history. Every update is O(1):
+
+- Returns use Welford's algorithm for mean/variance, plus a running sum
+  of squared negative returns for the downside deviation.
+- Drawdown tracks the running peak and the largest fall from it.
+- Trades update win/loss counts, gross profit/loss and streaks.
+
+The same accumulator backs PerformanceMetrics (event-driven backtests),
+WalkForwardBacktester's trade-level stats and the live PerformanceTracker;
+each caller keeps its own conventions (sample vs population deviation,
+risk-free rate, what to report when a ratio is undefined).
+"""
+
+import copy
+import math
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Periods per year used to annualize daily ratios
+TRADING_DAYS_PER_YEAR = 252
+
+
+@dataclass
+class RunningStats:
+    """
+    Running mean/variance (Welford) and downside deviation of a series.
+
+    The downside deviation is the root mean square of the negative values
+    only, the definition both the backtest and live Sortino ratios use.
+    """
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    downside_count: int = 0
+    downside_sum_sq: float = 0.0
+
+    def add(self, value: float) -> None:
+        """Add one observation"""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < 0:
+            self.downside_count += 1
+            self.downside_sum_sq += value * value
+
+    def variance(self, ddof: int = 1) -> float:
+        """Variance with `ddof` delta degrees of freedom (0 if undefined)"""
+        if self.count <= ddof:
+            return 0.0
+        return max(self.m2, 0.0) / (self.count - ddof)
+
+    def std(self, ddof: int = 1) -> float:
+        """Standard deviation with `ddof` delta degrees of freedom"""
+        return math.sqrt(self.variance(ddof))
+
+    @property
+    def downside_deviation(self) -> float:
+        """Root mean square of the negative observations"""
+        if not self.downside_count:
+            return 0.0
+        return math.sqrt(self.downside_sum_sq / self.downside_count)
+
+    def sharpe_ratio(
+        self,
+        risk_free_rate: float = 0.0,
+        periods_per_year: int = TRADING_DAYS_PER_YEAR,
+        ddof: int = 1,
+    ) -> Optional[float]:
+        """
+        Annualized Sharpe ratio of per-period returns.
+
+        Args:
+            risk_free_rate: Annual risk-free rate, spread evenly over periods
+            periods_per_year: Periods per year (252 for daily returns)
+            ddof: 1 for the sample deviation, 0 for the population deviation
+
+        Returns:
+            Sharpe ratio, or None with too few observations or no volatility
+        """
+        std = self.std(ddof)
+        if self.count == 0 or std <= 0:
+            return None
+        excess = self.mean - risk_free_rate / periods_per_year
+        return excess / std * math.sqrt(periods_per_year)
+
+    def sortino_ratio(
+        self,
+        risk_free_rate: float = 0.0,
+        periods_per_year: int = TRADING_DAYS_PER_YEAR,
+    ) -> Optional[float]:
+        """
+        Annualized Sortino ratio of per-period returns.
+
+        Returns:
+            Sortino ratio, inf if no observation was negative, or None with
+            no observations
+        """
+        if self.count == 0:
+            return None
+        if not self.downside_count:
+            return float('inf')
+        downside = self.downside_deviation
+        if downside == 0:
+            return None
+        excess = self.mean - risk_free_rate / periods_per_year
+        return excess / downside * math.sqrt(periods_per_year)
+
+
+@dataclass
+class MetricsSnapshot:
+    """Point-in-time copy of an OnlineMetrics accumulator"""
+    # Equity curve
+    equity_points: int
+    equity: Optional[float]
+    peak_equity: Optional[float]
+    max_drawdown: float          # Largest peak-to-trough fall, in currency
+    max_drawdown_pct: float      # Largest fall as % of the peak it fell from
+    current_drawdown: float
+    current_drawdown_pct: float
+    returns: RunningStats        # Per-point returns of the equity curve
+
+    # Trades
+    total_trades: int
+    winning_trades: int          # pnl > 0
+    losing_trades: int           # pnl < 0
+    net_pnl: float
+    gross_profit: float
+    gross_loss: float            # Positive magnitude
+    best_trade: float
+    worst_trade: float
+    consecutive_wins: int        # Current streak (breakeven trades count as losses)
+    consecutive_losses: int
+    max_consecutive_wins: int
+    max_consecutive_losses: int
+
+    @property
+    def win_rate(self) -> float:
+        """Fraction of trades with positive P&L"""
+        return self.winning_trades / self.total_trades if self.total_trades else 0
+
+    @property
+    def avg_win(self) -> float:
+        return self.gross_profit / self.winning_trades if self.winning_trades else 0
+
+    @property
+    def avg_loss(self) -> float:
+        """Average losing trade (negative)"""
+        return -self.gross_loss / self.losing_trades if self.losing_trades else 0
+
+    @property
+    def avg_trade(self) -> float:
+        return self.net_pnl / self.total_trades if self.total_trades else 0
+
+    @property
+    def profit_factor(self) -> float:
+        """Gross profit / gross loss (inf without losses)"""
+        return self.gross_profit / self.gross_loss if self.gross_loss > 0 else float('inf')
+
+    @property
+    def expectancy(self) -> float:
+        return (self.win_rate * self.avg_win) - ((1 - self.win_rate) * abs(self.avg_loss))
+
+    def sharpe_ratio(self, risk_free_rate: float = 0.0, ddof: int = 1) -> Optional[float]:
+        """Annualized Sharpe ratio of the equity curve's returns"""
+        return self.returns.sharpe_ratio(risk_free_rate, ddof=ddof)
+
+    def sortino_ratio(self, risk_free_rate: float = 0.0) -> Optional[float]:
+        """Annualized Sortino ratio of the equity curve's returns"""
+        return self.returns.sortino_ratio(risk_free_rate)
+
+
+class OnlineMetrics:
+    """
+    O(1)-per-update accumulator of equity-curve and trade metrics.
+
+    Feed it equity points with add_equity() and closed trades with
+    add_trade() as they happen; snapshot() returns the metrics so far.
+    The two streams are independent - a trade-only equity curve is built
+    by calling add_equity() with the running balance after each trade.
+    """
+
+    def __init__(self, initial_equity: Optional[float] = None):
+        """
+        Args:
+            initial_equity: First equity point, if known up front
+        """
+        self.returns = RunningStats()
+        self.equity_points = 0
+        self.equity: Optional[float] = None
+        self.peak_equity: Optional[float] = None
+        self.max_drawdown = 0.0
+        self.max_drawdown_pct = 0.0
+
+        self.total_trades = 0
+        self.winning_trades = 0
+        self.losing_trades = 0
+        self.net_pnl = 0.0
+        self.gross_profit = 0.0
+        self.gross_loss = 0.0
+        self.best_trade = 0.0
+        self.worst_trade = 0.0
+        self.consecutive_wins = 0
+        self.consecutive_losses = 0
+        self.max_consecutive_wins = 0
+        self.max_consecutive_losses = 0
+
+        if initial_equity is not None:
+            self.add_equity(initial_equity)
+
+    def add_equity(self, equity: float) -> None:
+        """Add the next point of the equity curve"""
+        previous = self.equity
+        if previous is not None and previous > 0:
+            self.returns.add((equity - previous) / previous)
+        self.equity = equity
+        self.equity_points += 1
+
+        if self.peak_equity is None or equity > self.peak_equity:
+            self.peak_equity = equity
+        drawdown = self.peak_equity - equity
+        if drawdown > self.max_drawdown:
+            self.max_drawdown = drawdown
+        if self.peak_equity > 0:
+            drawdown_pct = drawdown / self.peak_equity * 100
+            if drawdown_pct > self.max_drawdown_pct:
+                self.max_drawdown_pct = drawdown_pct
+
+    def add_trade(self, pnl: float) -> None:
+        """Add one closed trade's P&L"""
+        if self.total_trades == 0:
+            self.best_trade = self.worst_trade = pnl
+        else:
+            self.best_trade = max(self.best_trade, pnl)
+            self.worst_trade = min(self.worst_trade, pnl)
+        self.total_trades += 1
+        self.net_pnl += pnl
+
+        if pnl > 0:
+            self.winning_trades += 1
+            self.gross_profit += pnl
+            self.consecutive_wins += 1
+            self.consecutive_losses = 0
+            self.max_consecutive_wins = max(self.max_consecutive_wins, self.consecutive_wins)
+        else:
+            if pnl < 0:
+                self.losing_trades += 1
+                self.gross_loss -= pnl
+            self.consecutive_losses += 1
+            self.consecutive_wins = 0
+            self.max_consecutive_losses = max(self.max_consecutive_losses, self.consecutive_losses)
+
+    @property
+    def current_drawdown(self) -> float:
+        if self.equity is None:
+            return 0.0
+        return self.peak_equity - self.equity
+
+    @property
+    def current_drawdown_pct(self) -> float:
+        if self.equity is None or self.peak_equity <= 0:
+            return 0.0
+        return (self.peak_equity - self.equity) / self.peak_equity * 100
+
+    def snapshot(self) -> MetricsSnapshot:
+        """Metrics as of now; later updates don't change the snapshot"""
+        return MetricsSnapshot(
+            equity_points=self.equity_points,
+            equity=self.equity,
+            peak_equity=self.peak_equity,
+            max_drawdown=self.max_drawdown,
+            max_drawdown_pct=self.max_drawdown_pct,
+            current_drawdown=self.current_drawdown,
+            current_drawdown_pct=self.current_drawdown_pct,
+            returns=copy.copy(self.returns),
+            total_trades=self.total_trades,
+            winning_trades=self.winning_trades,
+            losing_trades=self.losing_trades,
+            net_pnl=self.net_pnl,
+            gross_profit=self.gross_profit,
+            gross_loss=self.gross_loss,
+            best_trade=self.best_trade,
+            worst_trade=self.worst_trade,
+            consecutive_wins=self.consecutive_wins,
+            consecutive_losses=self.consecutive_losses,
+            max_consecutive_wins=self.max_consecutive_wins,
+            max_consecutive_losses=self.max_consecutive_losses,
+        )
@@ -0,0 +1,837 @@
+"""
+Order fill simulator for backtests.
+
+Models the order types the live bot submits - market, limit, stop,
+trailing stop, bracket (entry + take-profit/stop-loss legs) and OCO -
+against bar OHLC instead of filling everything at the close.
+
+There is no order book. Within a bar, price is assumed to travel from
+the open through the high and low to the close in the order given by
+IntrabarPath, and a resting order fills at the first point of that path
+that reaches its level. An order the path jumps past (e.g. a stop below
+a gap-down open) fills at the first price beyond it, not at its level.
+Market, stop and trailing-stop fills pay slippage from the SlippageConfig
+model; limit fills don't.
+
+With max_volume_fraction set, a bar only has that share of its volume to
+fill the symbol's orders. An order that gets less than its quantity is
+partially filled: a limit keeps resting at its level, a triggered stop or
+market order fills the rest from the next bar's open.
+
+Resting orders are kept per symbol in two lists sorted by trigger level:
+one for orders triggered by falling prices (buy limits, sell stops) and
+one for rising prices (sell limits, buy stops). Finding the next order a
+price move triggers is a look at the end of a list, so thousands of
+resting orders cost little per bar. Trailing stops, whose levels move
+with price, are kept in NumPy arrays and checked/updated together.
+"""
+
+import bisect
+import itertools
+import logging
+import math
+import random
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .slippage import SlippageConfig, calculate_slippage
+
+logger = logging.getLogger(__name__)
+
+# Compact a book once this many cancelled orders are left in its lists
+_COMPACT_MIN_STALE = 64
+
+
+class OrderType(str, Enum):
+    """Simulated order types"""
+    MARKET = "market"
+    LIMIT = "limit"
+    STOP = "stop"
+    TRAILING_STOP = "trailing_stop"
+
+
+class OrderStatus(str, Enum):
+    """Simulated order lifecycle"""
+    HELD = "held"            # Bracket leg waiting for its entry to fill
+    OPEN = "open"
+    FILLED = "filled"
+    CANCELLED = "cancelled"
+    REPLACED = "replaced"    # Superseded by replace_order()
+
+
+class IntrabarPath(str, Enum):
+    """Assumed order in which price visits a bar's high and low"""
+    OHLC = "ohlc"                    # Open -> High -> Low -> Close
+    OLHC = "olhc"                    # Open -> Low -> High -> Close
+    NEAREST_FIRST = "nearest_first"  # Whichever extreme is closer to the open
+    BAR_DIRECTION = "bar_direction"  # Up bars O-L-H-C, down bars O-H-L-C
+
+
+def intrabar_path(
+    path: IntrabarPath, open_: float, high: float, low: float, close: float
+) -> Tuple[float, float, float, float]:
+    """Prices visited by a bar, in order"""
+    if path == IntrabarPath.OHLC:
+        high_first = True
+    elif path == IntrabarPath.OLHC:
+        high_first = False
+    elif path == IntrabarPath.NEAREST_FIRST:
+        high_first = (high - open_) < (open_ - low)
+    else:
+        high_first = close < open_
+    return (open_, high, low, close) if high_first else (open_, low, high, close)
+
+
+@dataclass
+class SimOrder:
+    """A simulated order"""
+    order_id: int
+    symbol: str
+    side: str                              # "buy" or "sell"
+    quantity: float
+    order_type: OrderType
+    limit_price: Optional[float] = None
+    stop_price: Optional[float] = None
+    trail_percent: Optional[float] = None  # e.g. 0.03 for 3%
+    trail_price: Optional[float] = None    # Trail dollar amount
+    status: OrderStatus = OrderStatus.OPEN
+    parent_id: Optional[int] = None        # Bracket entry this leg waits on
+    oco_group: Optional[int] = None
+    tag: str = ""                          # "entry", "take_profit", "stop_loss", ...
+    extreme: Optional[float] = None        # Trailing high (sell) or low (buy) water mark
+    filled_price: Optional[float] = None   # Average over partial fills
+    filled_at: Optional[datetime] = None   # Last fill
+    filled_quantity: float = 0.0
+
+    @property
+    def remaining(self) -> float:
+        return self.quantity - self.filled_quantity
+
+    @property
+    def falling(self) -> bool:
+        """Whether falling prices trigger the order (buy limits, sell stops)"""
+        if self.order_type == OrderType.LIMIT:
+            return self.side == "buy"
+        return self.side == "sell"
+
+    @property
+    def level(self) -> Optional[float]:
+        """Price that triggers the order"""
+        if self.order_type == OrderType.LIMIT:
+            return self.limit_price
+        if self.order_type == OrderType.STOP:
+            return self.stop_price
+        if self.order_type == OrderType.TRAILING_STOP and self.extreme is not None:
+            sign = -1 if self.side == "sell" else 1
+            if self.trail_percent:
+                return self.extreme * (1 + sign * self.trail_percent)
+            return self.extreme + sign * self.trail_price
+        return None
+
+
+@dataclass
+class Fill:
+    """An executed simulated order"""
+    order_id: int
+    symbol: str
+    side: str
+    quantity: float       # This fill's quantity (less than the order's when partial)
+    price: float          # Executed price, after slippage
+    trigger_price: float  # Point on the intrabar path where the order executed
+    slippage_pct: float
+    order_type: OrderType
+    tag: str = ""
+    timestamp: Optional[datetime] = None
+
+
+@dataclass
+class Bracket:
+    """Orders of a bracket: the entry and its two exit legs"""
+    entry: SimOrder
+    take_profit: SimOrder
+    stop_loss: SimOrder
+
+
+class _TrailingStops:
+    """Trailing stops of one symbol as parallel arrays"""
+
+    def __init__(self):
+        self.order_ids = np.empty(0, dtype=np.int64)
+        self.is_sell = np.empty(0, dtype=bool)
+        self.extreme = np.empty(0)
+        self.percent = np.empty(0)  # 0 when trailing by a dollar amount
+        self.amount = np.empty(0)
+        self.active = np.empty(0, dtype=bool)
+        self._index: Dict[int, int] = {}
+        self._pending: List[SimOrder] = []
+        self._inactive = 0
+
+    def __len__(self) -> int:
+        return len(self._index) + len(self._pending)
+
+    def add(self, order: SimOrder) -> None:
+        self._pending.append(order)
+
+    def flush(self, price: float) -> None:
+        """Move added orders into the arrays (unset water marks start at price)"""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        start = len(self.order_ids)
+        self.order_ids = np.concatenate([self.order_ids, [o.order_id for o in pending]])
+        self.is_sell = np.concatenate([self.is_sell, [o.side == "sell" for o in pending]])
+        self.extreme = np.concatenate([self.extreme, [price if o.extreme is None else o.extreme for o in pending]])
+        self.percent = np.concatenate([self.percent, [o.trail_percent or 0.0 for o in pending]])
+        self.amount = np.concatenate([self.amount, [o.trail_price or 0.0 for o in pending]])
+        self.active = np.concatenate([self.active, np.ones(len(pending), dtype=bool)])
+        for offset, order in enumerate(pending):
+            self._index[order.order_id] = start + offset
+
+    def extreme_of(self, order_id: int) -> Optional[float]:
+        index = self._index.get(order_id)
+        return None if index is None else float(self.extreme[index])
+
+    def remove(self, order_id: int) -> None:
+        index = self._index.pop(order_id, None)
+        if index is None:
+            self._pending = [o for o in self._pending if o.order_id != order_id]
+            return
+        self.active[index] = False
+        self._inactive += 1
+        if self._inactive >= _COMPACT_MIN_STALE and self._inactive * 2 > len(self.active):
+            self._compact()
+
+    def _compact(self) -> None:
+        keep = self.active
+        for name in ("order_ids", "is_sell", "extreme", "percent", "amount", "active"):
+            setattr(self, name, getattr(self, name)[keep])
+        self._index = {int(order_id): i for i, order_id in enumerate(self.order_ids)}
+        self._inactive = 0
+
+    def levels(self) -> np.ndarray:
+        trail = np.where(self.percent > 0, self.extreme * self.percent, self.amount)
+        return np.where(self.is_sell, self.extreme - trail, self.extreme + trail)
+
+    def next_trigger(self, price: float, target: float, falling: bool) -> Optional[Tuple[float, int]]:
+        """First (trigger price, order id) hit moving from price to target, if any"""
+        if not self._index:
+            return None
+        levels = self.levels()
+        if falling:
+            hit = self.active & self.is_sell & (levels >= target)
+            if not hit.any():
+                return None
+            points = np.where(hit, np.minimum(levels, price), -np.inf)
+            index = int(np.argmax(points))
+        else:
+            hit = self.active & ~self.is_sell & (levels <= target)
+            if not hit.any():
+                return None
+            points = np.where(hit, np.maximum(levels, price), np.inf)
+            index = int(np.argmin(points))
+        return float(points[index]), int(self.order_ids[index])
+
+    def update_extremes(self, price: float) -> None:
+        np.maximum(self.extreme, price, out=self.extreme, where=self.is_sell)
+        np.minimum(self.extreme, price, out=self.extreme, where=~self.is_sell)
+
+
+class _SymbolBook:
+    """
+    Resting orders of one symbol.
+
+    Both lists hold (key, -order_id) sorted ascending, keyed so that the
+    next order to trigger is the last entry: falling = level, rising =
+    -level. Ties go to the oldest order. Cancelled orders are left in
+    place and skipped (or compacted away once there are many).
+    """
+
+    def __init__(self):
+        self.market: Dict[int, None] = {}  # Market orders and triggered remainders, in arrival order
+        self.falling: List[Tuple[float, int]] = []
+        self.rising: List[Tuple[float, int]] = []
+        self.trailing = _TrailingStops()
+        self.stale = 0
+
+    def __len__(self) -> int:
+        return len(self.market) + len(self.falling) + len(self.rising) + len(self.trailing)
+
+    def insert(self, order: SimOrder) -> None:
+        if order.order_type == OrderType.MARKET:
+            self.market[order.order_id] = None
+        elif order.order_type == OrderType.TRAILING_STOP:
+            self.trailing.add(order)
+        elif order.falling:
+            bisect.insort(self.falling, (order.level, -order.order_id))
+        else:
+            bisect.insort(self.rising, (-order.level, -order.order_id))
+
+
+class OrderSimulator:
+    """
+    Fills resting orders against OHLC bars.
+
+    Usage:
+        simulator = OrderSimulator(SlippageConfig(), path=IntrabarPath.BAR_DIRECTION)
+        simulator.submit_bracket_order("AAPL", 10, "buy", stop_loss_price=95, take_profit_price=110)
+        for bar in bars:
+            fills = simulator.process_bar("AAPL", bar.open, bar.high, bar.low, bar.close,
+                                          volume=bar.volume, timestamp=bar.timestamp)
+    """
+
+    def __init__(
+        self,
+        slippage: Optional[SlippageConfig] = None,
+        path: IntrabarPath = IntrabarPath.BAR_DIRECTION,
+        rng: Optional[random.Random] = None,
+        max_volume_fraction: Optional[float] = None,
+    ):
+        """
+        Args:
+            slippage: Slippage model for market/stop fills (None = fill at the trigger price)
+            path: Intrabar path assumption
+            rng: Source of the adaptive slippage model's noise
+            max_volume_fraction: Share of a bar's volume its fills may take
+                (None = unlimited; bars without volume are unlimited too)
+        """
+        self.slippage = slippage
+        self.path = IntrabarPath(path)
+        self.rng = rng
+        self.max_volume_fraction = max_volume_fraction
+        self.orders: Dict[int, SimOrder] = {}
+        self._books: Dict[str, _SymbolBook] = {}
+        # Open orders and held orders waiting for release, per symbol
+        self._working: Dict[str, Dict[int, SimOrder]] = {}
+        # What their buy side still needs: limit notional, and the quantity of unpriced orders per symbol
+        self._buy_notional = 0.0
+        self._buy_unpriced: Dict[str, float] = {}
+        self._children: Dict[int, List[int]] = {}
+        self._oco_groups: Dict[int, List[int]] = {}
+        self._ids = itertools.count(1)
+        self._last_price: Dict[str, float] = {}
+        # Set while a bar is being processed
+        self._bar_symbol: Optional[str] = None
+        self._bar_context: Tuple[Optional[datetime], float, float] = (None, 0.0, 0.0)
+        self._bar_fills: List[Fill] = []
+        self._bar_liquidity = math.inf
+
+    # ===== ORDER ENTRY =====
+
+    def submit_order(
+        self,
+        symbol: str,
+        quantity: float,
+        side: str,
+        order_type: OrderType = OrderType.MARKET,
+        limit_price: Optional[float] = None,
+        stop_price: Optional[float] = None,
+        trail_percent: Optional[float] = None,
+        trail_price: Optional[float] = None,
+        tag: str = "",
+        held: bool = False,
+    ) -> SimOrder:
+        """
+        Submit a single order; it rests until a processed bar fills it.
+
+        A held order waits, without filling, until release_order() (e.g. a
+        market order queued for the open).
+        """
+        order = self._new_order(symbol, quantity, side, order_type, limit_price, stop_price,
+                                trail_percent, trail_price, tag)
+        if held:
+            order.status = OrderStatus.HELD
+        else:
+            self._book(symbol).insert(order)
+        self._add_working(order)
+        return order
+
+    def submit_trailing_stop_order(
+        self,
+        symbol: str,
+        quantity: float,
+        trail_percent: Optional[float] = None,
+        trail_price: Optional[float] = None,
+        side: str = "sell",
+        held: bool = False,
+    ) -> SimOrder:
+        """Trailing stop, trailing from the last processed close (or the next open)"""
+        return self.submit_order(symbol, quantity, side, OrderType.TRAILING_STOP,
+                                 trail_percent=trail_percent, trail_price=trail_price, tag="trailing_stop",
+                                 held=held)
+
+    def submit_oco_order(
+        self,
+        symbol: str,
+        quantity: float,
+        stop_loss_price: float,
+        take_profit_price: float,
+        side: str = "sell",
+        held: bool = False,
+    ) -> Tuple[SimOrder, SimOrder]:
+        """Take-profit limit and stop-loss stop; filling either cancels the other (held: release both)"""
+        take_profit = self._new_order(symbol, quantity, side, OrderType.LIMIT,
+                                      limit_price=take_profit_price, tag="take_profit")
+        stop_loss = self._new_order(symbol, quantity, side, OrderType.STOP,
+                                    stop_price=stop_loss_price, tag="stop_loss")
+        self._link_oco(take_profit, stop_loss)
+        book = self._book(symbol)
+        for order in (take_profit, stop_loss):
+            if held:
+                order.status = OrderStatus.HELD
+            else:
+                book.insert(order)
+            self._add_working(order)
+        return take_profit, stop_loss
+
+    def submit_bracket_order(
+        self,
+        symbol: str,
+        quantity: float,
+        side: str,
+        stop_loss_price: float,
+        take_profit_price: float,
+        limit_price: Optional[float] = None,
+        held: bool = False,
+    ) -> Bracket:
+        """
+        Entry (market, or limit if limit_price is given) with OCO exit legs.
+
+        The legs are held until the entry fills and become active at the
+        fill, so they can fill later in the same bar. With held=True the
+        entry itself waits for release_order().
+        """
+        exit_side = "sell" if side == "buy" else "buy"
+        entry_type = OrderType.LIMIT if limit_price is not None else OrderType.MARKET
+        entry = self._new_order(symbol, quantity, side, entry_type, limit_price=limit_price, tag="entry")
+        take_profit = self._new_order(symbol, quantity, exit_side, OrderType.LIMIT,
+                                      limit_price=take_profit_price, tag="take_profit")
+        stop_loss = self._new_order(symbol, quantity, exit_side, OrderType.STOP,
+                                    stop_price=stop_loss_price, tag="stop_loss")
+        for leg in (take_profit, stop_loss):
+            leg.status = OrderStatus.HELD
+            leg.parent_id = entry.order_id
+        self._children[entry.order_id] = [take_profit.order_id, stop_loss.order_id]
+        self._link_oco(take_profit, stop_loss)
+        if held:
+            entry.status = OrderStatus.HELD
+        else:
+            self._book(symbol).insert(entry)
+        self._add_working(entry)
+        return Bracket(entry=entry, take_profit=take_profit, stop_loss=stop_loss)
+
+    def release_order(self, order_id: int) -> bool:
+        """Start a held order (not a bracket leg); it fills from the next processed bar"""
+        order = self.orders.get(order_id)
+        if order is None or order.status != OrderStatus.HELD or order.parent_id is not None:
+            return False
+        order.status = OrderStatus.OPEN
+        self._book(order.symbol).insert(order)
+        return True
+
+    def cancel_order(self, order_id: int) -> bool:
+        """Cancel an open or held order, with its bracket legs and OCO sibling"""
+        order = self.orders.get(order_id)
+        if order is None or order.status not in (OrderStatus.OPEN, OrderStatus.HELD):
+            return False
+        self._cancel(order)
+        return True
+
+    def replace_order(
+        self,
+        order_id: int,
+        quantity: Optional[float] = None,
+        limit_price: Optional[float] = None,
+        stop_price: Optional[float] = None,
+        trail_price: Optional[float] = None,
+    ) -> Optional[SimOrder]:
+        """
+        Replace an open or held order with a changed copy (Alpaca's cancel-replace).
+
+        The copy takes the old order's place in its bracket and OCO group, so
+        moving one exit leg leaves the other working. Unchanged fields carry
+        over; quantity defaults to what is left of the old order.
+
+        Returns:
+            The new order (None if the order is not open or held)
+        """
+        old = self.get_order(order_id)
+        if old is None or old.status not in (OrderStatus.OPEN, OrderStatus.HELD):
+            return None
+        new = self._new_order(
+            old.symbol,
+            quantity if quantity is not None else old.remaining,
+            old.side,
+            old.order_type,
+            limit_price=limit_price if limit_price is not None else old.limit_price,
+            stop_price=stop_price if stop_price is not None else old.stop_price,
+            trail_percent=None if trail_price is not None else old.trail_percent,
+            trail_price=trail_price if trail_price is not None else old.trail_price,
+            tag=old.tag,
+        )
+        new.extreme = old.extreme
+        new.parent_id, new.oco_group = old.parent_id, old.oco_group
+        for linked in (self._children.get(old.parent_id), self._oco_groups.get(old.oco_group)):
+            if linked and order_id in linked:
+                linked[linked.index(order_id)] = new.order_id
+        children = self._children.pop(order_id, None)
+        if children:
+            self._children[new.order_id] = children
+            for child_id in children:
+                self.orders[child_id].parent_id = new.order_id
+
+        was_open = old.status == OrderStatus.OPEN
+        was_working = order_id in self._working.get(old.symbol, {})
+        old.status = OrderStatus.REPLACED
+        self._remove_working(old)
+        if was_open:
+            self._unbook(old)
+            self._book(new.symbol).insert(new)
+        else:
+            new.status = OrderStatus.HELD
+        if was_working:
+            self._add_working(new)
+        return new
+
+    def cancel_all_orders(self, symbol: Optional[str] = None) -> int:
+        """Cancel every open or held order (of one symbol); returns the count"""
+        cancelled = 0
+        for order in list(self.orders.values()):
+            if symbol is None or order.symbol == symbol:
+                cancelled += self.cancel_order(order.order_id)
+        return cancelled
+
+    def get_order(self, order_id: int) -> Optional[SimOrder]:
+        order = self.orders.get(order_id)
+        if order is not None and order.order_type == OrderType.TRAILING_STOP and order.status == OrderStatus.OPEN:
+            extreme = self._book(order.symbol).trailing.extreme_of(order_id)
+            if extreme is not None:
+                order.extreme = extreme
+        return order
+
+    def working_orders(self, symbol: Optional[str] = None) -> List[SimOrder]:
+        """Open orders plus held orders waiting for release (not bracket legs waiting on their entry)"""
+        if symbol is not None:
+            return list(self._working.get(symbol, {}).values())
+        return [order for orders in self._working.values() for order in orders.values()]
+
+    def working_buy_totals(self) -> Tuple[float, Dict[str, float]]:
+        """
+        Unfilled size of the working buy orders, kept as orders change.
+
+        Returns:
+            (remaining quantity x limit price of limit orders,
+             remaining quantity of market/stop/trailing orders per symbol)
+        """
+        return self._buy_notional, self._buy_unpriced
+
+    def has_resting_orders(self, symbol: str) -> bool:
+        """Whether any open order of the symbol is waiting for a bar"""
+        book = self._books.get(symbol)
+        return book is not None and len(book) - book.stale > 0
+
+    def update_price(self, symbol: str, price: float) -> None:
+        """Record a price seen without processing a bar (new trailing stops trail from it)"""
+        self._last_price[symbol] = price
+
+    def get_open_orders(self, symbol: Optional[str] = None) -> List[SimOrder]:
+        return [
+            self.get_order(order.order_id) for order in self.orders.values()
+            if order.status == OrderStatus.OPEN and (symbol is None or order.symbol == symbol)
+        ]
+
+    def _new_order(
+        self,
+        symbol: str,
+        quantity: float,
+        side: str,
+        order_type: OrderType,
+        limit_price: Optional[float] = None,
+        stop_price: Optional[float] = None,
+        trail_percent: Optional[float] = None,
+        trail_price: Optional[float] = None,
+        tag: str = "",
+    ) -> SimOrder:
+        order_type = OrderType(order_type)
+        if side not in ("buy", "sell"):
+            raise ValueError(f"Unknown order side: {side}")
+        if quantity <= 0:
+            raise ValueError("Order quantity must be positive")
+        if order_type == OrderType.LIMIT and limit_price is None:
+            raise ValueError("Limit orders need a limit_price")
+        if order_type == OrderType.STOP and stop_price is None:
+            raise ValueError("Stop orders need a stop_price")
+        if order_type == OrderType.TRAILING_STOP and not (trail_percent or trail_price):
+            raise ValueError("Trailing stops need trail_percent or trail_price")
+
+        order = SimOrder(
+            order_id=next(self._ids),
+            symbol=symbol,
+            side=side,
+            quantity=quantity,
+            order_type=order_type,
+            limit_price=limit_price,
+            stop_price=stop_price,
+            trail_percent=trail_percent,
+            trail_price=trail_price,
+            tag=tag,
+            extreme=self._last_price.get(symbol) if order_type == OrderType.TRAILING_STOP else None,
+        )
+        self.orders[order.order_id] = order
+        return order
+
+    def _add_working(self, order: SimOrder) -> None:
+        working = self._working.get(order.symbol)
+        if working is None:
+            working = self._working[order.symbol] = {}
+        working[order.order_id] = order
+        self._track_buys(order, order.remaining)
+
+    def _remove_working(self, order: SimOrder) -> None:
+        working = self._working.get(order.symbol)
+        if working is not None and working.pop(order.order_id, None) is not None:
+            self._track_buys(order, -order.remaining)
+
+    def _track_buys(self, order: SimOrder, quantity: float) -> None:
+        """Add quantity (negative to remove) of a working order to the buy totals"""
+        if order.side != "buy":
+            return
+        if order.limit_price is not None:
+            self._buy_notional += quantity * order.limit_price
+        else:
+            self._buy_unpriced[order.symbol] = self._buy_unpriced.get(order.symbol, 0.0) + quantity
+
+    def _link_oco(self, *orders: SimOrder) -> None:
+        group = orders[0].order_id
+        for order in orders:
+            order.oco_group = group
+        self._oco_groups[group] = [order.order_id for order in orders]
+
+    def _book(self, symbol: str) -> _SymbolBook:
+        book = self._books.get(symbol)
+        if book is None:
+            book = self._books[symbol] = _SymbolBook()
+        return book
+
+    # ===== BAR PROCESSING =====
+
+    def process_bar(
+        self,
+        symbol: str,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float = 0.0,
+        atr: Optional[float] = None,
+        timestamp: Optional[datetime] = None,
+    ) -> List[Fill]:
+        """
+        Fill the symbol's resting orders against one bar.
+
+        Args:
+            symbol: Symbol of the bar
+            open_, high, low, close: Bar prices
+            volume: Bar volume (volume-based slippage)
+            atr: Average True Range (volatility-based slippage; 2% of the open if None)
+            timestamp: Recorded on the fills
+
+        Returns:
+            Fills in the order they happened within the bar
+        """
+        book = self._books.get(symbol)
+        self._last_price[symbol] = close
+        if book is None or not len(book):
+            return []
+
+        self._bar_symbol = symbol
+        self._bar_context = (timestamp, volume, atr if atr is not None else open_ * 0.02)
+        self._bar_fills = fills = []
+        self._bar_liquidity = (
+            self.max_volume_fraction * volume if self.max_volume_fraction and volume > 0 else math.inf
+        )
+        try:
+            book.trailing.flush(open_)
+            # Market orders, and anything the open gapped through, fill at the open
+            self._settle(book, open_)
+            points = intrabar_path(self.path, open_, high, low, close)
+            for start, end in zip(points, points[1:]):
+                if end != start:
+                    self._walk(book, start, end)
+        finally:
+            self._bar_symbol = None
+            self._bar_fills = []
+        return fills
+
+    def _settle(self, book: _SymbolBook, price: float) -> None:
+        """Fill everything marketable at price"""
+        while book.market:
+            order_id = next(iter(book.market))
+            if not self._fill(self.orders[order_id], price):
+                return  # Out of liquidity: the rest waits for the next bar
+            del book.market[order_id]
+        self._walk(book, price, price, falling=True)
+        self._walk(book, price, price, falling=False)
+
+    def _walk(self, book: _SymbolBook, start: float, end: float, falling: Optional[bool] = None) -> None:
+        """Move price from start to end, filling orders as their levels are reached"""
+        if falling is None:
+            falling = end < start
+        price = start
+        while self._bar_liquidity > 0:
+            static = self._next_static(book, price, end, falling)
+            trailing = book.trailing.next_trigger(price, end, falling)
+            if static is None and trailing is None:
+                break
+            # The one reached first: the higher trigger on the way down, the lower on the way up
+            if trailing is None or (static is not None and (
+                static[0] >= trailing[0] if falling else static[0] <= trailing[0]
+            )):
+                point, order = static
+                (book.falling if falling else book.rising).pop()
+            else:
+                point, order_id = trailing
+                order = self.orders[order_id]
+                order.extreme = book.trailing.extreme_of(order_id)
+                book.trailing.remove(order_id)
+            if not self._fill(order, point):
+                self._requeue(book, order)
+            price = point
+        book.trailing.update_extremes(end)
+
+    def _next_static(
+        self, book: _SymbolBook, price: float, target: float, falling: bool
+    ) -> Optional[Tuple[float, SimOrder]]:
+        entries = book.falling if falling else book.rising
+        while entries:
+            key, negative_id = entries[-1]
+            order = self.orders[-negative_id]
+            if order.status != OrderStatus.OPEN:
+                entries.pop()
+                book.stale -= 1
+                continue
+            if falling:
+                return (min(key, price), order) if key >= target else None
+            return (max(-key, price), order) if -key <= target else None
+        return None
+
+    # ===== FILLS AND CANCELS =====
+
+    def _fill(self, order: SimOrder, trigger_price: float) -> bool:
+        """Fill as much of the order as the bar's liquidity allows; True once it is complete"""
+        timestamp, volume, atr = self._bar_context
+        quantity = min(order.remaining, self._bar_liquidity)
+        if quantity <= 0:
+            return False
+        self._bar_liquidity -= quantity
+        if order.order_type == OrderType.LIMIT or self.slippage is None:
+            slippage_pct, price = 0.0, trigger_price
+        else:
+            slippage_pct, price = calculate_slippage(
+                self.slippage, trigger_price, quantity, order.side, volume, atr, rng=self.rng,
+            )
+        filled = order.filled_quantity + quantity
+        order.filled_price = price if not order.filled_quantity else (
+            (order.filled_price * order.filled_quantity + price * quantity) / filled
+        )
+        order.filled_quantity = filled
+        order.filled_at = timestamp
+        self._track_buys(order, -quantity)
+        self._bar_fills.append(Fill(
+            order_id=order.order_id,
+            symbol=order.symbol,
+            side=order.side,
+            quantity=quantity,
+            price=price,
+            trigger_price=trigger_price,
+            slippage_pct=slippage_pct,
+            order_type=order.order_type,
+            tag=order.tag,
+            timestamp=timestamp,
+        ))
+
+        if order.remaining > 1e-9:
+            # The other side of an OCO pair only has to cover what is left
+            for sibling_id in self._oco_groups.get(order.oco_group, []):
+                sibling = self.orders[sibling_id]
+                if sibling is not order:
+                    remaining = sibling.remaining
+                    sibling.quantity = max(sibling.filled_quantity, sibling.quantity - quantity)
+                    self._track_buys(sibling, sibling.remaining - remaining)
+            return False
+
+        order.status = OrderStatus.FILLED
+        self._remove_working(order)
+        if order.oco_group is not None:
+            for sibling_id in self._oco_groups.pop(order.oco_group, []):
+                sibling = self.orders[sibling_id]
+                if sibling is not order and sibling.status in (OrderStatus.OPEN, OrderStatus.HELD):
+                    self._cancel(sibling)
+        # Bracket legs start once the entry has filled completely
+        for child_id in self._children.pop(order.order_id, []):
+            self._activate(self.orders[child_id], trigger_price)
+        return True
+
+    def _requeue(self, book: _SymbolBook, order: SimOrder) -> None:
+        """Put back a partially filled order: limits keep resting, triggered orders wait for the next open"""
+        if order.order_type == OrderType.LIMIT:
+            book.insert(order)
+        else:
+            book.market[order.order_id] = None
+
+    def _activate(self, order: SimOrder, price: float) -> None:
+        """Release a held bracket leg at price (mid-bar when its entry filled mid-bar)"""
+        if order.status != OrderStatus.HELD:
+            return
+        order.status = OrderStatus.OPEN
+        self._add_working(order)
+        book = self._book(order.symbol)
+        if order.symbol != self._bar_symbol:
+            book.insert(order)
+            return
+        if order.order_type == OrderType.MARKET or (
+            order.order_type != OrderType.TRAILING_STOP
+            and (order.level >= price if order.falling else order.level <= price)
+        ):
+            if not self._fill(order, price):
+                self._requeue(book, order)
+            return
+        book.insert(order)
+        book.trailing.flush(price)
+
+    def _cancel(self, order: SimOrder) -> None:
+        was_open = order.status == OrderStatus.OPEN
+        order.status = OrderStatus.CANCELLED
+        self._remove_working(order)
+        for child_id in self._children.pop(order.order_id, []):
+            self._cancel(self.orders[child_id])
+        # Like Alpaca, cancelling one leg of an OCO pair cancels the other
+        for sibling_id in self._oco_groups.pop(order.oco_group, []):
+            sibling = self.orders[sibling_id]
+            if sibling.status in (OrderStatus.OPEN, OrderStatus.HELD):
+                self._cancel(sibling)
+        if was_open:
+            self._unbook(order)
+
+    def _unbook(self, order: SimOrder) -> None:
+        """Take an order that is no longer open out of its symbol's book"""
+        book = self._book(order.symbol)
+        if order.order_id in book.market:
+            del book.market[order.order_id]
+        elif order.order_type == OrderType.TRAILING_STOP:
+            order.extreme = book.trailing.extreme_of(order.order_id) or order.extreme
+            book.trailing.remove(order.order_id)
+        else:
+            book.stale += 1
+            if book.stale >= _COMPACT_MIN_STALE and book.stale * 2 > len(book.falling) + len(book.rising):
+                self._compact(book)
+
+    def _compact(self, book: _SymbolBook) -> None:
+        def is_open(entry):
+            return self.orders[-entry[1]].status == OrderStatus.OPEN
+        book.falling = [entry for entry in book.falling if is_open(entry)]
+        book.rising = [entry for entry in book.rising if is_open(entry)]
+        book.stale = 0
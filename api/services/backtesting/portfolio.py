@@ -6,10 +6,11 @@ Tracks positions, cash, and equity through a backtest simulation.
 
 import logging
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 from dataclasses import dataclass, field
 
 from models.backtest import Signal, SimulatedTrade, EquityPoint
+from .online_metrics import OnlineMetrics
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +35,8 @@ class SimulatedPortfolio:
     - Open positions
     - Trade history
     - Equity curve over time
+    - Running performance metrics (`metrics`), current as of the last
+      recorded equity point and closed trade
     """
 
     def __init__(
@@ -58,6 +61,7 @@ class SimulatedPortfolio:
         self.positions: Dict[str, Position] = {}
         self.trades: List[SimulatedTrade] = []
         self.equity_curve: List[EquityPoint] = []
+        self.metrics = OnlineMetrics()
 
         self._current_prices: Dict[str, float] = {}
 
@@ -87,12 +91,20 @@ class SimulatedPortfolio:
 
     def record_equity(self, timestamp: datetime) -> None:
         """Record current equity to the equity curve."""
-        self.equity_curve.append(EquityPoint(
+        point = EquityPoint(
             timestamp=timestamp,
             equity=self.equity,
             cash=self.cash,
             positions_value=self.positions_value
-        ))
+        )
+        self.equity_curve.append(point)
+        self.metrics.add_equity(point.equity)
+
+    def extend_equity_curve(self, points: Iterable[EquityPoint]) -> None:
+        """Append precomputed equity points (vectorized runs)."""
+        for point in points:
+            self.equity_curve.append(point)
+            self.metrics.add_equity(point.equity)
 
     def calculate_position_size(self, symbol: str, price: float) -> float:
         """
@@ -207,6 +219,7 @@ class SimulatedPortfolio:
                 trade.exit_time = signal.timestamp
                 trade.pnl = pnl
                 trade.pnl_pct = pnl_pct
+                self.metrics.add_trade(pnl)
                 break
 
         logger.info(f"SELL {pos.quantity} {symbol} @ ${current_price:.2f} | P&L: ${pnl:.2f} ({pnl_pct:.1f}%) | Reason: {signal.reason}")
@@ -0,0 +1,280 @@
+"""
+Point-in-time market data for replaying the live bot.
+
+Holds minute bars per symbol and answers get_bars() the way the data API
+would have at a given moment: only minutes that had closed by then are
+visible, coarser timeframes are aggregated from them (the bucket in
+progress appears as a partial bar, like Alpaca's latest bar), and an
+optional coarser history (e.g. a year of daily bars) is served before the
+first replayed minute so indicators have their lookback.
+
+Aggregates for each symbol/timeframe are built once with NumPy and
+sliced per request, so the bot's many get_bars() calls stay cheap.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .minute_store import COLUMNS, MinuteBarStore, eastern_offset_seconds, session_days
+
+logger = logging.getLogger(__name__)
+
+# Seconds per bar of the timeframes aggregated from minutes; "1day" uses ET sessions
+TIMEFRAME_SECONDS = {
+    "1min": 60,
+    "5min": 5 * 60,
+    "15min": 15 * 60,
+    "1hour": 60 * 60,
+    "1day": 24 * 60 * 60,
+}
+
+_EPOCH = date(1970, 1, 1)
+
+# Regular session in minutes since midnight ET
+REGULAR_OPEN = 9 * 60 + 30
+REGULAR_CLOSE = 16 * 60
+
+
+def normalize_timeframe(timeframe: str) -> str:
+    """Data API timeframe ("1Min", "1Hour", "1Day", ...) as a TIMEFRAME_SECONDS key"""
+    key = timeframe.lower()
+    if key not in TIMEFRAME_SECONDS:
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+    return key
+
+
+@dataclass
+class BarArrays:
+    """Bars as column arrays; timestamps are bar start times (epoch seconds, UTC)"""
+    timestamps: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @classmethod
+    def from_columns(cls, timestamps, columns: Dict[str, Any]) -> "BarArrays":
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        order = np.argsort(timestamps, kind="stable")
+        return cls(
+            timestamps=timestamps[order],
+            **{name: np.asarray(columns[name], dtype=np.float64)[order] for name in COLUMNS},
+        )
+
+
+@dataclass
+class _Aggregate:
+    """Minutes grouped into the buckets of one timeframe"""
+    bars: BarArrays
+    bucket_of_minute: np.ndarray  # Bucket index of every minute
+    bucket_first: np.ndarray      # First minute index of every bucket
+    bucket_end: np.ndarray        # One past the last minute index of every bucket
+
+
+def _bucket_starts(timestamps: np.ndarray, timeframe: str) -> np.ndarray:
+    """Start time of the bucket each minute belongs to"""
+    if timeframe != "1day":
+        seconds = TIMEFRAME_SECONDS[timeframe]
+        return timestamps - timestamps % seconds
+    # Daily bars start at midnight ET, like the data API's
+    days = session_days(timestamps)
+    starts = days * 86400
+    for day_number in np.unique(days).tolist():
+        offset = eastern_offset_seconds(_EPOCH + timedelta(days=day_number))
+        starts[days == day_number] -= offset
+    return starts
+
+
+class ReplayMarketData:
+    """
+    Minute bars of the replayed symbols, served without lookahead.
+
+    Usage:
+        data = ReplayMarketData()
+        data.add_minutes("AAPL", timestamps, {"open": ..., "high": ..., ...})
+        data.add_history("AAPL", "1day", daily_timestamps, daily_columns)
+        bars = data.get_bars("AAPL", "15Min", limit=100, as_of=clock.timestamp())
+    """
+
+    def __init__(self):
+        self._minutes: Dict[str, BarArrays] = {}
+        self._history: Dict[Tuple[str, str], BarArrays] = {}
+        self._aggregates: Dict[Tuple[str, str], _Aggregate] = {}
+        self._regular: Dict[str, np.ndarray] = {}
+
+    # ===== LOADING =====
+
+    def add_minutes(self, symbol: str, timestamps, columns: Dict[str, Any]) -> None:
+        """Set a symbol's minute bars (timestamps: bar start, epoch seconds)"""
+        symbol = symbol.upper()
+        self._minutes[symbol] = BarArrays.from_columns(timestamps, columns)
+        self._regular.pop(symbol, None)
+        for key in [key for key in self._aggregates if key[0] == symbol]:
+            del self._aggregates[key]
+
+    def add_history(self, symbol: str, timeframe: str, timestamps, columns: Dict[str, Any]) -> None:
+        """
+        Set completed bars of a timeframe from before the minute bars.
+
+        Only bars starting before the symbol's first minute bucket are
+        served, so history and aggregated minutes never overlap.
+        """
+        self._history[(symbol.upper(), normalize_timeframe(timeframe))] = BarArrays.from_columns(timestamps, columns)
+
+    @classmethod
+    def from_minute_store(
+        cls, store: MinuteBarStore, symbols: List[str], start_date: date, end_date: date
+    ) -> "ReplayMarketData":
+        """Load the stored minutes of [start_date, end_date] for each symbol"""
+        data = cls()
+        for symbol in symbols:
+            chunks = list(store.iter_days(symbol, start_date, end_date))
+            if not chunks:
+                logger.warning(f"[Replay] No stored minute bars for {symbol} in {start_date} - {end_date}")
+                continue
+            data.add_minutes(
+                symbol,
+                np.concatenate([chunk.timestamps for chunk in chunks]),
+                {name: np.concatenate([getattr(chunk, name) for chunk in chunks]) for name in COLUMNS},
+            )
+        return data
+
+    # ===== QUERIES =====
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._minutes)
+
+    def minutes(self, symbol: str) -> Optional[BarArrays]:
+        """All minute bars of a symbol (the broker fills orders against them)"""
+        return self._minutes.get(symbol.upper())
+
+    def time_range(self) -> Optional[Tuple[int, int]]:
+        """(first minute start, last minute end) across symbols, epoch seconds"""
+        ranges = [(int(m.timestamps[0]), int(m.timestamps[-1]) + 60) for m in self._minutes.values() if len(m)]
+        if not ranges:
+            return None
+        return min(r[0] for r in ranges), max(r[1] for r in ranges)
+
+    def regular_session_mask(self, symbol: str) -> np.ndarray:
+        """Whether each of the symbol's minutes is in the regular session (9:30 AM - 4:00 PM ET, weekdays)"""
+        symbol = symbol.upper()
+        mask = self._regular.get(symbol)
+        if mask is None:
+            timestamps = self._minutes[symbol].timestamps
+            days = session_days(timestamps)
+            offsets = np.array([eastern_offset_seconds(_EPOCH + timedelta(days=int(d))) for d in days.tolist()],
+                               dtype=np.int64) if len(days) else np.empty(0, dtype=np.int64)
+            minute_of_day = (timestamps + offsets) % 86400 // 60
+            weekday = (days + 3) % 7  # 1970-01-01 was a Thursday (Monday = 0)
+            mask = self._regular[symbol] = (
+                (weekday < 5) & (minute_of_day >= REGULAR_OPEN) & (minute_of_day < REGULAR_CLOSE)
+            )
+        return mask
+
+    def closed_minutes(self, symbol: str, as_of: float) -> int:
+        """Number of the symbol's minute bars that had closed by as_of"""
+        minutes = self._minutes.get(symbol.upper())
+        if minutes is None:
+            return 0
+        return int(np.searchsorted(minutes.timestamps, as_of - 60, side="right"))
+
+    def last_price(self, symbol: str, as_of: float) -> Optional[float]:
+        """Close of the last minute that had closed by as_of"""
+        count = self.closed_minutes(symbol, as_of)
+        return float(self._minutes[symbol.upper()].close[count - 1]) if count else None
+
+    def get_bars(self, symbol: str, timeframe: str, limit: int, as_of: float) -> List[Dict[str, Any]]:
+        """
+        The last `limit` bars visible at as_of (epoch seconds).
+
+        Returns:
+            Bar dicts shaped like AlpacaService.get_bars, oldest first
+        """
+        symbol, timeframe = symbol.upper(), normalize_timeframe(timeframe)
+        bars = self._visible(symbol, timeframe, as_of)
+        if bars is None or limit <= 0:
+            return []
+        timestamps, columns = bars
+        start = max(0, len(timestamps) - limit)
+        return [
+            {
+                "timestamp": datetime.fromtimestamp(int(ts), timezone.utc).isoformat(),
+                "open": float(o),
+                "high": float(h),
+                "low": float(l),
+                "close": float(c),
+                "volume": float(v),
+            }
+            for ts, o, h, l, c, v in zip(
+                timestamps[start:].tolist(), *(columns[name][start:].tolist() for name in COLUMNS)
+            )
+        ]
+
+    def _visible(self, symbol: str, timeframe: str, as_of: float) -> Optional[Tuple[np.ndarray, Dict[str, np.ndarray]]]:
+        history = self._history.get((symbol, timeframe))
+        minutes = self._minutes.get(symbol)
+        closed = self.closed_minutes(symbol, as_of)
+
+        if minutes is None or not closed:
+            if history is None:
+                return None
+            seconds = TIMEFRAME_SECONDS[timeframe]
+            count = int(np.searchsorted(history.timestamps, as_of - seconds, side="right"))
+            return history.timestamps[:count], {name: getattr(history, name)[:count] for name in COLUMNS}
+
+        aggregate = self._aggregate(symbol, timeframe)
+        bucket = int(aggregate.bucket_of_minute[closed - 1])
+        full = aggregate.bars
+        timestamps = full.timestamps[:bucket + 1].copy()
+        columns = {name: getattr(full, name)[:bucket + 1].copy() for name in COLUMNS}
+
+        # The bucket in progress, built from its closed minutes only
+        first, end = int(aggregate.bucket_first[bucket]), int(aggregate.bucket_end[bucket])
+        if closed < end:
+            columns["open"][-1] = minutes.open[first]
+            columns["high"][-1] = minutes.high[first:closed].max()
+            columns["low"][-1] = minutes.low[first:closed].min()
+            columns["close"][-1] = minutes.close[closed - 1]
+            columns["volume"][-1] = minutes.volume[first:closed].sum()
+
+        if history is not None:
+            count = int(np.searchsorted(history.timestamps, full.timestamps[0], side="left"))
+            if count:
+                timestamps = np.concatenate([history.timestamps[:count], timestamps])
+                columns = {name: np.concatenate([getattr(history, name)[:count], columns[name]]) for name in COLUMNS}
+        return timestamps, columns
+
+    def _aggregate(self, symbol: str, timeframe: str) -> _Aggregate:
+        key = (symbol, timeframe)
+        aggregate = self._aggregates.get(key)
+        if aggregate is not None:
+            return aggregate
+
+        minutes = self._minutes[symbol]
+        starts = _bucket_starts(minutes.timestamps, timeframe)
+        first = np.flatnonzero(np.r_[True, np.diff(starts) != 0])
+        end = np.r_[first[1:], len(starts)]
+        bucket_of_minute = np.repeat(np.arange(len(first)), end - first)
+        aggregate = self._aggregates[key] = _Aggregate(
+            bars=BarArrays(
+                timestamps=starts[first],
+                open=minutes.open[first],
+                high=np.maximum.reduceat(minutes.high, first),
+                low=np.minimum.reduceat(minutes.low, first),
+                close=minutes.close[end - 1],
+                volume=np.add.reduceat(minutes.volume, first),
+            ),
+            bucket_of_minute=bucket_of_minute,
+            bucket_first=first,
+            bucket_end=end,
+        )
+        return aggregate
@@ -0,0 +1,379 @@
+"""
+Backtest result cache.
+
+Content-addressed store of BacktestResults, so rerunning an identical
+request (same symbols, dates, strategy, params) returns the stored result
+instead of reloading bars from Alpaca and re-simulating.
+
+The cache key is a SHA-256 of:
+- The canonical request: sorted JSON with the strategy's resolved params
+  (so {} and explicit defaults match), without the `vectorized` flag
+  (both modes produce the same result) or `use_cache`
+- The data snapshot version: the bar source, BACKTEST_DATA_VERSION (bump to
+  invalidate after data corrections), and - for ranges reaching today - the
+  current date, since today's bar is still forming
+- The strategy code version: a hash of the backtesting engine and strategy
+  sources, so any simulation change invalidates old results
+
+Entries are pickle files on local disk, so every API worker and background
+job process shares them. Once the directory exceeds its size budget the
+least recently used entries are evicted.
+
+Besides the result, an entry keeps the bars it was run on and (for
+event-driven runs) an EngineCheckpoint taken before the final close-out.
+A request that only moves the end date forward reuses both: just the new
+bars are fetched and just the new timestamps are simulated.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+from dataclasses import dataclass, field
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from models.backtest import BacktestRequest, BacktestResult
+from .data_loader import BacktestData, Bar, SymbolData
+from .engine import BacktestEngine, EngineCheckpoint
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT_VERSION = 1
+
+# Sources whose changes alter backtest results (relative to services/backtesting)
+_CODE_ROOT = Path(__file__).resolve().parent
+_MODELS_FILE = _CODE_ROOT.parent.parent / "models" / "backtest.py"
+
+
+@lru_cache(maxsize=1)
+def strategy_code_version() -> str:
+    """Hash of the engine, portfolio, metrics and strategy sources"""
+    digest = hashlib.sha256()
+    for path in sorted(_CODE_ROOT.rglob("*.py")) + [_MODELS_FILE]:
+        if path.name == "result_cache.py" or not path.exists():
+            continue
+        digest.update(str(path.relative_to(_CODE_ROOT.parent.parent)).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def data_source_name(data_service: Any = None) -> str:
+    """Identify the bar source (None and AlpacaService both mean Alpaca)"""
+    if data_service is None:
+        return "alpaca"
+    from services.alpaca_service import AlpacaService
+    if isinstance(data_service, AlpacaService):
+        return "alpaca"
+    cls = type(data_service)
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+@dataclass(frozen=True)
+class CacheKey:
+    """Where a request's result lives: base key directory + end date file"""
+    base: str
+    end_date: date
+    live_on: Optional[date] = None  # Set when the range reaches today
+
+    @property
+    def filename(self) -> str:
+        if self.live_on is not None:
+            return f"{self.end_date.isoformat()}@{self.live_on.isoformat()}.pkl"
+        return f"{self.end_date.isoformat()}.pkl"
+
+
+@dataclass
+class CacheEntry:
+    """A cached result plus what's needed to extend it"""
+    result: BacktestResult
+    bars: Dict[str, List[Bar]] = field(default_factory=dict)
+    benchmark_bars: List[Bar] = field(default_factory=list)
+    checkpoint: Optional[EngineCheckpoint] = None
+
+    @classmethod
+    def from_engine(cls, result: BacktestResult, engine: BacktestEngine) -> "CacheEntry":
+        bars = {}
+        if engine.data is not None:
+            bars = {symbol: sd.bars for symbol, sd in engine.data.symbol_data.items()}
+        benchmark_bars = engine.benchmark_data.bars if engine.benchmark_data is not None else []
+        return cls(result=result, bars=bars, benchmark_bars=benchmark_bars, checkpoint=engine.checkpoint)
+
+    def extend(self, request: BacktestRequest, delta: BacktestData, delta_benchmark: SymbolData):
+        """
+        Combine the cached bars with bars loaded after the cached end date.
+
+        Returns:
+            (BacktestData, benchmark SymbolData) for the full requested range,
+            or None if the cached bars don't cover every requested symbol
+        """
+        if any(symbol not in self.bars for symbol in delta.symbol_data):
+            return None
+
+        data = BacktestData(symbols=request.symbols, start_date=request.start_date, end_date=request.end_date)
+        for symbol, bars in self.bars.items():
+            new_bars = delta.symbol_data[symbol].bars if symbol in delta.symbol_data else []
+            data.symbol_data[symbol] = SymbolData(symbol=symbol, bars=bars + _after(new_bars, bars))
+        benchmark = SymbolData(
+            symbol=delta_benchmark.symbol,
+            bars=self.benchmark_bars + _after(delta_benchmark.bars, self.benchmark_bars),
+        )
+        return data, benchmark
+
+
+def _after(new_bars: List[Bar], cached_bars: List[Bar]) -> List[Bar]:
+    """New bars strictly after the last cached bar"""
+    if not cached_bars:
+        return list(new_bars)
+    last = max(b.timestamp for b in cached_bars)
+    return [b for b in new_bars if b.timestamp > last]
+
+
+class BacktestResultCache:
+    """
+    Disk-backed, size-bounded cache of backtest results.
+
+    Layout: <directory>/<base key>/<end date>.pkl, where the base key
+    covers everything but the end date. Entries for the same base key are
+    candidates for extension when a later end date is requested.
+    Writes are atomic (temp file + rename); LRU order is file mtime,
+    refreshed on every hit.
+    """
+
+    def __init__(
+        self,
+        directory: str = "./backtest_cache",
+        max_bytes: int = 512 * 1024 * 1024,
+        data_version: str = "1",
+        enabled: bool = True,
+    ):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.data_version = data_version
+        self.enabled = enabled
+
+        self._hits = 0
+        self._misses = 0
+        self._extensions = 0
+        self._evictions = 0
+
+    # ===== KEYS =====
+
+    def key_for(
+        self,
+        request: BacktestRequest,
+        strategy_params: Optional[Dict[str, Any]] = None,
+        data_source: str = "alpaca",
+        today: Optional[date] = None,
+    ) -> CacheKey:
+        """
+        Build the cache key for a request.
+
+        Args:
+            request: The backtest request
+            strategy_params: The strategy's resolved params (defaults filled in)
+            data_source: See data_source_name()
+            today: Override the current date (tests)
+        """
+        today = today or date.today()
+        canonical = request.model_dump(mode="json", exclude={"end_date", "vectorized", "use_cache"})
+        if strategy_params is not None:
+            canonical["strategy_params"] = strategy_params
+        material = {
+            "format": CACHE_FORMAT_VERSION,
+            "request": canonical,
+            "data": {"source": data_source, "version": self.data_version},
+            "code": strategy_code_version(),
+        }
+        base = hashlib.sha256(
+            json.dumps(material, sort_keys=True, separators=(",", ":"), default=str).encode()
+        ).hexdigest()[:32]
+        live_on = today if request.end_date >= today else None
+        return CacheKey(base=base, end_date=request.end_date, live_on=live_on)
+
+    # ===== LOOKUP =====
+
+    def get(self, key: CacheKey) -> Optional[CacheEntry]:
+        """Entry for exactly this key, or None"""
+        if not self.enabled:
+            return None
+        entry = self._read(self.directory / key.base / key.filename)
+        if entry is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+        return entry
+
+    def find_extendable(self, key: CacheKey) -> Optional[CacheEntry]:
+        """
+        The entry with the latest end date before key.end_date.
+
+        Only complete ranges (ended before the day they were run) qualify,
+        since a range that reached "today" may hold a partial last bar.
+        """
+        if not self.enabled:
+            return None
+        candidates = []
+        for path in self._entries(self.directory / key.base):
+            if "@" in path.stem:
+                continue
+            try:
+                end_date = date.fromisoformat(path.stem)
+            except ValueError:
+                continue
+            if end_date < key.end_date:
+                candidates.append((end_date, path))
+
+        for _, path in sorted(candidates, reverse=True):
+            entry = self._read(path)
+            if entry is not None:
+                self._extensions += 1
+                return entry
+        return None
+
+    def _read(self, path: Path) -> Optional[CacheEntry]:
+        try:
+            with open(path, "rb") as f:
+                version, entry = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"[BacktestCache] Dropping unreadable entry {path.name}: {e}")
+            self._remove(path)
+            return None
+
+        if version != CACHE_FORMAT_VERSION or not isinstance(entry, CacheEntry):
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    # ===== STORE =====
+
+    def put(self, key: CacheKey, entry: CacheEntry) -> bool:
+        """
+        Store an entry, then evict down to the size budget.
+
+        Returns True if the entry was written.
+        """
+        if not self.enabled:
+            return False
+        path = self.directory / key.base / key.filename
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                pickle.dump((CACHE_FORMAT_VERSION, entry), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"[BacktestCache] Could not store result: {e}")
+            self._remove(tmp_path)
+            return False
+
+        self._drop_stale_live_entries(path.parent, key)
+        self.evict()
+        return True
+
+    def _drop_stale_live_entries(self, directory: Path, key: CacheKey) -> None:
+        """Remove same-range entries made on earlier days (their last bar was partial)"""
+        prefix = f"{key.end_date.isoformat()}@"
+        for path in self._entries(directory):
+            if path.name.startswith(prefix) and path.name != key.filename:
+                self._remove(path)
+
+    def evict(self) -> int:
+        """
+        Delete least recently used entries until under max_bytes.
+
+        Returns:
+            Number of entries evicted
+        """
+        entries = []
+        for directory in self._base_dirs():
+            for path in self._entries(directory):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for _, size, path in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+            evicted += 1
+
+        if evicted:
+            self._evictions += evicted
+            logger.info(f"[BacktestCache] Evicted {evicted} entries ({total / 1e6:.1f} MB kept)")
+        return evicted
+
+    def clear(self) -> None:
+        """Delete every entry"""
+        for directory in self._base_dirs():
+            for path in self._entries(directory):
+                self._remove(path)
+
+    # ===== HELPERS =====
+
+    def _base_dirs(self) -> List[Path]:
+        if not self.directory.is_dir():
+            return []
+        return [p for p in self.directory.iterdir() if p.is_dir()]
+
+    @staticmethod
+    def _entries(directory: Path) -> List[Path]:
+        if not directory.is_dir():
+            return []
+        return [p for p in directory.iterdir() if p.suffix == ".pkl"]
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+        try:
+            path.parent.rmdir()  # Only succeeds once the base key has no entries left
+        except OSError:
+            pass
+
+    def get_status(self) -> Dict[str, Any]:
+        sizes = [p.stat().st_size for d in self._base_dirs() for p in self._entries(d)]
+        return {
+            "enabled": self.enabled,
+            "directory": str(self.directory),
+            "entries": len(sizes),
+            "size_bytes": sum(sizes),
+            "max_bytes": self.max_bytes,
+            "hits": self._hits,
+            "misses": self._misses,
+            "extensions": self._extensions,
+            "evictions": self._evictions,
+            "code_version": strategy_code_version(),
+        }
+
+
+_backtest_result_cache: Optional[BacktestResultCache] = None
+
+
+def get_backtest_result_cache() -> BacktestResultCache:
+    """Get the global result cache (configured from BACKTEST_CACHE_* env vars)"""
+    global _backtest_result_cache
+    if _backtest_result_cache is None:
+        _backtest_result_cache = BacktestResultCache(
+            directory=os.getenv("BACKTEST_CACHE_DIR", "./backtest_cache"),
+            max_bytes=int(float(os.getenv("BACKTEST_CACHE_MAX_MB", "512")) * 1024 * 1024),
+            data_version=os.getenv("BACKTEST_DATA_VERSION", "1"),
+            enabled=os.getenv("BACKTEST_CACHE_ENABLED", "true").lower() in ("true", "1", "yes"),
+        )
+    return _backtest_result_cache
@@ -0,0 +1,48 @@
+"""
+Indicator values shared by the strategy variants of a multi-strategy run.
+
+When several variants are simulated over one timeline pass, variants that
+need the same indicator on the same bar (e.g. two RSI strategies with the
+same period but different thresholds) get one computation between them.
+Strategies look values up through shared_value(), which computes directly
+when the strategy isn't part of a multi-strategy run.
+"""
+
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class SharedIndicators:
+    """
+    Memo of indicator values for the current timestamp.
+
+    Keys are (indicator name, symbol, *parameters). Only the current
+    timestamp's values are kept, so memory doesn't grow with the run.
+    """
+
+    def __init__(self):
+        self.timestamp: Optional[datetime] = None
+        self.computed = 0
+        self.reused = 0
+        self._values: Dict[Hashable, Any] = {}
+
+    def advance(self, timestamp: datetime) -> None:
+        """Move to the next timestamp, dropping the previous bar's values"""
+        self.timestamp = timestamp
+        self._values.clear()
+
+    def get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        if key in self._values:
+            self.reused += 1
+            return self._values[key]
+        value = self._values[key] = compute()
+        self.computed += 1
+        return value
+
+
+def shared_value(strategy: Any, key: Hashable, compute: Callable[[], Any]) -> Any:
+    """compute(), shared with the strategy's sibling variants when it has any"""
+    shared = getattr(strategy, "shared_indicators", None)
+    if shared is None:
+        return compute()
+    return shared.get(key, compute)
@@ -0,0 +1,384 @@
+"""
+Single-position simulation core.
+
+The single-symbol backtesters - services/backtester.BacktestEngine and
+WalkForwardBacktester (and through it the auto-optimizer's weight search)
+- share one position model: enter on a "long"/"short" signal with a
+fixed fraction of capital, exit on a stop-loss/take-profit level checked
+at the bar close or on a strategy exit signal, one position at a time.
+simulate() is that model, written once.
+
+It works on whole arrays rather than stepping every bar with a position
+dict:
+
+- Entry signals given as a sides array are turned into the list of
+  signal bars up front, so flat stretches between trades are skipped.
+- While a position is open, only the exit conditions are checked: per
+  bar on plain floats for the first few bars (most holds are short),
+  then over growing array chunks.
+- Equity isn't tracked per bar: the run is recorded as flat/held
+  segments, and the whole mark-to-market curve is one array expression
+  at the end.
+- Trades are returned column-wise (TradeRecords), not as per-trade dicts.
+
+Slippage and intrabar order fills are hooks, so a fill model plugged in
+here applies to every backtester built on the core. The event-driven
+multi-symbol engine (backtesting.engine) keeps its own loop: its
+strategies read portfolio state on every bar. Its vectorized path lives
+in backtesting.vectorized.
+"""
+
+import logging
+import math
+from bisect import bisect_left
+from dataclasses import dataclass
+from itertools import compress
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# (bar, price, quantity, side) -> (slippage_pct, exec_price). Side is the
+# position side ("long"/"short") on entry, the order side ("sell"/"buy") on exit
+SlippageHook = Callable[[int, float, int, str], Tuple[float, float]]
+
+# bar -> None, or (exit_reason, reference_price, slippage_pct, exec_price)
+IntrabarExitHook = Callable[[int], Optional[Tuple[str, float, float, float]]]
+
+# (bar, quantity, stop_price, target_price, side) called after each entry
+EntryHook = Callable[[int, int, float, float, str], None]
+
+# Bars of a hold checked one at a time before switching to array chunks
+# (below this, per-call numpy overhead outweighs the per-bar loop)
+SCALAR_EXIT_BARS = 32
+FIRST_EXIT_CHUNK = 256
+
+
+@dataclass
+class TradeRecords:
+    """Closed trades, one array (or list) per field"""
+    entry_bar: np.ndarray
+    exit_bar: np.ndarray
+    side: List[str]
+    quantity: np.ndarray
+    entry_price: np.ndarray
+    exit_price: np.ndarray
+    pnl: np.ndarray
+    slippage_pct: np.ndarray
+    slippage_cost: np.ndarray
+    exit_reason: List[str]
+
+    def __len__(self) -> int:
+        return len(self.side)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Trades as dicts (the WalkForwardBacktester trade format)"""
+        columns = zip(
+            self.entry_price.tolist(), self.exit_price.tolist(), self.side, self.quantity.tolist(),
+            self.pnl.tolist(), self.exit_reason, self.slippage_pct.tolist(), self.slippage_cost.tolist(),
+        )
+        return [
+            {
+                "entry_price": entry_price,
+                "exit_price": exit_price,
+                "side": side,
+                "quantity": quantity,
+                "pnl": pnl,
+                "exit_reason": exit_reason,
+                "slippage_pct": slippage_pct,
+                "slippage_cost": slippage_cost,
+            }
+            for entry_price, exit_price, side, quantity, pnl, exit_reason, slippage_pct, slippage_cost in columns
+        ]
+
+
+_TRADE_FIELDS = (
+    "entry_bar", "exit_bar", "side", "quantity", "entry_price", "exit_price",
+    "pnl", "slippage_pct", "slippage_cost", "exit_reason",
+)
+_FIELD_DTYPES = {"entry_bar": np.int64, "exit_bar": np.int64, "quantity": np.int64}
+
+
+def _trade_records(rows: List[Tuple]) -> TradeRecords:
+    """Transpose per-trade rows (in _TRADE_FIELDS order) into columns"""
+    columns = list(zip(*rows)) if rows else [()] * len(_TRADE_FIELDS)
+    fields = {}
+    for name, column in zip(_TRADE_FIELDS, columns):
+        if name in ("side", "exit_reason"):
+            fields[name] = list(column)
+        else:
+            fields[name] = np.array(column, dtype=_FIELD_DTYPES.get(name, np.float64))
+    return TradeRecords(**fields)
+
+
+@dataclass
+class Simulation:
+    """Result of simulate()"""
+    trades: TradeRecords
+    equity: np.ndarray       # Initial capital, then equity at each simulated bar's close
+    final_capital: float     # Realized capital (an open position isn't counted)
+    open_side: str = ""      # Side of a position still open at the end ("" if flat)
+
+    @property
+    def sharpe(self) -> float:
+        """Annualized Sharpe ratio of bar-to-bar equity returns (sample deviation)"""
+        if len(self.equity) <= 2:
+            return 0
+        returns = np.diff(self.equity) / self.equity[:-1]
+        std = float(returns.std(ddof=1))
+        return (float(returns.mean()) * 252) / (std * math.sqrt(252)) if std > 0 else 0
+
+    @property
+    def max_drawdown(self) -> float:
+        """Largest fall of the equity curve from its running peak, as a fraction"""
+        peaks = np.maximum.accumulate(self.equity)
+        return float(((peaks - self.equity) / peaks).max()) if len(self.equity) else 0
+
+
+def simulate(
+    closes: Sequence[float],
+    start: int,
+    initial_capital: float,
+    stop_loss_pct: float,
+    take_profit_pct: float,
+    position_fraction: float = 0.1,
+    sides: Optional[Sequence[str]] = None,
+    signal: Optional[Callable[[int], str]] = None,
+    long_exits: Optional[Sequence[str]] = None,
+    short_exits: Optional[Sequence[str]] = None,
+    slippage: Optional[SlippageHook] = None,
+    intrabar_exit: Optional[IntrabarExitHook] = None,
+    on_entry: Optional[EntryHook] = None,
+    close_at_end: bool = False,
+) -> Simulation:
+    """
+    Simulate one position at a time over bars [start, len(closes)).
+
+    On each bar: record equity at the close, check the open position's
+    exits, then (if flat) check for an entry.
+
+    Args:
+        closes: Close prices
+        start: First simulated bar (earlier bars are indicator warm-up)
+        initial_capital: Starting capital
+        stop_loss_pct: Stop distance from the entry fill
+        take_profit_pct: Target distance from the entry fill
+        position_fraction: Fraction of capital per position (whole shares)
+        sides: Entry signal per bar ("long", "short" or "")
+        signal: Entry signal for one bar, called only while flat (when
+            sides isn't precomputed)
+        long_exits / short_exits: Strategy exit reason per bar ("" for
+            none), checked after the stop and target
+        slippage: Fill price model; fills at the close when None
+        intrabar_exit: Replaces the close-based stop/target check (e.g. an
+            OrderSimulator working the bracket through the bar)
+        on_entry: Called after each entry with the bracket levels
+        close_at_end: Close a position still open at the last close
+            (reason "end_of_data", no slippage)
+
+    Returns:
+        Simulation with the trades and equity curve
+    """
+    prices = closes if isinstance(closes, list) else list(closes)
+    close_array = np.fromiter(prices, dtype=np.float64, count=len(prices))
+    num_bars = len(prices)
+    start = min(start, num_bars)
+
+    # Equity segments: bars, realized capital, and the held position (entry price, quantity, long?)
+    segments: List[Tuple[int, float, float, int, bool]] = []
+    rows: List[Tuple] = []
+    capital = initial_capital
+    open_side = ""
+
+    if sides is not None:
+        signal_bars = list(compress(range(start, num_bars), sides[start:num_bars]))
+        num_signals = len(signal_bars)
+    next_signal = 0
+    exit_masks = {True: _signal_mask(long_exits, num_bars), False: _signal_mask(short_exits, num_bars)}
+
+    bar = start       # Next bar to check for an entry
+    recorded = start  # Next bar whose equity isn't recorded yet
+    while bar < num_bars:
+        # ---- Flat: find the next entry signal ----
+        if sides is not None:
+            next_signal = bisect_left(signal_bars, bar, next_signal)
+            if next_signal == num_signals:
+                break
+            entry_bar = signal_bars[next_signal]
+            side = sides[entry_bar]
+        else:
+            entry_bar, side = bar, ""
+            while entry_bar < num_bars:
+                side = signal(entry_bar)
+                if side:
+                    break
+                entry_bar += 1
+            if entry_bar == num_bars:
+                break
+
+        # Flat through the signal bar's close
+        if entry_bar >= recorded:
+            segments.append((entry_bar + 1 - recorded, capital, 0.0, 0, True))
+            recorded = entry_bar + 1
+
+        price = prices[entry_bar]
+        quantity = int(capital * position_fraction / price)
+        if quantity <= 0:
+            bar = entry_bar + 1
+            continue
+
+        # The trade records the exit's slippage (the WalkForwardBacktester trade format)
+        entry_price = slippage(entry_bar, price, quantity, side)[1] if slippage else price
+        is_long = side == "long"
+        if is_long:
+            stop = entry_price * (1 - stop_loss_pct)
+            target = entry_price * (1 + take_profit_pct)
+        else:
+            stop = entry_price * (1 + stop_loss_pct)
+            target = entry_price * (1 - take_profit_pct)
+        if on_entry:
+            on_entry(entry_bar, quantity, stop, target, side)
+
+        # ---- In position: find the exit bar ----
+        exits = long_exits if is_long else short_exits
+        exit_bar, exit_reason, fill = entry_bar + 1, "", None
+        scalar_end = num_bars if intrabar_exit else min(entry_bar + 1 + SCALAR_EXIT_BARS, num_bars)
+        while exit_bar < scalar_end:
+            if intrabar_exit:
+                fill = intrabar_exit(exit_bar)
+                if fill:
+                    exit_reason = fill[0]
+                    break
+            else:
+                current = prices[exit_bar]
+                if is_long:
+                    if current <= stop:
+                        exit_reason = "stop_loss"
+                        break
+                    if current >= target:
+                        exit_reason = "take_profit"
+                        break
+                else:
+                    if current >= stop:
+                        exit_reason = "stop_loss"
+                        break
+                    if current <= target:
+                        exit_reason = "take_profit"
+                        break
+            if exits is not None and exits[exit_bar]:
+                exit_reason = exits[exit_bar]
+                break
+            exit_bar += 1
+        else:
+            # A long hold: search the rest in array chunks
+            if exit_bar < num_bars:
+                exit_bar = _first_exit_bar(close_array, exit_masks[is_long], exit_bar, stop, target, is_long)
+                if exit_bar < num_bars:
+                    exit_reason = _price_exit(prices[exit_bar], stop, target, is_long) or exits[exit_bar]
+
+        # Held (marked to market) through the exit bar's close
+        held_end = min(exit_bar + 1, num_bars)
+        segments.append((held_end - recorded, capital, entry_price, quantity, is_long))
+        recorded = held_end
+
+        if exit_bar == num_bars:
+            if close_at_end:
+                exit_bar, exit_reason = num_bars - 1, "end_of_data"
+                fill = (exit_reason, prices[-1], 0.0, prices[-1])
+            else:
+                open_side = side
+                break
+
+        if fill:
+            _, reference_price, exit_slippage, exit_price = fill
+        else:
+            reference_price = prices[exit_bar]
+            if slippage:
+                exit_slippage, exit_price = slippage(
+                    exit_bar, reference_price, quantity, "sell" if is_long else "buy",
+                )
+            else:
+                exit_slippage, exit_price = 0.0, reference_price
+
+        if is_long:
+            pnl = (exit_price - entry_price) * quantity
+        else:
+            pnl = (entry_price - exit_price) * quantity
+        rows.append((
+            entry_bar, exit_bar, side, quantity, entry_price, exit_price, pnl,
+            exit_slippage, abs(reference_price - exit_price) * quantity, exit_reason,
+        ))
+        capital += pnl
+        if exit_reason == "end_of_data":
+            break
+        bar = exit_bar  # Can re-enter on the exit bar
+
+    segments.append((num_bars - recorded, capital, 0.0, 0, True))
+    return Simulation(
+        trades=_trade_records(rows),
+        equity=_equity_curve(close_array[start:], initial_capital, segments),
+        final_capital=capital,
+        open_side=open_side,
+    )
+
+
+def _price_exit(price: float, stop: float, target: float, is_long: bool) -> str:
+    """Stop-loss/take-profit reason at a close ("" if neither level was reached)
+
+    Same checks as simulate()'s per-bar exit loop, which inlines them.
+    """
+    if is_long:
+        if price <= stop:
+            return "stop_loss"
+        if price >= target:
+            return "take_profit"
+    else:
+        if price >= stop:
+            return "stop_loss"
+        if price <= target:
+            return "take_profit"
+    return ""
+
+
+def _signal_mask(reasons: Optional[Sequence[str]], num_bars: int) -> Optional[np.ndarray]:
+    """Boolean array of the bars with a non-empty exit reason"""
+    if reasons is None:
+        return None
+    mask = np.zeros(num_bars, dtype=bool)
+    mask[list(compress(range(num_bars), reasons[:num_bars]))] = True
+    return mask
+
+
+def _first_exit_bar(
+    closes: np.ndarray, exit_mask: Optional[np.ndarray], bar: int,
+    stop: float, target: float, is_long: bool,
+) -> int:
+    """First bar from `bar` on that closes through the stop/target or has an exit signal (len(closes) if none)"""
+    chunk = FIRST_EXIT_CHUNK
+    while bar < len(closes):
+        end = min(bar + chunk, len(closes))
+        window = closes[bar:end]
+        if is_long:
+            hits = (window <= stop) | (window >= target)
+        else:
+            hits = (window >= stop) | (window <= target)
+        if exit_mask is not None:
+            hits |= exit_mask[bar:end]
+        found = np.flatnonzero(hits)
+        if found.size:
+            return bar + int(found[0])
+        bar, chunk = end, chunk * 2
+    return len(closes)
+
+
+def _equity_curve(closes: np.ndarray, initial_capital: float, segments: List[Tuple]) -> np.ndarray:
+    """Initial capital, then capital plus the held position's unrealized P&L at each close"""
+    lengths, capital, entry_price, quantity, is_long = (np.array(column) for column in zip(*segments))
+    capital = np.repeat(capital.astype(np.float64), lengths)
+    unrealized = (closes - np.repeat(entry_price, lengths)) * np.repeat(quantity, lengths)
+    equity = np.empty(len(closes) + 1, dtype=np.float64)
+    equity[0] = initial_capital
+    # Flat bars have quantity 0, so their unrealized P&L is exactly 0
+    equity[1:] = np.where(np.repeat(is_long, lengths), capital + unrealized, capital - unrealized)
+    return equity
@@ -0,0 +1,96 @@
+"""
+Slippage models shared by the backtesters and the order fill simulator.
+"""
+
+import random
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional, Tuple
+
+
+class SlippageModel(str, Enum):
+    """Slippage calculation methods"""
+    FIXED = "fixed"              # Fixed percentage
+    VOLUME_BASED = "volume_based"  # Based on order size vs volume
+    VOLATILITY_BASED = "volatility_based"  # Based on ATR
+    ADAPTIVE = "adaptive"        # Combines volume and volatility
+
+
+@dataclass
+class SlippageConfig:
+    """Configuration for slippage modeling"""
+    model: SlippageModel = SlippageModel.ADAPTIVE
+    fixed_slippage_pct: float = 0.001  # 0.1% default
+    volume_impact_factor: float = 0.1  # How much order size impacts price
+    volatility_multiplier: float = 0.5  # Multiplier for ATR-based slippage
+    min_slippage_pct: float = 0.0001   # 0.01% minimum
+    max_slippage_pct: float = 0.02     # 2% maximum
+
+
+def calculate_slippage(
+    config: SlippageConfig,
+    price: float,
+    quantity: float,
+    side: str,
+    volume: float,
+    atr: float,
+    rng: Optional[random.Random] = None,
+) -> Tuple[float, float]:
+    """
+    Calculate realistic slippage for an order.
+
+    Args:
+        config: Slippage model and bounds
+        price: Order price
+        quantity: Order quantity
+        side: "buy" or "sell"
+        volume: Current bar volume
+        atr: Average True Range
+        rng: Source of the adaptive model's noise (module random if None)
+
+    Returns:
+        (slippage_pct, executed_price)
+    """
+    if config.model == SlippageModel.FIXED:
+        slippage_pct = config.fixed_slippage_pct
+
+    elif config.model == SlippageModel.VOLUME_BASED:
+        # Slippage increases with order size relative to volume
+        order_value = price * quantity
+        volume_value = price * volume if volume > 0 else price * 10000
+        order_ratio = order_value / volume_value
+        slippage_pct = config.fixed_slippage_pct * (1 + order_ratio * config.volume_impact_factor)
+
+    elif config.model == SlippageModel.VOLATILITY_BASED:
+        # Slippage based on ATR as percentage of price
+        atr_pct = atr / price if price > 0 else 0
+        slippage_pct = atr_pct * config.volatility_multiplier
+
+    else:  # ADAPTIVE - combines both
+        # Volume component
+        order_value = price * quantity
+        volume_value = price * volume if volume > 0 else price * 10000
+        order_ratio = order_value / volume_value
+        volume_slippage = config.fixed_slippage_pct * (1 + order_ratio * config.volume_impact_factor)
+
+        # Volatility component
+        atr_pct = atr / price if price > 0 else 0
+        vol_slippage = atr_pct * config.volatility_multiplier
+
+        # Combine - take the larger impact
+        slippage_pct = max(volume_slippage, vol_slippage)
+
+        # Add random variation (market microstructure noise)
+        noise = (rng or random).uniform(-0.2, 0.3) * slippage_pct
+        slippage_pct += noise
+
+    # Apply bounds
+    slippage_pct = max(config.min_slippage_pct, min(config.max_slippage_pct, slippage_pct))
+
+    # Calculate executed price
+    if side == "buy":
+        executed_price = price * (1 + slippage_pct)
+    else:
+        executed_price = price * (1 - slippage_pct)
+
+    return slippage_pct, executed_price
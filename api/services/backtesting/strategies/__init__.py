@@ -7,8 +7,10 @@ Each strategy implements the Strategy protocol:
 
 from .simple_rsi import SimpleRSIStrategy
 from .macd_crossover import MACDCrossoverStrategy
+from .weighted_score import WeightedScoreStrategy
 
 __all__ = [
     "SimpleRSIStrategy",
     "MACDCrossoverStrategy",
+    "WeightedScoreStrategy",
 ]
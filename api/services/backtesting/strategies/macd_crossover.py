@@ -8,9 +8,14 @@ import logging
 from datetime import datetime
 from typing import List, Dict, Tuple, Optional
 
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
 from models.backtest import Signal
 from ..portfolio import SimulatedPortfolio
 from ..data_loader import BacktestData, Bar
+from ..shared_indicators import shared_value
+from ..vectorized import SignalArrays
 
 logger = logging.getLogger(__name__)
 
@@ -83,13 +88,17 @@ class MACDCrossoverStrategy:
 
         for symbol, bar in bars.items():
             # Get historical closes
-            closes = lookback_data.get_lookback(symbol, current_timestamp, min_periods + 10)
+            closes = lookback_data.get_lookback(symbol, current_timestamp, self._lookback_window)
 
             if len(closes) < min_periods:
                 continue  # Not enough data
 
-            # Calculate MACD
-            macd_line, signal_line = self._calculate_macd(closes)
+            # Calculate MACD (once per bar across variants with these periods)
+            macd_line, signal_line = shared_value(
+                self,
+                ("macd", symbol, self.fast_period, self.slow_period, self.signal_period),
+                lambda: self._calculate_macd(closes),
+            )
 
             if macd_line is None or signal_line is None:
                 continue
@@ -127,6 +136,72 @@ class MACDCrossoverStrategy:
 
         return signals
 
+    @property
+    def _lookback_window(self) -> int:
+        """Closes used per MACD evaluation (slow EMA + signal period + 10 bars of warm-up)."""
+        return self.slow_period + self.signal_period + 10
+
+    @property
+    def lookback_periods(self) -> int:
+        """Bars of history generate_signals reads per symbol (for streaming backtests)."""
+        return self._lookback_window
+
+    def compute_signals(self, closes: np.ndarray) -> SignalArrays:
+        """
+        Compute crossover signals for every bar at once (vectorized backtests).
+
+        Produces the same MACD/signal values as generate_signals, which
+        evaluates the EMAs over a sliding lookback window: every windowed
+        EMA is a fixed linear combination of the window's closes, so a full
+        window reduces to a dot product with precomputed weights.
+        """
+        macd, signal = self._calculate_macd_series(closes)
+        above = macd > signal
+        below = macd < signal
+
+        entries = np.zeros(len(closes), dtype=bool)
+        exits = np.zeros(len(closes), dtype=bool)
+        # Crossover vs the previous bar (NaN comparisons are False, so no signal until both exist)
+        entries[1:] = (macd[:-1] <= signal[:-1]) & above[1:]
+        exits[1:] = (macd[:-1] >= signal[:-1]) & below[1:]
+
+        def describe(action: str, row: int) -> str:
+            if action == "BUY":
+                return f"MACD bullish crossover (MACD={macd[row]:.2f} > Signal={signal[row]:.2f})"
+            return f"MACD bearish crossover (MACD={macd[row]:.2f} < Signal={signal[row]:.2f})"
+
+        return SignalArrays(entries=entries, exits=exits, describe=describe, repeat_on_stale_bars=False)
+
+    def _calculate_macd_series(self, closes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """MACD and signal line for every bar (NaN while there is too little history)."""
+        n = len(closes)
+        macd = np.full(n, np.nan)
+        signal = np.full(n, np.nan)
+        window = self._lookback_window
+        min_periods = self.slow_period + self.signal_period
+
+        # Bars with a partial window: evaluate directly
+        for row in range(min_periods - 1, min(window - 1, n)):
+            macd_line, signal_line = self._calculate_macd(closes[:row + 1])
+            if macd_line is not None and signal_line is not None:
+                macd[row], signal[row] = macd_line, signal_line
+
+        if n >= window:
+            macd_weights, signal_weights = self._macd_window_weights(window)
+            windows = sliding_window_view(closes, window)
+            macd[window - 1:] = windows @ macd_weights
+            signal[window - 1:] = windows @ signal_weights
+
+        return macd, signal
+
+    def _macd_window_weights(self, window: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Weights turning a window of closes into (MACD line, signal line), as in _calculate_macd."""
+        fast = _ema_series_weights(window, self.fast_period)
+        slow = _ema_series_weights(window, self.slow_period)
+        history = fast[:len(slow)] - slow
+        signal = _ema_series_weights(len(history), self.signal_period)[-1] @ history
+        return fast[-1] - slow[-1], signal
+
     def _calculate_macd(self, closes: List[float]) -> Tuple[Optional[float], Optional[float]]:
         """
         Calculate MACD line and signal line.
@@ -197,3 +272,19 @@ class MACDCrossoverStrategy:
             emas.append(ema)
 
         return emas
+
+
+def _ema_series_weights(length: int, period: int) -> np.ndarray:
+    """
+    Weights of each EMA value over its input, matching _calculate_ema_series.
+
+    Row k holds the weights of the k-th EMA value (SMA seed over the first
+    `period` inputs, then one recursion step per input).
+    """
+    multiplier = 2 / (period + 1)
+    weights = np.zeros((length - period + 1, length))
+    weights[0, :period] = 1 / period
+    for k in range(1, len(weights)):
+        weights[k] = weights[k - 1] * (1 - multiplier)
+        weights[k, period + k - 1] += multiplier
+    return weights
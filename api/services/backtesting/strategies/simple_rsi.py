@@ -9,9 +9,14 @@ import logging
 from datetime import datetime
 from typing import List, Dict
 
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
 from models.backtest import Signal
 from ..portfolio import SimulatedPortfolio
 from ..data_loader import BacktestData, Bar
+from ..shared_indicators import shared_value
+from ..vectorized import SignalArrays
 
 logger = logging.getLogger(__name__)
 
@@ -83,8 +88,8 @@ class SimpleRSIStrategy:
             if len(closes) < self.rsi_period + 1:
                 continue  # Not enough data
 
-            # Calculate RSI
-            rsi = self._calculate_rsi(closes)
+            # Calculate RSI (once per bar across variants with this period)
+            rsi = shared_value(self, ("rsi", symbol, self.rsi_period), lambda: self._calculate_rsi(closes))
 
             if rsi is None:
                 continue
@@ -110,6 +115,11 @@ class SimpleRSIStrategy:
 
         return signals
 
+    @property
+    def lookback_periods(self) -> int:
+        """Bars of history generate_signals reads per symbol (for streaming backtests)."""
+        return self.rsi_period + 1
+
     def _calculate_rsi(self, closes: List[float]) -> float:
         """
         Calculate RSI from closing prices.
@@ -145,3 +155,38 @@ class SimpleRSIStrategy:
         rsi = 100 - (100 / (1 + rs))
 
         return rsi
+
+    def compute_signals(self, closes: np.ndarray) -> SignalArrays:
+        """
+        Compute RSI entry/exit signals for every bar at once (vectorized backtests).
+
+        Uses the same RSI definition as generate_signals: simple average
+        gain/loss over the last rsi_period changes.
+        """
+        rsi = self._calculate_rsi_series(closes)
+
+        def describe(action: str, row: int) -> str:
+            if action == "BUY":
+                return f"RSI={rsi[row]:.1f} < {self.oversold} (oversold)"
+            return f"RSI={rsi[row]:.1f} > {self.overbought} (overbought)"
+
+        return SignalArrays(
+            entries=rsi < self.oversold,
+            exits=rsi > self.overbought,
+            describe=describe,
+        )
+
+    def _calculate_rsi_series(self, closes: np.ndarray) -> np.ndarray:
+        """RSI for every bar (NaN until rsi_period + 1 closes are available)."""
+        period = self.rsi_period
+        rsi = np.full(len(closes), np.nan)
+        if len(closes) < period + 1:
+            return rsi
+
+        windows = sliding_window_view(np.diff(closes), period)
+        avg_gain = np.where(windows > 0, windows, 0.0).sum(axis=1) / period
+        avg_loss = np.where(windows > 0, 0.0, -windows).sum(axis=1) / period
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi[period:] = np.where(avg_loss == 0, 100.0, 100 - 100 / (1 + avg_gain / avg_loss))
+        return rsi
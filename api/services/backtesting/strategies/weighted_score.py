@@ -0,0 +1,171 @@
+"""
+Weighted Score Strategy for backtesting.
+
+Runs the live bot's StrategyEngine (weighted indicator scoring) as a
+backtestable strategy, so indicator weightings and entry thresholds can
+be compared against the simple strategies.
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from models.backtest import Signal
+from services.strategy_engine import SignalType, StrategyEngine, TradeType
+from ..portfolio import SimulatedPortfolio
+from ..data_loader import BacktestData, Bar
+from ..shared_indicators import shared_value
+
+logger = logging.getLogger(__name__)
+
+# StrategyEngine needs this many bars before it scores anything
+MIN_BARS = 50
+
+
+class WeightedScoreStrategy:
+    """
+    StrategyEngine scoring as a backtest strategy.
+
+    Rules:
+    - BUY when the weighted score reaches entry_threshold
+    - SELL when StrategyEngine.should_exit does (stop-loss, profit target,
+      reversal, or time stop), using the stop/target suggested at entry
+    - One position per symbol
+    """
+
+    def __init__(
+        self,
+        entry_threshold: float = 70.0,
+        weights: Optional[Dict[str, float]] = None,
+        lookback: int = 200,
+        swing_profit_target_pct: float = 0.08,
+        longterm_profit_target_pct: float = 0.15,
+        default_stop_loss_pct: float = 0.05,
+    ):
+        """
+        Initialize the weighted score strategy.
+
+        Args:
+            entry_threshold: Minimum score for a BUY
+            weights: Indicator weights (default: the bot's DEFAULT_WEIGHTS)
+            lookback: Bars of history scored per evaluation (200 covers SMA 200)
+            swing_profit_target_pct: Profit target for swing trades
+            longterm_profit_target_pct: Profit target for long-term trades
+            default_stop_loss_pct: Default stop-loss percentage
+        """
+        self.engine = StrategyEngine(
+            weights=weights,
+            entry_threshold=entry_threshold,
+            swing_profit_target_pct=swing_profit_target_pct,
+            longterm_profit_target_pct=longterm_profit_target_pct,
+            default_stop_loss_pct=default_stop_loss_pct,
+        )
+        self.lookback = lookback
+
+        # Store params for reporting
+        self.params = {
+            "entry_threshold": entry_threshold,
+            "weights": dict(self.engine.weights),
+            "lookback": lookback,
+            "swing_profit_target_pct": swing_profit_target_pct,
+            "longterm_profit_target_pct": longterm_profit_target_pct,
+            "default_stop_loss_pct": default_stop_loss_pct,
+        }
+
+        # Stop-loss, profit target and trade type chosen at each entry
+        self._exits: Dict[str, Tuple[float, float, TradeType]] = {}
+
+    async def generate_signals(
+        self,
+        bars: Dict[str, Bar],
+        portfolio: SimulatedPortfolio,
+        lookback_data: BacktestData,
+        current_timestamp: datetime
+    ) -> List[Signal]:
+        """
+        Generate trading signals from the weighted indicator score.
+
+        Args:
+            bars: Current bars for each symbol
+            portfolio: Current portfolio state
+            lookback_data: Historical data for lookback
+            current_timestamp: Current timestamp
+
+        Returns:
+            List of signals to execute
+        """
+        signals = []
+
+        for symbol in bars:
+            history = self._history(lookback_data, symbol, current_timestamp)
+            if len(history[0]) < MIN_BARS:
+                continue  # Not enough data
+
+            # Indicators don't depend on weights/threshold: once per bar across variants
+            indicators = shared_value(
+                self,
+                ("strategy_engine", symbol, self.lookback),
+                lambda: self.engine.calculate_indicators(*history),
+            )
+            prices, highs, lows, volumes = history
+            position = portfolio.positions.get(symbol)
+
+            if position is None:
+                analysis = self.engine.signal_from_indicators(symbol, indicators, prices[-1])
+                if analysis.signal_type == SignalType.BUY:
+                    self._exits[symbol] = (
+                        analysis.suggested_stop_loss,
+                        analysis.suggested_profit_target,
+                        analysis.trade_type,
+                    )
+                    signals.append(Signal(
+                        symbol=symbol,
+                        action="BUY",
+                        timestamp=current_timestamp,
+                        reason=f"Score {analysis.score:.1f} >= {self.engine.entry_threshold} "
+                               f"({analysis.trade_type.value})",
+                        confidence=analysis.score / 100,
+                    ))
+                continue
+
+            stop_loss, profit_target, trade_type = self._exits.get(
+                symbol,
+                (position.entry_price * (1 - self.engine.default_stop_loss_pct),
+                 position.entry_price * (1 + self.engine.swing_profit_target_pct),
+                 TradeType.SWING),
+            )
+            should_exit, reason = self.engine.should_exit(
+                symbol=symbol,
+                entry_price=position.entry_price,
+                current_price=prices[-1],
+                stop_loss=stop_loss,
+                profit_target=profit_target,
+                trade_type=trade_type,
+                entry_time_days=(current_timestamp - position.entry_time).days,
+                prices=prices,
+                highs=highs,
+                lows=lows,
+                volumes=volumes,
+                indicators=indicators,
+            )
+            if should_exit:
+                signals.append(Signal(
+                    symbol=symbol,
+                    action="SELL",
+                    timestamp=current_timestamp,
+                    reason=reason,
+                ))
+
+        return signals
+
+    @property
+    def lookback_periods(self) -> int:
+        """Bars of history generate_signals reads per symbol (for streaming backtests)."""
+        return self.lookback
+
+    def _history(self, data: BacktestData, symbol: str, timestamp: datetime) -> Tuple[List[float], ...]:
+        """(closes, highs, lows, volumes) over the lookback, as lists for IndicatorService"""
+        return tuple(
+            data.get_lookback_array(symbol, timestamp, self.lookback, column).tolist()
+            for column in ("close", "high", "low", "volume")
+        )
@@ -0,0 +1,194 @@
+"""
+Vectorized backtest simulation.
+
+Signal-based strategies can implement `compute_signals(closes)` to produce
+their whole entry/exit signal arrays up front from full-history indicator
+arrays, instead of recomputing indicators from a lookback slice on every
+simulated bar.
+
+The simulator then walks only the bars that carry a signal, filling
+through the regular SimulatedPortfolio (same sizing, cash and commission
+rules as the event-driven engine), and builds the equity curve with
+array operations.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Protocol
+
+import numpy as np
+
+from models.backtest import Signal, EquityPoint
+from .data_loader import BacktestData
+from .portfolio import SimulatedPortfolio
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SignalArrays:
+    """
+    Entry/exit signals for one symbol, aligned to its bars.
+
+    Attributes:
+        entries: Bool array - BUY if flat on this bar
+        exits: Bool array - SELL if holding on this bar
+        describe: Builds the signal reason for (action, bar index)
+        repeat_on_stale_bars: Whether a signal fires again when the timeline
+            advances but the symbol has no new bar (true for level-based
+            signals like RSI thresholds, false for crossovers)
+    """
+    entries: np.ndarray
+    exits: np.ndarray
+    describe: Optional[Callable[[str, int], str]] = None
+    repeat_on_stale_bars: bool = True
+
+
+class VectorizedStrategy(Protocol):
+    """Protocol for strategies that support vectorized backtests."""
+
+    def compute_signals(self, closes: np.ndarray) -> SignalArrays:
+        """Compute entry/exit signals for every bar of one symbol."""
+        ...
+
+
+def supports_vectorized(strategy) -> bool:
+    """Check if a strategy implements the vectorized interface."""
+    return callable(getattr(strategy, "compute_signals", None))
+
+
+def simulate_signals(
+    data: BacktestData,
+    strategy: VectorizedStrategy,
+    portfolio: SimulatedPortfolio,
+) -> int:
+    """
+    Simulate a strategy's signal arrays on the data timeline.
+
+    Mirrors BacktestEngine's event loop: on each timestamp, symbols are
+    processed in data order, positions decided from the state at the start
+    of the bar, and fills executed at the bar's close.
+
+    Returns:
+        Number of timeline bars processed
+    """
+    timestamps = data.timestamps
+    num_steps = len(timestamps)
+    if num_steps == 0:
+        return 0
+
+    symbols = list(data.symbol_data.keys())
+    rows = {s: data.timeline_rows(s) for s in symbols}
+    closes = {s: data.symbol_data[s].array("close") for s in symbols}
+
+    # Timeline-aligned signals per symbol
+    entries_t: Dict[str, np.ndarray] = {}
+    exits_t: Dict[str, np.ndarray] = {}
+    describers: Dict[str, Optional[Callable[[str, int], str]]] = {}
+    for symbol in symbols:
+        symbol_rows = rows[symbol]
+        valid = symbol_rows >= 0
+        if not valid.any():
+            entries_t[symbol] = exits_t[symbol] = np.zeros(num_steps, dtype=bool)
+            continue
+
+        arrays = strategy.compute_signals(closes[symbol])
+        safe_rows = np.where(valid, symbol_rows, 0)
+        active = valid
+        if not arrays.repeat_on_stale_bars:
+            # Only the first timestamp of each bar can fire
+            new_bar = np.ones(num_steps, dtype=bool)
+            new_bar[1:] = symbol_rows[1:] != symbol_rows[:-1]
+            active = valid & new_bar
+        entries_t[symbol] = arrays.entries[safe_rows] & active
+        exits_t[symbol] = arrays.exits[safe_rows] & active
+        describers[symbol] = arrays.describe
+
+    entry_matrix = np.vstack([entries_t[s] for s in symbols])
+    exit_matrix = np.vstack([exits_t[s] for s in symbols])
+
+    # Candidate (step, symbol) events ordered by step, then symbol (data order)
+    event_steps, event_symbols = np.nonzero((entry_matrix | exit_matrix).T)
+    event_entries = entry_matrix[event_symbols, event_steps].tolist()
+    event_exits = exit_matrix[event_symbols, event_steps].tolist()
+
+    # Plain lists: scalar access in the event loop is much cheaper than on arrays
+    row_lists = {s: rows[s].tolist() for s in symbols}
+    close_lists = {s: closes[s].tolist() for s in symbols}
+
+    # Piecewise-constant holdings and cash, filled in after the event loop
+    cash_changes: List[tuple] = []  # (step, cash after step)
+    holding_changes: Dict[str, List[tuple]] = {s: [] for s in symbols}  # (step, quantity after step)
+    positions = portfolio.positions
+
+    for step, index, is_entry, is_exit in zip(event_steps.tolist(), event_symbols.tolist(), event_entries, event_exits):
+        symbol = symbols[index]
+        # Each symbol appears once per step and only its own position decides
+        # its action, so deciding and filling in order matches the event loop
+        if is_entry and symbol not in positions:
+            action = "BUY"
+            # Sizing uses current equity: mark held positions to this bar
+            for held in positions:
+                portfolio._current_prices[held] = close_lists[held][row_lists[held][step]]
+        elif is_exit and symbol in positions:
+            action = "SELL"
+        else:
+            continue
+
+        row = row_lists[symbol][step]
+        price = close_lists[symbol][row]
+        describe = describers.get(symbol)
+        signal = Signal(
+            symbol=symbol,
+            action=action,
+            timestamp=timestamps[step],
+            reason=describe(action, row) if describe else action,
+        )
+        portfolio._current_prices[symbol] = price
+        if portfolio.execute(signal, price):
+            position = positions.get(symbol)
+            holding_changes[symbol].append((step, position.quantity if position else 0.0))
+            cash_changes.append((step, portfolio.cash))
+
+    # Final prices, then close out like the event-driven engine
+    last = num_steps - 1
+    for symbol in symbols:
+        if rows[symbol][last] >= 0:
+            portfolio._current_prices[symbol] = float(closes[symbol][rows[symbol][last]])
+
+    _record_equity_curve(data, portfolio, rows, closes, cash_changes, holding_changes)
+
+    portfolio.close_all_positions(timestamps[last])
+    portfolio.record_equity(timestamps[last])
+    return num_steps
+
+
+def _step_series(changes: List[tuple], num_steps: int, initial: float) -> np.ndarray:
+    """Expand (step, value-after-step) changes into a per-step array."""
+    if not changes:
+        return np.full(num_steps, initial, dtype=np.float64)
+    steps = np.array([step for step, _ in changes])
+    values = np.array([value for _, value in changes], dtype=np.float64)
+    # Index of the last change at or before each step (several changes per step: last wins)
+    index = np.searchsorted(steps, np.arange(num_steps), side="right") - 1
+    return np.where(index >= 0, values[np.maximum(index, 0)], initial)
+
+
+def _record_equity_curve(data, portfolio, rows, closes, cash_changes, holding_changes):
+    """Append one EquityPoint per timeline step to the portfolio's equity curve."""
+    num_steps = len(data.timestamps)
+    cash = _step_series(cash_changes, num_steps, portfolio.initial_capital)
+    positions_value = np.zeros(num_steps, dtype=np.float64)
+
+    for symbol, changes in holding_changes.items():
+        if not changes:
+            continue
+        quantity = _step_series(changes, num_steps, 0.0)
+        held = quantity != 0
+        positions_value[held] += quantity[held] * closes[symbol][rows[symbol][held]]
+
+    equity = cash + positions_value
+    portfolio.extend_equity_curve(
+        EquityPoint(timestamp=ts, equity=e, cash=c, positions_value=p)
+        for ts, e, c, p in zip(data.timestamps, equity.tolist(), cash.tolist(), positions_value.tolist())
+    )
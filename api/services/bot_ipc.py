@@ -0,0 +1,500 @@
+"""
+Bot Process IPC
+===============
+
+Lets the trading bot run in its own process while the API runs as any
+number of stateless uvicorn workers on the same host.
+
+    BOT_PROCESS_MODE=external   API workers proxy to the bot process
+    BOT_PROCESS_MODE=embedded   (default) bot lives inside the API process
+
+In external mode `get_trading_bot()` returns a BotProxy instead of a
+TradingBot. The proxy forwards attribute reads, attribute writes and
+method calls (sync and async) to the real bot over a local
+multiprocessing connection authenticated with BOT_IPC_AUTHKEY, so the
+routes work unchanged. The bot process itself is started with
+`python bot_process.py`.
+
+Writes and method calls are executed on the bot's event loop, so API
+traffic never races the trading loop, and dashboards polling status no
+longer share an event loop with order management. Plain attribute reads
+are answered on the connection's thread without waiting for the loop
+(reads of mutable containers still go through it, so they are never
+copied mid-update).
+
+On the API side, connections are kept open and reused across requests,
+and routes run their bot access off the event loop (offload_bot_io /
+run_bot_io), since every proxy read or call is a blocking round trip.
+
+Only the attributes and methods listed in BOT_IPC_ALLOWLIST can be
+reached over the connection; a route that needs something new adds it
+there.
+
+Proxy semantics to keep in mind:
+- Plain data (numbers, strings, enums, datetimes, lists, dicts, ...) is
+  returned as a COPY - mutating it in place does not reach the bot.
+  Reassign the attribute instead (`bot.items = bot.items + [x]`).
+- Any other object (services, dataclasses, ...) comes back as a nested
+  proxy, so `bot.auto_optimizer.enabled = True` works as expected.
+"""
+
+import asyncio
+import enum
+import functools
+import inspect
+import logging
+import os
+import pickle
+import threading
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from functools import reduce
+from multiprocessing.connection import Client, Listener
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union
+
+from exceptions import BotProcessError, BotProcessUnavailableError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IPC_ADDRESS = "127.0.0.1:8765"
+
+# What API workers may read, write or call, by path under the bot. Anything
+# else (private helpers, the bot's services' other methods) is refused.
+BOT_IPC_ALLOWLIST: Dict[Tuple[str, ...], frozenset] = {
+    (): frozenset({
+        # Lifecycle and status
+        "state", "start", "stop", "pause", "resume", "get_status",
+        "current_session", "current_cycle",
+        # Execution
+        "get_execution_log", "get_strong_buy_trace", "_execution_log",
+        "_log_execution_event", "new_entries_paused", "auto_trade_mode",
+        "strategy_override", "_apply_ai_risk_preset", "ai_risk_tolerance",
+        "_apply_config", "_queued_trades",
+        # Scanning
+        "asset_class_mode", "crypto_trading_enabled", "enabled_symbols",
+        "_stock_scan_progress", "_crypto_scan_progress", "_total_scans_today",
+        "_stock_analysis_results", "_crypto_analysis_results",
+        # Hierarchical trading
+        "hierarchical_mode_enabled", "current_trading_horizon",
+        "force_trading_horizon", "daily_profit_target_pct",
+        "_hierarchical_scan_results",
+        # Services
+        "alpaca", "auto_optimizer", "auto_optimize_enabled", "strategy",
+        "smart_scanner", "priority_scanner", "execution_logger",
+    }),
+    ("alpaca",): frozenset({
+        "get_account", "get_positions", "get_quote", "is_market_open",
+        "close_position", "submit_market_order",
+    }),
+    ("auto_optimizer",): frozenset({
+        "enabled", "current_regime", "last_optimization", "get_status",
+        "run_optimization", "start_background_optimization",
+        "stop_background_optimization",
+    }),
+    ("strategy",): frozenset({"weights", "entry_threshold"}),
+    ("smart_scanner",): frozenset({
+        "all_opportunities", "get_scan_summary", "evaluate_symbol", "strategy",
+    }),
+    ("smart_scanner", "strategy"): frozenset({"daily_goal"}),
+    ("smart_scanner", "strategy", "daily_goal"): frozenset({
+        "date", "target_profit_pct", "achieved_profit_pct", "goal_achieved",
+        "trades_taken", "wins", "losses", "best_trade_pct", "worst_trade_pct",
+        "horizons_used",
+    }),
+    ("priority_scanner",): frozenset({"get_tier_summary", "get_all_priorities"}),
+    ("execution_logger",): frozenset({
+        "get_error_summary", "get_recent_attempts", "diagnose_failures",
+    }),
+}
+
+# Types returned by value; everything else is returned as a nested proxy
+_VALUE_TYPES = (
+    type(None), bool, int, float, str, bytes, Decimal,
+    list, tuple, dict, set, frozenset,
+    datetime, date, time, timedelta, enum.Enum,
+)
+
+# Returned by value but read on the bot's loop, so they aren't pickled while it mutates them
+_MUTABLE_VALUE_TYPES = (list, dict, set)
+
+IPCAddress = Union[str, Tuple[str, int]]
+T = TypeVar("T")
+
+
+def is_external_bot_mode() -> bool:
+    """True if the bot runs in its own process and the API should proxy to it"""
+    return os.getenv("BOT_PROCESS_MODE", "embedded").lower() == "external"
+
+
+def get_ipc_address() -> IPCAddress:
+    """
+    Get the bot IPC address from BOT_IPC_ADDRESS.
+
+    "host:port" selects a TCP socket (keep it on 127.0.0.1); anything else
+    is treated as a Unix socket path.
+    """
+    address = os.getenv("BOT_IPC_ADDRESS", DEFAULT_IPC_ADDRESS)
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit():
+        return (host, int(port))
+    return address
+
+
+def get_ipc_authkey() -> bytes:
+    """Get the shared secret both processes authenticate with"""
+    authkey = os.getenv("BOT_IPC_AUTHKEY")
+    if not authkey:
+        raise BotProcessError(
+            "BOT_IPC_AUTHKEY must be set to run the bot out of process",
+            error_code="BOT_IPC_NOT_CONFIGURED",
+        )
+    return authkey.encode()
+
+
+# ==================== SERVER (bot process) ====================
+
+class BotIPCServer:
+    """
+    Serves proxy requests against a local object (the TradingBot).
+
+    Connections are accepted and read on background threads. Plain
+    attribute reads are answered there; everything else is executed on
+    `loop`, the event loop the bot runs on.
+    """
+
+    def __init__(
+        self,
+        target: Any,
+        loop: asyncio.AbstractEventLoop,
+        address: Optional[IPCAddress] = None,
+        authkey: Optional[bytes] = None,
+        request_timeout_seconds: float = 300.0,
+        allowlist: Optional[Dict[Tuple[str, ...], frozenset]] = None,
+    ):
+        self.target = target
+        self.allowlist = BOT_IPC_ALLOWLIST if allowlist is None else allowlist
+        self.loop = loop
+        self.request_timeout_seconds = request_timeout_seconds
+        self._listener = Listener(address or get_ipc_address(), authkey=authkey or get_ipc_authkey())
+        self._accept_thread: Optional[threading.Thread] = None
+        self._closed = False
+
+        # Statistics
+        self.connections_accepted = 0
+        self.requests_served = 0
+        self.request_errors = 0
+
+    @property
+    def address(self) -> IPCAddress:
+        return self._listener.address
+
+    def start(self):
+        """Start accepting connections"""
+        self._accept_thread = threading.Thread(target=self._accept_loop, name="bot-ipc-accept", daemon=True)
+        self._accept_thread.start()
+        logger.info(f"[BotIPC] Listening on {self.address}")
+
+    def close(self):
+        """Stop accepting connections"""
+        self._closed = True
+        self._listener.close()
+
+    def _accept_loop(self):
+        while not self._closed:
+            try:
+                conn = self._listener.accept()
+            except OSError:
+                if self._closed:
+                    return
+                continue
+            except Exception as e:
+                # Failed authentication and similar - keep serving others
+                logger.warning(f"[BotIPC] Rejected connection: {e}")
+                continue
+            self.connections_accepted += 1
+            threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+
+    def _serve_connection(self, conn):
+        with conn:
+            while True:
+                try:
+                    request = conn.recv()
+                except (EOFError, OSError):
+                    return
+
+                response = self._answer_read(request)
+                if response is None:
+                    future = asyncio.run_coroutine_threadsafe(self._handle(request), self.loop)
+                    try:
+                        response = future.result(timeout=self.request_timeout_seconds)
+                    except Exception as e:
+                        response = ("error", _transferable_exception(e))
+
+                try:
+                    conn.send(response)
+                except (pickle.PicklingError, TypeError, AttributeError) as e:
+                    conn.send(("error", BotProcessError(f"Result cannot be sent to the API process: {e}")))
+                except OSError:
+                    return
+
+    def _answer_read(self, request: tuple) -> Optional[tuple]:
+        """Answer a ping or plain attribute read on the connection's thread (None: use the bot's loop)"""
+        op = request[0]
+        if op == "ping":
+            self.requests_served += 1
+            return ("ok", "value", True)
+        if op != "get":
+            return None
+        try:
+            value = getattr(self._resolve(request[1], request[2]), request[2])
+        except Exception as e:
+            self.requests_served += 1
+            self.request_errors += 1
+            return ("error", _transferable_exception(e))
+        if isinstance(value, _MUTABLE_VALUE_TYPES):
+            return None
+        self.requests_served += 1
+        return _describe(value)
+
+    def _resolve(self, path: Tuple[str, ...], name: str) -> Any:
+        """The object at `path` under the target, if `name` is allowlisted there"""
+        if name not in self.allowlist.get(tuple(path), ()):
+            raise AttributeError(f"Access to {'.'.join(('bot',) + tuple(path) + (name,))} is not allowed over IPC")
+        return reduce(getattr, path, self.target)
+
+    async def _handle(self, request: tuple) -> tuple:
+        """Execute one request on the bot's event loop"""
+        self.requests_served += 1
+        try:
+            op = request[0]
+            path, name = request[1], request[2]
+            obj = self._resolve(path, name)
+
+            if op == "get":
+                return _describe(getattr(obj, name))
+
+            if op == "set":
+                setattr(obj, name, request[3])
+                return ("ok", "value", None)
+
+            if op == "call":
+                result = getattr(obj, name)(*request[3], **request[4])
+                if asyncio.iscoroutine(result):
+                    result = await result
+                return ("ok", "value", result)
+
+            raise BotProcessError(f"Unknown IPC operation: {op}")
+        except Exception as e:
+            self.request_errors += 1
+            return ("error", _transferable_exception(e))
+
+
+def _describe(value: Any) -> tuple:
+    """Response to a read: the value itself, or what kind of proxy to build"""
+    if asyncio.iscoroutinefunction(value):
+        return ("ok", "async_method", None)
+    if callable(value) and not isinstance(value, type):
+        return ("ok", "method", None)
+    if isinstance(value, _VALUE_TYPES):
+        return ("ok", "value", value)
+    return ("ok", "object", None)
+
+
+def _transferable_exception(exc: Exception) -> Exception:
+    """Return the exception itself if it survives pickling, else a BotProcessError describing it"""
+    try:
+        pickle.loads(pickle.dumps(exc))
+        return exc
+    except Exception:
+        return BotProcessError(str(exc), remote_type=type(exc).__name__)
+
+
+# ==================== CLIENT (API workers) ====================
+
+class _ConnectionPool:
+    """
+    Open connections to the bot process, reused across requests.
+
+    A connection carries one request at a time; concurrent requests (from
+    different threads) each take their own. Also remembers which remote
+    attributes are methods, so calling one costs a single round trip.
+    """
+
+    def __init__(self, address: IPCAddress, authkey: bytes, max_idle: int = 8):
+        self.address = address
+        self.authkey = authkey
+        self.max_idle = max_idle
+        self.method_kinds: Dict[Tuple[Tuple[str, ...], str], str] = {}
+        self._idle: List[Any] = []
+        self._lock = threading.Lock()
+
+    def request(self, message: tuple) -> tuple:
+        """Send one request and return the raw response"""
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is not None:
+            try:
+                conn.send(message)
+            except (EOFError, OSError):
+                # Idle connection closed by the bot process (e.g. it restarted)
+                conn.close()
+                conn = None
+            except BaseException:
+                self._release(conn)  # Nothing was sent (e.g. an unpicklable argument)
+                raise
+        if conn is None:
+            conn = Client(self.address, authkey=self.authkey)
+            try:
+                conn.send(message)
+            except BaseException:
+                conn.close()
+                raise
+
+        try:
+            response = conn.recv()
+        except BaseException:
+            conn.close()
+            raise
+
+        self._release(conn)
+        return response
+
+    def _release(self, conn) -> None:
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close(self):
+        """Close all idle connections"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+_pools: Dict[Tuple[IPCAddress, bytes], _ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(address: IPCAddress, authkey: bytes) -> _ConnectionPool:
+    key = (tuple(address) if isinstance(address, list) else address, authkey)
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = _ConnectionPool(address, authkey)
+        return _pools[key]
+
+
+class BotProxy:
+    """
+    Stand-in for the TradingBot inside API workers.
+
+    Each proxy holds an attribute path into the remote bot; attribute
+    access and calls are forwarded to the bot process over pooled
+    connections. Every access blocks until the bot answers - keep it off
+    the event loop (offload_bot_io / run_bot_io).
+    """
+
+    def __init__(
+        self,
+        address: Optional[IPCAddress] = None,
+        authkey: Optional[bytes] = None,
+        _path: Tuple[str, ...] = (),
+    ):
+        object.__setattr__(self, "_address", address or get_ipc_address())
+        object.__setattr__(self, "_authkey", authkey or get_ipc_authkey())
+        object.__setattr__(self, "_path", _path)
+
+    @property
+    def _pool(self) -> _ConnectionPool:
+        return _get_pool(self._address, self._authkey)
+
+    def _request(self, message: tuple) -> Any:
+        try:
+            status, *payload = self._pool.request(message)
+        except (ConnectionRefusedError, FileNotFoundError, EOFError) as e:
+            raise BotProcessUnavailableError(
+                f"Trading bot process is not reachable: {e}", address=str(self._address)
+            ) from e
+
+        if status == "error":
+            raise payload[0]
+        return payload
+
+    def ping(self) -> bool:
+        """Check that the bot process is reachable"""
+        try:
+            return self._request(("ping",))[1]
+        except BotProcessUnavailableError:
+            return False
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__"):
+            raise AttributeError(name)
+
+        kind = self._pool.method_kinds.get((self._path, name))
+        if kind is None:
+            kind, value = self._request(("get", self._path, name))
+            if kind == "value":
+                return value
+            if kind == "object":
+                return BotProxy(self._address, self._authkey, _path=self._path + (name,))
+            self._pool.method_kinds[(self._path, name)] = kind
+
+        def call(*args, **kwargs):
+            return self._request(("call", self._path, name, args, kwargs))[1]
+
+        if kind == "async_method":
+            async def async_call(*args, **kwargs):
+                # Blocking IPC runs off the event loop; the bot may take a while (e.g. start())
+                return await asyncio.to_thread(call, *args, **kwargs)
+            return async_call
+        return call
+
+    def __setattr__(self, name: str, value: Any):
+        self._request(("set", self._path, name, value))
+
+    def __repr__(self) -> str:
+        path = ".".join(("bot",) + self._path)
+        return f"<BotProxy {path} @ {self._address}>"
+
+
+# ==================== ROUTE HELPERS ====================
+
+async def run_bot_io(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a block of bot access from an async route.
+
+    With an external bot every read and call is a blocking round trip, so
+    the block runs on a worker thread. An embedded bot is a local object
+    shared with the trading loop, so the block runs on the event loop as before.
+    An awaitable result (a bot coroutine method called in the block) is
+    awaited here, on the caller's loop.
+    """
+    if is_external_bot_mode():
+        result = await asyncio.to_thread(func, *args, **kwargs)
+    else:
+        result = func(*args, **kwargs)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+def offload_bot_io(handler: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Serve a synchronous route body that only touches the bot through run_bot_io.
+
+    The body runs on a worker thread for an external bot and inline on the
+    event loop for an embedded one; the route itself stays on the server's
+    loop. Coroutine methods the body calls come back as awaitables and are
+    awaited there. Routes that await anything else wrap their bot access in
+    run_bot_io() directly instead.
+    """
+    if inspect.iscoroutinefunction(handler):
+        raise TypeError(f"offload_bot_io expects a synchronous handler, got {handler.__name__}")
+
+    @functools.wraps(handler)
+    async def wrapper(*args, **kwargs):
+        return await run_bot_io(handler, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,355 @@
+"""
+Partitioned Bot Workers
+=======================
+
+Runs the symbol analysis pipeline (bars, adaptive indicators, pattern
+recognition, multi-timeframe confluence) in N worker processes, so large
+symbol universes aren't limited to one CPU core and the API server's GIL.
+
+Roles:
+- Workers: each owns a stable partition of the symbol universe and only
+  ANALYZES - they return candidate TradingOpportunity objects.
+- Coordinator (the TradingBot process): keeps the hierarchical cascade
+  state, picks the best opportunity, and keeps sole authority over risk
+  checks (RiskManager, CircuitBreaker) and order submission.
+
+IPC uses multiprocessing queues (spawn context) - no external broker.
+Each worker has its own task queue (so a symbol always lands on the same
+worker and its per-cycle data context stays warm across the cascade) and
+all workers share one result queue back to the coordinator.
+
+If a worker dies or misses the deadline it is restarted, and its symbols
+are reported back as failed so the coordinator can analyze them locally.
+"""
+
+import asyncio
+import itertools
+import logging
+import multiprocessing as mp
+import queue
+import time
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
+
+from .hierarchical_strategy import TradingHorizon, TradingOpportunity
+
+logger = logging.getLogger(__name__)
+
+
+def partition_symbols(symbols: List[str], num_partitions: int) -> List[List[str]]:
+    """
+    Split symbols into stable partitions.
+
+    Uses a CRC32 hash (not Python's salted hash) so a symbol maps to the
+    same partition across cycles and restarts. Order within a partition
+    follows the input order.
+    """
+    partitions: List[List[str]] = [[] for _ in range(num_partitions)]
+    for symbol in symbols:
+        partitions[zlib.crc32(symbol.upper().encode()) % num_partitions].append(symbol)
+    return partitions
+
+
+def _default_alpaca_factory(paper_trading: bool):
+    from .alpaca_service import get_alpaca_service
+    return get_alpaca_service(paper_trading=paper_trading)
+
+
+# ==================== WORKER PROCESS ====================
+
+def _worker_main(
+    worker_id: int,
+    task_queue: "mp.Queue",
+    result_queue: "mp.Queue",
+    alpaca_factory: Callable[[], Any],
+) -> None:
+    """Worker process entry point: analyze partitions until a None task arrives"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format=f"%(asctime)s [worker-{worker_id}] %(name)s %(levelname)s: %(message)s",
+    )
+
+    # Imported here so the coordinator doesn't pay for it at import time
+    from .scan_context import ScanDataContext
+    from .smart_scanner import SmartScanner
+
+    scanner = SmartScanner(alpaca_service=alpaca_factory())
+    loop = asyncio.new_event_loop()
+    context: Optional[ScanDataContext] = None
+
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+
+        # One data context per coordinator cycle, reused across the cascade
+        if context is None or context.cycle_id != task["cycle_id"]:
+            context = ScanDataContext(scanner.alpaca, cycle_id=task["cycle_id"])
+        fetches_saved_before = context.fetches_saved
+
+        started = time.perf_counter()
+        horizon = TradingHorizon(task["horizon"])
+        opportunities: List[TradingOpportunity] = []
+        failed: List[str] = []
+
+        for symbol in task["symbols"]:
+            try:
+                opportunity = loop.run_until_complete(
+                    scanner._analyze_symbol_for_horizon(symbol, horizon, context, raise_errors=True)
+                )
+                if opportunity:
+                    opportunities.append(opportunity)
+            except Exception as e:
+                logger.warning(f"Error analyzing {symbol}: {e}")
+                failed.append(symbol)
+
+        result_queue.put({
+            "request_id": task["request_id"],
+            "worker_id": worker_id,
+            "opportunities": opportunities,
+            "scanned": len(task["symbols"]) - len(failed),
+            "failed": failed,
+            "symbol_metrics": {
+                symbol: context.symbol_metrics[symbol]
+                for symbol in task["symbols"] if symbol in context.symbol_metrics
+            },
+            "fetches_saved": context.fetches_saved - fetches_saved_before,
+            "duration_ms": int((time.perf_counter() - started) * 1000),
+        })
+
+    loop.close()
+
+
+# ==================== COORDINATOR SIDE ====================
+
+@dataclass
+class PartitionScanResult:
+    """Merged result of one horizon scan across all workers"""
+    opportunities: List[TradingOpportunity] = field(default_factory=list)
+    scanned: int = 0
+    fetches_saved: int = 0
+    failed_symbols: List[str] = field(default_factory=list)
+    symbol_metrics: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+
+@dataclass
+class _WorkerHandle:
+    """Coordinator-side bookkeeping for one worker process"""
+    worker_id: int
+    process: Any
+    task_queue: Any
+    tasks_completed: int = 0
+    restarts: int = 0
+    last_duration_ms: int = 0
+    started_at: datetime = field(default_factory=datetime.now)
+
+
+class BotWorkerPool:
+    """
+    Pool of analysis worker processes with a single coordinator.
+
+    Usage:
+        pool = BotWorkerPool(num_workers=4, paper_trading=True)
+        pool.start()
+        result = await pool.analyze(symbols, TradingHorizon.SWING, cycle_id="abc")
+        pool.shutdown()
+    """
+
+    def __init__(
+        self,
+        num_workers: int,
+        paper_trading: bool = True,
+        alpaca_factory: Optional[Callable[[], Any]] = None,
+        task_timeout_seconds: float = 120.0,
+    ):
+        """
+        Args:
+            num_workers: Number of worker processes
+            paper_trading: Trading mode used by the default data client factory
+            alpaca_factory: Picklable zero-arg callable creating the workers' data client
+            task_timeout_seconds: Deadline for all workers to answer one horizon scan
+        """
+        if num_workers < 1:
+            raise ValueError(f"num_workers must be at least 1, got {num_workers}")
+
+        self.num_workers = num_workers
+        self.alpaca_factory = alpaca_factory or partial(_default_alpaca_factory, paper_trading)
+        self.task_timeout_seconds = task_timeout_seconds
+
+        self._mp = mp.get_context("spawn")
+        self._result_queue = None
+        self._workers: List[_WorkerHandle] = []
+        self._request_ids = itertools.count(1)
+        self._lock = asyncio.Lock()
+        self._running = False
+
+        # Statistics
+        self._requests = 0
+        self._timeouts = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    def start(self) -> None:
+        """Spawn the worker processes"""
+        if self._running:
+            return
+        self._result_queue = self._mp.Queue()
+        self._workers = [self._spawn_worker(worker_id) for worker_id in range(self.num_workers)]
+        self._running = True
+        logger.info(f"[WorkerPool] Started {self.num_workers} analysis worker(s)")
+
+    def _spawn_worker(self, worker_id: int, restarts: int = 0) -> _WorkerHandle:
+        task_queue = self._mp.Queue()
+        process = self._mp.Process(
+            target=_worker_main,
+            args=(worker_id, task_queue, self._result_queue, self.alpaca_factory),
+            name=f"chartsense-bot-worker-{worker_id}",
+            daemon=True,
+        )
+        process.start()
+        return _WorkerHandle(worker_id=worker_id, process=process, task_queue=task_queue, restarts=restarts)
+
+    def _restart_worker(self, worker_id: int) -> None:
+        """
+        Replace a dead or stuck worker with a fresh process and task queue.
+
+        Blocks for the join and the spawn - call it through asyncio.to_thread
+        from the event loop.
+        """
+        handle = self._workers[worker_id]
+        if handle.process.is_alive():
+            handle.process.terminate()
+        handle.process.join(timeout=5)
+        self._workers[worker_id] = self._spawn_worker(worker_id, restarts=handle.restarts + 1)
+        logger.warning(f"[WorkerPool] Restarted worker {worker_id}")
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        """Stop all workers"""
+        if not self._running:
+            return
+        self._running = False
+        for handle in self._workers:
+            try:
+                handle.task_queue.put(None)
+            except (OSError, ValueError):
+                pass
+        for handle in self._workers:
+            handle.process.join(timeout=timeout)
+            if handle.process.is_alive():
+                handle.process.terminate()
+        logger.info("[WorkerPool] All workers stopped")
+
+    async def analyze(
+        self,
+        symbols: List[str],
+        horizon: TradingHorizon,
+        cycle_id: str,
+    ) -> PartitionScanResult:
+        """
+        Analyze symbols for a horizon across all workers.
+
+        Symbols of workers that fail or miss the deadline are returned in
+        failed_symbols so the caller can analyze them itself.
+        """
+        if not self._running:
+            raise RuntimeError("Worker pool is not running")
+
+        # One horizon scan at a time - results are matched by request id
+        async with self._lock:
+            return await self._analyze(symbols, horizon, cycle_id)
+
+    async def _analyze(self, symbols: List[str], horizon: TradingHorizon, cycle_id: str) -> PartitionScanResult:
+        request_id = next(self._request_ids)
+        self._requests += 1
+        partitions = partition_symbols(symbols, self.num_workers)
+
+        pending: Dict[int, List[str]] = {}
+        for worker_id, partition in enumerate(partitions):
+            if not partition:
+                continue
+            handle = self._workers[worker_id]
+            if not handle.process.is_alive():
+                await asyncio.to_thread(self._restart_worker, worker_id)
+                handle = self._workers[worker_id]
+            handle.task_queue.put({
+                "request_id": request_id,
+                "cycle_id": cycle_id,
+                "horizon": horizon.value,
+                "symbols": partition,
+            })
+            pending[worker_id] = partition
+
+        result = PartitionScanResult()
+        loop = asyncio.get_running_loop()
+        deadline = time.monotonic() + self.task_timeout_seconds
+
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                message = await loop.run_in_executor(
+                    None, partial(self._result_queue.get, True, min(remaining, 1.0))
+                )
+            except queue.Empty:
+                # Detect crashed workers early instead of waiting for the deadline
+                for worker_id in list(pending):
+                    if not self._workers[worker_id].process.is_alive():
+                        logger.warning(f"[WorkerPool] Worker {worker_id} died during scan")
+                        result.failed_symbols.extend(pending.pop(worker_id))
+                        await asyncio.to_thread(self._restart_worker, worker_id)
+                continue
+
+            if message["request_id"] != request_id:
+                continue  # Late answer to an earlier, timed-out request
+
+            worker_id = message["worker_id"]
+            if worker_id not in pending:
+                continue
+            del pending[worker_id]
+
+            handle = self._workers[worker_id]
+            handle.tasks_completed += 1
+            handle.last_duration_ms = message["duration_ms"]
+            result.opportunities.extend(message["opportunities"])
+            result.scanned += message["scanned"]
+            result.fetches_saved += message["fetches_saved"]
+            result.failed_symbols.extend(message["failed"])
+            result.symbol_metrics.update(message["symbol_metrics"])
+
+        for worker_id, partition in pending.items():
+            self._timeouts += 1
+            logger.warning(
+                f"[WorkerPool] Worker {worker_id} missed the {self.task_timeout_seconds:.0f}s deadline "
+                f"({len(partition)} symbols) - restarting"
+            )
+            result.failed_symbols.extend(partition)
+            await asyncio.to_thread(self._restart_worker, worker_id)
+
+        return result
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get worker pool status"""
+        return {
+            "running": self._running,
+            "num_workers": self.num_workers,
+            "requests": self._requests,
+            "timeouts": self._timeouts,
+            "workers": [
+                {
+                    "worker_id": h.worker_id,
+                    "alive": h.process.is_alive(),
+                    "pid": h.process.pid,
+                    "tasks_completed": h.tasks_completed,
+                    "restarts": h.restarts,
+                    "last_duration_ms": h.last_duration_ms,
+                    "started_at": h.started_at.isoformat(),
+                }
+                for h in self._workers
+            ],
+        }
@@ -0,0 +1,261 @@
+"""
+Chart and export payloads for backtest and performance results.
+
+A multi-year intraday backtest has hundreds of thousands of equity points
+and thousands of trades - megabytes of JSON that a chart a few hundred
+pixels wide can't show. The API sends a shape-preserving subset instead:
+
+- LTTB (Largest-Triangle-Three-Buckets): one point per bucket, the one
+  forming the largest triangle with its neighbours. Keeps the visual shape
+  with a fixed point count.
+- Min/max bucketing: each bucket's lowest and highest point, in order.
+  Keeps every extreme, so drawdowns are drawn to their true depth.
+
+Both always keep the first and last point. Trade lists are paginated, and
+the full-resolution data stays downloadable as CSV or as a compact NumPy
+.npy file (np.load, no pickle).
+"""
+
+import csv
+import io
+import logging
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Sequence, TypeVar
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Smallest max_points the algorithms accept (first, last and one bucket)
+MIN_POINTS = 3
+
+
+class DownsampleMethod(str, Enum):
+    """Shape-preserving downsampling algorithm"""
+    LTTB = "lttb"
+    MINMAX = "minmax"
+
+
+# ==================== DOWNSAMPLING ====================
+
+def lttb_indices(y: Sequence[float], max_points: int, x: Optional[Sequence[float]] = None) -> np.ndarray:
+    """
+    Indices of the points Largest-Triangle-Three-Buckets keeps.
+
+    Args:
+        y: Values
+        max_points: Points to keep (at least 3)
+        x: Positions of the values (default: evenly spaced, i.e. bar index)
+
+    Returns:
+        Sorted indices into y (all of them if there are max_points or fewer)
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if max_points >= n:
+        return np.arange(n)
+    if max_points < MIN_POINTS:
+        raise ValueError(f"max_points must be at least {MIN_POINTS}")
+    x = np.arange(n, dtype=np.float64) if x is None else np.asarray(x, dtype=np.float64)
+
+    # Interior points split into max_points - 2 buckets; the first and last point are kept as-is
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    previous = 0
+    for bucket in range(max_points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        # Third vertex: the average of the next bucket (the last point for the final bucket)
+        if bucket + 2 < len(edges):
+            next_start, next_end = end, edges[bucket + 2]
+            avg_x, avg_y = x[next_start:next_end].mean(), y[next_start:next_end].mean()
+        else:
+            avg_x, avg_y = x[n - 1], y[n - 1]
+
+        # Twice the triangle area for every candidate in the bucket
+        areas = np.abs(
+            (x[previous] - avg_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+    return selected
+
+
+def minmax_indices(y: Sequence[float], max_points: int) -> np.ndarray:
+    """
+    Indices of each bucket's minimum and maximum (in order), plus the first
+    and last point.
+
+    Args:
+        y: Values
+        max_points: Most points to keep (at least 3)
+
+    Returns:
+        Sorted, unique indices into y
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if max_points >= n:
+        return np.arange(n)
+    if max_points < MIN_POINTS:
+        raise ValueError(f"max_points must be at least {MIN_POINTS}")
+
+    # Each bucket keeps two points; with room for only one interior point,
+    # keep the one LTTB picks (furthest from the line between the ends)
+    num_buckets = (max_points - 2) // 2
+    if num_buckets == 0:
+        return lttb_indices(y, max_points)
+    edges = np.linspace(1, n - 1, num_buckets + 1).astype(np.int64)
+    starts, ends = edges[:-1], edges[1:]
+    keep = [0, n - 1]
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        if end > start:
+            bucket = y[start:end]
+            keep.append(start + int(np.argmin(bucket)))
+            keep.append(start + int(np.argmax(bucket)))
+    return np.unique(np.asarray(keep, dtype=np.int64))
+
+
+def downsample_indices(
+    y: Sequence[float],
+    max_points: Optional[int],
+    method: DownsampleMethod = DownsampleMethod.LTTB,
+) -> np.ndarray:
+    """Indices to keep from y (all of them when max_points is None)"""
+    if max_points is None:
+        return np.arange(len(y))
+    if method == DownsampleMethod.MINMAX:
+        return minmax_indices(y, max_points)
+    return lttb_indices(y, max_points)
+
+
+def downsample(
+    points: Sequence[T],
+    value: Callable[[T], float],
+    max_points: Optional[int],
+    method: DownsampleMethod = DownsampleMethod.LTTB,
+) -> List[T]:
+    """
+    Shape-preserving subset of a series of points.
+
+    Args:
+        points: Points in chronological order
+        value: The charted value of a point (e.g. its equity)
+        max_points: Most points to return (None for all)
+        method: LTTB or min/max bucketing
+
+    Returns:
+        The kept points, in order
+    """
+    if max_points is None or len(points) <= max_points:
+        return list(points)
+    indices = downsample_indices([value(point) for point in points], max_points, method)
+    return [points[i] for i in indices.tolist()]
+
+
+# ==================== PAGINATION ====================
+
+def paginate(items: Sequence[T], page: int = 1, page_size: int = 50) -> Dict[str, Any]:
+    """
+    One page of a list.
+
+    Returns:
+        {items, total_count, page, page_size, total_pages}
+    """
+    if page < 1 or page_size < 1:
+        raise ValueError("page and page_size must be at least 1")
+    offset = (page - 1) * page_size
+    return {
+        "items": list(items[offset:offset + page_size]),
+        "total_count": len(items),
+        "page": page,
+        "page_size": page_size,
+        "total_pages": (len(items) + page_size - 1) // page_size,
+    }
+
+
+def shape_backtest_result(
+    result: Dict[str, Any],
+    max_points: Optional[int] = None,
+    method: DownsampleMethod = DownsampleMethod.LTTB,
+    trades_page: Optional[int] = None,
+    trades_page_size: int = 50,
+) -> Dict[str, Any]:
+    """
+    Downsample a backtest result's equity curve and page its trades.
+
+    Args:
+        result: BacktestResult as a dict (results without an equity curve or
+            trades, like single-symbol summaries, pass through)
+        max_points: Most equity points to keep (None for all)
+        method: Downsampling method
+        trades_page: Trades page to return (None for all trades)
+        trades_page_size: Trades per page
+
+    Returns:
+        A shallow copy with equity_points_total / trades_total set to the
+        full-resolution counts when the lists were cut
+    """
+    shaped = dict(result)
+    curve = result.get("equity_curve")
+    if curve is not None and max_points is not None and len(curve) > max_points:
+        shaped["equity_curve"] = downsample(curve, lambda point: point["equity"], max_points, method)
+        shaped["equity_points_total"] = len(curve)
+    trades = result.get("trades")
+    if trades is not None and trades_page is not None:
+        shaped["trades"] = paginate(trades, trades_page, trades_page_size)["items"]
+        shaped["trades_total"] = len(trades)
+    return shaped
+
+
+# ==================== EXPORT ====================
+
+def to_csv(rows: Sequence[Dict[str, Any]], columns: Optional[List[str]] = None) -> str:
+    """
+    Rows as CSV text with a header line.
+
+    Args:
+        rows: Dicts (e.g. model_dump(mode="json") of equity points or trades)
+        columns: Column order (default: the first row's keys)
+    """
+    if columns is None:
+        columns = list(rows[0]) if rows else []
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore", lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+def _timestamp_ms(value: Any) -> np.datetime64:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        value = value.replace(tzinfo=None) - value.utcoffset()
+    return np.datetime64(value, "ms")
+
+
+def to_npy(
+    rows: Sequence[Dict[str, Any]],
+    value_fields: List[str],
+    time_field: str = "timestamp",
+) -> bytes:
+    """
+    Rows as a NumPy .npy structured array: a datetime64[ms] time column (UTC)
+    plus one float64 column per value field.
+
+    Load with np.load(io.BytesIO(data)) - no pickle needed.
+    """
+    dtype = [(time_field, "datetime64[ms]")] + [(name, np.float64) for name in value_fields]
+    array = np.empty(len(rows), dtype=dtype)
+    array[time_field] = [_timestamp_ms(row[time_field]) for row in rows]
+    for name in value_fields:
+        array[name] = [row[name] if row[name] is not None else np.nan for row in rows]
+    buffer = io.BytesIO()
+    np.save(buffer, array, allow_pickle=False)
+    return buffer.getvalue()
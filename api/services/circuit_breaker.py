@@ -16,6 +16,8 @@ from dataclasses import dataclass
 from datetime import datetime, date, timedelta
 from enum import Enum
 
+from .clock import Clock, SYSTEM_CLOCK
+
 logger = logging.getLogger(__name__)
 
 
@@ -105,6 +107,7 @@ class CircuitBreaker:
         alpaca_service=None,
         exit_manager=None,
         config: Optional[BreakerConfig] = None,
+        clock: Optional[Clock] = None,
     ):
         """
         Initialize circuit breaker.
@@ -113,8 +116,10 @@ class CircuitBreaker:
             alpaca_service: AlpacaService for account queries
             exit_manager: ExitManager for position liquidation
             config: BreakerConfig with thresholds
+            clock: Time source for resets, cooldowns and the monitor loop (default: wall clock)
         """
         self.alpaca = alpaca_service
+        self.clock = clock or SYSTEM_CLOCK
         self.exit_manager = exit_manager
         self.config = config or BreakerConfig()
 
@@ -186,12 +191,12 @@ class CircuitBreaker:
         while self._monitor_running:
             try:
                 await self._check_drawdown()
-                await asyncio.sleep(self._monitor_interval)
+                await self.clock.sleep(self._monitor_interval)
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Error in circuit breaker monitor: {e}")
-                await asyncio.sleep(30)
+                await self.clock.sleep(30)
 
     async def _check_drawdown(self):
         """Check current drawdown levels"""
@@ -223,7 +228,7 @@ class CircuitBreaker:
             BreakerStatus with current state
         """
         self._current_equity = current_equity
-        today = date.today()
+        today = self.clock.today()
 
         # Daily reset
         if self._last_daily_reset != today:
@@ -377,14 +382,14 @@ class CircuitBreaker:
         """Trigger the circuit breaker"""
         self._state = BreakerState.TRIGGERED
         self._trigger_type = trigger_type
-        self._trigger_time = datetime.now()
+        self._trigger_time = self.clock.now()
         self._trigger_message = message
 
         logger.critical(f"🚨 CIRCUIT BREAKER TRIGGERED: {message}")
 
         # Record in history
         self._trigger_history.append({
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": self.clock.now().isoformat(),
             "type": trigger_type.value,
             "message": message,
             "equity": self._current_equity,
@@ -426,7 +431,7 @@ class CircuitBreaker:
 
         cooldown_end = self._trigger_time + timedelta(hours=cooldown_hours)
 
-        if datetime.now() >= cooldown_end:
+        if self.clock.now() >= cooldown_end:
             await self._reset()
 
     async def _reset(self):
@@ -470,7 +475,7 @@ class CircuitBreaker:
         """Manually halt trading"""
         self._state = BreakerState.MANUAL_HALT
         self._trigger_message = reason
-        self._trigger_time = datetime.now()
+        self._trigger_time = self.clock.now()
         logger.warning(f"Manual trading halt: {reason}")
 
     async def manual_resume(self):
@@ -508,7 +513,7 @@ class CircuitBreaker:
                     DrawdownType.TOTAL: self.config.total_cooldown_hours,
                 }.get(self._trigger_type, 24)
                 cooldown_end = self._trigger_time + timedelta(hours=cooldown_hours)
-                remaining = cooldown_end - datetime.now()
+                remaining = cooldown_end - self.clock.now()
                 return False, f"In cooldown ({remaining.total_seconds()/3600:.1f}h remaining)"
             return False, "In cooldown"
 
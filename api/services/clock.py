@@ -0,0 +1,165 @@
+"""
+Clock
+=====
+
+Time source for the trading bot and the services it drives.
+
+The bot, smart scanner, hierarchical strategy, risk manager, exit manager
+and circuit breaker read the time and wait through a Clock instead of
+calling datetime.now() / asyncio.sleep() directly:
+
+- SystemClock: wall time and real sleeps (the default everywhere)
+- VirtualClock: simulated time for historical replay (see services/replay.py)
+
+A VirtualClock only moves when tasks sleep on it. Sleepers are woken in
+wake-time order, and the clock jumps straight to the next wake-up once the
+event loop has gone a few iterations without anything else to run, so an
+hour of the bot sleeping between cycles costs microseconds.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+from datetime import date, datetime, timedelta, timezone, tzinfo
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Event loop iterations a VirtualClock waits for other tasks to settle
+# before it advances to the next wake-up
+DEFAULT_IDLE_HOPS = 16
+
+
+class Clock:
+    """Time source: now(), today() and sleep()"""
+
+    def now(self, tz: Optional[tzinfo] = None) -> datetime:
+        """Current time, with the same semantics as datetime.now(tz)"""
+        raise NotImplementedError
+
+    def today(self) -> date:
+        """Current local date, like date.today()"""
+        return self.now().date()
+
+    def timestamp(self) -> float:
+        """Current time as epoch seconds"""
+        return self.now(timezone.utc).timestamp()
+
+    async def sleep(self, seconds: float) -> None:
+        """Wait, like asyncio.sleep(seconds)"""
+        raise NotImplementedError
+
+
+class SystemClock(Clock):
+    """Wall-clock time and real sleeps"""
+
+    def now(self, tz: Optional[tzinfo] = None) -> datetime:
+        return datetime.now(tz)
+
+    def today(self) -> date:
+        return date.today()
+
+    async def sleep(self, seconds: float) -> None:
+        await asyncio.sleep(seconds)
+
+
+SYSTEM_CLOCK = SystemClock()
+
+
+class VirtualClock(Clock):
+    """
+    Simulated time, advanced by the tasks sleeping on it.
+
+    Usage:
+        clock = VirtualClock(datetime(2024, 3, 4, 13, 0, tzinfo=timezone.utc))
+        bot = TradingBot(alpaca_service=broker, clock=clock, ...)
+        task = asyncio.create_task(bot._main_loop())
+        await clock.sleep_until(end)   # Returns once the bot has run until `end`
+
+    Time only moves forward. Work the tasks do between sleeps takes no
+    simulated time, so results don't depend on how fast the host is.
+
+    Caveat: the clock advances once the event loop has run idle_hops
+    iterations without a new sleeper. A task blocked on real I/O or a
+    thread (rather than on the clock) doesn't hold time back.
+    """
+
+    def __init__(self, start: datetime, idle_hops: int = DEFAULT_IDLE_HOPS):
+        """
+        Args:
+            start: Initial time (naive times are taken as local time, like datetime.now())
+            idle_hops: Event loop iterations to wait before advancing
+        """
+        self._now = start.astimezone(timezone.utc)
+        self.idle_hops = idle_hops
+        self._sleepers: List[Tuple[datetime, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._advance_scheduled = False
+        self._activity = 0
+
+    def now(self, tz: Optional[tzinfo] = None) -> datetime:
+        if tz is None:
+            return self._now.astimezone().replace(tzinfo=None)
+        return self._now.astimezone(tz)
+
+    def timestamp(self) -> float:
+        return self._now.timestamp()
+
+    async def sleep(self, seconds: float) -> None:
+        if seconds <= 0:
+            await asyncio.sleep(0)
+            return
+        await self.sleep_until(self._now + timedelta(seconds=seconds))
+
+    async def sleep_until(self, when: datetime) -> None:
+        """Wait until the clock reaches `when`"""
+        when = when.astimezone(timezone.utc)
+        if when <= self._now:
+            await asyncio.sleep(0)
+            return
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        heapq.heappush(self._sleepers, (when, next(self._sequence), future))
+        self._activity += 1
+        if not self._advance_scheduled:
+            self._advance_scheduled = True
+            loop.call_soon(self._advance, loop, self.idle_hops, self._activity)
+        # A cancelled sleeper's future is cancelled too; _advance skips it
+        await future
+
+    def advance(self, seconds: float) -> None:
+        """Move time forward now, waking every sleeper that comes due (tests)"""
+        self._now += timedelta(seconds=seconds)
+        self._wake_due()
+
+    def _advance(self, loop: asyncio.AbstractEventLoop, hops: int, activity: int) -> None:
+        # New sleepers mean tasks are still running: give them more time to settle
+        if activity != self._activity:
+            loop.call_soon(self._advance, loop, self.idle_hops, self._activity)
+            return
+        if hops > 0:
+            loop.call_soon(self._advance, loop, hops - 1, activity)
+            return
+
+        self._advance_scheduled = False
+        while self._sleepers and self._sleepers[0][2].done():
+            heapq.heappop(self._sleepers)
+        if not self._sleepers:
+            return
+        self._now = max(self._now, self._sleepers[0][0])
+        self._wake_due()
+
+    def _wake_due(self) -> None:
+        while self._sleepers and self._sleepers[0][0] <= self._now:
+            _, _, future = heapq.heappop(self._sleepers)
+            if not future.done():
+                future.set_result(None)
+        # Sleepers left for later: keep the clock moving once the woken tasks settle
+        if self._sleepers and not self._advance_scheduled:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return
+            self._advance_scheduled = True
+            loop.call_soon(self._advance, loop, self.idle_hops, self._activity)
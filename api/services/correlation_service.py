@@ -465,6 +465,53 @@ class CorrelationService:
             for key, _ in sorted_items[:250]:
                 del self._correlation_cache[key]
 
+    # ==================== SNAPSHOT ====================
+
+    def export_state(self) -> Dict[str, Any]:
+        """Export cached correlations for a warm-restart snapshot"""
+        return {
+            "correlations": [
+                {
+                    "symbol_a": pair.symbol_a,
+                    "symbol_b": pair.symbol_b,
+                    "correlation": pair.correlation,
+                    "correlation_type": pair.correlation_type,
+                    "calculated_at": pair.calculated_at.isoformat(),
+                    "lookback_days": pair.lookback_days,
+                }
+                for pair in self._correlation_cache.values()
+            ],
+        }
+
+    def restore_state(self, state: Dict[str, Any]) -> int:
+        """
+        Restore cached correlations from a snapshot, dropping expired entries.
+
+        Returns the number of correlations restored.
+        """
+        restored = 0
+        for data in state.get("correlations", []):
+            try:
+                pair = CorrelationPair(
+                    symbol_a=data["symbol_a"],
+                    symbol_b=data["symbol_b"],
+                    correlation=data["correlation"],
+                    correlation_type=data["correlation_type"],
+                    calculated_at=datetime.fromisoformat(data["calculated_at"]),
+                    lookback_days=data["lookback_days"],
+                )
+            except (KeyError, ValueError) as e:
+                logger.warning(f"Skipping invalid correlation snapshot entry: {e}")
+                continue
+
+            cache_key = self._make_cache_key(pair.symbol_a, pair.symbol_b)
+            self._correlation_cache[cache_key] = pair
+            # Re-check TTL through the normal cache path
+            if self._get_cached_correlation(cache_key):
+                restored += 1
+
+        return restored
+
     # ==================== STATUS ====================
 
     def get_status(self) -> Dict[str, Any]:
@@ -16,6 +16,8 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 
+from .clock import Clock, SYSTEM_CLOCK
+
 logger = logging.getLogger(__name__)
 
 
@@ -113,14 +115,16 @@ class ExitManager:
     6. Manage trailing stops
     """
 
-    def __init__(self, alpaca_service=None):
+    def __init__(self, alpaca_service=None, clock: Optional[Clock] = None):
         """
         Initialize exit manager.
 
         Args:
             alpaca_service: AlpacaService instance for order execution
+            clock: Time source for hold times and the monitor loop (default: wall clock)
         """
         self.alpaca = alpaca_service
+        self.clock = clock or SYSTEM_CLOCK
 
         # Managed positions: symbol -> ManagedPosition
         self._positions: Dict[str, ManagedPosition] = {}
@@ -196,9 +200,10 @@ class ExitManager:
             symbol=symbol,
             quantity=quantity,
             entry_price=entry_price,
-            entry_time=datetime.now(),
+            entry_time=self.clock.now(),
             trade_type=trade_type,
             stop_loss_price=stop_loss_price,
+            original_stop_loss=stop_loss_price,
             take_profit_price=take_profit_price,
             target_2_price=target_2_price,
             entry_signal_score=entry_signal_score,
@@ -291,12 +296,12 @@ class ExitManager:
         while self._monitor_running:
             try:
                 await self._check_all_positions()
-                await asyncio.sleep(self._monitor_interval_seconds)
+                await self.clock.sleep(self._monitor_interval_seconds)
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Error in exit monitor loop: {e}")
-                await asyncio.sleep(5)
+                await self.clock.sleep(5)
 
     async def _check_all_positions(self):
         """Check all positions for exit conditions"""
@@ -446,12 +451,12 @@ class ExitManager:
                     quantity=exit_quantity,
                     entry_price=position.entry_price,
                     exit_price=current_price,
-                    exit_time=datetime.now(),
+                    exit_time=self.clock.now(),
                     exit_reason=ExitReason.PARTIAL_PROFIT,
                     pnl_amount=pnl_amount,
                     pnl_percent=pnl_pct,
                     order_id=result.get("id", ""),
-                    hold_duration_minutes=int((datetime.now() - position.entry_time).total_seconds() / 60),
+                    hold_duration_minutes=int((self.clock.now() - position.entry_time).total_seconds() / 60),
                     metadata={"partial": True, "portion": self.partial_exit_portion},
                 )
                 self._record_exit(exit_event)
@@ -470,7 +475,7 @@ class ExitManager:
 
     async def _check_time_based_exit(self, position: ManagedPosition) -> bool:
         """Check if position should be exited based on hold time"""
-        hold_time = datetime.now() - position.entry_time
+        hold_time = self.clock.now() - position.entry_time
 
         if position.trade_type == "SCALP":
             max_hold = timedelta(minutes=self.scalp_max_hold_minutes)
@@ -529,12 +534,12 @@ class ExitManager:
             quantity=quantity,
             entry_price=position.entry_price,
             exit_price=exit_price,
-            exit_time=datetime.now(),
+            exit_time=self.clock.now(),
             exit_reason=exit_reason,
             pnl_amount=pnl_amount,
             pnl_percent=pnl_pct,
             order_id=position.stop_loss_order_id or "",
-            hold_duration_minutes=int((datetime.now() - position.entry_time).total_seconds() / 60),
+            hold_duration_minutes=int((self.clock.now() - position.entry_time).total_seconds() / 60),
             metadata={
                 "trade_type": position.trade_type,
                 "horizon": position.horizon,
@@ -743,7 +748,7 @@ class ExitManager:
                     "partial_exit_done": p.partial_exit_done,
                     "high_water_mark": p.high_water_mark,
                     "trade_type": p.trade_type,
-                    "hold_minutes": int((datetime.now() - p.entry_time).total_seconds() / 60),
+                    "hold_minutes": int((self.clock.now() - p.entry_time).total_seconds() / 60),
                 }
                 for p in self._positions.values()
             ],
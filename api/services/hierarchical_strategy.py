@@ -23,6 +23,8 @@ from enum import Enum
 from datetime import datetime, timedelta
 import asyncio
 
+from .clock import Clock, SYSTEM_CLOCK
+
 logger = logging.getLogger(__name__)
 
 
@@ -111,7 +113,13 @@ class HierarchicalStrategy:
     "What's the best opportunity available RIGHT NOW?"
     """
 
-    def __init__(self):
+    def __init__(self, clock: Optional[Clock] = None):
+        """
+        Args:
+            clock: Time source for scan intervals, validity and the daily goal (default: wall clock)
+        """
+        self.clock = clock or SYSTEM_CLOCK
+
         # Score thresholds for each horizon
         # Scan intervals based on trade type (user requested):
         # - Scalp: 60 seconds (fast, short-term trades)
@@ -223,7 +231,7 @@ class HierarchicalStrategy:
 
         # Daily tracking
         self.daily_goal = DailyTradingGoal(
-            date=datetime.now().strftime("%Y-%m-%d"),
+            date=self.clock.now().strftime("%Y-%m-%d"),
             target_profit_pct=0.5,  # 0.5% daily goal
             achieved_profit_pct=0.0,
             trades_taken=0,
@@ -267,7 +275,7 @@ class HierarchicalStrategy:
            - Swing: 10 minutes (600 seconds)
            - Long: 30 minutes (1800 seconds)
         """
-        now = datetime.now()
+        now = self.clock.now()
 
         # Reset exhausted flags based on time (using scan_interval_seconds)
         for horizon, last_time in self.last_scan_time.items():
@@ -292,9 +300,14 @@ class HierarchicalStrategy:
     def mark_horizon_exhausted(self, horizon: TradingHorizon):
         """Mark a horizon as scanned with no good opportunities"""
         self.horizon_exhausted[horizon] = True
-        self.last_scan_time[horizon] = datetime.now()
+        self.last_scan_time[horizon] = self.clock.now()
         logger.info(f"Horizon {horizon.value} exhausted - cascading to next")
 
+    def force_horizon(self, horizon: TradingHorizon):
+        """Focus the cascade on one horizon by marking every other one exhausted"""
+        self.horizon_exhausted = {h: h != horizon for h in TradingHorizon}
+        logger.info(f"Horizon forced to {horizon.value}")
+
     def get_scan_interval_seconds(self, horizon: TradingHorizon) -> int:
         """Get the scan interval in seconds for a given horizon.
 
@@ -314,7 +327,7 @@ class HierarchicalStrategy:
         interval_seconds = self.get_scan_interval_seconds(horizon)
         next_scan = self.last_scan_time[horizon] + timedelta(seconds=interval_seconds)
 
-        if datetime.now() >= next_scan:
+        if self.clock.now() >= next_scan:
             return None  # Ready to scan now
         return next_scan
 
@@ -324,7 +337,7 @@ class HierarchicalStrategy:
         if next_scan is None:
             return 0
 
-        delta = (next_scan - datetime.now()).total_seconds()
+        delta = (next_scan - self.clock.now()).total_seconds()
         return max(0, int(delta))
 
     def evaluate_opportunity(
@@ -565,7 +578,7 @@ class HierarchicalStrategy:
             TradingHorizon.INTRADAY: 4,
             TradingHorizon.SCALP: 0.5,
         }
-        valid_until = datetime.now() + timedelta(hours=validity_hours[horizon])
+        valid_until = self.clock.now() + timedelta(hours=validity_hours[horizon])
 
         return TradingOpportunity(
             symbol=symbol,
@@ -592,6 +605,7 @@ class HierarchicalStrategy:
             confirmation_timeframe=self.timeframe_configs[horizon]["momentum"],
             entry_timeframe=self.timeframe_configs[horizon]["entry"],
             valid_until=valid_until,
+            detected_at=self.clock.now(),
         )
 
     def _calculate_trend_score(self, indicators: Dict, horizon: TradingHorizon) -> float:
@@ -882,7 +896,7 @@ class HierarchicalStrategy:
 
     def update_daily_goal(self, trade_pnl_pct: float, horizon: TradingHorizon):
         """Update daily goal tracking after a trade"""
-        today = datetime.now().strftime("%Y-%m-%d")
+        today = self.clock.now().strftime("%Y-%m-%d")
 
         # Reset if new day
         if self.daily_goal.date != today:
@@ -948,6 +962,38 @@ class HierarchicalStrategy:
             },
         }
 
+    def export_state(self) -> Dict[str, Any]:
+        """Export cascade position and daily goal for a warm-restart snapshot"""
+        return {
+            "current_horizon": self.current_horizon.value,
+            "horizon_exhausted": {h.value: v for h, v in self.horizon_exhausted.items()},
+            "last_scan_time": {h.value: t.isoformat() for h, t in self.last_scan_time.items()},
+            "daily_goal": {
+                "date": self.daily_goal.date,
+                "target_profit_pct": self.daily_goal.target_profit_pct,
+                "achieved_profit_pct": self.daily_goal.achieved_profit_pct,
+                "trades_taken": self.daily_goal.trades_taken,
+                "wins": self.daily_goal.wins,
+                "losses": self.daily_goal.losses,
+                "best_trade_pct": self.daily_goal.best_trade_pct,
+                "worst_trade_pct": self.daily_goal.worst_trade_pct,
+                "horizons_used": self.daily_goal.horizons_used,
+                "goal_achieved": self.daily_goal.goal_achieved,
+            },
+        }
+
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        """Restore cascade position from a snapshot; the daily goal only if it is for today"""
+        self.current_horizon = TradingHorizon(state.get("current_horizon", self.current_horizon.value))
+        for horizon_value, exhausted in state.get("horizon_exhausted", {}).items():
+            self.horizon_exhausted[TradingHorizon(horizon_value)] = exhausted
+        for horizon_value, scanned_at in state.get("last_scan_time", {}).items():
+            self.last_scan_time[TradingHorizon(horizon_value)] = datetime.fromisoformat(scanned_at)
+
+        goal = state.get("daily_goal")
+        if goal and goal.get("date") == self.clock.now().strftime("%Y-%m-%d"):
+            self.daily_goal = DailyTradingGoal(**goal)
+
 
 # Singleton instance
 _hierarchical_strategy: Optional[HierarchicalStrategy] = None
@@ -0,0 +1,224 @@
+"""
+Vectorized Monte Carlo Simulation
+=================================
+
+Resamples a backtest's trade sequence many times to estimate how much of
+its Sharpe ratio and drawdown is down to trade ordering or luck.
+
+Each chunk of simulations is one (simulations x trades) matrix: the
+resampled P&L (or return) paths are built with NumPy indexing, and the
+equity paths, Sharpe ratios and max drawdowns are computed with array ops
+along the trade axis. Only three numbers per simulation are kept, so
+memory stays bounded by the chunk size however many simulations run.
+
+Methods:
+- permutation: shuffle trade order (same trades, different path)
+- bootstrap: draw trades with replacement
+- block_bootstrap: draw runs of consecutive trades with replacement, which
+  keeps streaks and regime clustering intact
+- return_bootstrap: draw per-trade returns with replacement and compound
+  them, so trade size scales with the simulated equity
+
+Chunks can run on several processes. Every chunk seeds its own generator
+from (seed, chunk index), so results are identical for any worker count.
+"""
+
+import logging
+import math
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from functools import partial
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on (simulations x trades) elements per chunk matrix
+MAX_CHUNK_ELEMENTS = 2_000_000
+
+TRADING_DAYS = 252
+
+
+class MonteCarloMethod(str, Enum):
+    """How simulated trade sequences are drawn"""
+    PERMUTATION = "permutation"
+    BOOTSTRAP = "bootstrap"
+    BLOCK_BOOTSTRAP = "block_bootstrap"
+    RETURN_BOOTSTRAP = "return_bootstrap"
+
+
+@dataclass
+class MonteCarloDistribution:
+    """Per-simulation outcomes, one entry per simulation"""
+    sharpes: np.ndarray
+    max_drawdowns: np.ndarray  # Fractions, e.g. 0.12 = 12%
+    final_pnls: np.ndarray
+
+
+def default_block_size(num_trades: int) -> int:
+    """Block length for the block bootstrap (about the square root of the sample)"""
+    return max(1, int(round(math.sqrt(num_trades))))
+
+
+def chunk_sizes(num_simulations: int, num_trades: int, chunk_size: Optional[int] = None) -> List[int]:
+    """
+    Split simulations into chunks that fit the element budget.
+
+    Only depends on the simulation and trade counts, never on the worker
+    count - chunk boundaries decide the random streams.
+    """
+    rows = chunk_size or max(1, MAX_CHUNK_ELEMENTS // max(num_trades, 1))
+    full, rest = divmod(num_simulations, rows)
+    return [rows] * full + ([rest] if rest else [])
+
+
+def path_metrics(pnl_paths: np.ndarray, initial_capital: float) -> MonteCarloDistribution:
+    """
+    Sharpe, max drawdown and final P&L for each row of additive P&L paths.
+
+    Same definitions as WalkForwardBacktester._calculate_sharpe_from_trades
+    and _calculate_max_drawdown, applied to all rows at once.
+    """
+    equity = initial_capital + np.cumsum(pnl_paths, axis=1)
+    previous = np.empty_like(equity)
+    previous[:, 0] = initial_capital
+    previous[:, 1:] = equity[:, :-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = pnl_paths / previous
+    return _metrics(returns, equity, initial_capital)
+
+
+def return_path_metrics(return_paths: np.ndarray, initial_capital: float) -> MonteCarloDistribution:
+    """Sharpe, max drawdown and final P&L for each row of compounded return paths."""
+    equity = initial_capital * np.cumprod(1 + return_paths, axis=1)
+    return _metrics(return_paths, equity, initial_capital)
+
+
+def _metrics(returns: np.ndarray, equity: np.ndarray, initial_capital: float) -> MonteCarloDistribution:
+    num_sims, num_trades = returns.shape
+    if num_trades < 2:
+        sharpes = np.zeros(num_sims)
+    else:
+        mean = returns.mean(axis=1)
+        std = returns.std(axis=1, ddof=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sharpes = np.where(std > 0, (mean * TRADING_DAYS) / (std * math.sqrt(TRADING_DAYS)), 0.0)
+
+    # Peak includes the starting capital
+    peaks = np.maximum(np.maximum.accumulate(equity, axis=1), initial_capital)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdowns = np.where(peaks > 0, (peaks - equity) / peaks, 0.0)
+    max_drawdowns = np.maximum(drawdowns.max(axis=1), 0.0) if num_trades else np.zeros(num_sims)
+
+    final_pnls = (equity[:, -1] - initial_capital) if num_trades else np.zeros(num_sims)
+    return MonteCarloDistribution(sharpes=sharpes, max_drawdowns=max_drawdowns, final_pnls=final_pnls)
+
+
+def trade_returns(pnls: np.ndarray, initial_capital: float) -> np.ndarray:
+    """Per-trade returns relative to the equity before each trade (original order)."""
+    previous = initial_capital + np.concatenate(([0.0], np.cumsum(pnls)[:-1]))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(previous > 0, pnls / previous, 0.0)
+
+
+def _resample_indices(
+    rng: np.random.Generator,
+    method: MonteCarloMethod,
+    rows: int,
+    num_trades: int,
+    block_size: int,
+) -> np.ndarray:
+    """(rows x num_trades) indices into the trade list"""
+    if method == MonteCarloMethod.PERMUTATION:
+        return rng.permuted(np.broadcast_to(np.arange(num_trades), (rows, num_trades)), axis=1)
+
+    if method == MonteCarloMethod.BLOCK_BOOTSTRAP:
+        # Circular blocks so trades near the end are drawn as often as the rest
+        num_blocks = -(-num_trades // block_size)
+        starts = rng.integers(0, num_trades, size=(rows, num_blocks, 1))
+        indices = (starts + np.arange(block_size)) % num_trades
+        return indices.reshape(rows, num_blocks * block_size)[:, :num_trades]
+
+    # BOOTSTRAP and RETURN_BOOTSTRAP
+    return rng.integers(0, num_trades, size=(rows, num_trades))
+
+
+def _simulate_chunk(
+    chunk_index: int,
+    rows: int,
+    pnls: np.ndarray,
+    initial_capital: float,
+    method: MonteCarloMethod,
+    seed: int,
+    block_size: int,
+) -> MonteCarloDistribution:
+    """Run one chunk of simulations (also the worker-process entry point)"""
+    rng = np.random.default_rng([seed, chunk_index])
+    indices = _resample_indices(rng, method, rows, len(pnls), block_size)
+
+    if method == MonteCarloMethod.RETURN_BOOTSTRAP:
+        return return_path_metrics(trade_returns(pnls, initial_capital)[indices], initial_capital)
+    return path_metrics(pnls[indices], initial_capital)
+
+
+def simulate(
+    pnls: Sequence[float],
+    initial_capital: float,
+    num_simulations: int,
+    method: MonteCarloMethod = MonteCarloMethod.PERMUTATION,
+    seed: int = 0,
+    block_size: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    workers: int = 1,
+) -> MonteCarloDistribution:
+    """
+    Run a Monte Carlo simulation over a trade P&L sequence.
+
+    Args:
+        pnls: Per-trade P&L in the backtest's order
+        initial_capital: Starting capital of every path
+        num_simulations: Number of simulated paths
+        method: Resampling method
+        seed: Base seed; results are identical for any worker count
+        block_size: Block length for block_bootstrap (default: sqrt(trades))
+        chunk_size: Simulations per chunk (default: fit MAX_CHUNK_ELEMENTS)
+        workers: Processes to spread chunks over (1 = in this process)
+
+    Returns:
+        MonteCarloDistribution with one entry per simulation
+    """
+    pnls = np.asarray(pnls, dtype=np.float64)
+    method = MonteCarloMethod(method)
+    block_size = block_size or default_block_size(len(pnls))
+    sizes = chunk_sizes(num_simulations, len(pnls), chunk_size)
+
+    run_chunk = partial(
+        _simulate_chunk,
+        pnls=pnls,
+        initial_capital=initial_capital,
+        method=method,
+        seed=seed,
+        block_size=block_size,
+    )
+
+    if workers > 1 and len(sizes) > 1:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(sizes)),
+            mp_context=mp.get_context("spawn"),
+        ) as pool:
+            chunks = list(pool.map(run_chunk, range(len(sizes)), sizes))
+    else:
+        chunks = [run_chunk(index, rows) for index, rows in enumerate(sizes)]
+
+    if not chunks:
+        empty = np.zeros(0)
+        return MonteCarloDistribution(sharpes=empty, max_drawdowns=empty, final_pnls=empty)
+
+    return MonteCarloDistribution(
+        sharpes=np.concatenate([c.sharpes for c in chunks]),
+        max_drawdowns=np.concatenate([c.max_drawdowns for c in chunks]),
+        final_pnls=np.concatenate([c.final_pnls for c in chunks]),
+    )
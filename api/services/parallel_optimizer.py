@@ -0,0 +1,478 @@
+"""
+Parallel Walk-Forward Parameter Optimizer
+=========================================
+
+Fans walk-forward work out across a process pool instead of running it
+serially in the request thread, in one of two shapes:
+- ParallelParamOptimizer: the grid search (every parameter combination x
+  every training window) in chunks; the test backtests stay serial.
+- ParallelWindowRunner: whole windows (optimize, then test) per task.
+  Used when there are at least as many windows as workers, and for
+  adaptive searches, which can't be split within a window.
+
+Data sharing:
+- The OHLCV and ATR series are written once into a single shared memory
+  block. Workers attach to it by name when they start and slice their
+  windows out of it, so tasks only carry window bounds (and combination
+  indices) - the price arrays are never pickled per task.
+
+Determinism:
+- Every backtest draws its slippage noise from its own RNG derived from
+  (seed, window, combination or search key), the best combination per
+  window is picked in combination order after all results are in, and
+  windows are aggregated in window order. The result is therefore
+  identical for any worker count and any completion order.
+
+Progress:
+- An OptimizationProgress is updated as chunks and windows complete and
+  handed to an optional callback. Finished windows are listed with their
+  Sharpe ratios, so a caller can report per-window completion.
+"""
+
+import logging
+import math
+import multiprocessing as mp
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Column order of the shared price block
+PRICE_COLUMNS = ("open", "high", "low", "close", "volume", "atr")
+
+
+@dataclass
+class OptimizationProgress:
+    """Progress of a parameter search (one task = one backtest)"""
+    total_tasks: int
+    completed_tasks: int = 0
+    workers: int = 1
+    started_at: float = field(default_factory=time.monotonic)
+    total_windows: int = 0
+    windows: Dict[int, Dict[str, Any]] = field(default_factory=dict)  # Finished windows by index
+
+    @property
+    def percent(self) -> float:
+        return self.completed_tasks / self.total_tasks * 100 if self.total_tasks else 100.0
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        if not self.completed_tasks:
+            return None
+        elapsed = time.monotonic() - self.started_at
+        return elapsed / self.completed_tasks * (self.total_tasks - self.completed_tasks)
+
+    @property
+    def completed_windows(self) -> int:
+        return len(self.windows)
+
+    def window_done(self, index: int, window: Any) -> None:
+        """Record a finished WalkForwardWindow"""
+        self.windows[index] = {
+            "window": index,
+            "train_sharpe": round(window.train_performance, 3),
+            "test_sharpe": round(window.test_performance, 3),
+            "trades": len(window.trades),
+            "params": window.optimal_params,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        eta = self.eta_seconds
+        return {
+            "total_tasks": self.total_tasks,
+            "completed_tasks": self.completed_tasks,
+            "percent": round(self.percent, 1),
+            "eta_seconds": round(eta, 1) if eta is not None else None,
+            "workers": self.workers,
+            "total_windows": self.total_windows,
+            "completed_windows": self.completed_windows,
+            "windows": [self.windows[index] for index in sorted(self.windows)],
+        }
+
+
+ProgressCallback = Callable[[OptimizationProgress], None]
+
+
+class SharedPriceArrays:
+    """
+    OHLCV + ATR series in one shared memory block.
+
+    The creating process owns the block and must call unlink(); attached
+    processes only close() their mapping.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, num_bars: int, has_atr: bool, owner: bool):
+        self._shm = shm
+        self.num_bars = num_bars
+        self.has_atr = has_atr
+        self._owner = owner
+        self.array = np.ndarray((len(PRICE_COLUMNS), num_bars), dtype=np.float64, buffer=shm.buf)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @classmethod
+    def create(
+        cls,
+        opens: Sequence[float],
+        highs: Sequence[float],
+        lows: Sequence[float],
+        closes: Sequence[float],
+        volumes: Sequence[float],
+        atrs: Optional[Sequence[float]],
+    ) -> "SharedPriceArrays":
+        num_bars = len(closes)
+        size = max(1, len(PRICE_COLUMNS) * num_bars * np.dtype(np.float64).itemsize)
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        shared = cls(shm, num_bars, has_atr=bool(atrs), owner=True)
+        for row, series in enumerate((opens, highs, lows, closes, volumes)):
+            shared.array[row] = series
+        shared.array[5] = atrs if atrs else 0.0
+        return shared
+
+    @classmethod
+    def attach(cls, name: str, num_bars: int, has_atr: bool) -> "SharedPriceArrays":
+        return cls(shared_memory.SharedMemory(name=name), num_bars, has_atr, owner=False)
+
+    def window(self, start: int, end: int) -> Tuple[List[float], ...]:
+        """
+        Series for bars [start, end) as plain lists.
+
+        Strategy functions index bar by bar, which is much cheaper on lists
+        than on numpy scalars. ATR is None when it wasn't available.
+        """
+        columns = [self.array[row, start:end].tolist() for row in range(5)]
+        atrs = self.array[5, start:end].tolist() if self.has_atr else None
+        return (*columns, atrs)
+
+    def columns(self) -> Tuple[Optional[np.ndarray], ...]:
+        """Full series as read-only views of the block (ATR None when unavailable)"""
+        views = [self.array[row] for row in range(len(PRICE_COLUMNS))]
+        for view in views:
+            view.flags.writeable = False
+        return (*views[:5], views[5] if self.has_atr else None)
+
+    def close(self) -> None:
+        # Drop the numpy view first - the buffer can't close while exported
+        self.array = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+# ==================== WORKER PROCESS ====================
+
+# Per-process state set up once by the pool initializer
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(
+    shm_name: str,
+    num_bars: int,
+    has_atr: bool,
+    strategy_func: Callable,
+    param_combos: List[Dict[str, Any]],
+    slippage_config: Any,
+    intrabar_exits: Any,
+    initial_capital: float,
+    seed: int,
+    search: Any = None,
+    space: Any = None,
+    window_budget: Any = None,
+) -> None:
+    """Pool initializer: attach to the shared prices and build a backtester"""
+    # Imported here to avoid a circular import with walk_forward_backtester
+    from .walk_forward_backtester import SeriesSides, WalkForwardBacktester
+
+    backtester = WalkForwardBacktester()
+    backtester.slippage_config = slippage_config
+    backtester.intrabar_exits = intrabar_exits
+    prices = SharedPriceArrays.attach(shm_name, num_bars, has_atr)
+    # Views, not lists: whole-window runs copy just the window they work on
+    series = prices.columns()
+    _worker_state.update({
+        "prices": prices,
+        "series": series,
+        "series_sides": SeriesSides(strategy_func, *series[:5]),
+        "backtester": backtester,
+        "strategy_func": strategy_func,
+        "param_combos": param_combos,
+        "search": search,
+        "space": space,
+        "window_budget": window_budget,
+        "initial_capital": initial_capital,
+        "seed": seed,
+        "windows": {},
+    })
+
+
+def _run_chunk(window_index: int, start: int, end: int, combo_indices: List[int]) -> Tuple[int, List[Tuple[int, float]]]:
+    """Backtest a chunk of combinations on one training window"""
+    from .walk_forward_backtester import task_rng
+
+    state = _worker_state
+    series = state["windows"].get(window_index)
+    if series is None:
+        series = state["windows"][window_index] = state["prices"].window(start, end)
+
+    backtester = state["backtester"]
+    results = []
+    for combo_index in combo_indices:
+        params = state["param_combos"][combo_index]
+        result = backtester._run_single_backtest(
+            *series,
+            state["strategy_func"],
+            params,
+            state["initial_capital"],
+            rng=task_rng(state["seed"], window_index, combo_index),
+            sides=state["series_sides"].window(params, start, end),
+        )
+        results.append((combo_index, result["sharpe"]))
+    return window_index, results
+
+
+def _run_window(bounds: Tuple[int, int, int, int, int]) -> Tuple[int, Any, int]:
+    """Optimize and test one whole window; returns (window_index, WalkForwardWindow, backtests run)"""
+    state = _worker_state
+    progress = OptimizationProgress(total_tasks=0)
+    window = state["backtester"]._run_window(
+        *state["series"],
+        state["series_sides"],
+        bounds,
+        state["strategy_func"],
+        state["initial_capital"],
+        state["seed"],
+        param_combos=state["param_combos"],
+        search=state["search"],
+        space=state["space"],
+        window_budget=state["window_budget"],
+        progress=progress,
+    )
+    return bounds[0], window, progress.completed_tasks
+
+
+# ==================== COORDINATOR SIDE ====================
+
+class ParallelParamOptimizer:
+    """
+    Grid search over all walk-forward training windows on a process pool.
+
+    Usage:
+        optimizer = ParallelParamOptimizer(backtester, workers=4)
+        best = optimizer.optimize(opens, highs, lows, closes, volumes, atrs,
+                                  windows, strategy_func, param_combos, 10000, seed=42)
+    """
+
+    def __init__(self, backtester: Any, workers: int, chunks_per_worker: int = 4):
+        """
+        Args:
+            backtester: WalkForwardBacktester whose slippage and exit settings the workers use
+            workers: Number of worker processes
+            chunks_per_worker: Tasks are batched into about this many chunks per
+                worker, trading scheduling overhead against load balance
+        """
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}")
+        self.backtester = backtester
+        self.workers = workers
+        self.chunks_per_worker = chunks_per_worker
+
+    @staticmethod
+    def can_pickle(strategy_func: Callable) -> bool:
+        """Strategy functions (and searches) must be importable, not closures, to reach the workers"""
+        try:
+            pickle.dumps(strategy_func)
+            return True
+        except (pickle.PicklingError, AttributeError, TypeError):
+            return False
+
+    def optimize(
+        self,
+        opens: Sequence[float],
+        highs: Sequence[float],
+        lows: Sequence[float],
+        closes: Sequence[float],
+        volumes: Sequence[float],
+        atrs: Optional[Sequence[float]],
+        windows: List[Tuple[int, int, int]],
+        strategy_func: Callable,
+        param_combos: List[Dict[str, Any]],
+        initial_capital: float,
+        seed: int,
+        progress: Optional[OptimizationProgress] = None,
+        progress_callback: Optional[ProgressCallback] = None,
+    ) -> Dict[int, Tuple[Dict[str, Any], float]]:
+        """
+        Find the best parameters for every training window.
+
+        Args:
+            opens, highs, lows, closes, volumes, atrs: Full price series
+            windows: (window_index, train_start, train_end) per window
+            strategy_func: Picklable signal function
+            param_combos: Combinations to evaluate, in tie-break order
+            initial_capital: Starting capital per backtest
+            seed: Base seed for the per-task slippage RNGs
+            progress: Progress object to update (created if not given)
+            progress_callback: Called with the progress after each chunk
+
+        Returns:
+            {window_index: (best_params, best_sharpe)}
+        """
+        combo_count = len(param_combos)
+        progress = progress or OptimizationProgress(total_tasks=len(windows) * combo_count)
+        progress.workers = self.workers
+
+        chunk_size = max(1, math.ceil(len(windows) * combo_count / (self.workers * self.chunks_per_worker)))
+        tasks = [
+            (window_index, start, end, list(range(first, min(first + chunk_size, combo_count))))
+            for window_index, start, end in windows
+            for first in range(0, combo_count, chunk_size)
+        ]
+
+        sharpes: Dict[int, List[float]] = {w[0]: [0.0] * combo_count for w in windows}
+        prices = SharedPriceArrays.create(opens, highs, lows, closes, volumes, atrs)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=mp.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(
+                    prices.name, prices.num_bars, prices.has_atr, strategy_func,
+                    param_combos, self.backtester.slippage_config, self.backtester.intrabar_exits,
+                    initial_capital, seed,
+                ),
+            ) as pool:
+                futures = [pool.submit(_run_chunk, *task) for task in tasks]
+                for future in as_completed(futures):
+                    window_index, results = future.result()
+                    for combo_index, sharpe in results:
+                        sharpes[window_index][combo_index] = sharpe
+                    progress.completed_tasks += len(results)
+                    if progress_callback:
+                        progress_callback(progress)
+        finally:
+            prices.close()
+
+        # Same selection as the serial search: first combination with the highest Sharpe
+        best: Dict[int, Tuple[Dict[str, Any], float]] = {}
+        for window_index, window_sharpes in sharpes.items():
+            best_sharpe = -float('inf')
+            best_params: Dict[str, Any] = {}
+            for params, sharpe in zip(param_combos, window_sharpes):
+                if sharpe > best_sharpe:
+                    best_sharpe = sharpe
+                    best_params = params
+            best[window_index] = (best_params, best_sharpe)
+
+        logger.info(
+            f"[ParallelOptimizer] {progress.total_tasks} backtests across {len(windows)} windows "
+            f"on {self.workers} workers in {time.monotonic() - progress.started_at:.1f}s"
+        )
+        return best
+
+
+
+class ParallelWindowRunner:
+    """
+    Whole walk-forward windows (optimize, then test) on a process pool.
+
+    Usage:
+        runner = ParallelWindowRunner(backtester, workers=4)
+        windows = runner.run(opens, highs, lows, closes, volumes, atrs,
+                             bounds, strategy_func, 10000, seed=42, search=TPESearch(),
+                             space=space, window_budget=budget)
+    """
+
+    def __init__(self, backtester: Any, workers: int):
+        """
+        Args:
+            backtester: WalkForwardBacktester whose slippage and exit settings the workers use
+            workers: Number of worker processes (capped at the number of windows)
+        """
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}")
+        self.backtester = backtester
+        self.workers = workers
+
+    def run(
+        self,
+        opens: Sequence[float],
+        highs: Sequence[float],
+        lows: Sequence[float],
+        closes: Sequence[float],
+        volumes: Sequence[float],
+        atrs: Optional[Sequence[float]],
+        bounds: List[Tuple[int, int, int, int, int]],
+        strategy_func: Callable,
+        initial_capital: float,
+        seed: int,
+        param_combos: Optional[List[Dict[str, Any]]] = None,
+        search: Any = None,
+        space: Any = None,
+        window_budget: Any = None,
+        progress: Optional[OptimizationProgress] = None,
+        progress_callback: Optional[ProgressCallback] = None,
+    ) -> Dict[int, Any]:
+        """
+        Run every window.
+
+        Args:
+            opens, highs, lows, closes, volumes, atrs: Full price series
+            bounds: (window_index, train_start, train_end, test_start, test_end) per window
+            strategy_func: Picklable signal function
+            initial_capital: Starting capital per backtest
+            seed: Base seed for the per-task RNGs
+            param_combos: Grid combinations (when no search is given)
+            search, space, window_budget: Picklable search, its space and per-window budget
+            progress: Progress object to update (created if not given)
+            progress_callback: Called with the progress after each window
+
+        Returns:
+            {window_index: WalkForwardWindow}
+        """
+        workers = min(self.workers, len(bounds))
+        progress = progress or OptimizationProgress(total_tasks=0, total_windows=len(bounds))
+        progress.workers = workers
+
+        windows: Dict[int, Any] = {}
+        prices = SharedPriceArrays.create(opens, highs, lows, closes, volumes, atrs)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=mp.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(
+                    prices.name, prices.num_bars, prices.has_atr, strategy_func,
+                    param_combos, self.backtester.slippage_config, self.backtester.intrabar_exits,
+                    initial_capital, seed, search, space, window_budget,
+                ),
+            ) as pool:
+                futures = [pool.submit(_run_window, window_bounds) for window_bounds in bounds]
+                try:
+                    for future in as_completed(futures):
+                        window_index, window, backtests = future.result()
+                        windows[window_index] = window
+                        progress.completed_tasks += backtests
+                        progress.window_done(window_index, window)
+                        if progress_callback:
+                            progress_callback(progress)
+                except BaseException:
+                    # Don't start queued windows on the way out (e.g. a cancelled job)
+                    for future in futures:
+                        future.cancel()
+                    raise
+        finally:
+            prices.close()
+
+        logger.info(
+            f"[ParallelWindowRunner] {len(bounds)} windows ({progress.completed_tasks} backtests) "
+            f"on {workers} workers in {time.monotonic() - progress.started_at:.1f}s"
+        )
+        return windows
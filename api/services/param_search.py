@@ -0,0 +1,532 @@
+"""
+Parameter Search Strategies
+===========================
+
+Pluggable ways of choosing which parameter sets to backtest. The full
+Cartesian product of a few parameters with three values each is already
+in the hundreds of thousands, so the walk-forward optimizer and the
+auto-optimizer's weight search hand a SearchSpace and an objective to one
+of these instead of enumerating everything.
+
+Searches:
+- GridSearch: the Cartesian product in order (first key varies slowest)
+- RandomSearch: independent samples from the space
+- SuccessiveHalving: many candidates scored on a short slice of the data,
+  the best 1/eta promoted to eta-times longer slices until the survivors
+  are scored on all of it
+- TPESearch: Tree-structured Parzen Estimator - after random warm-up,
+  samples where good results were dense relative to bad ones
+
+Objective:
+- objective(params, fidelity) -> score, higher is better. fidelity is the
+  fraction of the data to score on (1.0 = all of it); only
+  SuccessiveHalving asks for less than 1.0.
+
+Budget:
+- SearchBudget caps evaluations, counted in full-data equivalents (a
+  scoring on 1/9 of the data costs 1/9), and wall-clock seconds. An
+  evaluation isn't started if it would overrun either, so a nightly
+  optimization finishes in a fixed time with the best result found so far.
+"""
+
+import itertools
+import logging
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Decimal places kept for normalized weight vectors
+WEIGHT_DECIMALS = 3
+
+Objective = Callable[[Dict[str, Any], float], float]
+
+
+# ==================== SEARCH SPACE ====================
+
+
+@dataclass(frozen=True)
+class Choice:
+    """A parameter taking one of a fixed list of values"""
+    values: Tuple[Any, ...]
+
+    def sample(self, rng: random.Random) -> Any:
+        return rng.choice(self.values)
+
+    def grid(self, resolution: int) -> List[Any]:
+        return list(self.values)
+
+
+@dataclass(frozen=True)
+class Uniform:
+    """A continuous parameter in [low, high]"""
+    low: float
+    high: float
+
+    def sample(self, rng: random.Random) -> float:
+        return rng.uniform(self.low, self.high)
+
+    def grid(self, resolution: int) -> List[float]:
+        if resolution <= 1:
+            return [(self.low + self.high) / 2]
+        step = (self.high - self.low) / (resolution - 1)
+        return [self.low + step * i for i in range(resolution)]
+
+
+Dimension = Union[Choice, Uniform]
+
+
+class SearchSpace:
+    """
+    Named dimensions to search over.
+
+    With normalize=True the dimensions are weights: every point is scaled
+    to sum to 1 before it's evaluated (StrategyEngine weight vectors).
+    """
+
+    def __init__(self, dimensions: Dict[str, Dimension], normalize: bool = False):
+        self.dimensions = dimensions
+        self.normalize = normalize
+
+    @classmethod
+    def from_ranges(cls, param_ranges: Dict[str, Sequence]) -> "SearchSpace":
+        """Space of discrete values, as in WalkForwardBacktester.param_ranges"""
+        return cls({name: Choice(tuple(values)) for name, values in param_ranges.items()})
+
+    @classmethod
+    def weights(cls, names: Iterable[str], low: float = 0.0, high: float = 1.0) -> "SearchSpace":
+        """Space of weight vectors summing to 1"""
+        return cls({name: Uniform(low, high) for name in names}, normalize=True)
+
+    def sample(self, rng: random.Random) -> Dict[str, Any]:
+        return {name: dim.sample(rng) for name, dim in self.dimensions.items()}
+
+    def grid(self, resolution: int = 3) -> Iterable[Dict[str, Any]]:
+        """Grid points in product order (first dimension varies slowest)"""
+        names = list(self.dimensions)
+        axes = [self.dimensions[name].grid(resolution) for name in names]
+        return (dict(zip(names, values)) for values in itertools.product(*axes))
+
+    def grid_size(self, resolution: int = 3) -> int:
+        return math.prod(len(dim.grid(resolution)) for dim in self.dimensions.values())
+
+    @property
+    def size(self) -> Optional[int]:
+        """Number of distinct points (None when any dimension is continuous)"""
+        if all(isinstance(dim, Choice) for dim in self.dimensions.values()):
+            return self.grid_size()
+        return None
+
+    def params(self, point: Dict[str, Any]) -> Dict[str, Any]:
+        """The parameters evaluated for a point"""
+        if not self.normalize:
+            return dict(point)
+        total = sum(point.values())
+        if total <= 0:
+            return {name: round(1 / len(point), WEIGHT_DECIMALS) for name in point}
+        return {name: round(value / total, WEIGHT_DECIMALS) for name, value in point.items()}
+
+
+# ==================== BUDGET & RESULTS ====================
+
+
+@dataclass
+class SearchBudget:
+    """Limits on one search (None = unlimited)"""
+    max_evaluations: Optional[float] = None  # Full-data evaluation equivalents
+    max_seconds: Optional[float] = None
+
+    def split(self, parts: int) -> "SearchBudget":
+        """An equal share, e.g. per walk-forward window"""
+        parts = max(parts, 1)
+        return SearchBudget(
+            max_evaluations=self.max_evaluations / parts if self.max_evaluations is not None else None,
+            max_seconds=self.max_seconds / parts if self.max_seconds is not None else None,
+        )
+
+
+@dataclass
+class Evaluation:
+    """One scoring of a parameter set"""
+    params: Dict[str, Any]
+    score: float
+    fidelity: float
+    point: Dict[str, Any] = field(repr=False, default_factory=dict)
+
+
+@dataclass
+class SearchResult:
+    """Outcome of a search"""
+    method: str
+    best_params: Dict[str, Any]
+    best_score: float
+    best_fidelity: float
+    evaluations: List[Evaluation]
+    cost: float                 # Full-data evaluation equivalents spent
+    elapsed_seconds: float
+    budget_exhausted: bool
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "method": self.method,
+            "best_params": self.best_params,
+            "best_score": round(self.best_score, 4) if math.isfinite(self.best_score) else None,
+            "best_fidelity": self.best_fidelity,
+            "evaluations": len(self.evaluations),
+            "cost": round(self.cost, 2),
+            "elapsed_seconds": round(self.elapsed_seconds, 2),
+            "budget_exhausted": self.budget_exhausted,
+        }
+
+
+class SearchRun:
+    """
+    Book-keeping for one search: evaluates points within the budget,
+    remembers every score and skips repeats of the same parameters.
+    """
+
+    def __init__(
+        self,
+        space: SearchSpace,
+        objective: Objective,
+        budget: SearchBudget,
+        on_evaluation: Optional[Callable[[Evaluation], None]] = None,
+    ):
+        self.space = space
+        self.objective = objective
+        self.budget = budget
+        self.on_evaluation = on_evaluation
+        self.evaluations: List[Evaluation] = []
+        self.cost = 0.0
+        self.budget_exhausted = False
+        self.started_at = time.monotonic()
+        self._scores: Dict[Tuple, float] = {}
+
+    def can_afford(self, fidelity: float = 1.0) -> bool:
+        """Whether an evaluation at this fidelity fits in what's left"""
+        budget = self.budget
+        if budget.max_evaluations is not None and self.cost + fidelity > budget.max_evaluations + 1e-9:
+            return False
+        if budget.max_seconds is not None:
+            elapsed = time.monotonic() - self.started_at
+            # Projected from the time evaluations have taken so far
+            per_evaluation = elapsed / self.cost if self.cost else 0.0
+            if elapsed + per_evaluation * fidelity > budget.max_seconds:
+                return False
+        return True
+
+    def explored_all(self) -> bool:
+        """Whether every point of a discrete space has been scored on the full data"""
+        size = self.space.size
+        return size is not None and sum(key[1] == 1.0 for key in self._scores) >= size
+
+    def _out_of_time(self) -> bool:
+        max_seconds = self.budget.max_seconds
+        return max_seconds is not None and time.monotonic() - self.started_at >= max_seconds
+
+    def evaluate(self, point: Dict[str, Any], fidelity: float = 1.0) -> Optional[float]:
+        """Score a point, or None once the budget won't cover it"""
+        if self.budget_exhausted or self._out_of_time():
+            self.budget_exhausted = True
+            return None
+        params = self.space.params(point)
+        key = (tuple(sorted(params.items())), fidelity)
+        if key in self._scores:
+            return self._scores[key]
+        if not self.can_afford(fidelity):
+            self.budget_exhausted = True
+            return None
+
+        score = self.objective(params, fidelity)
+        if score is None or not math.isfinite(score):
+            score = -math.inf
+        self.cost += fidelity
+        self._scores[key] = score
+
+        evaluation = Evaluation(params=params, score=score, fidelity=fidelity, point=dict(point))
+        self.evaluations.append(evaluation)
+        if self.on_evaluation:
+            self.on_evaluation(evaluation)
+        return score
+
+    def result(self, method: str) -> SearchResult:
+        """Best result at the highest fidelity reached (earliest wins ties)"""
+        best = None
+        for evaluation in self.evaluations:
+            if best is None or (evaluation.fidelity, evaluation.score) > (best.fidelity, best.score):
+                best = evaluation
+        return SearchResult(
+            method=method,
+            best_params=best.params if best else {},
+            best_score=best.score if best else -math.inf,
+            best_fidelity=best.fidelity if best else 0.0,
+            evaluations=self.evaluations,
+            cost=self.cost,
+            elapsed_seconds=time.monotonic() - self.started_at,
+            budget_exhausted=self.budget_exhausted,
+        )
+
+
+# ==================== SEARCHES ====================
+
+
+class ParamSearch:
+    """
+    Base class for search strategies.
+
+    Subclasses implement _search(run, rng), asking run.evaluate() for
+    scores and stopping when it returns None (budget spent).
+    """
+
+    name = "base"
+
+    def search(
+        self,
+        space: SearchSpace,
+        objective: Objective,
+        budget: Optional[SearchBudget] = None,
+        rng: Optional[random.Random] = None,
+        initial: Optional[List[Dict[str, Any]]] = None,
+        on_evaluation: Optional[Callable[[Evaluation], None]] = None,
+    ) -> SearchResult:
+        """
+        Search the space for the highest-scoring parameters.
+
+        Args:
+            space: Dimensions to search
+            objective: objective(params, fidelity) -> score (higher is better)
+            budget: Evaluation/time limits (default: unlimited)
+            rng: Random source (seed it for reproducible searches)
+            initial: Points scored on the full data first, e.g. the
+                parameters currently in use
+            on_evaluation: Called after every evaluation (progress)
+
+        Returns:
+            SearchResult with the best parameters found
+        """
+        run = SearchRun(space, objective, budget or SearchBudget(), on_evaluation)
+        rng = rng or random.Random()
+
+        for point in initial or []:
+            if run.evaluate(point) is None:
+                break
+        else:
+            self._search(run, rng)
+
+        result = run.result(self.name)
+        logger.debug(
+            f"{self.name} search: {len(result.evaluations)} evaluations, cost {result.cost:.1f}, "
+            f"best {result.best_score:.3f} in {result.elapsed_seconds:.1f}s"
+        )
+        return result
+
+    def planned_evaluations(self, space: SearchSpace, budget: Optional[SearchBudget] = None) -> int:
+        """Upper bound on evaluations (for progress reporting)"""
+        raise NotImplementedError
+
+    def _search(self, run: SearchRun, rng: random.Random) -> None:
+        raise NotImplementedError
+
+
+def _budget_cap(budget: Optional[SearchBudget]) -> float:
+    if budget is None or budget.max_evaluations is None:
+        return math.inf
+    return math.floor(budget.max_evaluations + 1e-9)
+
+
+class GridSearch(ParamSearch):
+    """Every grid point in order, up to limit (Uniform dimensions get `resolution` points)"""
+
+    name = "grid"
+
+    def __init__(self, limit: Optional[int] = None, resolution: int = 3):
+        self.limit = limit
+        self.resolution = resolution
+
+    def planned_evaluations(self, space: SearchSpace, budget: Optional[SearchBudget] = None) -> int:
+        size = space.grid_size(self.resolution)
+        return int(min(size, self.limit if self.limit is not None else size, _budget_cap(budget)))
+
+    def _search(self, run: SearchRun, rng: random.Random) -> None:
+        for point in itertools.islice(run.space.grid(self.resolution), self.limit):
+            if run.evaluate(point) is None:
+                return
+
+
+class RandomSearch(ParamSearch):
+    """Independent random samples"""
+
+    name = "random"
+
+    def __init__(self, n_trials: int = 100):
+        self.n_trials = n_trials
+
+    def planned_evaluations(self, space: SearchSpace, budget: Optional[SearchBudget] = None) -> int:
+        return int(min(self.n_trials, _budget_cap(budget)))
+
+    def _search(self, run: SearchRun, rng: random.Random) -> None:
+        for _ in range(self.n_trials):
+            if run.explored_all() or run.evaluate(run.space.sample(rng)) is None:
+                return
+
+
+class SuccessiveHalving(ParamSearch):
+    """
+    Successive halving over random candidates.
+
+    Rungs score on min_fidelity, min_fidelity * eta, ... up to the full
+    data; each rung keeps the best 1/eta. Every rung costs the same
+    (n_candidates * min_fidelity), so without n_candidates the count is
+    sized to the evaluation budget.
+    """
+
+    name = "successive_halving"
+
+    def __init__(self, n_candidates: Optional[int] = None, eta: int = 3, min_fidelity: float = 1 / 9):
+        if eta < 2:
+            raise ValueError("eta must be at least 2")
+        if not 0 < min_fidelity <= 1:
+            raise ValueError("min_fidelity must be in (0, 1]")
+        self.n_candidates = n_candidates
+        self.eta = eta
+        self.min_fidelity = min_fidelity
+
+    def _fidelities(self) -> List[float]:
+        fidelities = [self.min_fidelity]
+        while fidelities[-1] < 1 - 1e-9:
+            fidelities.append(min(1.0, fidelities[-1] * self.eta))
+        return fidelities
+
+    def _candidates(self, budget: Optional[SearchBudget], spent: float = 0.0) -> int:
+        if self.n_candidates is not None:
+            return self.n_candidates
+        rungs = len(self._fidelities())
+        if budget is None or budget.max_evaluations is None:
+            return self.eta ** (rungs - 1) * self.eta  # eta survivors on the full data
+        available = max(budget.max_evaluations - spent, 0)
+        return max(int(available / (self.min_fidelity * rungs) + 1e-9), 1)
+
+    def planned_evaluations(self, space: SearchSpace, budget: Optional[SearchBudget] = None) -> int:
+        count = self._candidates(budget)
+        total = 0
+        for _ in self._fidelities():
+            total += count
+            count = max(count // self.eta, 1)
+        return total
+
+    def _search(self, run: SearchRun, rng: random.Random) -> None:
+        candidates = [run.space.sample(rng) for _ in range(self._candidates(run.budget, run.cost))]
+        fidelities = self._fidelities()
+
+        for rung, fidelity in enumerate(fidelities):
+            scored = []
+            for index, point in enumerate(candidates):
+                score = run.evaluate(point, fidelity)
+                if score is None:
+                    return
+                scored.append((score, -index, point))
+            if rung == len(fidelities) - 1:
+                return
+            scored.sort(key=lambda item: item[:2], reverse=True)
+            candidates = [point for _, _, point in scored[:max(len(scored) // self.eta, 1)]]
+
+
+class TPESearch(ParamSearch):
+    """
+    Tree-structured Parzen Estimator (independent per dimension).
+
+    After n_startup random trials, the evaluations are split into the best
+    `gamma` fraction and the rest. Each dimension gets a density for both
+    groups (smoothed value frequencies for Choice, Gaussian kernels for
+    Uniform); n_samples candidates are drawn from the good densities and
+    the one maximising good/bad likelihood is evaluated next.
+    """
+
+    name = "tpe"
+
+    def __init__(self, n_trials: int = 100, n_startup: int = 10, gamma: float = 0.25, n_samples: int = 24):
+        self.n_trials = n_trials
+        self.n_startup = n_startup
+        self.gamma = gamma
+        self.n_samples = n_samples
+
+    def planned_evaluations(self, space: SearchSpace, budget: Optional[SearchBudget] = None) -> int:
+        return int(min(self.n_trials, _budget_cap(budget)))
+
+    def _search(self, run: SearchRun, rng: random.Random) -> None:
+        for _ in range(self.n_trials):
+            if run.explored_all():
+                return
+            history = [e for e in run.evaluations if e.fidelity == 1.0 and e.point]
+            if len(history) < self.n_startup:
+                point = run.space.sample(rng)
+            else:
+                point = self._suggest(run.space, history, rng)
+            if run.evaluate(point) is None:
+                return
+
+    def _suggest(self, space: SearchSpace, history: List[Evaluation], rng: random.Random) -> Dict[str, Any]:
+        ranked = sorted(history, key=lambda e: e.score, reverse=True)
+        n_good = max(1, math.ceil(self.gamma * len(ranked)))
+        good = [e.point for e in ranked[:n_good]]
+        bad = [e.point for e in ranked[n_good:]] or good
+
+        best_point, best_ratio = None, -math.inf
+        for _ in range(self.n_samples):
+            point, ratio = {}, 0.0
+            for name, dim in space.dimensions.items():
+                good_values = [p[name] for p in good]
+                bad_values = [p[name] for p in bad]
+                value = _parzen_sample(dim, good_values, rng)
+                point[name] = value
+                ratio += (math.log(_parzen_density(dim, good_values, value))
+                          - math.log(_parzen_density(dim, bad_values, value)))
+            if ratio > best_ratio:
+                best_point, best_ratio = point, ratio
+        return best_point
+
+
+def _bandwidth(dim: Uniform, count: int) -> float:
+    return max((dim.high - dim.low) * (count + 1) ** -0.2 / 2, 1e-12)
+
+
+def _parzen_sample(dim: Dimension, values: List[Any], rng: random.Random) -> Any:
+    """Draw from the density of observed values (with a uniform prior component)"""
+    if isinstance(dim, Choice):
+        weights = [1 + sum(value == v for v in values) for value in dim.values]
+        return rng.choices(dim.values, weights=weights)[0]
+    index = rng.randrange(len(values) + 1)
+    if index == len(values):
+        return dim.sample(rng)
+    value = rng.gauss(values[index], _bandwidth(dim, len(values)))
+    return min(max(value, dim.low), dim.high)
+
+
+def _parzen_density(dim: Dimension, values: List[Any], value: Any) -> float:
+    if isinstance(dim, Choice):
+        return (1 + sum(value == v for v in values)) / (len(dim.values) + len(values))
+    width = max(dim.high - dim.low, 1e-12)
+    sigma = _bandwidth(dim, len(values))
+    density = 1 / width  # Prior component
+    for center in values:
+        density += math.exp(-0.5 * ((value - center) / sigma) ** 2) / (sigma * math.sqrt(2 * math.pi))
+    return density / (len(values) + 1)
+
+
+SEARCHES = {
+    "grid": GridSearch,
+    "random": RandomSearch,
+    "successive_halving": SuccessiveHalving,
+    "tpe": TPESearch,
+}
+
+
+def create_search(name: str, **kwargs) -> ParamSearch:
+    """Search strategy by name"""
+    search_class = SEARCHES.get(name)
+    if search_class is None:
+        raise ValueError(f"Unknown search: {name}. Available: {', '.join(SEARCHES)}")
+    return search_class(**kwargs)
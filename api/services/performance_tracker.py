@@ -2,6 +2,7 @@
 Performance Tracker and Self-Optimizer
 Tracks trading performance, calculates metrics, and optimizes strategy parameters
 """
+import bisect
 import logging
 from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime, timedelta
@@ -13,6 +14,7 @@ from sqlalchemy import func, and_
 
 from database.models import Trade, PerformanceMetric, BotConfiguration, OptimizationLog
 from database.connection import SessionLocal
+from services.backtesting.online_metrics import OnlineMetrics, RunningStats
 
 logger = logging.getLogger(__name__)
 
@@ -93,118 +95,120 @@ class PerformanceTracker:
         """
         db = self._get_db()
         try:
-            start_date = datetime.now() - timedelta(days=period_days)
-
-            # Get completed trades in period
-            trades = db.query(Trade).filter(
-                and_(
-                    Trade.exit_time != None,
-                    Trade.exit_time >= start_date
-                )
-            ).all()
-
-            if not trades:
-                return self._empty_metrics(period_days)
-
-            # Basic counts
-            total_trades = len(trades)
-            winning_trades = len([t for t in trades if (t.profit_loss or 0) > 0])
-            losing_trades = len([t for t in trades if (t.profit_loss or 0) < 0])
-            win_rate = winning_trades / total_trades if total_trades > 0 else 0
-
-            # P&L calculations
-            pnls = [t.profit_loss or 0 for t in trades]
-            total_pnl = sum(pnls)
-
-            # Calculate total P&L percentage (weighted by trade size)
-            total_invested = sum(t.entry_price * t.quantity for t in trades)
-            total_pnl_pct = (total_pnl / total_invested * 100) if total_invested > 0 else 0
-
-            # Profit factor
-            gross_profit = sum(p for p in pnls if p > 0)
-            gross_loss = abs(sum(p for p in pnls if p < 0))
-            profit_factor = gross_profit / gross_loss if gross_loss > 0 else float('inf') if gross_profit > 0 else 0
-
-            # Average win/loss
-            wins = [p for p in pnls if p > 0]
-            losses = [p for p in pnls if p < 0]
-            avg_win = statistics.mean(wins) if wins else 0
-            avg_loss = statistics.mean(losses) if losses else 0
-
-            # Best/worst trades
-            best_trade = max(pnls) if pnls else 0
-            worst_trade = min(pnls) if pnls else 0
-
-            # Trade duration
-            durations = []
-            for t in trades:
-                if t.entry_time and t.exit_time:
-                    duration = (t.exit_time - t.entry_time).total_seconds() / 3600
-                    durations.append(duration)
-            avg_duration = statistics.mean(durations) if durations else 0
-
-            # Sharpe ratio (simplified - daily returns)
-            sharpe_ratio = self._calculate_sharpe_ratio(trades, period_days)
-
-            # Max drawdown
-            max_drawdown, max_drawdown_pct = self._calculate_max_drawdown(trades)
-
-            # By trade type
-            swing_trades_list = [t for t in trades if t.trade_type == "SWING"]
-            swing_wins = len([t for t in swing_trades_list if (t.profit_loss or 0) > 0])
-            swing_win_rate = swing_wins / len(swing_trades_list) if swing_trades_list else 0
-
-            longterm_trades_list = [t for t in trades if t.trade_type == "LONG_TERM"]
-            longterm_wins = len([t for t in longterm_trades_list if (t.profit_loss or 0) > 0])
-            longterm_win_rate = longterm_wins / len(longterm_trades_list) if longterm_trades_list else 0
-
-            # Calculate additional risk metrics
-            sortino_ratio = self._calculate_sortino_ratio(trades, period_days)
-            calmar_ratio = self._calculate_calmar_ratio(total_pnl_pct, max_drawdown_pct)
-            current_drawdown_pct = self._calculate_current_drawdown(trades)
-
-            # Average trade and expectancy
-            avg_trade = statistics.mean(pnls) if pnls else 0
-            expectancy = (win_rate * avg_win) - ((1 - win_rate) * abs(avg_loss)) if total_trades > 0 else 0
-
-            # Consecutive tracking
-            cons_wins, cons_losses, max_cons_wins, max_cons_losses = self._calculate_consecutive_stats(trades)
-
-            return PerformanceMetrics(
-                period_days=period_days,
-                total_trades=total_trades,
-                winning_trades=winning_trades,
-                losing_trades=losing_trades,
-                win_rate=win_rate,
-                total_pnl=total_pnl,
-                total_pnl_pct=total_pnl_pct,
-                profit_factor=profit_factor,
-                sharpe_ratio=sharpe_ratio,
-                sortino_ratio=sortino_ratio,
-                calmar_ratio=calmar_ratio,
-                max_drawdown=max_drawdown,
-                max_drawdown_pct=max_drawdown_pct,
-                current_drawdown_pct=current_drawdown_pct,
-                avg_win=avg_win,
-                avg_loss=avg_loss,
-                avg_trade=avg_trade,
-                expectancy=expectancy,
-                avg_trade_duration_hours=avg_duration,
-                best_trade=best_trade,
-                worst_trade=worst_trade,
-                consecutive_wins=cons_wins,
-                consecutive_losses=cons_losses,
-                max_consecutive_wins=max_cons_wins,
-                max_consecutive_losses=max_cons_losses,
-                swing_trades=len(swing_trades_list),
-                swing_win_rate=swing_win_rate,
-                longterm_trades=len(longterm_trades_list),
-                longterm_win_rate=longterm_win_rate,
-            )
+            trades = self._get_completed_trades(db, period_days)
+            return self._metrics_from_trades(trades, period_days)
         finally:
             if not self._db:
                 db.close()
 
+    def _get_completed_trades(self, db: Session, period_days: int) -> List[Trade]:
+        """Trades closed in the last period_days, oldest exit first"""
+        start_date = datetime.now() - timedelta(days=period_days)
+        return db.query(Trade).filter(
+            and_(
+                Trade.exit_time != None,
+                Trade.exit_time >= start_date
+            )
+        ).order_by(Trade.exit_time).all()
+
+    def _metrics_from_trades(self, trades: List[Trade], period_days: int) -> PerformanceMetrics:
+        """
+        Calculate metrics from completed trades sorted by exit time.
+
+        One pass feeds an OnlineMetrics accumulator (trade stats, streaks and
+        the cumulative P&L curve's drawdown) and a RunningStats of daily P&L
+        (Sharpe/Sortino).
+        """
+        if not trades:
+            return self._empty_metrics(period_days)
+
+        online = OnlineMetrics(initial_equity=0)  # Cumulative P&L curve
+        daily = RunningStats()
+        day, day_pnl = None, 0.0
+        total_invested = 0
+        durations = []
+        swing_trades = swing_wins = longterm_trades = longterm_wins = 0
+
+        for t in trades:
+            pnl = t.profit_loss or 0
+            online.add_trade(pnl)
+            online.add_equity(online.equity + pnl)
+
+            # Daily P&L - trades arrive in exit order, so a day is done once the date changes
+            date_key = t.exit_time.date()
+            if date_key != day:
+                if day is not None:
+                    daily.add(day_pnl)
+                day, day_pnl = date_key, 0.0
+            day_pnl += pnl
+
+            total_invested += t.entry_price * t.quantity
+            if t.entry_time and t.exit_time:
+                durations.append((t.exit_time - t.entry_time).total_seconds() / 3600)
+
+            # By trade type
+            if t.trade_type == "SWING":
+                swing_trades += 1
+                swing_wins += pnl > 0
+            elif t.trade_type == "LONG_TERM":
+                longterm_trades += 1
+                longterm_wins += pnl > 0
+        daily.add(day_pnl)
+
+        metrics = online.snapshot()
+        total_trades = metrics.total_trades
+        win_rate = metrics.win_rate
+        total_pnl = metrics.net_pnl
+
+        # Calculate total P&L percentage (weighted by trade size)
+        total_pnl_pct = (total_pnl / total_invested * 100) if total_invested > 0 else 0
+
+        # Profit factor (0 when nothing was won or lost)
+        profit_factor = metrics.profit_factor if metrics.gross_profit > 0 or metrics.gross_loss > 0 else 0
+
+        # Drawdown of cumulative P&L, as % of its highest point
+        peak = metrics.peak_equity
+        max_drawdown = metrics.max_drawdown
+        max_drawdown_pct = (max_drawdown / peak * 100) if peak > 0 else 0
+        current_drawdown_pct = round(metrics.current_drawdown_pct, 2)
+
+        sharpe_ratio, sortino_ratio = self._daily_ratios(daily, total_trades)
+        calmar_ratio = self._calculate_calmar_ratio(total_pnl_pct, max_drawdown_pct)
+
+        avg_duration = statistics.mean(durations) if durations else 0
+
+        return PerformanceMetrics(
+            period_days=period_days,
+            total_trades=total_trades,
+            winning_trades=metrics.winning_trades,
+            losing_trades=metrics.losing_trades,
+            win_rate=win_rate,
+            total_pnl=total_pnl,
+            total_pnl_pct=total_pnl_pct,
+            profit_factor=profit_factor,
+            sharpe_ratio=sharpe_ratio,
+            sortino_ratio=sortino_ratio,
+            calmar_ratio=calmar_ratio,
+            max_drawdown=max_drawdown,
+            max_drawdown_pct=max_drawdown_pct,
+            current_drawdown_pct=current_drawdown_pct,
+            avg_win=metrics.avg_win,
+            avg_loss=metrics.avg_loss,
+            avg_trade=metrics.avg_trade,
+            expectancy=metrics.expectancy,
+            avg_trade_duration_hours=avg_duration,
+            best_trade=metrics.best_trade,
+            worst_trade=metrics.worst_trade,
+            consecutive_wins=metrics.consecutive_wins,
+            consecutive_losses=metrics.consecutive_losses,
+            max_consecutive_wins=metrics.max_consecutive_wins,
+            max_consecutive_losses=metrics.max_consecutive_losses,
+            swing_trades=swing_trades,
+            swing_win_rate=swing_wins / swing_trades if swing_trades else 0,
+            longterm_trades=longterm_trades,
+            longterm_win_rate=longterm_wins / longterm_trades if longterm_trades else 0,
+        )
+
     def _empty_metrics(self, period_days: int) -> PerformanceMetrics:
         """Return empty metrics when no trades exist"""
         return PerformanceMetrics(
@@ -239,129 +243,37 @@ class PerformanceTracker:
             longterm_win_rate=0,
         )
 
-    def _calculate_sharpe_ratio(
+    def _daily_ratios(
         self,
-        trades: List[Trade],
-        period_days: int,
+        daily: RunningStats,
+        total_trades: int,
         risk_free_rate: float = 0.05
-    ) -> Optional[float]:
+    ) -> Tuple[Optional[float], Optional[float]]:
         """
-        Calculate Sharpe ratio from trades.
+        Calculate Sharpe and Sortino ratios from daily P&L.
 
         Args:
-            trades: List of completed trades
-            period_days: Period in days
+            daily: Running stats of P&L per trading day
+            total_trades: Trades in the period
             risk_free_rate: Annual risk-free rate (default 5%)
 
         Returns:
-            Sharpe ratio or None if insufficient data
-        """
-        if len(trades) < 5:
-            return None
-
-        # Group trades by date and calculate daily returns
-        daily_pnl: Dict[str, float] = {}
-        for trade in trades:
-            if trade.exit_time:
-                date_key = trade.exit_time.strftime("%Y-%m-%d")
-                daily_pnl[date_key] = daily_pnl.get(date_key, 0) + (trade.profit_loss or 0)
-
-        if len(daily_pnl) < 5:
-            return None
-
-        returns = list(daily_pnl.values())
-        avg_return = statistics.mean(returns)
-        std_return = statistics.stdev(returns) if len(returns) > 1 else 0
-
-        if std_return == 0:
-            return None
-
-        # Annualize (assuming 252 trading days)
-        daily_rf_rate = risk_free_rate / 252
-        sharpe = (avg_return - daily_rf_rate) / std_return * (252 ** 0.5)
-
-        return round(sharpe, 2)
-
-    def _calculate_max_drawdown(self, trades: List[Trade]) -> Tuple[float, float]:
+            (sharpe, sortino), each None if undefined or with fewer than
+            5 trades or trading days
         """
-        Calculate maximum drawdown from trade history.
+        if total_trades < 5 or daily.count < 5:
+            return None, None
 
-        Returns:
-            Tuple of (max_drawdown_amount, max_drawdown_pct)
-        """
-        if not trades:
-            return 0, 0
+        sharpe = daily.sharpe_ratio(risk_free_rate)
+        sortino = daily.sortino_ratio(risk_free_rate)
+        if sortino == float('inf'):
+            sortino = None  # No losing days
 
-        # Sort by exit time
-        sorted_trades = sorted(
-            [t for t in trades if t.exit_time],
-            key=lambda t: t.exit_time
+        return (
+            round(sharpe, 2) if sharpe is not None else None,
+            round(sortino, 2) if sortino is not None else None,
         )
 
-        # Build equity curve
-        cumulative_pnl = 0
-        peak = 0
-        max_drawdown = 0
-
-        for trade in sorted_trades:
-            cumulative_pnl += trade.profit_loss or 0
-            peak = max(peak, cumulative_pnl)
-            drawdown = peak - cumulative_pnl
-            max_drawdown = max(max_drawdown, drawdown)
-
-        max_drawdown_pct = (max_drawdown / peak * 100) if peak > 0 else 0
-
-        return max_drawdown, max_drawdown_pct
-
-    def _calculate_sortino_ratio(
-        self,
-        trades: List[Trade],
-        period_days: int,
-        risk_free_rate: float = 0.05
-    ) -> Optional[float]:
-        """
-        Calculate Sortino ratio (downside deviation only).
-
-        Args:
-            trades: List of completed trades
-            period_days: Period in days
-            risk_free_rate: Annual risk-free rate (default 5%)
-
-        Returns:
-            Sortino ratio or None if insufficient data
-        """
-        if len(trades) < 5:
-            return None
-
-        # Group trades by date and calculate daily returns
-        daily_pnl: Dict[str, float] = {}
-        for trade in trades:
-            if trade.exit_time:
-                date_key = trade.exit_time.strftime("%Y-%m-%d")
-                daily_pnl[date_key] = daily_pnl.get(date_key, 0) + (trade.profit_loss or 0)
-
-        if len(daily_pnl) < 5:
-            return None
-
-        returns = list(daily_pnl.values())
-        avg_return = statistics.mean(returns)
-
-        # Calculate downside deviation (only negative returns)
-        negative_returns = [r for r in returns if r < 0]
-        if not negative_returns:
-            return None  # No downside = infinite Sortino
-
-        import math
-        downside_dev = math.sqrt(statistics.mean([r**2 for r in negative_returns]))
-
-        if downside_dev == 0:
-            return None
-
-        daily_rf_rate = risk_free_rate / 252
-        sortino = (avg_return - daily_rf_rate) / downside_dev * (252 ** 0.5)
-
-        return round(sortino, 2)
-
     def _calculate_calmar_ratio(
         self,
         total_return_pct: float,
@@ -382,80 +294,6 @@ class PerformanceTracker:
 
         return round(total_return_pct / max_drawdown_pct, 2)
 
-    def _calculate_current_drawdown(self, trades: List[Trade]) -> float:
-        """Calculate current drawdown percentage from peak"""
-        if not trades:
-            return 0
-
-        sorted_trades = sorted(
-            [t for t in trades if t.exit_time],
-            key=lambda t: t.exit_time
-        )
-
-        if not sorted_trades:
-            return 0
-
-        cumulative_pnl = 0
-        peak = 0
-
-        for trade in sorted_trades:
-            cumulative_pnl += trade.profit_loss or 0
-            peak = max(peak, cumulative_pnl)
-
-        if peak <= 0:
-            return 0
-
-        current_dd = (peak - cumulative_pnl) / peak * 100
-        return round(current_dd, 2)
-
-    def _calculate_consecutive_stats(
-        self,
-        trades: List[Trade]
-    ) -> Tuple[int, int, int, int]:
-        """
-        Calculate consecutive win/loss statistics.
-
-        Returns:
-            (current_wins, current_losses, max_wins, max_losses)
-        """
-        if not trades:
-            return 0, 0, 0, 0
-
-        sorted_trades = sorted(
-            [t for t in trades if t.exit_time],
-            key=lambda t: t.exit_time
-        )
-
-        current_wins = 0
-        current_losses = 0
-        max_wins = 0
-        max_losses = 0
-        streak = 0
-        last_winner = None
-
-        for trade in sorted_trades:
-            is_winner = (trade.profit_loss or 0) > 0
-
-            if last_winner is None:
-                streak = 1
-            elif is_winner == last_winner:
-                streak += 1
-            else:
-                streak = 1
-
-            if is_winner:
-                max_wins = max(max_wins, streak)
-                current_wins = streak
-                current_losses = 0
-            else:
-                max_losses = max(max_losses, streak)
-                current_losses = streak
-                current_wins = 0
-
-            last_winner = is_winner
-
-        return current_wins, current_losses, max_wins, max_losses
-
     def get_dashboard_data(self) -> Dict[str, Any]:
         """
         Get complete dashboard data for the frontend.
@@ -463,10 +301,23 @@ class PerformanceTracker:
         Returns:
             Dict with all performance data needed for dashboard display
         """
-        metrics_7d = self.calculate_metrics(period_days=7)
-        metrics_30d = self.calculate_metrics(period_days=30)
-        metrics_90d = self.calculate_metrics(period_days=90)
-        equity_curve = self.get_equity_curve(period_days=90)
+        # One query for the longest period; shorter periods are its most recent trades
+        db = self._get_db()
+        try:
+            trades_90d = self._get_completed_trades(db, 90)
+        finally:
+            if not self._db:
+                db.close()
+        exit_times = [t.exit_time for t in trades_90d]
+
+        def since(days: int) -> List[Trade]:
+            start_date = datetime.now() - timedelta(days=days)
+            return trades_90d[bisect.bisect_left(exit_times, start_date):]
+
+        metrics_7d = self._metrics_from_trades(since(7), 7)
+        metrics_30d = self._metrics_from_trades(since(30), 30)
+        metrics_90d = self._metrics_from_trades(trades_90d, 90)
+        equity_curve = self._equity_curve(trades_90d)
 
         return {
             "summary": {
@@ -539,31 +390,26 @@ class PerformanceTracker:
         """
         db = self._get_db()
         try:
-            start_date = datetime.now() - timedelta(days=period_days)
-
-            trades = db.query(Trade).filter(
-                and_(
-                    Trade.exit_time != None,
-                    Trade.exit_time >= start_date
-                )
-            ).order_by(Trade.exit_time).all()
-
-            curve = []
-            cumulative_pnl = 0
-
-            for trade in trades:
-                cumulative_pnl += trade.profit_loss or 0
-                curve.append({
-                    "date": trade.exit_time.isoformat() if trade.exit_time else None,
-                    "pnl": trade.profit_loss or 0,
-                    "cumulative_pnl": cumulative_pnl,
-                })
-
-            return curve
+            return self._equity_curve(self._get_completed_trades(db, period_days))
         finally:
             if not self._db:
                 db.close()
 
+    def _equity_curve(self, trades: List[Trade]) -> List[Dict[str, Any]]:
+        """Cumulative P&L points of trades sorted by exit time"""
+        curve = []
+        cumulative_pnl = 0
+
+        for trade in trades:
+            cumulative_pnl += trade.profit_loss or 0
+            curve.append({
+                "date": trade.exit_time.isoformat() if trade.exit_time else None,
+                "pnl": trade.profit_loss or 0,
+                "cumulative_pnl": cumulative_pnl,
+            })
+
+        return curve
+
     def get_trade_history(
         self,
         limit: int = 50,
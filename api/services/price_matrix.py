@@ -0,0 +1,724 @@
+"""
+Shared Price Matrix
+===================
+
+OHLCV histories in memory-mapped files shared by every process on the
+host, so backtest jobs, optimizer workers, partitioned bot workers and
+uvicorn workers read the same bars instead of each holding its own lists
+of bar dicts / Bar objects.
+
+Layout (one file per timeframe, e.g. 1day.prices under PRICE_MATRIX_DIR):
+- A header of int64 words: magic, format, version counter, generation,
+  symbol slots, bar capacity per slot.
+- Per symbol slot: its name, metadata (live flag, bar count, covered time
+  range, publish time, timestamp flags), int64 timestamps (epoch microseconds) and one
+  float64 row per column - a symbol x time matrix for open, high, low,
+  close and volume.
+
+Readers map the file read-only and hand out numpy views into it, so a
+process attaching adds no copy of the bars. Put the directory on a tmpfs
+(e.g. /dev/shm) and the files are plain shared memory.
+
+Consistency:
+- Publishing takes an exclusive lock on the timeframe's lock file, so
+  there is exactly one writer per timeframe at a time. Any process may
+  publish bars it fetched.
+- The header version is a seqlock: odd while a write is in progress.
+  Readers retry until they see the same even version before and after
+  building their views.
+- Within a generation published bars never change, except a symbol's last
+  bar (the still-forming bar), which may be amended in place. Appends go
+  into the slot's spare capacity; any other change (older history,
+  corrections) writes the symbol to a fresh slot, so existing views keep
+  their data.
+- When slots or capacity run out the file is rebuilt and atomically
+  replaced (a new generation). Readers still mapping the old file keep
+  valid views and switch over on their next read.
+"""
+
+import logging
+import mmap
+import os
+import tempfile
+import time
+from collections.abc import Sequence as SequenceABC
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Not on Windows - the matrix is disabled there
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+MAGIC = 0x4353505249434531  # "CSPRICE1"
+FORMAT_VERSION = 1
+COLUMNS = ("open", "high", "low", "close", "volume")
+NAME_BYTES = 16
+
+# Header words
+HEADER_WORDS = 16
+_MAGIC, _FORMAT, _VERSION, _GENERATION, _SLOTS, _USED, _CAPACITY, _SUPERSEDED, _UPDATED_AT = range(9)
+
+# Metadata words per slot
+META_WORDS = 6
+_LIVE, _LENGTH, _COVERED_FROM, _COVERED_TO, _PUBLISHED_AT, _FLAGS = range(META_WORDS)
+
+# How the publisher's timestamps looked, so readers get the same kind back
+FLAG_TZ_AWARE = 1
+FLAG_TEXT = 2
+
+MIN_SLOTS = 16
+MIN_CAPACITY = 64
+
+# A reader gives up (and the caller fetches for itself) if a write seems stuck this long
+READ_TIMEOUT_SECONDS = 1.0
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_NAIVE_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class PriceMatrixError(Exception):
+    """A price matrix file that can't be used (wrong format, truncated)"""
+
+
+# ==================== TIMESTAMPS ====================
+
+def to_epoch_us(value: Any) -> int:
+    """Epoch microseconds of a datetime, date or ISO string (naive times are UTC)"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    elif isinstance(value, date) and not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def from_epoch_us(value: int, tz_aware: bool) -> datetime:
+    """datetime for epoch microseconds (UTC-aware, or naive UTC)"""
+    delta = timedelta(microseconds=int(value))
+    return _EPOCH + delta if tz_aware else _NAIVE_EPOCH + delta
+
+
+def format_epoch_us(value: int, tz_aware: bool) -> str:
+    """ISO timestamp for epoch microseconds, as the data API formats them"""
+    return from_epoch_us(value, tz_aware).isoformat()
+
+
+def _is_tz_aware(value: Any) -> bool:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return isinstance(value, datetime) and value.tzinfo is not None
+
+
+def _now_us() -> int:
+    return time.time_ns() // 1000
+
+
+class EpochTimes(SequenceABC):
+    """
+    Timestamps as datetimes (or ISO strings with text=True), converted on access.
+
+    Keeps only the shared int64 view, not an object per bar; supports
+    len(), indexing, slicing, iteration and bisect.
+    """
+
+    def __init__(self, values: np.ndarray, tz_aware: bool = False, text: bool = False):
+        self.values = values
+        self.tz_aware = tz_aware
+        self.text = text
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return EpochTimes(self.values[index], self.tz_aware, self.text)
+        if self.text:
+            return format_epoch_us(self.values[index], self.tz_aware)
+        return from_epoch_us(self.values[index], self.tz_aware)
+
+
+# ==================== SERIES ====================
+
+@dataclass
+class PriceSeries:
+    """One symbol's bars as read-only views into the shared matrix"""
+    symbol: str
+    timeframe: str
+    timestamps: np.ndarray  # Epoch microseconds
+    opens: np.ndarray
+    highs: np.ndarray
+    lows: np.ndarray
+    closes: np.ndarray
+    volumes: np.ndarray
+    covered_from: int       # Every bar in [covered_from, covered_to] (epoch us) is present
+    covered_to: int
+    published_at: int
+    version: int            # Matrix version the views were taken at
+    tz_aware: bool = False  # Published with timezone-aware timestamps
+    text: bool = False      # Published with ISO string timestamps
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def columns(self) -> Tuple[np.ndarray, ...]:
+        """(opens, highs, lows, closes, volumes)"""
+        return self.opens, self.highs, self.lows, self.closes, self.volumes
+
+    @property
+    def datetimes(self) -> EpochTimes:
+        """Timestamps as the publisher gave them (datetimes or ISO strings)"""
+        return EpochTimes(self.timestamps, self.tz_aware, self.text)
+
+    def covers(self, start_us: int, end_us: int) -> bool:
+        """True if every bar between start and end (epoch us) is in the series"""
+        return self.covered_from <= start_us and end_us <= self.covered_to
+
+    def _slice(self, first: int, last: int) -> "PriceSeries":
+        return replace(
+            self,
+            timestamps=self.timestamps[first:last],
+            opens=self.opens[first:last],
+            highs=self.highs[first:last],
+            lows=self.lows[first:last],
+            closes=self.closes[first:last],
+            volumes=self.volumes[first:last],
+        )
+
+    def between(self, start_us: int, end_us: int) -> "PriceSeries":
+        """Bars with start <= timestamp <= end (views, no copy)"""
+        first = int(np.searchsorted(self.timestamps, start_us, side="left"))
+        last = int(np.searchsorted(self.timestamps, end_us, side="right"))
+        return self._slice(first, last)
+
+    def tail(self, count: int) -> "PriceSeries":
+        """The last `count` bars (views, no copy)"""
+        return self._slice(max(len(self) - count, 0), len(self))
+
+    def to_bars(self) -> List[Dict[str, Any]]:
+        """Bars as dicts in the data API's format (ISO timestamps)"""
+        return [
+            {
+                "timestamp": format_epoch_us(ts, self.tz_aware),
+                "open": o, "high": h, "low": l, "close": c, "volume": v,
+            }
+            for ts, o, h, l, c, v in zip(
+                self.timestamps.tolist(), self.opens.tolist(), self.highs.tolist(),
+                self.lows.tolist(), self.closes.tolist(), self.volumes.tolist(),
+            )
+        ]
+
+
+# ==================== FILE MAPPING ====================
+
+@dataclass(frozen=True)
+class _Layout:
+    """Byte offsets of one matrix file"""
+    slots: int
+    capacity: int
+
+    @property
+    def names_offset(self) -> int:
+        return HEADER_WORDS * 8
+
+    @property
+    def meta_offset(self) -> int:
+        return self.names_offset + self.slots * NAME_BYTES
+
+    @property
+    def timestamps_offset(self) -> int:
+        return self.meta_offset + self.slots * META_WORDS * 8
+
+    @property
+    def values_offset(self) -> int:
+        return self.timestamps_offset + self.slots * self.capacity * 8
+
+    @property
+    def size(self) -> int:
+        return self.values_offset + len(COLUMNS) * self.slots * self.capacity * 8
+
+
+class _Mapping:
+    """One generation of a matrix file mapped into this process"""
+
+    def __init__(self, path: str, writable: bool = False):
+        fd = os.open(path, os.O_RDWR if writable else os.O_RDONLY)
+        try:
+            size = os.fstat(fd).st_size
+            if size < HEADER_WORDS * 8:
+                raise PriceMatrixError(f"{path} is truncated")
+            self._mmap = mmap.mmap(fd, size, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        finally:
+            os.close(fd)
+
+        self.header = np.ndarray((HEADER_WORDS,), dtype=np.int64, buffer=self._mmap)
+        if self.header[_MAGIC] != MAGIC or self.header[_FORMAT] != FORMAT_VERSION:
+            raise PriceMatrixError(f"{path} is not a format {FORMAT_VERSION} price matrix")
+        self.layout = layout = _Layout(int(self.header[_SLOTS]), int(self.header[_CAPACITY]))
+        if layout.size != size:
+            raise PriceMatrixError(f"{path} is {size} bytes, expected {layout.size}")
+
+        self.names = np.ndarray((layout.slots, NAME_BYTES), dtype=np.uint8, buffer=self._mmap,
+                                offset=layout.names_offset)
+        self.meta = np.ndarray((layout.slots, META_WORDS), dtype=np.int64, buffer=self._mmap,
+                               offset=layout.meta_offset)
+        self.timestamps = np.ndarray((layout.slots, layout.capacity), dtype=np.int64, buffer=self._mmap,
+                                     offset=layout.timestamps_offset)
+        self.values = np.ndarray((len(COLUMNS), layout.slots, layout.capacity), dtype=np.float64,
+                                 buffer=self._mmap, offset=layout.values_offset)
+
+    @classmethod
+    def create(cls, path: str, slots: int, capacity: int, generation: int) -> "_Mapping":
+        """Write an empty matrix file and map it writable"""
+        layout = _Layout(slots, capacity)
+        with open(path, "wb") as f:
+            f.truncate(layout.size)
+            header = np.zeros(HEADER_WORDS, dtype=np.int64)
+            header[[_MAGIC, _FORMAT, _GENERATION, _SLOTS, _CAPACITY]] = [
+                MAGIC, FORMAT_VERSION, generation, slots, capacity,
+            ]
+            f.write(header.tobytes())
+        return cls(path, writable=True)
+
+    @property
+    def used(self) -> int:
+        return int(self.header[_USED])
+
+    def directory(self) -> Dict[str, int]:
+        """Live slot per symbol"""
+        used = self.used
+        live = np.flatnonzero(self.meta[:used, _LIVE])
+        return {self.names[slot].tobytes().rstrip(b"\0").decode("ascii"): int(slot) for slot in live}
+
+    def series(self, symbol: str, timeframe: str, slot: int) -> PriceSeries:
+        live, length, covered_from, covered_to, published_at, flags = (int(v) for v in self.meta[slot])
+        return PriceSeries(
+            symbol=symbol,
+            timeframe=timeframe,
+            timestamps=self.timestamps[slot, :length],
+            opens=self.values[0, slot, :length],
+            highs=self.values[1, slot, :length],
+            lows=self.values[2, slot, :length],
+            closes=self.values[3, slot, :length],
+            volumes=self.values[4, slot, :length],
+            covered_from=covered_from,
+            covered_to=covered_to,
+            published_at=published_at,
+            version=int(self.header[_VERSION]),
+            tz_aware=bool(flags & FLAG_TZ_AWARE),
+            text=bool(flags & FLAG_TEXT),
+        )
+
+    @contextmanager
+    def writing(self) -> Iterator[None]:
+        """Seqlock section: readers retry while the version is odd"""
+        self.header[_VERSION] += 1
+        try:
+            yield
+        finally:
+            self.header[_UPDATED_AT] = _now_us()
+            self.header[_VERSION] += 1
+
+    def close(self) -> None:
+        self.header = self.names = self.meta = self.timestamps = self.values = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass  # Views still handed out - the mapping goes when they do
+
+
+# ==================== MATRIX ====================
+
+class PriceMatrix:
+    """
+    One timeframe's symbol x time matrix.
+
+    Usage:
+        matrix = PriceMatrix("/dev/shm/chartsense-prices", "1Day")
+        matrix.publish("AAPL", timestamps_us, values)   # values: (5, n) open/high/low/close/volume
+        series = matrix.read("AAPL")                    # PriceSeries of read-only views
+    """
+
+    def __init__(self, root: str, timeframe: str):
+        self.root = root
+        self.timeframe = timeframe.lower()
+        self.path = os.path.join(root, f"{self.timeframe}.prices")
+        self._lock_path = self.path + ".lock"
+
+        self._mapping: Optional[_Mapping] = None
+        self._directory: Dict[str, int] = {}
+        self._directory_version = -1
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.appends = 0
+        self.slot_writes = 0
+        self.rebuilds = 0
+
+    # ===== READING =====
+
+    def _current(self) -> Optional[_Mapping]:
+        """This process's mapping of the newest generation"""
+        mapping = self._mapping
+        if mapping is not None and not mapping.header[_SUPERSEDED]:
+            return mapping
+        try:
+            mapping = _Mapping(self.path)
+        except FileNotFoundError:
+            return None
+        except (PriceMatrixError, ValueError, OSError) as e:
+            logger.warning(f"[PriceMatrix] Can't map {self.path}: {e}")
+            return None
+        self._mapping = mapping
+        self._directory_version = -1
+        return mapping
+
+    def read(self, symbol: str) -> Optional[PriceSeries]:
+        """A symbol's bars as read-only views (None if not published)"""
+        symbol = symbol.upper()
+        deadline = None
+        while True:
+            mapping = self._current()
+            if mapping is None:
+                self.misses += 1
+                return None
+
+            version = int(mapping.header[_VERSION])
+            if version % 2 == 0:
+                if version != self._directory_version:
+                    self._directory = mapping.directory()
+                    self._directory_version = version
+                slot = self._directory.get(symbol)
+                series = mapping.series(symbol, self.timeframe, slot) if slot is not None else None
+                if int(mapping.header[_VERSION]) == version:
+                    if series is None:
+                        self.misses += 1
+                    else:
+                        self.hits += 1
+                    return series
+
+            deadline = deadline or time.monotonic() + READ_TIMEOUT_SECONDS
+            if time.monotonic() > deadline:
+                logger.warning(f"[PriceMatrix] {self.path} stayed locked for writing - reading nothing")
+                self.misses += 1
+                return None
+            time.sleep(0)
+
+    def symbols(self) -> List[str]:
+        """Published symbols"""
+        mapping = self._current()
+        return sorted(mapping.directory()) if mapping is not None else []
+
+    @property
+    def version(self) -> Tuple[int, int]:
+        """(generation, version) of the newest mapping - changes with every write"""
+        mapping = self._current()
+        if mapping is None:
+            return 0, 0
+        return int(mapping.header[_GENERATION]), int(mapping.header[_VERSION])
+
+    # ===== WRITING =====
+
+    @contextmanager
+    def _write_lock(self) -> Iterator[None]:
+        os.makedirs(self.root, exist_ok=True)
+        with open(self._lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def publish(
+        self,
+        symbol: str,
+        timestamps: np.ndarray,
+        values: np.ndarray,
+        covered_from: Optional[int] = None,
+        covered_to: Optional[int] = None,
+        flags: int = 0,
+    ) -> Optional[PriceSeries]:
+        """
+        Merge bars into a symbol's series.
+
+        Args:
+            symbol: Symbol (at most 16 characters)
+            timestamps: Epoch microseconds per bar
+            values: (5, n) open/high/low/close/volume
+            covered_from, covered_to: Time range the bars are complete for
+                (default: first to last bar). Bars of an overlapping earlier
+                range outside it are kept; a disjoint range replaces them.
+            flags: FLAG_TZ_AWARE / FLAG_TEXT - how the timestamps should be read back
+
+        Returns:
+            The symbol's series after the write
+        """
+        name = symbol.upper()
+        if len(name.encode("ascii")) > NAME_BYTES:
+            raise ValueError(f"Symbol {symbol} is longer than {NAME_BYTES} characters")
+
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        values = np.asarray(values, dtype=np.float64).reshape(len(COLUMNS), len(timestamps))
+        # Sorted, one bar per timestamp (the last one given wins)
+        order = np.argsort(timestamps, kind="stable")
+        timestamps, values = timestamps[order], values[:, order]
+        if len(timestamps):
+            keep = np.append(timestamps[1:] != timestamps[:-1], True)
+            timestamps, values = timestamps[keep], values[:, keep]
+            covered_from = min(covered_from, int(timestamps[0])) if covered_from is not None else int(timestamps[0])
+            covered_to = max(covered_to, int(timestamps[-1])) if covered_to is not None else int(timestamps[-1])
+        elif covered_from is None or covered_to is None:
+            return self.read(name)
+
+        with self._write_lock():
+            mapping = self._open_for_write()
+            slot = mapping.directory().get(name) if mapping is not None else None
+            old = None
+            if slot is not None:
+                _, length, old_from, old_to, _, _ = (int(v) for v in mapping.meta[slot])
+                old = (mapping.timestamps[slot, :length], mapping.values[:, slot, :length], old_from, old_to)
+            merged = _merge(old, timestamps, values, covered_from, covered_to) + (flags,)
+
+            if mapping is not None and slot is not None and self._append(mapping, slot, *merged):
+                self.appends += 1
+            elif mapping is not None and mapping.used < mapping.layout.slots \
+                    and len(merged[0]) <= mapping.layout.capacity:
+                self._write_slot(mapping, name, slot, *merged)
+                self.slot_writes += 1
+            else:
+                self._rebuild(mapping, name, *merged)
+                self.rebuilds += 1
+            if mapping is not None:
+                mapping.close()
+
+        return self.read(name)
+
+    def _open_for_write(self) -> Optional[_Mapping]:
+        try:
+            mapping = _Mapping(self.path, writable=True)
+        except FileNotFoundError:
+            return None
+        except (PriceMatrixError, ValueError, OSError) as e:
+            logger.warning(f"[PriceMatrix] Replacing unusable {self.path}: {e}")
+            return None
+        if mapping.header[_VERSION] % 2:
+            # A writer died mid-write: start a fresh generation
+            logger.warning(f"[PriceMatrix] {self.path} was left mid-write - starting over")
+            mapping.header[_SUPERSEDED] = 1
+            mapping.close()
+            return None
+        return mapping
+
+    @staticmethod
+    def _append(mapping: _Mapping, slot: int, timestamps, values,
+                covered_from: int, covered_to: int, flags: int) -> bool:
+        """Write in place if only the last bar changes or bars are added (False if not possible)"""
+        length = int(mapping.meta[slot, _LENGTH])
+        keep = max(length - 1, 0)  # Published bars that must stay as they are
+        if len(timestamps) > mapping.layout.capacity or len(timestamps) < keep:
+            return False
+        if mapping.meta[slot, _FLAGS] != flags:
+            return False
+        if not (np.array_equal(timestamps[:keep], mapping.timestamps[slot, :keep])
+                and np.array_equal(values[:, :keep], mapping.values[:, slot, :keep])):
+            return False
+
+        with mapping.writing():
+            mapping.timestamps[slot, keep:len(timestamps)] = timestamps[keep:]
+            mapping.values[:, slot, keep:len(timestamps)] = values[:, keep:]
+            mapping.meta[slot] = [1, len(timestamps), covered_from, covered_to, _now_us(), flags]
+        return True
+
+    @staticmethod
+    def _write_slot(mapping: _Mapping, name: str, old_slot: Optional[int],
+                    timestamps, values, covered_from: int, covered_to: int, flags: int) -> None:
+        """Write the series to the next free slot and retire the old one"""
+        slot = mapping.used
+        # Not visible to readers until it's marked live
+        mapping.timestamps[slot, :len(timestamps)] = timestamps
+        mapping.values[:, slot, :len(timestamps)] = values
+        mapping.names[slot] = 0
+        mapping.names[slot, :len(name)] = np.frombuffer(name.encode("ascii"), dtype=np.uint8)
+        with mapping.writing():
+            mapping.meta[slot] = [1, len(timestamps), covered_from, covered_to, _now_us(), flags]
+            if old_slot is not None:
+                mapping.meta[old_slot, _LIVE] = 0
+            mapping.header[_USED] += 1
+
+    def _rebuild(self, old: Optional[_Mapping], name: str,
+                 timestamps, values, covered_from: int, covered_to: int, flags: int) -> None:
+        """Write a compacted, larger generation and atomically replace the file"""
+        directory = old.directory() if old is not None else {}
+        directory.pop(name, None)
+        lengths = [int(old.meta[slot, _LENGTH]) for slot in directory.values()] + [len(timestamps)]
+        longest = max(lengths)
+
+        capacity = old.layout.capacity if old is not None else MIN_CAPACITY
+        if longest > capacity:
+            capacity = max(longest + longest // 2, capacity * 2)
+        slots = max(MIN_SLOTS, 2 * len(lengths))
+        generation = int(old.header[_GENERATION]) + 1 if old is not None else 1
+
+        fd, temp_path = tempfile.mkstemp(dir=self.root, prefix=f".{self.timeframe}-", suffix=".tmp")
+        os.close(fd)
+        try:
+            new = _Mapping.create(temp_path, slots, capacity, generation)
+            for symbol, old_slot in directory.items():
+                length = int(old.meta[old_slot, _LENGTH])
+                self._copy_into(new, symbol, old.timestamps[old_slot, :length], old.values[:, old_slot, :length],
+                                old.meta[old_slot])
+            self._copy_into(new, name, timestamps, values,
+                            [1, len(timestamps), covered_from, covered_to, _now_us(), flags])
+            new.header[_UPDATED_AT] = _now_us()
+            new.close()
+            os.replace(temp_path, self.path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+        if old is not None:
+            old.header[_SUPERSEDED] = 1
+        logger.info(f"[PriceMatrix] {self.path} generation {generation}: "
+                    f"{len(lengths)} symbols, {slots} slots x {capacity} bars")
+
+    @staticmethod
+    def _copy_into(mapping: _Mapping, name: str, timestamps, values, meta) -> None:
+        slot = mapping.used
+        mapping.timestamps[slot, :len(timestamps)] = timestamps
+        mapping.values[:, slot, :len(timestamps)] = values
+        mapping.names[slot, :len(name)] = np.frombuffer(name.encode("ascii"), dtype=np.uint8)
+        mapping.meta[slot] = meta
+        mapping.header[_USED] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        generation, version = self.version
+        mapping = self._current()
+        return {
+            "timeframe": self.timeframe,
+            "generation": generation,
+            "version": version,
+            "symbols": len(mapping.directory()) if mapping is not None else 0,
+            "slots": mapping.layout.slots if mapping is not None else 0,
+            "capacity": mapping.layout.capacity if mapping is not None else 0,
+            "bytes": mapping.layout.size if mapping is not None else 0,
+            "hits": self.hits,
+            "misses": self.misses,
+            "appends": self.appends,
+            "slot_writes": self.slot_writes,
+            "rebuilds": self.rebuilds,
+        }
+
+
+def _merge(old, timestamps, values, covered_from: int, covered_to: int):
+    """
+    New bars merged over an existing series.
+
+    The new bars are complete for their covered range, so they replace the
+    old bars inside it; old bars outside it stay if the ranges overlap or
+    touch. Returns (timestamps, values, covered_from, covered_to).
+    """
+    if old is None:
+        return timestamps, values, covered_from, covered_to
+    old_timestamps, old_values, old_from, old_to = old
+    if covered_from > old_to + 1 or covered_to + 1 < old_from:
+        return timestamps, values, covered_from, covered_to
+
+    outside = (old_timestamps < covered_from) | (old_timestamps > covered_to)
+    merged_timestamps = np.concatenate([old_timestamps[outside], timestamps])
+    merged_values = np.concatenate([old_values[:, outside], values], axis=1)
+    order = np.argsort(merged_timestamps, kind="stable")
+    return merged_timestamps[order], merged_values[:, order], min(old_from, covered_from), max(old_to, covered_to)
+
+
+# ==================== SERVICE ====================
+
+class PriceMatrixService:
+    """
+    Price matrices for every timeframe under one directory.
+
+    Usage:
+        matrix = get_price_matrix()          # None when PRICE_MATRIX_DIR isn't set
+        series = matrix.read("AAPL", "1Day")
+        if series is None or not series.covers(start_us, end_us):
+            series = matrix.publish_bars("AAPL", "1Day", await alpaca.get_bars(...))
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._matrices: Dict[str, PriceMatrix] = {}
+
+    def matrix(self, timeframe: str) -> PriceMatrix:
+        key = timeframe.lower()
+        matrix = self._matrices.get(key)
+        if matrix is None:
+            matrix = self._matrices[key] = PriceMatrix(self.root, key)
+        return matrix
+
+    def read(self, symbol: str, timeframe: str) -> Optional[PriceSeries]:
+        return self.matrix(timeframe).read(symbol)
+
+    def publish_bars(
+        self,
+        symbol: str,
+        timeframe: str,
+        bars: Sequence[Dict[str, Any]],
+        covered_from: Optional[int] = None,
+        covered_to: Optional[int] = None,
+    ) -> Optional[PriceSeries]:
+        """Publish bar dicts from the data API (timestamp/open/high/low/close/volume, or t/o/h/l/c/v)"""
+        stamps = [bar.get("timestamp") or bar.get("t") for bar in bars]
+        timestamps = np.fromiter((to_epoch_us(ts) for ts in stamps), dtype=np.int64, count=len(bars))
+        values = np.array(
+            [[float(bar.get(column) or bar.get(column[0], 0)) for bar in bars] for column in COLUMNS],
+            dtype=np.float64,
+        ).reshape(len(COLUMNS), len(bars))
+        flags = 0
+        if stamps and isinstance(stamps[0], str):
+            flags |= FLAG_TEXT
+        if stamps and _is_tz_aware(stamps[0]):
+            flags |= FLAG_TZ_AWARE
+        return self.matrix(timeframe).publish(symbol, timestamps, values, covered_from, covered_to, flags)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "root": self.root,
+            "timeframes": {timeframe: matrix.get_stats() for timeframe, matrix in self._matrices.items()},
+        }
+
+
+# Singleton instance
+_price_matrix: Optional[PriceMatrixService] = None
+
+
+def get_price_matrix() -> Optional[PriceMatrixService]:
+    """
+    Get the host-wide price matrix (directory from PRICE_MATRIX_DIR, e.g.
+    /dev/shm/chartsense-prices). None when it isn't configured - every
+    process then keeps its own bars.
+    """
+    global _price_matrix
+    if _price_matrix is None:
+        root = os.getenv("PRICE_MATRIX_DIR")
+        if not root:
+            return None
+        if fcntl is None:
+            logger.warning("[PriceMatrix] File locking isn't available on this platform - disabled")
+            return None
+        _price_matrix = PriceMatrixService(root)
+    return _price_matrix
+
+
+def reset_price_matrix() -> None:
+    """Reset the global price matrix (for testing)"""
+    global _price_matrix
+    _price_matrix = None
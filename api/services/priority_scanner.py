@@ -2,8 +2,10 @@
 Priority Tier Scanner Service
 Implements smart scanning with dynamic priority based on volatility and volume
 """
+import heapq
+import itertools
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from enum import Enum
 from dataclasses import dataclass, field
@@ -18,6 +20,21 @@ class PriorityTier(str, Enum):
     LOW = "LOW"         # Tier 3: Every 3 minutes - Low activity, consolidating
 
 
+# Scan interval in seconds per tier
+TIER_SCAN_INTERVALS: Dict[PriorityTier, int] = {
+    PriorityTier.HIGH: 3,
+    PriorityTier.STANDARD: 30,
+    PriorityTier.LOW: 180,
+}
+
+# Scan order when several symbols are due at once (lower first)
+TIER_RANK: Dict[PriorityTier, int] = {
+    PriorityTier.HIGH: 0,
+    PriorityTier.STANDARD: 1,
+    PriorityTier.LOW: 2,
+}
+
+
 @dataclass
 class SymbolPriority:
     """Priority data for a single symbol"""
@@ -38,10 +55,13 @@ class SymbolPriority:
     # Historical accuracy at this symbol
     historical_win_rate: float = 0.5
     signals_generated: int = 0
+    last_signal_at: Optional[datetime] = None
 
     # Timing
     time_in_current_tier: int = 0  # seconds
     tier_change_reason: str = ""
+    tier_entered_at: Optional[datetime] = None
+    next_scan_at: Optional[datetime] = None  # None = due now
 
     def should_scan(self) -> bool:
         """Check if this symbol should be scanned based on its tier"""
@@ -49,22 +69,46 @@ class SymbolPriority:
             return True
 
         elapsed = (datetime.now() - self.last_scan_time).total_seconds()
-
-        if self.tier == PriorityTier.HIGH:
-            return elapsed >= 3  # 3 seconds
-        elif self.tier == PriorityTier.STANDARD:
-            return elapsed >= 30  # 30 seconds
-        else:  # LOW
-            return elapsed >= 180  # 3 minutes
+        return elapsed >= self.get_scan_interval()
 
     def get_scan_interval(self) -> int:
         """Get scan interval in seconds for this tier"""
-        if self.tier == PriorityTier.HIGH:
-            return 3
-        elif self.tier == PriorityTier.STANDARD:
-            return 30
-        else:
-            return 180
+        return TIER_SCAN_INTERVALS[self.tier]
+
+
+def compute_activity_metrics(
+    highs: List[float],
+    lows: List[float],
+    closes: List[float],
+    volumes: List[float],
+    lookback: int = 20,
+) -> Dict[str, float]:
+    """
+    Activity metrics for update_symbol_metrics from a symbol's recent bars.
+
+    Returns:
+        volume_ratio: Last bar's volume / average volume of the bars before it
+        volatility_ratio: Average true range of the last 5 bars / over the lookback
+        price_change_pct: Last bar's close-to-close change in percent
+    """
+    if len(closes) < 2:
+        return {"volume_ratio": 1.0, "volatility_ratio": 1.0, "price_change_pct": 0.0}
+
+    prior_volumes = volumes[-lookback - 1:-1]
+    avg_volume = sum(prior_volumes) / len(prior_volumes)
+
+    true_ranges = [
+        max(highs[i] - lows[i], abs(highs[i] - closes[i - 1]), abs(lows[i] - closes[i - 1]))
+        for i in range(max(1, len(closes) - lookback), len(closes))
+    ]
+    recent = true_ranges[-5:]
+    avg_range = sum(true_ranges) / len(true_ranges)
+
+    return {
+        "volume_ratio": volumes[-1] / avg_volume if avg_volume > 0 else 1.0,
+        "volatility_ratio": (sum(recent) / len(recent)) / avg_range if avg_range > 0 else 1.0,
+        "price_change_pct": (closes[-1] / closes[-2] - 1) * 100 if closes[-2] else 0.0,
+    }
 
 
 class PriorityScannerService:
@@ -86,9 +130,23 @@ class PriorityScannerService:
         - Low volume (< 50% of average)
         - Price consolidating in tight range
         - No recent signals
+
+    Scheduling:
+        Symbols sit in a min-heap keyed by their next-scan time, so
+        register/reschedule/pop are O(log n) and finding the due symbols
+        costs O(k log n) for k due symbols - independent of universe size.
+        Heap entries are invalidated lazily: rescheduling pushes a new entry
+        and bumps the symbol's token, and stale entries are skipped on pop.
+        A second heap keyed by each HIGH symbol's last activity (entering
+        the tier or its latest signal) drives demotion the same way.
+
+    Tiers follow the metrics fed through update_symbol_metrics, except that
+    a strong signal holds a symbol in HIGH until it has gone
+    SIGNAL_HOLD_MINUTES without another one (demote_inactive_symbols).
     """
 
-    def __init__(self):
+    def __init__(self, clock: Optional[Callable[[], datetime]] = None):
+        self._clock = clock or datetime.now
         self._symbol_priorities: Dict[str, SymbolPriority] = {}
         self._total_scans: int = 0
         self._scans_by_tier: Dict[PriorityTier, int] = {
@@ -96,8 +154,17 @@ class PriorityScannerService:
             PriorityTier.STANDARD: 0,
             PriorityTier.LOW: 0,
         }
+        self._tier_counts: Dict[PriorityTier, int] = {tier: 0 for tier in PriorityTier}
         self._last_priority_update: Optional[datetime] = None
 
+        # Due-time heap: (due_ts, tier_rank, last_scan_ts, token, symbol)
+        self._schedule: List[Tuple[float, int, float, int, str]] = []
+        # HIGH-tier demotion heap: (last_activity_ts, tier_entered_ts, symbol)
+        self._high_tier_heap: List[Tuple[float, float, str]] = []
+        # Current token per symbol - heap entries with an older token are stale
+        self._tokens: Dict[str, int] = {}
+        self._token_counter = itertools.count()
+
         # Thresholds for tier promotion/demotion
         self.HIGH_VOLUME_THRESHOLD = 2.0  # 200% of average
         self.HIGH_VOLATILITY_THRESHOLD = 1.5  # 150% of average ATR
@@ -106,13 +173,89 @@ class PriorityScannerService:
         self.LOW_VOLUME_THRESHOLD = 0.5  # 50% of average
         self.LOW_VOLATILITY_THRESHOLD = 0.7  # 70% of average ATR
 
+        # Minutes a strong signal keeps a symbol in HIGH without another one
+        self.SIGNAL_HOLD_MINUTES = 30
+
+    # ==================== SCHEDULING ====================
+
+    def _schedule_symbol(self, priority: SymbolPriority, scanned_at: Optional[datetime] = None) -> None:
+        """
+        Push the symbol's next scan onto the heap, invalidating older entries.
+
+        The next scan is one tier interval after `scanned_at` (defaults to the
+        symbol's last scan time; never-scanned symbols are due immediately).
+        """
+        token = next(self._token_counter)
+        self._tokens[priority.symbol] = token
+
+        base_time = scanned_at or priority.last_scan_time
+        if base_time is None:
+            due_ts = 0.0  # Never scanned - due immediately
+            last_scan_ts = 0.0
+        else:
+            last_scan_ts = base_time.timestamp()
+            due_ts = last_scan_ts + priority.get_scan_interval()
+        # Same timezone as the clock that stamped the scan
+        priority.next_scan_at = (
+            base_time + timedelta(seconds=priority.get_scan_interval()) if base_time else None
+        )
+
+        heapq.heappush(
+            self._schedule,
+            (due_ts, TIER_RANK[priority.tier], last_scan_ts, token, priority.symbol),
+        )
+
+    def _is_current(self, token: int, symbol: str) -> bool:
+        return self._tokens.get(symbol) == token
+
+    def _set_tier(self, priority: SymbolPriority, tier: PriorityTier, reason: str) -> None:
+        """Change a symbol's tier, keeping counts, schedule and demotion heap in sync"""
+        if priority.tier == tier:
+            priority.tier_change_reason = reason
+            return
+
+        self._tier_counts[priority.tier] -= 1
+        self._tier_counts[tier] += 1
+        priority.tier = tier
+        priority.tier_change_reason = reason
+        priority.time_in_current_tier = 0
+        priority.tier_entered_at = self._clock()
+
+        self._schedule_symbol(priority)
+        if tier == PriorityTier.HIGH:
+            entered_ts = priority.tier_entered_at.timestamp()
+            heapq.heappush(self._high_tier_heap, (entered_ts, entered_ts, priority.symbol))
+
+    def _pop_due(self, now_ts: float, limit: Optional[int]) -> List[Tuple[int, float, str]]:
+        """Pop current heap entries that are due, returning (tier_rank, last_scan_ts, symbol)"""
+        due = []
+        while self._schedule and (limit is None or len(due) < limit):
+            due_ts, tier_rank, last_scan_ts, token, symbol = self._schedule[0]
+            if not self._is_current(token, symbol):
+                heapq.heappop(self._schedule)  # Stale entry
+                continue
+            if due_ts > now_ts:
+                break
+            heapq.heappop(self._schedule)
+            due.append((tier_rank, last_scan_ts, symbol))
+        return due
+
+    # ==================== REGISTRATION ====================
+
     def register_symbol(self, symbol: str, initial_tier: PriorityTier = PriorityTier.STANDARD) -> SymbolPriority:
         """Register a symbol for priority tracking"""
         if symbol not in self._symbol_priorities:
-            self._symbol_priorities[symbol] = SymbolPriority(
+            priority = SymbolPriority(
                 symbol=symbol,
-                tier=initial_tier
+                tier=initial_tier,
+                tier_entered_at=self._clock(),
             )
+            self._symbol_priorities[symbol] = priority
+            self._tier_counts[initial_tier] += 1
+            self._schedule_symbol(priority)
+            if initial_tier == PriorityTier.HIGH:
+                entered_ts = priority.tier_entered_at.timestamp()
+                heapq.heappush(self._high_tier_heap, (entered_ts, entered_ts, symbol))
             logger.debug(f"Registered {symbol} in {initial_tier.value} tier")
         return self._symbol_priorities[symbol]
 
@@ -121,6 +264,15 @@ class PriorityScannerService:
         for symbol in symbols:
             self.register_symbol(symbol)
 
+    def unregister_symbol(self, symbol: str) -> bool:
+        """Stop tracking a symbol. Its heap entries become stale and are dropped lazily."""
+        priority = self._symbol_priorities.pop(symbol, None)
+        if not priority:
+            return False
+        self._tier_counts[priority.tier] -= 1
+        self._tokens.pop(symbol, None)
+        return True
+
     def update_symbol_metrics(
         self,
         symbol: str,
@@ -146,13 +298,14 @@ class PriorityScannerService:
         priority.has_news_spike = has_news_spike
         priority.sentiment_score = sentiment_score
 
-        # Calculate new tier
+        # Calculate new tier (a recent strong signal holds HIGH until demote_inactive_symbols)
         old_tier = priority.tier
         new_tier = self._calculate_tier(priority)
+        if old_tier == PriorityTier.HIGH and self._signal_is_recent(priority):
+            new_tier = PriorityTier.HIGH
 
         if new_tier != old_tier:
-            priority.tier = new_tier
-            priority.time_in_current_tier = 0
+            self._set_tier(priority, new_tier, "")
             priority.tier_change_reason = self._get_tier_change_reason(priority)
             logger.info(f"{symbol} tier changed: {old_tier.value} -> {new_tier.value} ({priority.tier_change_reason})")
 
@@ -181,6 +334,11 @@ class PriorityScannerService:
         # Default to STANDARD
         return PriorityTier.STANDARD
 
+    def _signal_is_recent(self, priority: SymbolPriority) -> bool:
+        if priority.last_signal_at is None:
+            return False
+        return (self._clock() - priority.last_signal_at).total_seconds() < self.SIGNAL_HOLD_MINUTES * 60
+
     def _get_tier_change_reason(self, priority: SymbolPriority) -> str:
         """Get human-readable reason for tier placement"""
         reasons = []
@@ -203,54 +361,80 @@ class PriorityScannerService:
 
     def get_symbols_to_scan(self) -> List[str]:
         """Get list of symbols that should be scanned now, ordered by priority"""
-        to_scan = []
-
-        # Sort by tier (HIGH first) then by time since last scan
-        sorted_priorities = sorted(
-            self._symbol_priorities.values(),
-            key=lambda p: (
-                0 if p.tier == PriorityTier.HIGH else 1 if p.tier == PriorityTier.STANDARD else 2,
-                p.last_scan_time or datetime.min
-            )
-        )
+        due = self._pop_due(self._clock().timestamp(), limit=None)
 
-        for priority in sorted_priorities:
-            if priority.should_scan():
-                to_scan.append(priority.symbol)
+        # Peek only - put the entries back with their current tokens
+        for tier_rank, last_scan_ts, symbol in due:
+            self._schedule_symbol(self._symbol_priorities[symbol])
 
-        return to_scan
+        # Sort by tier (HIGH first) then by time since last scan
+        due.sort(key=lambda entry: (entry[0], entry[1]))
+        return [symbol for _, _, symbol in due]
 
     def get_next_symbol_to_scan(self) -> Optional[str]:
         """Get the single highest priority symbol to scan next"""
         symbols = self.get_symbols_to_scan()
         return symbols[0] if symbols else None
 
+    def pop_due_symbols(self, limit: Optional[int] = None) -> List[str]:
+        """
+        Take the symbols that are due for a scan, ordered by priority.
+
+        Popped symbols are leased: they are rescheduled one tier interval
+        out, so they aren't handed out again before the caller records the
+        scan (record_scan reschedules them from the actual scan time).
+
+        Args:
+            limit: Maximum number of symbols to return (None = all due).
+                With a limit, the longest-overdue symbols are taken first.
+
+        Returns:
+            Symbols to scan now, HIGH tier first, longest-waiting first
+        """
+        now = self._clock()
+        due = self._pop_due(now.timestamp(), limit)
+
+        for _, _, symbol in due:
+            # Lease: schedule as if scanned now, without counting a scan
+            self._schedule_symbol(self._symbol_priorities[symbol], scanned_at=now)
+
+        due.sort(key=lambda entry: (entry[0], entry[1]))
+        return [symbol for _, _, symbol in due]
+
+    def seconds_until_next_due(self) -> Optional[float]:
+        """Seconds until the next symbol is due (0 if one is due now, None if none registered)"""
+        while self._schedule:
+            due_ts, _, _, token, symbol = self._schedule[0]
+            if self._is_current(token, symbol):
+                return max(0.0, due_ts - self._clock().timestamp())
+            heapq.heappop(self._schedule)
+        return None
+
     def record_scan(self, symbol: str) -> None:
         """Record that a symbol was just scanned"""
         priority = self._symbol_priorities.get(symbol)
         if priority:
-            priority.last_scan_time = datetime.now()
+            priority.last_scan_time = self._clock()
             priority.scan_count += 1
             self._total_scans += 1
             self._scans_by_tier[priority.tier] += 1
+            self._schedule_symbol(priority)
 
     def record_signal(self, symbol: str, signal_type: str, confidence: float) -> None:
         """Record that a signal was generated for a symbol"""
         priority = self._symbol_priorities.get(symbol)
         if priority:
             priority.signals_generated += 1
+            priority.last_signal_at = self._clock()
 
             # If strong signal, promote to HIGH tier temporarily
             if confidence >= 70 and signal_type in ["BUY", "STRONG_BUY"]:
-                priority.tier = PriorityTier.HIGH
-                priority.tier_change_reason = f"Strong {signal_type} signal at {confidence:.0f}%"
+                self._set_tier(priority, PriorityTier.HIGH, f"Strong {signal_type} signal at {confidence:.0f}%")
                 logger.info(f"{symbol} promoted to HIGH tier: {priority.tier_change_reason}")
 
     def get_tier_summary(self) -> Dict[str, Any]:
         """Get summary of current tier distribution"""
-        tier_counts = {tier: 0 for tier in PriorityTier}
-        for priority in self._symbol_priorities.values():
-            tier_counts[priority.tier] += 1
+        tier_counts = self._tier_counts
 
         return {
             "total_symbols": len(self._symbol_priorities),
@@ -284,7 +468,10 @@ class PriorityScannerService:
             "price_change_pct": priority.price_change_pct,
             "has_news_spike": priority.has_news_spike,
             "tier_change_reason": priority.tier_change_reason,
-            "should_scan_now": priority.should_scan(),
+            "next_scan_at": priority.next_scan_at.isoformat() if priority.next_scan_at else None,
+            "should_scan_now": (
+                priority.next_scan_at is None or priority.next_scan_at <= self._clock()
+            ),
         }
 
     def get_all_priorities(self) -> List[Dict[str, Any]]:
@@ -294,32 +481,114 @@ class PriorityScannerService:
             for symbol in self._symbol_priorities.keys()
         ]
 
-    def demote_inactive_symbols(self, inactivity_threshold_minutes: int = 30) -> int:
+    def demote_inactive_symbols(self, inactivity_threshold_minutes: Optional[int] = None) -> int:
         """
-        Demote symbols that have been in HIGH tier without signals for too long.
+        Demote HIGH symbols that have gone too long without a signal to the
+        tier their metrics call for. Symbols whose metrics still say HIGH stay.
         Returns count of demoted symbols.
+
+        Only symbols whose last activity (entering HIGH or their latest
+        signal) has passed the threshold are visited; symbols with a newer
+        signal are pushed back keyed by it.
+
+        Args:
+            inactivity_threshold_minutes: Defaults to SIGNAL_HOLD_MINUTES
         """
+        if inactivity_threshold_minutes is None:
+            inactivity_threshold_minutes = self.SIGNAL_HOLD_MINUTES
         demoted = 0
-        threshold = timedelta(minutes=inactivity_threshold_minutes)
-
-        for priority in self._symbol_priorities.values():
-            if priority.tier == PriorityTier.HIGH:
-                if priority.last_scan_time:
-                    priority.time_in_current_tier = int(
-                        (datetime.now() - priority.last_scan_time).total_seconds()
-                    )
-
-                # If HIGH for too long without new signals, demote to STANDARD
-                if priority.time_in_current_tier > threshold.total_seconds():
-                    if priority.signals_generated == 0:
-                        priority.tier = PriorityTier.STANDARD
-                        priority.tier_change_reason = "Demoted: No signals in HIGH tier"
-                        priority.time_in_current_tier = 0
-                        demoted += 1
-                        logger.info(f"{priority.symbol} demoted to STANDARD: inactivity")
+        now = self._clock()
+        cutoff_ts = now.timestamp() - inactivity_threshold_minutes * 60
+
+        while self._high_tier_heap and self._high_tier_heap[0][0] <= cutoff_ts:
+            _, entered_ts, symbol = heapq.heappop(self._high_tier_heap)
+            priority = self._symbol_priorities.get(symbol)
+            if not priority or priority.tier != PriorityTier.HIGH:
+                continue
+            if priority.tier_entered_at and priority.tier_entered_at.timestamp() != entered_ts:
+                continue  # Stale - re-entered HIGH later and has a newer entry
+
+            priority.time_in_current_tier = int(now.timestamp() - entered_ts)
+
+            last_signal_ts = priority.last_signal_at.timestamp() if priority.last_signal_at else 0.0
+            if last_signal_ts > cutoff_ts:
+                # Signalled since entering HIGH - check again once that signal has aged out
+                heapq.heappush(self._high_tier_heap, (last_signal_ts, entered_ts, symbol))
+                continue
+
+            tier = self._calculate_tier(priority)
+            if tier == PriorityTier.HIGH:
+                heapq.heappush(self._high_tier_heap, (now.timestamp(), entered_ts, symbol))
+                continue
+            self._set_tier(priority, tier, "Demoted: No signals in HIGH tier")
+            demoted += 1
+            logger.info(f"{priority.symbol} demoted to {tier.value}: inactivity")
 
         return demoted
 
+    def export_state(self) -> Dict[str, Any]:
+        """Export tier assignments and scan history for a warm-restart snapshot"""
+        return {
+            "symbols": [
+                {
+                    "symbol": p.symbol,
+                    "tier": p.tier.value,
+                    "last_scan_time": p.last_scan_time.isoformat() if p.last_scan_time else None,
+                    "scan_count": p.scan_count,
+                    "volume_ratio": p.volume_ratio,
+                    "volatility_ratio": p.volatility_ratio,
+                    "price_change_pct": p.price_change_pct,
+                    "has_news_spike": p.has_news_spike,
+                    "sentiment_score": p.sentiment_score,
+                    "historical_win_rate": p.historical_win_rate,
+                    "signals_generated": p.signals_generated,
+                    "last_signal_at": p.last_signal_at.isoformat() if p.last_signal_at else None,
+                    "tier_change_reason": p.tier_change_reason,
+                }
+                for p in self._symbol_priorities.values()
+            ],
+            "total_scans": self._total_scans,
+            "scans_by_tier": {tier.value: count for tier, count in self._scans_by_tier.items()},
+        }
+
+    def restore_state(self, state: Dict[str, Any]) -> int:
+        """
+        Restore tier assignments from a snapshot.
+
+        Returns the number of symbols restored.
+        """
+        restored = 0
+        for data in state.get("symbols", []):
+            try:
+                tier = PriorityTier(data["tier"])
+                priority = self.register_symbol(data["symbol"], tier)
+                last_scan = data.get("last_scan_time")
+                priority.last_scan_time = datetime.fromisoformat(last_scan) if last_scan else None
+                priority.scan_count = data.get("scan_count", 0)
+                priority.volume_ratio = data.get("volume_ratio", 1.0)
+                priority.volatility_ratio = data.get("volatility_ratio", 1.0)
+                priority.price_change_pct = data.get("price_change_pct", 0.0)
+                priority.has_news_spike = data.get("has_news_spike", False)
+                priority.sentiment_score = data.get("sentiment_score", 0.5)
+                priority.historical_win_rate = data.get("historical_win_rate", 0.5)
+                priority.signals_generated = data.get("signals_generated", 0)
+                last_signal = data.get("last_signal_at")
+                priority.last_signal_at = datetime.fromisoformat(last_signal) if last_signal else None
+                self._set_tier(priority, tier, data.get("tier_change_reason", ""))
+                self._schedule_symbol(priority)
+                restored += 1
+            except (KeyError, ValueError) as e:
+                logger.warning(f"Skipping invalid priority snapshot entry {data}: {e}")
+
+        self._total_scans = state.get("total_scans", self._total_scans)
+        for tier_value, count in state.get("scans_by_tier", {}).items():
+            try:
+                self._scans_by_tier[PriorityTier(tier_value)] = count
+            except ValueError:
+                continue
+
+        return restored
+
 
 # Singleton instance
 _priority_scanner: Optional[PriorityScannerService] = None
@@ -0,0 +1,353 @@
+"""
+Bot Replay
+Runs the live TradingBot over historical minute bars on a virtual clock
+
+The bot's own code runs unchanged - main loop, session handling,
+hierarchical scanner, risk manager and order handling - against:
+- SimulatedBroker in place of AlpacaService (fills from the replayed minutes)
+- VirtualClock in place of the wall clock (time jumps from sleep to sleep)
+- An in-memory database seeded with the replayed symbols as the watchlist
+
+Every bar the bot sees is one that had closed at the simulated time, so a
+replay shows what the bot would have done on those days, decision for
+decision, in seconds per day instead of hours.
+
+Optionally the ExitManager and CircuitBreaker monitors run alongside:
+- Positions the bot opens are registered with the exit manager, which
+  protects them with OCO stop/target orders
+- A breaker trigger pauses new entries until the breaker resets
+
+Crypto, AI discovery and the auto-optimizer are off during a replay
+(no historical data or deterministic answers for them).
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import pytz
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from database.connection import Base
+from database.models import Position, UserWatchlist
+from models.backtest import BacktestResult, EquityPoint
+from .auto_optimizer import AutoOptimizer
+from .backtesting.metrics import PerformanceMetrics
+from .backtesting.replay_data import ReplayMarketData
+from .backtesting.slippage import SlippageConfig
+from .circuit_breaker import BreakerConfig, CircuitBreaker
+from .clock import DEFAULT_IDLE_HOPS, VirtualClock
+from .exit_manager import ExitManager
+from .hierarchical_strategy import HierarchicalStrategy
+from .priority_scanner import PriorityScannerService
+from .simulated_broker import DEFAULT_SLIPPAGE, SimulatedBroker
+from .smart_scanner import SmartScanner
+from .trading_bot import BotState, TradingBot
+
+logger = logging.getLogger(__name__)
+
+EASTERN = pytz.timezone("US/Eastern")
+
+# How often the replay reconciles bot positions with the broker (seconds)
+POSITION_SYNC_SECONDS = 60
+
+
+@dataclass
+class ReplayResult:
+    """Outcome of a bot replay"""
+    backtest: BacktestResult           # Equity (one point per session close), round trips, metrics
+    orders_submitted: int
+    orders_rejected: int
+    fills: int
+    simulated_seconds: float
+    wall_seconds: float
+    breaker_triggers: List[Dict[str, Any]] = field(default_factory=list)
+    exits_managed: int = 0             # Exits the exit manager executed
+
+    @property
+    def speedup(self) -> float:
+        """Simulated time per wall-clock second"""
+        return self.simulated_seconds / self.wall_seconds if self.wall_seconds else 0.0
+
+
+class BotReplay:
+    """
+    Replays the trading bot over a historical period.
+
+    Usage:
+        data = ReplayMarketData.from_minute_store(get_minute_bar_store(), ["AAPL", "MSFT"], day, day)
+        replay = BotReplay(data, start=datetime(2024, 3, 4, 13, 0, tzinfo=timezone.utc),
+                           end=datetime(2024, 3, 5, 1, 0, tzinfo=timezone.utc))
+        result = await replay.run()
+    """
+
+    def __init__(
+        self,
+        market_data: ReplayMarketData,
+        start: datetime,
+        end: datetime,
+        symbols: Optional[List[str]] = None,
+        starting_cash: float = 100000.0,
+        bot_config: Optional[Dict[str, Any]] = None,
+        use_exit_manager: bool = False,
+        use_circuit_breaker: bool = False,
+        breaker_config: Optional[BreakerConfig] = None,
+        slippage: Optional[SlippageConfig] = DEFAULT_SLIPPAGE,
+        seed: int = 0,
+        idle_hops: int = DEFAULT_IDLE_HOPS,
+    ):
+        """
+        Args:
+            market_data: Minute bars (plus optional history) of the replayed symbols
+            start: Simulated start time (naive = local time)
+            end: Simulated end time
+            symbols: Watchlist for the bot (default: every symbol in market_data)
+            starting_cash: Simulated account cash
+            bot_config: Overrides in TradingBot config format (see TradingBot.start)
+            use_exit_manager: Run the ExitManager on the bot's positions
+            use_circuit_breaker: Run the CircuitBreaker on account equity
+            breaker_config: Circuit breaker thresholds
+            slippage: Broker slippage on market and stop fills
+            seed: Broker slippage noise seed
+            idle_hops: VirtualClock idle hops (see services/clock.py)
+        """
+        if end <= start:
+            raise ValueError("Replay end must be after its start")
+        self.market_data = market_data
+        self.start = start
+        self.end = end
+        self.symbols = [s.upper() for s in (symbols or market_data.symbols)]
+        self.starting_cash = starting_cash
+        self.bot_config = bot_config or {}
+        self.use_exit_manager = use_exit_manager
+        self.use_circuit_breaker = use_circuit_breaker
+        self.breaker_config = breaker_config
+        self.slippage = slippage
+        self.seed = seed
+        self.idle_hops = idle_hops
+
+        # Built by run()
+        self.clock: Optional[VirtualClock] = None
+        self.broker: Optional[SimulatedBroker] = None
+        self.bot: Optional[TradingBot] = None
+        self.exit_manager: Optional[ExitManager] = None
+        self.circuit_breaker: Optional[CircuitBreaker] = None
+        self.session_factory = None
+        self._equity_curve: List[EquityPoint] = []
+        self._exits_managed = 0
+
+    # ===== SETUP =====
+
+    def _create_database(self):
+        """In-memory database with the replayed symbols as the user watchlist"""
+        engine = create_engine(
+            "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool,
+        )
+        Base.metadata.create_all(engine)
+        session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        db = session_factory()
+        try:
+            for symbol in self.symbols:
+                db.add(UserWatchlist(symbol=symbol, auto_trade=True))
+            db.commit()
+        finally:
+            db.close()
+        return session_factory
+
+    def _build_bot(self) -> TradingBot:
+        clock, broker = self.clock, self.broker
+        bot = TradingBot(
+            alpaca_service=broker,
+            paper_trading=True,
+            clock=clock,
+            session_factory=self.session_factory,
+            smart_scanner=SmartScanner(alpaca_service=broker, clock=clock, strategy=HierarchicalStrategy(clock=clock)),
+            auto_optimizer=AutoOptimizer(alpaca_service=broker),
+        )
+        bot.priority_scanner = PriorityScannerService(clock=clock.now)
+        # No state snapshots to disk and no worker processes from a replay
+        bot.trading_config = replace(bot.trading_config, state_snapshot_enabled=False, bot_worker_processes=0)
+
+        if self.bot_config:
+            bot._apply_config(self.bot_config)
+        bot.enabled_symbols = list(self.symbols)
+        bot.asset_class_mode = "stocks"
+        bot.crypto_trading_enabled = False
+        bot.use_ai_discovery = False
+        bot.auto_optimize_enabled = False
+        return bot
+
+    async def _start_monitors(self) -> None:
+        if self.use_exit_manager:
+            self.exit_manager = ExitManager(alpaca_service=self.broker, clock=self.clock)
+
+            def count_exit(exit_event):
+                self._exits_managed += 1
+
+            self.exit_manager.on_exit(count_exit)
+            await self.exit_manager.start_monitoring()
+
+        if self.use_circuit_breaker:
+            self.circuit_breaker = CircuitBreaker(
+                alpaca_service=self.broker,
+                exit_manager=self.exit_manager,
+                config=self.breaker_config,
+                clock=self.clock,
+            )
+
+            def pause_entries(trigger_type, message):
+                self.bot.new_entries_paused = True
+
+            def resume_entries():
+                self.bot.new_entries_paused = False
+
+            self.circuit_breaker.on_trigger(pause_entries)
+            self.circuit_breaker.on_reset(resume_entries)
+            await self.circuit_breaker.start_monitoring()
+
+    async def _stop_monitors(self) -> None:
+        if self.circuit_breaker:
+            await self.circuit_breaker.stop_monitoring()
+        if self.exit_manager:
+            await self.exit_manager.stop_monitoring()
+
+    # ===== RUN =====
+
+    async def run(self) -> ReplayResult:
+        """Replay the bot from start to end"""
+        wall_start = time.perf_counter()
+        self.clock = VirtualClock(self.start, idle_hops=self.idle_hops)
+        self.broker = SimulatedBroker(
+            self.market_data, self.clock, starting_cash=self.starting_cash, slippage=self.slippage, seed=self.seed,
+        )
+        self.session_factory = self._create_database()
+        self.bot = bot = self._build_bot()
+        self._equity_curve = []
+        self._exits_managed = 0
+
+        logger.info(f"[Replay] {len(self.symbols)} symbols, {self.start} to {self.end}")
+        await bot._load_db_config()
+        bot.state = BotState.RUNNING
+        bot.start_time = self.clock.now()
+        await self._start_monitors()
+
+        tasks = [
+            asyncio.create_task(bot._main_loop()),
+            asyncio.create_task(self._record_session_closes()),
+            asyncio.create_task(self._sync_positions()),
+        ]
+        try:
+            await self.clock.sleep_until(self.end)
+        finally:
+            bot.state = BotState.STOPPED
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self._stop_monitors()
+
+        await self._record_equity()
+        return self._build_result(time.perf_counter() - wall_start)
+
+    async def _record_session_closes(self) -> None:
+        """Record equity at every regular-session close"""
+        while True:
+            day = self.clock.now(EASTERN).date()
+            close = EASTERN.localize(datetime(day.year, day.month, day.day, 16))
+            if close <= self.clock.now(EASTERN):
+                day += timedelta(days=1)
+                close = EASTERN.localize(datetime(day.year, day.month, day.day, 16))
+            await self.clock.sleep_until(close)
+            if day.weekday() < 5:
+                await self._record_equity()
+
+    async def _record_equity(self) -> None:
+        account = await self.broker.get_account()
+        self._equity_curve.append(EquityPoint(
+            timestamp=self.clock.now(timezone.utc),
+            equity=account["equity"],
+            cash=account["cash"],
+            positions_value=account["equity"] - account["cash"],
+        ))
+
+    async def _sync_positions(self) -> None:
+        """
+        Reconcile the bot's Position rows with the broker's positions.
+
+        Rows of positions the broker no longer holds (closed by a stop,
+        target or the exit manager) are removed, so the symbol can be
+        traded again; new positions are handed to the exit manager.
+        """
+        while True:
+            await self.clock.sleep(POSITION_SYNC_SECONDS)
+            held = {p["symbol"]: p for p in await self.broker.get_positions()}
+            db = self.session_factory()
+            try:
+                for row in db.query(Position).all():
+                    position = held.get(row.symbol)
+                    if position is None:
+                        db.delete(row)
+                        continue
+                    if self.exit_manager and not self.exit_manager.get_position(row.symbol) and position["quantity"] > 0:
+                        await self.exit_manager.register_position(
+                            symbol=row.symbol,
+                            quantity=position["quantity"],
+                            entry_price=position["entry_price"],
+                            stop_loss_price=row.stop_loss_price or position["entry_price"] * 0.95,
+                            take_profit_price=row.profit_target_price,
+                            trade_type=row.trade_type or "SWING",
+                            entry_signal_score=row.entry_score or 0,
+                            entry_reason=row.entry_reason or "",
+                        )
+                db.commit()
+            except Exception as e:
+                logger.error(f"[Replay] Position sync failed: {e}")
+            finally:
+                db.close()
+
+    # ===== RESULT =====
+
+    def _build_result(self, wall_seconds: float) -> ReplayResult:
+        broker = self.broker
+        metrics = PerformanceMetrics.calculate(
+            trades=broker.trades,
+            equity_curve=self._equity_curve,
+            initial_capital=self.starting_cash,
+        )
+        start_ts, end_ts = self.start.timestamp(), self.end.timestamp()
+        bars_processed = sum(
+            self.market_data.closed_minutes(symbol, end_ts) - self.market_data.closed_minutes(symbol, start_ts)
+            for symbol in self.symbols
+        )
+        backtest = BacktestResult(
+            symbols=self.symbols,
+            start_date=self.start.date(),
+            end_date=self.end.date(),
+            initial_capital=self.starting_cash,
+            strategy=TradingBot.__name__,
+            strategy_params=self.bot_config,
+            final_equity=self._equity_curve[-1].equity,
+            metrics=metrics,
+            equity_curve=self._equity_curve,
+            trades=broker.trades,
+            run_time_seconds=wall_seconds,
+            bars_processed=bars_processed,
+        )
+        result = ReplayResult(
+            backtest=backtest,
+            orders_submitted=broker.orders_submitted,
+            orders_rejected=broker.orders_rejected,
+            fills=len(broker.fills),
+            simulated_seconds=end_ts - start_ts,
+            wall_seconds=wall_seconds,
+            breaker_triggers=self.circuit_breaker.get_status()["trigger_history"] if self.circuit_breaker else [],
+            exits_managed=self._exits_managed,
+        )
+        logger.info(
+            f"[Replay] Done: {result.orders_submitted} orders, {len(broker.trades)} round trips, "
+            f"{metrics.total_return_pct:.2f}% return, {result.speedup:,.0f}x real time"
+        )
+        return result
@@ -7,6 +7,8 @@ from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
 from datetime import datetime, date
 
+from .clock import Clock, SYSTEM_CLOCK
+
 logger = logging.getLogger(__name__)
 
 
@@ -42,6 +44,7 @@ class RiskManager:
         risk_per_trade_pct: float = 0.02,
         max_daily_loss_pct: float = 0.03,
         default_stop_loss_pct: float = 0.05,
+        clock: Optional[Clock] = None,
     ):
         """
         Initialize risk manager.
@@ -52,7 +55,9 @@ class RiskManager:
             risk_per_trade_pct: Risk per trade (% of equity)
             max_daily_loss_pct: Maximum daily loss before stopping (% of equity)
             default_stop_loss_pct: Default stop-loss percentage
+            clock: Time source for the daily reset (default: wall clock)
         """
+        self.clock = clock or SYSTEM_CLOCK
         self.max_positions = max_positions
         self.max_position_size_pct = max_position_size_pct
         self.risk_per_trade_pct = risk_per_trade_pct
@@ -279,7 +284,7 @@ class RiskManager:
 
     def _reset_daily_if_needed(self, account_equity: float):
         """Reset daily tracking if it's a new day"""
-        today = date.today()
+        today = self.clock.today()
         if self._last_reset_date != today:
             self._daily_pnl = 0.0
             self._daily_trades = 0
@@ -0,0 +1,205 @@
+"""
+Scan Data Context
+=================
+
+Per-cycle cache of market data shared by every horizon of a hierarchical scan.
+
+Each horizon analyzes one fetch of its primary timeframe per symbol
+(SWING 1day, INTRADAY 1hour, SCALP 5min). Those timeframes don't overlap,
+so a SWING -> INTRADAY -> SCALP cascade still makes one fetch per symbol
+per horizon. What the context saves are revisits: a cascade scans a
+horizon again when its last scan found only FAIR opportunities, and
+without a shared context every such pass re-fetches and re-analyzes the
+same bars.
+
+The context holds, for the lifetime of one scan cycle:
+- Bars per (symbol, timeframe), served as slices for smaller limits
+- Derived adaptive indicators per (symbol, timeframe, limit, mode)
+- Pattern recognition results per (symbol, timeframe, limit)
+
+With a shared price matrix configured (PRICE_MATRIX_DIR), fetched bars are
+published to it and bars another process published recently enough are
+read from it instead of fetched, so partitioned bot workers and API
+workers share one copy of each symbol's bars.
+
+It also counts fetches made vs. fetches saved so the UI can show how much
+the cascade reused.
+"""
+
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .price_matrix import PriceSeries, get_price_matrix, to_epoch_us
+
+logger = logging.getLogger(__name__)
+
+# Bars in the shared price matrix count as current if they were complete up
+# to at most this long before the cycle started
+SHARED_BARS_MAX_AGE_SECONDS = 30
+
+
+@dataclass
+class _CachedBars:
+    """Bars fetched for one (symbol, timeframe) pair"""
+    bars: Sequence  # Bar dicts, or the PriceSeries they were published as
+    limit: int
+    fetched_at: datetime = field(default_factory=datetime.now)
+
+    def last(self, limit: int) -> List[Dict[str, Any]]:
+        if isinstance(self.bars, PriceSeries):
+            return self.bars.tail(limit).to_bars()
+        return self.bars[-limit:]
+
+    def covers(self, limit: int) -> bool:
+        """True if this fetch can answer a request for `limit` bars"""
+        # If the API returned fewer bars than requested, there is no more
+        # history to get - a larger request would return the same bars.
+        return limit <= self.limit or len(self.bars) < self.limit
+
+
+class ScanDataContext:
+    """
+    Shared data for a single scan cycle.
+
+    Not meant to outlive the cycle: bars are never refreshed, so a new
+    context should be created for every cycle.
+    """
+
+    def __init__(self, alpaca_service, cycle_id: Optional[str] = None, price_matrix=None):
+        self.alpaca = alpaca_service
+        self.price_matrix = price_matrix if price_matrix is not None else get_price_matrix()
+        self.created_at = datetime.now()
+        # Identifies the cycle across processes (worker pools keep one context per cycle)
+        self.cycle_id = cycle_id or uuid.uuid4().hex[:12]
+
+        self._bars: Dict[Tuple[str, str], _CachedBars] = {}
+        self._indicators: Dict[Tuple[str, str, int, str], Dict[str, Any]] = {}
+        self._patterns: Dict[Tuple[str, str, int], Optional[Dict[str, Any]]] = {}
+        # Latest activity metrics per symbol, for the priority scanner's tiers
+        self.symbol_metrics: Dict[str, Dict[str, float]] = {}
+
+        # Reuse statistics
+        self.fetches_made = 0
+        self.fetches_saved = 0
+        self.shared_reads = 0
+        self.indicator_computations = 0
+        self.indicator_reuses = 0
+        self.pattern_computations = 0
+        self.pattern_reuses = 0
+
+    async def get_bars(self, symbol: str, timeframe: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        Get the last `limit` bars for a symbol, fetching only if not cached.
+
+        Args:
+            symbol: Stock symbol
+            timeframe: Data API timeframe ("1min", "5min", "15min", "1hour", "1day")
+            limit: Number of bars wanted
+
+        Returns:
+            List of bar dicts (may be shorter than limit)
+        """
+        timeframe = timeframe.lower()
+        key = (symbol.upper(), timeframe)
+        cached = self._bars.get(key)
+        if cached and cached.covers(limit):
+            self.fetches_saved += 1
+            return cached.last(limit)
+
+        shared = self._read_shared(symbol, timeframe, limit)
+        if shared is not None:
+            self.fetches_saved += 1
+            self.shared_reads += 1
+            self._bars[key] = _CachedBars(bars=shared, limit=limit)
+            return shared.tail(limit).to_bars()
+
+        bars = await self.alpaca.get_bars(symbol, timeframe=timeframe, limit=limit)
+        self.fetches_made += 1
+        self._bars[key] = _CachedBars(bars=self._publish(symbol, timeframe, bars) or bars, limit=limit)
+        return bars
+
+    def _read_shared(self, symbol: str, timeframe: str, limit: int) -> Optional[PriceSeries]:
+        """The symbol's shared bars if there are enough of them and they are current"""
+        if self.price_matrix is None:
+            return None
+        series = self.price_matrix.read(symbol, timeframe)
+        if series is None or len(series) < limit:
+            return None
+        fresh_from = (self.created_at.timestamp() - SHARED_BARS_MAX_AGE_SECONDS) * 1_000_000
+        return series if series.covered_to >= fresh_from else None
+
+    def _publish(self, symbol: str, timeframe: str, bars: List[Dict[str, Any]]) -> Optional[PriceSeries]:
+        """Publish fetched bars (complete from the first one up to now) for other processes"""
+        if self.price_matrix is None or not bars:
+            return None
+        try:
+            first = bars[0].get("timestamp") or bars[0].get("t")
+            return self.price_matrix.publish_bars(
+                symbol, timeframe, bars,
+                covered_from=to_epoch_us(first), covered_to=time.time_ns() // 1000,
+            )
+        except (OSError, ValueError) as e:
+            logger.warning(f"[ScanContext] Couldn't publish {symbol} {timeframe} bars: {e}")
+            return None
+
+    def has_bars(self, symbol: str, timeframe: str) -> bool:
+        """Check if bars for a symbol/timeframe are already in the context"""
+        return (symbol.upper(), timeframe.lower()) in self._bars
+
+    def get_indicators(
+        self,
+        symbol: str,
+        timeframe: str,
+        limit: int,
+        mode: str,
+        compute: Callable[[], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """
+        Get derived indicators, computing them once per (symbol, timeframe, limit, mode).
+
+        Returns a shallow copy so callers can add keys without polluting the cache.
+        """
+        key = (symbol.upper(), timeframe.lower(), limit, mode)
+        if key in self._indicators:
+            self.indicator_reuses += 1
+        else:
+            self._indicators[key] = compute()
+            self.indicator_computations += 1
+        return dict(self._indicators[key])
+
+    def get_patterns(
+        self,
+        symbol: str,
+        timeframe: str,
+        limit: int,
+        compute: Callable[[], Optional[Dict[str, Any]]],
+    ) -> Optional[Dict[str, Any]]:
+        """Get pattern recognition results, computing them once per (symbol, timeframe, limit)"""
+        key = (symbol.upper(), timeframe.lower(), limit)
+        if key in self._patterns:
+            self.pattern_reuses += 1
+        else:
+            self._patterns[key] = compute()
+            self.pattern_computations += 1
+        return self._patterns[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get reuse statistics for this cycle"""
+        requests = self.fetches_made + self.fetches_saved
+        return {
+            "symbols": len({symbol for symbol, _ in self._bars}),
+            "timeframes_cached": len(self._bars),
+            "fetches_made": self.fetches_made,
+            "fetches_saved": self.fetches_saved,
+            "fetch_reuse_pct": round(self.fetches_saved / requests * 100, 1) if requests else 0.0,
+            "shared_reads": self.shared_reads,
+            "indicator_computations": self.indicator_computations,
+            "indicator_reuses": self.indicator_reuses,
+            "pattern_computations": self.pattern_computations,
+            "pattern_reuses": self.pattern_reuses,
+            "created_at": self.created_at.isoformat(),
+        }
@@ -0,0 +1,907 @@
+"""
+Simulated Broker
+Drop-in stand-in for AlpacaService with in-memory accounts and fills
+
+Orders go to the backtester's OrderSimulator and fill against bars as
+they close, so resting limit, stop, trailing-stop, bracket and OCO orders
+fill the way they do in backtests. Market orders fill at the last price
+during the regular session (plus slippage).
+
+Bars come from one of two places:
+- Replay: minute bars in a ReplayMarketData, processed lazily as the
+  clock moves past them (the bot replay).
+- Feed: bars and prices pushed with push_bar()/push_price() (load tests),
+  and with a data_service, the quotes the bot asks for. This is the paper
+  backend get_alpaca_service() returns with TRADING_BROKER_BACKEND=simulated.
+
+Every public AlpacaService method is implemented, so any paper-mode caller
+can use it. Without a data_service, latest bars and trades come from the
+simulator's own bars, the market clock from its clock, and asset search
+from the symbols it has seen. Orders can be replaced like Alpaca's
+(cancel-replace: the old order reports "replaced").
+
+Orders can take latency_seconds to reach the book ("pending_new" until
+they do), and with max_volume_fraction a bar only fills that share of its
+volume, so large orders fill over several bars ("partially_filled").
+
+Like Alpaca's, orders only work during the regular session: market and
+plain limit orders placed outside it are held for the open, and resting
+orders are checked against regular-session minutes. Extended-hours limit
+orders also fill against pre-market and after-hours minutes (while one is
+open, that symbol's other resting orders see those minutes too).
+
+Cash, positions and completed round trips are tracked in memory. Orders
+Alpaca would reject are rejected with the same exception types:
+insufficient buying power, and selling shares that are not held or are
+already committed to other open sell orders (no shorting).
+"""
+import heapq
+import logging
+import random
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import pytz
+
+from config.trading_config import get_trading_config
+from exceptions import (
+    AlpacaAuthError,
+    AlpacaError,
+    AlpacaInsufficientFundsError,
+    AlpacaOrderError,
+    AlpacaPositionError,
+)
+from models.backtest import SimulatedTrade
+from .alpaca_service import REGULAR_END, REGULAR_START, AlpacaService, market_session
+from .backtesting.order_simulator import (
+    Fill,
+    IntrabarPath,
+    OrderSimulator,
+    OrderStatus,
+    OrderType,
+    SimOrder,
+)
+from .backtesting.replay_data import TIMEFRAME_SECONDS, ReplayMarketData
+from .backtesting.slippage import SlippageConfig, SlippageModel
+from .clock import SYSTEM_CLOCK, Clock
+
+logger = logging.getLogger(__name__)
+
+EASTERN = pytz.timezone("US/Eastern")
+
+# Half of a typical large-cap spread, paid by market and stop fills
+DEFAULT_SLIPPAGE = SlippageConfig(model=SlippageModel.FIXED, fixed_slippage_pct=0.0005)
+
+# Reported statuses of orders that can still fill
+OPEN_STATUSES = ("pending_new", "new", "accepted", "held", "partially_filled")
+
+
+@dataclass
+class _Holding:
+    """An open position"""
+    quantity: float      # Negative when short
+    avg_price: float
+    entry_time: datetime
+
+
+@dataclass
+class _Route:
+    """Orders of one submission on their way to the book"""
+    order_ids: List[int]
+    symbol: str
+    session_bound: bool   # Works only in the regular session (else queued for the open)
+    extended: bool        # Extended-hours limit order
+
+
+class SimulatedBroker:
+    """
+    In-memory brokerage with AlpacaService's public methods.
+
+    Usage:
+        broker = SimulatedBroker(market_data, clock, starting_cash=100_000)
+        bot = TradingBot(alpaca_service=broker, clock=clock, ...)
+
+        broker = SimulatedBroker(latency_seconds=0.005, max_volume_fraction=0.1)
+        broker.push_bar("AAPL", 190.0, 190.5, 189.8, 190.2, volume=12000)
+    """
+
+    def __init__(
+        self,
+        market_data: Optional[ReplayMarketData] = None,
+        clock: Clock = SYSTEM_CLOCK,
+        starting_cash: float = 100000.0,
+        slippage: Optional[SlippageConfig] = DEFAULT_SLIPPAGE,
+        path: IntrabarPath = IntrabarPath.BAR_DIRECTION,
+        seed: int = 0,
+        latency_seconds: float = 0.0,
+        max_volume_fraction: Optional[float] = None,
+        enforce_sessions: bool = True,
+        data_service: Optional[AlpacaService] = None,
+    ):
+        """
+        Args:
+            market_data: Minute bars to fill against and serve get_bars from
+                (None = feed mode: bars are pushed)
+            clock: Bars are processed and orders arrive up to its current time
+            starting_cash: Initial account cash
+            slippage: Slippage on market and stop fills (None = fill at the trigger price)
+            path: Intrabar path assumption for resting orders
+            seed: Seed for the adaptive slippage model's noise
+            latency_seconds: Time from submission until an order reaches the book
+            max_volume_fraction: Share of a bar's volume fills may take (None = unlimited)
+            enforce_sessions: Hold orders and ignore bars outside the regular
+                session like Alpaca (False = trade around the clock)
+            data_service: Feed mode: quotes, bars and other market data come from it
+        """
+        self.market_data = market_data
+        self.clock = clock
+        self.starting_cash = starting_cash
+        self.cash = starting_cash
+        self.latency_seconds = latency_seconds
+        self.enforce_sessions = enforce_sessions
+        self.data_service = data_service
+        self.simulator = OrderSimulator(
+            slippage, path=path, rng=random.Random(seed), max_volume_fraction=max_volume_fraction,
+        )
+
+        self._holdings: Dict[str, _Holding] = {}
+        self._cursor: Dict[str, int] = {}
+        self._prices: Dict[str, float] = {}         # Feed mode: last pushed close and volume
+        self._volumes: Dict[str, float] = {}
+        self._in_flight: List[Tuple[float, int, _Route]] = []  # Heap by arrival time
+        self._pending: Set[int] = set()             # Ids of orders in flight
+        self._queued: Dict[str, List[int]] = {}     # Held orders waiting for the regular session
+        self._extended: Dict[str, List[int]] = {}   # Open extended-hours limit orders
+        self._oco_legs: Dict[int, List[int]] = {}   # OCO order id -> leg order ids
+        self._submitted_at: Dict[int, datetime] = {}
+
+        self.fills: List[Fill] = []
+        self.trades: List[SimulatedTrade] = []
+        self.orders_submitted = 0
+        self.orders_rejected = 0
+        self.paper_trading = True
+        self._last_bars: Dict[str, Dict[str, Any]] = {}  # Feed mode: last pushed bar
+
+    @property
+    def is_initialized(self) -> bool:
+        return True
+
+    # ===== ACCOUNT =====
+
+    async def get_account(self) -> Dict[str, Any]:
+        self._sync()
+        positions_value = sum(h.quantity * self._price(symbol) for symbol, h in self._holdings.items())
+        equity = self.cash + positions_value
+        return {
+            "id": "simulated",
+            "equity": equity,
+            "cash": self.cash,
+            "buying_power": self._buying_power(),
+            "portfolio_value": equity,
+            "currency": "USD",
+            "pattern_day_trader": False,
+            "trading_blocked": False,
+            "account_blocked": False,
+            "daytrade_count": 0,
+            "last_equity": None,
+        }
+
+    async def get_buying_power(self) -> float:
+        return (await self.get_account())["buying_power"]
+
+    async def get_positions(self) -> List[Dict[str, Any]]:
+        self._sync()
+        return [self._position_dict(symbol) for symbol in self._holdings]
+
+    async def get_position(self, symbol: str) -> Optional[Dict[str, Any]]:
+        self._sync()
+        symbol = symbol.upper()
+        return self._position_dict(symbol) if symbol in self._holdings else None
+
+    # ===== ORDERS =====
+
+    async def submit_market_order(
+        self, symbol: str, quantity: float, side: str, time_in_force: str = "day"
+    ) -> Dict[str, Any]:
+        symbol, side = symbol.upper(), side.lower()
+        await self._refresh(symbol)
+        self._check_order(symbol, quantity, side, "market")
+        order = self.simulator.submit_order(symbol, quantity, side, OrderType.MARKET, held=True)
+        self._route([order])
+        return self._order_dict(order.order_id)
+
+    async def submit_limit_order(
+        self, symbol: str, quantity: float, side: str, limit_price: float, time_in_force: str = "day"
+    ) -> Dict[str, Any]:
+        symbol, side = symbol.upper(), side.lower()
+        await self._refresh(symbol)
+        self._check_order(symbol, quantity, side, "limit", limit_price)
+        order = self.simulator.submit_order(
+            symbol, quantity, side, OrderType.LIMIT, limit_price=limit_price, held=True,
+        )
+        self._route([order])
+        return self._order_dict(order.order_id)
+
+    async def submit_extended_hours_order(
+        self, symbol: str, quantity: float, side: str, limit_price: float
+    ) -> Dict[str, Any]:
+        symbol, side = symbol.upper(), side.lower()
+        await self._refresh(symbol)
+        self._check_order(symbol, quantity, side, "limit_extended", limit_price)
+        order = self.simulator.submit_order(
+            symbol, quantity, side, OrderType.LIMIT, limit_price=limit_price, held=True,
+        )
+        self._route([order], session_bound=False, extended=True)
+        result = self._order_dict(order.order_id)
+        result["extended_hours"] = True
+        return result
+
+    async def submit_stop_loss_order(
+        self, symbol: str, quantity: float, stop_price: float, time_in_force: str = "gtc"
+    ) -> Dict[str, Any]:
+        symbol = symbol.upper()
+        await self._refresh(symbol)
+        self._check_order(symbol, quantity, "sell", "stop")
+        order = self.simulator.submit_order(
+            symbol, quantity, "sell", OrderType.STOP, stop_price=stop_price, tag="stop_loss", held=True,
+        )
+        self._route([order])
+        return self._order_dict(order.order_id)
+
+    async def submit_trailing_stop_order(
+        self,
+        symbol: str,
+        quantity: float,
+        trail_percent: Optional[float] = None,
+        trail_price: Optional[float] = None,
+        time_in_force: str = "gtc",
+    ) -> Dict[str, Any]:
+        """Trailing sell stop; trail_percent is a fraction like AlpacaService's (0.03 = 3%)"""
+        symbol = symbol.upper()
+        await self._refresh(symbol)
+        self._check_order(symbol, quantity, "sell", "trailing_stop")
+        order = self.simulator.submit_trailing_stop_order(
+            symbol, quantity, trail_percent=trail_percent, trail_price=trail_price, held=True,
+        )
+        self._route([order], session_bound=False)
+        return self._order_dict(order.order_id)
+
+    async def submit_bracket_order(
+        self,
+        symbol: str,
+        quantity: float,
+        side: str,
+        stop_loss_price: float,
+        take_profit_price: float,
+        limit_price: Optional[float] = None,
+        time_in_force: str = "gtc",
+    ) -> Dict[str, Any]:
+        symbol, side = symbol.upper(), side.lower()
+        await self._refresh(symbol)
+        self._check_order(symbol, quantity, side, "bracket", limit_price)
+        bracket = self.simulator.submit_bracket_order(
+            symbol, quantity, side, stop_loss_price, take_profit_price, limit_price=limit_price, held=True,
+        )
+        self._route([bracket.entry])
+        result = self._order_dict(bracket.entry.order_id)
+        result.update({
+            "order_class": "bracket",
+            "stop_loss_price": stop_loss_price,
+            "take_profit_price": take_profit_price,
+            "limit_price": limit_price,
+            "legs": [self._order_dict(leg.order_id) for leg in (bracket.take_profit, bracket.stop_loss)],
+        })
+        return result
+
+    async def submit_oco_order(
+        self,
+        symbol: str,
+        quantity: float,
+        stop_loss_price: float,
+        take_profit_price: float,
+        time_in_force: str = "gtc",
+    ) -> Dict[str, Any]:
+        """Take-profit and stop-loss exits for a long position, reported as one order"""
+        symbol = symbol.upper()
+        await self._refresh(symbol)
+        self._check_order(symbol, quantity, "sell", "oco")
+        take_profit, stop_loss = self.simulator.submit_oco_order(
+            symbol, quantity, stop_loss_price, take_profit_price, held=True,
+        )
+        self._oco_legs[take_profit.order_id] = [take_profit.order_id, stop_loss.order_id]
+        self._route([take_profit, stop_loss], session_bound=False)
+        result = self._order_dict(take_profit.order_id)
+        result.update({
+            "order_class": "oco",
+            "stop_loss_price": stop_loss_price,
+            "take_profit_price": take_profit_price,
+        })
+        return result
+
+    async def replace_order(
+        self,
+        order_id: str,
+        quantity: Optional[float] = None,
+        limit_price: Optional[float] = None,
+        stop_price: Optional[float] = None,
+        trail_price: Optional[float] = None,
+        time_in_force: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Cancel-replace like Alpaca: returns the new order; the old one reports status replaced"""
+        self._sync()
+        order = self._lookup(order_id)
+        if order is None or order.order_id in self._pending or order.status not in (OrderStatus.OPEN, OrderStatus.HELD):
+            raise AlpacaOrderError(
+                message=f"Failed to replace order {order_id}: order is not open",
+                order_type="replace", alpaca_message="order is not open",
+            )
+        extra = (quantity if quantity is not None else order.remaining) - order.remaining
+        if extra > 0 and order.parent_id is None:
+            self._check_order(order.symbol, extra, order.side, "replace", limit_price or order.limit_price)
+
+        new = self.simulator.replace_order(order.order_id, quantity, limit_price, stop_price, trail_price)
+        self._accept(new)
+        self._relink(order.order_id, new.order_id)
+        at = self.clock.timestamp()
+        if new.status == OrderStatus.OPEN and (
+            self._session(at) == "regular" or not self.enforce_sessions
+            or new.order_id in self._extended.get(new.symbol, [])
+        ):
+            self._fill_now(new.symbol, at)
+        return self._order_dict(new.order_id)
+
+    async def cancel_order(self, order_id: str) -> bool:
+        self._sync()
+        order = self._lookup(order_id)
+        if order is None:
+            raise AlpacaOrderError(message=f"Order not found: {order_id}", alpaca_message="order not found")
+        return self.simulator.cancel_order(order.order_id)
+
+    async def cancel_all_orders(self) -> int:
+        self._sync()
+        self._queued.clear()
+        return self.simulator.cancel_all_orders()
+
+    async def get_order(self, order_id: str) -> Optional[Dict[str, Any]]:
+        self._sync()
+        order = self._lookup(order_id)
+        return self._order_dict(order.order_id) if order else None
+
+    async def get_orders(self, status: str = "all", limit: int = 100, after: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Most recent orders first"""
+        self._sync()
+        orders = []
+        for order_id in reversed(self._submitted_at):
+            order = self._order_dict(order_id)
+            if status == "open" and order["status"] not in OPEN_STATUSES:
+                continue
+            if status == "closed" and order["status"] in OPEN_STATUSES:
+                continue
+            orders.append(order)
+            if len(orders) >= limit:
+                break
+        return orders
+
+    async def close_position(self, symbol: str, quantity: Optional[float] = None) -> Dict[str, Any]:
+        self._sync()
+        symbol = symbol.upper()
+        holding = self._holdings.get(symbol)
+        if holding is None:
+            raise AlpacaPositionError(message=f"Failed to close position {symbol}: position does not exist",
+                                      symbol=symbol, operation="close")
+        side = "sell" if holding.quantity > 0 else "buy"
+        return await self.submit_market_order(symbol, quantity or abs(holding.quantity), side)
+
+    async def close_all_positions(self) -> List[Dict[str, Any]]:
+        await self.cancel_all_orders()
+        return [await self.close_position(symbol) for symbol in list(self._holdings)]
+
+    # ===== MARKET DATA =====
+
+    async def get_latest_quote(self, symbol: str) -> Dict[str, Any]:
+        symbol = symbol.upper()
+        if self.market_data is None and self.data_service is not None:
+            # The real quote, which also moves the simulated market
+            quote = await self.data_service.get_latest_quote(symbol)
+            bid, ask = quote.get("bid_price"), quote.get("ask_price")
+            price = (bid + ask) / 2 if bid and ask else bid or ask
+            if price:
+                self.push_price(symbol, price)
+            return quote
+        price = self._price(symbol)
+        return {
+            "symbol": symbol,
+            "bid_price": price,
+            "ask_price": price,
+            "bid_size": 0,
+            "ask_size": 0,
+            "timestamp": self.clock.now(timezone.utc).isoformat(),
+        }
+
+    async def get_quote(self, symbol: str) -> Dict[str, Any]:
+        quote = await self.get_latest_quote(symbol)
+        bid, ask = quote.get("bid_price"), quote.get("ask_price")
+        quote["price"] = (bid + ask) / 2 if bid and ask else bid
+        return quote
+
+    async def get_latest_bar(self, symbol: str) -> Dict[str, Any]:
+        symbol = symbol.upper()
+        if self.market_data is None:
+            if self.data_service is not None:
+                return await self.data_service.get_latest_bar(symbol)
+            bar = self._last_bars.get(symbol)
+        else:
+            bars = self.market_data.get_bars(symbol, "1min", 1, self.clock.timestamp())
+            bar = bars[-1] if bars else None
+        if bar is None:
+            raise AlpacaError(message=f"No market data for {symbol}", error_code="ALPACA_NO_DATA")
+        return {"symbol": symbol, **bar}
+
+    async def get_latest_trade(self, symbol: str) -> Dict[str, Any]:
+        """The last bar's close as a trade"""
+        symbol = symbol.upper()
+        if self.market_data is None and self.data_service is not None:
+            return await self.data_service.get_latest_trade(symbol)
+        bar = await self.get_latest_bar(symbol)
+        return {
+            "symbol": symbol,
+            "price": bar["close"],
+            "size": bar["volume"],
+            "timestamp": bar["timestamp"],
+            "exchange": "SIM",
+        }
+
+    async def get_bars(
+        self,
+        symbol: str,
+        timeframe: str = "1Day",
+        limit: int = 100,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        if self.market_data is None:
+            if self.data_service is None:
+                return []
+            return await self.data_service.get_bars(symbol, timeframe, limit, start=start, end=end)
+        as_of = self.clock.timestamp()
+        if end is not None:
+            as_of = min(as_of, end.timestamp())
+        # Unsupported timeframes fall back to daily bars, like AlpacaService.get_bars
+        if timeframe.lower() not in TIMEFRAME_SECONDS:
+            timeframe = "1day"
+        bars = self.market_data.get_bars(symbol, timeframe, limit, as_of)
+        if start is not None:
+            start_iso = start.astimezone(timezone.utc).isoformat()
+            bars = [bar for bar in bars if bar["timestamp"] >= start_iso]
+        return bars
+
+    async def get_market_hours_info(self) -> Dict[str, Any]:
+        now_eastern = self.clock.now(EASTERN)
+        session, can_trade = market_session(now_eastern)
+        next_open, next_close = self._next_open_close(now_eastern)
+        return {
+            "is_open": session == "regular",
+            "session": session,
+            "can_trade": can_trade,
+            "can_trade_extended": session in ["pre_market", "after_hours"],
+            "current_time_eastern": now_eastern.strftime("%H:%M:%S"),
+            "next_open": next_open.isoformat(),
+            "next_close": next_close.isoformat(),
+        }
+
+    async def get_market_clock(self) -> Dict[str, Any]:
+        """The clock's time (virtual in a replay), not the exchange's"""
+        now_eastern = self.clock.now(EASTERN)
+        next_open, next_close = self._next_open_close(now_eastern)
+        return {
+            "is_open": market_session(now_eastern)[0] == "regular",
+            "next_open": next_open.isoformat(),
+            "next_close": next_close.isoformat(),
+            "timestamp": now_eastern.isoformat(),
+        }
+
+    async def is_market_open(self) -> bool:
+        return self._session() == "regular"
+
+    # ===== ASSETS =====
+
+    async def search_assets(self, query: str, limit: int = 20) -> List[Dict[str, str]]:
+        """Search through the data service, else among the symbols the simulator has bars for"""
+        if self.data_service is not None:
+            return await self.data_service.search_assets(query, limit)
+        query_upper = query.upper()
+        symbols = set(self._prices) | set(self._holdings)
+        if self.market_data is not None:
+            symbols.update(self.market_data.symbols)
+        matches = sorted(symbol for symbol in symbols if symbol.startswith(query_upper))
+        # Exact match first, like AlpacaService.search_assets
+        matches.sort(key=lambda symbol: symbol != query_upper)
+        return [
+            {"symbol": symbol, "name": symbol, "type": "stock", "region": "United States"}
+            for symbol in matches[:limit]
+        ]
+
+    # ===== PRICE FEED =====
+
+    def push_bar(
+        self,
+        symbol: str,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float = 0.0,
+        timestamp: Optional[datetime] = None,
+    ) -> List[Fill]:
+        """
+        Fill resting orders against a bar that has just closed (feed mode).
+
+        Returns:
+            The bar's fills
+        """
+        self._sync()
+        symbol = symbol.upper()
+        timestamp = timestamp or self.clock.now(timezone.utc)
+        self._prices[symbol], self._volumes[symbol] = close, volume
+        self._last_bars[symbol] = {
+            "timestamp": timestamp.astimezone(timezone.utc).isoformat(),
+            "open": open_, "high": high, "low": low, "close": close, "volume": volume,
+        }
+        fills = []
+        if not self._idle(symbol):
+            fills = self._process_bar(symbol, open_, high, low, close, volume, timestamp,
+                                      regular=self._session(timestamp.timestamp()) == "regular")
+        self.simulator.update_price(symbol, close)
+        return fills
+
+    def push_price(self, symbol: str, price: float, volume: float = 0.0,
+                   timestamp: Optional[datetime] = None) -> List[Fill]:
+        """A trade or quote at price (feed mode): a bar with no range"""
+        return self.push_bar(symbol, price, price, price, price, volume, timestamp)
+
+    # ===== FILL PROCESSING =====
+
+    def _route(self, orders: List[SimOrder], session_bound: bool = True, extended: bool = False) -> None:
+        """Send a submission's held orders to the book, after the latency"""
+        self._accept(orders[0])
+        route = _Route([order.order_id for order in orders], orders[0].symbol, session_bound, extended)
+        if self.latency_seconds > 0:
+            heapq.heappush(self._in_flight, (self.clock.timestamp() + self.latency_seconds, route.order_ids[0], route))
+            self._pending.update(route.order_ids)
+        else:
+            self._arrive(route, self.clock.timestamp())
+
+    def _arrive(self, route: _Route, at: float) -> None:
+        """Orders reach the book: working now, or queued for the open if they only work in the regular session"""
+        self._pending.difference_update(route.order_ids)
+        order_ids = [i for i in route.order_ids if self.simulator.orders[i].status == OrderStatus.HELD]
+        if not order_ids:
+            return  # Cancelled in flight
+        regular = self._session(at) == "regular" or not self.enforce_sessions
+        if route.session_bound and not regular:
+            self._queued.setdefault(route.symbol, []).extend(order_ids)
+            return
+        for order_id in order_ids:
+            self.simulator.release_order(order_id)
+        if route.extended:
+            self._extended.setdefault(route.symbol, []).extend(order_ids)
+        if regular or route.extended:
+            self._fill_now(route.symbol, at)
+
+    async def _refresh(self, symbol: str) -> None:
+        """Catch up before an order: the current quote (feed mode with a data service), arrivals and bars"""
+        if self.market_data is None and self.data_service is not None:
+            await self.get_latest_quote(symbol)
+        self._sync()
+
+    def _sync(self) -> None:
+        """Deliver orders and process bars up to the clock, in time order"""
+        now = self.clock.timestamp()
+        while self._in_flight and self._in_flight[0][0] <= now:
+            arrival, _, route = heapq.heappop(self._in_flight)
+            self._replay(arrival)
+            self._arrive(route, arrival)
+        self._replay(now)
+
+    def _replay(self, as_of: float) -> None:
+        """Fill resting orders against every minute that has closed by as_of (replay mode)"""
+        if self.market_data is None:
+            return
+        for symbol in self.market_data.symbols:
+            start = self._cursor.get(symbol, 0)
+            end = self.market_data.closed_minutes(symbol, as_of)
+            if end <= start:
+                continue
+            self._cursor[symbol] = end
+            minutes = self.market_data.minutes(symbol)
+            if self._idle(symbol):
+                self.simulator.update_price(symbol, float(minutes.close[end - 1]))
+                continue
+
+            regular = self.market_data.regular_session_mask(symbol)
+            for i in range(start, end):
+                high, low = float(minutes.high[i]), float(minutes.low[i])
+                self._process_bar(
+                    symbol, float(minutes.open[i]), high, low, float(minutes.close[i]), float(minutes.volume[i]),
+                    datetime.fromtimestamp(int(minutes.timestamps[i]), timezone.utc), regular=bool(regular[i]),
+                )
+                if self._idle(symbol):
+                    break
+            self.simulator.update_price(symbol, float(minutes.close[end - 1]))
+
+    def _process_bar(
+        self, symbol: str, open_: float, high: float, low: float, close: float, volume: float,
+        timestamp: datetime, regular: bool,
+    ) -> List[Fill]:
+        if regular or not self.enforce_sessions:
+            for order_id in self._queued.pop(symbol, []):
+                self.simulator.release_order(order_id)
+        elif not self._has_extended(symbol):
+            return []
+        fills = self.simulator.process_bar(
+            symbol, open_, high, low, close, volume=volume, atr=high - low, timestamp=timestamp,
+        )
+        self._apply(fills)
+        return fills
+
+    def _idle(self, symbol: str) -> bool:
+        return not (self.simulator.has_resting_orders(symbol) or self._queued.get(symbol))
+
+    def _has_extended(self, symbol: str) -> bool:
+        open_ids = [
+            order_id for order_id in self._extended.get(symbol, [])
+            if self.simulator.orders[order_id].status == OrderStatus.OPEN
+        ]
+        if open_ids:
+            self._extended[symbol] = open_ids
+        else:
+            self._extended.pop(symbol, None)
+        return bool(open_ids)
+
+    def _fill_now(self, symbol: str, at: float) -> None:
+        """Fill what is marketable at the last price (a zero-range bar at time at)"""
+        price = self._price(symbol, at)
+        if self.market_data is None:
+            volume = self._volumes.get(symbol, 0.0)
+        else:
+            minutes = self.market_data.minutes(symbol)
+            closed = self._cursor.get(symbol, 0)
+            volume = float(minutes.volume[closed - 1]) if minutes is not None and closed else 0.0
+        fills = self.simulator.process_bar(
+            symbol, price, price, price, price, volume=volume, atr=0.0,
+            timestamp=datetime.fromtimestamp(at, timezone.utc),
+        )
+        self._apply(fills)
+
+    def _apply(self, fills: List[Fill]) -> None:
+        for fill in fills:
+            fill.price = float(fill.price)
+            self.fills.append(fill)
+            signed = fill.quantity if fill.side == "buy" else -fill.quantity
+            self.cash -= signed * fill.price
+            holding = self._holdings.get(fill.symbol)
+            timestamp = fill.timestamp or self.clock.now(timezone.utc)
+
+            if holding is None:
+                self._holdings[fill.symbol] = _Holding(signed, fill.price, timestamp)
+                continue
+            if (holding.quantity > 0) == (signed > 0):
+                total = holding.quantity + signed
+                holding.avg_price = (holding.avg_price * holding.quantity + fill.price * signed) / total
+                holding.quantity = total
+                continue
+
+            closed = min(abs(signed), abs(holding.quantity))
+            direction = 1 if holding.quantity > 0 else -1
+            pnl = (fill.price - holding.avg_price) * closed * direction
+            self.trades.append(SimulatedTrade(
+                symbol=fill.symbol,
+                side="BUY" if direction > 0 else "SELL",
+                quantity=closed,
+                entry_price=holding.avg_price,
+                entry_time=holding.entry_time,
+                exit_price=fill.price,
+                exit_time=timestamp,
+                pnl=pnl,
+                pnl_pct=pnl / (holding.avg_price * closed) * 100,
+                reason=fill.tag or fill.order_type.value,
+            ))
+            remaining = holding.quantity + signed
+            if abs(remaining) < 1e-9:
+                del self._holdings[fill.symbol]
+            elif (remaining > 0) != (holding.quantity > 0):
+                self._holdings[fill.symbol] = _Holding(remaining, fill.price, timestamp)
+            else:
+                holding.quantity = remaining
+
+    # ===== CHECKS =====
+
+    def _check_order(
+        self, symbol: str, quantity: float, side: str, order_type: str, limit_price: Optional[float] = None
+    ) -> None:
+        price = self._price(symbol)
+        if not price:
+            self._reject(f"no market data for {symbol}", order_type, symbol, side, quantity)
+        if quantity <= 0:
+            self._reject("qty must be > 0", order_type, symbol, side, quantity)
+
+        if side == "buy":
+            holding = self._holdings.get(symbol)
+            if holding is not None and holding.quantity < 0:
+                return  # Buying to cover
+            required = quantity * (limit_price or price)
+            available = self._buying_power()
+            if required > available:
+                self.orders_rejected += 1
+                raise AlpacaInsufficientFundsError(
+                    required_amount=required, available_amount=available, symbol=symbol,
+                )
+            return
+
+        held = self._holdings[symbol].quantity if symbol in self._holdings else 0.0
+        available = held - self._committed_to_sells(symbol)
+        if quantity > available + 1e-9:
+            self._reject(
+                f"insufficient qty available for order (requested: {quantity:g}, available: {max(available, 0):g})",
+                order_type, symbol, side, quantity,
+            )
+
+    def _reject(self, reason: str, order_type: str, symbol: str, side: str, quantity: float) -> None:
+        self.orders_rejected += 1
+        raise AlpacaOrderError(
+            message=f"Failed to submit {order_type} order: {reason}",
+            order_type=order_type, symbol=symbol, side=side, quantity=quantity, alpaca_message=reason,
+        )
+
+    def _committed_to_sells(self, symbol: str) -> float:
+        """Shares held for open sell orders (an OCO pair holds them once)"""
+        committed, groups = 0.0, set()
+        for order in self.simulator.working_orders(symbol):
+            if order.side != "sell":
+                continue
+            if order.oco_group is not None:
+                if order.oco_group in groups:
+                    continue
+                groups.add(order.oco_group)
+            committed += order.remaining
+        return committed
+
+    def _buying_power(self) -> float:
+        """Cash less what open buy orders will cost (cash account, no margin)"""
+        notional, unpriced = self.simulator.working_buy_totals()
+        reserved = notional + sum(quantity * self._price(symbol) for symbol, quantity in unpriced.items() if quantity > 1e-9)
+        return max(self.cash - reserved, 0.0)
+
+    # ===== HELPERS =====
+
+    def _accept(self, order: SimOrder) -> None:
+        self.orders_submitted += 1
+        self._submitted_at[order.order_id] = self.clock.now(timezone.utc)
+
+    def _price(self, symbol: str, at: Optional[float] = None) -> float:
+        if self.market_data is None:
+            return self._prices.get(symbol, 0.0)
+        return self.market_data.last_price(symbol, self.clock.timestamp() if at is None else at) or 0.0
+
+    def _session(self, at: Optional[float] = None) -> str:
+        now_eastern = self.clock.now(EASTERN) if at is None else datetime.fromtimestamp(at, EASTERN)
+        return market_session(now_eastern)[0]
+
+    def _next_open_close(self, now_eastern: datetime) -> Tuple[datetime, datetime]:
+        """Next regular-session open and close after now (weekends skipped, no holiday calendar)"""
+        def next_at(minutes: int) -> datetime:
+            day = now_eastern.date()
+            while True:
+                at = EASTERN.localize(datetime.combine(day, time(minutes // 60, minutes % 60)))
+                if day.weekday() < 5 and at > now_eastern:
+                    return at
+                day += timedelta(days=1)
+        return next_at(REGULAR_START), next_at(REGULAR_END)
+
+    def _relink(self, old_id: int, new_id: int) -> None:
+        """Point the held, extended-hours and OCO bookkeeping at a replacement order"""
+        for order_ids in (*self._queued.values(), *self._extended.values(), *self._oco_legs.values()):
+            if old_id in order_ids:
+                order_ids[order_ids.index(old_id)] = new_id
+        if old_id in self._oco_legs:
+            self._oco_legs[new_id] = self._oco_legs.pop(old_id)
+
+    def _lookup(self, order_id: str) -> Optional[SimOrder]:
+        try:
+            return self.simulator.get_order(int(order_id))
+        except (TypeError, ValueError):
+            return None
+
+    def _position_dict(self, symbol: str) -> Dict[str, Any]:
+        holding = self._holdings[symbol]
+        price = self._price(symbol) or holding.avg_price
+        cost = holding.avg_price * holding.quantity
+        unrealized = (price - holding.avg_price) * holding.quantity
+        return {
+            "symbol": symbol,
+            "quantity": holding.quantity,
+            "entry_price": holding.avg_price,
+            "current_price": price,
+            "market_value": price * holding.quantity,
+            "unrealized_pnl": unrealized,
+            "unrealized_pnl_pct": unrealized / abs(cost) * 100 if cost else 0.0,
+            "side": "long" if holding.quantity > 0 else "short",
+            "asset_class": "us_equity",
+        }
+
+    def _order_dict(self, order_id: int) -> Dict[str, Any]:
+        legs = [self.simulator.get_order(leg) for leg in self._oco_legs.get(order_id, [order_id])]
+        # The leg that traded
+        order = next((leg for leg in legs if leg.status == OrderStatus.FILLED), None) or \
+            next((leg for leg in legs if leg.filled_quantity), legs[0])
+        filled = order.filled_quantity > 0
+        if order.status == OrderStatus.FILLED:
+            status = "filled"
+        elif order.status == OrderStatus.REPLACED:
+            status = "replaced"
+        elif all(leg.status == OrderStatus.CANCELLED for leg in legs):
+            status = "canceled"
+        elif filled:
+            status = "partially_filled"
+        elif order_id in self._pending:
+            status = "pending_new"
+        elif order.status == OrderStatus.HELD:
+            # Alpaca's names: queued for the open vs. a bracket leg waiting on its entry
+            status = "accepted" if order.parent_id is None else "held"
+        else:
+            status = "new"
+        submitted_at = self._submitted_at.get(order_id)
+        return {
+            "id": str(order_id),
+            "symbol": order.symbol,
+            "quantity": order.quantity,
+            "side": order.side,
+            "type": order.order_type.value,
+            "status": status,
+            "limit_price": order.limit_price,
+            "stop_price": order.stop_price,
+            "filled_qty": order.filled_quantity,
+            "filled_avg_price": order.filled_price if filled else None,
+            "submitted_at": submitted_at.isoformat() if submitted_at else None,
+            "filled_at": order.filled_at.isoformat() if filled and order.filled_at else None,
+        }
+
+
+# ===== SINGLETON =====
+
+_simulated_broker: Optional[SimulatedBroker] = None
+
+
+def get_simulated_broker() -> SimulatedBroker:
+    """
+    The simulated paper account (TRADING_BROKER_BACKEND=simulated).
+
+    Real market data from Alpaca when API keys are set; without them it runs
+    on pushed prices only.
+    """
+    global _simulated_broker
+    if _simulated_broker is None:
+        config = get_trading_config()
+        try:
+            data_service = AlpacaService(paper_trading=True)
+        except AlpacaAuthError as e:
+            logger.warning(f"Simulated broker without market data ({e.message}); prices must be pushed")
+            data_service = None
+        _simulated_broker = SimulatedBroker(
+            starting_cash=config.sim_starting_cash,
+            latency_seconds=config.sim_latency_ms / 1000,
+            max_volume_fraction=config.sim_max_volume_fraction or None,
+            data_service=data_service,
+        )
+        logger.info(
+            f"Created SIMULATED paper broker (cash ${config.sim_starting_cash:,.0f}, "
+            f"latency {config.sim_latency_ms}ms)"
+        )
+    return _simulated_broker
+
+
+def reset_simulated_broker() -> None:
+    """Drop the simulated account (useful for testing)"""
+    global _simulated_broker
+    _simulated_broker = None
@@ -15,9 +15,7 @@ Daily Goal: Make money every trading day by adapting to conditions.
 """
 
 import logging
-import asyncio
 from typing import Dict, Any, Optional, List, Tuple
-from datetime import datetime, timedelta
 from dataclasses import dataclass
 
 from .hierarchical_strategy import (
@@ -28,9 +26,13 @@ from .hierarchical_strategy import (
     get_hierarchical_strategy,
 )
 from .pattern_recognition import PatternRecognitionService
+from .priority_scanner import compute_activity_metrics
 from .multi_timeframe import MultiTimeframeService, Timeframe
 from .indicators import IndicatorService, AdaptiveIndicatorEngine, TradingMode
 from .alpaca_service import AlpacaService, get_alpaca_service
+from .scan_context import ScanDataContext
+from .bot_workers import BotWorkerPool
+from .clock import Clock, SYSTEM_CLOCK
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +48,7 @@ class ScanResult:
     next_horizon: TradingHorizon
     daily_progress: Dict[str, Any]
     scan_summary: str
+    fetches_saved: int = 0  # Bar fetches served from the cycle's data context
 
 
 class SmartScanner:
@@ -68,9 +71,12 @@ class SmartScanner:
     def __init__(
         self,
         alpaca_service: Optional[AlpacaService] = None,
+        clock: Optional[Clock] = None,
+        strategy: Optional[HierarchicalStrategy] = None,
     ):
         self.alpaca = alpaca_service or get_alpaca_service()
-        self.strategy = get_hierarchical_strategy()
+        self.clock = clock or SYSTEM_CLOCK
+        self.strategy = strategy or get_hierarchical_strategy()
         self.pattern_service = PatternRecognitionService()
         self.multi_tf_service = MultiTimeframeService()
         self.indicator_service = IndicatorService()
@@ -79,15 +85,30 @@ class SmartScanner:
         # Scan state
         self.last_scan_results: Dict[TradingHorizon, ScanResult] = {}
         self.all_opportunities: List[TradingOpportunity] = []
+        self.last_cycle_data_stats: Optional[Dict[str, Any]] = None
+        # Activity metrics per symbol from the last full cascade (feeds priority tiers)
+        self.last_symbol_metrics: Dict[str, Dict[str, float]] = {}
+
+        # Optional multi-process analysis (see services/bot_workers.py)
+        self.worker_pool: Optional[BotWorkerPool] = None
 
         # Performance tracking
         self.scans_today = 0
         self.opportunities_found_today = 0
-        self.last_reset_date = datetime.now().date()
+        self.last_reset_date = self.clock.now().date()
+
+    def attach_worker_pool(self, worker_pool: Optional[BotWorkerPool]):
+        """
+        Analyze symbols in worker processes instead of in this process.
+
+        Cascade state, best-opportunity selection and everything downstream
+        (risk checks, orders) stay here; pass None to go back to local analysis.
+        """
+        self.worker_pool = worker_pool
 
     def _reset_daily_stats_if_needed(self):
         """Reset daily statistics at market open"""
-        today = datetime.now().date()
+        today = self.clock.now().date()
         if today != self.last_reset_date:
             self.scans_today = 0
             self.opportunities_found_today = 0
@@ -104,6 +125,7 @@ class SmartScanner:
         self,
         symbols: List[str],
         force_horizon: Optional[TradingHorizon] = None,
+        context: Optional[ScanDataContext] = None,
     ) -> ScanResult:
         """
         Perform an intelligent scan of symbols.
@@ -111,12 +133,17 @@ class SmartScanner:
         Args:
             symbols: List of symbols to scan
             force_horizon: Force a specific horizon (skips cascading logic)
+            context: Data context shared across the cycle (a fresh one is used if omitted)
 
         Returns:
             ScanResult with best opportunity found
         """
         self._reset_daily_stats_if_needed()
-        start_time = datetime.now()
+        start_time = self.clock.now()
+
+        if context is None:
+            context = ScanDataContext(self.alpaca)
+        fetches_saved_before = context.fetches_saved
 
         # Determine which horizon to scan
         if force_horizon:
@@ -128,22 +155,36 @@ class SmartScanner:
 
         opportunities = []
         scanned = 0
+        worker_fetches_saved = 0
+        local_symbols = symbols
+
+        # Fan the analysis out to worker processes when a pool is attached;
+        # symbols of failed workers fall back to local analysis below
+        if self.worker_pool and self.worker_pool.is_running:
+            partition_result = await self.worker_pool.analyze(symbols, current_horizon, context.cycle_id)
+            opportunities.extend(partition_result.opportunities)
+            scanned += partition_result.scanned
+            worker_fetches_saved = partition_result.fetches_saved
+            context.symbol_metrics.update(partition_result.symbol_metrics)
+            local_symbols = partition_result.failed_symbols
 
         # Scan each symbol
-        for symbol in symbols:
+        for symbol in local_symbols:
             try:
-                opportunity = await self._analyze_symbol_for_horizon(symbol, current_horizon)
+                opportunity = await self._analyze_symbol_for_horizon(symbol, current_horizon, context)
                 if opportunity:
                     opportunities.append(opportunity)
-                    if opportunity.quality in [OpportunityQuality.EXCELLENT, OpportunityQuality.GOOD]:
-                        logger.info(
-                            f"[SmartScanner] Found {opportunity.quality.value} opportunity: "
-                            f"{symbol} ({opportunity.horizon.value}) - Score: {opportunity.overall_score:.1f}"
-                        )
                 scanned += 1
             except Exception as e:
                 logger.warning(f"[SmartScanner] Error analyzing {symbol}: {e}")
 
+        for opportunity in opportunities:
+            if opportunity.quality in [OpportunityQuality.EXCELLENT, OpportunityQuality.GOOD]:
+                logger.info(
+                    f"[SmartScanner] Found {opportunity.quality.value} opportunity: "
+                    f"{opportunity.symbol} ({opportunity.horizon.value}) - Score: {opportunity.overall_score:.1f}"
+                )
+
         # Store all opportunities for this horizon
         self.all_opportunities.extend(opportunities)
 
@@ -164,7 +205,7 @@ class SmartScanner:
             )
 
         # Calculate scan duration
-        duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
+        duration_ms = int((self.clock.now() - start_time).total_seconds() * 1000)
 
         # Update stats
         self.scans_today += 1
@@ -179,6 +220,7 @@ class SmartScanner:
             next_horizon=next_horizon,
             daily_progress=self.strategy.get_strategy_summary()["daily_goal"],
             scan_summary=scan_summary,
+            fetches_saved=context.fetches_saved - fetches_saved_before + worker_fetches_saved,
         )
 
         self.last_scan_results[current_horizon] = result
@@ -190,6 +232,8 @@ class SmartScanner:
         self,
         symbol: str,
         horizon: TradingHorizon,
+        context: Optional[ScanDataContext] = None,
+        raise_errors: bool = False,
     ) -> Optional[TradingOpportunity]:
         """
         Analyze a single symbol for the given trading horizon.
@@ -200,7 +244,17 @@ class SmartScanner:
         3. Pattern recognition
         4. Elliott Wave analysis
         5. Multi-TF confluence scoring
+
+        Bars, indicators and patterns come from the cycle's data context, so
+        a symbol analyzed again for the same horizon within the cycle isn't
+        re-fetched or re-analyzed.
+
+        Errors are logged and return None, unless raise_errors is set (worker
+        processes report failed symbols so the coordinator can retry them).
         """
+        if context is None:
+            context = ScanDataContext(self.alpaca)
+
         try:
             # Get timeframe configuration for this horizon
             tf_config = self.strategy.timeframe_configs[horizon]
@@ -220,7 +274,7 @@ class SmartScanner:
                 TradingHorizon.SCALP: 100,
             }[horizon]
 
-            bars = await self.alpaca.get_bars(symbol, timeframe=primary_tf, limit=limit)
+            bars = await context.get_bars(symbol, primary_tf, limit)
 
             if len(bars) < 30:
                 logger.debug(f"[SmartScanner] Insufficient data for {symbol}: {len(bars)} bars")
@@ -233,6 +287,7 @@ class SmartScanner:
             closes = [b["close"] for b in bars]
             volumes = [b["volume"] for b in bars]
             current_price = closes[-1]
+            context.symbol_metrics[symbol] = compute_activity_metrics(highs, lows, closes, volumes)
 
             # Map horizon to TradingMode for adaptive engine
             mode_map = {
@@ -242,24 +297,32 @@ class SmartScanner:
             }
             trading_mode = mode_map[horizon]
 
-            # Set the adaptive engine mode before calculating indicators
-            self.adaptive_engine.set_mode(trading_mode, auto=False)
+            def compute_indicators() -> Dict[str, Any]:
+                # Set the adaptive engine mode before calculating indicators
+                self.adaptive_engine.set_mode(trading_mode, auto=False)
+
+                # Note: calculate_adaptive_indicators uses the engine's current mode
+                # and expects (highs, lows, closes, volumes) - NOT mode or prices
+                return self.adaptive_engine.calculate_adaptive_indicators(
+                    highs=highs,
+                    lows=lows,
+                    closes=closes,
+                    volumes=volumes,
+                )
 
             # Calculate adaptive indicators
-            # Note: calculate_adaptive_indicators uses the engine's current mode
-            # and expects (highs, lows, closes, volumes) - NOT mode or prices
-            indicators = self.adaptive_engine.calculate_adaptive_indicators(
-                highs=highs,
-                lows=lows,
-                closes=closes,
-                volumes=volumes,
+            indicators = context.get_indicators(
+                symbol, primary_tf, limit, trading_mode.value, compute_indicators
             )
 
             # Add current price to indicators
             indicators["current_price"] = current_price
 
             # Run pattern recognition
-            pattern_analysis = self.pattern_service.analyze(opens, highs, lows, closes)
+            pattern_analysis = context.get_patterns(
+                symbol, primary_tf, limit,
+                lambda: self.pattern_service.analyze(opens, highs, lows, closes),
+            )
             patterns = []
             if pattern_analysis:
                 # Convert pattern results to dicts
@@ -311,6 +374,8 @@ class SmartScanner:
             return opportunity
 
         except Exception as e:
+            if raise_errors:
+                raise
             logger.error(f"[SmartScanner] Error analyzing {symbol} for {horizon.value}: {e}")
             return None
 
@@ -327,11 +392,15 @@ class SmartScanner:
         2. If nothing good, scan for INTRADAY
         3. If nothing good, scan for SCALP
 
+        All cascades share one data context, so a horizon scanned again
+        within the cycle reuses its bars and analysis.
+
         Returns:
             Tuple of (best_opportunity, all_scan_results)
         """
         results = []
         best_overall = None
+        context = ScanDataContext(self.alpaca)
 
         for cascade_num in range(max_cascades):
             # Determine current horizon (cascading logic)
@@ -340,7 +409,7 @@ class SmartScanner:
             logger.info(f"[SmartScanner] Cascade {cascade_num + 1}/{max_cascades}: Scanning {current_horizon.value}")
 
             # Perform scan
-            result = await self.scan(symbols)
+            result = await self.scan(symbols, context=context)
             results.append(result)
 
             # Check if we found a good opportunity
@@ -360,7 +429,14 @@ class SmartScanner:
                 break
 
             # Small delay between cascades
-            await asyncio.sleep(0.5)
+            await self.clock.sleep(0.5)
+
+        self.last_cycle_data_stats = context.get_stats()
+        self.last_symbol_metrics = dict(context.symbol_metrics)
+        logger.info(
+            f"[SmartScanner] Data context: {context.fetches_made} fetches, "
+            f"{context.fetches_saved} saved by reuse"
+        )
 
         # If we didn't find anything good, return the best FAIR opportunity if any
         if not best_overall:
@@ -394,8 +470,9 @@ class SmartScanner:
             "daily_goal": self.strategy.get_strategy_summary()["daily_goal"],
             "active_opportunities": len([
                 o for o in self.all_opportunities
-                if o.valid_until and o.valid_until > datetime.now()
+                if o.valid_until and o.valid_until > self.clock.now()
             ]),
+            "data_context": self.last_cycle_data_stats,
         }
 
     def record_trade_result(self, pnl_pct: float, horizon: TradingHorizon):
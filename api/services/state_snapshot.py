@@ -0,0 +1,285 @@
+"""
+Bot State Snapshot Service
+==========================
+
+Snapshots the trading bot's analytic state to a compact local file and
+restores it on startup, so a redeploy or crash doesn't start from cold.
+
+Captured state:
+- Indicator state (adaptive engine mode, hierarchical cascade position)
+- Last analysis results (stock/crypto analysis, scores, ready stocks)
+- Priority tiers (PriorityScannerService)
+- AI trade gate decision cache
+- Correlation cache
+
+Validity checks on restore:
+- Format version must match
+- Checksum must match (detects truncated/corrupt files)
+- Trading mode (paper/live) must match the running bot
+- Snapshot must be younger than the configured max age
+
+Orders, positions and account data are NOT part of the snapshot - those
+always come from the broker.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from config import get_trading_config
+from .ai_trade_gate import get_ai_trade_gate
+from .correlation_service import get_correlation_service
+from .indicators import TradingMode
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+
+class StateSnapshotService:
+    """
+    Writes and restores bot analytic state snapshots.
+
+    The file is gzip-compressed JSON with a header (version, timestamp,
+    trading mode, checksum) and one payload section per component.
+    Writes are atomic (temp file + rename) so a crash mid-write never
+    leaves a half-written snapshot behind.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_age_seconds: Optional[int] = None,
+    ):
+        config = get_trading_config()
+        self.path = path or config.state_snapshot_path
+        self.max_age_seconds = max_age_seconds or config.state_snapshot_max_age_seconds
+
+        self.last_saved_at: Optional[datetime] = None
+        self.last_restored_at: Optional[datetime] = None
+        self.last_restore_summary: Dict[str, Any] = {}
+        self.last_error: Optional[str] = None
+
+    # ==================== CAPTURE ====================
+
+    def capture(self, bot) -> Dict[str, Any]:
+        """Collect the analytic state of a TradingBot into a payload dict"""
+        adaptive_engine = bot.smart_scanner.adaptive_engine
+        return {
+            "indicator_state": {
+                "adaptive_mode": adaptive_engine.current_mode.value,
+                "auto_mode": adaptive_engine.auto_mode,
+                "last_volatility": adaptive_engine._last_volatility,
+                "hierarchical": bot.smart_scanner.strategy.export_state(),
+            },
+            "analysis": {
+                "stock_analysis_results": bot._stock_analysis_results,
+                "crypto_analysis_results": bot._crypto_analysis_results,
+                "stock_scores": bot._stock_scores,
+                "ready_stocks": bot._ready_stocks,
+                "hierarchical_scan_results": bot._hierarchical_scan_results,
+                "last_stock_analysis_time": _isoformat(bot._last_stock_analysis_time),
+                "last_crypto_analysis_time": _isoformat(bot._last_crypto_analysis_time),
+            },
+            "priority_tiers": bot.priority_scanner.export_state(),
+            "ai_gate": get_ai_trade_gate().export_state(),
+            "correlations": get_correlation_service().export_state(),
+        }
+
+    def save(self, bot) -> bool:
+        """
+        Write a snapshot of the bot's analytic state.
+
+        Returns True if the snapshot was written.
+        """
+        try:
+            payload = self.capture(bot)
+            # default=str keeps odd values (datetimes, enums) from failing the whole snapshot
+            payload_json = json.dumps(payload, default=str, separators=(",", ":"), sort_keys=True)
+            document = {
+                "version": SNAPSHOT_VERSION,
+                "saved_at": datetime.now().isoformat(),
+                "paper_trading": bot.paper_trading,
+                "checksum": hashlib.sha256(payload_json.encode()).hexdigest(),
+                "payload": payload_json,
+            }
+
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                json.dump(document, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+
+            self.last_saved_at = datetime.now()
+            self.last_error = None
+            logger.debug(f"[SNAPSHOT] Saved bot state to {self.path}")
+            return True
+        except Exception as e:
+            self.last_error = f"Save failed: {e}"
+            logger.warning(f"[SNAPSHOT] Could not save bot state: {e}")
+            return False
+
+    # ==================== RESTORE ====================
+
+    def load(self, paper_trading: bool) -> Optional[Dict[str, Any]]:
+        """
+        Read and validate the snapshot file.
+
+        Returns:
+            The payload dict, or None if missing or invalid
+        """
+        if not os.path.exists(self.path):
+            return None
+
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                document = json.load(f)
+        except (OSError, ValueError) as e:
+            self.last_error = f"Unreadable snapshot: {e}"
+            logger.warning(f"[SNAPSHOT] Ignoring unreadable snapshot {self.path}: {e}")
+            return None
+
+        reason = self._validate(document, paper_trading)
+        if reason:
+            self.last_error = reason
+            logger.info(f"[SNAPSHOT] Ignoring snapshot: {reason}")
+            return None
+
+        return json.loads(document["payload"])
+
+    def _validate(self, document: Dict[str, Any], paper_trading: bool) -> Optional[str]:
+        """Return the reason a snapshot is invalid, or None if it can be used"""
+        if document.get("version") != SNAPSHOT_VERSION:
+            return f"version {document.get('version')} != {SNAPSHOT_VERSION}"
+
+        payload_json = document.get("payload")
+        if not isinstance(payload_json, str):
+            return "missing payload"
+        if hashlib.sha256(payload_json.encode()).hexdigest() != document.get("checksum"):
+            return "checksum mismatch"
+
+        if document.get("paper_trading") != paper_trading:
+            return "snapshot is for a different trading mode"
+
+        try:
+            saved_at = datetime.fromisoformat(document["saved_at"])
+        except (KeyError, ValueError):
+            return "missing timestamp"
+        age = (datetime.now() - saved_at).total_seconds()
+        if age > self.max_age_seconds or age < 0:
+            return f"snapshot age {age:.0f}s outside 0-{self.max_age_seconds}s"
+
+        return None
+
+    def restore(self, bot) -> Dict[str, Any]:
+        """
+        Restore a TradingBot's analytic state from the snapshot file.
+
+        Each section is restored independently; a bad section is skipped
+        without affecting the others.
+
+        Returns:
+            Summary of what was restored (empty if nothing was)
+        """
+        payload = self.load(bot.paper_trading)
+        if payload is None:
+            return {}
+
+        summary: Dict[str, Any] = {}
+
+        try:
+            indicator_state = payload.get("indicator_state", {})
+            adaptive_engine = bot.smart_scanner.adaptive_engine
+            adaptive_engine.set_mode(
+                TradingMode(indicator_state["adaptive_mode"]),
+                auto=indicator_state.get("auto_mode", False),
+            )
+            adaptive_engine._last_volatility = indicator_state.get("last_volatility", 0.0)
+            bot.smart_scanner.strategy.restore_state(indicator_state.get("hierarchical", {}))
+            summary["indicator_state"] = True
+        except (KeyError, ValueError, TypeError) as e:
+            logger.warning(f"[SNAPSHOT] Skipping indicator state: {e}")
+
+        try:
+            analysis = payload.get("analysis", {})
+            # Only fill in results the bot hasn't produced itself yet
+            for symbol, result in analysis.get("stock_analysis_results", {}).items():
+                bot._stock_analysis_results.setdefault(symbol, result)
+            for symbol, result in analysis.get("crypto_analysis_results", {}).items():
+                bot._crypto_analysis_results.setdefault(symbol, result)
+            for symbol, score in analysis.get("stock_scores", {}).items():
+                bot._stock_scores.setdefault(symbol, score)
+            for symbol in analysis.get("ready_stocks", []):
+                if symbol not in bot._ready_stocks:
+                    bot._ready_stocks.append(symbol)
+            if not bot._hierarchical_scan_results:
+                bot._hierarchical_scan_results = analysis.get("hierarchical_scan_results", {})
+            bot._last_stock_analysis_time = bot._last_stock_analysis_time or _parse_datetime(
+                analysis.get("last_stock_analysis_time")
+            )
+            bot._last_crypto_analysis_time = bot._last_crypto_analysis_time or _parse_datetime(
+                analysis.get("last_crypto_analysis_time")
+            )
+            summary["analysis_results"] = (
+                len(bot._stock_analysis_results) + len(bot._crypto_analysis_results)
+            )
+        except (AttributeError, TypeError, ValueError) as e:
+            logger.warning(f"[SNAPSHOT] Skipping analysis results: {e}")
+
+        try:
+            summary["priority_symbols"] = bot.priority_scanner.restore_state(payload.get("priority_tiers", {}))
+        except (AttributeError, TypeError) as e:
+            logger.warning(f"[SNAPSHOT] Skipping priority tiers: {e}")
+
+        try:
+            summary["ai_gate_decisions"] = get_ai_trade_gate().restore_state(payload.get("ai_gate", {}))
+        except (AttributeError, TypeError) as e:
+            logger.warning(f"[SNAPSHOT] Skipping AI gate cache: {e}")
+
+        try:
+            summary["correlations"] = get_correlation_service().restore_state(payload.get("correlations", {}))
+        except (AttributeError, TypeError) as e:
+            logger.warning(f"[SNAPSHOT] Skipping correlation cache: {e}")
+
+        self.last_restored_at = datetime.now()
+        self.last_restore_summary = summary
+        logger.info(f"[SNAPSHOT] Restored bot state from {self.path}: {summary}")
+        return summary
+
+    # ==================== STATUS ====================
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get snapshot service status"""
+        return {
+            "path": self.path,
+            "max_age_seconds": self.max_age_seconds,
+            "last_saved_at": _isoformat(self.last_saved_at),
+            "last_restored_at": _isoformat(self.last_restored_at),
+            "last_restore_summary": self.last_restore_summary,
+            "last_error": self.last_error,
+        }
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+# Singleton instance
+_state_snapshot_service: Optional[StateSnapshotService] = None
+
+
+def get_state_snapshot_service() -> StateSnapshotService:
+    """Get the global state snapshot service"""
+    global _state_snapshot_service
+    if _state_snapshot_service is None:
+        _state_snapshot_service = StateSnapshotService()
+    return _state_snapshot_service
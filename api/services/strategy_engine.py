@@ -114,11 +114,32 @@ class StrategyEngine:
             logger.warning(f"Insufficient data for {symbol}: {len(prices)} bars")
             return self._create_hold_signal(symbol, prices[-1] if prices else 0, {}, ["Insufficient data"])
 
-        current_price = prices[-1]
-
         # Calculate all indicators
         indicator_values = self._calculate_all_indicators(prices, highs, lows, volumes)
 
+        return self.signal_from_indicators(symbol, indicator_values, prices[-1])
+
+    def signal_from_indicators(
+        self,
+        symbol: str,
+        indicator_values: Dict[str, Any],
+        current_price: float,
+    ) -> TradingSignal:
+        """
+        Score already-calculated indicators into a trading signal.
+
+        Indicator values don't depend on the weights or entry threshold, so
+        callers comparing several weightings (multi-strategy backtests) can
+        calculate them once and score them per engine.
+
+        Args:
+            symbol: Stock symbol
+            indicator_values: Output of calculate_indicators
+            current_price: Latest close
+
+        Returns:
+            TradingSignal with recommendation
+        """
         # Score each indicator component
         component_scores, reasons = self._score_indicators(indicator_values, current_price)
 
@@ -147,6 +168,16 @@ class StrategyEngine:
             reasons=reasons,
         )
 
+    def calculate_indicators(
+        self,
+        prices: List[float],
+        highs: List[float],
+        lows: List[float],
+        volumes: List[int],
+    ) -> Dict[str, Any]:
+        """Calculate every indicator used for scoring (see signal_from_indicators)"""
+        return self._calculate_all_indicators(prices, highs, lows, volumes)
+
     def _calculate_all_indicators(
         self,
         prices: List[float],
@@ -538,6 +569,7 @@ class StrategyEngine:
         highs: List[float],
         lows: List[float],
         volumes: List[int],
+        indicators: Optional[Dict[str, Any]] = None,
     ) -> Tuple[bool, str]:
         """
         Determine if we should exit a position.
@@ -551,6 +583,7 @@ class StrategyEngine:
             trade_type: SWING or LONG_TERM
             entry_time_days: Days since entry
             prices, highs, lows, volumes: Recent price data
+            indicators: Already-calculated indicators for prices (skips recalculating)
 
         Returns:
             Tuple of (should_exit, reason)
@@ -567,7 +600,8 @@ class StrategyEngine:
 
         # 3. Calculate indicators for signal reversal check
         if len(prices) >= 50:
-            indicators = self._calculate_all_indicators(prices, highs, lows, volumes)
+            if indicators is None:
+                indicators = self._calculate_all_indicators(prices, highs, lows, volumes)
 
             # Check for bearish reversal signals
             rsi = indicators["rsi_14"]
@@ -10,7 +10,7 @@ The bot is designed to be always active:
 import asyncio
 import logging
 import os
-from typing import Dict, Any, Optional, List
+from typing import Callable, Dict, Any, Optional, List
 from datetime import datetime, timedelta
 from enum import Enum
 
@@ -22,11 +22,15 @@ from .risk_manager import RiskManager
 from .indicators import IndicatorService
 from .ai_advisor import get_ai_advisor
 from .crypto_service import CryptoService
-from .priority_scanner import PriorityScannerService, get_priority_scanner, PriorityTier
+from .priority_scanner import PriorityScannerService, get_priority_scanner, PriorityTier, compute_activity_metrics
 from .execution_logger import ExecutionLogger, ExecutionErrorCode, parse_api_error
 from .smart_scanner import SmartScanner, get_smart_scanner
 from .hierarchical_strategy import TradingHorizon, OpportunityQuality
 from .auto_optimizer import get_auto_optimizer, AutoOptimizer
+from .state_snapshot import StateSnapshotService, get_state_snapshot_service
+from .bot_workers import BotWorkerPool
+from .bot_ipc import BotProxy, is_external_bot_mode
+from .clock import Clock, SYSTEM_CLOCK
 from config import TradingConfig, get_trading_config
 from database.models import Trade, Position, BotConfiguration, StockRepository, UserWatchlist
 from database.connection import SessionLocal
@@ -52,6 +56,10 @@ class TradingBot:
         self,
         alpaca_service: Optional[AlpacaService] = None,
         paper_trading: bool = None,
+        clock: Optional[Clock] = None,
+        session_factory: Optional[Callable[[], Session]] = None,
+        smart_scanner: Optional[SmartScanner] = None,
+        auto_optimizer: Optional[AutoOptimizer] = None,
     ):
         """
         Initialize trading bot.
@@ -59,18 +67,24 @@ class TradingBot:
         Args:
             alpaca_service: Alpaca service instance
             paper_trading: Use paper trading (safer for testing). Reads from ALPACA_TRADING_MODE env var if not specified.
+            clock: Time source for every timestamp and wait (default: wall clock; see services/replay.py)
+            session_factory: Creates database sessions (default: SessionLocal)
+            smart_scanner: Hierarchical scanner (default: the shared instance)
+            auto_optimizer: Strategy weight optimizer (default: the shared instance)
         """
         # Default to paper trading unless explicitly set to live
         if paper_trading is None:
             paper_trading = os.getenv("ALPACA_TRADING_MODE", "paper") == "paper"
         self.alpaca = alpaca_service or get_alpaca_service(paper_trading=paper_trading)
+        self.clock = clock or SYSTEM_CLOCK
+        self.session_factory = session_factory or SessionLocal
         self.strategy = StrategyEngine()
-        self.risk_manager = RiskManager()
+        self.risk_manager = RiskManager(clock=self.clock)
         self.indicator_service = IndicatorService()
         self.ai_advisor = get_ai_advisor()
 
         # Auto-optimizer for automatic weight tuning
-        self.auto_optimizer = get_auto_optimizer()
+        self.auto_optimizer = auto_optimizer or get_auto_optimizer()
         self.auto_optimizer.set_strategy_engine(self.strategy)
         self.auto_optimize_enabled = True  # Enable automatic strategy optimization
 
@@ -207,11 +221,18 @@ class TradingBot:
         # ===== HIERARCHICAL TRADING MODE =====
         # This is the "make money every day" intelligent strategy
         self.hierarchical_mode_enabled = True  # Use smart cascading scan
-        self.smart_scanner = get_smart_scanner()  # Intelligent scanner
+        self.smart_scanner = smart_scanner or get_smart_scanner()  # Intelligent scanner
         self.daily_profit_target_pct = self.trading_config.daily_profit_target_pct
         self.current_trading_horizon: Optional[TradingHorizon] = None
         self._hierarchical_scan_results: Dict[str, Any] = {}
 
+        # Warm restart: periodic snapshot of analytic state
+        self.state_snapshot: StateSnapshotService = get_state_snapshot_service()
+        self._last_state_snapshot_time: Optional[datetime] = None
+
+        # Partitioned analysis workers (started with the bot when configured)
+        self.worker_pool: Optional[BotWorkerPool] = None
+
         # Stock scan tracking (similar to crypto scan tracking)
         self._stock_scan_progress: Dict[str, Any] = {
             "total": 0,
@@ -257,9 +278,19 @@ class TradingBot:
             return
 
         self.state = BotState.RUNNING
-        self.start_time = datetime.now()
+        self.start_time = self.clock.now()
         self.error_message = None
 
+        # Warm restart: restore analytic state from the last snapshot
+        if self.trading_config.state_snapshot_enabled:
+            restored = self.state_snapshot.restore(self)
+            if restored:
+                logger.info(f"Warm start from snapshot: {restored}")
+
+        # Analysis runs in worker processes; risk checks and orders stay here
+        if self.trading_config.bot_worker_processes > 0:
+            self._start_worker_pool()
+
         # Start auto-optimizer background task (adapts strategy weights automatically)
         if self.auto_optimize_enabled:
             await self.auto_optimizer.start_background_optimization()
@@ -278,6 +309,11 @@ class TradingBot:
         logger.info("Stopping trading bot...")
         self.state = BotState.STOPPED
 
+        if self.trading_config.state_snapshot_enabled:
+            self._save_state_snapshot()
+
+        self._stop_worker_pool()
+
         # Stop auto-optimizer
         if self.auto_optimize_enabled:
             await self.auto_optimizer.stop_background_optimization()
@@ -558,7 +594,7 @@ class TradingBot:
     async def _load_db_config(self):
         """Load configuration from database including user watchlist and stock repository"""
         try:
-            db = SessionLocal()
+            db = self.session_factory()
 
             # Load bot configuration
             config = db.query(BotConfiguration).filter(BotConfiguration.is_active == True).first()
@@ -673,9 +709,11 @@ class TradingBot:
             try:
                 if self.state == BotState.PAUSED:
                     self.current_cycle = "paused"
-                    await asyncio.sleep(5)
+                    await self.clock.sleep(5)
                     continue
 
+                self._maybe_snapshot_state()
+
                 # Get detailed market session info
                 market_info = await self.alpaca.get_market_hours_info()
                 new_session = market_info.get("session", "unknown")
@@ -699,7 +737,7 @@ class TradingBot:
                 if self.risk_manager.is_daily_loss_limit_hit(account["equity"]):
                     self.current_cycle = "daily_loss_limit_paused"
                     logger.warning("Daily loss limit reached, pausing trading")
-                    await asyncio.sleep(300)
+                    await self.clock.sleep(300)
                     continue
 
                 # Determine what to do based on session and asset class mode
@@ -740,7 +778,7 @@ class TradingBot:
 
                     # Shorter sleep when actively trading crypto
                     sleep_time = 60 if should_scan_crypto and self.aggressive_crypto_after_hours else 300
-                    await asyncio.sleep(sleep_time)
+                    await self.clock.sleep(sleep_time)
 
                 elif self.current_session == "regular":
                     # Normal trading hours - run both stock and crypto cycles CONCURRENTLY
@@ -767,7 +805,7 @@ class TradingBot:
                                 logger.error(f"Concurrent task {i} failed: {result}")
 
                     self.current_cycle = "cycle_complete"
-                    await asyncio.sleep(self.cycle_interval_seconds)
+                    await self.clock.sleep(self.cycle_interval_seconds)
 
                 elif self.current_session in ["pre_market", "after_hours"]:
                     # Extended hours - both scanners run concurrently
@@ -790,14 +828,14 @@ class TradingBot:
                         logger.info(f"Starting CONCURRENT extended hours scan: {len(concurrent_tasks)} scanner(s)")
                         await asyncio.gather(*concurrent_tasks, return_exceptions=True)
 
-                    await asyncio.sleep(self.cycle_interval_seconds * 2)  # Slower during extended
+                    await self.clock.sleep(self.cycle_interval_seconds * 2)  # Slower during extended
 
                 else:
                     # Unknown session - be cautious, but still do crypto if enabled
                     self.current_cycle = "unknown_session"
                     if should_scan_crypto:
                         await self._run_crypto_cycle()
-                    await asyncio.sleep(60)
+                    await self.clock.sleep(60)
 
             except asyncio.CancelledError:
                 logger.info("Main loop cancelled")
@@ -817,10 +855,46 @@ class TradingBot:
                     error_code=ExecutionErrorCode.UNKNOWN_ERROR,
                     error_message=f"Main loop error: {str(e)}",
                 )
-                await asyncio.sleep(30)
+                await self.clock.sleep(30)
 
         logger.info("Main trading loop ended")
 
+    def _maybe_snapshot_state(self):
+        """Snapshot analytic state if the snapshot interval has elapsed"""
+        if not self.trading_config.state_snapshot_enabled:
+            return
+        interval = timedelta(seconds=self.trading_config.state_snapshot_interval_seconds)
+        if self._last_state_snapshot_time and self.clock.now() - self._last_state_snapshot_time < interval:
+            return
+        self._save_state_snapshot()
+
+    def _start_worker_pool(self):
+        """Start the analysis worker processes and hand them to the smart scanner"""
+        try:
+            self.worker_pool = BotWorkerPool(
+                num_workers=self.trading_config.bot_worker_processes,
+                paper_trading=self.paper_trading,
+                task_timeout_seconds=self.trading_config.bot_worker_timeout_seconds,
+            )
+            self.worker_pool.start()
+            self.smart_scanner.attach_worker_pool(self.worker_pool)
+        except Exception as e:
+            logger.error(f"Could not start worker pool, analyzing in-process: {e}")
+            self.worker_pool = None
+
+    def _stop_worker_pool(self):
+        """Detach and stop the analysis worker processes"""
+        if not self.worker_pool:
+            return
+        self.smart_scanner.attach_worker_pool(None)
+        self.worker_pool.shutdown()
+        self.worker_pool = None
+
+    def _save_state_snapshot(self):
+        """Write an analytic state snapshot (never raises)"""
+        self._last_state_snapshot_time = self.clock.now()
+        self.state_snapshot.save(self)
+
     async def _run_aggressive_crypto_cycle(self):
         """
         Run aggressive crypto scanning when stock market is closed.
@@ -828,7 +902,7 @@ class TradingBot:
         """
         logger.info("Running aggressive crypto cycle (market closed, crypto focus)")
         await self._run_crypto_cycle()
-        await asyncio.sleep(30)  # Short pause between scans
+        await self.clock.sleep(30)  # Short pause between scans
         await self._run_crypto_cycle()
 
     async def _run_off_hours_cycle(self):
@@ -883,12 +957,12 @@ class TradingBot:
             return
 
         try:
-            db = SessionLocal()
+            db = self.session_factory()
             for symbol, score in self._stock_scores.items():
                 repo_stock = db.query(StockRepository).filter(StockRepository.symbol == symbol).first()
                 if repo_stock:
                     repo_stock.last_analysis_score = score
-                    repo_stock.last_analysis_time = datetime.now()
+                    repo_stock.last_analysis_time = self.clock.now()
                     repo_stock.is_tradeable = score >= self.strategy.entry_threshold
             db.commit()
             db.close()
@@ -959,7 +1033,7 @@ class TradingBot:
                     "best_opportunity": None,
                     "scan_status": "at_capacity",
                     "scan_summary": f"{capacity_reason}. Monitoring existing positions only.",
-                    "last_scan_completed": datetime.now().isoformat(),
+                    "last_scan_completed": self.clock.now().isoformat(),
                     "next_scan_in_seconds": self.cycle_interval_seconds,
                     "market_status": "regular" if not extended_hours else "extended",
                     "monitoring_only": True,
@@ -969,12 +1043,12 @@ class TradingBot:
                 logger.info(f"[Hierarchical] Capacity reached: {capacity_reason} - monitoring only, no new position scans")
                 return  # Exit early - no need to scan for new positions
 
-            # Get symbols to scan (exclude those we already have positions in)
-            symbols_to_scan = [s for s in self.enabled_symbols if s not in self._positions_cache]
+            # Get symbols due for a scan (exclude those we already have positions in)
+            symbols_to_scan = self._get_due_stock_symbols()
 
             if not symbols_to_scan:
-                logger.info("[Hierarchical] No symbols to scan (all in positions)")
-                self._stock_scan_progress["scan_summary"] = "All symbols already in positions"
+                logger.info("[Hierarchical] No symbols due for a scan (in positions or scanned recently)")
+                self._stock_scan_progress["scan_summary"] = "No symbols due for a scan (in positions or scanned recently)"
                 return
 
             # Update scan progress
@@ -999,6 +1073,20 @@ class TradingBot:
                 max_cascades=3,
             )
 
+            # Feed scan results back into the priority scheduler
+            for symbol in symbols_to_scan:
+                self.priority_scanner.record_scan(symbol)
+            for symbol, metrics in self.smart_scanner.last_symbol_metrics.items():
+                self.priority_scanner.update_symbol_metrics(symbol, **metrics)
+            for result in scan_results:
+                opportunity = result.best_opportunity
+                if opportunity and opportunity.quality in [OpportunityQuality.EXCELLENT, OpportunityQuality.GOOD]:
+                    self.priority_scanner.record_signal(
+                        opportunity.symbol,
+                        "BUY" if opportunity.direction == "LONG" else "SELL",
+                        opportunity.overall_score,
+                    )
+
             # Store results for UI
             self._hierarchical_scan_results = {
                 "best_opportunity": {
@@ -1019,7 +1107,7 @@ class TradingBot:
                 } if best_opportunity else None,
                 "scan_summary": self.smart_scanner.get_scan_summary(),
                 "cascades_run": len(scan_results),
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": self.clock.now().isoformat(),
             }
 
             # Update stock scan progress
@@ -1043,39 +1131,38 @@ class TradingBot:
                         f"Score: {best_opportunity.overall_score:.1f}"
                     )
 
-                    # Check risk management
-                    can_trade, reason = self.risk_manager.can_open_position(
-                        equity=equity,
-                        buying_power=buying_power,
+                    # Size the position, then check risk management
+                    position_size = self.risk_manager.calculate_position_size(
+                        account_equity=equity,
+                        entry_price=best_opportunity.entry_price,
+                        stop_loss_price=best_opportunity.stop_loss,
                         current_positions=len(positions),
                     )
+                    risk_check = self.risk_manager.can_open_position(
+                        account_equity=equity,
+                        buying_power=buying_power,
+                        current_positions=positions,
+                        entry_price=best_opportunity.entry_price,
+                        position_value=position_size.position_value,
+                    )
 
-                    if can_trade and not self.new_entries_paused:
-                        # Calculate position size
-                        position_size = self.risk_manager.calculate_position_size(
-                            equity=equity,
-                            price=best_opportunity.entry_price,
-                            stop_loss_pct=abs(
-                                (best_opportunity.entry_price - best_opportunity.stop_loss) /
-                                best_opportunity.entry_price
-                            ),
-                        )
-
-                        if position_size > 0:
+                    if risk_check.can_trade and not self.new_entries_paused:
+                        if position_size.shares > 0:
                             logger.info(
                                 f"[Hierarchical] Executing {best_opportunity.direction} on "
-                                f"{best_opportunity.symbol}: {position_size} shares @ ${best_opportunity.entry_price:.2f}"
+                                f"{best_opportunity.symbol}: {position_size.shares} shares @ ${best_opportunity.entry_price:.2f}"
                             )
 
                             # Execute the trade
                             await self._execute_hierarchical_entry(
                                 opportunity=best_opportunity,
-                                quantity=position_size,
+                                quantity=position_size.shares,
                                 extended_hours=extended_hours,
                             )
                         else:
                             logger.warning(f"[Hierarchical] Position size calculated as 0 - skipping")
                     else:
+                        reason = risk_check.reason if not risk_check.can_trade else "New entries paused"
                         logger.info(f"[Hierarchical] Cannot trade: {reason}")
                         self._stock_scan_progress["scan_summary"] = f"Opportunity found but blocked: {reason}"
                 else:
@@ -1087,7 +1174,7 @@ class TradingBot:
                 self._stock_scan_progress["scan_summary"] = "No opportunities found after full cascade"
                 logger.info("[Hierarchical] No tradeable opportunities found after full cascade")
 
-            self._stock_scan_progress["last_scan_completed"] = datetime.now().isoformat()
+            self._stock_scan_progress["last_scan_completed"] = self.clock.now().isoformat()
             self.current_cycle = "cycle_complete"
 
         except Exception as e:
@@ -1126,7 +1213,7 @@ class TradingBot:
                 logger.info(f"[Hierarchical] Order placed: {result['id']} for {symbol}")
 
                 # Store position in database with hierarchical metadata
-                db = SessionLocal()
+                db = self.session_factory()
                 try:
                     # Map horizon to trade type
                     trade_type_map = {
@@ -1177,14 +1264,14 @@ class TradingBot:
                         entry_score=opportunity.overall_score,
                         indicators_snapshot=indicators_snapshot,
                         confluence_factors=confluence_factors,
-                        entry_time=datetime.now(),
+                        entry_time=self.clock.now(),
                     )
                     db.add(new_position)
                     db.commit()
                 finally:
                     db.close()
 
-                self.last_trade_time = datetime.now()
+                self.last_trade_time = self.clock.now()
                 self.trades_today += 1
 
                 # Log success
@@ -1255,7 +1342,7 @@ class TradingBot:
             await self._refresh_symbols_from_watchlist()
 
             # Initialize stock scan tracking
-            symbols_to_scan = [s for s in self.enabled_symbols if s not in self._positions_cache]
+            symbols_to_scan = self._get_due_stock_symbols()
             self._stock_scan_progress = {
                 "total": len(symbols_to_scan),
                 "scanned": 0,
@@ -1288,6 +1375,9 @@ class TradingBot:
 
                 # Analyze symbol
                 signal = await self._analyze_symbol(symbol)
+                self.priority_scanner.record_scan(symbol)
+                if signal and signal.signal_type in (SignalType.BUY, SignalType.SELL):
+                    self.priority_scanner.record_signal(symbol, signal.signal_type.value, signal.score)
 
                 # Store analysis results for UI display (like crypto) - store ALL results
                 if signal:
@@ -1305,12 +1395,12 @@ class TradingBot:
                             confidence,
                             self.strategy.entry_threshold
                         ),
-                        "timestamp": datetime.now().isoformat(),
+                        "timestamp": self.clock.now().isoformat(),
                         "indicators": signal.indicators if hasattr(signal, 'indicators') else {},
                         "current_price": signal.current_price,
                         "trade_type": signal.trade_type.value if signal.trade_type else None,
                     }
-                    self._last_stock_analysis_time = datetime.now()
+                    self._last_stock_analysis_time = self.clock.now()
 
                     # Log stock analysis like crypto does
                     logger.info(f"Stock analysis for {symbol}: signal={signal_type}, confidence={confidence:.1f}, threshold={self.strategy.entry_threshold}")
@@ -1322,12 +1412,12 @@ class TradingBot:
                         "threshold": self.strategy.entry_threshold,
                         "meets_threshold": False,
                         "reason": "Insufficient historical data (need 50+ days)",
-                        "timestamp": datetime.now().isoformat(),
+                        "timestamp": self.clock.now().isoformat(),
                         "indicators": {},
                         "current_price": None,
                         "trade_type": None,
                     }
-                    self._last_stock_analysis_time = datetime.now()
+                    self._last_stock_analysis_time = self.clock.now()
                     # Debug log moved to _analyze_symbol for actual bar count
 
                 # Track best opportunity
@@ -1419,7 +1509,7 @@ class TradingBot:
                                     "confidence": ai_decision.get("confidence", 0),
                                     "reasoning": ai_decision.get("reasoning", ""),
                                     "concerns": ai_decision.get("concerns", []),
-                                    "timestamp": datetime.now().isoformat(),
+                                    "timestamp": self.clock.now().isoformat(),
                                     "symbol": symbol,
                                     "ai_generated": True,
                                     "model": ai_decision.get("model", "gpt-4"),
@@ -1493,7 +1583,7 @@ class TradingBot:
             self._stock_scan_progress["scanned"] = len(symbols_to_scan)
             self._stock_scan_progress["current_symbol"] = None
             self._stock_scan_progress["best_opportunity"] = best_buy_signal
-            self._stock_scan_progress["last_scan_completed"] = datetime.now().isoformat()
+            self._stock_scan_progress["last_scan_completed"] = self.clock.now().isoformat()
             self._total_scans_today += 1
 
             # Set final scan status and summary
@@ -1521,6 +1611,27 @@ class TradingBot:
             logger.error(f"Error in trading cycle: {e}")
             raise
 
+    def _get_due_stock_symbols(self) -> List[str]:
+        """
+        Pull the stock symbols due for a scan from the priority scanner.
+
+        Enabled symbols are registered each cycle (a no-op for known ones),
+        and HIGH symbols whose last signal has aged out are demoted first.
+        Symbols that have left the watchlist are dropped as they come due,
+        and symbols we hold positions in are skipped.
+        """
+        self.priority_scanner.register_symbols(self.enabled_symbols)
+        self.priority_scanner.demote_inactive_symbols()
+        enabled = set(self.enabled_symbols)
+
+        due = []
+        for symbol in self.priority_scanner.pop_due_symbols():
+            if symbol not in enabled:
+                self.priority_scanner.unregister_symbol(symbol)
+            elif symbol not in self._positions_cache:
+                due.append(symbol)
+        return due
+
     async def _refresh_symbols_from_watchlist(self):
         """
         Refresh stock symbols from the user's watchlist.
@@ -1528,7 +1639,7 @@ class TradingBot:
         automatically included in the next scan cycle.
         """
         try:
-            db = SessionLocal()
+            db = self.session_factory()
 
             # Get ALL stocks from watchlist (not just auto_trade=True)
             # This makes the scanner follow the watchlist completely
@@ -1558,7 +1669,7 @@ class TradingBot:
         """Use AI to discover promising stocks to trade"""
         # Only run discovery every 4 hours
         discovery_interval = timedelta(hours=4)
-        if self.last_discovery_time and (datetime.now() - self.last_discovery_time) < discovery_interval:
+        if self.last_discovery_time and (self.clock.now() - self.last_discovery_time) < discovery_interval:
             return
 
         logger.info("Running AI stock discovery...")
@@ -1603,7 +1714,7 @@ class TradingBot:
                 # Update database config
                 await self._save_discovered_symbols()
 
-            self.last_discovery_time = datetime.now()
+            self.last_discovery_time = self.clock.now()
 
         except Exception as e:
             logger.error(f"AI stock discovery failed: {e}")
@@ -1611,7 +1722,7 @@ class TradingBot:
     async def _save_discovered_symbols(self):
         """Save discovered symbols to database"""
         try:
-            db = SessionLocal()
+            db = self.session_factory()
             config = db.query(BotConfiguration).filter(BotConfiguration.is_active == True).first()
             if config:
                 config.enabled_symbols = self.enabled_symbols
@@ -1654,6 +1765,9 @@ class TradingBot:
             highs = [b["high"] for b in bars]
             lows = [b["low"] for b in bars]
             volumes = [b["volume"] for b in bars]
+            self.priority_scanner.update_symbol_metrics(
+                symbol, **compute_activity_metrics(highs, lows, prices, volumes)
+            )
 
             # Generate signal
             signal = self.strategy.analyze(symbol, prices, highs, lows, volumes)
@@ -1669,6 +1783,18 @@ class TradingBot:
             logger.error(f"Error analyzing {symbol}: {e}")
             return None
 
+    def _exit_trade_type(self, stored_trade_type: Optional[str]) -> TradeType:
+        """
+        Exit rules for a stored position's trade type.
+
+        Hierarchical entries store their horizon (INTRADAY, SCALP), which the
+        strategy engine has no rules for - those are held to the swing rules,
+        as are positions without a trade type. LONG_TERM keeps its own.
+        """
+        if stored_trade_type == TradeType.LONG_TERM.value:
+            return TradeType.LONG_TERM
+        return TradeType.SWING
+
     async def _check_exit_signals(self, positions: List[Dict]):
         """Check existing positions for exit signals including trailing stops and partial profits"""
         for pos in positions:
@@ -1676,7 +1802,7 @@ class TradingBot:
 
             try:
                 # Get our tracked position data from database
-                db = SessionLocal()
+                db = self.session_factory()
                 db_position = db.query(Position).filter(Position.symbol == symbol).first()
 
                 if not db_position:
@@ -1746,7 +1872,9 @@ class TradingBot:
 
                 # Calculate days held
                 entry_time = db_position.entry_time
-                days_held = (datetime.now() - entry_time).days
+                days_held = (self.clock.now() - entry_time).days
+
+                trade_type = self._exit_trade_type(db_position.trade_type)
 
                 # Check standard exit conditions
                 should_exit, exit_reason = self.strategy.should_exit(
@@ -1755,7 +1883,7 @@ class TradingBot:
                     current_price=current_price,
                     stop_loss=current_stop,
                     profit_target=db_position.profit_target_price or entry_price * 1.10,
-                    trade_type=TradeType(db_position.trade_type) if db_position.trade_type else TradeType.SWING,
+                    trade_type=trade_type,
                     entry_time_days=days_held,
                     prices=prices,
                     highs=highs,
@@ -1844,14 +1972,14 @@ class TradingBot:
             # Wait for fill (with timeout)
             filled_price = signal.current_price
             for _ in range(10):
-                await asyncio.sleep(1)
+                await self.clock.sleep(1)
                 order_status = await self.alpaca.get_order(order["id"])
                 if order_status and order_status["status"] == "filled":
                     filled_price = order_status["filled_avg_price"] or filled_price
                     break
 
             # Record in database
-            db = SessionLocal()
+            db = self.session_factory()
             try:
                 # Create trade record
                 trade = Trade(
@@ -1859,7 +1987,7 @@ class TradingBot:
                     side="BUY",
                     quantity=shares,
                     entry_price=filled_price,
-                    entry_time=datetime.now(),
+                    entry_time=self.clock.now(),
                     entry_order_id=order["id"],
                     strategy_name="default",
                     trade_type=signal.trade_type.value,
@@ -1893,7 +2021,7 @@ class TradingBot:
                     symbol=symbol,
                     quantity=shares,
                     entry_price=filled_price,
-                    entry_time=datetime.now(),
+                    entry_time=self.clock.now(),
                     stop_loss_price=signal.suggested_stop_loss,
                     profit_target_price=signal.suggested_profit_target,
                     trade_type=signal.trade_type.value,
@@ -1908,7 +2036,7 @@ class TradingBot:
             finally:
                 db.close()
 
-            self.last_trade_time = datetime.now()
+            self.last_trade_time = self.clock.now()
             logger.info(f"Entry executed: {symbol} {shares} shares @ ${filled_price:.2f}")
 
             # Log successful execution
@@ -1981,14 +2109,14 @@ class TradingBot:
             # Wait for fill
             exit_price = None
             for _ in range(10):
-                await asyncio.sleep(1)
+                await self.clock.sleep(1)
                 order_status = await self.alpaca.get_order(order["id"])
                 if order_status and order_status["status"] == "filled":
                     exit_price = order_status["filled_avg_price"]
                     break
 
             # Update database - reduce position quantity
-            db = SessionLocal()
+            db = self.session_factory()
             try:
                 position = db.query(Position).filter(Position.symbol == symbol).first()
                 if position:
@@ -2000,9 +2128,9 @@ class TradingBot:
                     side="SELL",
                     quantity=quantity,
                     entry_price=position.entry_price if position else 0,
-                    entry_time=position.entry_time if position else datetime.now(),
+                    entry_time=position.entry_time if position else self.clock.now(),
                     exit_price=exit_price,
-                    exit_time=datetime.now(),
+                    exit_time=self.clock.now(),
                     exit_order_id=order["id"],
                     exit_reason=reason,
                     profit_loss=(exit_price - position.entry_price) * quantity if position and exit_price else 0,
@@ -2020,7 +2148,7 @@ class TradingBot:
             finally:
                 db.close()
 
-            self.last_trade_time = datetime.now()
+            self.last_trade_time = self.clock.now()
             logger.info(f"Partial exit executed: {symbol} {quantity} shares @ ${exit_price:.2f if exit_price else 'N/A'} ({reason})")
 
         except Exception as e:
@@ -2142,7 +2270,7 @@ class TradingBot:
             "signal": signal.upper(),
             "confidence": confidence,
             "reason": reason or f"Strong {signal} signal detected while market closed",
-            "queued_at": datetime.now().isoformat(),
+            "queued_at": self.clock.now().isoformat(),
             "status": "PENDING",
         }
         self._queued_trades.append(trade)
@@ -2178,14 +2306,14 @@ class TradingBot:
             # Wait for fill
             exit_price = None
             for _ in range(10):
-                await asyncio.sleep(1)
+                await self.clock.sleep(1)
                 order_status = await self.alpaca.get_order(order["id"])
                 if order_status and order_status["status"] == "filled":
                     exit_price = order_status["filled_avg_price"]
                     break
 
             # Update database
-            db = SessionLocal()
+            db = self.session_factory()
             try:
                 # Find the open trade
                 trade = db.query(Trade).filter(
@@ -2195,7 +2323,7 @@ class TradingBot:
 
                 if trade:
                     trade.exit_price = exit_price or trade.entry_price
-                    trade.exit_time = datetime.now()
+                    trade.exit_time = self.clock.now()
                     trade.exit_order_id = order["id"]
                     trade.exit_reason = reason
                     trade.profit_loss = (trade.exit_price - trade.entry_price) * trade.quantity
@@ -2213,18 +2341,24 @@ class TradingBot:
             finally:
                 db.close()
 
-            self.last_trade_time = datetime.now()
+            self.last_trade_time = self.clock.now()
             logger.info(f"Exit executed: {symbol} @ ${exit_price:.2f if exit_price else 'N/A'} ({reason})")
 
         except Exception as e:
             logger.error(f"Failed to execute exit for {symbol}: {e}")
             raise
 
+    def force_trading_horizon(self, horizon: TradingHorizon):
+        """Override the cascade and only look for opportunities in one horizon"""
+        self.current_trading_horizon = horizon
+        if self.smart_scanner:
+            self.smart_scanner.strategy.force_horizon(horizon)
+
     def get_status(self) -> Dict[str, Any]:
         """Get current bot status with detailed information"""
         uptime_seconds = 0
         if self.start_time:
-            uptime_seconds = int((datetime.now() - self.start_time).total_seconds())
+            uptime_seconds = int((self.clock.now() - self.start_time).total_seconds())
 
         # Format uptime nicely
         hours, remainder = divmod(uptime_seconds, 3600)
@@ -2304,6 +2438,10 @@ class TradingBot:
             "total_scans_today": self._total_scans_today,
             # Priority Tier Summary
             "priority_tier_summary": self.priority_scanner.get_tier_summary(),
+            # Warm Restart Snapshot
+            "state_snapshot": self.state_snapshot.get_status(),
+            # Partitioned Analysis Workers
+            "worker_pool": self.worker_pool.get_status() if self.worker_pool else None,
             # Queued trades for market open
             "queued_trades": self._queued_trades,
             "queued_trades_count": len(self._queued_trades),
@@ -2454,7 +2592,7 @@ class TradingBot:
             symbol = normalized_symbol
 
         event = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": self.clock.now().isoformat(),
             "symbol": symbol,
             "event_type": event_type,
             "executed": executed,
@@ -2518,7 +2656,7 @@ class TradingBot:
             technical_analysis: The technical analysis that was evaluated
         """
         decision_record = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": self.clock.now().isoformat(),
             "symbol": symbol,
             "decision": ai_decision.get("decision", "UNKNOWN"),
             "confidence": ai_decision.get("confidence", 0),
@@ -2635,7 +2773,7 @@ class TradingBot:
                     "best_opportunity": None,
                     "scan_status": "at_capacity",
                     "scan_summary": f"{capacity_reason}. Monitoring existing positions only.",
-                    "last_scan_completed": datetime.now().isoformat(),
+                    "last_scan_completed": self.clock.now().isoformat(),
                     "next_scan_in_seconds": self.cycle_interval_seconds,
                     "monitoring_only": True,
                     "positions_held": list(current_crypto_positions.keys()),
@@ -2662,7 +2800,7 @@ class TradingBot:
                             "confidence": 0,
                             "threshold": self.crypto_entry_threshold,
                             "reason": "No analysis data available",
-                            "timestamp": datetime.now().isoformat(),
+                            "timestamp": self.clock.now().isoformat(),
                         }
                         continue
 
@@ -2697,11 +2835,11 @@ class TradingBot:
                         "threshold": self.crypto_entry_threshold,
                         "meets_threshold": signal == "BUY" and confidence >= self.crypto_entry_threshold,
                         "reason": self._get_analysis_reason(signal, confidence, self.crypto_entry_threshold),
-                        "timestamp": datetime.now().isoformat(),
+                        "timestamp": self.clock.now().isoformat(),
                         "indicators": analysis.get("indicators", {}),
                         "signals": analysis.get("signals", []),
                     }
-                    self._last_crypto_analysis_time = datetime.now()
+                    self._last_crypto_analysis_time = self.clock.now()
 
                     logger.info(f"Crypto analysis for {symbol}: signal={signal}, confidence={confidence:.1f}, threshold={self.crypto_entry_threshold}")
 
@@ -2958,7 +3096,7 @@ class TradingBot:
             self._crypto_scan_progress["scanned"] = len(symbols_to_scan)
             self._crypto_scan_progress["current_symbol"] = None
             self._crypto_scan_progress["best_opportunity"] = best_buy_signal
-            self._crypto_scan_progress["last_scan_completed"] = datetime.now().isoformat()
+            self._crypto_scan_progress["last_scan_completed"] = self.clock.now().isoformat()
             self._total_scans_today += 1  # Count crypto scans too
 
             # Set final scan status and summary
@@ -3054,9 +3192,18 @@ _trading_bot: Optional[TradingBot] = None
 
 
 def get_trading_bot(paper_trading: bool = None) -> TradingBot:
-    """Get or create trading bot singleton"""
+    """
+    Get or create trading bot singleton.
+
+    With BOT_PROCESS_MODE=external the bot runs in its own process
+    (bot_process.py) and this returns a BotProxy that forwards to it.
+    """
     global _trading_bot
     if _trading_bot is None:
+        if is_external_bot_mode():
+            _trading_bot = BotProxy()
+            return _trading_bot
+
         # Default to paper trading from env, or True for safety
         if paper_trading is None:
             paper_trading = os.getenv("ALPACA_TRADING_MODE", "paper") == "paper"
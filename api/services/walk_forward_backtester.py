@@ -9,6 +9,8 @@ This service provides:
 4. Parameter optimization with cross-validation
 5. Regime detection for strategy selection
 """
+import functools
+import itertools
 import logging
 import math
 import random
@@ -16,29 +18,164 @@ import statistics
 from typing import Dict, Any, Optional, List, Tuple, Callable
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from enum import Enum
 from collections import defaultdict
 
+import numpy as np
+
+from . import monte_carlo
+from .backtesting import sim_core
+from .backtesting.online_metrics import MetricsSnapshot, OnlineMetrics
+from .backtesting.order_simulator import IntrabarPath, OrderSimulator
+from .backtesting.slippage import SlippageConfig, calculate_slippage
+from .monte_carlo import MonteCarloMethod
+from .parallel_optimizer import (
+    OptimizationProgress, ParallelParamOptimizer, ParallelWindowRunner, ProgressCallback,
+)
+from .param_search import GridSearch, ParamSearch, SearchBudget, SearchSpace
+
 logger = logging.getLogger(__name__)
 
+# Parameter combinations evaluated per training window
+MAX_PARAM_COMBINATIONS = 100
 
-class SlippageModel(str, Enum):
-    """Slippage calculation methods"""
-    FIXED = "fixed"              # Fixed percentage
-    VOLUME_BASED = "volume_based"  # Based on order size vs volume
-    VOLATILITY_BASED = "volatility_based"  # Based on ATR
-    ADAPTIVE = "adaptive"        # Combines volume and volatility
+# Shortest training slice a reduced-fidelity search evaluation runs on
+# (bars before 50 are warm-up in _run_single_backtest)
+MIN_SEARCH_BARS = 100
 
 
-@dataclass
-class SlippageConfig:
-    """Configuration for slippage modeling"""
-    model: SlippageModel = SlippageModel.ADAPTIVE
-    fixed_slippage_pct: float = 0.001  # 0.1% default
-    volume_impact_factor: float = 0.1  # How much order size impacts price
-    volatility_multiplier: float = 0.5  # Multiplier for ATR-based slippage
-    min_slippage_pct: float = 0.0001   # 0.01% minimum
-    max_slippage_pct: float = 0.02     # 2% maximum
+def task_rng(seed: int, *key) -> random.Random:
+    """
+    RNG for one backtest task, derived from the run seed and the task key.
+
+    Each (window, combination) backtest gets its own stream, so results
+    don't depend on how tasks are spread across worker processes.
+    """
+    return random.Random(":".join(str(part) for part in (seed, *key)))
+
+
+# ==================== PRECOMPUTED SIGNALS ====================
+#
+# A strategy function can carry a `precompute` attribute that returns the
+# signal side ("long", "short" or "") for every bar of a window in one
+# pass. _run_single_backtest calls it once per parameter set and window
+# and indexes the result, instead of calling the strategy on every bar.
+#
+# A `precompute_series` attribute does the same for the whole series:
+# run_walk_forward calls it once per parameter set and hands every window
+# its slice. Only valid for signals that look back no further than the
+# 50-bar warm-up, so a slice equals computing on the window alone.
+
+
+def with_precompute(precompute: Callable) -> Callable:
+    """Decorator attaching a whole-window signal function to a strategy function"""
+    def decorate(strategy_func: Callable) -> Callable:
+        strategy_func.precompute = precompute
+        return strategy_func
+    return decorate
+
+
+class SeriesSides:
+    """Whole-series sides per parameter set, sliced per window (strategies with precompute_series)"""
+
+    def __init__(self, strategy_func: Callable, opens, highs, lows, closes, volumes):
+        self.precompute = getattr(strategy_func, "precompute_series", None)
+        self.series = (opens, highs, lows, closes, volumes)
+        self._sides: Dict[Tuple, List[str]] = {}
+
+    def window(self, params: Dict[str, Any], start: int, end: int) -> Optional[List[str]]:
+        """Sides for bars [start, end), or None when the strategy has no precompute_series"""
+        if self.precompute is None:
+            return None
+        key = tuple(sorted(params.items()))
+        sides = self._sides.get(key)
+        if sides is None:
+            sides = self._sides[key] = list(self.precompute(*self.series, params))
+        return sides[start:end]
+
+
+def bars_slice(series, start: int, end: int) -> List[float]:
+    """
+    series[start:end] as a list. Price series may be lists or numpy arrays
+    (e.g. shared price matrix views); strategies index lists much faster.
+    """
+    part = series[start:end]
+    return part.tolist() if isinstance(part, np.ndarray) else part
+
+
+def ema_series(values: List[float], period: int) -> List[Optional[float]]:
+    """EMA seeded with the SMA of the first `period` values (None before that)"""
+    result: List[Optional[float]] = [None] * len(values)
+    if period < 1 or len(values) < period:
+        return result
+    mult = 2 / (period + 1)
+    value = sum(values[:period]) / period
+    result[period - 1] = value
+    for j in range(period, len(values)):
+        value = (values[j] - value) * mult + value
+        result[j] = value
+    return result
+
+
+def rsi_series(closes: List[float], period: int) -> np.ndarray:
+    """
+    RSI at every bar over the last `period` price changes (simple averages,
+    as in rsi_strategy). NaN for the first `period` bars.
+    """
+    closes = np.asarray(closes, dtype=np.float64)
+    rsi = np.full(len(closes), np.nan)
+    if period < 1 or len(closes) <= period:
+        return rsi
+
+    changes = np.diff(closes)
+    gain_sums = np.concatenate(([0.0], np.cumsum(np.maximum(changes, 0.0))))
+    loss_sums = np.concatenate(([0.0], np.cumsum(np.maximum(-changes, 0.0))))
+    # Window for bar i: the changes ending at closes[i]
+    avg_gain = (gain_sums[period:] - gain_sums[:-period]) / period
+    avg_loss = (loss_sums[period:] - loss_sums[:-period]) / period
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi[period:] = np.where(avg_loss == 0, 100.0, 100 - 100 / (1 + avg_gain / avg_loss))
+    return rsi
+
+
+def precompute_rsi_signals(opens, highs, lows, closes, volumes, params: Dict) -> List[str]:
+    """Signal side per bar for rsi_strategy"""
+    rsi = rsi_series(closes, params.get("rsi_period", 14))
+    sides = np.full(len(rsi), "", dtype=object)
+    sides[rsi < params.get("rsi_oversold", 30)] = "long"
+    sides[rsi > params.get("rsi_overbought", 70)] = "short"
+    return sides.tolist()
+
+
+def macd_series(
+    closes: List[float], fast: int, slow: int, signal: int
+) -> Tuple[List[Optional[float]], List[Optional[float]]]:
+    """MACD line and its signal-line EMA at every bar (None during warm-up)"""
+    fast_ema = ema_series(closes, fast)
+    slow_ema = ema_series(closes, slow)
+    macd = [f - s if f is not None and s is not None else None for f, s in zip(fast_ema, slow_ema)]
+
+    # Signal line over the defined part of the MACD line
+    first = next((j for j, value in enumerate(macd) if value is not None), len(macd))
+    signal_line = [None] * first + ema_series(macd[first:], signal)
+    return macd, signal_line
+
+
+def precompute_macd_signals(opens, highs, lows, closes, volumes, params: Dict) -> List[str]:
+    """Signal side per bar for macd_strategy (MACD / signal-line crossovers)"""
+    fast = params.get("macd_fast", 12)
+    slow = params.get("macd_slow", 26)
+    signal = params.get("macd_signal", 9)
+    macd, signal_line = macd_series(closes, fast, slow, signal)
+
+    sides = [""] * len(closes)
+    for i in range(max(slow + signal, 1), len(closes)):
+        if signal_line[i - 1] is None:
+            continue
+        if macd[i] > signal_line[i] and macd[i - 1] <= signal_line[i - 1]:
+            sides[i] = "long"
+        elif macd[i] < signal_line[i] and macd[i - 1] >= signal_line[i - 1]:
+            sides[i] = "short"
+    return sides
 
 
 @dataclass
@@ -73,6 +210,7 @@ class WalkForwardResult:
     windows: List[WalkForwardWindow] = field(default_factory=list)
     optimal_params_summary: Dict[str, Any] = field(default_factory=dict)
     robustness_score: float = 0  # 0-100
+    seed: Optional[int] = None   # Slippage noise seed (reproduces the run)
 
 
 @dataclass
@@ -89,6 +227,8 @@ class MonteCarloResult:
     mean_max_drawdown: float
     worst_drawdown: float
     confidence_interval_90: Tuple[float, float]
+    method: str = MonteCarloMethod.PERMUTATION.value
+    seed: Optional[int] = None
 
 
 class WalkForwardBacktester:
@@ -121,6 +261,14 @@ class WalkForwardBacktester:
             "take_profit_pct": [0.04, 0.06, 0.10],
         }
 
+        # Processes for the parameter search (1 = serial in the calling thread)
+        self.optimizer_workers = 1
+
+        # Stops/targets rest as OCO orders filled against each bar's range
+        # along this path (None = checked against closes only)
+        self.intrabar_exits: Optional[IntrabarPath] = None
+        self._optimization_progress: Optional[OptimizationProgress] = None
+
     def set_slippage_config(self, config: SlippageConfig):
         """Set slippage configuration"""
         self.slippage_config = config
@@ -135,6 +283,7 @@ class WalkForwardBacktester:
         volume: float,
         atr: float,
         avg_volume: float = None,
+        rng: Optional[random.Random] = None,
     ) -> Tuple[float, float]:
         """
         Calculate realistic slippage for an order.
@@ -146,55 +295,12 @@ class WalkForwardBacktester:
             volume: Current bar volume
             atr: Average True Range
             avg_volume: Average daily volume
+            rng: Source of the adaptive model's noise (module random if None)
 
         Returns:
             (slippage_pct, executed_price)
         """
-        config = self.slippage_config
-
-        if config.model == SlippageModel.FIXED:
-            slippage_pct = config.fixed_slippage_pct
-
-        elif config.model == SlippageModel.VOLUME_BASED:
-            # Slippage increases with order size relative to volume
-            order_value = price * quantity
-            volume_value = price * volume if volume > 0 else price * 10000
-            order_ratio = order_value / volume_value
-            slippage_pct = config.fixed_slippage_pct * (1 + order_ratio * config.volume_impact_factor)
-
-        elif config.model == SlippageModel.VOLATILITY_BASED:
-            # Slippage based on ATR as percentage of price
-            atr_pct = atr / price if price > 0 else 0
-            slippage_pct = atr_pct * config.volatility_multiplier
-
-        else:  # ADAPTIVE - combines both
-            # Volume component
-            order_value = price * quantity
-            volume_value = price * volume if volume > 0 else price * 10000
-            order_ratio = order_value / volume_value
-            volume_slippage = config.fixed_slippage_pct * (1 + order_ratio * config.volume_impact_factor)
-
-            # Volatility component
-            atr_pct = atr / price if price > 0 else 0
-            vol_slippage = atr_pct * config.volatility_multiplier
-
-            # Combine - take the larger impact
-            slippage_pct = max(volume_slippage, vol_slippage)
-
-            # Add random variation (market microstructure noise)
-            noise = random.uniform(-0.2, 0.3) * slippage_pct
-            slippage_pct += noise
-
-        # Apply bounds
-        slippage_pct = max(config.min_slippage_pct, min(config.max_slippage_pct, slippage_pct))
-
-        # Calculate executed price
-        if side == "buy":
-            executed_price = price * (1 + slippage_pct)
-        else:
-            executed_price = price * (1 - slippage_pct)
-
-        return slippage_pct, executed_price
+        return calculate_slippage(self.slippage_config, price, quantity, side, volume, atr, rng=rng)
 
     def estimate_market_impact(
         self,
@@ -236,6 +342,11 @@ class WalkForwardBacktester:
         num_windows: int = 5,          # Number of walk-forward periods
         min_trades_per_window: int = 5,
         initial_capital: float = 10000,
+        workers: Optional[int] = None,
+        seed: Optional[int] = None,
+        progress_callback: Optional[ProgressCallback] = None,
+        search: Optional[ParamSearch] = None,
+        search_budget: Optional[SearchBudget] = None,
     ) -> WalkForwardResult:
         """
         Run walk-forward optimization.
@@ -244,7 +355,8 @@ class WalkForwardBacktester:
         validates on test.
 
         Args:
-            opens, highs, lows, closes, volumes: Price data
+            opens, highs, lows, closes, volumes: Price data (lists, or arrays such
+                as price matrix views - each window copies only its own bars)
             dates: Date strings
             strategy_func: Function that generates signals given params
             param_ranges: Parameter ranges to optimize
@@ -252,6 +364,17 @@ class WalkForwardBacktester:
             num_windows: Number of rolling windows
             min_trades_per_window: Minimum trades for valid window
             initial_capital: Starting capital
+            workers: Processes for the windows (default: optimizer_workers). With at
+                least as many windows as workers, or a search, each worker runs
+                whole windows; otherwise each window's grid is split across them.
+                Needs a picklable strategy_func and search, otherwise runs serially.
+            seed: Slippage noise seed; results are identical for any worker count
+            progress_callback: Called with an OptimizationProgress as backtests and windows finish
+            search: Parameter search per training window (e.g. TPESearch,
+                SuccessiveHalving). Default: the first MAX_PARAM_COMBINATIONS
+                grid combinations.
+            search_budget: Evaluation/time limit for the whole run, shared
+                equally between windows (implies a grid search if no search given)
 
         Returns:
             WalkForwardResult with performance metrics
@@ -269,7 +392,14 @@ class WalkForwardBacktester:
 
         # Calculate ATR for slippage
         atrs = self._calculate_atr(highs, lows, closes, 14)
+        series_sides = SeriesSides(strategy_func, opens, highs, lows, closes, volumes)
 
+        if seed is None:
+            seed = random.getrandbits(32)
+        workers = workers or self.optimizer_workers
+
+        # Window bounds up front so the parameter search can cover all windows at once
+        bounds = []
         for i in range(num_windows):
             window_start = i * window_size
             train_start = window_start
@@ -279,48 +409,66 @@ class WalkForwardBacktester:
 
             if test_end <= test_start:
                 continue
+            bounds.append((i, train_start, train_end, test_start, test_end))
 
-            # Optimize parameters on training data
-            best_params, train_sharpe = self._optimize_params(
-                opens[train_start:train_end],
-                highs[train_start:train_end],
-                lows[train_start:train_end],
-                closes[train_start:train_end],
-                volumes[train_start:train_end],
-                atrs[train_start:train_end] if atrs else None,
-                strategy_func,
-                param_ranges,
-                initial_capital,
-            )
+        if search is None and search_budget is not None:
+            search = GridSearch(limit=MAX_PARAM_COMBINATIONS)
 
-            # Validate on test data
-            test_result = self._run_single_backtest(
-                opens[test_start:test_end],
-                highs[test_start:test_end],
-                lows[test_start:test_end],
-                closes[test_start:test_end],
-                volumes[test_start:test_end],
-                atrs[test_start:test_end] if atrs else None,
-                strategy_func,
-                best_params,
-                initial_capital,
-            )
+        if search is not None:
+            space = SearchSpace.from_ranges(param_ranges)
+            window_budget = (search_budget or SearchBudget()).split(len(bounds))
+            param_combos = None
+            total_tasks = len(bounds) * search.planned_evaluations(space, window_budget)
+        else:
+            space = window_budget = None
+            param_combos = self._generate_param_combinations(param_ranges, limit=MAX_PARAM_COMBINATIONS)
+            total_tasks = len(bounds) * len(param_combos)
+        progress = OptimizationProgress(total_tasks=total_tasks, workers=workers, total_windows=len(bounds))
+        self._optimization_progress = progress
+
+        finished: Dict[int, WalkForwardWindow] = {}
+        optimized = None
+        if workers > 1 and bounds:
+            if not (ParallelParamOptimizer.can_pickle(strategy_func) and ParallelParamOptimizer.can_pickle(search)):
+                logger.info("Strategy function or search can't be sent to worker processes - running serially")
+                progress.workers = 1
+            elif search is not None or len(bounds) >= workers:
+                # Whole windows per worker, so the test backtests (and adaptive searches) run in parallel too
+                finished = ParallelWindowRunner(self, workers).run(
+                    opens, highs, lows, closes, volumes, atrs, bounds,
+                    strategy_func, initial_capital, seed,
+                    param_combos=param_combos, search=search, space=space, window_budget=window_budget,
+                    progress=progress, progress_callback=progress_callback,
+                )
+            else:
+                # Fewer windows than workers - split each window's grid instead
+                optimized = ParallelParamOptimizer(self, workers).optimize(
+                    opens, highs, lows, closes, volumes, atrs,
+                    [(i, train_start, train_end) for i, train_start, train_end, _, _ in bounds],
+                    strategy_func, param_combos, initial_capital, seed,
+                    progress=progress, progress_callback=progress_callback,
+                )
 
-            window = WalkForwardWindow(
-                train_start=train_start,
-                train_end=train_end,
-                test_start=test_start,
-                test_end=test_end,
-                optimal_params=best_params,
-                train_performance=train_sharpe,
-                test_performance=test_result["sharpe"],
-                trades=test_result["trades"],
-            )
+        # Aggregate in window order, however the windows were run
+        for window_bounds in bounds:
+            i = window_bounds[0]
+            window = finished.get(i)
+            if window is None:
+                window = self._run_window(
+                    opens, highs, lows, closes, volumes, atrs, series_sides, window_bounds,
+                    strategy_func, initial_capital, seed,
+                    param_combos=param_combos, search=search, space=space, window_budget=window_budget,
+                    optimized=optimized[i] if optimized is not None else None,
+                    progress=progress, progress_callback=progress_callback,
+                )
+                progress.window_done(i, window)
+                if progress_callback:
+                    progress_callback(progress)
             windows.append(window)
-            all_trades.extend(test_result["trades"])
+            all_trades.extend(window.trades)
 
             # Track slippage
-            for trade in test_result["trades"]:
+            for trade in window.trades:
                 total_slippage += trade.get("slippage_pct", 0)
                 slippage_count += 1
 
@@ -332,23 +480,16 @@ class WalkForwardBacktester:
         avg_oos_sharpe = statistics.mean(out_sample_sharpes) if out_sample_sharpes else 0
         efficiency = avg_oos_sharpe / avg_is_sharpe if avg_is_sharpe > 0 else 0
 
-        # Calculate trade metrics
-        wins = [t for t in all_trades if t.get("pnl", 0) > 0]
-        losses = [t for t in all_trades if t.get("pnl", 0) <= 0]
-        win_rate = len(wins) / len(all_trades) * 100 if all_trades else 0
-
-        total_wins = sum(t.get("pnl", 0) for t in wins)
-        total_losses = abs(sum(t.get("pnl", 0) for t in losses))
-        profit_factor = total_wins / total_losses if total_losses > 0 else float('inf')
-
-        total_pnl = sum(t.get("pnl", 0) for t in all_trades)
-        total_return_pct = (total_pnl / initial_capital) * 100
+        # Calculate trade metrics (one pass over the combined out-of-sample trades)
+        trade_metrics = self._trade_metrics(all_trades, initial_capital)
+        win_rate = trade_metrics.win_rate * 100
+        profit_factor = trade_metrics.profit_factor
+        total_return_pct = (trade_metrics.net_pnl / initial_capital) * 100
 
         avg_slippage = total_slippage / slippage_count if slippage_count > 0 else 0
         slippage_cost = sum(t.get("slippage_cost", 0) for t in all_trades)
 
-        # Calculate max drawdown
-        max_dd = self._calculate_max_drawdown(all_trades, initial_capital)
+        max_dd = trade_metrics.max_drawdown_pct / 100
 
         # Summarize optimal params across windows
         param_summary = self._summarize_params(windows)
@@ -375,185 +516,256 @@ class WalkForwardBacktester:
             windows=windows,
             optimal_params_summary=param_summary,
             robustness_score=round(robustness, 1),
+            seed=seed,
+        )
+
+    def _run_window(
+        self,
+        opens, highs, lows, closes, volumes, atrs,
+        series_sides: SeriesSides,
+        bounds: Tuple[int, int, int, int, int],
+        strategy_func, initial_capital, seed: int,
+        param_combos: Optional[List[Dict[str, Any]]] = None,
+        search: Optional[ParamSearch] = None,
+        space: Optional[SearchSpace] = None,
+        window_budget: Optional[SearchBudget] = None,
+        optimized: Optional[Tuple[Dict[str, Any], float]] = None,
+        progress: Optional[OptimizationProgress] = None,
+        progress_callback: Optional[ProgressCallback] = None,
+    ) -> WalkForwardWindow:
+        """
+        Optimize on one window's training bars, then validate on its test bars.
+
+        Takes the full series (lists or arrays) and slices them itself, so
+        worker processes can run whole windows (ParallelWindowRunner) on
+        shared arrays. `optimized` skips the search with an already found
+        (best_params, train_sharpe).
+        """
+        i, train_start, train_end, test_start, test_end = bounds
+        has_atr = atrs is not None and len(atrs) > 0
+        train = [bars_slice(series, train_start, train_end) for series in (opens, highs, lows, closes, volumes)]
+        train_atrs = bars_slice(atrs, train_start, train_end) if has_atr else None
+        window_sides = None
+        if series_sides.precompute is not None:
+            window_sides = functools.partial(series_sides.window, start=train_start, end=train_end)
+
+        # Optimize parameters on training data
+        if optimized is not None:
+            best_params, train_sharpe = optimized
+        elif search is not None:
+            best_params, train_sharpe = self._search_params(
+                *train,
+                train_atrs,
+                strategy_func,
+                space,
+                search,
+                window_budget,
+                initial_capital,
+                seed=seed,
+                window_index=i,
+                progress=progress,
+                progress_callback=progress_callback,
+                window_sides=window_sides,
+            )
+        else:
+            best_params, train_sharpe = self._optimize_params(
+                *train,
+                train_atrs,
+                strategy_func,
+                param_combos,
+                initial_capital,
+                seed=seed,
+                window_index=i,
+                progress=progress,
+                progress_callback=progress_callback,
+                window_sides=window_sides,
+            )
+
+        # Validate on test data
+        test_result = self._run_single_backtest(
+            *(bars_slice(series, test_start, test_end) for series in (opens, highs, lows, closes, volumes)),
+            bars_slice(atrs, test_start, test_end) if has_atr else None,
+            strategy_func,
+            best_params,
+            initial_capital,
+            rng=task_rng(seed, i, "test"),
+            sides=series_sides.window(best_params, test_start, test_end),
+        )
+
+        return WalkForwardWindow(
+            train_start=train_start,
+            train_end=train_end,
+            test_start=test_start,
+            test_end=test_end,
+            optimal_params=best_params,
+            train_performance=train_sharpe,
+            test_performance=test_result["sharpe"],
+            trades=test_result["trades"],
         )
 
     def _optimize_params(
         self,
         opens, highs, lows, closes, volumes, atrs,
-        strategy_func, param_ranges, initial_capital
+        strategy_func, param_combos, initial_capital,
+        seed: int = 0,
+        window_index: int = 0,
+        progress: Optional[OptimizationProgress] = None,
+        progress_callback: Optional[ProgressCallback] = None,
+        window_sides: Optional[Callable[[Dict[str, Any]], List[str]]] = None,
     ) -> Tuple[Dict[str, Any], float]:
-        """Find optimal parameters using grid search"""
+        """Find optimal parameters using grid search (serial)"""
         best_sharpe = -float('inf')
         best_params = {}
 
-        # Generate parameter combinations
-        param_combos = self._generate_param_combinations(param_ranges)
-
-        for params in param_combos[:100]:  # Limit combinations
+        for combo_index, params in enumerate(param_combos):
             result = self._run_single_backtest(
                 opens, highs, lows, closes, volumes, atrs,
-                strategy_func, params, initial_capital
+                strategy_func, params, initial_capital,
+                rng=task_rng(seed, window_index, combo_index),
+                sides=window_sides(params) if window_sides else None,
             )
 
             if result["sharpe"] > best_sharpe:
                 best_sharpe = result["sharpe"]
                 best_params = params
 
+            if progress:
+                progress.completed_tasks += 1
+                if progress_callback:
+                    progress_callback(progress)
+
         return best_params, best_sharpe
 
+    def _search_params(
+        self,
+        opens, highs, lows, closes, volumes, atrs,
+        strategy_func, space: SearchSpace, search: ParamSearch, budget: SearchBudget,
+        initial_capital,
+        seed: int = 0,
+        window_index: int = 0,
+        progress: Optional[OptimizationProgress] = None,
+        progress_callback: Optional[ProgressCallback] = None,
+        window_sides: Optional[Callable[[Dict[str, Any]], List[str]]] = None,
+    ) -> Tuple[Dict[str, Any], float]:
+        """
+        Find optimal parameters with a search strategy (serial).
+
+        Reduced-fidelity evaluations score on the most recent part of the
+        training window (nearest the test period), at least MIN_SEARCH_BARS.
+        """
+        num_bars = len(closes)
+
+        def objective(params: Dict[str, Any], fidelity: float) -> float:
+            start = max(num_bars - max(int(num_bars * fidelity), MIN_SEARCH_BARS), 0)
+            # Noise keyed by the parameters, so a score doesn't depend on search order
+            key = ",".join(f"{name}={params[name]}" for name in sorted(params))
+            result = self._run_single_backtest(
+                opens[start:], highs[start:], lows[start:], closes[start:],
+                volumes[start:], atrs[start:] if atrs else None,
+                strategy_func, params, initial_capital,
+                rng=task_rng(seed, window_index, fidelity, key),
+                sides=window_sides(params)[start:] if window_sides else None,
+            )
+            return result["sharpe"]
+
+        def on_evaluation(_evaluation) -> None:
+            if progress:
+                progress.completed_tasks += 1
+                if progress_callback:
+                    progress_callback(progress)
+
+        result = search.search(
+            space, objective, budget,
+            rng=task_rng(seed, window_index, "search"),
+            on_evaluation=on_evaluation,
+        )
+        logger.debug(f"Window {window_index}: {result.to_dict()}")
+        return result.best_params, result.best_score
+
     def _run_single_backtest(
         self,
         opens, highs, lows, closes, volumes, atrs,
-        strategy_func, params, initial_capital
+        strategy_func, params, initial_capital,
+        rng: Optional[random.Random] = None,
+        sides: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
-        """Run a single backtest with given parameters"""
-        capital = initial_capital
-        position = None
-        trades = []
-        equity_curve = [initial_capital]
-
+        """Run a single backtest with given parameters (sides: precomputed signal per bar)"""
         stop_loss_pct = params.get("stop_loss_pct", 0.03)
         take_profit_pct = params.get("take_profit_pct", 0.06)
 
-        for i in range(50, len(closes)):
-            current_price = closes[i]
-            current_volume = volumes[i] if volumes else 10000
-            current_atr = atrs[i] if atrs else current_price * 0.02
-
-            # Update equity
-            if position:
-                unrealized = (current_price - position["entry_price"]) * position["quantity"]
-                if position["side"] == "short":
-                    unrealized = -unrealized
-                current_equity = capital + unrealized
-            else:
-                current_equity = capital
-            equity_curve.append(current_equity)
-
-            # Check exit
-            if position:
-                exit_signal = False
-                exit_reason = ""
-
-                if position["side"] == "long":
-                    if current_price <= position["stop_price"]:
-                        exit_signal = True
-                        exit_reason = "stop_loss"
-                    elif current_price >= position["target_price"]:
-                        exit_signal = True
-                        exit_reason = "take_profit"
-                else:
-                    if current_price >= position["stop_price"]:
-                        exit_signal = True
-                        exit_reason = "stop_loss"
-                    elif current_price <= position["target_price"]:
-                        exit_signal = True
-                        exit_reason = "take_profit"
-
-                if exit_signal:
-                    # Apply slippage
-                    slippage_pct, exec_price = self.calculate_slippage(
-                        current_price, position["quantity"],
-                        "sell" if position["side"] == "long" else "buy",
-                        current_volume, current_atr
-                    )
-
-                    if position["side"] == "long":
-                        pnl = (exec_price - position["entry_price"]) * position["quantity"]
-                    else:
-                        pnl = (position["entry_price"] - exec_price) * position["quantity"]
-
-                    slippage_cost = abs(current_price - exec_price) * position["quantity"]
-
-                    trades.append({
-                        "entry_price": position["entry_price"],
-                        "exit_price": exec_price,
-                        "side": position["side"],
-                        "quantity": position["quantity"],
-                        "pnl": pnl,
-                        "exit_reason": exit_reason,
-                        "slippage_pct": slippage_pct,
-                        "slippage_cost": slippage_cost,
-                    })
-
-                    capital += pnl
-                    position = None
-
-            # Check entry
-            if not position:
-                signal, side = strategy_func(
-                    i, opens, highs, lows, closes, volumes, params
+        # Whole-window signals when the strategy supports it (O(n) instead of O(n * period))
+        precompute = getattr(strategy_func, "precompute", None)
+        if sides is None and precompute:
+            sides = precompute(opens, highs, lows, closes, volumes, params)
+
+        def signal(i: int) -> str:
+            entry, side = strategy_func(i, opens, highs, lows, closes, volumes, params)
+            return side if entry else ""
+
+        def bar_volume(i: int) -> float:
+            return volumes[i] if volumes else 10000
+
+        def bar_atr(i: int) -> float:
+            return atrs[i] if atrs else closes[i] * 0.02
+
+        calculate_slippage = self.calculate_slippage
+
+        def slippage(i: int, price: float, quantity: int, side: str) -> Tuple[float, float]:
+            volume = volumes[i] if volumes else 10000
+            atr = atrs[i] if atrs else closes[i] * 0.02
+            return calculate_slippage(price, quantity, side, volume, atr, rng=rng)
+
+        intrabar_exit = on_entry = None
+        if self.intrabar_exits:
+            simulator = OrderSimulator(self.slippage_config, self.intrabar_exits, rng=rng)
+
+            def on_entry(i: int, quantity: int, stop: float, target: float, side: str) -> None:
+                simulator.submit_oco_order(
+                    "", quantity, stop_loss_price=stop, take_profit_price=target,
+                    side="sell" if side == "long" else "buy",
                 )
 
-                if signal:
-                    position_value = capital * 0.1
-                    quantity = int(position_value / current_price)
-
-                    if quantity > 0:
-                        # Apply slippage
-                        slippage_pct, exec_price = self.calculate_slippage(
-                            current_price, quantity, side,
-                            current_volume, current_atr
-                        )
-
-                        if side == "long":
-                            stop = exec_price * (1 - stop_loss_pct)
-                            target = exec_price * (1 + take_profit_pct)
-                        else:
-                            stop = exec_price * (1 + stop_loss_pct)
-                            target = exec_price * (1 - take_profit_pct)
-
-                        position = {
-                            "entry_price": exec_price,
-                            "side": side,
-                            "quantity": quantity,
-                            "stop_price": stop,
-                            "target_price": target,
-                        }
-
-        # Calculate Sharpe
-        if len(equity_curve) > 1:
-            returns = []
-            for j in range(1, len(equity_curve)):
-                ret = (equity_curve[j] - equity_curve[j-1]) / equity_curve[j-1]
-                returns.append(ret)
-
-            if returns and len(returns) > 1:
-                avg_ret = statistics.mean(returns)
-                std_ret = statistics.stdev(returns)
-                sharpe = (avg_ret * 252) / (std_ret * math.sqrt(252)) if std_ret > 0 else 0
-            else:
-                sharpe = 0
-        else:
-            sharpe = 0
+            def intrabar_exit(i: int):
+                fills = simulator.process_bar(
+                    "", opens[i], highs[i], lows[i], closes[i], bar_volume(i), bar_atr(i),
+                )
+                if not fills:
+                    return None
+                return fills[0].tag, fills[0].trigger_price, fills[0].slippage_pct, fills[0].price
+
+        result = sim_core.simulate(
+            closes, 50, initial_capital, stop_loss_pct, take_profit_pct,
+            sides=sides,
+            signal=signal if sides is None else None,
+            slippage=slippage,
+            intrabar_exit=intrabar_exit,
+            on_entry=on_entry,
+        )
 
         return {
-            "sharpe": sharpe,
-            "trades": trades,
-            "final_capital": capital,
-            "equity_curve": equity_curve,
+            "sharpe": result.sharpe,
+            "trades": result.trades.to_dicts(),
+            "final_capital": result.final_capital,
+            "equity_curve": result.equity,
         }
 
-    def _generate_param_combinations(self, param_ranges: Dict[str, List]) -> List[Dict]:
-        """Generate all parameter combinations"""
+    def _generate_param_combinations(
+        self,
+        param_ranges: Dict[str, List],
+        limit: Optional[int] = None,
+    ) -> List[Dict]:
+        """
+        Generate parameter combinations (first key varies slowest).
+
+        With a limit only the first `limit` combinations are built - the
+        default ranges alone have 3^13 combinations.
+        """
         if not param_ranges:
             return [{}]
 
         keys = list(param_ranges.keys())
-        values = list(param_ranges.values())
-
-        combinations = []
-
-        def recurse(idx, current):
-            if idx == len(keys):
-                combinations.append(current.copy())
-                return
-            for val in values[idx]:
-                current[keys[idx]] = val
-                recurse(idx + 1, current)
-
-        recurse(0, {})
-        return combinations
+        combinations = itertools.islice(itertools.product(*param_ranges.values()), limit)
+        return [dict(zip(keys, values)) for values in combinations]
 
     def _calculate_atr(
         self,
@@ -566,39 +778,23 @@ class WalkForwardBacktester:
         if len(closes) < period + 1:
             return []
 
-        atrs = [0] * len(closes)
-        tr_values = []
-
-        for i in range(1, len(closes)):
-            high_low = highs[i] - lows[i]
-            high_close = abs(highs[i] - closes[i - 1])
-            low_close = abs(lows[i] - closes[i - 1])
-            tr = max(high_low, high_close, low_close)
-            tr_values.append(tr)
-
-            if i >= period:
-                atrs[i] = statistics.mean(tr_values[-period:])
+        highs = np.asarray(highs, dtype=np.float64)
+        lows = np.asarray(lows, dtype=np.float64)
+        closes = np.asarray(closes, dtype=np.float64)
+        # True range of bars 1..n-1
+        tr = np.maximum.reduce([
+            highs[1:] - lows[1:],
+            np.abs(highs[1:] - closes[:-1]),
+            np.abs(lows[1:] - closes[:-1]),
+        ])
 
+        atrs = [0] * len(closes)
+        atrs[period:] = np.lib.stride_tricks.sliding_window_view(tr, period).mean(axis=1).tolist()
         return atrs
 
     def _calculate_max_drawdown(self, trades: List[Dict], initial_capital: float) -> float:
-        """Calculate maximum drawdown from trades"""
-        if not trades:
-            return 0
-
-        equity = initial_capital
-        peak = initial_capital
-        max_dd = 0
-
-        for trade in trades:
-            equity += trade.get("pnl", 0)
-            if equity > peak:
-                peak = equity
-            dd = (peak - equity) / peak if peak > 0 else 0
-            if dd > max_dd:
-                max_dd = dd
-
-        return max_dd
+        """Calculate maximum drawdown (fraction of the peak) from trades"""
+        return self._trade_metrics(trades, initial_capital).max_drawdown_pct / 100
 
     def _summarize_params(self, windows: List[WalkForwardWindow]) -> Dict[str, Any]:
         """Summarize optimal parameters across windows"""
@@ -687,11 +883,26 @@ class WalkForwardBacktester:
         trades: List[Dict],
         initial_capital: float = 10000,
         num_simulations: int = 1000,
+        method: MonteCarloMethod = MonteCarloMethod.PERMUTATION,
+        seed: Optional[int] = None,
+        block_size: Optional[int] = None,
+        workers: int = 1,
     ) -> MonteCarloResult:
         """
         Run Monte Carlo simulation on trade results.
 
-        Randomly shuffles trade order to test robustness.
+        Resamples the trade sequence (shuffle by default) to test robustness.
+        Simulations run as NumPy matrices in bounded-size chunks, see
+        services/monte_carlo.py.
+
+        Args:
+            trades: Trades with a "pnl" key, in backtest order
+            initial_capital: Starting capital
+            num_simulations: Number of simulated paths
+            method: permutation, bootstrap, block_bootstrap or return_bootstrap
+            seed: Seed for reproducible runs (random if None)
+            block_size: Block length for block_bootstrap (default: sqrt(trades))
+            workers: Processes to spread the chunks over
         """
         if not trades or len(trades) < 10:
             return MonteCarloResult(
@@ -711,44 +922,42 @@ class WalkForwardBacktester:
         # Calculate original performance
         original_sharpe = self._calculate_sharpe_from_trades(trades, initial_capital)
 
-        simulation_sharpes = []
-        simulation_drawdowns = []
-        profitable_count = 0
-
-        for _ in range(num_simulations):
-            # Shuffle trades
-            shuffled = trades.copy()
-            random.shuffle(shuffled)
-
-            # Calculate metrics
-            sharpe = self._calculate_sharpe_from_trades(shuffled, initial_capital)
-            max_dd = self._calculate_max_drawdown(shuffled, initial_capital)
-
-            simulation_sharpes.append(sharpe)
-            simulation_drawdowns.append(max_dd)
-
-            final_pnl = sum(t.get("pnl", 0) for t in shuffled)
-            if final_pnl > 0:
-                profitable_count += 1
+        if seed is None:
+            seed = random.getrandbits(32)
+        method = MonteCarloMethod(method)
+
+        distribution = monte_carlo.simulate(
+            [t.get("pnl", 0) for t in trades],
+            initial_capital,
+            num_simulations,
+            method=method,
+            seed=seed,
+            block_size=block_size,
+            workers=workers,
+        )
+        sharpes = distribution.sharpes
+        drawdowns = distribution.max_drawdowns
 
         # Sort for percentiles
-        sorted_sharpes = sorted(simulation_sharpes)
+        sorted_sharpes = np.sort(sharpes)
+        sharpe_5th = float(sorted_sharpes[int(0.05 * num_simulations)])
+        sharpe_95th = float(sorted_sharpes[int(0.95 * num_simulations)])
+        profitable_count = int(np.count_nonzero(distribution.final_pnls > 0))
 
         return MonteCarloResult(
             num_simulations=num_simulations,
             original_sharpe=round(original_sharpe, 3),
-            mean_sharpe=round(statistics.mean(simulation_sharpes), 3),
-            median_sharpe=round(statistics.median(simulation_sharpes), 3),
-            sharpe_std=round(statistics.stdev(simulation_sharpes), 3) if len(simulation_sharpes) > 1 else 0,
-            sharpe_5th_percentile=round(sorted_sharpes[int(0.05 * num_simulations)], 3),
-            sharpe_95th_percentile=round(sorted_sharpes[int(0.95 * num_simulations)], 3),
+            mean_sharpe=round(float(sharpes.mean()), 3),
+            median_sharpe=round(float(np.median(sharpes)), 3),
+            sharpe_std=round(float(sharpes.std(ddof=1)), 3) if num_simulations > 1 else 0,
+            sharpe_5th_percentile=round(sharpe_5th, 3),
+            sharpe_95th_percentile=round(sharpe_95th, 3),
             probability_profitable=round(profitable_count / num_simulations * 100, 1),
-            mean_max_drawdown=round(statistics.mean(simulation_drawdowns) * 100, 2),
-            worst_drawdown=round(max(simulation_drawdowns) * 100, 2),
-            confidence_interval_90=(
-                round(sorted_sharpes[int(0.05 * num_simulations)], 3),
-                round(sorted_sharpes[int(0.95 * num_simulations)], 3),
-            ),
+            mean_max_drawdown=round(float(drawdowns.mean()) * 100, 2),
+            worst_drawdown=round(float(drawdowns.max()) * 100, 2),
+            confidence_interval_90=(round(sharpe_5th, 3), round(sharpe_95th, 3)),
+            method=method.value,
+            seed=seed,
         )
 
     def _calculate_sharpe_from_trades(
@@ -756,40 +965,22 @@ class WalkForwardBacktester:
         trades: List[Dict],
         initial_capital: float
     ) -> float:
-        """Calculate Sharpe ratio from trade list"""
-        if not trades:
-            return 0
-
-        # Build equity curve
-        equity = initial_capital
-        equity_curve = [initial_capital]
+        """Calculate Sharpe ratio from trade list (one return per trade, annualized as daily)"""
+        return self._trade_metrics(trades, initial_capital).sharpe_ratio() or 0
 
+    def _trade_metrics(self, trades: List[Dict], initial_capital: float) -> MetricsSnapshot:
+        """Metrics of the equity curve that compounds trade P&L onto initial_capital"""
+        metrics = OnlineMetrics(initial_capital)
         for trade in trades:
-            equity += trade.get("pnl", 0)
-            equity_curve.append(equity)
-
-        # Calculate returns
-        returns = []
-        for i in range(1, len(equity_curve)):
-            ret = (equity_curve[i] - equity_curve[i-1]) / equity_curve[i-1]
-            returns.append(ret)
-
-        if not returns or len(returns) < 2:
-            return 0
-
-        avg_ret = statistics.mean(returns)
-        std_ret = statistics.stdev(returns)
-
-        if std_ret <= 0:
-            return 0
-
-        # Annualized Sharpe (assuming daily)
-        sharpe = (avg_ret * 252) / (std_ret * math.sqrt(252))
-        return sharpe
+            pnl = trade.get("pnl", 0)
+            metrics.add_trade(pnl)
+            metrics.add_equity(metrics.equity + pnl)
+        return metrics.snapshot()
 
     # ==================== STRATEGY FUNCTIONS ====================
 
     @staticmethod
+    @with_precompute(precompute_rsi_signals)
     def rsi_strategy(
         i: int,
         opens, highs, lows, closes, volumes,
@@ -832,47 +1023,23 @@ class WalkForwardBacktester:
         return False, ""
 
     @staticmethod
+    @with_precompute(precompute_macd_signals)
     def macd_strategy(
         i: int,
         opens, highs, lows, closes, volumes,
         params: Dict
     ) -> Tuple[bool, str]:
-        """MACD crossover strategy"""
-        fast = params.get("macd_fast", 12)
-        slow = params.get("macd_slow", 26)
-        signal = params.get("macd_signal", 9)
+        """
+        MACD crossover strategy (MACD line crossing its signal-line EMA).
 
-        if i < slow + signal:
+        Per-bar form rebuilds the EMAs up to bar i; backtests use the
+        precomputed whole-window signals instead.
+        """
+        if i < params.get("macd_slow", 26) + params.get("macd_signal", 9):
             return False, ""
 
-        # Calculate EMAs
-        def ema(data, period, idx):
-            mult = 2 / (period + 1)
-            value = data[idx - period]
-            for j in range(idx - period + 1, idx + 1):
-                value = (data[j] - value) * mult + value
-            return value
-
-        fast_ema = ema(closes, fast, i)
-        slow_ema = ema(closes, slow, i)
-        macd_line = fast_ema - slow_ema
-
-        fast_ema_prev = ema(closes, fast, i - 1)
-        slow_ema_prev = ema(closes, slow, i - 1)
-        macd_line_prev = fast_ema_prev - slow_ema_prev
-
-        # Signal line (simplified)
-        signal_value = macd_line * 0.9  # Approximation
-        signal_prev = macd_line_prev * 0.9
-
-        # Bullish crossover
-        if macd_line > signal_value and macd_line_prev <= signal_prev:
-            return True, "long"
-        # Bearish crossover
-        elif macd_line < signal_value and macd_line_prev >= signal_prev:
-            return True, "short"
-
-        return False, ""
+        side = precompute_macd_signals(None, None, None, closes[:i + 1], None, params)[i]
+        return bool(side), side
 
     # ==================== STATUS ====================
 
@@ -888,6 +1055,11 @@ class WalkForwardBacktester:
             },
             "available_strategies": ["rsi", "macd", "bollinger", "momentum"],
             "monte_carlo_enabled": True,
+            "optimizer_workers": self.optimizer_workers,
+            "intrabar_exits": self.intrabar_exits.value if self.intrabar_exits else None,
+            "optimization_progress": (
+                self._optimization_progress.to_dict() if self._optimization_progress else None
+            ),
         }
 
 
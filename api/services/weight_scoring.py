@@ -0,0 +1,427 @@
+"""
+Weight Scoring Kernel
+=====================
+
+Fast walk-forward scoring of StrategyEngine weight vectors for the
+auto-optimizer.
+
+Votes:
+- The weighted strategy takes a -1/0/+1 vote from each indicator and
+  trades when the weighted sum passes +/-SCORE_THRESHOLD. The votes don't
+  depend on the weights, so they are computed once per symbol (and
+  indicator-parameter set) as a (bars x indicators) array. Scoring a
+  weight vector is a weighted sum of its columns giving every bar's side,
+  and the walk-forward simulation then indexes those sides
+  (precompute_series) instead of recomputing indicators per bar.
+- Every vote looks back at most 50 bars, the backtest warm-up, so a slice
+  of the whole-series votes equals computing them on a window.
+
+Universe:
+- WeightScorer scores a weight vector on every optimization symbol. With
+  workers > 1 symbols are spread over a process pool whose workers keep
+  each symbol's vote arrays for the whole search.
+"""
+
+import logging
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .walk_forward_backtester import WalkForwardBacktester, WalkForwardResult, rsi_series, task_rng
+
+logger = logging.getLogger(__name__)
+
+# Vote columns, in the order the per-bar strategy summed them
+COMPONENTS = ("rsi", "sma_crossover", "momentum", "bollinger", "mean_reversion", "macd", "volume")
+
+# Indicator parameters the votes depend on (defaults when a combination lacks them)
+INDICATOR_PARAMS = {
+    "rsi_period": 14,
+    "rsi_oversold": 30,
+    "rsi_overbought": 70,
+    "bb_period": 20,
+    "bb_std": 2.0,
+    "macd_fast": 12,
+    "macd_slow": 26,
+}
+
+# Weighted vote needed for a long (or below minus this, a short)
+SCORE_THRESHOLD = 0.3
+
+# Bars before the first vote (the longest lookback, SMA 50)
+WARMUP_BARS = 50
+
+# Fewest bars a reduced-fidelity evaluation backtests on
+MIN_FIDELITY_BARS = 250
+
+
+# ==================== VOTES ====================
+
+
+def _calculate_rsi(closes: List[float], i: int, period: int) -> float:
+    """RSI at index i over the last `period` changes"""
+    if i < period:
+        return 50
+
+    gains = []
+    losses = []
+    for j in range(i - period, i):
+        change = closes[j + 1] - closes[j]
+        if change > 0:
+            gains.append(change)
+            losses.append(0)
+        else:
+            gains.append(0)
+            losses.append(abs(change))
+
+    avg_gain = sum(gains) / period if gains else 0
+    avg_loss = sum(losses) / period if losses else 0
+
+    if avg_loss == 0:
+        return 100
+    rs = avg_gain / avg_loss
+    return 100 - (100 / (1 + rs))
+
+
+def _calculate_ema(closes: List[float], i: int, period: int) -> float:
+    """EMA at index i, seeded with the SMA of the `period` bars before it"""
+    if i < period:
+        return closes[i]
+    mult = 2 / (period + 1)
+    value = sum(closes[i-period:i-period+period]) / period
+    for j in range(i - period + 1, i + 1):
+        value = (closes[j] - value) * mult + value
+    return value
+
+
+def bar_votes(i: int, closes: List[float], volumes: List[float], params: Dict) -> Dict[str, int]:
+    """Indicator votes at bar i (per-bar reference for component_votes)"""
+    if i < WARMUP_BARS:
+        return {name: 0 for name in COMPONENTS}
+
+    signals = {}
+
+    # RSI
+    rsi = _calculate_rsi(closes, i, params.get("rsi_period", 14))
+    if rsi < params.get("rsi_oversold", 30):
+        signals["rsi"] = 1  # Bullish
+    elif rsi > params.get("rsi_overbought", 70):
+        signals["rsi"] = -1  # Bearish
+    else:
+        signals["rsi"] = 0
+
+    # SMA Crossover
+    sma_short = sum(closes[i-20:i]) / 20
+    sma_long = sum(closes[i-50:i]) / 50
+    signals["sma_crossover"] = 1 if sma_short > sma_long else -1
+
+    # Momentum (20-day return)
+    momentum = (closes[i] - closes[i-20]) / closes[i-20]
+    signals["momentum"] = 1 if momentum > 0.02 else (-1 if momentum < -0.02 else 0)
+
+    # Bollinger Bands
+    bb_period = params.get("bb_period", 20)
+    bb_std = params.get("bb_std", 2.0)
+    sma = sum(closes[i-bb_period:i]) / bb_period
+    std = (sum((c - sma)**2 for c in closes[i-bb_period:i]) / bb_period) ** 0.5
+    upper = sma + bb_std * std
+    lower = sma - bb_std * std
+    if closes[i] < lower:
+        signals["bollinger"] = 1
+        signals["mean_reversion"] = 1
+    elif closes[i] > upper:
+        signals["bollinger"] = -1
+        signals["mean_reversion"] = -1
+    else:
+        signals["bollinger"] = 0
+        signals["mean_reversion"] = 0
+
+    # MACD
+    fast_ema = _calculate_ema(closes, i, params.get("macd_fast", 12))
+    slow_ema = _calculate_ema(closes, i, params.get("macd_slow", 26))
+    macd = fast_ema - slow_ema
+    signals["macd"] = 1 if macd > 0 else -1
+
+    # Volume (above average = confirmation)
+    avg_vol = sum(volumes[i-20:i]) / 20
+    signals["volume"] = 1 if volumes[i] > avg_vol * 1.2 else 0
+
+    return signals
+
+
+def _window_means(values: np.ndarray, length: int, index: np.ndarray) -> np.ndarray:
+    """Mean of values[i - length:i] for every i in index"""
+    sums = np.concatenate(([0.0], np.cumsum(values)))
+    return (sums[index] - sums[index - length]) / length
+
+
+def _windowed_ema(closes: np.ndarray, period: int, index: np.ndarray) -> np.ndarray:
+    """_calculate_ema at every i in index (EMA restarted from an SMA seed per bar)"""
+    mult = 2 / (period + 1)
+    value = _window_means(closes, period, index)
+    for step in range(1, period + 1):
+        value = (closes[index - period + step] - value) * mult + value
+    return np.where(index < period, closes[index], value)
+
+
+def component_votes(closes: List[float], volumes: List[float], params: Dict) -> np.ndarray:
+    """
+    Votes of every indicator at every bar, as a (bars x COMPONENTS) array.
+
+    Matches bar_votes() bar for bar; rows before WARMUP_BARS are zero.
+    """
+    closes = np.asarray(closes, dtype=np.float64)
+    volumes = np.asarray(volumes, dtype=np.float64)
+    votes = np.zeros((len(closes), len(COMPONENTS)))
+    if len(closes) <= WARMUP_BARS:
+        return votes
+    index = np.arange(WARMUP_BARS, len(closes))
+    price = closes[index]
+    column = {name: votes[WARMUP_BARS:, k] for k, name in enumerate(COMPONENTS)}
+
+    rsi = rsi_series(closes, params.get("rsi_period", 14))[index]
+    column["rsi"][:] = np.where(rsi < params.get("rsi_oversold", 30), 1,
+                                np.where(rsi > params.get("rsi_overbought", 70), -1, 0))
+
+    column["sma_crossover"][:] = np.where(
+        _window_means(closes, 20, index) > _window_means(closes, 50, index), 1, -1,
+    )
+
+    momentum = (price - closes[index - 20]) / closes[index - 20]
+    column["momentum"][:] = np.where(momentum > 0.02, 1, np.where(momentum < -0.02, -1, 0))
+
+    bb_period = params.get("bb_period", 20)
+    bb_std = params.get("bb_std", 2.0)
+    window = np.lib.stride_tricks.sliding_window_view(closes, bb_period)[index - bb_period]
+    sma = window.mean(axis=1)
+    std = np.sqrt(((window - sma[:, None]) ** 2).mean(axis=1))
+    band = np.where(price < sma - bb_std * std, 1, np.where(price > sma + bb_std * std, -1, 0))
+    column["bollinger"][:] = band
+    column["mean_reversion"][:] = band
+
+    macd = (_windowed_ema(closes, params.get("macd_fast", 12), index)
+            - _windowed_ema(closes, params.get("macd_slow", 26), index))
+    column["macd"][:] = np.where(macd > 0, 1, -1)
+
+    column["volume"][:] = np.where(volumes[index] > _window_means(volumes, 20, index) * 1.2, 1, 0)
+    return votes
+
+
+def weighted_sides(votes: np.ndarray, weights: Dict[str, float], threshold: float = SCORE_THRESHOLD) -> List[str]:
+    """Signal side per bar for the weighted sum of the votes"""
+    # Summed column by column in COMPONENTS order, as the per-bar strategy
+    # did, so a score landing exactly on the threshold rounds the same way
+    score = np.zeros(len(votes))
+    for k, name in enumerate(COMPONENTS):
+        score = score + votes[:, k] * weights.get(name, 0)
+    sides = np.full(len(votes), "", dtype=object)
+    sides[score > threshold] = "long"
+    sides[score < -threshold] = "short"
+    return sides.tolist()
+
+
+class SymbolComponents:
+    """One symbol's price data and its vote arrays per indicator-parameter set"""
+
+    def __init__(self, symbol: str, data: Dict[str, List]):
+        self.symbol = symbol
+        self.data = data
+        self._votes: Dict[Tuple, np.ndarray] = {}
+
+    @property
+    def num_bars(self) -> int:
+        return len(self.data["closes"])
+
+    def votes(self, params: Dict[str, Any]) -> np.ndarray:
+        key = tuple(params.get(name, default) for name, default in INDICATOR_PARAMS.items())
+        votes = self._votes.get(key)
+        if votes is None:
+            votes = self._votes[key] = component_votes(self.data["closes"], self.data["volumes"], params)
+        return votes
+
+
+class WeightedSignals:
+    """
+    Weighted-vote strategy function for one symbol and weight vector.
+
+    run_walk_forward uses precompute_series; calling it per bar
+    recomputes the votes the slow way (reference only).
+    """
+
+    def __init__(self, components: SymbolComponents, weights: Dict[str, float], start: int = 0):
+        """
+        Args:
+            components: The symbol's vote arrays
+            weights: Weight per COMPONENTS entry
+            start: Index in the symbol's data of the first bar of the series
+                the backtest runs on (reduced-fidelity runs use the tail)
+        """
+        self.components = components
+        self.weights = weights
+        self.start = start
+
+    def __call__(self, i, opens, highs, lows, closes, volumes, params) -> Tuple[bool, str]:
+        votes = bar_votes(i, closes, volumes, params)
+        score = 0
+        for name in COMPONENTS:
+            score += votes[name] * self.weights.get(name, 0)
+        if score > SCORE_THRESHOLD:
+            return True, "long"
+        elif score < -SCORE_THRESHOLD:
+            return True, "short"
+        return False, ""
+
+    def precompute_series(self, opens, highs, lows, closes, volumes, params) -> List[str]:
+        votes = self.components.votes(params)[self.start:self.start + len(closes)]
+        return weighted_sides(votes, self.weights)
+
+
+def score_symbol(
+    backtester: WalkForwardBacktester,
+    components: SymbolComponents,
+    weights: Dict[str, float],
+    fidelity: float = 1.0,
+    seed: Optional[int] = None,
+    num_windows: int = 4,
+    initial_capital: float = 100000,
+) -> WalkForwardResult:
+    """
+    Walk-forward backtest of a weight vector on one symbol.
+
+    fidelity < 1 backtests only the most recent part of the data (at
+    least MIN_FIDELITY_BARS), for successive-halving searches.
+    """
+    num_bars = components.num_bars
+    start = 0
+    if fidelity < 1.0:
+        start = max(num_bars - max(int(num_bars * fidelity), MIN_FIDELITY_BARS), 0)
+    data = {column: values[start:] for column, values in components.data.items()}
+
+    result = backtester.run_walk_forward(
+        opens=data["opens"],
+        highs=data["highs"],
+        lows=data["lows"],
+        closes=data["closes"],
+        volumes=data["volumes"],
+        dates=data["dates"],
+        strategy_func=WeightedSignals(components, weights, start),
+        num_windows=num_windows,
+        initial_capital=initial_capital,
+        workers=1,
+        seed=seed,
+    )
+    result.symbol = components.symbol
+    return result
+
+
+# ==================== WORKER PROCESS ====================
+
+# Per-process state set up once by the pool initializer
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(historical_data: Dict[str, Dict[str, List]], slippage_config: Any, intrabar_exits: Any,
+                 param_ranges: Dict[str, List]) -> None:
+    """Pool initializer: a backtester plus every symbol's data (votes built on first use)"""
+    backtester = WalkForwardBacktester()
+    backtester.slippage_config = slippage_config
+    backtester.intrabar_exits = intrabar_exits
+    backtester.param_ranges = param_ranges
+    _worker_state.update({
+        "backtester": backtester,
+        "components": {symbol: SymbolComponents(symbol, data) for symbol, data in historical_data.items()},
+    })
+
+
+def _score_task(symbol: str, weights: Dict[str, float], fidelity: float, seed: int,
+                num_windows: int, initial_capital: float) -> WalkForwardResult:
+    return score_symbol(
+        _worker_state["backtester"], _worker_state["components"][symbol],
+        weights, fidelity, seed, num_windows, initial_capital,
+    )
+
+
+# ==================== SCORER ====================
+
+
+class WeightScorer:
+    """
+    Scores weight vectors on every symbol of the optimization universe.
+
+    Usage:
+        with WeightScorer(historical_data, backtester, workers=4, seed=7) as scorer:
+            results = scorer.score(weights)   # {symbol: WalkForwardResult}
+    """
+
+    def __init__(
+        self,
+        historical_data: Dict[str, Dict[str, List]],
+        backtester: WalkForwardBacktester,
+        workers: int = 1,
+        num_windows: int = 4,
+        initial_capital: float = 100000,
+        seed: int = 0,
+    ):
+        """
+        Args:
+            historical_data: {symbol: {"opens", "highs", "lows", "closes", "volumes", "dates"}}
+            backtester: Supplies slippage, exit and parameter-range settings
+            workers: Processes to spread symbols over (1 = serial in this thread)
+            num_windows: Walk-forward windows per symbol
+            initial_capital: Starting capital per backtest
+            seed: Slippage noise seed - every weight vector sees the same noise,
+                so scores differ only through the weights
+        """
+        self.backtester = backtester
+        self.components = {symbol: SymbolComponents(symbol, data) for symbol, data in historical_data.items()}
+        self.num_windows = num_windows
+        self.initial_capital = initial_capital
+        self.seeds = {symbol: task_rng(seed, symbol).getrandbits(32) for symbol in historical_data}
+        self.workers = min(workers, len(historical_data)) if historical_data else 1
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        if self.workers > 1:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=mp.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(historical_data, backtester.slippage_config, backtester.intrabar_exits,
+                          backtester.param_ranges),
+            )
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self.components)
+
+    def score(self, weights: Dict[str, float], fidelity: float = 1.0) -> Dict[str, WalkForwardResult]:
+        """Walk-forward result per symbol, in symbol order"""
+        if self._pool is None:
+            return {
+                symbol: score_symbol(
+                    self.backtester, components, weights, fidelity,
+                    self.seeds[symbol], self.num_windows, self.initial_capital,
+                )
+                for symbol, components in self.components.items()
+            }
+
+        futures = {
+            symbol: self._pool.submit(
+                _score_task, symbol, weights, fidelity,
+                self.seeds[symbol], self.num_windows, self.initial_capital,
+            )
+            for symbol in self.components
+        }
+        return {symbol: future.result() for symbol, future in futures.items()}
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self) -> "WeightScorer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
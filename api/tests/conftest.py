@@ -19,6 +19,11 @@ from unittest.mock import AsyncMock, MagicMock, patch
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Don't let bots started in tests read or write warm-restart snapshots
+os.environ.setdefault("TRADING_STATE_SNAPSHOT_ENABLED", "false")
+# Backtests in tests always simulate (cache tests use their own directory)
+os.environ.setdefault("BACKTEST_CACHE_ENABLED", "false")
+
 from fastapi.testclient import TestClient
 from main import app
 
@@ -7,6 +7,7 @@ This package provides:
 - MockAlpacaService: Mock implementation of Alpaca trading API
 - MockAlphaVantageService: Mock implementation of Alpha Vantage API
 - MockCryptoService: Mock implementation of Alpaca crypto trading API
+- SyntheticBarService: Deterministic random-walk daily bars for backtests
 - Price data fixtures: Sample datasets for indicator testing
 
 Usage:
@@ -38,6 +39,8 @@ from tests.mocks.crypto_mock import (
     create_mock_crypto_position,
 )
 
+from tests.mocks.synthetic_bars import SyntheticBarService
+
 from tests.mocks.fixtures import (
     PriceDataset,
     generate_uptrend_data,
@@ -66,6 +69,8 @@ __all__ = [
     "create_mock_crypto_bars",
     "create_mock_crypto_order",
     "create_mock_crypto_position",
+    # Synthetic data service
+    "SyntheticBarService",
     # Fixtures
     "PriceDataset",
     "generate_uptrend_data",
@@ -301,6 +301,15 @@ def create_mock_bars(
     return bars
 
 
+def _naive(value) -> datetime:
+    """Datetime (or ISO string) as naive UTC, for comparing bar timestamps"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
 class MockAlpacaService:
     """
     Mock implementation of AlpacaService for testing.
@@ -334,6 +343,7 @@ class MockAlpacaService:
         self._orders: Dict[str, Dict[str, Any]] = {}
         self._market_open = True
         self._initialized = True
+        self._bars: Dict[str, List[Dict[str, Any]]] = {}
 
         # Track method calls for assertions
         self.call_history: List[Dict[str, Any]] = []
@@ -373,6 +383,16 @@ class MockAlpacaService:
         """Remove all orders"""
         self._orders.clear()
 
+    def set_bars(self, symbol: str, bars: List[Dict[str, Any]]) -> None:
+        """
+        Serve fixed historical bars for a symbol from get_bars.
+
+        Args:
+            symbol: Stock symbol
+            bars: Bars oldest first, with ISO-format timestamps
+        """
+        self._bars[symbol.upper()] = bars
+
     def set_market_open(self, is_open: bool) -> None:
         """Set whether market is open"""
         self._market_open = is_open
@@ -724,6 +744,15 @@ class MockAlpacaService:
         self._record_call("get_bars", symbol=symbol, timeframe=timeframe, limit=limit)
         self._check_error("get_bars")
 
+        if symbol.upper() in self._bars:
+            # Like AlpacaService: the most recent `limit` bars within [start, end]
+            bars = [
+                bar for bar in self._bars[symbol.upper()]
+                if (start is None or _naive(bar["timestamp"]) >= _naive(start))
+                and (end is None or _naive(bar["timestamp"]) <= _naive(end))
+            ]
+            return bars[-limit:] if limit else bars
+
         current_price = 100.0
         if symbol.upper() in self._positions:
             current_price = self._positions[symbol.upper()]["current_price"]
@@ -10,6 +10,7 @@ This module provides:
   - Downtrend: Consistent price decrease
   - Sideways: Range-bound movement
   - Volatile: High volatility (good for testing scalp mode)
+  - Random walk: Long seeded series for simulation core tests
 
 Usage:
     from tests.mocks.fixtures import generate_uptrend_data, PriceDataset
@@ -421,6 +422,60 @@ def generate_volatile_data(
     )
 
 
+def generate_random_walk_data(
+    days: int = 500,
+    seed: int = 1,
+    volatility: float = 0.015,
+    cycle_amplitude: float = 0.0,
+    cycle_period: float = 9.0,
+    wick: float = 0.005,
+    start_price: float = 100.0,
+) -> PriceDataset:
+    """
+    Generate a seeded random walk, optionally with a sine cycle in the returns.
+
+    Use for testing:
+    - Simulation core results against reference loops
+
+    Each close is the previous one times
+    1 + cycle_amplitude * sin(i / cycle_period) + gauss(0, volatility).
+    Opens are the previous close; highs and lows widen the bar's body by
+    `wick`. The same seed always gives the same series.
+
+    Args:
+        days: Number of bars
+        seed: Random seed
+        volatility: Standard deviation of the random part of each return
+        cycle_amplitude: Amplitude of the sine cycle (0 = pure random walk)
+        cycle_period: Period of the sine cycle, in bars / 2π
+        wick: High/low distance from the bar's body (0.005 = 0.5%)
+        start_price: Starting price
+
+    Returns:
+        PriceDataset (dates are bar numbers)
+    """
+    rng = random.Random(seed)
+    price = start_price
+    opens, highs, lows, closes, volumes = [], [], [], [], []
+    for i in range(days):
+        open_ = price
+        price *= 1 + cycle_amplitude * math.sin(i / cycle_period) + rng.gauss(0, volatility)
+        opens.append(open_)
+        highs.append(max(open_, price) * (1 + wick))
+        lows.append(min(open_, price) * (1 - wick))
+        closes.append(price)
+        volumes.append(rng.randint(800_000, 1_600_000))
+
+    return PriceDataset(
+        opens=opens,
+        highs=highs,
+        lows=lows,
+        closes=closes,
+        volumes=volumes,
+        dates=[str(i) for i in range(days)],
+    )
+
+
 def generate_ohlcv_dataframe(
     start_price: float = 100.0,
     days: int = 100,
@@ -0,0 +1,45 @@
+"""
+Synthetic Bar Service
+=====================
+Provides a stand-in data service that serves deterministic daily bars.
+
+This module provides:
+- SyntheticBarService: Random-walk daily bars (business days only) for any
+  symbol, seeded by the symbol so every call and process sees the same series
+
+The class is importable by path, so it can be handed to spawned backtest
+job processes as a data service factory.
+
+Usage:
+    from tests.mocks.synthetic_bars import SyntheticBarService
+
+    bars = await SyntheticBarService().get_bars("AAA", "1Day", 500, start, end)
+"""
+
+import random
+from datetime import timedelta
+
+
+class SyntheticBarService:
+    """Serves deterministic random-walk daily bars for any symbol"""
+
+    async def get_bars(self, symbol, timeframe="1Day", limit=100, start=None, end=None):
+        rng = random.Random(symbol)
+        price = rng.uniform(20, 400)
+        bars = []
+        day = start
+        while day <= end and len(bars) < limit:
+            if day.weekday() < 5:
+                change = rng.gauss(0.0003, 0.015)
+                open_price = price
+                price = max(1.0, price * (1 + change))
+                bars.append({
+                    "timestamp": day.isoformat(),
+                    "open": open_price,
+                    "high": max(open_price, price) * (1 + abs(rng.gauss(0, 0.004))),
+                    "low": min(open_price, price) * (1 - abs(rng.gauss(0, 0.004))),
+                    "close": price,
+                    "volume": rng.randint(100_000, 5_000_000),
+                })
+            day += timedelta(days=1)
+        return bars
@@ -0,0 +1,214 @@
+"""
+Unit Tests for the Backtest Result Cache
+========================================
+Tests BacktestResultCache and its use by run_backtest.
+
+Tests cover:
+- Canonical cache keys (params, data source, code version, live ranges)
+- Identical requests served from the cache without loading data
+- Extending the end date matching a full re-run (event-driven and vectorized)
+- LRU eviction under the size budget and unreadable entries
+
+Run with: pytest tests/unit/test_backtest_cache.py -v
+"""
+import math
+import random
+from datetime import date, timedelta
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from models.backtest import BacktestRequest
+from services.backtesting import result_cache
+from services.backtesting.result_cache import BacktestResultCache, CacheEntry
+from services.backtesting.engine import run_backtest
+
+
+class StableBarService:
+    """Bars that depend only on (symbol, day), so any sub-range matches a longer load"""
+
+    def __init__(self):
+        self.requests = []
+
+    async def get_bars(self, symbol, timeframe="1Day", limit=100, start=None, end=None):
+        self.requests.append((symbol, start.date(), end.date()))
+        bars = []
+        day = start
+        while day <= end and len(bars) < limit:
+            if day.weekday() < 5:
+                ordinal = day.toordinal()
+                rng = random.Random(f"{symbol}:{ordinal}")
+                close = 100 * (1 + 0.15 * math.sin(ordinal / 9 + len(symbol))) * (1 + rng.gauss(0, 0.01))
+                bars.append({
+                    "timestamp": day.replace(hour=0, minute=0, second=0, microsecond=0).isoformat(),
+                    "open": close, "high": close * 1.01, "low": close * 0.99,
+                    "close": close, "volume": 1_000_000,
+                })
+            day += timedelta(days=1)
+        return bars
+
+
+REQUEST = BacktestRequest(
+    symbols=["AAA", "BBBB"],
+    start_date=date(2021, 1, 4),
+    end_date=date(2021, 9, 30),
+    initial_capital=50000,
+)
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = BacktestResultCache(directory=str(tmp_path / "cache"))
+    monkeypatch.setattr(result_cache, "get_backtest_result_cache", lambda: cache)
+    return cache
+
+
+def _comparable(result):
+    return result.model_dump(exclude={"run_time_seconds", "cache_status"})
+
+
+class TestCacheKeys:
+    """Test what does and doesn't change the key"""
+
+    def test_equivalent_requests_share_a_key(self, cache):
+        explicit = REQUEST.model_copy(update={"strategy_params": {"rsi_period": 14}, "vectorized": True})
+
+        assert cache.key_for(REQUEST, {"rsi_period": 14}) == cache.key_for(explicit, {"rsi_period": 14})
+
+    def test_params_source_and_code_change_the_key(self, cache, monkeypatch):
+        key = cache.key_for(REQUEST, {"rsi_period": 14})
+
+        assert cache.key_for(REQUEST, {"rsi_period": 7}).base != key.base
+        assert cache.key_for(REQUEST, {"rsi_period": 14}, data_source="synthetic").base != key.base
+        monkeypatch.setattr(result_cache, "strategy_code_version", lambda: "changed")
+        assert cache.key_for(REQUEST, {"rsi_period": 14}).base != key.base
+
+    def test_end_date_only_changes_the_file(self, cache):
+        later = REQUEST.model_copy(update={"end_date": date(2021, 12, 31)})
+
+        assert cache.key_for(later).base == cache.key_for(REQUEST).base
+        assert cache.key_for(later).filename != cache.key_for(REQUEST).filename
+
+    def test_live_range_includes_today(self, cache):
+        key = cache.key_for(REQUEST, today=REQUEST.end_date)
+
+        assert key.filename == "2021-09-30@2021-09-30.pkl"
+        assert cache.key_for(REQUEST, today=date(2021, 10, 1)).filename == "2021-09-30.pkl"
+
+
+class TestRunBacktestCache:
+    """Test run_backtest reading and writing the cache"""
+
+    @pytest.mark.asyncio
+    async def test_identical_request_is_a_hit(self, cache):
+        service = StableBarService()
+
+        first = await run_backtest(REQUEST, data_service=service)
+        loads = len(service.requests)
+        second = await run_backtest(REQUEST, data_service=service)
+
+        assert first.cache_status is None
+        assert second.cache_status == "hit"
+        assert len(service.requests) == loads
+        assert _comparable(second) == _comparable(first)
+        assert cache.get_status()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_use_cache_false_always_simulates(self, cache):
+        service = StableBarService()
+        await run_backtest(REQUEST, data_service=service)
+
+        result = await run_backtest(REQUEST.model_copy(update={"use_cache": False}), data_service=service)
+
+        assert result.cache_status is None
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("strategy,vectorized", [
+        ("simple_rsi", False),
+        ("macd_crossover", False),
+        ("simple_rsi", True),
+    ])
+    async def test_extension_matches_full_run(self, cache, strategy, vectorized):
+        base = REQUEST.model_copy(update={"strategy": strategy, "vectorized": vectorized})
+        extended = base.model_copy(update={"end_date": date(2022, 3, 31)})
+        service = StableBarService()
+
+        await run_backtest(base, data_service=service)
+        service.requests.clear()
+        result = await run_backtest(extended, data_service=service)
+        full = await run_backtest(extended, data_service=StableBarService(), use_cache=False)
+
+        assert result.cache_status == "extended"
+        assert {start for _, start, _ in service.requests} == {date(2021, 10, 1)}
+        assert result.trades
+        assert _comparable(result) == _comparable(full)
+
+    @pytest.mark.asyncio
+    async def test_extension_can_be_extended_again(self, cache):
+        service = StableBarService()
+        ends = [date(2021, 9, 30), date(2021, 12, 31), date(2022, 6, 30)]
+
+        for end_date in ends:
+            result = await run_backtest(REQUEST.model_copy(update={"end_date": end_date}), data_service=service)
+        full = await run_backtest(
+            REQUEST.model_copy(update={"end_date": ends[-1]}), data_service=StableBarService(), use_cache=False
+        )
+
+        assert result.cache_status == "extended"
+        assert _comparable(result) == _comparable(full)
+
+    @pytest.mark.asyncio
+    async def test_live_entries_are_not_extended(self, cache):
+        key = cache.key_for(REQUEST, today=REQUEST.end_date)
+        result = await run_backtest(REQUEST, data_service=StableBarService(), use_cache=False)
+        cache.put(key, CacheEntry(result=result))
+
+        later = cache.key_for(REQUEST.model_copy(update={"end_date": date(2021, 12, 31)}))
+
+        assert cache.find_extendable(later) is None
+
+
+class TestEviction:
+    """Test the size budget and damaged entries"""
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_evicted(self, cache):
+        result = await run_backtest(REQUEST, data_service=StableBarService(), use_cache=False)
+        keys = [cache.key_for(REQUEST.model_copy(update={"initial_capital": capital})) for capital in (1, 2, 3)]
+
+        for age, key in enumerate(keys):
+            cache.put(key, CacheEntry(result=result))
+            path = cache.directory / key.base / key.filename
+            os.utime(path, (1000 + age, 1000 + age))
+        size = path.stat().st_size
+        cache.get(keys[0])  # Refreshes keys[0], leaving keys[1] the oldest
+        cache.max_bytes = size * 2
+        evicted = cache.evict()
+
+        assert evicted == 1
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) is not None and cache.get(keys[2]) is not None
+        assert cache.get_status()["size_bytes"] <= cache.max_bytes
+
+    def test_unreadable_entry_is_dropped(self, cache):
+        key = cache.key_for(REQUEST)
+        path = cache.directory / key.base / key.filename
+        path.parent.mkdir(parents=True)
+        path.write_bytes(b"not a pickle")
+
+        assert cache.get(key) is None
+        assert not path.exists()
+
+    @pytest.mark.asyncio
+    async def test_disabled_cache_stores_nothing(self, tmp_path, monkeypatch):
+        cache = BacktestResultCache(directory=str(tmp_path / "off"), enabled=False)
+        monkeypatch.setattr(result_cache, "get_backtest_result_cache", lambda: cache)
+
+        await run_backtest(REQUEST, data_service=StableBarService())
+        result = await run_backtest(REQUEST, data_service=StableBarService())
+
+        assert result.cache_status is None
+        assert cache.get_status()["entries"] == 0
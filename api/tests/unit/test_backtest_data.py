@@ -0,0 +1,128 @@
+"""
+Unit Tests for Indexed BacktestData
+===================================
+Tests the timeline index used by the backtesting engine.
+
+Tests cover:
+- Bar lookup matching a linear scan, including symbols with gaps
+- Lookups at timestamps that are not on the timeline
+- Lookback windows returned as read-only views (no copies)
+- Index rebuild when bars are added later
+
+Run with: pytest tests/unit/test_backtest_data.py -v
+"""
+import random
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from services.backtesting.data_loader import BacktestData, Bar, SymbolData
+
+START = datetime(2024, 1, 2)
+
+
+def _bars(days, start_price=100.0, seed=0):
+    rng = random.Random(seed)
+    bars, price = [], start_price
+    for day in days:
+        price *= 1 + rng.uniform(-0.02, 0.02)
+        bars.append(Bar(START + timedelta(days=day), price, price * 1.01, price * 0.99, price, 1000.0))
+    return bars
+
+
+def _data():
+    data = BacktestData(symbols=["AAA", "BBB"], start_date=date(2024, 1, 2), end_date=date(2024, 12, 31))
+    data.symbol_data["AAA"] = SymbolData("AAA", _bars(range(0, 60), seed=1))
+    # BBB starts later and skips every third day
+    data.symbol_data["BBB"] = SymbolData("BBB", _bars([d for d in range(10, 60) if d % 3], seed=2))
+    return data
+
+
+def _scan_bar(sd, timestamp):
+    """Reference implementation: linear scan"""
+    for bar in reversed(sd.bars):
+        if bar.timestamp <= timestamp:
+            return bar
+    return None
+
+
+class TestBarLookup:
+    """Test O(1) bar lookup against a linear scan"""
+
+    def test_bars_match_linear_scan(self):
+        data = _data()
+
+        for timestamp in data.timestamps:
+            bars = data.get_bars_at(timestamp)
+            for symbol, sd in data.symbol_data.items():
+                assert bars.get(symbol) is _scan_bar(sd, timestamp)
+
+    def test_off_timeline_timestamps(self):
+        data = _data()
+
+        before_all = data.get_bars_at(START - timedelta(days=1))
+        between = data.get_bars_at(START + timedelta(days=12, hours=6))
+
+        assert before_all == {}
+        assert between["AAA"].timestamp == START + timedelta(days=12)
+        assert between["BBB"].timestamp == START + timedelta(days=11)
+
+    def test_unsorted_bars_are_sorted_on_index(self):
+        data = _data()
+        random.Random(3).shuffle(data.symbol_data["AAA"].bars)
+
+        bars = data.get_bars_at(START + timedelta(days=5))
+
+        assert bars["AAA"].timestamp == START + timedelta(days=5)
+
+    def test_index_rebuilds_when_bars_are_added(self):
+        data = _data()
+        assert len(data.timestamps) == 60
+
+        data.symbol_data["AAA"].bars.extend(_bars([60, 61], seed=4))
+
+        assert len(data.timestamps) == 62
+        assert data.get_bars_at(START + timedelta(days=61))["BBB"].timestamp == START + timedelta(days=59)
+
+
+class TestLookback:
+    """Test zero-copy lookback windows"""
+
+    def test_lookback_matches_closes_up_to_timestamp(self):
+        data = _data()
+        sd = data.symbol_data["BBB"]
+        timestamp = START + timedelta(days=40)
+
+        lookback = data.get_lookback("BBB", timestamp, 15)
+        expected = [b.close for b in sd.bars if b.timestamp <= timestamp][-15:]
+
+        assert lookback.tolist() == expected
+
+    def test_lookback_is_a_read_only_view(self):
+        data = _data()
+
+        lookback = data.get_lookback("AAA", START + timedelta(days=30), 20)
+
+        assert np.shares_memory(lookback, data.symbol_data["AAA"].array("close"))
+        with pytest.raises(ValueError):
+            lookback[0] = 0.0
+
+    def test_short_history_and_unknown_symbol(self):
+        data = _data()
+
+        assert len(data.get_lookback("BBB", START + timedelta(days=10), 50)) == 1
+        assert len(data.get_lookback("BBB", START, 50)) == 0
+        assert len(data.get_lookback("ZZZ", START, 50)) == 0
+
+    def test_other_columns(self):
+        data = _data()
+        timestamp = START + timedelta(days=20)
+
+        highs = data.get_lookback_array("AAA", timestamp, 5, "high")
+
+        assert highs.tolist() == [b.high for b in data.symbol_data["AAA"].bars[16:21]]
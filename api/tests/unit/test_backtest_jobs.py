@@ -0,0 +1,251 @@
+"""
+Unit Tests for the Backtest Job Queue
+=====================================
+Tests BacktestJobManager running backtests in background processes.
+
+Tests cover:
+- Jobs completing with the same result as an in-request backtest
+- Progress reporting and failed jobs
+- Walk-forward jobs running windows in parallel, reporting each finished window
+- Cancelling queued and running jobs
+- Per-client concurrency caps
+- Results persisted to and served from the database
+- Several workers sharing the table: cancelling another worker's job,
+  startup recovery leaving live workers' jobs alone
+
+Run with: pytest tests/unit/test_backtest_jobs.py -v
+"""
+import asyncio
+from datetime import date
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from exceptions import BacktestJobLimitError
+from models.backtest import BacktestRequest, WalkForwardRequest
+from services.backtest_jobs import BacktestJobManager
+from services.backtesting.engine import run_backtest
+from tests.mocks.synthetic_bars import SyntheticBarService
+
+SHORT_REQUEST = BacktestRequest(
+    symbols=["AAA", "BBB"],
+    start_date=date(2021, 1, 4),
+    end_date=date(2022, 12, 30),
+    initial_capital=50000,
+)
+
+# Long enough to still be running when the test cancels it
+LONG_REQUEST = BacktestRequest(
+    symbols=[f"SYM{i:02d}" for i in range(40)],
+    start_date=date(2000, 1, 3),
+    end_date=date(2020, 12, 31),
+)
+
+
+def _manager(**kwargs):
+    kwargs.setdefault("persist", False)
+    return BacktestJobManager(data_service_factory=SyntheticBarService, **kwargs)
+
+
+async def _wait_for_status(manager, job_id, status, timeout=60):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while (job := await manager.get(job_id))["status"] != status:
+        assert asyncio.get_running_loop().time() < deadline, job
+        await asyncio.sleep(0.1)
+
+
+@pytest.fixture
+def job_db(tmp_path, monkeypatch):
+    """Point the job table at a throwaway SQLite file instead of ./chartsense.db"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    import database.connection as connection
+
+    url = f"sqlite:///{tmp_path / 'jobs.db'}"
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    monkeypatch.setenv("DATABASE_URL", url)
+    monkeypatch.setattr(connection, "engine", engine)
+    monkeypatch.setattr(connection, "SessionLocal", sessionmaker(autocommit=False, autoflush=False, bind=engine))
+    connection.init_db()
+    yield
+    engine.dispose()
+
+
+class TestJobExecution:
+    """Test jobs run to completion in a separate process"""
+
+    @pytest.mark.asyncio
+    async def test_job_matches_in_request_backtest(self):
+        manager = _manager()
+
+        job = await manager.submit("backtest", SHORT_REQUEST.model_dump(mode="json"), client_id="a")
+        status = await manager.wait(job.job_id, timeout=60)
+
+        assert status["status"] == "COMPLETED"
+        assert status["progress"] == 100.0
+        expected = await run_backtest(SHORT_REQUEST, data_service=SyntheticBarService())
+        result = await manager.get_result(job.job_id)
+        assert result["final_equity"] == pytest.approx(expected.final_equity)
+        assert len(result["trades"]) == len(expected.trades)
+
+    @pytest.mark.asyncio
+    async def test_failed_job_reports_error(self):
+        manager = _manager()
+        payload = SHORT_REQUEST.model_copy(update={"strategy": "no_such_strategy"}).model_dump(mode="json")
+
+        job = await manager.submit("backtest", payload, client_id="a")
+        status = await manager.wait(job.job_id, timeout=60)
+
+        assert status["status"] == "FAILED"
+        assert "Unknown strategy" in status["error"]
+        assert await manager.get_result(job.job_id) is None
+
+    @pytest.mark.asyncio
+    async def test_walk_forward_job_reports_windows(self):
+        manager = _manager()
+        request = WalkForwardRequest(
+            symbol="AAA", start_date=date(2019, 1, 2), end_date=date(2021, 12, 31),
+            param_ranges={"rsi_period": [7, 14], "rsi_oversold": [30, 35]},
+            num_windows=3, workers=2, seed=5,
+        )
+
+        job = await manager.submit("walk_forward", request.model_dump(mode="json"), client_id="a")
+        status = await manager.wait(job.job_id, timeout=120)
+
+        assert status["status"] == "COMPLETED", status["error"]
+        detail = status["progress_detail"]
+        assert (detail["completed_windows"], detail["total_windows"], detail["workers"]) == (3, 3, 2)
+        result = await manager.get_result(job.job_id)
+        assert (result["symbol"], result["total_windows"], result["seed"]) == ("AAA", 3, 5)
+        assert [w["test_sharpe"] for w in detail["windows"]] == \
+               [round(w["test_performance"], 3) for w in result["windows"]]
+
+    @pytest.mark.asyncio
+    async def test_unknown_kind_rejected(self):
+        with pytest.raises(ValueError):
+            await _manager().submit("nope", {}, client_id="a")
+
+
+class TestCancellation:
+    """Test cancelling queued and running jobs"""
+
+    @pytest.mark.asyncio
+    async def test_cancel_running_job(self):
+        manager = _manager(cancel_grace_seconds=10)
+        job = await manager.submit("backtest", LONG_REQUEST.model_dump(mode="json"), client_id="a")
+
+        await _wait_for_status(manager, job.job_id, "RUNNING")
+        while (await manager.get(job.job_id))["progress"] == 0:
+            await asyncio.sleep(0.1)
+        running = await manager.get(job.job_id)
+        await manager.cancel(job.job_id)
+        status = await manager.wait(job.job_id, timeout=30)
+
+        assert running["eta_seconds"] is not None
+        assert status["status"] == "CANCELLED"
+        assert not job._process.is_alive()
+
+    @pytest.mark.asyncio
+    async def test_cancel_queued_job(self):
+        manager = _manager(max_concurrent_jobs=1)
+        first = await manager.submit("backtest", LONG_REQUEST.model_dump(mode="json"), client_id="a")
+        second = await manager.submit("backtest", SHORT_REQUEST.model_dump(mode="json"), client_id="b")
+
+        status = await manager.cancel(second.job_id)
+
+        assert status["status"] == "CANCELLED"
+        assert second._process is None
+        await manager.shutdown()
+        assert (await manager.get(first.job_id))["status"] == "FAILED"
+
+
+class TestLimits:
+    """Test concurrency caps"""
+
+    @pytest.mark.asyncio
+    async def test_per_client_cap(self):
+        manager = _manager(max_jobs_per_client=1)
+        await manager.submit("backtest", LONG_REQUEST.model_dump(mode="json"), client_id="a")
+
+        with pytest.raises(BacktestJobLimitError):
+            await manager.submit("backtest", LONG_REQUEST.model_dump(mode="json"), client_id="a")
+        await manager.submit("backtest", LONG_REQUEST.model_dump(mode="json"), client_id="b")
+
+        assert manager.get_status()["rejected"] == 1
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_queue_cap(self):
+        manager = _manager(max_concurrent_jobs=1, max_queued_jobs=1, max_jobs_per_client=5)
+        running = await manager.submit("backtest", LONG_REQUEST.model_dump(mode="json"), client_id="a")
+        await _wait_for_status(manager, running.job_id, "RUNNING")
+        await manager.submit("backtest", LONG_REQUEST.model_dump(mode="json"), client_id="a")
+
+        with pytest.raises(BacktestJobLimitError):
+            await manager.submit("backtest", LONG_REQUEST.model_dump(mode="json"), client_id="a")
+        await manager.shutdown()
+
+
+@pytest.mark.usefixtures("job_db")
+class TestPersistence:
+    """Test jobs are stored in the database"""
+
+    @pytest.mark.asyncio
+    async def test_result_served_from_database(self):
+        manager = _manager(persist=True)
+
+        job = await manager.submit("backtest", SHORT_REQUEST.model_dump(mode="json"), client_id="a")
+        await manager.wait(job.job_id, timeout=60)
+
+        # A fresh manager (e.g. another API worker) only has the database
+        other = _manager(persist=True)
+        status = await other.get(job.job_id)
+        assert status["status"] == "COMPLETED"
+        assert status["request"]["symbols"] == ["AAA", "BBB"]
+        assert await other.get_result(job.job_id) == await manager.get_result(job.job_id)
+        assert await other.get("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_cancel_from_another_worker(self):
+        owner = _manager(persist=True, heartbeat_seconds=0.2, cancel_grace_seconds=10)
+        other = _manager(persist=True)
+
+        job = await owner.submit("backtest", LONG_REQUEST.model_dump(mode="json"), client_id="a")
+        await _wait_for_status(owner, job.job_id, "RUNNING")
+        requested = await other.cancel(job.job_id)
+        status = await owner.wait(job.job_id, timeout=30)
+
+        assert requested["cancel_requested"] is True
+        assert status["status"] == "CANCELLED"
+        assert (await other.get(job.job_id))["status"] == "CANCELLED"
+        await owner.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_recovery_skips_live_workers_jobs(self):
+        owner = _manager(persist=True, heartbeat_seconds=0.2)
+        job = await owner.submit("backtest", LONG_REQUEST.model_dump(mode="json"), client_id="a")
+        await _wait_for_status(owner, job.job_id, "RUNNING")
+
+        # A second worker starting up, then one starting after the owner died
+        _manager(persist=True).recover_interrupted_jobs()
+        assert (await owner.get(job.job_id))["status"] == "RUNNING"
+        _manager(persist=True, stale_after_seconds=0).recover_interrupted_jobs()
+        assert (await _manager(persist=True).get(job.job_id))["status"] == "FAILED"
+        await owner.shutdown()
+
+
+class TestRoutes:
+    """Test the job endpoints"""
+
+    def test_unknown_job_returns_404(self, test_client):
+        assert test_client.get("/api/backtest/jobs/does-not-exist").status_code == 404
+        assert test_client.delete("/api/backtest/jobs/does-not-exist").status_code == 404
+
+    def test_list_jobs_for_client(self, test_client):
+        response = test_client.get("/api/backtest/jobs", headers={"X-Client-Id": "nobody"})
+
+        assert response.status_code == 200
+        assert response.json() == {"jobs": []}
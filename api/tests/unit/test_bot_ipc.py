@@ -0,0 +1,281 @@
+"""
+Unit Tests for Bot Process IPC
+==============================
+Tests the proxy that lets API workers talk to an out-of-process bot.
+
+Tests cover:
+- Attribute reads, writes and nested object proxies
+- Sync and async method calls executed on the bot's event loop
+- Plain reads answered while the bot's loop is busy
+- Connections reused across requests, one round trip per method call
+- Route helpers running bot access off the event loop in external mode
+- Names outside the IPC allowlist refused
+- Remote exceptions re-raised in the caller
+- Authentication and unreachable bot handling
+- get_trading_bot() returning a proxy in external mode
+
+Run with: pytest tests/unit/test_bot_ipc.py -v
+"""
+import asyncio
+import threading
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from exceptions import BotProcessUnavailableError
+from services import trading_bot as trading_bot_module
+from services.bot_ipc import BOT_IPC_ALLOWLIST, BotIPCServer, BotProxy, offload_bot_io, run_bot_io
+from services.trading_bot import BotState
+
+AUTHKEY = b"test-authkey"
+FAKE_BOT_ALLOWLIST = {
+    (): frozenset({"state", "enabled_symbols", "auto_optimizer", "get_status", "start", "fail", "does_not_exist"}),
+    ("auto_optimizer",): frozenset({"enabled"}),
+}
+
+
+class FakeOptimizer:
+    def __init__(self):
+        self.enabled = False
+
+
+class FakeBot:
+    """Minimal stand-in for TradingBot"""
+
+    def __init__(self):
+        self.state = BotState.STOPPED
+        self.enabled_symbols = ["AAPL", "MSFT"]
+        self.auto_optimizer = FakeOptimizer()
+        self.calls_on_thread = []
+
+    def get_status(self):
+        self.calls_on_thread.append(threading.current_thread().name)
+        return {"state": self.state.value, "symbols": len(self.enabled_symbols)}
+
+    async def start(self):
+        await asyncio.sleep(0)
+        self.state = BotState.RUNNING
+        return True
+
+    def fail(self):
+        raise ValueError("bad request")
+
+
+@pytest.fixture
+def served_bot():
+    """Run an IPC server for a FakeBot on a background event loop"""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, name="bot-loop", daemon=True)
+    thread.start()
+
+    bot = FakeBot()
+    server = BotIPCServer(
+        bot, loop=loop, address=("127.0.0.1", 0), authkey=AUTHKEY, allowlist=FAKE_BOT_ALLOWLIST
+    )
+    server.start()
+    proxy = BotProxy(address=server.address, authkey=AUTHKEY)
+
+    yield bot, proxy, server
+
+    server.close()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=5)
+
+
+class TestBotProxy:
+    """Test proxying a bot over IPC"""
+
+    def test_reads_plain_values(self, served_bot):
+        bot, proxy, _ = served_bot
+
+        assert proxy.state == BotState.STOPPED
+        assert proxy.enabled_symbols == ["AAPL", "MSFT"]
+
+    def test_writes_attributes(self, served_bot):
+        bot, proxy, _ = served_bot
+
+        proxy.enabled_symbols = proxy.enabled_symbols + ["NVDA"]
+
+        assert bot.enabled_symbols == ["AAPL", "MSFT", "NVDA"]
+
+    def test_nested_objects_are_proxied(self, served_bot):
+        bot, proxy, _ = served_bot
+
+        proxy.auto_optimizer.enabled = True
+
+        assert bot.auto_optimizer.enabled is True
+        assert proxy.auto_optimizer.enabled is True
+
+    def test_sync_calls_run_on_bot_loop(self, served_bot):
+        bot, proxy, _ = served_bot
+
+        status = proxy.get_status()
+
+        assert status == {"state": "STOPPED", "symbols": 2}
+        assert bot.calls_on_thread == ["bot-loop"]
+
+    def test_async_calls_are_awaited(self, served_bot):
+        bot, proxy, _ = served_bot
+
+        assert asyncio.run(proxy.start()) is True
+        assert bot.state == BotState.RUNNING
+
+    def test_remote_exceptions_are_reraised(self, served_bot):
+        _, proxy, server = served_bot
+
+        with pytest.raises(ValueError, match="bad request"):
+            proxy.fail()
+        with pytest.raises(AttributeError):
+            proxy.does_not_exist
+        assert not hasattr(proxy, "does_not_exist")
+        assert server.request_errors == 3
+
+    def test_dunder_access_is_refused(self, served_bot):
+        _, proxy, _ = served_bot
+
+        with pytest.raises(AttributeError):
+            proxy._request(("get", (), "__class__"))
+        with pytest.raises(AttributeError):
+            proxy._request(("call", ("__dict__",), "clear", (), {}))
+
+    def test_names_outside_allowlist_are_refused(self, served_bot):
+        bot, proxy, _ = served_bot
+
+        with pytest.raises(AttributeError, match="not allowed"):
+            proxy.calls_on_thread
+        with pytest.raises(AttributeError, match="not allowed"):
+            proxy._request(("get", ("auto_optimizer",), "state"))
+        with pytest.raises(AttributeError, match="not allowed"):
+            proxy._request(("set", ("auto_optimizer",), "missing", 1))
+        with pytest.raises(AttributeError, match="not allowed"):
+            proxy._request(("call", ("enabled_symbols",), "clear", (), {}))
+        assert bot.enabled_symbols == ["AAPL", "MSFT"]
+
+    def test_default_allowlist_covers_bot_routes(self):
+        assert "get_status" in BOT_IPC_ALLOWLIST[()]
+        assert "submit_market_order" in BOT_IPC_ALLOWLIST[("alpaca",)]
+        assert "alpaca" not in BOT_IPC_ALLOWLIST[("alpaca",)]
+        assert ("alpaca", "_client") not in BOT_IPC_ALLOWLIST
+
+    def test_plain_reads_do_not_wait_for_bot_loop(self, served_bot):
+        bot, proxy, server = served_bot
+        release = threading.Event()
+        server.loop.call_soon_threadsafe(release.wait, 10)  # Bot busy, e.g. mid-scan
+
+        try:
+            assert proxy.state == BotState.STOPPED
+            assert proxy.auto_optimizer.enabled is False
+        finally:
+            release.set()
+        assert proxy.enabled_symbols == ["AAPL", "MSFT"]  # Containers are read on the loop
+
+    def test_connection_reused_across_requests(self, served_bot):
+        bot, proxy, server = served_bot
+
+        for _ in range(5):
+            proxy.get_status()
+            proxy.auto_optimizer.enabled
+
+        assert server.connections_accepted == 1
+        # After the first get_status, each call is a single request
+        served = server.requests_served
+        proxy.get_status()
+        assert server.requests_served == served + 1
+
+    def test_wrong_authkey_is_rejected(self, served_bot):
+        _, _, server = served_bot
+        intruder = BotProxy(address=server.address, authkey=b"wrong")
+
+        with pytest.raises(Exception):
+            intruder.state
+
+
+class TestUnavailableBot:
+    """Test behavior when the bot process is down"""
+
+    def test_unreachable_bot_raises_and_pings_false(self):
+        proxy = BotProxy(address=("127.0.0.1", 1), authkey=AUTHKEY)
+
+        assert proxy.ping() is False
+        with pytest.raises(BotProcessUnavailableError):
+            proxy.get_status()
+
+
+class TestExternalMode:
+    """Test get_trading_bot() mode selection"""
+
+    def test_external_mode_returns_proxy(self, monkeypatch):
+        monkeypatch.setenv("BOT_PROCESS_MODE", "external")
+        monkeypatch.setenv("BOT_IPC_AUTHKEY", "secret")
+        monkeypatch.setenv("BOT_IPC_ADDRESS", "127.0.0.1:9876")
+        monkeypatch.setattr(trading_bot_module, "_trading_bot", None)
+
+        bot = trading_bot_module.get_trading_bot()
+
+        assert isinstance(bot, BotProxy)
+        assert bot._address == ("127.0.0.1", 9876)
+
+
+class TestRouteHelpers:
+    """Test running bot access off the event loop"""
+
+    @pytest.mark.asyncio
+    async def test_external_mode_runs_off_event_loop(self, monkeypatch):
+        monkeypatch.setenv("BOT_PROCESS_MODE", "external")
+        loop_thread = threading.current_thread()
+        loop = asyncio.get_running_loop()
+
+        @offload_bot_io
+        def handler(value):
+            return value, threading.current_thread()
+
+        result, handler_thread = await handler(7)
+        thread = await run_bot_io(threading.current_thread)
+
+        assert result == 7
+        assert handler_thread is not loop_thread and thread is not loop_thread
+        assert asyncio.get_running_loop() is loop
+
+    @pytest.mark.asyncio
+    async def test_embedded_mode_stays_on_event_loop(self, monkeypatch):
+        monkeypatch.setenv("BOT_PROCESS_MODE", "embedded")
+
+        @offload_bot_io
+        def handler():
+            return threading.current_thread()
+
+        assert await handler() is threading.current_thread()
+        assert await run_bot_io(threading.current_thread) is threading.current_thread()
+
+    @pytest.mark.asyncio
+    async def test_offloaded_coroutine_results_run_on_server_loop(self, monkeypatch):
+        monkeypatch.setenv("BOT_PROCESS_MODE", "external")
+        loop = asyncio.get_running_loop()
+
+        async def bot_method():
+            return asyncio.get_running_loop()
+
+        @offload_bot_io
+        def handler():
+            return bot_method()
+
+        assert await handler() is loop
+
+    def test_offload_bot_io_rejects_async_handlers(self):
+        async def handler():
+            return None
+
+        with pytest.raises(TypeError):
+            offload_bot_io(handler)
+
+    @pytest.mark.asyncio
+    async def test_run_bot_io_awaits_coroutine_results(self, monkeypatch):
+        monkeypatch.setenv("BOT_PROCESS_MODE", "external")
+        loop_thread = threading.current_thread()
+
+        async def bot_method():
+            return threading.current_thread()
+
+        assert await run_bot_io(lambda: bot_method()) is loop_thread
@@ -0,0 +1,227 @@
+"""
+Unit Tests for the Bot Replay
+=============================
+Tests replaying the live TradingBot over historical minute bars: the
+virtual clock, point-in-time market data, the simulated broker and the
+replay runner.
+
+Tests cover:
+- VirtualClock waking sleepers in time order and jumping between them
+- Market sessions from Eastern time
+- Bars served without lookahead (partial bucket in progress, history first)
+- Orders held outside the regular session and filled at the open
+- Rejections for unheld shares and insufficient buying power
+- A short end-to-end replay that trades, deterministically
+
+Run with: pytest tests/unit/test_bot_replay.py -v
+"""
+import asyncio
+from datetime import date, datetime
+
+import pytest
+import pytz
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from exceptions import AlpacaInsufficientFundsError, AlpacaOrderError
+from scripts.benchmark_throughput import business_days, synthetic_minutes
+from services.alpaca_service import market_session
+from services.backtesting.replay_data import ReplayMarketData
+from services.clock import VirtualClock
+from services.replay import BotReplay
+from services.simulated_broker import SimulatedBroker
+
+EASTERN = pytz.timezone("US/Eastern")
+DAY = date(2024, 3, 4)  # A Monday (EST)
+
+
+def eastern(hour, minute=0, second=0, day=DAY):
+    return EASTERN.localize(datetime(day.year, day.month, day.day, hour, minute, second))
+
+
+def minute_data(prices, first=(9, 28)):
+    """One symbol's minute bars from (open, high, low, close) tuples, a minute apart"""
+    start = int(eastern(*first).timestamp())
+    data = ReplayMarketData()
+    data.add_minutes(
+        "AAA",
+        [start + 60 * i for i in range(len(prices))],
+        {
+            "open": [p[0] for p in prices],
+            "high": [p[1] for p in prices],
+            "low": [p[2] for p in prices],
+            "close": [p[3] for p in prices],
+            "volume": [1000.0] * len(prices),
+        },
+    )
+    return data
+
+
+# 9:28 and 9:29 pre-market, then the regular session
+PRICES = [
+    (100.0, 100.5, 99.5, 100.0),
+    (100.0, 100.8, 99.8, 100.5),
+    (101.0, 102.0, 100.5, 101.5),
+    (101.5, 103.0, 101.0, 102.5),
+    (102.5, 102.6, 99.0, 99.5),
+]
+
+
+class TestVirtualClock:
+    """Test simulated time"""
+
+    @pytest.mark.asyncio
+    async def test_sleepers_wake_in_time_order(self):
+        clock = VirtualClock(eastern(9, 30))
+        woken = []
+
+        async def sleeper(name, seconds):
+            await clock.sleep(seconds)
+            woken.append((name, clock.now(EASTERN).strftime("%H:%M")))
+
+        tasks = [asyncio.create_task(sleeper("late", 3600)), asyncio.create_task(sleeper("early", 60))]
+        await clock.sleep_until(eastern(12))
+        await asyncio.gather(*tasks)
+
+        assert woken == [("early", "09:31"), ("late", "10:30")]
+        assert clock.now(EASTERN) == eastern(12)
+
+    def test_advance_and_naive_now(self):
+        clock = VirtualClock(eastern(9, 30))
+        clock.advance(90)
+
+        assert clock.timestamp() == eastern(9, 31, 30).timestamp()
+        assert clock.now() == eastern(9, 31, 30).astimezone().replace(tzinfo=None)
+
+
+class TestMarketSession:
+    """Test session classification"""
+
+    @pytest.mark.parametrize("when,expected", [
+        (eastern(3, 59), ("overnight", False)),
+        (eastern(4), ("pre_market", True)),
+        (eastern(9, 30), ("regular", True)),
+        (eastern(16), ("after_hours", True)),
+        (eastern(20), ("overnight", False)),
+        (eastern(12, day=date(2024, 3, 2)), ("weekend", False)),  # Saturday
+    ])
+    def test_sessions(self, when, expected):
+        assert market_session(when) == expected
+
+
+class TestReplayMarketData:
+    """Test point-in-time bars"""
+
+    def test_partial_bucket_has_no_lookahead(self):
+        data = minute_data(PRICES, first=(9, 30))
+
+        # 9:32:30 - the 9:30 and 9:31 minutes have closed, 9:32 has not
+        bars = data.get_bars("AAA", "5Min", 10, eastern(9, 32, 30).timestamp())
+
+        assert len(bars) == 1
+        assert (bars[0]["open"], bars[0]["high"], bars[0]["low"], bars[0]["close"]) == (100.0, 100.8, 99.5, 100.5)
+        assert bars[0]["volume"] == 2000.0
+        assert data.get_bars("AAA", "1Min", 10, eastern(9, 30, 59).timestamp()) == []
+
+    def test_history_served_before_minutes(self):
+        data = minute_data(PRICES)
+        history_day = int(EASTERN.localize(datetime(2024, 3, 1)).timestamp())
+        data.add_history("AAA", "1Day", [history_day], {"open": [90], "high": [95], "low": [89], "close": [94],
+                                                       "volume": [1e6]})
+
+        bars = data.get_bars("AAA", "1Day", 5, eastern(9, 30, 30).timestamp())
+
+        assert [bar["close"] for bar in bars] == [94.0, 100.5]
+
+    def test_unsupported_timeframe(self):
+        with pytest.raises(ValueError):
+            minute_data(PRICES).get_bars("AAA", "2Hour", 10, eastern(10).timestamp())
+
+
+class TestSimulatedBroker:
+    """Test order handling against replayed minutes"""
+
+    def broker(self, at, cash=100000.0):
+        clock = VirtualClock(at)
+        return SimulatedBroker(minute_data(PRICES), clock, starting_cash=cash, slippage=None), clock
+
+    @pytest.mark.asyncio
+    async def test_pre_market_order_fills_at_the_open(self):
+        broker, clock = self.broker(eastern(9, 29, 30))
+
+        order = await broker.submit_market_order("AAA", 10, "buy")
+        assert order["status"] == "accepted"
+        assert (await broker.get_latest_quote("AAA"))["ask_price"] == 100.0  # 9:28 close
+
+        clock.advance(120)
+        filled = await broker.get_order(order["id"])
+
+        assert filled["status"] == "filled"
+        assert filled["filled_avg_price"] == 101.0  # 9:30 open
+        assert (await broker.get_position("AAA"))["quantity"] == 10
+
+    @pytest.mark.asyncio
+    async def test_oco_protects_the_position(self):
+        broker, clock = self.broker(eastern(9, 31, 5))
+        await broker.submit_market_order("AAA", 10, "buy")
+
+        await broker.submit_oco_order("AAA", 10, stop_loss_price=99.8, take_profit_price=102.8)
+        with pytest.raises(AlpacaOrderError):
+            await broker.submit_market_order("AAA", 5, "sell")  # Shares held for the OCO
+        clock.advance(60)
+
+        assert await broker.get_position("AAA") is None
+        assert [(trade.exit_price, trade.reason) for trade in broker.trades] == [(102.8, "take_profit")]
+        assert broker.orders_rejected == 1
+
+    @pytest.mark.asyncio
+    async def test_insufficient_buying_power(self):
+        broker, _ = self.broker(eastern(9, 31, 5), cash=1000.0)
+
+        with pytest.raises(AlpacaInsufficientFundsError):
+            await broker.submit_market_order("AAA", 100, "buy")
+        assert await broker.get_positions() == []
+
+
+class TestBotReplay:
+    """Test replaying the trading bot end to end"""
+
+    class EagerReplay(BotReplay):
+        """Replay with lower entry bars, so a short synthetic window trades"""
+
+        def _build_bot(self):
+            bot = super()._build_bot()
+            for thresholds in bot.smart_scanner.strategy.thresholds.values():
+                thresholds["min_score"] -= 15
+            return bot
+
+    def market_data(self):
+        days = business_days(date(2024, 2, 26), 6)
+        data = ReplayMarketData()
+        data.add_minutes("SYN000", *synthetic_minutes("SYN000", days, 100.0, seed=3))
+        return data, days[-1]
+
+    @pytest.mark.asyncio
+    async def test_replay_trades_deterministically(self):
+        data, day = self.market_data()
+
+        async def replay():
+            return await self.EagerReplay(data, start=eastern(9, 25, day=day), end=eastern(11, day=day)).run()
+
+        first, second = await replay(), await replay()
+
+        assert first.orders_submitted > 0 and first.fills > 0
+        assert first.backtest.bars_processed == 95
+        assert first.speedup > 1
+        assert [point.timestamp for point in first.backtest.equity_curve] == [eastern(11, day=day)]
+        assert [(t.entry_time, t.entry_price, t.exit_price) for t in first.backtest.trades] == \
+               [(t.entry_time, t.entry_price, t.exit_price) for t in second.backtest.trades]
+        assert first.backtest.final_equity == second.backtest.final_equity
+
+    def test_end_before_start(self):
+        data, day = self.market_data()
+
+        with pytest.raises(ValueError):
+            BotReplay(data, start=eastern(11, day=day), end=eastern(10, day=day))
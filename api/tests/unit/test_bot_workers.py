@@ -0,0 +1,160 @@
+"""
+Unit Tests for Partitioned Bot Workers
+======================================
+Tests the multi-process analysis pool used by the SmartScanner.
+
+Tests cover:
+- Stable symbol partitioning
+- Horizon scans fanned out to real worker processes
+- Coordinator keeps the cascade (no analysis fetches in-process)
+- Fallback to local analysis when workers miss the deadline or fail a symbol
+- Restart of dead workers
+
+Run with: pytest tests/unit/test_bot_workers.py -v
+"""
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from services.bot_workers import BotWorkerPool, partition_symbols
+from services.smart_scanner import SmartScanner
+from services.hierarchical_strategy import TradingHorizon, TradingOpportunity
+from tests.mocks.alpaca_mock import MockAlpacaService
+
+SYMBOLS = ["AAPL", "MSFT", "NVDA", "AMD", "TSLA", "META", "GOOGL", "AMZN"]
+
+
+def failing_bars_service():
+    """Worker data client whose bar requests all fail"""
+    service = MockAlpacaService()
+    service.simulate_error("Data feed unavailable", method="get_bars")
+    return service
+
+
+@pytest.fixture(scope="module")
+def worker_pool():
+    pool = BotWorkerPool(num_workers=2, alpaca_factory=MockAlpacaService, task_timeout_seconds=120)
+    pool.start()
+    yield pool
+    pool.shutdown()
+
+
+class TestPartitionSymbols:
+    """Test symbol partitioning"""
+
+    def test_every_symbol_lands_in_exactly_one_partition(self):
+        partitions = partition_symbols(SYMBOLS, 3)
+
+        assert len(partitions) == 3
+        assert sorted(s for p in partitions for s in p) == sorted(SYMBOLS)
+
+    def test_partitioning_is_stable_and_case_insensitive(self):
+        first = partition_symbols(SYMBOLS, 4)
+        again = partition_symbols(list(reversed(SYMBOLS)), 4)
+        lower = partition_symbols([s.lower() for s in SYMBOLS], 4)
+
+        for i in range(4):
+            assert set(first[i]) == set(again[i])
+            assert {s.upper() for s in lower[i]} == set(first[i])
+
+
+class TestBotWorkerPool:
+    """Test the worker pool against real worker processes"""
+
+    def test_requires_at_least_one_worker(self):
+        with pytest.raises(ValueError):
+            BotWorkerPool(num_workers=0)
+
+    @pytest.mark.asyncio
+    async def test_analyze_requires_running_pool(self):
+        pool = BotWorkerPool(num_workers=1, alpaca_factory=MockAlpacaService)
+
+        with pytest.raises(RuntimeError):
+            await pool.analyze(SYMBOLS, TradingHorizon.SWING, cycle_id="c1")
+
+    @pytest.mark.asyncio
+    async def test_workers_analyze_all_symbols(self, worker_pool):
+        result = await worker_pool.analyze(SYMBOLS, TradingHorizon.SWING, cycle_id="c1")
+
+        assert result.scanned == len(SYMBOLS)
+        assert result.failed_symbols == []
+        assert all(isinstance(o, TradingOpportunity) for o in result.opportunities)
+        assert {o.symbol for o in result.opportunities} <= set(SYMBOLS)
+        assert set(result.symbol_metrics) == set(SYMBOLS)
+
+        status = worker_pool.get_status()
+        assert status["running"] is True
+        assert all(w["alive"] for w in status["workers"])
+
+    @pytest.mark.asyncio
+    async def test_workers_reuse_context_within_a_cycle(self, worker_pool):
+        await worker_pool.analyze(SYMBOLS, TradingHorizon.SWING, cycle_id="reuse")
+        result = await worker_pool.analyze(SYMBOLS, TradingHorizon.SWING, cycle_id="reuse")
+
+        # A revisited horizon reads the bars its first scan fetched
+        assert result.fetches_saved == len(SYMBOLS)
+
+    @pytest.mark.asyncio
+    async def test_scanner_delegates_analysis_to_workers(self, worker_pool):
+        service = MockAlpacaService()
+        scanner = SmartScanner(alpaca_service=service)
+        scanner.attach_worker_pool(worker_pool)
+
+        result = await scanner.scan(SYMBOLS, force_horizon=TradingHorizon.SWING)
+
+        assert result.symbols_scanned == len(SYMBOLS)
+        assert not [c for c in service.call_history if c["method"] == "get_bars"]
+
+    @pytest.mark.asyncio
+    async def test_dead_worker_is_restarted(self, worker_pool):
+        victim = worker_pool._workers[0].process
+        victim.terminate()
+        victim.join(timeout=5)
+
+        result = await worker_pool.analyze(SYMBOLS, TradingHorizon.SWING, cycle_id="c2")
+
+        assert result.scanned == len(SYMBOLS)
+        assert worker_pool.get_status()["workers"][0]["restarts"] == 1
+
+
+class TestLocalFallback:
+    """Test fallback to in-process analysis"""
+
+    @pytest.mark.asyncio
+    async def test_missed_deadline_falls_back_to_local_analysis(self):
+        # Workers can't even finish importing within the deadline
+        pool = BotWorkerPool(num_workers=1, alpaca_factory=MockAlpacaService, task_timeout_seconds=0.01)
+        pool.start()
+        try:
+            service = MockAlpacaService()
+            scanner = SmartScanner(alpaca_service=service)
+            scanner.attach_worker_pool(pool)
+
+            result = await scanner.scan(SYMBOLS, force_horizon=TradingHorizon.SWING)
+
+            assert result.symbols_scanned == len(SYMBOLS)
+            assert [c for c in service.call_history if c["method"] == "get_bars"]
+            assert pool.get_status()["timeouts"] == 1
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_failed_symbols_are_analyzed_locally(self):
+        pool = BotWorkerPool(num_workers=1, alpaca_factory=failing_bars_service)
+        pool.start()
+        try:
+            worker_result = await pool.analyze(SYMBOLS[:2], TradingHorizon.SWING, cycle_id="f1")
+            service = MockAlpacaService()
+            scanner = SmartScanner(alpaca_service=service)
+            scanner.attach_worker_pool(pool)
+
+            result = await scanner.scan(SYMBOLS, force_horizon=TradingHorizon.SWING)
+
+            assert worker_result.scanned == 0
+            assert worker_result.failed_symbols == SYMBOLS[:2]
+            assert result.symbols_scanned == len(SYMBOLS)
+            assert [c for c in service.call_history if c["method"] == "get_bars"]
+        finally:
+            pool.shutdown()
@@ -0,0 +1,201 @@
+"""
+Unit Tests for Chart and Export Payloads
+========================================
+Tests equity curve downsampling, trade pagination and the full-resolution
+exports used by the backtest and performance APIs.
+
+Tests cover:
+- LTTB matching a straightforward reference implementation
+- Min/max bucketing keeping every bucket's extremes
+- Pagination and backtest result shaping
+- CSV and .npy exports, including the backtest job export route
+
+Run with: pytest tests/unit/test_chart_data.py -v
+"""
+import csv
+import io
+import math
+import random
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from routes import backtest as backtest_routes
+from services.chart_data import (
+    DownsampleMethod, downsample, lttb_indices, minmax_indices, paginate, shape_backtest_result, to_csv, to_npy,
+)
+
+
+def equity_values(n=5000, seed=1):
+    rng = random.Random(seed)
+    equity, values = 100000.0, []
+    for i in range(n):
+        equity *= 1 + 0.002 * math.sin(i / 200) + rng.gauss(0, 0.003)
+        values.append(equity)
+    return values
+
+
+def reference_lttb(values, threshold):
+    """Textbook LTTB (Steinarsson), one point at a time"""
+    n = len(values)
+    every = (n - 2) / (threshold - 2)
+    sampled, a = [0], 0
+    for i in range(threshold - 2):
+        avg_start, avg_end = int((i + 1) * every) + 1, min(int((i + 2) * every) + 1, n)
+        if avg_start >= avg_end:
+            avg_start, avg_end = n - 1, n
+        avg_x = sum(range(avg_start, avg_end)) / (avg_end - avg_start)
+        avg_y = sum(values[avg_start:avg_end]) / (avg_end - avg_start)
+        best, best_area = None, -1
+        for j in range(int(i * every) + 1, int((i + 1) * every) + 1):
+            area = abs((a - avg_x) * (values[j] - values[a]) - (a - j) * (avg_y - values[a]))
+            if area > best_area:
+                best, best_area = j, area
+        sampled.append(best)
+        a = best
+    sampled.append(n - 1)
+    return sampled
+
+
+def equity_points(n=400):
+    start = datetime(2024, 1, 2, 14, 30, tzinfo=timezone.utc)
+    return [
+        {"timestamp": (start + timedelta(minutes=i)).isoformat(), "equity": value,
+         "cash": value / 2, "positions_value": value / 2}
+        for i, value in enumerate(equity_values(n))
+    ]
+
+
+class TestDownsampling:
+    """Test LTTB and min/max bucketing"""
+
+    @pytest.mark.parametrize("max_points", [3, 10, 257, 1000])
+    def test_lttb_matches_reference(self, max_points):
+        values = equity_values()
+
+        indices = lttb_indices(values, max_points)
+
+        assert indices.tolist() == reference_lttb(values, max_points)
+
+    def test_lttb_keeps_spike(self):
+        values = [1.0] * 1000
+        values[537] = 50.0
+
+        indices = lttb_indices(values, 20)
+
+        assert len(indices) == 20 and 537 in indices
+        assert indices[0] == 0 and indices[-1] == 999
+
+    def test_minmax_keeps_extremes(self):
+        values = equity_values(3001)
+
+        indices = minmax_indices(values, 100)
+
+        assert len(indices) <= 100
+        assert np.all(np.diff(indices) > 0)
+        assert int(np.argmin(values)) in indices and int(np.argmax(values)) in indices
+        assert indices[0] == 0 and indices[-1] == 3000
+
+    @pytest.mark.parametrize("max_points", [3, 4, 5, 6])
+    def test_minmax_small_budgets_stay_within_max_points(self, max_points):
+        indices = minmax_indices(equity_values(500), max_points)
+
+        assert len(indices) <= max_points
+        assert indices[0] == 0 and indices[-1] == 499
+
+    def test_small_series_unchanged(self):
+        points = [{"equity": v} for v in (1.0, 2.0, 3.0)]
+
+        assert downsample(points, lambda p: p["equity"], 10) == points
+        assert downsample(points, lambda p: p["equity"], None) == points
+        with pytest.raises(ValueError):
+            lttb_indices(equity_values(10), 2)
+
+    @pytest.mark.parametrize("method", list(DownsampleMethod))
+    def test_downsample_returns_points_in_order(self, method):
+        points = equity_points(2000)
+
+        kept = downsample(points, lambda p: p["equity"], 150, method)
+
+        assert 100 <= len(kept) <= 150
+        assert kept[0] is points[0] and kept[-1] is points[-1]
+        assert [p["timestamp"] for p in kept] == sorted(p["timestamp"] for p in kept)
+
+
+class TestPagination:
+    """Test trade pages and result shaping"""
+
+    def test_paginate(self):
+        page = paginate(list(range(95)), page=2, page_size=40)
+
+        assert page["items"] == list(range(40, 80))
+        assert (page["total_count"], page["total_pages"]) == (95, 3)
+        assert paginate(list(range(95)), page=4, page_size=40)["items"] == []
+
+    def test_shape_backtest_result(self):
+        result = {"final_equity": 1.0, "equity_curve": equity_points(1000),
+                  "trades": [{"symbol": "AAA", "pnl": i} for i in range(120)]}
+
+        shaped = shape_backtest_result(result, max_points=200, trades_page=3, trades_page_size=50)
+
+        assert len(shaped["equity_curve"]) == 200 and shaped["equity_points_total"] == 1000
+        assert [t["pnl"] for t in shaped["trades"]] == list(range(100, 120))
+        assert shaped["trades_total"] == 120
+        assert len(result["equity_curve"]) == 1000  # Input untouched
+        assert shape_backtest_result({"strategy": "rsi"}, max_points=10, trades_page=1) == {"strategy": "rsi"}
+
+
+class TestExport:
+    """Test full-resolution CSV and .npy exports"""
+
+    def test_csv(self):
+        points = equity_points(50)
+
+        rows = list(csv.DictReader(io.StringIO(to_csv(points))))
+
+        assert len(rows) == 50
+        assert rows[7]["timestamp"] == points[7]["timestamp"]
+        assert float(rows[7]["equity"]) == points[7]["equity"]
+
+    def test_npy_round_trip(self):
+        points = equity_points(300)
+
+        array = np.load(io.BytesIO(to_npy(points, ["equity", "cash", "positions_value"])))
+
+        assert len(array) == 300
+        assert array["equity"].tolist() == [p["equity"] for p in points]
+        assert array["timestamp"][0] == np.datetime64("2024-01-02T14:30", "ms")
+        assert np.all(np.diff(array["timestamp"]) == np.timedelta64(1, "m"))
+
+    @pytest.mark.asyncio
+    async def test_job_export_and_pages(self, monkeypatch):
+        result = {"equity_curve": equity_points(500), "trades": [{"symbol": "AAA", "pnl": i} for i in range(30)]}
+
+        class Manager:
+            async def get(self, job_id):
+                return {"job_id": job_id, "status": "COMPLETED"} if job_id == "done" else None
+
+            async def get_result(self, job_id):
+                return result
+
+        monkeypatch.setattr(backtest_routes, "get_backtest_job_manager", lambda: Manager())
+
+        response = await backtest_routes.export_backtest_job("done", data="equity", file_format="npy")
+        assert np.load(io.BytesIO(response.body))["equity"].tolist() == [p["equity"] for p in result["equity_curve"]]
+        assert "backtest_done_equity.npy" in response.headers["content-disposition"]
+
+        trades_csv = await backtest_routes.export_backtest_job("done", data="trades", file_format="csv")
+        assert trades_csv.body.decode().splitlines()[0] == "symbol,pnl"
+
+        page = await backtest_routes.get_backtest_job_trades("done", page=2, page_size=25)
+        assert len(page["items"]) == 5 and page["total_pages"] == 2
+
+        shaped = await backtest_routes.get_backtest_job_result(
+            "done", max_points=50, method=DownsampleMethod.MINMAX, trades_page=None, trades_page_size=50,
+        )
+        assert len(shaped["equity_curve"]) <= 50 and shaped["equity_points_total"] == 500
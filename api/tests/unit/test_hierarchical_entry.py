@@ -0,0 +1,138 @@
+"""
+Unit Tests for Hierarchical Entries and Exits
+=============================================
+Tests how the TradingBot's hierarchical cycle sizes and risk-checks the
+cascade's best opportunity, and which exit rules its positions get.
+
+Tests cover:
+- Entries sized by the risk manager, checked with the sized position value
+- Entries blocked by the risk check or by paused entries
+- Stored trade types mapped to LONG_TERM or SWING exit rules
+
+Run with: pytest tests/unit/test_hierarchical_entry.py -v
+"""
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from services.auto_optimizer import AutoOptimizer
+from services.hierarchical_strategy import OpportunityQuality, TradingHorizon, TradingOpportunity
+from services.risk_manager import RiskCheckResult
+from services.smart_scanner import SmartScanner
+from services.strategy_engine import TradeType
+from services.trading_bot import TradingBot
+from tests.mocks.alpaca_mock import MockAlpacaService
+
+
+def make_opportunity(entry_price=100.0, stop_loss=95.0):
+    return TradingOpportunity(
+        symbol="AAA",
+        horizon=TradingHorizon.INTRADAY,
+        quality=OpportunityQuality.GOOD,
+        overall_score=80.0,
+        trend_score=80.0,
+        momentum_score=80.0,
+        pattern_score=80.0,
+        volume_score=80.0,
+        multi_tf_score=80.0,
+        direction="LONG",
+        entry_price=entry_price,
+        stop_loss=stop_loss,
+        target_1=entry_price * 1.02,
+        target_2=entry_price * 1.04,
+        risk_reward_ratio=2.0,
+    )
+
+
+@pytest.fixture
+def bot(monkeypatch):
+    """A TradingBot whose cascade always finds one GOOD opportunity and records entries"""
+    alpaca = MockAlpacaService()
+    bot = TradingBot(
+        alpaca_service=alpaca,
+        paper_trading=True,
+        smart_scanner=SmartScanner(alpaca_service=alpaca),
+        auto_optimizer=AutoOptimizer(alpaca_service=alpaca),
+    )
+    bot.entries = []
+
+    async def full_cascade_scan(symbols, max_cascades=3):
+        return make_opportunity(), []
+
+    async def record_entry(opportunity, quantity, extended_hours=False):
+        bot.entries.append((opportunity.symbol, quantity))
+
+    async def no_op(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr(bot.smart_scanner, "full_cascade_scan", full_cascade_scan)
+    monkeypatch.setattr(bot, "_execute_hierarchical_entry", record_entry)
+    monkeypatch.setattr(bot, "_check_exit_signals", no_op)
+    monkeypatch.setattr(bot, "_refresh_symbols_from_watchlist", no_op)
+    monkeypatch.setattr(bot, "_get_due_stock_symbols", lambda: ["AAA"])
+    return bot
+
+
+class TestHierarchicalRiskCheck:
+    """Test sizing and risk checks on the cascade's best opportunity"""
+
+    @pytest.mark.asyncio
+    async def test_entry_is_sized_by_the_risk_manager(self, bot, monkeypatch):
+        checked = []
+        can_open_position = bot.risk_manager.can_open_position
+
+        def record_check(**kwargs):
+            checked.append(kwargs)
+            return can_open_position(**kwargs)
+
+        monkeypatch.setattr(bot.risk_manager, "can_open_position", record_check)
+
+        await bot._run_hierarchical_trading_cycle()
+
+        expected = bot.risk_manager.calculate_position_size(
+            account_equity=100000.0, entry_price=100.0, stop_loss_price=95.0, current_positions=0,
+        )
+        assert expected.shares > 0
+        assert bot.entries == [("AAA", expected.shares)]
+        assert checked[0]["position_value"] == expected.position_value
+        assert checked[0]["current_positions"] == []
+        assert bot._stock_scan_progress["scan_status"] != "error"
+
+    @pytest.mark.asyncio
+    async def test_failed_risk_check_blocks_entry(self, bot, monkeypatch):
+        monkeypatch.setattr(
+            bot.risk_manager, "can_open_position",
+            lambda **kwargs: RiskCheckResult(
+                can_trade=False, reason="Daily loss limit reached", available_capital=0.0, current_exposure=0.0,
+            ),
+        )
+
+        await bot._run_hierarchical_trading_cycle()
+
+        assert bot.entries == []
+        assert bot._stock_scan_progress["scan_summary"] == "Opportunity found but blocked: Daily loss limit reached"
+
+    @pytest.mark.asyncio
+    async def test_paused_entries_block_entry(self, bot):
+        bot.new_entries_paused = True
+
+        await bot._run_hierarchical_trading_cycle()
+
+        assert bot.entries == []
+        assert bot._stock_scan_progress["scan_summary"] == "Opportunity found but blocked: New entries paused"
+
+
+class TestExitTradeType:
+    """Test exit rules chosen for stored positions"""
+
+    @pytest.mark.parametrize("stored,expected", [
+        ("LONG_TERM", TradeType.LONG_TERM),
+        ("SWING", TradeType.SWING),
+        ("INTRADAY", TradeType.SWING),
+        ("SCALP", TradeType.SWING),
+        (None, TradeType.SWING),
+    ])
+    def test_stored_trade_types(self, bot, stored, expected):
+        assert bot._exit_trade_type(stored) is expected
@@ -0,0 +1,225 @@
+"""
+Unit Tests for Intraday Backtesting
+===================================
+Tests minute-bar backtests streamed from the local MinuteBarStore.
+
+Tests cover:
+- Filling the store a week at a time and reusing complete months
+- Splitting stored bars into ET trading days (across DST changes)
+- Rolling lookback windows and lazy, month-at-a-time streaming
+- Session rules: regular hours, entry cutoff, max hold, flatten at close
+- run_backtest routing 1Min requests to the intraday engine
+
+Run with: pytest tests/unit/test_intraday_backtest.py -v
+"""
+import math
+import random
+from datetime import date, datetime, time, timedelta, timezone
+
+import numpy as np
+import pytest
+import pytz
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from models.backtest import BacktestRequest
+from services.backtesting import minute_store
+from services.backtesting.engine import run_backtest
+from services.backtesting.intraday import (
+    IntradayBacktestEngine,
+    IntradaySessionRules,
+    RollingWindow,
+    iter_trading_days,
+)
+from services.backtesting.minute_store import MinuteBarStore
+from services.backtesting.strategies import SimpleRSIStrategy
+from services.indicators import TradingMode
+
+EASTERN = pytz.timezone("US/Eastern")
+
+
+class MinuteBarService:
+    """Deterministic minute bars from 4:00 AM to 8:00 PM ET on weekdays"""
+
+    def __init__(self):
+        self.requests = []
+
+    async def get_bars(self, symbol, timeframe="1Min", limit=100, start=None, end=None):
+        self.requests.append((symbol, start, end))
+        bars = []
+        day = start.astimezone(EASTERN).date()
+        while day <= end.astimezone(EASTERN).date():
+            if day.weekday() < 5:
+                session_start = EASTERN.localize(datetime.combine(day, time(4)))
+                for minute in range(16 * 60):
+                    ts = session_start + timedelta(minutes=minute)
+                    if not start <= ts <= end:
+                        continue
+                    rng = random.Random(f"{symbol}:{ts.timestamp()}")
+                    close = 100 + 3 * math.sin(ts.timestamp() / 1800 + len(symbol)) + rng.gauss(0, 0.05)
+                    bars.append({
+                        "timestamp": ts.astimezone(timezone.utc).isoformat(),
+                        "open": close, "high": close + 0.02, "low": close - 0.02,
+                        "close": close, "volume": 1000,
+                    })
+            day += timedelta(days=1)
+        return bars[-limit:]
+
+
+def _et(timestamp):
+    return timestamp.astimezone(EASTERN)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return MinuteBarStore(str(tmp_path / "minute_bars"))
+
+
+class TestMinuteBarStore:
+    """Test filling and reading the local store"""
+
+    @pytest.mark.asyncio
+    async def test_fills_by_week_and_reuses_complete_months(self, store):
+        service = MinuteBarService()
+
+        fetched = await store.ensure(["AAA"], date(2024, 1, 10), date(2024, 2, 5), service, today=date(2024, 6, 1))
+        requests = len(service.requests)
+        again = await store.ensure(["AAA"], date(2024, 1, 10), date(2024, 2, 5), service, today=date(2024, 6, 1))
+
+        assert fetched == 2 and again == 0
+        assert len(service.requests) == requests
+        assert all((end - start) < timedelta(days=7) for _, start, end in service.requests)
+        assert store.has_month("AAA", date(2024, 1, 1)) and store.has_month("AAA", date(2024, 2, 1))
+
+    @pytest.mark.asyncio
+    async def test_current_month_is_partial_and_refreshed(self, store):
+        service = MinuteBarService()
+
+        await store.ensure(["AAA"], date(2024, 3, 1), date(2024, 3, 8), service, today=date(2024, 3, 8))
+        await store.ensure(["AAA"], date(2024, 3, 1), date(2024, 3, 8), service, today=date(2024, 3, 8))
+
+        assert not store.has_month("AAA", date(2024, 3, 1))
+        assert store.read_month("AAA", date(2024, 3, 1)) is not None
+        assert service.requests[0][1] == service.requests[-2][1]  # Refetched from the month start
+
+    @pytest.mark.asyncio
+    async def test_days_split_on_eastern_time_across_dst(self, store):
+        await store.ensure(["AAA"], date(2024, 3, 7), date(2024, 3, 12), MinuteBarService(), today=date(2024, 6, 1))
+
+        chunks = list(store.iter_days("AAA", date(2024, 3, 7), date(2024, 3, 12)))
+
+        assert [c.day for c in chunks] == [date(2024, 3, 7), date(2024, 3, 8), date(2024, 3, 11), date(2024, 3, 12)]
+        for chunk in chunks:
+            assert len(chunk) == 16 * 60
+            assert chunk.minute_of_day[0] == 4 * 60
+            assert chunk.minute_of_day[-1] == 20 * 60 - 1
+
+
+class TestStreaming:
+    """Test bounded lookback and lazy reads"""
+
+    def test_rolling_window_keeps_last_bars(self):
+        window = RollingWindow(5)
+        values = list(range(23))
+
+        for value in values:
+            window.append((value, value, value, float(value), value))
+
+        assert len(window) == 5
+        assert window.tail(3, 5).tolist() == values[-5:]
+        assert window.tail(3, 2).tolist() == values[-2:]
+        assert window._buffer.shape[1] == 10
+
+    @pytest.mark.asyncio
+    async def test_months_read_lazily(self, store, monkeypatch):
+        await store.ensure(["AAA", "BBB"], date(2024, 1, 2), date(2024, 3, 29), MinuteBarService(), today=date(2024, 6, 1))
+        reads = []
+        original = store.read_month
+        monkeypatch.setattr(store, "read_month", lambda s, m: reads.append((s, m)) or original(s, m))
+
+        days = iter_trading_days(store, ["AAA", "BBB"], date(2024, 1, 2), date(2024, 3, 29), IntradaySessionRules())
+        first = next(days)
+
+        assert first.day == date(2024, 1, 2)
+        assert sorted(reads) == [("AAA", date(2024, 1, 1)), ("BBB", date(2024, 1, 1))]
+        assert all(len(chunk) == 390 for chunk in first.chunks.values())
+
+
+class TestSessionRules:
+    """Test the simulated bot's intraday rules"""
+
+    def test_mode_rules(self):
+        scalp = IntradaySessionRules.for_mode(TradingMode.SCALP)
+        swing = IntradaySessionRules.for_mode(TradingMode.SWING, allow_extended_hours=True)
+
+        assert scalp.max_hold_minutes == 60 and scalp.flatten_at_close
+        assert not swing.flatten_at_close
+        assert scalp.in_session(np.array([569, 570, 959, 960])).tolist() == [False, True, True, False]
+        assert swing.in_session(np.array([240, 1199, 1200])).tolist() == [True, True, False]
+        assert scalp.can_enter(944) and not scalp.can_enter(945)
+
+    @pytest.mark.asyncio
+    async def test_intraday_run_respects_session(self, store):
+        engine = IntradayBacktestEngine(
+            strategy=SimpleRSIStrategy(rsi_period=7),
+            start_date=date(2024, 1, 8),
+            end_date=date(2024, 1, 19),
+            rules=IntradaySessionRules.for_mode(TradingMode.INTRADAY),
+            store=store,
+            data_service=MinuteBarService(),
+        )
+
+        result = await engine.run(["AAA", "BBBB"])
+
+        assert result.trades
+        assert result.bars_processed == 10 * 390
+        assert len(result.equity_curve) == 10 + 1
+        for trade in result.trades:
+            entry, exit_ = _et(trade.entry_time), _et(trade.exit_time)
+            assert entry.date() == exit_.date()
+            assert time(9, 30) <= entry.time() < time(15, 45)
+            assert exit_.time() < time(16)
+
+    @pytest.mark.asyncio
+    async def test_scalp_mode_limits_hold_time(self, store):
+        engine = IntradayBacktestEngine(
+            strategy=SimpleRSIStrategy(rsi_period=7, overbought=99),  # Rarely sells on RSI
+            start_date=date(2024, 1, 8),
+            end_date=date(2024, 1, 12),
+            rules=IntradaySessionRules.for_mode(TradingMode.SCALP),
+            store=store,
+            data_service=MinuteBarService(),
+        )
+
+        result = await engine.run(["AAA"])
+
+        held = [trade.exit_time - trade.entry_time for trade in result.trades]
+        assert held
+        assert max(held) == timedelta(minutes=60)
+
+
+class TestRunBacktest:
+    """Test routing from BacktestRequest"""
+
+    @pytest.mark.asyncio
+    async def test_minute_request_uses_intraday_engine(self, store, monkeypatch):
+        monkeypatch.setattr(minute_store, "get_minute_bar_store", lambda: store)
+        request = BacktestRequest(
+            symbols=["AAA"], start_date=date(2024, 1, 8), end_date=date(2024, 1, 9),
+            timeframe="1Min", trading_mode="scalp",
+        )
+
+        result = await run_backtest(request, data_service=MinuteBarService())
+
+        assert result.bars_processed == 2 * 390
+
+    @pytest.mark.asyncio
+    async def test_rejects_unknown_timeframe_and_mode(self):
+        request = BacktestRequest(symbols=["AAA"], start_date=date(2024, 1, 8), end_date=date(2024, 1, 9))
+
+        with pytest.raises(ValueError):
+            await run_backtest(request.model_copy(update={"timeframe": "5Min"}))
+        with pytest.raises(ValueError):
+            await run_backtest(request.model_copy(update={"timeframe": "1Min", "trading_mode": "hodl"}))
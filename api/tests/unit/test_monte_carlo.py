@@ -0,0 +1,119 @@
+"""
+Unit Tests for Vectorized Monte Carlo
+=====================================
+Tests the NumPy Monte Carlo simulation behind WalkForwardBacktester.run_monte_carlo.
+
+Tests cover:
+- Path metrics matching the per-trade Sharpe and drawdown helpers
+- Permutation, bootstrap, block bootstrap and return resampling
+- Reproducibility for a seed, independent of chunking workers
+- Bounded chunk sizes for large simulation counts
+
+Run with: pytest tests/unit/test_monte_carlo.py -v
+"""
+import random
+
+import numpy as np
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from services import monte_carlo
+from services.monte_carlo import MonteCarloMethod
+from services.walk_forward_backtester import WalkForwardBacktester
+
+
+def _trades(count=40, seed=1):
+    rng = random.Random(seed)
+    return [{"pnl": rng.gauss(50, 400)} for _ in range(count)]
+
+
+class TestPathMetrics:
+    """Test array metrics against the per-trade helpers"""
+
+    def test_matches_scalar_sharpe_and_drawdown(self):
+        backtester = WalkForwardBacktester()
+        trades = _trades()
+        rng = random.Random(2)
+        orderings = [rng.sample(trades, len(trades)) for _ in range(20)]
+
+        paths = np.array([[t["pnl"] for t in order] for order in orderings])
+        metrics = monte_carlo.path_metrics(paths, 10000)
+
+        for row, order in enumerate(orderings):
+            assert metrics.sharpes[row] == pytest.approx(backtester._calculate_sharpe_from_trades(order, 10000))
+            assert metrics.max_drawdowns[row] == pytest.approx(backtester._calculate_max_drawdown(order, 10000))
+            assert metrics.final_pnls[row] == pytest.approx(sum(t["pnl"] for t in order))
+
+    def test_return_paths_compound(self):
+        metrics = monte_carlo.return_path_metrics(np.array([[0.1, -0.5, 0.2]]), 1000)
+
+        assert metrics.final_pnls[0] == pytest.approx(1000 * 1.1 * 0.5 * 1.2 - 1000)
+        assert metrics.max_drawdowns[0] == pytest.approx(0.5)
+
+
+class TestMethods:
+    """Test each resampling method"""
+
+    def test_permutation_keeps_the_same_trades(self):
+        trades = _trades()
+        total = sum(t["pnl"] for t in trades)
+
+        distribution = monte_carlo.simulate([t["pnl"] for t in trades], 10000, 200, seed=1)
+
+        assert np.allclose(distribution.final_pnls, total)
+        assert distribution.sharpes.std() > 0
+
+    @pytest.mark.parametrize("method", list(MonteCarloMethod))
+    def test_methods_run_and_are_reproducible(self, method):
+        pnls = [t["pnl"] for t in _trades()]
+
+        first = monte_carlo.simulate(pnls, 10000, 500, method=method, seed=5)
+        second = monte_carlo.simulate(pnls, 10000, 500, method=method, seed=5)
+        other = monte_carlo.simulate(pnls, 10000, 500, method=method, seed=6)
+
+        assert len(first.sharpes) == 500
+        assert np.array_equal(first.sharpes, second.sharpes)
+        assert not np.array_equal(first.sharpes, other.sharpes)
+
+    def test_block_bootstrap_draws_consecutive_trades(self):
+        rng = np.random.default_rng(0)
+
+        indices = monte_carlo._resample_indices(rng, MonteCarloMethod.BLOCK_BOOTSTRAP, 50, 20, 5)
+
+        assert indices.shape == (50, 20)
+        steps = np.diff(indices, axis=1)[:, [0, 1, 2, 3]]
+        assert np.all((steps == 1) | (steps == -19))
+
+
+class TestChunking:
+    """Test bounded memory and worker independence"""
+
+    def test_chunks_respect_element_budget(self):
+        sizes = monte_carlo.chunk_sizes(100_000, 500)
+
+        assert sum(sizes) == 100_000
+        assert max(sizes) * 500 <= monte_carlo.MAX_CHUNK_ELEMENTS
+
+    def test_workers_do_not_change_results(self):
+        pnls = [t["pnl"] for t in _trades()]
+
+        serial = monte_carlo.simulate(pnls, 10000, 3000, method="bootstrap", seed=9, chunk_size=1000)
+        parallel = monte_carlo.simulate(pnls, 10000, 3000, method="bootstrap", seed=9, chunk_size=1000, workers=2)
+
+        assert np.array_equal(serial.sharpes, parallel.sharpes)
+        assert np.array_equal(serial.max_drawdowns, parallel.max_drawdowns)
+
+    def test_run_monte_carlo_result(self):
+        result = WalkForwardBacktester().run_monte_carlo(
+            _trades(), num_simulations=1000, method="block_bootstrap", seed=3
+        )
+
+        assert result.num_simulations == 1000
+        assert result.method == "block_bootstrap"
+        assert result.seed == 3
+        assert result.sharpe_5th_percentile <= result.median_sharpe <= result.sharpe_95th_percentile
+        assert 0 <= result.probability_profitable <= 100
+        assert result.worst_drawdown >= result.mean_max_drawdown
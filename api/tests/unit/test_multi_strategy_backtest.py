@@ -0,0 +1,159 @@
+"""
+Unit Tests for Multi-Strategy Backtests
+=======================================
+Tests BacktestEngine.run_variants running several strategy/parameter
+variants over one pass of shared data.
+
+Tests cover:
+- Each variant matching a separate single-strategy run, and the comparison table
+- Bars loaded once for all variants
+- Indicators shared between variants with the same parameters
+- The StrategyEngine-backed weighted_score strategy
+- Variant naming and validation
+
+Run with: pytest tests/unit/test_multi_strategy_backtest.py -v
+"""
+import math
+import random
+from datetime import date, timedelta
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from models.backtest import BacktestRequest, MultiBacktestRequest, StrategyVariant
+from services.backtesting.engine import create_strategy, run_backtest, run_multi_backtest
+from services.strategy_engine import StrategyEngine
+
+
+class CountingBarService:
+    """Deterministic daily bars that records every request"""
+
+    def __init__(self):
+        self.requests = []
+
+    async def get_bars(self, symbol, timeframe="1Day", limit=100, start=None, end=None):
+        self.requests.append(symbol)
+        bars = []
+        day = start
+        while day <= end and len(bars) < limit:
+            if day.weekday() < 5:
+                ordinal = day.toordinal()
+                rng = random.Random(f"{symbol}:{ordinal}")
+                close = 100 * (1 + 0.2 * math.sin(ordinal / 11 + len(symbol))) * (1 + rng.gauss(0, 0.015))
+                bars.append({
+                    "timestamp": day.replace(hour=0, minute=0, second=0, microsecond=0).isoformat(),
+                    "open": close, "high": close * 1.01, "low": close * 0.99,
+                    "close": close, "volume": rng.randint(800_000, 1_200_000),
+                })
+            day += timedelta(days=1)
+        return bars
+
+
+VARIANTS = [
+    StrategyVariant(strategy="simple_rsi", strategy_params={"oversold": 30, "overbought": 70}),
+    StrategyVariant(strategy="simple_rsi", strategy_params={"oversold": 40, "overbought": 60}),
+    StrategyVariant(strategy="macd_crossover"),
+    StrategyVariant(name="weighted_55", strategy="weighted_score", strategy_params={"entry_threshold": 55}),
+    StrategyVariant(name="weighted_60", strategy="weighted_score", strategy_params={"entry_threshold": 60}),
+]
+
+REQUEST = MultiBacktestRequest(
+    symbols=["AAA", "BBBB"],
+    start_date=date(2021, 1, 4),
+    end_date=date(2021, 9, 30),
+    initial_capital=50000,
+    variants=VARIANTS,
+)
+
+
+def _comparable(result):
+    return result.model_dump(exclude={"run_time_seconds", "cache_status"})
+
+
+class TestRunVariants:
+    """Test one pass over shared data"""
+
+    @pytest.mark.asyncio
+    async def test_variants_match_separate_runs(self):
+        result = await run_multi_backtest(REQUEST, data_service=CountingBarService())
+
+        assert list(result.results) == ["simple_rsi#1", "simple_rsi#2", "macd_crossover", "weighted_55", "weighted_60"]
+        for variant, (name, variant_result) in zip(VARIANTS, result.results.items()):
+            single = await run_backtest(
+                BacktestRequest(
+                    symbols=REQUEST.symbols, start_date=REQUEST.start_date, end_date=REQUEST.end_date,
+                    initial_capital=REQUEST.initial_capital, strategy=variant.strategy,
+                    strategy_params=variant.strategy_params,
+                ),
+                data_service=CountingBarService(),
+                use_cache=False,
+            )
+            assert variant_result.trades, name
+            assert _comparable(variant_result) == _comparable(single), name
+
+        assert [row.name for row in result.comparison] == list(result.results)
+        assert result.best_variant == max(result.comparison, key=lambda row: row.sharpe_ratio).name
+        for row in result.comparison:
+            assert row.total_trades == result.results[row.name].metrics.total_trades
+            assert row.final_equity == result.results[row.name].final_equity
+
+    @pytest.mark.asyncio
+    async def test_bars_loaded_once_and_indicators_shared(self):
+        service = CountingBarService()
+
+        result = await run_multi_backtest(REQUEST, data_service=service)
+
+        assert sorted(service.requests) == ["AAA", "BBBB", "SPY"]
+        # Both RSI variants use period 14, both weighted variants the same lookback
+        assert result.indicators_reused > 0
+        assert result.indicators_reused >= result.indicators_computed / 2
+
+
+class TestValidation:
+    """Test variant naming and strategy validation"""
+
+    @pytest.mark.asyncio
+    async def test_duplicate_names_rejected(self):
+        request = REQUEST.model_copy(update={"variants": [
+            StrategyVariant(name="x", strategy="simple_rsi"),
+            StrategyVariant(name="x", strategy="macd_crossover"),
+        ]})
+
+        with pytest.raises(ValueError):
+            await run_multi_backtest(request, data_service=CountingBarService())
+
+    @pytest.mark.asyncio
+    async def test_unknown_strategy_rejected(self):
+        request = REQUEST.model_copy(update={"variants": [StrategyVariant(strategy="hodl")]})
+
+        with pytest.raises(ValueError):
+            await run_multi_backtest(request, data_service=CountingBarService())
+
+
+class TestWeightedScore:
+    """Test the StrategyEngine adapter"""
+
+    def test_split_scoring_matches_analyze(self):
+        engine = StrategyEngine(entry_threshold=60)
+        rng = random.Random(5)
+        prices = [100 * (1 + 0.1 * math.sin(i / 7)) + rng.gauss(0, 1) for i in range(120)]
+        highs = [p * 1.01 for p in prices]
+        lows = [p * 0.99 for p in prices]
+        volumes = [1_000_000] * len(prices)
+
+        direct = engine.analyze("AAA", prices, highs, lows, volumes)
+        split = engine.signal_from_indicators(
+            "AAA", engine.calculate_indicators(prices, highs, lows, volumes), prices[-1],
+        )
+
+        assert split == direct
+
+    def test_params_reported(self):
+        strategy = create_strategy("weighted_score", {"entry_threshold": 65})
+
+        assert strategy.params["entry_threshold"] == 65
+        assert strategy.params["weights"] == strategy.engine.weights
+        assert strategy.lookback_periods == 200
@@ -0,0 +1,218 @@
+"""
+Unit Tests for Online Performance Metrics
+========================================
+Tests the O(1)-per-update metrics accumulator and the backtest and live
+metrics built on it.
+
+Tests cover:
+- Welford mean/variance and downside deviation matching full-list statistics
+- Running peak, drawdown, streaks and profit factor
+- Snapshots staying fixed while the accumulator keeps updating
+- PerformanceMetrics from a portfolio's accumulator matching a rebuilt one
+- WalkForwardBacktester and PerformanceTracker trade statistics
+
+Run with: pytest tests/unit/test_online_metrics.py -v
+"""
+import math
+import random
+import statistics
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from models.backtest import Signal
+from services.backtesting.metrics import PerformanceMetrics
+from services.backtesting.online_metrics import OnlineMetrics, RunningStats
+from services.backtesting.portfolio import SimulatedPortfolio
+from services.performance_tracker import PerformanceTracker
+from services.walk_forward_backtester import WalkForwardBacktester
+
+PNLS = [120.0, -40.0, -35.5, 0.0, 210.0, 15.0, -300.0, 80.0, 80.0, -10.0, 55.0]
+
+
+def equity_series(n=300, seed=1):
+    rng = random.Random(seed)
+    equity, values = 10000.0, []
+    for _ in range(n):
+        equity *= 1 + rng.gauss(0.0005, 0.01)
+        values.append(equity)
+    return values
+
+
+class TestRunningStats:
+    """Test running statistics against full-list calculations"""
+
+    def test_matches_statistics_module(self):
+        rng = random.Random(3)
+        values = [rng.gauss(0, 1) * (i % 7) for i in range(500)]
+        stats = RunningStats()
+        for value in values:
+            stats.add(value)
+
+        negatives = [v for v in values if v < 0]
+        assert stats.count == 500
+        assert stats.mean == pytest.approx(statistics.mean(values))
+        assert stats.std() == pytest.approx(statistics.stdev(values))
+        assert stats.std(ddof=0) == pytest.approx(statistics.pstdev(values))
+        assert stats.downside_deviation == pytest.approx(math.sqrt(statistics.mean([v * v for v in negatives])))
+
+    def test_undefined_ratios(self):
+        stats = RunningStats()
+        assert stats.sharpe_ratio() is None and stats.sortino_ratio() is None
+
+        stats.add(0.01)
+        assert stats.sharpe_ratio() is None  # One sample has no sample deviation
+        stats.add(0.02)
+        assert stats.sharpe_ratio() > 0
+        assert stats.sortino_ratio() == float('inf')  # No negative returns
+
+
+class TestOnlineMetrics:
+    """Test equity and trade accumulation"""
+
+    def test_drawdown_and_returns(self):
+        values = equity_series()
+        metrics = OnlineMetrics()
+        for value in values:
+            metrics.add_equity(value)
+        snapshot = metrics.snapshot()
+
+        peak, max_dd = values[0], 0
+        for value in values:
+            peak = max(peak, value)
+            max_dd = max(max_dd, (peak - value) / peak * 100)
+        returns = [(b - a) / a for a, b in zip(values, values[1:])]
+
+        assert snapshot.max_drawdown_pct == pytest.approx(max_dd)
+        assert snapshot.peak_equity == max(values)
+        assert snapshot.current_drawdown_pct == pytest.approx((max(values) - values[-1]) / max(values) * 100)
+        assert snapshot.returns.count == len(returns)
+        expected = statistics.mean(returns) / statistics.stdev(returns) * math.sqrt(252)
+        assert snapshot.sharpe_ratio() == pytest.approx(expected)
+
+    def test_trade_stats(self):
+        metrics = OnlineMetrics()
+        for pnl in PNLS:
+            metrics.add_trade(pnl)
+        snapshot = metrics.snapshot()
+
+        wins = [p for p in PNLS if p > 0]
+        losses = [p for p in PNLS if p < 0]
+        assert (snapshot.total_trades, snapshot.winning_trades, snapshot.losing_trades) == (11, 6, 4)
+        assert snapshot.win_rate == pytest.approx(6 / 11)
+        assert snapshot.profit_factor == pytest.approx(sum(wins) / -sum(losses))
+        assert snapshot.avg_loss == pytest.approx(statistics.mean(losses))
+        assert (snapshot.best_trade, snapshot.worst_trade) == (210.0, -300.0)
+        # Breakeven trades extend losing streaks
+        assert (snapshot.max_consecutive_wins, snapshot.max_consecutive_losses) == (2, 3)
+        assert (snapshot.consecutive_wins, snapshot.consecutive_losses) == (1, 0)
+
+    def test_snapshot_is_a_copy(self):
+        metrics = OnlineMetrics(initial_equity=100)
+        metrics.add_equity(110)
+        metrics.add_equity(104)
+        snapshot = metrics.snapshot()
+
+        metrics.add_equity(50)
+        metrics.add_trade(-54)
+
+        assert snapshot.returns.count == 2 and snapshot.total_trades == 0
+        assert snapshot.max_drawdown == pytest.approx(6)
+        assert metrics.snapshot().max_drawdown == pytest.approx(60)
+
+
+class TestBacktestMetrics:
+    """Test the backtesters' metrics built on the accumulator"""
+
+    def test_portfolio_accumulator_matches_rebuilt(self):
+        portfolio = SimulatedPortfolio(initial_capital=10000)
+        start = datetime(2024, 1, 1)
+        prices = [100 * (1 + 0.05 * math.sin(i / 5)) for i in range(120)]
+        for i, price in enumerate(prices):
+            timestamp = start + timedelta(days=i)
+            portfolio.update_prices({"AAA": SimpleNamespace(close=price)})
+            if i % 10 == 0:
+                portfolio.execute(Signal(symbol="AAA", action="BUY", timestamp=timestamp, reason="test"), price)
+            elif i % 10 == 6:
+                portfolio.execute(Signal(symbol="AAA", action="SELL", timestamp=timestamp, reason="test"), price)
+            portfolio.record_equity(timestamp)
+
+        live = PerformanceMetrics.calculate(
+            portfolio.trades, portfolio.equity_curve, 10000, online=portfolio.metrics,
+        )
+        rebuilt = PerformanceMetrics.calculate(portfolio.trades, portfolio.equity_curve, 10000)
+
+        assert live == rebuilt
+        assert live.total_trades == 12
+        assert live.max_drawdown_pct > 0 and live.sharpe_ratio != 0
+
+    def test_walk_forward_trade_metrics(self):
+        trades = [{"pnl": pnl} for pnl in PNLS]
+        backtester = WalkForwardBacktester()
+
+        equity, curve = 10000.0, [10000.0]
+        for pnl in PNLS:
+            equity += pnl
+            curve.append(equity)
+        returns = [(b - a) / a for a, b in zip(curve, curve[1:])]
+        peak, max_dd = curve[0], 0
+        for value in curve:
+            peak = max(peak, value)
+            max_dd = max(max_dd, (peak - value) / peak)
+
+        sharpe = (statistics.mean(returns) * 252) / (statistics.stdev(returns) * math.sqrt(252))
+        assert backtester._calculate_sharpe_from_trades(trades, 10000) == pytest.approx(sharpe)
+        assert backtester._calculate_max_drawdown(trades, 10000) == pytest.approx(max_dd)
+        assert backtester._calculate_sharpe_from_trades([], 10000) == 0
+
+
+class TestPerformanceTracker:
+    """Test live metrics from closed trades"""
+
+    def make_trades(self):
+        start = datetime(2024, 3, 1, 10)
+        trades = []
+        for i, pnl in enumerate(PNLS):
+            exit_time = start + timedelta(days=i // 2, hours=i % 2)  # Two trades a day
+            trades.append(SimpleNamespace(
+                profit_loss=pnl, entry_price=50.0, quantity=10, trade_type="SWING" if i % 3 else "LONG_TERM",
+                entry_time=exit_time - timedelta(hours=4), exit_time=exit_time,
+            ))
+        return trades
+
+    def test_metrics_from_trades(self):
+        trades = self.make_trades()
+
+        metrics = PerformanceTracker(db=object())._metrics_from_trades(trades, 30)
+
+        daily = {}
+        for t in trades:
+            daily[t.exit_time.date()] = daily.get(t.exit_time.date(), 0) + t.profit_loss
+        days = list(daily.values())
+        sharpe = (statistics.mean(days) - 0.05 / 252) / statistics.stdev(days) * 252 ** 0.5
+        cumulative, peak, max_dd = 0, 0, 0
+        for pnl in PNLS:
+            cumulative += pnl
+            peak = max(peak, cumulative)
+            max_dd = max(max_dd, peak - cumulative)
+
+        assert metrics.total_trades == 11 and metrics.losing_trades == 4
+        assert metrics.total_pnl == pytest.approx(sum(PNLS))
+        assert metrics.sharpe_ratio == round(sharpe, 2)
+        assert metrics.max_drawdown == pytest.approx(max_dd)
+        assert metrics.max_drawdown_pct == pytest.approx(max_dd / peak * 100)
+        assert metrics.current_drawdown_pct == round((peak - cumulative) / peak * 100, 2)
+        assert metrics.swing_trades + metrics.longterm_trades == 11
+        assert metrics.avg_trade_duration_hours == pytest.approx(4)
+        assert (metrics.max_consecutive_wins, metrics.max_consecutive_losses) == (2, 3)
+
+    def test_too_few_trading_days(self):
+        metrics = PerformanceTracker(db=object())._metrics_from_trades(self.make_trades()[:6], 30)
+
+        assert metrics.total_trades == 6
+        assert metrics.sharpe_ratio is None and metrics.sortino_ratio is None  # Only 3 days
@@ -0,0 +1,333 @@
+"""
+Unit Tests for the Order Fill Simulator
+=======================================
+Tests OrderSimulator filling bracket, OCO, trailing-stop, stop and limit
+orders against bar OHLC.
+
+Tests cover:
+- Intrabar path assumptions deciding which of a stop and target fills
+- Gaps through resting levels filling at the open
+- Bracket legs activating mid-bar and OCO siblings cancelling
+- Held orders waiting for release
+- Replaced orders keeping their bracket and OCO links
+- Trailing stops following the high-water mark
+- Slippage on stop fills but not on limit fills
+- Partial fills capped by bar volume, with OCO siblings shrinking
+- Thousands of resting orders filled in price order, cancels skipped
+- The working-order index and buy totals kept as orders change
+- Walk-forward stops/targets filled intrabar when enabled
+
+Run with: pytest tests/unit/test_order_simulator.py -v
+"""
+import random
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from services.backtesting.order_simulator import IntrabarPath, OrderSimulator, OrderStatus, OrderType
+from services.backtesting.slippage import SlippageConfig, SlippageModel
+from services.walk_forward_backtester import WalkForwardBacktester, task_rng
+
+FIXED_SLIPPAGE = SlippageConfig(model=SlippageModel.FIXED, fixed_slippage_pct=0.001)
+
+
+class TestIntrabarPath:
+    """Test which level a bar reaches first"""
+
+    @pytest.mark.parametrize("path,open_,close,expected", [
+        (IntrabarPath.OHLC, 100, 100, "take_profit"),
+        (IntrabarPath.OLHC, 100, 100, "stop_loss"),
+        (IntrabarPath.BAR_DIRECTION, 99, 104, "stop_loss"),    # Up bar: low first
+        (IntrabarPath.BAR_DIRECTION, 104, 99, "take_profit"),  # Down bar: high first
+        (IntrabarPath.NEAREST_FIRST, 103, 100, "take_profit"),
+    ])
+    def test_stop_or_target_first(self, path, open_, close, expected):
+        simulator = OrderSimulator(path=path)
+        simulator.submit_oco_order("AAA", 10, stop_loss_price=96, take_profit_price=105)
+
+        fills = simulator.process_bar("AAA", open_, 106, 95, close)
+
+        assert [fill.tag for fill in fills] == [expected]
+        assert fills[0].price == (105 if expected == "take_profit" else 96)
+        assert not simulator.get_open_orders()
+
+    def test_gap_fills_at_the_open(self):
+        simulator = OrderSimulator()
+        stop = simulator.submit_order("AAA", 10, "sell", OrderType.STOP, stop_price=96)
+        limit = simulator.submit_order("AAA", 10, "buy", OrderType.LIMIT, limit_price=97)
+
+        fills = simulator.process_bar("AAA", 90, 92, 89, 91)
+
+        assert {fill.order_id: fill.price for fill in fills} == {stop.order_id: 90, limit.order_id: 90}
+
+
+class TestBracketAndOCO:
+    """Test linked orders"""
+
+    def test_bracket_legs_fill_in_the_entry_bar(self):
+        simulator = OrderSimulator(path=IntrabarPath.OHLC)
+        bracket = simulator.submit_bracket_order(
+            "AAA", 10, "buy", stop_loss_price=95, take_profit_price=110, limit_price=98,
+        )
+
+        assert bracket.stop_loss.status == OrderStatus.HELD
+        fills = simulator.process_bar("AAA", 100, 101, 94, 96)  # Down to 98, then on to 94
+
+        assert [(fill.tag, fill.price) for fill in fills] == [("entry", 98), ("stop_loss", 95)]
+        assert bracket.take_profit.status == OrderStatus.CANCELLED
+
+    def test_market_bracket_enters_at_next_open(self):
+        simulator = OrderSimulator()
+        bracket = simulator.submit_bracket_order("AAA", 5, "sell", stop_loss_price=105, take_profit_price=95)
+
+        first = simulator.process_bar("AAA", 100, 102, 99, 101)
+        second = simulator.process_bar("AAA", 101, 101, 94, 95)
+
+        assert [(fill.tag, fill.price) for fill in first] == [("entry", 100)]
+        assert [(fill.tag, fill.side, fill.price) for fill in second] == [("take_profit", "buy", 95)]
+        assert bracket.stop_loss.status == OrderStatus.CANCELLED
+
+    def test_cancel_entry_cancels_legs(self):
+        simulator = OrderSimulator()
+        bracket = simulator.submit_bracket_order("AAA", 5, "buy", 95, 110, limit_price=90)
+
+        assert simulator.cancel_order(bracket.entry.order_id)
+        assert simulator.process_bar("AAA", 100, 100, 80, 85) == []
+        assert bracket.take_profit.status == bracket.stop_loss.status == OrderStatus.CANCELLED
+
+    def test_held_bracket_waits_for_release(self):
+        simulator = OrderSimulator()
+        bracket = simulator.submit_bracket_order("AAA", 5, "buy", 95, 110, held=True)
+
+        assert simulator.process_bar("AAA", 100, 101, 99, 100) == []
+        assert not simulator.release_order(bracket.stop_loss.order_id)  # Legs follow their entry
+        assert simulator.release_order(bracket.entry.order_id)
+        fills = simulator.process_bar("AAA", 102, 111, 101, 110)
+
+        assert [(fill.tag, fill.price) for fill in fills] == [("entry", 102), ("take_profit", 110)]
+
+    def test_replaced_leg_keeps_its_links(self):
+        simulator = OrderSimulator(path=IntrabarPath.OHLC)
+        bracket = simulator.submit_bracket_order("AAA", 10, "buy", 95, 110, limit_price=98)
+        entry = simulator.replace_order(bracket.entry.order_id, limit_price=99)
+        stop = simulator.replace_order(bracket.stop_loss.order_id, stop_price=97)
+
+        assert bracket.entry.status == bracket.stop_loss.status == OrderStatus.REPLACED
+        assert stop.status == OrderStatus.HELD  # Still waiting on the (replaced) entry
+        fills = simulator.process_bar("AAA", 100, 101, 96, 96.5)
+
+        assert [(fill.order_id, fill.price) for fill in fills] == [(entry.order_id, 99), (stop.order_id, 97)]
+        assert bracket.take_profit.status == OrderStatus.CANCELLED
+        assert simulator.replace_order(stop.order_id, stop_price=90) is None  # Already filled
+
+
+class TestTrailingStop:
+    """Test trailing stops following price"""
+
+    def test_trails_the_high(self):
+        simulator = OrderSimulator()
+        simulator.process_bar("AAA", 100, 100, 100, 100)
+        order = simulator.submit_trailing_stop_order("AAA", 10, trail_percent=0.05)
+
+        assert simulator.process_bar("AAA", 100, 120, 115, 118) == []
+        assert simulator.get_order(order.order_id).level == pytest.approx(114)
+        fills = simulator.process_bar("AAA", 117, 118, 110, 111)
+
+        assert [fill.price for fill in fills] == [pytest.approx(114)]
+        assert order.extreme == 120
+
+    def test_trail_price_for_short_cover(self):
+        simulator = OrderSimulator()
+        simulator.process_bar("AAA", 50, 50, 50, 50)
+        simulator.submit_trailing_stop_order("AAA", 10, trail_price=2, side="buy")
+
+        simulator.process_bar("AAA", 50, 50, 45, 46)
+        fills = simulator.process_bar("AAA", 46, 48, 46, 47)
+
+        assert [(fill.side, fill.price) for fill in fills] == [("buy", 47)]
+
+
+class TestSlippage:
+    """Test slippage applies to stop/market fills only"""
+
+    def test_stop_pays_slippage_limit_does_not(self):
+        simulator = OrderSimulator(FIXED_SLIPPAGE, path=IntrabarPath.OHLC)
+        simulator.submit_order("AAA", 10, "sell", OrderType.LIMIT, limit_price=105)
+        simulator.submit_order("AAA", 10, "sell", OrderType.STOP, stop_price=96)
+
+        limit, stop = simulator.process_bar("AAA", 100, 106, 95, 100)
+
+        assert limit.price == 105 and limit.slippage_pct == 0
+        assert stop.trigger_price == 96
+        assert stop.price == pytest.approx(96 * (1 - 0.001))
+
+
+class TestManyOrders:
+    """Test large books of resting orders"""
+
+    def test_thousands_of_orders_fill_in_price_order(self):
+        rng = random.Random(7)
+        simulator = OrderSimulator(path=IntrabarPath.OHLC)
+        stops = [simulator.submit_order("AAA", 1, "sell", OrderType.STOP, stop_price=rng.uniform(80, 100))
+                 for _ in range(3000)]
+        limits = [simulator.submit_order("AAA", 1, "sell", OrderType.LIMIT, limit_price=rng.uniform(100, 120))
+                  for _ in range(3000)]
+        cancelled = {order.order_id for order in stops[::3]}
+        for order_id in cancelled:
+            simulator.cancel_order(order_id)
+
+        fills = simulator.process_bar("AAA", 100, 110, 90, 95)
+
+        limit_prices = [fill.price for fill in fills if fill.order_type == OrderType.LIMIT]
+        stop_prices = [fill.price for fill in fills if fill.order_type == OrderType.STOP]
+        assert limit_prices == sorted(limit_prices)
+        assert stop_prices == sorted(stop_prices, reverse=True)
+        assert len(limit_prices) == sum(order.limit_price <= 110 for order in limits)
+        assert len(stop_prices) == sum(order.stop_price >= 90 and order.order_id not in cancelled for order in stops)
+        assert not cancelled & {fill.order_id for fill in fills}
+        # Limits (high first) all fill before any stop
+        assert fills[len(limit_prices) - 1].order_type == OrderType.LIMIT
+
+    def test_working_index_and_buy_totals(self):
+        rng = random.Random(3)
+        simulator = OrderSimulator(max_volume_fraction=0.2)
+        orders = []
+        for _ in range(500):
+            symbol = rng.choice(("AAA", "BBB"))
+            kind = rng.random()
+            if kind < 0.4:
+                orders.append(simulator.submit_order(symbol, rng.randint(1, 50), "buy", OrderType.LIMIT,
+                                                     limit_price=rng.uniform(95, 100)))
+            elif kind < 0.6:
+                orders.append(simulator.submit_order(symbol, rng.randint(1, 50), "buy", OrderType.MARKET,
+                                                     held=rng.random() < 0.5))
+            elif kind < 0.8:
+                orders.append(simulator.submit_bracket_order(symbol, rng.randint(1, 50), "buy", 90, 110).entry)
+            else:
+                orders.extend(simulator.submit_oco_order(symbol, rng.randint(1, 50), 92, 108))
+        for order in rng.sample(orders, 100):
+            simulator.cancel_order(order.order_id)
+        for _ in range(20):
+            for symbol in ("AAA", "BBB"):
+                simulator.process_bar(symbol, 100, 101, 96, 98, volume=rng.randint(10, 500))
+
+        working = simulator.working_orders()
+        assert {order.order_id for order in working} == {
+            order.order_id for order in simulator.orders.values()
+            if order.status == OrderStatus.OPEN or (order.status == OrderStatus.HELD and order.parent_id is None)
+        }
+        notional, unpriced = simulator.working_buy_totals()
+        buys = [order for order in working if order.side == "buy"]
+        assert notional == pytest.approx(sum(o.remaining * o.limit_price for o in buys if o.limit_price))
+        for symbol in ("AAA", "BBB"):
+            assert unpriced[symbol] == pytest.approx(
+                sum(o.remaining for o in buys if o.limit_price is None and o.symbol == symbol), abs=1e-6,
+            )
+
+
+class TestPartialFills:
+    """Test fills capped at a share of bar volume"""
+
+    def test_limit_fills_over_several_bars(self):
+        simulator = OrderSimulator(max_volume_fraction=0.1)
+        order = simulator.submit_order("AAA", 150, "buy", OrderType.LIMIT, limit_price=99)
+
+        first = simulator.process_bar("AAA", 100, 100, 98, 99, volume=1000)
+        second = simulator.process_bar("AAA", 100, 102, 100, 101, volume=1000)  # Above the limit
+        assert [fill.quantity for fill in first] == [100]
+        assert not second and order.status == OrderStatus.OPEN
+
+        third = simulator.process_bar("AAA", 101, 101, 98, 99, volume=1000)
+
+        assert [(fill.quantity, fill.price) for fill in third] == [(50, 99)]
+        assert order.status == OrderStatus.FILLED
+        assert order.filled_quantity == 150
+
+    def test_triggered_stop_fills_the_rest_at_the_next_open(self):
+        simulator = OrderSimulator(max_volume_fraction=0.5)
+        order = simulator.submit_order("AAA", 100, "sell", OrderType.STOP, stop_price=95)
+
+        simulator.process_bar("AAA", 100, 100, 94, 96, volume=100)
+        assert order.status == OrderStatus.OPEN and order.filled_quantity == 50
+
+        fills = simulator.process_bar("AAA", 110, 111, 109, 110, volume=1000)  # Back above the stop
+
+        assert [(fill.quantity, fill.price) for fill in fills] == [(50, 110)]
+        assert order.status == OrderStatus.FILLED
+        assert order.filled_price == pytest.approx((95 * 50 + 110 * 50) / 100)
+
+    def test_oco_sibling_covers_what_is_left(self):
+        simulator = OrderSimulator(max_volume_fraction=0.1)
+        take_profit, stop_loss = simulator.submit_oco_order("AAA", 100, stop_loss_price=95, take_profit_price=105)
+
+        simulator.process_bar("AAA", 100, 106, 100, 104, volume=300)
+        assert take_profit.filled_quantity == 30 and stop_loss.quantity == 70
+
+        fills = simulator.process_bar("AAA", 96, 96, 90, 91, volume=10000)
+
+        assert [(fill.tag, fill.quantity) for fill in fills] == [("stop_loss", 70)]
+        assert take_profit.status == OrderStatus.CANCELLED
+        assert take_profit.filled_quantity + stop_loss.filled_quantity == 100
+
+    def test_bracket_legs_wait_for_the_whole_entry(self):
+        simulator = OrderSimulator(max_volume_fraction=0.5)
+        bracket = simulator.submit_bracket_order("AAA", 100, "buy", stop_loss_price=90, take_profit_price=110)
+
+        simulator.process_bar("AAA", 100, 101, 99, 100, volume=100)
+        assert bracket.entry.filled_quantity == 50
+        assert bracket.take_profit.status == OrderStatus.HELD
+
+        simulator.process_bar("AAA", 100, 101, 99, 100, volume=100)
+
+        assert bracket.entry.status == OrderStatus.FILLED
+        assert bracket.take_profit.status == OrderStatus.OPEN and bracket.take_profit.quantity == 100
+
+    def test_no_volume_means_no_cap(self):
+        simulator = OrderSimulator(max_volume_fraction=0.01)
+        simulator.submit_order("AAA", 1000, "buy", OrderType.MARKET)
+
+        fills = simulator.process_bar("AAA", 100, 101, 99, 100)
+
+        assert [fill.quantity for fill in fills] == [1000]
+
+
+class TestWalkForwardExits:
+    """Test WalkForwardBacktester stops/targets filled against bar ranges"""
+
+    @staticmethod
+    def _bars(num_bars=400, seed=3):
+        rng = random.Random(seed)
+        price, opens, highs, lows, closes = 100.0, [], [], [], []
+        for _ in range(num_bars):
+            open_ = price
+            price *= 1 + rng.gauss(0, 0.02)
+            opens.append(open_)
+            highs.append(max(open_, price) * (1 + abs(rng.gauss(0, 0.01))))
+            lows.append(min(open_, price) * (1 - abs(rng.gauss(0, 0.01))))
+            closes.append(price)
+        return opens, highs, lows, closes
+
+    def test_exits_fill_at_stop_and_target_levels(self):
+        backtester = WalkForwardBacktester()
+        backtester.set_slippage_config(FIXED_SLIPPAGE)
+        backtester.intrabar_exits = IntrabarPath.BAR_DIRECTION
+        opens, highs, lows, closes = self._bars()
+        params = {"rsi_period": 14, "rsi_oversold": 40, "rsi_overbought": 60,
+                  "stop_loss_pct": 0.03, "take_profit_pct": 0.04}
+
+        result = backtester._run_single_backtest(
+            opens, highs, lows, closes, [1_000_000] * len(closes), None,
+            WalkForwardBacktester.rsi_strategy, params, 10000, rng=task_rng(1, "x"),
+        )
+
+        long_stops = [t for t in result["trades"] if t["side"] == "long" and t["exit_reason"] == "stop_loss"]
+        long_targets = [t for t in result["trades"] if t["side"] == "long" and t["exit_reason"] == "take_profit"]
+        assert long_stops and long_targets
+        for trade in long_targets:
+            assert trade["exit_price"] >= trade["entry_price"] * 1.04 - 1e-9
+            assert trade["slippage_cost"] == 0
+        for trade in long_stops:
+            assert trade["exit_price"] <= trade["entry_price"] * 0.97 * (1 - 0.001) + 1e-9
@@ -0,0 +1,153 @@
+"""
+Unit Tests for the Parallel Walk-Forward Optimizer
+==================================================
+Tests the process-pool walk-forward of WalkForwardBacktester: whole
+windows per worker, or each window's grid split across workers.
+
+Tests cover:
+- Identical walk-forward results for 1 to 4 worker processes
+- Identical results for a search run serially and with windows in parallel
+- Reproducible slippage noise for a fixed seed
+- Progress reporting, including finished windows
+- Serial fallback for strategy functions that can't be pickled
+- Shared price block round-trip and lazy combination generation
+
+Run with: pytest tests/unit/test_parallel_optimizer.py -v
+"""
+import random
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from services.param_search import RandomSearch
+from services.parallel_optimizer import SharedPriceArrays
+from services.walk_forward_backtester import WalkForwardBacktester
+
+PARAM_RANGES = {
+    "rsi_period": [7, 14],
+    "rsi_oversold": [30, 35],
+    "rsi_overbought": [65, 70],
+    "stop_loss_pct": [0.02, 0.05],
+}
+
+
+def _prices(num_bars=600, seed=1):
+    rng = random.Random(seed)
+    price, closes = 100.0, []
+    for _ in range(num_bars):
+        price *= 1 + rng.gauss(0, 0.02)
+        closes.append(price)
+    return {
+        "opens": closes,
+        "highs": [c * 1.01 for c in closes],
+        "lows": [c * 0.99 for c in closes],
+        "closes": closes,
+        "volumes": [rng.randint(100_000, 2_000_000) for _ in closes],
+        "dates": [str(i) for i in range(num_bars)],
+    }
+
+
+def _run(workers, seed=7, strategy_func=WalkForwardBacktester.rsi_strategy, **kwargs):
+    return WalkForwardBacktester().run_walk_forward(
+        **_prices(),
+        strategy_func=strategy_func,
+        param_ranges=PARAM_RANGES,
+        num_windows=3,
+        workers=workers,
+        seed=seed,
+        **kwargs,
+    )
+
+
+def _summary(result):
+    return (
+        [(w.optimal_params, w.train_performance, w.test_performance, w.trades) for w in result.windows],
+        result.out_of_sample_sharpe,
+        result.total_slippage_cost,
+    )
+
+
+class TestDeterminism:
+    """Test results don't depend on the worker count"""
+
+    def test_same_result_for_any_worker_count(self):
+        serial = _run(workers=1)
+        assert serial.total_trades > 0
+
+        # 2 and 3 run whole windows per worker; 4 (> 3 windows) splits each grid
+        for workers in (2, 3, 4):
+            assert _summary(_run(workers=workers)) == _summary(serial)
+
+    def test_search_windows_run_in_parallel(self):
+        serial = _run(workers=1, search=RandomSearch(n_trials=6))
+
+        assert _summary(_run(workers=3, search=RandomSearch(n_trials=6))) == _summary(serial)
+
+    def test_seed_controls_slippage_noise(self):
+        assert _summary(_run(workers=1, seed=3)) == _summary(_run(workers=1, seed=3))
+        assert _run(workers=1, seed=3).seed == 3
+        assert _summary(_run(workers=1, seed=3)) != _summary(_run(workers=1, seed=4))
+
+
+class TestParallelOptimizer:
+    """Test progress reporting and fallbacks"""
+
+    def test_progress_reaches_total(self):
+        updates = []
+
+        _run(workers=2, progress_callback=lambda p: updates.append(p.to_dict()))
+
+        total = 3 * 16
+        assert updates[-1]["completed_tasks"] == total
+        assert updates[-1]["total_tasks"] == total
+        assert updates[-1]["percent"] == 100.0
+        completed = [u["completed_tasks"] for u in updates]
+        assert completed == sorted(completed)
+
+    def test_progress_lists_finished_windows(self):
+        updates = []
+
+        result = _run(workers=2, progress_callback=lambda p: updates.append(p.to_dict()))
+
+        assert [u["completed_windows"] for u in updates] == [1, 2, 3]
+        final = updates[-1]
+        assert final["total_windows"] == 3
+        assert [w["window"] for w in final["windows"]] == [0, 1, 2]
+        assert [w["test_sharpe"] for w in final["windows"]] == \
+               [round(w.test_performance, 3) for w in result.windows]
+        assert [w["trades"] for w in final["windows"]] == [len(w.trades) for w in result.windows]
+
+    def test_closure_strategy_runs_serially(self):
+        def closure_strategy(i, opens, highs, lows, closes, volumes, params):
+            return WalkForwardBacktester.rsi_strategy(i, opens, highs, lows, closes, volumes, params)
+
+        parallel = _run(workers=2, strategy_func=closure_strategy)
+
+        assert _summary(parallel) == _summary(_run(workers=1))
+
+    def test_shared_prices_round_trip(self):
+        prices = _prices(num_bars=50)
+        shared = SharedPriceArrays.create(
+            prices["opens"], prices["highs"], prices["lows"], prices["closes"], prices["volumes"], None
+        )
+        try:
+            attached = SharedPriceArrays.attach(shared.name, shared.num_bars, shared.has_atr)
+            opens, highs, lows, closes, volumes, atrs = attached.window(10, 20)
+            attached.close()
+        finally:
+            shared.close()
+
+        assert closes == prices["closes"][10:20]
+        assert volumes == prices["volumes"][10:20]
+        assert atrs is None
+
+    def test_combinations_are_generated_lazily_in_order(self):
+        backtester = WalkForwardBacktester()
+
+        limited = backtester._generate_param_combinations(backtester.param_ranges, limit=5)
+
+        assert len(limited) == 5
+        assert limited[0]["rsi_period"] == limited[4]["rsi_period"] == 7
+        assert [c["take_profit_pct"] for c in limited[:3]] == [0.04, 0.06, 0.10]
+        assert backtester._generate_param_combinations({}) == [{}]
@@ -0,0 +1,250 @@
+"""
+Unit Tests for Parameter Search Strategies
+==========================================
+Tests the grid, random, successive-halving and TPE searches and their use
+by WalkForwardBacktester and AutoOptimizer.
+
+Tests cover:
+- Grid order matching the previous Cartesian-product enumeration
+- Evaluation and time budgets stopping a search
+- Successive halving promoting the best candidates to longer data
+- TPE concentrating on good regions of strategy params and weight vectors
+- Walk-forward optimization with a search and budget, reproducible by seed
+- AutoOptimizer scoring its preset weights first, then searching
+
+Run with: pytest tests/unit/test_param_search.py -v
+"""
+import math
+import random
+import time
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from services import auto_optimizer
+from services.auto_optimizer import AutoOptimizer, MarketRegime, REGIME_WEIGHT_ADJUSTMENTS
+from services.param_search import (
+    GridSearch, RandomSearch, SearchBudget, SearchSpace, SuccessiveHalving, TPESearch, Uniform, create_search,
+)
+from services.backtesting.slippage import SlippageConfig, SlippageModel
+from services.strategy_engine import DEFAULT_WEIGHTS
+from services.walk_forward_backtester import WalkForwardBacktester, WalkForwardResult
+
+RANGES = {
+    "rsi_period": [7, 14, 21],
+    "rsi_oversold": [20, 25, 30, 35, 40],
+    "stop_loss_pct": [0.02, 0.03, 0.05],
+    "take_profit_pct": [0.04, 0.06, 0.10],
+}
+TARGET = {"rsi_period": 14, "rsi_oversold": 30, "stop_loss_pct": 0.03, "take_profit_pct": 0.06}
+
+
+PLANE = SearchSpace({"x": Uniform(0, 1), "y": Uniform(0, 1)})
+
+
+def plane_objective(params, fidelity):
+    """Noisier the shorter the data"""
+    noise = random.Random(f"{params}:{fidelity}").gauss(0, 0.1 * (1 - fidelity))
+    return params["x"] + params["y"] + noise
+
+
+def distance_objective(params, fidelity=1.0):
+    """Peaks at TARGET; each parameter's distance counted in grid steps"""
+    return -sum(abs(RANGES[name].index(params[name]) - RANGES[name].index(TARGET[name])) for name in RANGES)
+
+
+class TestGridSearch:
+    """Test the grid matches the previous enumeration"""
+
+    def test_order_and_limit_match_param_combinations(self):
+        seen = []
+        GridSearch(limit=40).search(
+            SearchSpace.from_ranges(RANGES), lambda params, fidelity: seen.append(params) or 0.0,
+        )
+
+        assert seen == WalkForwardBacktester()._generate_param_combinations(RANGES, limit=40)
+
+    def test_create_search_by_name(self):
+        assert isinstance(create_search("tpe", n_trials=5), TPESearch)
+        with pytest.raises(ValueError):
+            create_search("annealing")
+
+
+class TestBudget:
+    """Test budgets stop searches with the best result so far"""
+
+    def test_evaluation_budget(self):
+        result = RandomSearch(n_trials=500).search(
+            SearchSpace.from_ranges(RANGES), distance_objective, SearchBudget(max_evaluations=25),
+            rng=random.Random(1),
+        )
+
+        assert len(result.evaluations) <= 25 and result.cost <= 25
+        assert result.budget_exhausted
+        assert result.best_score == max(e.score for e in result.evaluations)
+
+    def test_time_budget(self):
+        def slow(params, fidelity):
+            time.sleep(0.02)
+            return distance_objective(params)
+
+        started = time.monotonic()
+        result = TPESearch(n_trials=1000).search(
+            SearchSpace.from_ranges(RANGES), slow, SearchBudget(max_seconds=0.3), rng=random.Random(1),
+        )
+
+        assert time.monotonic() - started < 0.3 + 0.05
+        assert result.budget_exhausted and 5 <= len(result.evaluations) <= 15
+
+
+class TestSuccessiveHalving:
+    """Test short-window evaluation and promotion"""
+
+    def test_survivors_promoted_to_full_data(self):
+        search = SuccessiveHalving(n_candidates=27, eta=3, min_fidelity=1 / 9)
+
+        result = search.search(PLANE, plane_objective, rng=random.Random(2))
+
+        rungs = {}
+        for evaluation in result.evaluations:
+            rungs.setdefault(evaluation.fidelity, []).append(evaluation)
+        fidelities = sorted(rungs)
+        assert fidelities == pytest.approx([1 / 9, 1 / 3, 1])
+        assert [len(rungs[f]) for f in fidelities] == [27, 9, 3]
+        assert result.best_fidelity == 1.0
+        # Promoted candidates are exactly the top third of the rung below
+        for lower, upper in zip(fidelities, fidelities[1:]):
+            top = sorted(rungs[lower], key=lambda e: e.score, reverse=True)[:len(rungs[upper])]
+            assert {tuple(e.params.items()) for e in top} == {tuple(e.params.items()) for e in rungs[upper]}
+        assert result.cost == pytest.approx(9)  # Each rung costs 27 * 1/9
+
+    def test_candidates_sized_to_budget(self):
+        search = SuccessiveHalving(eta=3, min_fidelity=1 / 9)
+
+        result = search.search(PLANE, plane_objective, SearchBudget(max_evaluations=6), rng=random.Random(3))
+
+        assert len([e for e in result.evaluations if e.fidelity == pytest.approx(1 / 9)]) == 18
+        assert result.cost <= 6 + 1e-9
+        assert not result.budget_exhausted
+
+
+class TestTPE:
+    """Test TPE beats random sampling on the same budget"""
+
+    def test_strategy_params(self):
+        space = SearchSpace.from_ranges(RANGES)
+        budget = SearchBudget(max_evaluations=30)
+
+        tpe = [TPESearch(n_startup=10).search(space, distance_objective, budget, rng=random.Random(s)).best_score
+               for s in range(5)]
+        rand = [RandomSearch().search(space, distance_objective, budget, rng=random.Random(s)).best_score
+                for s in range(5)]
+
+        assert sum(tpe) > sum(rand)
+
+    def test_weight_vectors(self):
+        target = {"momentum": 0.4, "mean_reversion": 0.05, "rsi": 0.3, "sma_crossover": 0.05,
+                  "bollinger": 0.1, "volume": 0.05, "macd": 0.05}
+        space = SearchSpace.weights(DEFAULT_WEIGHTS)
+
+        def objective(weights, fidelity):
+            assert sum(weights.values()) == pytest.approx(1, abs=0.01)
+            return -sum((weights[k] - target[k]) ** 2 for k in target)
+
+        result = TPESearch(n_trials=80, n_startup=15).search(
+            space, objective, rng=random.Random(4), initial=[DEFAULT_WEIGHTS],
+        )
+
+        assert result.evaluations[0].params == DEFAULT_WEIGHTS
+        assert result.best_score > objective(DEFAULT_WEIGHTS, 1.0)
+
+
+def _bars(num_bars=600, seed=5):
+    rng = random.Random(seed)
+    price, opens, highs, lows, closes = 100.0, [], [], [], []
+    for i in range(num_bars):
+        open_ = price
+        price *= 1 + 0.01 * math.sin(i / 9) + rng.gauss(0, 0.01)
+        opens.append(open_)
+        highs.append(max(open_, price) * 1.005)
+        lows.append(min(open_, price) * 0.995)
+        closes.append(price)
+    return opens, highs, lows, closes, [1_000_000] * num_bars, [""] * num_bars
+
+
+class TestWalkForwardSearch:
+    """Test run_walk_forward with a search strategy"""
+
+    RANGES = {"rsi_period": [7, 14, 21], "rsi_oversold": [25, 30, 35], "rsi_overbought": [65, 70, 75],
+              "stop_loss_pct": [0.02, 0.03, 0.05], "take_profit_pct": [0.04, 0.06, 0.10]}
+
+    def test_budget_and_reproducibility(self):
+        progress = []
+        backtester = WalkForwardBacktester()
+
+        result = backtester.run_walk_forward(
+            *_bars(), WalkForwardBacktester.rsi_strategy, param_ranges=self.RANGES,
+            num_windows=2, seed=11, search=SuccessiveHalving(min_fidelity=1 / 3),
+            search_budget=SearchBudget(max_evaluations=12),
+            progress_callback=lambda p: progress.append(p.completed_tasks),
+        )
+        again = WalkForwardBacktester().run_walk_forward(
+            *_bars(), WalkForwardBacktester.rsi_strategy, param_ranges=self.RANGES,
+            num_windows=2, seed=11, search=SuccessiveHalving(min_fidelity=1 / 3),
+            search_budget=SearchBudget(max_evaluations=12),
+        )
+
+        assert result.total_windows == 2
+        assert [w.optimal_params for w in result.windows] == [w.optimal_params for w in again.windows]
+        assert result.out_of_sample_sharpe == again.out_of_sample_sharpe
+        assert progress[-1] == backtester._optimization_progress.total_tasks
+        assert all(set(w.optimal_params) == set(self.RANGES) for w in result.windows)
+
+    def test_budget_alone_runs_the_grid(self):
+        def run(budget):
+            backtester = WalkForwardBacktester()
+            backtester.set_slippage_config(SlippageConfig(model=SlippageModel.FIXED))  # No noise
+            return backtester.run_walk_forward(
+                *_bars(), WalkForwardBacktester.rsi_strategy, param_ranges=self.RANGES,
+                num_windows=2, seed=11, search_budget=budget,
+            )
+
+        budgeted, grid = run(SearchBudget(max_evaluations=2 * 243)), run(None)
+
+        assert [w.optimal_params for w in budgeted.windows] == [w.optimal_params for w in grid.windows]
+        assert [w.train_performance for w in budgeted.windows] == [w.train_performance for w in grid.windows]
+
+
+class TestAutoOptimizerSearch:
+    """Test the auto-optimizer's weight search"""
+
+    @pytest.mark.asyncio
+    async def test_presets_first_then_search(self, monkeypatch):
+        monkeypatch.setattr(auto_optimizer, "get_alpaca_service", lambda: None)
+        optimizer = AutoOptimizer()
+        optimizer.weight_search = TPESearch(n_startup=5)
+        optimizer.search_budget = SearchBudget(max_evaluations=20)
+        optimizer.optimizer_workers = 1
+        tested = []
+
+        def fake_backtest(scorer, weights, fidelity=1.0):
+            tested.append(dict(weights))
+            sharpe = 3 * weights["rsi"] - weights["macd"]
+            return WalkForwardResult(
+                symbol="SPY", strategy="walk_forward", total_windows=4, in_sample_sharpe=sharpe,
+                out_of_sample_sharpe=sharpe, efficiency_ratio=1, total_return_pct=0, total_trades=10,
+                win_rate=50, profit_factor=1, max_drawdown_pct=0, avg_slippage_pct=0,
+                total_slippage_cost=0, robustness_score=60,
+            )
+        monkeypatch.setattr(optimizer, "_run_backtest_with_weights", fake_backtest)
+
+        weights, result = await optimizer._find_optimal_weights({"SPY": {}}, MarketRegime.BEAR_TRENDING)
+
+        # Current weights are the defaults here - scored once
+        assert tested[:2] == [DEFAULT_WEIGHTS, REGIME_WEIGHT_ADJUSTMENTS[MarketRegime.BEAR_TRENDING]]
+        assert len(tested) == 20
+        assert weights["rsi"] > REGIME_WEIGHT_ADJUSTMENTS[MarketRegime.BEAR_TRENDING]["rsi"]
+        assert result.out_of_sample_sharpe == pytest.approx(3 * weights["rsi"] - weights["macd"])
@@ -0,0 +1,224 @@
+"""
+Unit Tests for the Shared Price Matrix
+======================================
+Tests the memory-mapped price matrix and the readers built on it:
+DataLoader, the walk-forward backtester and the scan data context.
+
+Tests cover:
+- Publishing and reading bars as read-only views
+- Appends in place, rewrites to a new slot and rebuilds to a new generation,
+  with views handed out earlier left intact
+- Covered ranges merging (overlapping) or replacing (disjoint)
+- Reading from another process
+- DataLoader serving a second load from the matrix, identical to a plain load
+- Walk-forward results on matrix views identical to results on lists
+- Scan contexts in different processes sharing fetched bars while current
+
+Run with: pytest tests/unit/test_price_matrix.py -v
+"""
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from services.backtesting.data_loader import DataLoader, SharedBars
+from services.price_matrix import (
+    MIN_SLOTS, PriceMatrix, PriceMatrixService, get_price_matrix, reset_price_matrix,
+)
+from services.scan_context import SHARED_BARS_MAX_AGE_SECONDS, ScanDataContext
+from services.walk_forward_backtester import WalkForwardBacktester
+from tests.mocks.alpaca_mock import MockAlpacaService
+from tests.mocks.synthetic_bars import SyntheticBarService
+
+DAY_US = 86400 * 1_000_000
+
+
+def daily(count, first_day=0, price=100.0):
+    """(timestamps, values) for `count` daily bars"""
+    timestamps = (np.arange(count, dtype=np.int64) + first_day) * DAY_US
+    closes = price + np.arange(count, dtype=np.float64)
+    values = np.vstack([closes - 0.5, closes + 1, closes - 1, closes, np.full(count, 1000.0)])
+    return timestamps, values
+
+
+def api_bars(count, end=None):
+    """Bar dicts like the data API's: ISO UTC timestamps, the last one at `end`"""
+    end = end or datetime.now(timezone.utc).replace(microsecond=0)
+    return [
+        {
+            "timestamp": (end - timedelta(hours=count - 1 - i)).isoformat(),
+            "open": 100.0 + i, "high": 101.0 + i, "low": 99.0 + i, "close": 100.5 + i, "volume": 5000.0,
+        }
+        for i in range(count)
+    ]
+
+
+def _bar_calls(service: MockAlpacaService):
+    return [c for c in service.call_history if c["method"] == "get_bars"]
+
+
+class TestPriceMatrix:
+    """Test publishing and reading the shared arrays"""
+
+    def test_publish_and_read_views(self, tmp_path):
+        matrix = PriceMatrix(str(tmp_path), "1Day")
+        timestamps, values = daily(10)
+
+        matrix.publish("aaa", timestamps, values)
+        series = matrix.read("AAA")
+
+        assert len(series) == 10
+        assert series.closes.tolist() == values[3].tolist()
+        assert not series.closes.flags.writeable
+        assert series.datetimes[1] == datetime(1970, 1, 2)
+        assert series.tail(2).to_bars()[0]["timestamp"] == "1970-01-09T00:00:00"
+        assert matrix.read("BBB") is None
+
+    def test_append_in_place(self, tmp_path):
+        matrix = PriceMatrix(str(tmp_path), "1Day")
+        timestamps, values = daily(10)
+        first = matrix.publish("AAA", timestamps, values)
+
+        # The forming last bar updated, two more bars after it
+        timestamps, values = daily(3, first_day=9, price=200.0)
+        second = matrix.publish("AAA", timestamps, values)
+
+        assert matrix.appends == 1 and matrix.rebuilds == 1
+        assert second.version > first.version
+        assert len(second) == 12 and second.closes[9] == 200.0
+        assert len(first) == 10 and first.closes[8] == 108.0
+
+    def test_rewrites_and_rebuilds_keep_old_views(self, tmp_path):
+        matrix = PriceMatrix(str(tmp_path), "1Day")
+        timestamps, values = daily(10)
+        original = matrix.publish("AAA", timestamps, values)
+
+        corrected = values.copy()
+        corrected[3, 2] = 50.0
+        matrix.publish("AAA", timestamps, corrected)
+        assert matrix.slot_writes == 1
+        assert matrix.read("AAA").closes[2] == 50.0
+        assert original.closes[2] == 102.0
+
+        generation = matrix.version[0]
+        for i in range(MIN_SLOTS):
+            matrix.publish(f"S{i}", timestamps, values)
+
+        assert matrix.version[0] > generation
+        assert matrix.read("AAA").closes[2] == 50.0
+        assert original.closes[2] == 102.0
+        assert len(matrix.symbols()) == MIN_SLOTS + 1
+
+    def test_covered_ranges(self, tmp_path):
+        matrix = PriceMatrix(str(tmp_path), "1Day")
+        matrix.publish("AAA", *daily(10), covered_to=10 * DAY_US - 1)  # Through the end of day 9
+
+        touching = matrix.publish("AAA", *daily(5, first_day=10))
+        assert len(touching) == 15
+        assert touching.covers(0, 14 * DAY_US) and not touching.covers(0, 15 * DAY_US)
+
+        disjoint = matrix.publish("AAA", *daily(5, first_day=100))
+        assert disjoint.timestamps[0] == 100 * DAY_US and len(disjoint) == 5
+
+    def test_read_from_another_process(self, tmp_path):
+        matrix = PriceMatrix(str(tmp_path), "1Day")
+        timestamps, values = daily(50)
+        matrix.publish("AAA", timestamps, values)
+
+        with ProcessPoolExecutor(1, mp_context=mp.get_context("spawn")) as pool:
+            series = pool.submit(PriceMatrix(str(tmp_path), "1Day").read, "AAA").result()
+
+        assert series.closes.tolist() == values[3].tolist()
+
+    def test_disabled_without_a_directory(self, monkeypatch):
+        monkeypatch.delenv("PRICE_MATRIX_DIR", raising=False)
+        reset_price_matrix()
+
+        assert get_price_matrix() is None
+
+
+class TestDataLoader:
+    """Test backtest data loaded through the matrix"""
+
+    @pytest.mark.asyncio
+    async def test_second_load_served_from_matrix(self, tmp_path):
+        service = MockAlpacaService()
+        service.set_bars("AAA", api_bars(48, end=datetime(2024, 3, 5, 20, tzinfo=timezone.utc)))
+        start, end = date(2024, 3, 3), date(2024, 3, 5)
+
+        plain = await DataLoader(service, price_matrix=None).load(["AAA"], start, end)
+        await DataLoader(service, price_matrix=PriceMatrixService(str(tmp_path))).load(["AAA"], start, end)
+        calls = len(_bar_calls(service))
+        shared = await DataLoader(service, price_matrix=PriceMatrixService(str(tmp_path))).load(["AAA"], start, end)
+
+        assert len(_bar_calls(service)) == calls
+        symbol_data = shared.symbol_data["AAA"]
+        assert isinstance(symbol_data.bars, SharedBars)
+        assert list(symbol_data.bars) == plain.symbol_data["AAA"].bars
+        assert shared.timestamps == plain.timestamps
+        assert not symbol_data.array("close").flags.writeable
+
+    @pytest.mark.asyncio
+    async def test_walk_forward_on_views(self, tmp_path):
+        loader = DataLoader(SyntheticBarService(), price_matrix=PriceMatrixService(str(tmp_path)))
+        data = await loader.load(["AAA"], date(2019, 1, 1), date(2021, 12, 31))
+        symbol_data = data.symbol_data["AAA"]
+        columns = {name: symbol_data.array(name) for name in ("open", "high", "low", "close", "volume")}
+
+        def run(series, workers):
+            return asdict(WalkForwardBacktester().run_walk_forward(
+                opens=series["open"], highs=series["high"], lows=series["low"], closes=series["close"],
+                volumes=series["volume"], dates=[], strategy_func=WalkForwardBacktester.rsi_strategy,
+                param_ranges={"rsi_period": [10, 14], "oversold": [30], "overbought": [70]},
+                num_windows=3, workers=workers, seed=7,
+            ))
+
+        on_lists = run({name: column.tolist() for name, column in columns.items()}, 1)
+
+        assert run(columns, 1) == on_lists
+        assert run(columns, 2) == on_lists
+
+
+class TestScanDataContext:
+    """Test bot scan cycles sharing bars through the matrix"""
+
+    @pytest.mark.asyncio
+    async def test_other_process_reads_fetched_bars(self, tmp_path):
+        service = MockAlpacaService()
+        service.set_bars("AAPL", api_bars(120))
+
+        first = ScanDataContext(service, price_matrix=PriceMatrixService(str(tmp_path)))
+        fetched = await first.get_bars("AAPL", "1Hour", 100)
+        # Another worker process: its own mapping of the same files
+        second = ScanDataContext(service, price_matrix=PriceMatrixService(str(tmp_path)))
+        shared = await second.get_bars("AAPL", "1hour", 100)
+        smaller = await second.get_bars("AAPL", "1hour", 20)
+
+        assert shared == fetched
+        assert smaller == fetched[-20:]
+        assert len(_bar_calls(service)) == 1
+        assert second.get_stats()["shared_reads"] == 1
+        assert second.fetches_saved == 2
+
+    @pytest.mark.asyncio
+    async def test_stale_or_short_shared_bars_are_fetched(self, tmp_path):
+        service = MockAlpacaService()
+        service.set_bars("AAPL", api_bars(120))
+        await ScanDataContext(service, price_matrix=PriceMatrixService(str(tmp_path))).get_bars("AAPL", "1hour", 50)
+
+        later = ScanDataContext(service, price_matrix=PriceMatrixService(str(tmp_path)))
+        later.created_at += timedelta(seconds=SHARED_BARS_MAX_AGE_SECONDS + 5)
+        longer = ScanDataContext(service, price_matrix=PriceMatrixService(str(tmp_path)))
+
+        await later.get_bars("AAPL", "1hour", 50)
+        await longer.get_bars("AAPL", "1hour", 100)
+
+        assert len(_bar_calls(service)) == 3
+        assert later.shared_reads == longer.shared_reads == 0
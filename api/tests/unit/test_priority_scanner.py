@@ -0,0 +1,208 @@
+"""
+Unit Tests for the Priority Scanner
+===================================
+Tests the heap-based tiered scan scheduler.
+
+Tests cover:
+- Due-time ordering across tiers
+- Next scan times in the clock's timezone
+- Leasing popped symbols until the scan is recorded
+- Tier changes rescheduling symbols
+- HIGH tier demotion once the last signal has aged out
+- Activity metrics computed from bars
+- Unregistering symbols (lazy heap invalidation)
+
+Run with: pytest tests/unit/test_priority_scanner.py -v
+"""
+import pytest
+from datetime import datetime, timedelta, timezone
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from services.priority_scanner import PriorityScannerService, PriorityTier, compute_activity_metrics
+
+
+class FakeClock:
+    """Manually advanced clock"""
+
+    def __init__(self, tz=None):
+        self.now = datetime(2025, 1, 6, 10, 0, 0, tzinfo=tz)
+
+    def __call__(self) -> datetime:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += timedelta(seconds=seconds)
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def scanner(clock) -> PriorityScannerService:
+    return PriorityScannerService(clock=clock)
+
+
+class TestScheduling:
+    """Test due-time scheduling"""
+
+    def test_new_symbols_are_due_immediately(self, scanner):
+        scanner.register_symbols(["AAPL", "MSFT"])
+
+        assert sorted(scanner.get_symbols_to_scan()) == ["AAPL", "MSFT"]
+
+    def test_get_symbols_to_scan_does_not_consume(self, scanner):
+        scanner.register_symbols(["AAPL", "MSFT"])
+        scanner.get_symbols_to_scan()
+
+        assert len(scanner.get_symbols_to_scan()) == 2
+
+    def test_scanned_symbol_is_due_after_tier_interval(self, scanner, clock):
+        scanner.register_symbol("AAPL")
+        scanner.record_scan("AAPL")
+
+        clock.advance(29)
+        assert scanner.get_symbols_to_scan() == []
+        clock.advance(1)
+        assert scanner.get_symbols_to_scan() == ["AAPL"]
+
+    def test_high_tier_sorted_first(self, scanner):
+        scanner.register_symbol("SLOW", PriorityTier.LOW)
+        scanner.register_symbol("NORMAL", PriorityTier.STANDARD)
+        scanner.register_symbol("FAST", PriorityTier.HIGH)
+
+        assert scanner.get_symbols_to_scan() == ["FAST", "NORMAL", "SLOW"]
+        assert scanner.get_next_symbol_to_scan() == "FAST"
+
+    def test_pop_due_leases_symbols(self, scanner, clock):
+        scanner.register_symbols(["AAPL", "MSFT"])
+
+        assert len(scanner.pop_due_symbols()) == 2
+        assert scanner.pop_due_symbols() == []
+
+        # Lease expires after one tier interval even without record_scan
+        clock.advance(30)
+        assert len(scanner.pop_due_symbols()) == 2
+
+    def test_pop_due_respects_limit(self, scanner):
+        scanner.register_symbols([f"SYM{i}" for i in range(10)])
+
+        assert len(scanner.pop_due_symbols(limit=3)) == 3
+        assert len(scanner.pop_due_symbols()) == 7
+
+    def test_promotion_reschedules_sooner(self, scanner, clock):
+        scanner.register_symbol("AAPL")
+        scanner.record_scan("AAPL")
+        clock.advance(5)
+
+        scanner.record_signal("AAPL", "BUY", 80)
+
+        assert scanner.get_symbols_to_scan() == ["AAPL"]
+        assert scanner.get_tier_summary()["tier_distribution"]["high"] == 1
+
+    def test_metrics_update_changes_tier(self, scanner):
+        scanner.register_symbol("AAPL")
+        tier = scanner.update_symbol_metrics("AAPL", volume_ratio=3.0)
+
+        assert tier == PriorityTier.HIGH
+        assert "High volume" in scanner.get_symbol_priority("AAPL")["tier_change_reason"]
+
+    def test_unregister_drops_symbol(self, scanner):
+        scanner.register_symbols(["AAPL", "MSFT"])
+        scanner.unregister_symbol("AAPL")
+
+        assert scanner.pop_due_symbols() == ["MSFT"]
+        assert scanner.get_tier_summary()["total_symbols"] == 1
+
+    def test_aware_clock(self):
+        clock = FakeClock(tz=timezone(timedelta(hours=-5)))
+        scanner = PriorityScannerService(clock=clock)
+        scanner.register_symbol("AAPL")
+        scanner.record_scan("AAPL")
+
+        priority = scanner.get_symbol_priority("AAPL")
+        assert priority["next_scan_at"] == "2025-01-06T10:00:30-05:00"
+        assert priority["should_scan_now"] is False
+        clock.advance(30)
+        assert scanner.get_symbol_priority("AAPL")["should_scan_now"] is True
+
+    def test_seconds_until_next_due(self, scanner, clock):
+        assert scanner.seconds_until_next_due() is None
+        scanner.register_symbol("AAPL")
+        scanner.record_scan("AAPL")
+        clock.advance(10)
+
+        assert scanner.seconds_until_next_due() == pytest.approx(20)
+
+
+class TestDemotion:
+    """Test HIGH tier demotion"""
+
+    def test_inactive_high_symbol_is_demoted(self, scanner, clock):
+        scanner.register_symbol("AAPL", PriorityTier.HIGH)
+
+        clock.advance(29 * 60)
+        assert scanner.demote_inactive_symbols(30) == 0
+        clock.advance(2 * 60)
+        assert scanner.demote_inactive_symbols(30) == 1
+
+        priority = scanner.get_symbol_priority("AAPL")
+        assert priority["tier"] == "STANDARD"
+        assert scanner.get_tier_summary()["tier_distribution"]["standard"] == 1
+
+    def test_demotion_counts_from_last_signal(self, scanner, clock):
+        scanner.register_symbol("AAPL")
+        scanner.record_signal("AAPL", "BUY", 90)
+        clock.advance(20 * 60)
+        scanner.record_signal("AAPL", "BUY", 75)
+
+        clock.advance(20 * 60)
+        assert scanner.demote_inactive_symbols(30) == 0
+        assert scanner.get_symbol_priority("AAPL")["tier"] == "HIGH"
+
+        clock.advance(15 * 60)
+        assert scanner.demote_inactive_symbols(30) == 1
+        assert scanner.get_symbol_priority("AAPL")["tier"] == "STANDARD"
+
+    def test_recent_signal_holds_high_against_calm_metrics(self, scanner, clock):
+        scanner.register_symbol("AAPL")
+        scanner.record_signal("AAPL", "BUY", 90)
+
+        assert scanner.update_symbol_metrics("AAPL", volume_ratio=0.3, volatility_ratio=0.5) == PriorityTier.HIGH
+
+        clock.advance(31 * 60)
+        assert scanner.demote_inactive_symbols() == 1
+        assert scanner.get_symbol_priority("AAPL")["tier"] == "LOW"
+
+    def test_hot_metrics_keep_symbol_high(self, scanner, clock):
+        scanner.update_symbol_metrics("AAPL", volume_ratio=3.0)
+
+        clock.advance(31 * 60)
+
+        assert scanner.demote_inactive_symbols(30) == 0
+        assert scanner.get_symbol_priority("AAPL")["tier"] == "HIGH"
+
+
+class TestActivityMetrics:
+    """Test tier metrics computed from bars"""
+
+    def test_volume_spike_and_price_move(self):
+        closes = [100.0] * 30 + [103.0]
+        highs = [c + 1 for c in closes]
+        lows = [c - 1 for c in closes]
+        volumes = [1000.0] * 30 + [3000.0]
+
+        metrics = compute_activity_metrics(highs, lows, closes, volumes)
+
+        assert metrics["volume_ratio"] == pytest.approx(3.0)
+        assert metrics["price_change_pct"] == pytest.approx(3.0)
+        assert metrics["volatility_ratio"] > 1.0
+
+    def test_too_few_bars_is_neutral(self):
+        assert compute_activity_metrics([1.0], [1.0], [1.0], [1.0]) == {
+            "volume_ratio": 1.0, "volatility_ratio": 1.0, "price_change_pct": 0.0,
+        }
@@ -0,0 +1,152 @@
+"""
+Unit Tests for the Scan Data Context
+====================================
+Tests the per-cycle data context shared by the SmartScanner cascade.
+
+Tests cover:
+- Bar fetches served from cache (including smaller limits)
+- Indicator and pattern computation reuse
+- One fetch per symbol per horizon across a cascade, reused on revisits
+- A SWING -> INTRADAY -> SCALP cascade shares no fetches between horizons
+
+Run with: pytest tests/unit/test_scan_context.py -v
+"""
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from services.scan_context import ScanDataContext
+from services.smart_scanner import SmartScanner
+from services.hierarchical_strategy import HierarchicalStrategy, TradingHorizon
+from tests.mocks.alpaca_mock import MockAlpacaService
+
+
+def _bar_calls(service: MockAlpacaService):
+    return [c["args"] for c in service.call_history if c["method"] == "get_bars"]
+
+
+class TestScanDataContext:
+    """Test bar, indicator and pattern caching"""
+
+    @pytest.mark.asyncio
+    async def test_repeated_fetch_is_served_from_cache(self):
+        service = MockAlpacaService()
+        context = ScanDataContext(service)
+
+        first = await context.get_bars("AAPL", "1hour", 100)
+        second = await context.get_bars("aapl", "1Hour", 100)
+
+        assert first == second
+        assert len(_bar_calls(service)) == 1
+        assert context.fetches_made == 1
+        assert context.fetches_saved == 1
+
+    @pytest.mark.asyncio
+    async def test_smaller_limit_is_sliced_from_cache(self):
+        service = MockAlpacaService()
+        context = ScanDataContext(service)
+
+        full = await context.get_bars("AAPL", "1day", 200)
+        partial = await context.get_bars("AAPL", "1day", 50)
+
+        assert partial == full[-50:]
+        assert len(_bar_calls(service)) == 1
+
+    @pytest.mark.asyncio
+    async def test_larger_limit_refetches(self):
+        service = MockAlpacaService()
+        context = ScanDataContext(service)
+
+        await context.get_bars("AAPL", "1day", 50)
+        bars = await context.get_bars("AAPL", "1day", 200)
+
+        assert len(bars) == 200
+        assert len(_bar_calls(service)) == 2
+        assert context.fetches_saved == 0
+
+    def test_indicators_computed_once(self):
+        context = ScanDataContext(MockAlpacaService())
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return {"rsi_14": 55}
+
+        first = context.get_indicators("AAPL", "1day", 200, "swing", compute)
+        first["current_price"] = 100.0
+        second = context.get_indicators("AAPL", "1day", 200, "swing", compute)
+
+        assert len(calls) == 1
+        assert "current_price" not in second
+        assert context.indicator_reuses == 1
+
+    def test_patterns_computed_once(self):
+        context = ScanDataContext(MockAlpacaService())
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return None
+
+        context.get_patterns("AAPL", "5min", 100, compute)
+        context.get_patterns("AAPL", "5min", 100, compute)
+
+        assert len(calls) == 1
+        assert context.get_stats()["pattern_reuses"] == 1
+
+
+class TestCascadeReuse:
+    """Test that the scanner cascade reuses data within a cycle"""
+
+    @pytest.mark.asyncio
+    async def test_each_horizon_fetches_its_primary_timeframe_once(self):
+        service = MockAlpacaService()
+        scanner = SmartScanner(alpaca_service=service)
+        context = ScanDataContext(service)
+        symbols = ["AAPL", "MSFT"]
+
+        # Each horizon twice, as when a cascade revisits a horizon with only FAIR results
+        for _ in range(2):
+            for horizon in (TradingHorizon.SWING, TradingHorizon.INTRADAY, TradingHorizon.SCALP):
+                for symbol in symbols:
+                    await scanner._analyze_symbol_for_horizon(symbol, horizon, context)
+
+        # Per symbol: 1day, 1hour and 5min, each fetched and analyzed once
+        stats = context.get_stats()
+        assert stats["fetches_made"] == 3 * len(symbols)
+        assert stats["fetches_saved"] == 3 * len(symbols)
+        assert stats["indicator_computations"] == 3 * len(symbols)
+        assert len(_bar_calls(service)) == stats["fetches_made"]
+
+    @pytest.mark.asyncio
+    async def test_cascade_fetches_each_horizon_separately(self, monkeypatch):
+        service = MockAlpacaService()
+        scanner = SmartScanner(alpaca_service=service, strategy=HierarchicalStrategy())
+        symbols = ["AAPL", "MSFT"]
+        scanner.strategy.horizon_exhausted[TradingHorizon.LONG] = True
+        # Nothing tradeable, so the cascade runs SWING -> INTRADAY -> SCALP
+        monkeypatch.setattr(scanner.strategy, "evaluate_opportunity", lambda *args, **kwargs: None)
+
+        _, results = await scanner.full_cascade_scan(symbols, max_cascades=3)
+
+        # The horizons' primary timeframes (1day, 1hour, 5min) don't overlap
+        assert [r.horizon_scanned for r in results] == [
+            TradingHorizon.SWING, TradingHorizon.INTRADAY, TradingHorizon.SCALP,
+        ]
+        assert scanner.last_cycle_data_stats["fetches_made"] == 3 * len(symbols)
+        assert scanner.last_cycle_data_stats["fetches_saved"] == 0
+        assert len(_bar_calls(service)) == 3 * len(symbols)
+
+    @pytest.mark.asyncio
+    async def test_scan_reports_fetches_saved(self):
+        service = MockAlpacaService()
+        scanner = SmartScanner(alpaca_service=service)
+        context = ScanDataContext(service)
+
+        first = await scanner.scan(["AAPL"], force_horizon=TradingHorizon.SWING, context=context)
+        second = await scanner.scan(["AAPL"], force_horizon=TradingHorizon.SWING, context=context)
+        other = await scanner.scan(["AAPL"], force_horizon=TradingHorizon.INTRADAY, context=context)
+
+        assert (first.fetches_saved, second.fetches_saved, other.fetches_saved) == (0, 1, 0)
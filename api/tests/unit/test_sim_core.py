@@ -0,0 +1,248 @@
+"""
+Unit Tests for the Simulation Core
+==================================
+Tests the array-based single-position simulation shared by BacktestEngine
+and WalkForwardBacktester.
+
+Tests cover:
+- Trades and equity matching a bar-by-bar reference loop
+- Re-entry on the exit bar and positions left open or closed at the end
+- Slippage and intrabar exit hooks
+- BacktestEngine signal arrays matching its per-bar entry/exit checks
+- Walk-forward runs with intrabar bracket exits
+
+Run with: pytest tests/unit/test_sim_core.py -v
+"""
+import random
+
+import numpy as np
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from services.backtester import BacktestEngine, StrategyType
+from services.backtesting import sim_core
+from services.backtesting.order_simulator import IntrabarPath
+from services.walk_forward_backtester import WalkForwardBacktester
+from tests.mocks.fixtures import generate_random_walk_data
+
+
+def make_closes(num_bars=400, seed=1):
+    return generate_random_walk_data(num_bars, seed, cycle_amplitude=0.015).closes
+
+
+def random_signals(num_bars, seed, density=0.1):
+    rng = random.Random(seed)
+    sides = [rng.choice(["long", "short"]) if rng.random() < density else "" for _ in range(num_bars)]
+    long_exits = ["signal_exit" if rng.random() < 0.05 else "" for _ in range(num_bars)]
+    short_exits = ["signal_exit" if rng.random() < 0.05 else "" for _ in range(num_bars)]
+    return sides, long_exits, short_exits
+
+
+def reference(closes, start, capital, stop_loss_pct, take_profit_pct, sides, long_exits, short_exits,
+              slippage=None, close_at_end=False):
+    """Bar-by-bar loop: record equity, check exits, then check for an entry"""
+    position, trades, equity = None, [], [capital]
+    for i in range(start, len(closes)):
+        price = closes[i]
+        if position:
+            unrealized = (price - position["entry"]) * position["qty"]
+            equity.append(capital + unrealized if position["side"] == "long" else capital - unrealized)
+        else:
+            equity.append(capital)
+
+        if position:
+            is_long = position["side"] == "long"
+            reason = ""
+            if is_long and price <= position["stop"] or not is_long and price >= position["stop"]:
+                reason = "stop_loss"
+            elif is_long and price >= position["target"] or not is_long and price <= position["target"]:
+                reason = "take_profit"
+            elif (long_exits if is_long else short_exits)[i]:
+                reason = (long_exits if is_long else short_exits)[i]
+            if reason:
+                exit_price = slippage(i, price, position["qty"], "sell" if is_long else "buy")[1] if slippage else price
+                pnl = (exit_price - position["entry"]) * position["qty"] * (1 if is_long else -1)
+                trades.append((position["bar"], i, position["side"], position["qty"], exit_price, pnl, reason))
+                capital += pnl
+                position = None
+
+        if not position and sides[i]:
+            qty = int(capital * 0.1 / price)
+            if qty > 0:
+                entry = slippage(i, price, qty, sides[i])[1] if slippage else price
+                sign = 1 if sides[i] == "long" else -1
+                position = {"bar": i, "side": sides[i], "qty": qty, "entry": entry,
+                            "stop": entry * (1 - sign * stop_loss_pct), "target": entry * (1 + sign * take_profit_pct)}
+
+    if position and close_at_end:
+        sign = 1 if position["side"] == "long" else -1
+        pnl = (closes[-1] - position["entry"]) * position["qty"] * sign
+        trades.append((position["bar"], len(closes) - 1, position["side"], position["qty"], closes[-1], pnl,
+                       "end_of_data"))
+        capital += pnl
+    return trades, equity, capital
+
+
+def as_tuples(records):
+    return list(zip(
+        records.entry_bar.tolist(), records.exit_bar.tolist(), records.side, records.quantity.tolist(),
+        records.exit_price.tolist(), records.pnl.tolist(), records.exit_reason,
+    ))
+
+
+def fixed_slippage(i, price, quantity, side):
+    pct = 0.001 + (i % 5) * 0.0002
+    return pct, price * (1 + pct) if side in ("long", "buy") else price * (1 - pct)
+
+
+class TestSimulate:
+    """Test simulate() against the bar-by-bar reference"""
+
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    @pytest.mark.parametrize("close_at_end", [False, True])
+    def test_matches_reference(self, seed, close_at_end):
+        closes = make_closes(seed=seed)
+        sides, long_exits, short_exits = random_signals(len(closes), seed)
+
+        result = sim_core.simulate(
+            closes, 50, 10000, 0.03, 0.06, sides=sides, long_exits=long_exits,
+            short_exits=short_exits, close_at_end=close_at_end,
+        )
+
+        trades, equity, capital = reference(
+            closes, 50, 10000, 0.03, 0.06, sides, long_exits, short_exits, close_at_end=close_at_end,
+        )
+        assert len(result.trades) > 10
+        assert as_tuples(result.trades) == trades
+        assert np.array_equal(result.equity, equity)
+        assert result.final_capital == capital
+
+    def test_signal_function_and_slippage(self):
+        closes = make_closes(seed=4)
+        sides, long_exits, short_exits = random_signals(len(closes), 4, density=0.3)
+
+        result = sim_core.simulate(
+            closes, 50, 10000, 0.02, 0.04, signal=lambda i: sides[i], long_exits=long_exits,
+            short_exits=short_exits, slippage=fixed_slippage,
+        )
+
+        trades, equity, capital = reference(
+            closes, 50, 10000, 0.02, 0.04, sides, long_exits, short_exits, slippage=fixed_slippage,
+        )
+        assert as_tuples(result.trades) == trades
+        assert np.allclose(result.equity, equity)
+        assert result.final_capital == pytest.approx(capital)
+        assert (result.trades.slippage_pct > 0).all()
+
+    def test_reenters_on_exit_bar(self):
+        closes = [100.0] * 5 + [110.0, 110.0, 110.0]
+        sides = ["long"] * len(closes)
+
+        result = sim_core.simulate(closes, 0, 10000, 0.05, 0.05, sides=sides)
+
+        assert result.trades.exit_bar.tolist() == [5]
+        assert result.trades.entry_bar.tolist() == [0]
+        assert result.open_side == "long"  # Re-entered at 110 on bar 5, still open
+        assert result.final_capital == 10100
+        assert result.equity.tolist() == [10000] * 6 + [10100] * 3
+
+    def test_no_signals(self):
+        result = sim_core.simulate(make_closes(100), 20, 5000, 0.03, 0.06, sides=[""] * 100)
+
+        assert len(result.trades) == 0
+        assert result.equity.tolist() == [5000] * 81
+        assert result.sharpe == 0 and result.max_drawdown == 0
+
+    def test_intrabar_exit_hook(self):
+        closes = make_closes(200)
+        entries = []
+
+        def on_entry(i, quantity, stop, target, side):
+            entries.append((i, quantity, stop, target, side))
+
+        def intrabar_exit(i):
+            if i - entries[-1][0] == 3:
+                return "take_profit", closes[i], 0.002, closes[i] * 0.998
+            return None
+
+        result = sim_core.simulate(
+            closes, 50, 10000, 0.03, 0.06, sides=["long"] * 200,
+            intrabar_exit=intrabar_exit, on_entry=on_entry,
+        )
+
+        assert all(exit_bar - entry_bar == 3 for entry_bar, exit_bar in zip(
+            result.trades.entry_bar.tolist(), result.trades.exit_bar.tolist()))
+        assert set(result.trades.exit_reason) == {"take_profit"}
+        assert entries[0][2] == pytest.approx(closes[50] * 0.97)
+        exit_closes = np.array(closes)[result.trades.exit_bar]
+        assert np.allclose(result.trades.slippage_cost, exit_closes * 0.002 * result.trades.quantity)
+
+
+class TestBacktestEngineSignals:
+    """Test the engine's signal arrays against its per-bar checks"""
+
+    @pytest.mark.parametrize("strategy", list(StrategyType))
+    def test_arrays_match_per_bar_checks(self, strategy):
+        engine = BacktestEngine()
+        closes = make_closes(600, seed=5)
+        ind = engine.indicator_service
+        rsi = ind.calculate_rsi(closes, 14)
+        macd_line, signal_line, _ = ind.calculate_macd(closes)
+        sma_20, sma_50, sma_200 = (ind.calculate_sma(closes, n) for n in (20, 50, 200))
+        upper_bb, _, lower_bb = ind.calculate_bollinger_bands(closes)
+        params = {"rsi_threshold": 35, "lookback": 10}
+
+        sides, long_exits, short_exits = engine._signal_arrays(
+            strategy, rsi, macd_line, signal_line, sma_20, sma_50, sma_200,
+            upper_bb, lower_bb, closes, params,
+        )
+
+        for i in range(1, len(closes)):
+            entry, side = engine._check_entry_signal(
+                strategy, i, rsi, macd_line, signal_line, sma_20, sma_50, sma_200,
+                upper_bb, lower_bb, closes, params,
+            )
+            assert sides[i] == (side if entry else "")
+            for position_side, exits in (("long", long_exits), ("short", short_exits)):
+                exit_, reason = engine._check_exit_signal(
+                    strategy, i, position_side, rsi, macd_line, signal_line, sma_20, sma_50,
+                    upper_bb, lower_bb, closes, params,
+                )
+                assert (exits[i] if exits else "") == (reason if exit_ else "")
+
+    def test_run_backtest_closes_at_end(self):
+        closes = make_closes(400, seed=6)
+        dates = [str(i) for i in range(400)]
+
+        result = BacktestEngine().run_backtest(
+            "AAA", StrategyType.RSI_OVERSOLD, closes, closes, closes, closes, [1e6] * 400, dates,
+        )
+
+        assert result.total_trades == len(result.trades) > 0
+        assert result.final_capital == pytest.approx(10000 + sum(t.pnl for t in result.trades))
+        assert all(t.exit_reason != "end_of_data" for t in result.trades[:-1])
+
+
+class TestWalkForwardIntrabar:
+    """Test walk-forward runs with intrabar bracket exits"""
+
+    def test_bracket_exits(self):
+        closes = make_closes(400, seed=7)
+        highs = [c * 1.01 for c in closes]
+        lows = [c * 0.99 for c in closes]
+        backtester = WalkForwardBacktester()
+        backtester.intrabar_exits = IntrabarPath.NEAREST_FIRST
+        atrs = backtester._calculate_atr(highs, lows, closes, 14)
+
+        result = backtester._run_single_backtest(
+            closes, highs, lows, closes, [1e6] * 400, atrs, backtester.rsi_strategy,
+            {"rsi_period": 14, "rsi_oversold": 40, "rsi_overbought": 60}, 10000, rng=random.Random(1),
+        )
+
+        assert result["trades"]
+        assert len(result["equity_curve"]) == 400 - 50 + 1
+        assert result["final_capital"] == pytest.approx(10000 + sum(t["pnl"] for t in result["trades"]))
+        assert {t["exit_reason"] for t in result["trades"]} <= {"stop_loss", "take_profit"}
@@ -0,0 +1,262 @@
+"""
+Unit Tests for the Simulated Broker Backend
+===========================================
+Tests SimulatedBroker as a paper-trading backend on a pushed price feed:
+latency to the book, partial fills, sessions, the market-data passthrough
+and selecting it through get_alpaca_service.
+
+Tests cover:
+- Orders filling against pushed bars and prices
+- Orders in flight until the latency has passed, and cancelled in flight
+- Partial fills capped by bar volume, reported as partially_filled
+- Orders held outside the regular session unless sessions are off
+- Quotes and other market data from the data service
+- Every public AlpacaService method working without a data service
+- Replacing orders, including one leg of an OCO pair
+- TRADING_BROKER_BACKEND=simulated selecting the simulated paper account
+
+Run with: pytest tests/unit/test_simulated_broker.py -v
+"""
+import inspect
+from datetime import date, datetime
+
+import pytest
+import pytz
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from config.trading_config import TradingConfig, reset_trading_config
+from exceptions import AlpacaOrderError
+from services.alpaca_service import AlpacaService, get_alpaca_service
+from services.clock import VirtualClock
+from services.simulated_broker import SimulatedBroker, get_simulated_broker, reset_simulated_broker
+from tests.mocks.alpaca_mock import MockAlpacaService
+
+EASTERN = pytz.timezone("US/Eastern")
+DAY = date(2024, 3, 4)  # A Monday (EST)
+
+
+def eastern(hour, minute=0, second=0):
+    return EASTERN.localize(datetime(DAY.year, DAY.month, DAY.day, hour, minute, second))
+
+
+def feed_broker(at=None, price=100.0, volume=0.0, **kwargs):
+    clock = VirtualClock(at or eastern(10))
+    broker = SimulatedBroker(clock=clock, slippage=None, **kwargs)
+    broker.push_price("AAA", price, volume=volume)
+    return broker, clock
+
+
+class TestFeedMode:
+    """Test fills against pushed prices"""
+
+    @pytest.mark.asyncio
+    async def test_market_and_resting_limit(self):
+        broker, _ = feed_broker()
+
+        market = await broker.submit_market_order("AAA", 10, "buy")
+        limit = await broker.submit_limit_order("AAA", 5, "buy", limit_price=98)
+        assert market["status"] == "filled" and market["filled_avg_price"] == 100.0
+        assert limit["status"] == "new"
+
+        fills = broker.push_bar("AAA", 100, 100.5, 97.5, 99)
+
+        assert [(fill.quantity, fill.price) for fill in fills] == [(5, 98)]
+        assert (await broker.get_position("AAA"))["quantity"] == 15
+        assert (await broker.get_account())["cash"] == 100000 - 1000 - 490
+
+    @pytest.mark.asyncio
+    async def test_partial_fills_by_volume(self):
+        broker, _ = feed_broker(volume=100, max_volume_fraction=0.1)
+
+        order = await broker.submit_market_order("AAA", 50, "buy")
+        assert (order["status"], order["filled_qty"]) == ("partially_filled", 10)
+        assert order["status"] in [o["status"] for o in await broker.get_orders(status="open")]
+
+        broker.push_bar("AAA", 101, 102, 100, 101, volume=1000)
+
+        order = await broker.get_order(order["id"])
+        assert (order["status"], order["filled_qty"]) == ("filled", 50)
+        assert order["filled_avg_price"] == pytest.approx((100 * 10 + 101 * 40) / 50)
+
+    @pytest.mark.asyncio
+    async def test_sessions(self):
+        broker, _ = feed_broker(at=eastern(20, 30))
+        held = await broker.submit_market_order("AAA", 10, "buy")
+        assert held["status"] == "accepted"
+
+        always, _ = feed_broker(at=eastern(20, 30), enforce_sessions=False)
+        assert (await always.submit_market_order("AAA", 10, "buy"))["status"] == "filled"
+
+
+class TestLatency:
+    """Test orders in flight to the book"""
+
+    @pytest.mark.asyncio
+    async def test_order_arrives_after_the_latency(self):
+        broker, clock = feed_broker(latency_seconds=0.5)
+
+        order = await broker.submit_limit_order("AAA", 10, "buy", limit_price=99)
+        assert order["status"] == "pending_new"
+        assert (await broker.get_account())["buying_power"] == 100000 - 990  # Reserved in flight
+
+        clock.advance(0.2)
+        assert not broker.push_bar("AAA", 100, 100, 98, 99.5)  # Before it arrives
+        clock.advance(0.5)
+        assert (await broker.get_order(order["id"]))["status"] == "new"
+
+        fills = broker.push_bar("AAA", 99, 99.5, 98.5, 99)
+        assert [fill.order_id for fill in fills] == [int(order["id"])]
+
+    @pytest.mark.asyncio
+    async def test_market_order_fills_at_the_arrival_price(self):
+        broker, clock = feed_broker(latency_seconds=0.5)
+
+        order = await broker.submit_market_order("AAA", 10, "buy")
+        clock.advance(0.2)
+        broker.push_price("AAA", 101)
+        clock.advance(0.5)
+
+        assert (await broker.get_order(order["id"]))["filled_avg_price"] == 101
+
+    @pytest.mark.asyncio
+    async def test_cancel_in_flight(self):
+        broker, clock = feed_broker(latency_seconds=0.5)
+        order = await broker.submit_market_order("AAA", 10, "buy")
+
+        assert await broker.cancel_order(order["id"])
+        clock.advance(1)
+
+        assert (await broker.get_order(order["id"]))["status"] == "canceled"
+        assert await broker.get_positions() == []
+        assert (await broker.get_account())["buying_power"] == 100000
+
+
+class TestDataService:
+    """Test market data from the data service"""
+
+    @pytest.mark.asyncio
+    async def test_quotes_move_the_simulated_market(self):
+        data_service = MockAlpacaService()
+        broker = SimulatedBroker(clock=VirtualClock(eastern(10)), slippage=None, data_service=data_service)
+
+        order = await broker.submit_market_order("AAA", 10, "buy")  # Priced from the quote
+        bar = await broker.get_latest_bar("AAA")
+
+        assert order["filled_avg_price"] == pytest.approx(100.0)
+        assert bar["close"] == 100.0
+        assert [call["method"] for call in data_service.call_history] == ["get_latest_quote", "get_latest_bar"]
+
+
+class TestAlpacaSurface:
+    """Test the broker stands in for every AlpacaService method"""
+
+    @pytest.mark.asyncio
+    async def test_every_public_method_without_a_data_service(self):
+        broker, _ = feed_broker()
+        await broker.submit_market_order("AAA", 10, "buy")
+        to_replace = await broker.submit_limit_order("AAA", 5, "buy", limit_price=90)
+        to_cancel = await broker.submit_limit_order("AAA", 5, "buy", limit_price=80)
+
+        calls = {
+            "get_account": (),
+            "get_buying_power": (),
+            "get_positions": (),
+            "get_position": ("AAA",),
+            "submit_market_order": ("AAA", 1, "buy"),
+            "submit_limit_order": ("AAA", 1, "buy", 95.0),
+            "submit_extended_hours_order": ("AAA", 1, "buy", 95.0),
+            "submit_stop_loss_order": ("AAA", 1, 90.0),
+            "submit_trailing_stop_order": ("AAA", 1, 0.05),
+            "submit_bracket_order": ("AAA", 1, "buy", 90.0, 110.0),
+            "submit_oco_order": ("AAA", 1, 90.0, 110.0),
+            "replace_order": (to_replace["id"], None, 91.0),
+            "cancel_order": (to_cancel["id"],),
+            "get_order": (to_cancel["id"],),
+            "get_orders": (),
+            "get_latest_quote": ("AAA",),
+            "get_quote": ("AAA",),
+            "get_latest_bar": ("AAA",),
+            "get_latest_trade": ("AAA",),
+            "get_bars": ("AAA",),
+            "is_market_open": (),
+            "get_market_clock": (),
+            "get_market_hours_info": (),
+            "search_assets": ("AA",),
+            "close_position": ("AAA", 1),
+            "close_all_positions": (),
+        }
+        public = {
+            name for name, member in inspect.getmembers(AlpacaService, inspect.iscoroutinefunction)
+            if not name.startswith("_")
+        }
+        assert public == set(calls)
+
+        results = {name: await getattr(broker, name)(*args) for name, args in calls.items()}
+
+        assert broker.is_initialized
+        assert results["replace_order"]["limit_price"] == 91.0
+        assert results["cancel_order"] is True
+        assert results["get_order"]["status"] == "canceled"
+        assert results["get_latest_trade"]["price"] == 100.0
+        assert results["get_market_clock"]["next_close"] == eastern(16).isoformat()
+        assert results["search_assets"] == [
+            {"symbol": "AAA", "name": "AAA", "type": "stock", "region": "United States"}
+        ]
+        assert await broker.get_positions() == []
+
+    @pytest.mark.asyncio
+    async def test_replace_one_oco_leg(self):
+        broker, _ = feed_broker()
+        await broker.submit_market_order("AAA", 10, "buy")
+        oco = await broker.submit_oco_order("AAA", 10, stop_loss_price=95, take_profit_price=110)
+        stop_id = str(int(oco["id"]) + 1)
+
+        moved = await broker.replace_order(stop_id, stop_price=98)
+        fills = broker.push_bar("AAA", 100, 100, 97, 97.5)
+
+        assert (await broker.get_order(stop_id))["status"] == "replaced"
+        assert [(fill.order_id, fill.price) for fill in fills] == [(int(moved["id"]), 98)]
+        assert (await broker.get_order(oco["id"]))["status"] == "filled"
+        assert await broker.get_positions() == []
+
+    @pytest.mark.asyncio
+    async def test_replace_unknown_or_filled_order(self):
+        broker, _ = feed_broker()
+        filled = await broker.submit_market_order("AAA", 10, "buy")
+
+        with pytest.raises(AlpacaOrderError):
+            await broker.replace_order(filled["id"], limit_price=99)
+        with pytest.raises(AlpacaOrderError):
+            await broker.replace_order("nope", limit_price=99)
+
+
+class TestBackendSelection:
+    """Test choosing the simulated paper backend"""
+
+    @pytest.fixture
+    def simulated_backend(self, monkeypatch):
+        monkeypatch.setenv("TRADING_BROKER_BACKEND", "simulated")
+        monkeypatch.setenv("TRADING_SIM_LATENCY_MS", "5")
+        monkeypatch.delenv("ALPACA_API_KEY", raising=False)
+        reset_trading_config()
+        reset_simulated_broker()
+        yield
+        reset_trading_config()
+        reset_simulated_broker()
+
+    def test_paper_mode_uses_the_simulated_broker(self, simulated_backend):
+        service = get_alpaca_service(paper_trading=True)
+
+        assert isinstance(service, SimulatedBroker)
+        assert service is get_simulated_broker()
+        assert service.latency_seconds == 0.005
+        assert service.data_service is None  # No API keys: pushed prices only
+
+    def test_invalid_backend(self, monkeypatch):
+        monkeypatch.setenv("TRADING_BROKER_BACKEND", "ibkr")
+
+        with pytest.raises(ValueError):
+            TradingConfig()
@@ -0,0 +1,157 @@
+"""
+Unit Tests for the Bot State Snapshot Service
+=============================================
+Tests warm-restart snapshots of the trading bot's analytic state.
+
+Tests cover:
+- Round trip of analysis results, priority tiers and caches
+- Validity checks (age, trading mode, checksum, version)
+- Atomic, compressed snapshot files
+
+Run with: pytest tests/unit/test_state_snapshot.py -v
+"""
+import gzip
+import json
+import pytest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from services.state_snapshot import StateSnapshotService
+from services.priority_scanner import PriorityScannerService, PriorityTier
+from services.smart_scanner import SmartScanner
+from services.correlation_service import CorrelationPair, get_correlation_service
+from services.ai_trade_gate import TradeGateResult, TradeDecision, get_ai_trade_gate
+from services.indicators import TradingMode
+from tests.mocks.alpaca_mock import MockAlpacaService
+
+
+def _make_bot(paper_trading: bool = True):
+    """Minimal stand-in exposing the attributes the snapshot reads and writes"""
+    return SimpleNamespace(
+        paper_trading=paper_trading,
+        smart_scanner=SmartScanner(alpaca_service=MockAlpacaService()),
+        priority_scanner=PriorityScannerService(),
+        _stock_analysis_results={},
+        _crypto_analysis_results={},
+        _stock_scores={},
+        _ready_stocks=[],
+        _hierarchical_scan_results={},
+        _last_stock_analysis_time=None,
+        _last_crypto_analysis_time=None,
+    )
+
+
+@pytest.fixture
+def snapshot_service(tmp_path) -> StateSnapshotService:
+    return StateSnapshotService(path=str(tmp_path / "state.json.gz"), max_age_seconds=600)
+
+
+class TestSnapshotRoundTrip:
+    """Test saving and restoring bot state"""
+
+    def test_round_trip_restores_analytic_state(self, snapshot_service):
+        bot = _make_bot()
+        bot._stock_analysis_results["AAPL"] = {"signal": "BUY", "confidence": 72.0}
+        bot._stock_scores["AAPL"] = 72.0
+        bot._ready_stocks.append("AAPL")
+        bot.priority_scanner.register_symbol("NVDA", PriorityTier.HIGH)
+        bot.priority_scanner.record_scan("NVDA")
+        bot.smart_scanner.adaptive_engine.set_mode(TradingMode.SCALP, auto=False)
+
+        assert snapshot_service.save(bot)
+
+        restored_bot = _make_bot()
+        summary = snapshot_service.restore(restored_bot)
+
+        assert summary["priority_symbols"] == 1
+        assert restored_bot._stock_analysis_results["AAPL"]["signal"] == "BUY"
+        assert restored_bot._stock_scores["AAPL"] == 72.0
+        assert restored_bot._ready_stocks == ["AAPL"]
+        priority = restored_bot.priority_scanner.get_symbol_priority("NVDA")
+        assert priority["tier"] == "HIGH"
+        assert priority["scan_count"] == 1
+        assert restored_bot.smart_scanner.adaptive_engine.current_mode == TradingMode.SCALP
+
+    def test_fresh_results_are_not_overwritten(self, snapshot_service):
+        bot = _make_bot()
+        bot._stock_analysis_results["AAPL"] = {"signal": "SELL"}
+        snapshot_service.save(bot)
+
+        restored_bot = _make_bot()
+        restored_bot._stock_analysis_results["AAPL"] = {"signal": "BUY"}
+        snapshot_service.restore(restored_bot)
+
+        assert restored_bot._stock_analysis_results["AAPL"]["signal"] == "BUY"
+
+    def test_caches_round_trip(self, snapshot_service):
+        correlation_service = get_correlation_service()
+        correlation_service._correlation_cache.clear()
+        correlation_service._cache_correlation("AAPL_MSFT", CorrelationPair(
+            symbol_a="AAPL", symbol_b="MSFT", correlation=0.8,
+            correlation_type="positive", calculated_at=datetime.now(), lookback_days=30,
+        ))
+        gate = get_ai_trade_gate()
+        gate._decision_cache.clear()
+        gate._cache_decision("AAPL_buy_80", TradeGateResult(
+            decision=TradeDecision.APPROVE, confidence=80.0, reasons=["ok"], concerns=[],
+        ))
+
+        snapshot_service.save(_make_bot())
+        correlation_service._correlation_cache.clear()
+        gate._decision_cache.clear()
+
+        summary = snapshot_service.restore(_make_bot())
+
+        assert summary["correlations"] == 1
+        assert summary["ai_gate_decisions"] == 1
+        assert gate._decision_cache["AAPL_buy_80"].decision == TradeDecision.APPROVE
+
+
+class TestSnapshotValidation:
+    """Test that invalid snapshots are ignored"""
+
+    def _rewrite(self, path, **changes):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            document = json.load(f)
+        document.update(changes)
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump(document, f)
+
+    def test_missing_file_restores_nothing(self, snapshot_service):
+        assert snapshot_service.restore(_make_bot()) == {}
+
+    def test_stale_snapshot_is_ignored(self, snapshot_service):
+        snapshot_service.save(_make_bot())
+        old = (datetime.now() - timedelta(hours=2)).isoformat()
+        self._rewrite(snapshot_service.path, saved_at=old)
+
+        assert snapshot_service.restore(_make_bot()) == {}
+        assert "age" in snapshot_service.last_error
+
+    def test_other_trading_mode_is_ignored(self, snapshot_service):
+        snapshot_service.save(_make_bot(paper_trading=True))
+
+        assert snapshot_service.restore(_make_bot(paper_trading=False)) == {}
+
+    def test_corrupt_payload_is_ignored(self, snapshot_service):
+        snapshot_service.save(_make_bot())
+        self._rewrite(snapshot_service.path, payload='{"analysis": {}}')
+
+        assert snapshot_service.restore(_make_bot()) == {}
+        assert snapshot_service.last_error == "checksum mismatch"
+
+    def test_unreadable_file_is_ignored(self, snapshot_service):
+        with open(snapshot_service.path, "wb") as f:
+            f.write(b"not gzip")
+
+        assert snapshot_service.restore(_make_bot()) == {}
+
+    def test_version_mismatch_is_ignored(self, snapshot_service):
+        snapshot_service.save(_make_bot())
+        self._rewrite(snapshot_service.path, version=0)
+
+        assert snapshot_service.restore(_make_bot()) == {}
@@ -0,0 +1,102 @@
+"""
+Unit Tests for the Throughput Benchmark Harness
+===============================================
+Tests the synthetic data, mock Alpaca bars and regression checks behind
+scripts/benchmark_throughput.py.
+
+Tests cover:
+- Deterministic, regime-switching synthetic OHLCV
+- MockAlpacaService serving registered bars like AlpacaService
+- Calibrated throughput, memory and GC regression checks
+- Measuring a case end to end
+
+Run with: pytest tests/unit/test_throughput_benchmark.py -v
+"""
+import statistics
+from datetime import datetime
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from scripts import benchmark_throughput as harness
+from tests.mocks.alpaca_mock import MockAlpacaService
+
+CASE = {"units": 1000, "seconds": 0.1, "throughput": 10000.0, "peak_rss_mb": 100.0,
+        "traced_peak_mb": 20.0, "gc_gen0": 10.0}
+
+
+class TestSyntheticData:
+    """Test synthetic bars"""
+
+    def test_deterministic_per_symbol_and_seed(self):
+        bars = harness.synthetic_bars("AAA", 300)
+
+        assert bars == harness.synthetic_bars("AAA", 300)
+        assert bars != harness.synthetic_bars("BBB", 300)
+        assert bars != harness.synthetic_bars("AAA", 300, seed=1)
+        assert all(b["low"] <= min(b["open"], b["close"]) <= max(b["open"], b["close"]) <= b["high"] for b in bars)
+        assert all(datetime.fromisoformat(b["timestamp"]).weekday() < 5 for b in bars)
+
+    def test_regimes_change_volatility(self):
+        closes = [b["close"] for b in harness.synthetic_bars("AAA", 3000)]
+        returns = [abs(b / a - 1) for a, b in zip(closes, closes[1:])]
+        window_vols = [statistics.mean(returns[i:i + 100]) for i in range(0, len(returns) - 100, 100)]
+
+        assert max(window_vols) > 2 * min(window_vols)
+
+
+class TestMockBars:
+    """Test MockAlpacaService registered bars"""
+
+    @pytest.mark.asyncio
+    async def test_filters_like_alpaca(self):
+        service = MockAlpacaService()
+        bars = harness.synthetic_bars("AAA", 50)
+        service.set_bars("aaa", bars)
+
+        assert await service.get_bars("AAA", "1Day", 10) == bars[-10:]
+        start, end = datetime.fromisoformat(bars[5]["timestamp"]), datetime(2010, 1, 29, 23, 59)
+        window = await service.get_bars("AAA", start=start.replace(tzinfo=None), end=end, limit=1000)
+        assert window[0] == bars[5] and window[-1]["timestamp"].startswith("2010-01-29")
+
+
+class TestRegressionCheck:
+    """Test comparison against a baseline"""
+
+    def baseline(self, calibration=0.1):
+        return {"calibration_seconds": calibration, "cases": {"walk_forward": dict(CASE)}}
+
+    def test_within_tolerance(self):
+        current = dict(CASE, throughput=7000.0, peak_rss_mb=130.0, gc_gen0=12.0)
+
+        assert harness.compare(self.baseline(), 0.1, {"walk_forward": current}) == []
+
+    def test_flags_regressions(self):
+        current = dict(CASE, throughput=6000.0, traced_peak_mb=60.0, gc_gen0=40.0)
+
+        regressions = harness.compare(self.baseline(), 0.1, {"walk_forward": current})
+
+        assert [metric.split()[0] for _, metric in regressions] == ["throughput", "traced_peak_mb", "gc_gen0"]
+
+    def test_throughput_scaled_by_calibration(self):
+        current = dict(CASE, throughput=5500.0)
+
+        # Half-speed machine: 5500/s is fine against a 10000/s baseline
+        assert harness.compare(self.baseline(0.1), 0.2, {"walk_forward": current}) == []
+        assert harness.compare(self.baseline(0.1), 0.1, {"walk_forward": current})
+
+
+class TestMeasureCase:
+    """Test measuring one case in-process"""
+
+    def test_walk_forward_case(self):
+        config = {"symbols": 1, "bars": 600, "simulations": 100, "seed": 0, "repeats": 1,
+                  "symbol_names": ["SYN000"]}
+
+        result = harness.measure_case("walk_forward", config)
+
+        assert result["units"] > 0 and result["throughput"] > 0
+        assert result["peak_rss_mb"] > 0 and result["traced_peak_mb"] > 0
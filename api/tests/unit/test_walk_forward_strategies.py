@@ -0,0 +1,129 @@
+"""
+Unit Tests for Walk-Forward Strategy Precompute
+===============================================
+Tests the whole-window RSI/MACD signal series used by WalkForwardBacktester.
+
+Tests cover:
+- RSI signals matching the per-bar rsi_strategy on every bar
+- EMA seeding and a real MACD signal-line EMA
+- Per-bar macd_strategy agreeing with the precomputed crossovers
+- _run_single_backtest giving the same result with and without precompute
+
+Run with: pytest tests/unit/test_walk_forward_strategies.py -v
+"""
+import random
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from services.walk_forward_backtester import (
+    WalkForwardBacktester,
+    ema_series,
+    macd_series,
+    precompute_macd_signals,
+    precompute_rsi_signals,
+    task_rng,
+)
+
+
+def _closes(num_bars=400, seed=1):
+    rng = random.Random(seed)
+    price, closes = 100.0, []
+    for _ in range(num_bars):
+        price *= 1 + rng.gauss(0, 0.02)
+        closes.append(price)
+    return closes
+
+
+def _per_bar_sides(strategy_func, closes, params):
+    return [strategy_func(i, closes, closes, closes, closes, None, params)[1] for i in range(len(closes))]
+
+
+class TestRSISignals:
+    """Test precomputed RSI against the per-bar strategy"""
+
+    @pytest.mark.parametrize("params", [
+        {},
+        {"rsi_period": 7, "rsi_oversold": 35, "rsi_overbought": 65},
+        {"rsi_period": 21, "rsi_oversold": 25, "rsi_overbought": 75},
+    ])
+    def test_matches_per_bar_strategy(self, params):
+        closes = _closes()
+
+        sides = precompute_rsi_signals(None, None, None, closes, None, params)
+
+        assert sides == _per_bar_sides(WalkForwardBacktester.rsi_strategy, closes, params)
+        assert "long" in sides and "short" in sides
+
+    def test_flat_prices_read_as_overbought(self):
+        sides = precompute_rsi_signals(None, None, None, [100.0] * 30, None, {"rsi_period": 14})
+
+        assert sides[:14] == [""] * 14
+        assert sides[14:] == ["short"] * 16
+
+
+class TestMACDSignals:
+    """Test the MACD series and crossovers"""
+
+    def test_ema_seeded_with_sma(self):
+        values = [1.0, 2.0, 3.0, 4.0, 5.0]
+
+        ema = ema_series(values, 3)
+
+        assert ema[:2] == [None, None]
+        assert ema[2] == pytest.approx(2.0)
+        assert ema[3] == pytest.approx(3.0)
+        assert ema[4] == pytest.approx(4.0)
+
+    def test_signal_line_is_ema_of_macd(self):
+        closes = _closes()
+
+        macd, signal_line = macd_series(closes, 12, 26, 9)
+
+        defined = [m for m in macd if m is not None]
+        assert len(defined) == len(closes) - 25
+        expected = ema_series(defined, 9)
+        assert signal_line[:25 + 8] == [None] * (25 + 8)
+        for offset, value in enumerate(expected[8:], start=25 + 8):
+            assert signal_line[offset] == pytest.approx(value)
+        # Not the old macd * 0.9 approximation
+        assert signal_line[200] != pytest.approx(macd[200] * 0.9)
+
+    def test_per_bar_strategy_matches_precompute(self):
+        closes = _closes(num_bars=250, seed=3)
+        params = {"macd_fast": 8, "macd_slow": 21, "macd_signal": 7}
+
+        sides = precompute_macd_signals(None, None, None, closes, None, params)
+
+        assert sides == _per_bar_sides(WalkForwardBacktester.macd_strategy, closes, params)
+        assert "long" in sides and "short" in sides
+        assert sides[:28] == [""] * 28
+
+
+class TestSingleBacktest:
+    """Test backtests use the precomputed signals transparently"""
+
+    def test_same_result_as_per_bar_calls(self):
+        backtester = WalkForwardBacktester()
+        closes = _closes(num_bars=500, seed=4)
+        volumes = [1_000_000] * len(closes)
+        params = {"rsi_period": 14, "rsi_oversold": 35, "rsi_overbought": 65}
+
+        def per_bar_rsi(i, opens, highs, lows, closes, volumes, params):
+            return WalkForwardBacktester.rsi_strategy(i, opens, highs, lows, closes, volumes, params)
+
+        precomputed = backtester._run_single_backtest(
+            closes, closes, closes, closes, volumes, None,
+            WalkForwardBacktester.rsi_strategy, params, 10000, rng=task_rng(1, "x"),
+        )
+        per_bar = backtester._run_single_backtest(
+            closes, closes, closes, closes, volumes, None,
+            per_bar_rsi, params, 10000, rng=task_rng(1, "x"),
+        )
+
+        assert precomputed["trades"]
+        assert precomputed["trades"] == per_bar["trades"]
+        assert precomputed["sharpe"] == per_bar["sharpe"]
@@ -0,0 +1,185 @@
+"""
+Unit Tests for the Weight Scoring Kernel
+========================================
+Tests the precomputed indicator votes the auto-optimizer scores weight
+vectors with, and its multi-symbol, parallel scoring.
+
+Tests cover:
+- Vectorized votes matching the per-bar indicator votes
+- Precomputed sides giving the same walk-forward result as per-bar signals
+- Serial and process-pool scoring agreeing across symbols
+- Reduced-fidelity scoring on the most recent bars
+- Concurrent data fetching and combined multi-symbol results
+
+Run with: pytest tests/unit/test_weight_scoring.py -v
+"""
+import math
+import random
+import time
+
+import numpy as np
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from services import auto_optimizer
+from services.auto_optimizer import AutoOptimizer, MarketRegime
+from services.param_search import RandomSearch, SearchBudget
+from services.strategy_engine import DEFAULT_WEIGHTS
+from services.walk_forward_backtester import WalkForwardBacktester
+from services.weight_scoring import (
+    COMPONENTS, SymbolComponents, WeightScorer, WeightedSignals, bar_votes, component_votes, score_symbol,
+)
+
+PARAMS = [
+    {},
+    {"rsi_period": 7, "rsi_oversold": 25, "rsi_overbought": 65, "bb_period": 15, "bb_std": 1.5,
+     "macd_fast": 8, "macd_slow": 21},
+    {"rsi_period": 21, "rsi_oversold": 35, "rsi_overbought": 75, "bb_period": 25, "bb_std": 2.5,
+     "macd_fast": 16, "macd_slow": 31},
+]
+
+
+def make_data(num_bars=500, seed=1):
+    rng = random.Random(seed)
+    price, data = 100.0, {"opens": [], "highs": [], "lows": [], "closes": [], "volumes": [], "dates": []}
+    for i in range(num_bars):
+        open_ = price
+        price *= 1 + 0.012 * math.sin(i / (7 + seed)) + rng.gauss(0, 0.012)
+        data["opens"].append(open_)
+        data["highs"].append(max(open_, price) * 1.004)
+        data["lows"].append(min(open_, price) * 0.996)
+        data["closes"].append(price)
+        data["volumes"].append(rng.randint(800_000, 1_600_000))
+        data["dates"].append(str(i))
+    return data
+
+
+class PerBarOnly:
+    """WeightedSignals without precompute_series (the old per-bar path)"""
+
+    def __init__(self, signals):
+        self.signals = signals
+
+    def __call__(self, *args):
+        return self.signals(*args)
+
+
+class TestVotes:
+    """Test vectorized votes against the per-bar reference"""
+
+    @pytest.mark.parametrize("params", PARAMS)
+    def test_matches_per_bar_votes(self, params):
+        data = make_data()
+
+        votes = component_votes(data["closes"], data["volumes"], params)
+
+        expected = np.array([
+            [bar_votes(i, data["closes"], data["volumes"], params)[name] for name in COMPONENTS]
+            for i in range(len(data["closes"]))
+        ])
+        assert np.array_equal(votes, expected)
+        assert not votes[:50].any() and votes[50:].any()
+
+    def test_votes_computed_once_per_indicator_params(self):
+        components = SymbolComponents("AAA", make_data())
+
+        first = components.votes({"rsi_period": 14, "stop_loss_pct": 0.02})
+        again = components.votes({"stop_loss_pct": 0.05, "take_profit_pct": 0.1})
+
+        assert first is again  # Exit params don't change the votes
+
+
+class TestWalkForwardEquivalence:
+    """Test precomputed sides reproduce per-bar signals"""
+
+    def test_same_result_as_per_bar_strategy(self):
+        components = SymbolComponents("AAA", make_data(1200))  # Test windows past the 50-bar warm-up
+        signals = WeightedSignals(components, DEFAULT_WEIGHTS)
+        data = components.data
+        backtester = WalkForwardBacktester()
+        backtester.param_ranges = {"bb_std": [1.5, 2.0], "rsi_period": [7, 14],
+                                   "stop_loss_pct": [0.02, 0.05], "take_profit_pct": [0.04, 0.10]}
+        series = (data["opens"], data["highs"], data["lows"], data["closes"], data["volumes"], data["dates"])
+
+        fast = backtester.run_walk_forward(*series, signals, num_windows=4, seed=3)
+        slow = backtester.run_walk_forward(*series, PerBarOnly(signals), num_windows=4, seed=3)
+
+        assert fast.total_trades > 0
+        assert fast == slow
+
+
+class TestWeightScorer:
+    """Test scoring across the optimization universe"""
+
+    HISTORY = {symbol: make_data(1000, seed) for seed, symbol in enumerate(["AAA", "BBB", "CCC"], start=1)}
+
+    def test_parallel_matches_serial(self):
+        backtester = WalkForwardBacktester()
+        backtester.param_ranges = {"stop_loss_pct": [0.02, 0.05], "take_profit_pct": [0.04, 0.10]}
+
+        with WeightScorer(self.HISTORY, backtester, workers=1, seed=9) as serial:
+            expected = serial.score(DEFAULT_WEIGHTS)
+        with WeightScorer(self.HISTORY, backtester, workers=3, seed=9) as parallel:
+            results = parallel.score(DEFAULT_WEIGHTS)
+            again = parallel.score(DEFAULT_WEIGHTS)
+
+        assert list(results) == ["AAA", "BBB", "CCC"]
+        assert results == expected == again
+        assert all(result.total_trades for result in results.values())
+        assert [r.symbol for r in results.values()] == ["AAA", "BBB", "CCC"]
+        assert len({r.seed for r in results.values()}) == 3  # Noise independent per symbol
+
+    def test_fidelity_uses_recent_bars(self):
+        backtester = WalkForwardBacktester()
+        backtester.param_ranges = {"stop_loss_pct": [0.03]}
+        components = SymbolComponents("AAA", make_data(1000))
+
+        result = score_symbol(backtester, components, DEFAULT_WEIGHTS, fidelity=1 / 3, seed=1)
+
+        # max(1000 // 3, 250) bars split into 4 windows of 83
+        assert result.windows[-1].test_end == 332
+
+
+class TestAutoOptimizerUniverse:
+    """Test the optimizer fetching and scoring every symbol"""
+
+    @pytest.fixture
+    def optimizer(self, monkeypatch):
+        monkeypatch.setattr(auto_optimizer, "get_alpaca_service", lambda: None)
+        optimizer = AutoOptimizer()
+        optimizer.optimizer_workers = 1
+        return optimizer
+
+    @pytest.mark.asyncio
+    async def test_fetches_symbols_concurrently(self, optimizer):
+        class SlowAlpaca:
+            def get_stock_bars(self, symbol, timeframe, start, end, limit=None):
+                time.sleep(0.2)
+                data = make_data(60, seed=len(symbol))
+                return [{"open": o, "high": h, "low": l, "close": c, "volume": v, "timestamp": d}
+                        for o, h, l, c, v, d in zip(*data.values())]
+
+        optimizer.alpaca = SlowAlpaca()
+        started = time.monotonic()
+
+        data = await optimizer._fetch_historical_data()
+
+        assert list(data) == optimizer.optimization_symbols
+        assert time.monotonic() - started < 0.2 * len(data) / 2
+
+    @pytest.mark.asyncio
+    async def test_weights_scored_on_every_symbol(self, optimizer):
+        optimizer.backtester = WalkForwardBacktester()
+        optimizer.backtester.param_ranges = {"stop_loss_pct": [0.02, 0.05], "take_profit_pct": [0.04, 0.10]}
+        optimizer.weight_search = RandomSearch()
+        optimizer.search_budget = SearchBudget(max_evaluations=6)
+
+        weights, result = await optimizer._find_optimal_weights(TestWeightScorer.HISTORY, MarketRegime.UNKNOWN)
+
+        assert result.symbol == "AAA,BBB,CCC"
+        assert result.total_windows == 12
+        assert result.total_trades == sum(len(w.trades) for w in result.windows) > 0
+        assert sum(weights.values()) == pytest.approx(1, abs=0.01)